@@ -5,13 +5,15 @@
 # This script orchestrates the execution of all pipeline stages in sequence.
 # It aborts on the first non-zero exit code and logs all activity.
 #
-# Usage: ./run_nightly.sh [--debug] [--skip-stage=<stage_number>]
+# Usage: ./run_nightly.sh [--debug] [--skip-stage=<stage_number>] [--stream]
 #
 # Options:
 #   --debug             Enable debug mode with verbose output
 #   --skip-stage=N      Skip stage N (1-6)
 #   --limit=N           Limit the number of leads processed in each stage
 #   --dry-run           Run without making external API calls or sending emails
+#   --stream            Run all stages at once in one process, over micro-batches
+#                       (cannot be combined with --skip-stage)
 #   --help              Display this help message
 
 set -e  # Exit immediately if a command exits with a non-zero status
@@ -31,6 +33,7 @@ DEBUG=false
 DRY_RUN=false
 SKIP_STAGES=()
 LEAD_LIMIT=""
+STREAM=false
 
 # Create log directory if it doesn't exist
 mkdir -p "$LOG_DIR"
@@ -62,7 +65,8 @@ log_metric() {
     mv "$tmp_file" "$METRICS_FILE"
 }
 
-# Function to run a pipeline stage
+# Function to run a pipeline stage; script is a file path, or "-m <module>"
+# to run a package module from the project root
 run_stage() {
     local stage_num="$1"
     local stage_name="$2"
@@ -94,7 +98,13 @@ run_stage() {
         sleep 2  # Simulate some processing time
     else
         # Actually run the command
-        if ! output=$($PYTHON_CMD "$script" $args 2>&1); then
+        local -a command=("$script")
+        local workdir="$PWD"
+        if [[ "$script" == "-m "* ]]; then
+            command=(-m "${script#-m }")
+            workdir="$PROJECT_ROOT"
+        fi
+        if ! output=$(cd "$workdir" && $PYTHON_CMD "${command[@]}" $args 2>&1); then
             status="failed"
             log "ERROR" "Stage $stage_num failed with exit code $?"
             log "ERROR" "$output"
@@ -137,10 +147,14 @@ Options:
   --skip-stage=N      Skip stage N (1-6)
   --limit=N           Limit the number of leads processed in each stage
   --dry-run           Run without making external API calls or sending emails
+  --stream            Run all stages at once in one process, over micro-batches
+                      of businesses, instead of one stage after another
+                      (cannot be combined with --skip-stage)
   --help              Display this help message
 
 Examples:
   ./run_nightly.sh --debug
+  ./run_nightly.sh --stream
   ./run_nightly.sh --skip-stage=3 --limit=10
   ./run_nightly.sh --dry-run
 
@@ -168,6 +182,9 @@ for arg in "$@"; do
             DRY_RUN=true
             LEAD_LIMIT="--limit=5"  # Default limit for dry runs
             ;;
+        --stream)
+            STREAM=true
+            ;;
         --help)
             show_help
             ;;
@@ -179,6 +196,12 @@ for arg in "$@"; do
     esac
 done
 
+# The streaming run is a single stage, so individual stages can't be skipped
+if [ "$STREAM" = true ] && [ ${#SKIP_STAGES[@]} -gt 0 ]; then
+    log "ERROR" "--skip-stage cannot be combined with --stream"
+    exit 2
+fi
+
 # Activate virtual environment if it exists
 if [ -d "$VENV_DIR" ]; then
     log "INFO" "Activating virtual environment"
@@ -225,13 +248,27 @@ if [ ! -z "$LEAD_LIMIT" ]; then
     COMMON_ARGS="$COMMON_ARGS $LEAD_LIMIT"
 fi
 
-# Run all pipeline stages in sequence
-run_stage 1 "Scraping" "${SCRIPT_DIR}/01_scrape.py" "$COMMON_ARGS"
-run_stage 2 "Enrichment" "${SCRIPT_DIR}/02_enrich.py" "$COMMON_ARGS"
-run_stage 3 "Deduplication" "${SCRIPT_DIR}/03_dedupe.py" "$COMMON_ARGS"
-run_stage 4 "Scoring" "${SCRIPT_DIR}/04_score.py" "$COMMON_ARGS"
-run_stage 5 "Mockup Generation" "${SCRIPT_DIR}/05_mockup.py" "$COMMON_ARGS"
-run_stage 6 "Email Queue" "${SCRIPT_DIR}/06_email_queue.py" "$COMMON_ARGS"
+if [ "$STREAM" = true ]; then
+    # One process runs every stage; a lead is emailed as soon as it is ready
+    STREAM_ARGS=""
+    if [ "$DEBUG" = true ]; then
+        STREAM_ARGS="$STREAM_ARGS --verbose"
+    fi
+    if [ "$DRY_RUN" = true ]; then
+        STREAM_ARGS="$STREAM_ARGS --dry-run"
+    fi
+    STREAM_ARGS="$STREAM_ARGS pipeline stream $LEAD_LIMIT"
+    # Numbered as the last stage so the batch tracker records it as complete
+    run_stage 6 "Streaming Pipeline" "-m leadfactory.cli.main" "$STREAM_ARGS"
+else
+    # Run all pipeline stages in sequence
+    run_stage 1 "Scraping" "${SCRIPT_DIR}/01_scrape.py" "$COMMON_ARGS"
+    run_stage 2 "Enrichment" "${SCRIPT_DIR}/02_enrich.py" "$COMMON_ARGS"
+    run_stage 3 "Deduplication" "${SCRIPT_DIR}/03_dedupe.py" "$COMMON_ARGS"
+    run_stage 4 "Scoring" "${SCRIPT_DIR}/04_score.py" "$COMMON_ARGS"
+    run_stage 5 "Mockup Generation" "${SCRIPT_DIR}/05_mockup.py" "$COMMON_ARGS"
+    run_stage 6 "Email Queue" "${SCRIPT_DIR}/06_email_queue.py" "$COMMON_ARGS"
+fi
 
 # Log completion
 log "INFO" "Nightly batch process completed successfully"
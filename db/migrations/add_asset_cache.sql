@@ -0,0 +1,27 @@
+-- Content-addressed screenshot and mockup cache
+-- Assets record the SHA-256 of their image so identical files can be found
+-- without re-uploading. asset_cache maps a normalized URL plus site
+-- fingerprint (or, for mockups, the source screenshot hash) to the image that
+-- was rendered for it, so unchanged sites are not captured again.
+
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS content_hash TEXT;
+ALTER TABLE assets ADD COLUMN IF NOT EXISTS metadata JSONB;
+
+CREATE INDEX IF NOT EXISTS idx_assets_content_hash ON assets(content_hash);
+
+CREATE TABLE IF NOT EXISTS asset_cache (
+    asset_type TEXT NOT NULL,  -- 'screenshot', 'mockup'
+    cache_key TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    size_bytes INTEGER,
+    render_seconds REAL,
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT NOW(),
+    last_hit_at TIMESTAMP,
+    PRIMARY KEY (asset_type, cache_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_asset_cache_content_hash ON asset_cache(content_hash);
+
+COMMENT ON TABLE asset_cache IS 'Rendered screenshots and mockups keyed by URL and site fingerprint';
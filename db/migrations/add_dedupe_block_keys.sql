@@ -0,0 +1,56 @@
+-- Blocking-key index for duplicate candidate generation
+-- Businesses sharing a key (phone digits, registered domain, email, full
+-- name, or a name-token/phonetic bucket within a ZIP or city) become
+-- candidate pairs.
+
+CREATE TABLE IF NOT EXISTS dedupe_block_keys (
+    block_key TEXT NOT NULL,
+    business_id INTEGER NOT NULL REFERENCES businesses(id) ON DELETE CASCADE,
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (block_key, business_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_dedupe_block_keys_business ON dedupe_block_keys(business_id);
+
+COMMENT ON TABLE dedupe_block_keys IS 'Blocking keys used to generate duplicate candidate pairs';
+
+-- Backfill watermark. Blocking replaces the full self-join only once every
+-- business up to indexed_through_id has keys of the current key_version.
+CREATE TABLE IF NOT EXISTS dedupe_block_index_state (
+    id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    key_version INTEGER NOT NULL,
+    indexed_through_id INTEGER NOT NULL,
+    completed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE dedupe_block_index_state IS 'How far dedupe_block_keys has been backfilled, and with which key format';
+
+-- Businesses whose blocking fields changed after their keys were written.
+-- The trigger below queues every such update, whichever code path made it
+-- (enrichment, manual edits, merges), and ensure_block_index re-keys the
+-- queued businesses before blocking is used.
+CREATE TABLE IF NOT EXISTS dedupe_block_key_updates (
+    business_id INTEGER PRIMARY KEY REFERENCES businesses(id) ON DELETE CASCADE,
+    queued_at TIMESTAMP NOT NULL DEFAULT clock_timestamp()
+);
+
+COMMENT ON TABLE dedupe_block_key_updates IS 'Businesses whose blocking keys must be regenerated';
+
+CREATE OR REPLACE FUNCTION queue_dedupe_block_key_update()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO dedupe_block_key_updates (business_id, queued_at)
+    VALUES (NEW.id, clock_timestamp())
+    ON CONFLICT (business_id) DO UPDATE SET queued_at = EXCLUDED.queued_at;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS queue_dedupe_block_key_update ON businesses;
+CREATE TRIGGER queue_dedupe_block_key_update
+    AFTER UPDATE OF name, phone, email, website, city, state, zip ON businesses
+    FOR EACH ROW
+    WHEN ((OLD.name, OLD.phone, OLD.email, OLD.website, OLD.city, OLD.state, OLD.zip)
+          IS DISTINCT FROM
+          (NEW.name, NEW.phone, NEW.email, NEW.website, NEW.city, NEW.state, NEW.zip))
+    EXECUTE FUNCTION queue_dedupe_block_key_update();
@@ -0,0 +1,31 @@
+-- Keyset pagination and full-text search for the logs browser
+-- Persists LLM log content length, adds (created_at, id) indexes so pages
+-- can be read by keyset instead of OFFSET, and indexes prompt text and
+-- HTML source URLs for search. HTML bodies live in files (html_path) and
+-- are not indexed here.
+-- Adding the generated columns rewrites llm_logs; run in a maintenance window.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE llm_logs
+    ADD COLUMN IF NOT EXISTS content_length INTEGER
+    GENERATED ALWAYS AS (
+        COALESCE(LENGTH(prompt_text) + LENGTH(response_json::text), 0)
+    ) STORED;
+
+ALTER TABLE llm_logs
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR
+    GENERATED ALWAYS AS (to_tsvector('simple', COALESCE(prompt_text, ''))) STORED;
+
+-- Keyset indexes: (timestamp, id) order, optionally within one business
+CREATE INDEX IF NOT EXISTS idx_llm_logs_created_at_id ON llm_logs(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_llm_logs_business_created_at_id ON llm_logs(business_id, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_raw_html_created_at_id ON raw_html_storage(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_raw_html_business_created_at_id ON raw_html_storage(business_id, created_at, id);
+
+-- Search indexes
+CREATE INDEX IF NOT EXISTS idx_llm_logs_search_vector ON llm_logs USING GIN(search_vector);
+CREATE INDEX IF NOT EXISTS idx_raw_html_original_url_trgm ON raw_html_storage USING GIN(original_url gin_trgm_ops);
+
+COMMENT ON COLUMN llm_logs.content_length IS 'Prompt plus response length, persisted for the logs browser';
+COMMENT ON COLUMN llm_logs.search_vector IS 'Full-text index of prompt_text for log search';
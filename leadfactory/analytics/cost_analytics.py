@@ -32,6 +32,8 @@ except ImportError:
     np = None
     stats = None
 
+from leadfactory.analytics import timeseries
+from leadfactory.analytics.timeseries import NUMPY_AVAILABLE
 from leadfactory.cost.cost_tracking import cost_tracker
 from leadfactory.utils.logging import get_logger
 
@@ -41,9 +43,19 @@ logger = get_logger(__name__)
 class CostAnalyticsEngine:
     """Advanced cost analytics and forecasting engine."""
 
-    def __init__(self):
-        """Initialize the cost analytics engine."""
+    def __init__(self, vectorized: Optional[bool] = None):
+        """
+        Initialize the cost analytics engine.
+
+        Args:
+            vectorized: Use the NumPy analysis kernels. Defaults to True when
+                NumPy is installed; False forces the pure-Python implementation.
+        """
         self.logger = get_logger(f"{__name__}.CostAnalyticsEngine")
+        self.vectorized = NUMPY_AVAILABLE if vectorized is None else vectorized
+        if self.vectorized and not NUMPY_AVAILABLE:
+            self.logger.warning("NumPy not available. Using pure-Python analysis.")
+            self.vectorized = False
 
         if not ADVANCED_ANALYTICS_AVAILABLE:
             self.logger.warning(
@@ -83,64 +95,150 @@ class CostAnalyticsEngine:
                     "data_points": len(historical_data),
                 }
 
-            # Extract time series data
-            dates = [
-                datetime.strptime(item["date"], "%Y-%m-%d") for item in historical_data
-            ]
-            costs = [item["cost"] for item in historical_data]
+            analysis = self._analyze_series(
+                service_type, historical_data, forecast_days
+            )
 
-            # Perform trend decomposition
-            trend_components = self._decompose_trend(costs)
+            self.logger.info(f"Trend analysis completed: {analysis['summary']}")
+            return analysis
 
-            # Detect seasonality
-            seasonality = self._detect_seasonality(costs, dates)
+        except Exception as e:
+            self.logger.error(f"Error in trend analysis: {e}")
+            raise
 
-            # Generate forecasts
-            forecasts = self._generate_advanced_forecast(costs, dates, forecast_days)
+    def analyze_service_cost_trends(
+        self,
+        days_back: int = 90,
+        forecast_days: int = 30,
+        service_types: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Run trend analysis for every service at once.
 
-            # Detect anomalies
-            anomalies = self._detect_advanced_anomalies(historical_data, costs)
+        History for all services is loaded with a single query. Series of
+        equal length are stacked and decomposed, and scanned for change
+        points, in one vectorized pass. Each result matches what
+        analyze_cost_trends() returns for that service.
 
-            # Calculate trend strength and direction
-            trend_metrics = self._calculate_trend_metrics(costs, dates)
+        Args:
+            days_back: Number of historical days to analyze
+            forecast_days: Number of days to forecast
+            service_types: Optional list of services to analyze
 
-            # Identify change points
-            change_points = self._detect_change_points(costs, dates)
+        Returns:
+            Trend analysis keyed by service
+        """
+        self.logger.info(
+            f"Starting per-service trend analysis for {days_back} days back, "
+            f"{forecast_days} days forecast"
+        )
 
-            # Calculate volatility metrics
-            volatility_analysis = self._analyze_volatility(costs)
+        try:
+            history = self._get_historical_cost_data_by_service(days_back)
+            if service_types is not None:
+                history = {
+                    service: history.get(service, []) for service in service_types
+                }
 
-            analysis = {
-                "service_type": service_type,
-                "analysis_period": {
-                    "start_date": dates[0].strftime("%Y-%m-%d"),
-                    "end_date": dates[-1].strftime("%Y-%m-%d"),
-                    "days_analyzed": len(historical_data),
-                },
-                "trend_components": trend_components,
-                "seasonality": seasonality,
-                "trend_metrics": trend_metrics,
-                "forecasts": forecasts,
-                "anomalies": anomalies,
-                "change_points": change_points,
-                "volatility_analysis": volatility_analysis,
-                "summary": {
-                    "overall_trend": trend_metrics["direction"],
-                    "trend_strength": trend_metrics["strength"],
-                    "forecast_confidence": forecasts["confidence_level"],
-                    "anomaly_count": len(anomalies),
-                    "seasonality_detected": seasonality["has_seasonality"],
-                },
-                "generated_at": datetime.now().isoformat(),
-            }
+            results = {}
+            eligible = []
+            for service, historical_data in history.items():
+                if len(historical_data) < 7:
+                    results[service] = {
+                        "error": "Insufficient data for trend analysis",
+                        "data_points": len(historical_data),
+                    }
+                else:
+                    eligible.append(service)
 
-            self.logger.info(f"Trend analysis completed: {analysis['summary']}")
-            return analysis
+            all_costs = [[item["cost"] for item in history[s]] for s in eligible]
+            all_dates = [
+                [datetime.strptime(item["date"], "%Y-%m-%d") for item in history[s]]
+                for s in eligible
+            ]
+            decompositions = self._decompose_trend_batch(all_costs)
+            change_points = self._detect_change_points_batch(all_costs, all_dates)
+
+            for index, service in enumerate(eligible):
+                results[service] = self._analyze_series(
+                    service,
+                    history[service],
+                    forecast_days,
+                    trend_components=decompositions[index],
+                    change_points=change_points[index],
+                )
+
+            self.logger.info(
+                f"Per-service trend analysis completed for {len(eligible)} services"
+            )
+            return results
 
         except Exception as e:
-            self.logger.error(f"Error in trend analysis: {e}")
+            self.logger.error(f"Error in per-service trend analysis: {e}")
             raise
 
+    def _analyze_series(
+        self,
+        service_type: Optional[str],
+        historical_data: List[Dict[str, Any]],
+        forecast_days: int,
+        trend_components: Optional[Dict[str, Any]] = None,
+        change_points: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """Analyze one daily cost series, reusing any precomputed components."""
+        # Extract time series data
+        dates = [
+            datetime.strptime(item["date"], "%Y-%m-%d") for item in historical_data
+        ]
+        costs = [item["cost"] for item in historical_data]
+
+        # Perform trend decomposition
+        if trend_components is None:
+            trend_components = self._decompose_trend(costs)
+
+        # Detect seasonality
+        seasonality = self._detect_seasonality(costs, dates)
+
+        # Generate forecasts
+        forecasts = self._generate_advanced_forecast(costs, dates, forecast_days)
+
+        # Detect anomalies
+        anomalies = self._detect_advanced_anomalies(historical_data, costs)
+
+        # Calculate trend strength and direction
+        trend_metrics = self._calculate_trend_metrics(costs, dates)
+
+        # Identify change points
+        if change_points is None:
+            change_points = self._detect_change_points(costs, dates)
+
+        # Calculate volatility metrics
+        volatility_analysis = self._analyze_volatility(costs)
+
+        return {
+            "service_type": service_type,
+            "analysis_period": {
+                "start_date": dates[0].strftime("%Y-%m-%d"),
+                "end_date": dates[-1].strftime("%Y-%m-%d"),
+                "days_analyzed": len(historical_data),
+            },
+            "trend_components": trend_components,
+            "seasonality": seasonality,
+            "trend_metrics": trend_metrics,
+            "forecasts": forecasts,
+            "anomalies": anomalies,
+            "change_points": change_points,
+            "volatility_analysis": volatility_analysis,
+            "summary": {
+                "overall_trend": trend_metrics["direction"],
+                "trend_strength": trend_metrics["strength"],
+                "forecast_confidence": forecasts["confidence_level"],
+                "anomaly_count": len(anomalies),
+                "seasonality_detected": seasonality["has_seasonality"],
+            },
+            "generated_at": datetime.now().isoformat(),
+        }
+
     def _get_historical_cost_data(
         self, service_type: Optional[str], days_back: int
     ) -> List[Dict[str, Any]]:
@@ -193,11 +291,60 @@ class CostAnalyticsEngine:
             self.logger.error(f"Error getting historical data: {e}")
             raise
 
+    def _get_historical_cost_data_by_service(
+        self, days_back: int
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Get historical cost data for every service with a single query."""
+        try:
+            conn = sqlite3.connect(cost_tracker.db_path)
+            cursor = conn.cursor()
+
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=days_back)
+
+            cursor.execute(
+                """
+                SELECT
+                    service,
+                    DATE(timestamp) as date,
+                    SUM(amount) as cost,
+                    COUNT(*) as transaction_count,
+                    AVG(amount) as avg_transaction_cost
+                FROM costs
+                WHERE DATE(timestamp) >= ? AND DATE(timestamp) <= ?
+                GROUP BY service, DATE(timestamp)
+                ORDER BY service, date
+            """,
+                (start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")),
+            )
+
+            results = cursor.fetchall()
+            conn.close()
+
+            history = {}
+            for service, date_str, cost, count, avg_cost in results:
+                history.setdefault(service, []).append(
+                    {
+                        "date": date_str,
+                        "cost": float(cost),
+                        "transaction_count": count,
+                        "avg_transaction_cost": float(avg_cost),
+                    }
+                )
+            return history
+
+        except Exception as e:
+            self.logger.error(f"Error getting historical data by service: {e}")
+            raise
+
     def _decompose_trend(self, costs: List[float]) -> Dict[str, Any]:
         """Decompose time series into trend, seasonal, and residual components."""
         if len(costs) < 14:
             return {"error": "Insufficient data for decomposition"}
 
+        if self.vectorized:
+            return self._decompose_trend_batch([costs])[0]
+
         try:
             # Simple moving average for trend
             window_size = min(7, len(costs) // 3)
@@ -212,62 +359,117 @@ class CostAnalyticsEngine:
             detrended = [costs[i] - trend[i] for i in range(len(costs))]
 
             # Estimate seasonal component (weekly pattern)
-            seasonal = []
-            if len(costs) >= 14:  # At least 2 weeks
-                for i in range(len(costs)):
-                    day_of_week = i % 7
-                    same_day_values = [
-                        detrended[j] for j in range(day_of_week, len(detrended), 7)
-                    ]
-                    seasonal.append(statistics.mean(same_day_values))
-            else:
-                seasonal = [0] * len(costs)
+            weekly_means = [
+                statistics.mean(detrended[day_of_week::7]) for day_of_week in range(7)
+            ]
+            seasonal = [weekly_means[i % 7] for i in range(len(costs))]
 
             # Calculate residuals
             residuals = [detrended[i] - seasonal[i] for i in range(len(costs))]
 
-            # Calculate component strengths
-            total_variance = statistics.variance(costs) if len(costs) > 1 else 0
-            trend_variance = statistics.variance(trend) if len(trend) > 1 else 0
-            seasonal_variance = (
-                statistics.variance(seasonal) if len(seasonal) > 1 else 0
-            )
-            residual_variance = (
-                statistics.variance(residuals) if len(residuals) > 1 else 0
+            return self._decomposition_result(
+                trend,
+                seasonal,
+                residuals,
+                statistics.variance(costs),
+                statistics.variance(trend),
+                statistics.variance(seasonal),
+                statistics.variance(residuals),
             )
 
-            return {
-                "trend": trend,
-                "seasonal": seasonal,
-                "residuals": residuals,
-                "variance_explained": {
-                    "trend": (
-                        (trend_variance / total_variance * 100)
-                        if total_variance > 0
-                        else 0
-                    ),
-                    "seasonal": (
-                        (seasonal_variance / total_variance * 100)
-                        if total_variance > 0
-                        else 0
-                    ),
-                    "residual": (
-                        (residual_variance / total_variance * 100)
-                        if total_variance > 0
-                        else 0
-                    ),
-                },
-                "decomposition_quality": (
-                    1 - (residual_variance / total_variance)
-                    if total_variance > 0
-                    else 0
-                ),
-            }
-
         except Exception as e:
             self.logger.error(f"Error in trend decomposition: {e}")
             return {"error": str(e)}
 
+    def _decompose_trend_batch(self, series: List[List[float]]) -> List[Dict[str, Any]]:
+        """
+        Decompose several series, stacking those of equal length.
+
+        Returns one result per series, in order, identical to calling
+        _decompose_trend() on each.
+        """
+        if not self.vectorized:
+            return [self._decompose_trend(costs) for costs in series]
+
+        results = [None] * len(series)
+        by_length = {}
+        for index, costs in enumerate(series):
+            if len(costs) < 14:
+                results[index] = {"error": "Insufficient data for decomposition"}
+            else:
+                by_length.setdefault(len(costs), []).append(index)
+
+        for length, indices in by_length.items():
+            try:
+                values = timeseries.as_series([series[i] for i in indices])
+
+                # Simple moving average for trend
+                trend = timeseries.centered_mean(values, min(7, length // 3))
+                detrended = values - trend
+
+                # Weekly seasonal component and residuals
+                seasonal = timeseries.phase_mean(detrended, 7)
+                residuals = detrended - seasonal
+
+                variances = [
+                    timeseries.sample_variance(component).tolist()
+                    for component in (values, trend, seasonal, residuals)
+                ]
+                trend, seasonal, residuals = (
+                    trend.tolist(),
+                    seasonal.tolist(),
+                    residuals.tolist(),
+                )
+                for row, index in enumerate(indices):
+                    results[index] = self._decomposition_result(
+                        trend[row],
+                        seasonal[row],
+                        residuals[row],
+                        *(variance[row] for variance in variances),
+                    )
+
+            except Exception as e:
+                self.logger.error(f"Error in trend decomposition: {e}")
+                for index in indices:
+                    results[index] = {"error": str(e)}
+
+        return results
+
+    def _decomposition_result(
+        self,
+        trend: List[float],
+        seasonal: List[float],
+        residuals: List[float],
+        total_variance: float,
+        trend_variance: float,
+        seasonal_variance: float,
+        residual_variance: float,
+    ) -> Dict[str, Any]:
+        """Assemble a decomposition result from its components."""
+        return {
+            "trend": trend,
+            "seasonal": seasonal,
+            "residuals": residuals,
+            "variance_explained": {
+                "trend": (
+                    (trend_variance / total_variance * 100) if total_variance > 0 else 0
+                ),
+                "seasonal": (
+                    (seasonal_variance / total_variance * 100)
+                    if total_variance > 0
+                    else 0
+                ),
+                "residual": (
+                    (residual_variance / total_variance * 100)
+                    if total_variance > 0
+                    else 0
+                ),
+            },
+            "decomposition_quality": (
+                1 - (residual_variance / total_variance) if total_variance > 0 else 0
+            ),
+        }
+
     def _detect_seasonality(
         self, costs: List[float], dates: List[datetime]
     ) -> Dict[str, Any]:
@@ -276,25 +478,20 @@ class CostAnalyticsEngine:
             return {"has_seasonality": False, "reason": "Insufficient data"}
 
         try:
-            # Test for weekly seasonality
-            weekly_pattern = {}
-            for i, date in enumerate(dates):
-                day_of_week = date.weekday()
-                if day_of_week not in weekly_pattern:
-                    weekly_pattern[day_of_week] = []
-                weekly_pattern[day_of_week].append(costs[i])
-
-            # Calculate day-of-week averages
-            daily_averages = {}
-            for day, values in weekly_pattern.items():
-                if len(values) >= 2:
-                    daily_averages[day] = statistics.mean(values)
+            # Day-of-week and day-of-month averages, for days seen at least twice
+            if self.vectorized:
+                overall_mean = float(timeseries.as_series(costs).mean())
+                daily_averages, monthly_averages = self._vectorized_calendar_averages(
+                    costs, dates
+                )
+            else:
+                overall_mean = statistics.mean(costs)
+                daily_averages, monthly_averages = self._calendar_averages(costs, dates)
 
             # Test for significant weekly variation
             if len(daily_averages) >= 7:
                 avg_costs = list(daily_averages.values())
                 weekly_variance = statistics.variance(avg_costs)
-                overall_mean = statistics.mean(costs)
                 coefficient_of_variation = (
                     (weekly_variance**0.5) / overall_mean if overall_mean > 0 else 0
                 )
@@ -304,30 +501,14 @@ class CostAnalyticsEngine:
                 has_weekly_seasonality = False
 
             # Test for monthly patterns (if enough data)
-            monthly_pattern = {}
-            if len(dates) >= 60:  # At least 2 months
-                for i, date in enumerate(dates):
-                    day_of_month = date.day
-                    if day_of_month not in monthly_pattern:
-                        monthly_pattern[day_of_month] = []
-                    monthly_pattern[day_of_month].append(costs[i])
-
-                monthly_averages = {}
-                for day, values in monthly_pattern.items():
-                    if len(values) >= 2:
-                        monthly_averages[day] = statistics.mean(values)
-
-                if len(monthly_averages) >= 15:  # At least half the month
-                    avg_monthly_costs = list(monthly_averages.values())
-                    monthly_variance = statistics.variance(avg_monthly_costs)
-                    monthly_cv = (
-                        (monthly_variance**0.5) / overall_mean
-                        if overall_mean > 0
-                        else 0
-                    )
-                    has_monthly_seasonality = monthly_cv > 0.15
-                else:
-                    has_monthly_seasonality = False
+            if len(dates) >= 60 and len(monthly_averages) >= 15:
+                # At least 2 months of data covering half the month
+                avg_monthly_costs = list(monthly_averages.values())
+                monthly_variance = statistics.variance(avg_monthly_costs)
+                monthly_cv = (
+                    (monthly_variance**0.5) / overall_mean if overall_mean > 0 else 0
+                )
+                has_monthly_seasonality = monthly_cv > 0.15
             else:
                 has_monthly_seasonality = False
 
@@ -383,6 +564,47 @@ class CostAnalyticsEngine:
             self.logger.error(f"Error detecting seasonality: {e}")
             return {"has_seasonality": False, "error": str(e)}
 
+    def _calendar_averages(
+        self, costs: List[float], dates: List[datetime]
+    ) -> Tuple[Dict[int, float], Dict[int, float]]:
+        """Average cost per weekday and per day of month, in first-seen order."""
+        weekly_pattern = {}
+        monthly_pattern = {}
+        for i, date in enumerate(dates):
+            weekly_pattern.setdefault(date.weekday(), []).append(costs[i])
+            monthly_pattern.setdefault(date.day, []).append(costs[i])
+
+        daily_averages = {
+            day: statistics.mean(values)
+            for day, values in weekly_pattern.items()
+            if len(values) >= 2
+        }
+        monthly_averages = {
+            day: statistics.mean(values)
+            for day, values in monthly_pattern.items()
+            if len(values) >= 2
+        }
+        return daily_averages, monthly_averages
+
+    def _vectorized_calendar_averages(
+        self, costs: List[float], dates: List[datetime]
+    ) -> Tuple[Dict[int, float], Dict[int, float]]:
+        """Vectorized equivalent of _calendar_averages()."""
+        values = timeseries.as_series(costs)
+        averages = []
+        for groups, n_groups in (
+            (timeseries.weekdays(dates), 7),
+            (timeseries.days_of_month(dates), 32),
+        ):
+            counts, means, _ = timeseries.group_stats(values, groups, n_groups)
+            averages.append(
+                {
+                    day: float(means[day])
+                    for day in timeseries.first_seen_order(groups, counts >= 2)
+                }
+            )
+        return averages[0], averages[1]
+
     def _generate_advanced_forecast(
         self, costs: List[float], dates: List[datetime], forecast_days: int
     ) -> Dict[str, Any]:
@@ -445,30 +667,18 @@ class CostAnalyticsEngine:
     ) -> Dict[str, Any]:
         """Generate linear trend forecast."""
         try:
-            # Convert dates to numeric values
-            base_date = dates[0]
-            x = [(date - base_date).days for date in dates]
-            y = costs
-
-            # Calculate linear regression
-            n = len(x)
-            sum_x = sum(x)
-            sum_y = sum(y)
-            sum_xy = sum(x[i] * y[i] for i in range(n))
-            sum_x2 = sum(xi**2 for xi in x)
+            if self.vectorized:
+                fit = self._vectorized_linear_fit(costs, dates)
+            else:
+                fit = self._linear_fit(costs, dates)
 
-            # Avoid division by zero
-            denominator = n * sum_x2 - sum_x**2
-            if abs(denominator) < 1e-10:
+            if fit is None:
                 return {
                     "error": "Cannot calculate linear trend - insufficient variance in dates"
                 }
-
-            slope = (n * sum_xy - sum_x * sum_y) / denominator
-            intercept = (sum_y - slope * sum_x) / n
+            slope, intercept, r_squared, last_x = fit
 
             # Generate forecast
-            last_x = x[-1]
             forecast_values = []
             forecast_dates = []
 
@@ -480,12 +690,6 @@ class CostAnalyticsEngine:
                     (dates[-1] + timedelta(days=i)).strftime("%Y-%m-%d")
                 )
 
-            # Calculate R-squared
-            y_mean = statistics.mean(y)
-            ss_tot = sum((yi - y_mean) ** 2 for yi in y)
-            ss_res = sum((y[i] - (slope * x[i] + intercept)) ** 2 for i in range(n))
-            r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
-
             return {
                 "method": "linear_trend",
                 "slope": slope,
@@ -499,6 +703,65 @@ class CostAnalyticsEngine:
             self.logger.error(f"Error in linear trend forecast: {e}")
             return {"error": str(e)}
 
+    def _linear_fit(
+        self, costs: List[float], dates: List[datetime]
+    ) -> Optional[Tuple[float, float, float, int]]:
+        """
+        Least-squares fit of cost against days elapsed.
+
+        Returns:
+            (slope, intercept, r_squared, last_x), or None if all dates coincide
+        """
+        # Convert dates to numeric values
+        base_date = dates[0]
+        x = [(date - base_date).days for date in dates]
+        y = costs
+
+        # Calculate linear regression
+        n = len(x)
+        sum_x = sum(x)
+        sum_y = sum(y)
+        sum_xy = sum(x[i] * y[i] for i in range(n))
+        sum_x2 = sum(xi**2 for xi in x)
+
+        # Avoid division by zero
+        denominator = n * sum_x2 - sum_x**2
+        if abs(denominator) < 1e-10:
+            return None
+
+        slope = (n * sum_xy - sum_x * sum_y) / denominator
+        intercept = (sum_y - slope * sum_x) / n
+
+        # Calculate R-squared
+        y_mean = statistics.mean(y)
+        ss_tot = sum((yi - y_mean) ** 2 for yi in y)
+        ss_res = sum((y[i] - (slope * x[i] + intercept)) ** 2 for i in range(n))
+        r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
+
+        return slope, intercept, r_squared, x[-1]
+
+    def _vectorized_linear_fit(
+        self, costs: List[float], dates: List[datetime]
+    ) -> Optional[Tuple[float, float, float, int]]:
+        """Vectorized equivalent of _linear_fit(), using centred sums."""
+        x = timeseries.day_offsets(dates)
+        y = timeseries.as_series(costs)
+
+        dx = x - x.mean()
+        dy = y - y.mean()
+        sxx = float((dx * dx).sum())
+        if abs(len(x) * sxx) < 1e-10:
+            return None
+
+        slope = float((dx * dy).sum()) / sxx
+        intercept = float(y.mean()) - slope * float(x.mean())
+
+        ss_tot = float((dy * dy).sum())
+        ss_res = float(((y - (slope * x + intercept)) ** 2).sum())
+        r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
+
+        return slope, intercept, r_squared, int(x[-1])
+
     def _exponential_smoothing_forecast(
         self, costs: List[float], forecast_days: int
     ) -> Dict[str, Any]:
@@ -506,25 +769,29 @@ class CostAnalyticsEngine:
         try:
             alpha = 0.3  # Smoothing parameter
 
-            # Calculate smoothed values
-            smoothed = [costs[0]]
-            for i in range(1, len(costs)):
-                smoothed_value = alpha * costs[i] + (1 - alpha) * smoothed[-1]
-                smoothed.append(smoothed_value)
+            # Calculate smoothed values and mean absolute error
+            if self.vectorized:
+                values = timeseries.as_series(costs)
+                smoothed = timeseries.exponential_smoothing(values, alpha)
+                mae = float(np.abs(values - smoothed).mean())
+                last_smoothed = float(smoothed[-1])
+            else:
+                smoothed = [costs[0]]
+                for i in range(1, len(costs)):
+                    smoothed_value = alpha * costs[i] + (1 - alpha) * smoothed[-1]
+                    smoothed.append(smoothed_value)
+                mae = statistics.mean(
+                    abs(costs[i] - smoothed[i]) for i in range(len(costs))
+                )
+                last_smoothed = smoothed[-1]
 
             # Generate forecast
-            last_smoothed = smoothed[-1]
             forecast_values = [max(0, last_smoothed)] * forecast_days
             forecast_dates = [
                 (datetime.now() + timedelta(days=i)).strftime("%Y-%m-%d")
                 for i in range(1, forecast_days + 1)
             ]
 
-            # Calculate mean absolute error
-            mae = statistics.mean(
-                abs(costs[i] - smoothed[i]) for i in range(len(costs))
-            )
-
             return {
                 "method": "exponential_smoothing",
                 "alpha": alpha,
@@ -646,22 +913,30 @@ class CostAnalyticsEngine:
                 }
 
             # Calculate weighted ensemble
-            ensemble_values = []
-            forecast_dates = []
-
-            for i in range(forecast_days):
-                weighted_sum = 0
+            if self.vectorized:
+                weighted = np.zeros(forecast_days)
                 for method, forecast in valid_forecasts.items():
-                    if i < len(forecast["forecast_values"]):
-                        weighted_sum += weights[method] * forecast["forecast_values"][i]
+                    values = timeseries.as_series(
+                        forecast["forecast_values"][:forecast_days]
+                    )
+                    weighted[: len(values)] += weights[method] * values
+                ensemble_values = np.maximum(0, weighted).tolist()
+            else:
+                ensemble_values = []
+                for i in range(forecast_days):
+                    weighted_sum = 0
+                    for method, forecast in valid_forecasts.items():
+                        if i < len(forecast["forecast_values"]):
+                            weighted_sum += (
+                                weights[method] * forecast["forecast_values"][i]
+                            )
 
-                ensemble_values.append(max(0, weighted_sum))
+                    ensemble_values.append(max(0, weighted_sum))
 
-                # Use dates from first valid forecast
-                if i < len(list(valid_forecasts.values())[0]["forecast_dates"]):
-                    forecast_dates.append(
-                        list(valid_forecasts.values())[0]["forecast_dates"][i]
-                    )
+            # Use dates from first valid forecast
+            forecast_dates = list(
+                next(iter(valid_forecasts.values()))["forecast_dates"][:forecast_days]
+            )
 
             return {
                 "method": "ensemble",
@@ -685,17 +960,16 @@ class CostAnalyticsEngine:
                     "error": "Insufficient historical data for prediction intervals"
                 }
 
-            # Calculate historical forecast errors (using simple persistence model)
-            errors = []
-            for i in range(1, len(historical_costs)):
-                error = abs(historical_costs[i] - historical_costs[i - 1])
-                errors.append(error)
-
-            # Calculate standard error
-            if len(errors) > 1:
-                std_error = statistics.stdev(errors)
+            # Calculate standard error of a simple persistence model
+            if self.vectorized:
+                errors = np.abs(np.diff(timeseries.as_series(historical_costs)))
+                std_error = float(timeseries.sample_std(errors))
             else:
-                std_error = statistics.stdev(historical_costs) * 0.1  # Fallback
+                errors = []
+                for i in range(1, len(historical_costs)):
+                    error = abs(historical_costs[i] - historical_costs[i - 1])
+                    errors.append(error)
+                std_error = statistics.stdev(errors)
 
             # Calculate prediction intervals (assuming normal distribution)
             confidence_levels = [80, 90, 95]
@@ -703,16 +977,23 @@ class CostAnalyticsEngine:
 
             intervals = {}
             for conf_level, z_score in zip(confidence_levels, z_scores):
-                lower_bounds = []
-                upper_bounds = []
+                if self.vectorized:
+                    values = timeseries.as_series(forecast_values)
+                    # Increase uncertainty with forecast horizon, 10% per period
+                    margins = z_score * std_error * (1 + np.arange(len(values)) * 0.1)
+                    lower_bounds = np.maximum(0, values - margins).tolist()
+                    upper_bounds = (values + margins).tolist()
+                else:
+                    lower_bounds = []
+                    upper_bounds = []
 
-                for i, forecast_value in enumerate(forecast_values):
-                    # Increase uncertainty with forecast horizon
-                    horizon_factor = 1 + (i * 0.1)  # 10% increase per period
-                    margin = z_score * std_error * horizon_factor
+                    for i, forecast_value in enumerate(forecast_values):
+                        # Increase uncertainty with forecast horizon
+                        horizon_factor = 1 + (i * 0.1)  # 10% increase per period
+                        margin = z_score * std_error * horizon_factor
 
-                    lower_bounds.append(max(0, forecast_value - margin))
-                    upper_bounds.append(forecast_value + margin)
+                        lower_bounds.append(max(0, forecast_value - margin))
+                        upper_bounds.append(forecast_value + margin)
 
                 intervals[f"{conf_level}%"] = {
                     "lower_bounds": lower_bounds,
@@ -747,9 +1028,15 @@ class CostAnalyticsEngine:
 
             # Factor 2: Data stability (low volatility = higher confidence)
             if len(historical_costs) > 1:
-                volatility = statistics.stdev(historical_costs) / statistics.mean(
-                    historical_costs
-                )
+                if self.vectorized:
+                    values = timeseries.as_series(historical_costs)
+                    volatility = float(timeseries.sample_std(values)) / float(
+                        values.mean()
+                    )
+                else:
+                    volatility = statistics.stdev(historical_costs) / statistics.mean(
+                        historical_costs
+                    )
                 stability_factor = max(0.1, 1.0 - min(1.0, volatility))
                 confidence_factors.append(stability_factor)
 
@@ -797,6 +1084,11 @@ class CostAnalyticsEngine:
             if len(x) != len(y) or len(x) < 2:
                 return 0.0
 
+            if self.vectorized:
+                return timeseries.correlation(
+                    timeseries.as_series(x), timeseries.as_series(y)
+                )
+
             n = len(x)
             sum_x = sum(x)
             sum_y = sum(y)
@@ -875,15 +1167,27 @@ class CostAnalyticsEngine:
             return anomalies
 
         try:
-            mean_cost = statistics.mean(costs)
-            std_cost = statistics.stdev(costs) if len(costs) > 1 else 0
+            if self.vectorized:
+                values = timeseries.as_series(costs)
+                mean_cost = float(values.mean())
+                std_cost = float(timeseries.sample_std(values))
+            else:
+                mean_cost = statistics.mean(costs)
+                std_cost = statistics.stdev(costs) if len(costs) > 1 else 0
 
             if std_cost == 0:
                 return anomalies
 
             threshold = 2.5  # Z-score threshold
 
-            for i, item in enumerate(historical_data):
+            if self.vectorized:
+                z_scores = np.abs(values - mean_cost) / std_cost
+                candidates = np.flatnonzero(z_scores > threshold).tolist()
+            else:
+                candidates = range(len(historical_data))
+
+            for i in candidates:
+                item = historical_data[i]
                 z_score = abs(item["cost"] - mean_cost) / std_cost
 
                 if z_score > threshold:
@@ -917,14 +1221,20 @@ class CostAnalyticsEngine:
             return anomalies
 
         try:
-            sorted_costs = sorted(costs)
-            n = len(sorted_costs)
+            n = len(costs)
 
             # Calculate quartiles
             q1_idx = n // 4
             q3_idx = 3 * n // 4
-            q1 = sorted_costs[q1_idx]
-            q3 = sorted_costs[q3_idx]
+            if self.vectorized:
+                values = timeseries.as_series(costs)
+                quartiles = np.partition(values, [q1_idx, q3_idx])
+                q1 = float(quartiles[q1_idx])
+                q3 = float(quartiles[q3_idx])
+            else:
+                sorted_costs = sorted(costs)
+                q1 = sorted_costs[q1_idx]
+                q3 = sorted_costs[q3_idx]
             iqr = q3 - q1
 
             if iqr == 0:
@@ -934,7 +1244,13 @@ class CostAnalyticsEngine:
             lower_bound = q1 - 1.5 * iqr
             upper_bound = q3 + 1.5 * iqr
 
-            for item in historical_data:
+            if self.vectorized:
+                outside = (values < lower_bound) | (values > upper_bound)
+                candidates = [historical_data[i] for i in np.flatnonzero(outside)]
+            else:
+                candidates = historical_data
+
+            for item in candidates:
                 if item["cost"] < lower_bound or item["cost"] > upper_bound:
                     anomaly_type = "high" if item["cost"] > upper_bound else "low"
                     deviation = abs(
@@ -975,14 +1291,9 @@ class CostAnalyticsEngine:
             window_size = min(7, len(costs) // 3)
             threshold_multiplier = 2.0
 
-            for i in range(window_size, len(costs)):
-                # Calculate moving average for window
-                window_costs = costs[i - window_size : i]
-                moving_avg = statistics.mean(window_costs)
-                moving_std = (
-                    statistics.stdev(window_costs) if len(window_costs) > 1 else 0
-                )
-
+            for i, moving_avg, moving_std in self._trailing_window_stats(
+                costs, window_size, threshold_multiplier
+            ):
                 if moving_std > 0:
                     current_cost = costs[i]
                     deviation = abs(current_cost - moving_avg)
@@ -1012,6 +1323,40 @@ class CostAnalyticsEngine:
             self.logger.error(f"Error in moving average anomaly detection: {e}")
             return []
 
+    def _trailing_window_stats(
+        self, costs: List[float], window_size: int, threshold_multiplier: float
+    ):
+        """
+        Yield (index, mean, stdev) of the window_size costs preceding each index.
+
+        The vectorized path only yields indices whose cost deviates from the
+        window mean by more than threshold_multiplier standard deviations.
+        """
+        if not self.vectorized:
+            for i in range(window_size, len(costs)):
+                # Calculate moving average for window
+                window_costs = costs[i - window_size : i]
+                moving_avg = statistics.mean(window_costs)
+                moving_std = (
+                    statistics.stdev(window_costs) if len(window_costs) > 1 else 0
+                )
+                yield i, moving_avg, moving_std
+            return
+
+        if window_size < 2:
+            return
+
+        values = timeseries.as_series(costs)
+        means, variances = timeseries.rolling_mean_var(values, window_size)
+        means = means[:-1]
+        stds = np.sqrt(variances[:-1])
+        deviations = np.abs(values[window_size:] - means)
+        flagged = np.flatnonzero(
+            (stds > 0) & (deviations > threshold_multiplier * stds)
+        )
+        for offset in flagged.tolist():
+            yield offset + window_size, float(means[offset]), float(stds[offset])
+
     def _detect_seasonal_anomalies(
         self, historical_data: List[Dict[str, Any]], costs: List[float]
     ) -> List[Dict[str, Any]]:
@@ -1022,30 +1367,55 @@ class CostAnalyticsEngine:
             return anomalies
 
         try:
-            # Group by day of week
-            weekday_costs = [[] for _ in range(7)]
-
-            for i, item in enumerate(historical_data):
-                date = datetime.strptime(item["date"], "%Y-%m-%d")
-                weekday = date.weekday()
-                weekday_costs[weekday].append(item["cost"])
-
-            # Calculate expected costs and thresholds for each weekday
-            weekday_stats = {}
-            for weekday in range(7):
-                if len(weekday_costs[weekday]) >= 2:
-                    mean_cost = statistics.mean(weekday_costs[weekday])
-                    std_cost = statistics.stdev(weekday_costs[weekday])
-                    weekday_stats[weekday] = {
-                        "mean": mean_cost,
-                        "std": std_cost,
-                        "threshold": 2.0 * std_cost,
+            if self.vectorized:
+                values = timeseries.as_series(costs)
+                weekday_labels = timeseries.weekdays(
+                    [item["date"] for item in historical_data]
+                )
+                counts, means, stds = timeseries.group_stats(values, weekday_labels, 7)
+                weekday_stats = {
+                    weekday: {
+                        "mean": float(means[weekday]),
+                        "std": float(stds[weekday]),
+                        "threshold": 2.0 * float(stds[weekday]),
                     }
+                    for weekday in range(7)
+                    if counts[weekday] >= 2
+                }
+                expected = means[weekday_labels]
+                spread = stds[weekday_labels]
+                with np.errstate(invalid="ignore"):
+                    flagged = (np.abs(values - expected) > 2.0 * spread) & (spread > 0)
+                candidates = np.flatnonzero(flagged).tolist()
+                weekday_labels = weekday_labels.tolist()
+            else:
+                # Group by day of week
+                weekday_costs = [[] for _ in range(7)]
+                weekday_labels = []
+
+                for i, item in enumerate(historical_data):
+                    date = datetime.strptime(item["date"], "%Y-%m-%d")
+                    weekday = date.weekday()
+                    weekday_costs[weekday].append(item["cost"])
+                    weekday_labels.append(weekday)
+                candidates = range(len(historical_data))
+
+                # Calculate expected costs and thresholds for each weekday
+                weekday_stats = {}
+                for weekday in range(7):
+                    if len(weekday_costs[weekday]) >= 2:
+                        mean_cost = statistics.mean(weekday_costs[weekday])
+                        std_cost = statistics.stdev(weekday_costs[weekday])
+                        weekday_stats[weekday] = {
+                            "mean": mean_cost,
+                            "std": std_cost,
+                            "threshold": 2.0 * std_cost,
+                        }
 
             # Check for seasonal anomalies
-            for item in historical_data:
-                date = datetime.strptime(item["date"], "%Y-%m-%d")
-                weekday = date.weekday()
+            for i in candidates:
+                item = historical_data[i]
+                weekday = weekday_labels[i]
 
                 if weekday in weekday_stats:
                     stats = weekday_stats[weekday]
@@ -1093,15 +1463,27 @@ class CostAnalyticsEngine:
             return {"error": "Insufficient data for trend metrics"}
 
         try:
+            if self.vectorized:
+                values = timeseries.as_series(costs)
+
             # Basic statistics
-            total_cost = sum(costs)
-            avg_cost = statistics.mean(costs)
-            min_cost = min(costs)
-            max_cost = max(costs)
+            if self.vectorized:
+                total_cost = float(values.sum())
+                avg_cost = float(values.mean())
+                min_cost = float(values.min())
+                max_cost = float(values.max())
+            else:
+                total_cost = sum(costs)
+                avg_cost = statistics.mean(costs)
+                min_cost = min(costs)
+                max_cost = max(costs)
 
             # Trend direction and strength
-            x = list(range(len(costs)))
-            correlation = self._calculate_correlation(x, costs)
+            if self.vectorized:
+                correlation = float(timeseries.index_correlation(values))
+            else:
+                x = list(range(len(costs)))
+                correlation = self._calculate_correlation(x, costs)
 
             # Determine trend direction
             if correlation > 0.1:
@@ -1128,14 +1510,19 @@ class CostAnalyticsEngine:
 
             # Volatility metrics
             if len(costs) > 1:
-                volatility = statistics.stdev(costs)
+                if self.vectorized:
+                    volatility = float(timeseries.sample_std(values))
+                else:
+                    volatility = statistics.stdev(costs)
                 coefficient_of_variation = volatility / avg_cost if avg_cost > 0 else 0
             else:
                 volatility = 0
                 coefficient_of_variation = 0
 
             # Acceleration (second derivative)
-            if len(costs) >= 3:
+            if self.vectorized:
+                avg_acceleration = float(np.diff(values, 2).mean())
+            elif len(costs) >= 3:
                 # Calculate first differences
                 first_diffs = [costs[i + 1] - costs[i] for i in range(len(costs) - 1)]
                 # Calculate second differences (acceleration)
@@ -1152,8 +1539,12 @@ class CostAnalyticsEngine:
                 recent_period = costs[-3:]  # Last 3 values
                 historical_period = costs[:-3]  # All but last 3
 
-                recent_avg = statistics.mean(recent_period)
-                historical_avg = statistics.mean(historical_period)
+                if self.vectorized:
+                    recent_avg = float(values[-3:].mean())
+                    historical_avg = float(values[:-3].mean())
+                else:
+                    recent_avg = statistics.mean(recent_period)
+                    historical_avg = statistics.mean(historical_period)
 
                 recent_vs_historical = (
                     ((recent_avg - historical_avg) / historical_avg * 100)
@@ -1192,6 +1583,9 @@ class CostAnalyticsEngine:
         if len(costs) < 10:
             return []
 
+        if self.vectorized:
+            return self._detect_change_points_batch([costs], [dates])[0]
+
         try:
             change_points = []
             window_size = max(3, len(costs) // 10)  # Adaptive window size
@@ -1217,26 +1611,10 @@ class CostAnalyticsEngine:
                         t_stat = mean_diff / (pooled_std * (2 / window_size) ** 0.5)
 
                         if t_stat > threshold:
-                            change_type = (
-                                "increase" if after_mean > before_mean else "decrease"
-                            )
-                            magnitude = abs(after_mean - before_mean)
-                            relative_magnitude = (
-                                magnitude / before_mean * 100 if before_mean > 0 else 0
-                            )
-
                             change_points.append(
-                                {
-                                    "date": dates[i].strftime("%Y-%m-%d"),
-                                    "index": i,
-                                    "type": change_type,
-                                    "before_mean": before_mean,
-                                    "after_mean": after_mean,
-                                    "magnitude": magnitude,
-                                    "relative_magnitude_pct": relative_magnitude,
-                                    "significance": t_stat,
-                                    "description": f"Significant {change_type} of {relative_magnitude:.1f}%",
-                                }
+                                self._change_point(
+                                    dates, i, before_mean, after_mean, t_stat
+                                )
                             )
 
             # Sort by significance and return top change points
@@ -1247,22 +1625,126 @@ class CostAnalyticsEngine:
             self.logger.error(f"Error detecting change points: {e}")
             return []
 
+    def _detect_change_points_batch(
+        self, series: List[List[float]], series_dates: List[List[datetime]]
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Detect change points in several series, stacking those of equal length.
+
+        Window means and variances come from cumulative sums, so each series
+        is scanned in O(n) regardless of the window size. Returns one result
+        per series, in order, identical to calling _detect_change_points().
+        """
+        if not self.vectorized:
+            return [
+                self._detect_change_points(costs, dates)
+                for costs, dates in zip(series, series_dates)
+            ]
+
+        results = [[] for _ in series]
+        by_length = {}
+        for index, costs in enumerate(series):
+            if len(costs) >= 10:
+                by_length.setdefault(len(costs), []).append(index)
+
+        threshold = 1.5  # Standard deviations for significance
+
+        for length, indices in by_length.items():
+            try:
+                window_size = max(3, length // 10)  # Adaptive window size
+                values = timeseries.as_series([series[i] for i in indices])
+                means, variances = timeseries.rolling_mean_var(values, window_size)
+
+                # Windows before and after each candidate index i in
+                # [window_size, length - window_size) start at i - window_size
+                # and i respectively
+                span = length - 2 * window_size
+                before_mean = means[..., :span]
+                after_mean = means[..., window_size : window_size + span]
+                pooled_std = np.sqrt(
+                    (variances[..., :span] + variances[..., window_size:][..., :span])
+                    / 2
+                )
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    t_stats = np.abs(after_mean - before_mean) / (
+                        pooled_std * (2 / window_size) ** 0.5
+                    )
+                significant = (pooled_std > 0) & (t_stats > threshold)
+
+                for row, index in enumerate(indices):
+                    offsets = np.flatnonzero(significant[row])
+                    # Most significant first, ties in series order
+                    order = np.argsort(-t_stats[row, offsets], kind="stable")
+                    results[index] = [
+                        self._change_point(
+                            series_dates[index],
+                            offset + window_size,
+                            float(before_mean[row, offset]),
+                            float(after_mean[row, offset]),
+                            float(t_stats[row, offset]),
+                        )
+                        for offset in offsets[order[:10]].tolist()
+                    ]
+
+            except Exception as e:
+                self.logger.error(f"Error detecting change points: {e}")
+                for index in indices:
+                    results[index] = []
+
+        return results
+
+    def _change_point(
+        self,
+        dates: List[datetime],
+        index: int,
+        before_mean: float,
+        after_mean: float,
+        t_stat: float,
+    ) -> Dict[str, Any]:
+        """Describe a change point at the given index."""
+        change_type = "increase" if after_mean > before_mean else "decrease"
+        magnitude = abs(after_mean - before_mean)
+        relative_magnitude = magnitude / before_mean * 100 if before_mean > 0 else 0
+
+        return {
+            "date": dates[index].strftime("%Y-%m-%d"),
+            "index": index,
+            "type": change_type,
+            "before_mean": before_mean,
+            "after_mean": after_mean,
+            "magnitude": magnitude,
+            "relative_magnitude_pct": relative_magnitude,
+            "significance": t_stat,
+            "description": f"Significant {change_type} of {relative_magnitude:.1f}%",
+        }
+
     def _analyze_volatility(self, costs: List[float]) -> Dict[str, Any]:
         """Analyze cost volatility patterns."""
         if len(costs) < 3:
             return {"error": "Insufficient data for volatility analysis"}
 
         try:
+            if self.vectorized:
+                values = timeseries.as_series(costs)
+
             # Basic volatility metrics
-            avg_cost = statistics.mean(costs)
-            std_dev = statistics.stdev(costs) if len(costs) > 1 else 0
+            if self.vectorized:
+                avg_cost = float(values.mean())
+                std_dev = float(timeseries.sample_std(values))
+            else:
+                avg_cost = statistics.mean(costs)
+                std_dev = statistics.stdev(costs) if len(costs) > 1 else 0
             coefficient_of_variation = std_dev / avg_cost if avg_cost > 0 else 0
 
             # Rolling volatility (if enough data)
             rolling_volatilities = []
             window_size = min(7, len(costs) // 3)
 
-            if window_size >= 3:
+            if window_size >= 3 and self.vectorized:
+                _, variances = timeseries.rolling_mean_var(values, window_size)
+                rolling_stds = np.sqrt(variances)
+                rolling_volatilities = rolling_stds.tolist()
+            elif window_size >= 3:
                 for i in range(window_size, len(costs) + 1):
                     window_costs = costs[i - window_size : i]
                     if len(window_costs) > 1:
@@ -1271,8 +1753,13 @@ class CostAnalyticsEngine:
 
             # Volatility trend
             if len(rolling_volatilities) >= 3:
-                x = list(range(len(rolling_volatilities)))
-                volatility_trend = self._calculate_correlation(x, rolling_volatilities)
+                if self.vectorized:
+                    volatility_trend = float(timeseries.index_correlation(rolling_stds))
+                else:
+                    x = list(range(len(rolling_volatilities)))
+                    volatility_trend = self._calculate_correlation(
+                        x, rolling_volatilities
+                    )
 
                 if volatility_trend > 0.2:
                     volatility_trend_desc = "increasing"
@@ -1285,15 +1772,28 @@ class CostAnalyticsEngine:
                 volatility_trend_desc = "unknown"
 
             # High volatility periods
-            if rolling_volatilities:
+            if rolling_volatilities and self.vectorized:
+                avg_volatility = float(rolling_stds.mean())
+                high_volatility_periods = int(
+                    (rolling_stds > avg_volatility * 1.5).sum()
+                )
+            elif rolling_volatilities:
                 avg_volatility = statistics.mean(rolling_volatilities)
                 high_volatility_threshold = avg_volatility * 1.5
                 high_volatility_periods = len(
                     [v for v in rolling_volatilities if v > high_volatility_threshold]
                 )
             else:
+                avg_volatility = 0
                 high_volatility_periods = 0
 
+            if self.vectorized:
+                min_cost = float(values.min())
+                max_cost = float(values.max())
+            else:
+                min_cost = min(costs)
+                max_cost = max(costs)
+
             # Volatility classification
             if coefficient_of_variation < 0.1:
                 volatility_level = "low"
@@ -1309,16 +1809,14 @@ class CostAnalyticsEngine:
                 "coefficient_of_variation": coefficient_of_variation,
                 "volatility_level": volatility_level,
                 "rolling_volatilities": rolling_volatilities,
-                "average_rolling_volatility": (
-                    statistics.mean(rolling_volatilities) if rolling_volatilities else 0
-                ),
+                "average_rolling_volatility": avg_volatility,
                 "volatility_trend": volatility_trend,
                 "volatility_trend_description": volatility_trend_desc,
                 "high_volatility_periods": high_volatility_periods,
                 "total_periods": len(rolling_volatilities),
-                "min_cost": min(costs),
-                "max_cost": max(costs),
-                "cost_range": max(costs) - min(costs),
+                "min_cost": min_cost,
+                "max_cost": max_cost,
+                "cost_range": max_cost - min_cost,
             }
 
         except Exception as e:
@@ -0,0 +1,259 @@
+"""
+Vectorized Time-Series Kernels
+==============================
+
+NumPy building blocks for CostAnalyticsEngine. Every kernel works along the
+last axis, so a single call can process one series (1-D) or a batch of
+equal-length series stacked into a 2-D array (one row per service).
+
+Rolling windows are computed from prefix sums instead of re-slicing the
+series for every index, which turns the O(n * window) loops of the list
+implementation into O(n) passes. Prefix sums are taken over mean-shifted
+values to limit cancellation, and windows whose values are all identical
+report an exact zero variance, as statistics.variance does.
+
+These kernels require NumPy; CostAnalyticsEngine keeps its pure-Python
+implementations for environments without it.
+"""
+
+from typing import Optional, Tuple
+
+try:
+    import numpy as np
+
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    np = None
+
+try:
+    from scipy.signal import lfilter
+except ImportError:
+    lfilter = None
+
+
+def as_series(values) -> "np.ndarray":
+    """Return values as a float array."""
+    return np.asarray(values, dtype=float)
+
+
+def _prefix_sums(values: "np.ndarray", squares: bool = False):
+    """Return prefix sums of mean-shifted values, with a leading zero."""
+    shift = values.mean(axis=-1, keepdims=True)
+    centered = values - shift
+    pad = [(0, 0)] * (values.ndim - 1) + [(1, 0)]
+    sums = np.pad(np.cumsum(centered, axis=-1), pad)
+    if not squares:
+        return shift, sums, None
+    square_sums = np.pad(np.cumsum(centered * centered, axis=-1), pad)
+    return shift, sums, square_sums
+
+
+def _is_constant(values: "np.ndarray") -> "np.ndarray":
+    """Whether every value along the last axis equals the first one."""
+    return (values == values[..., :1]).all(axis=-1)
+
+
+def sample_variance(values: "np.ndarray") -> "np.ndarray":
+    """Sample variance (ddof=1) along the last axis, exactly 0 if constant."""
+    return np.where(_is_constant(values), 0.0, np.var(values, axis=-1, ddof=1))
+
+
+def sample_std(values: "np.ndarray") -> "np.ndarray":
+    """Sample standard deviation (ddof=1) along the last axis, exactly 0 if constant."""
+    return np.sqrt(sample_variance(values))
+
+
+def centered_mean(values: "np.ndarray", window_size: int) -> "np.ndarray":
+    """
+    Mean of a window centred on each point, truncated at the series edges.
+
+    Point i averages values[max(0, i - w // 2) : min(n, i + w // 2 + 1)].
+    """
+    n = values.shape[-1]
+    half = window_size // 2
+    index = np.arange(n)
+    lower = np.maximum(0, index - half)
+    upper = np.minimum(n, index + half + 1)
+
+    shift, sums, _ = _prefix_sums(values)
+    window_sums = np.take(sums, upper, axis=-1) - np.take(sums, lower, axis=-1)
+    return shift + window_sums / (upper - lower)
+
+
+def phase_mean(values: "np.ndarray", period: int) -> "np.ndarray":
+    """
+    Replace each point with the mean of all points sharing its phase.
+
+    Point i becomes the mean of values[i % period :: period].
+    """
+    n = values.shape[-1]
+    cycles = -(-n // period)
+    padded = np.zeros(values.shape[:-1] + (cycles * period,))
+    padded[..., :n] = values
+    totals = padded.reshape(values.shape[:-1] + (cycles, period)).sum(axis=-2)
+    phases = np.arange(n) % period
+    counts = np.bincount(phases, minlength=period)
+    return np.take(totals / counts, phases, axis=-1)
+
+
+def rolling_mean_var(
+    values: "np.ndarray", window_size: int
+) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Mean and sample variance of every full window.
+
+    Entry s describes values[..., s : s + window_size], for s in
+    0 .. n - window_size. The variance comes from cumulative sums of the
+    values and their squares.
+    """
+    n = values.shape[-1]
+    shift, sums, square_sums = _prefix_sums(values, squares=True)
+    lower = np.arange(n - window_size + 1)
+    upper = lower + window_size
+
+    window_sums = np.take(sums, upper, axis=-1) - np.take(sums, lower, axis=-1)
+    window_squares = np.take(square_sums, upper, axis=-1) - np.take(
+        square_sums, lower, axis=-1
+    )
+    means = shift + window_sums / window_size
+    variances = (window_squares - window_sums * window_sums / window_size) / (
+        window_size - 1
+    )
+    variances = np.maximum(variances, 0.0)
+
+    # A window holding a single repeated value has no spread at all
+    changes = np.pad(
+        np.cumsum(values[..., 1:] != values[..., :-1], axis=-1),
+        [(0, 0)] * (values.ndim - 1) + [(1, 0)],
+    )
+    constant = np.take(changes, upper - 1, axis=-1) == np.take(changes, lower, axis=-1)
+    variances[constant] = 0.0
+    return means, variances
+
+
+def index_correlation(values: "np.ndarray") -> "np.ndarray":
+    """Pearson correlation of each series with its index 0 .. n - 1."""
+    n = values.shape[-1]
+    x = np.arange(n, dtype=float)
+    x -= x.mean()
+    y = values - values.mean(axis=-1, keepdims=True)
+    numerator = (y * x).sum(axis=-1)
+    denominator = np.sqrt((x * x).sum() * (y * y).sum(axis=-1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Same cut-off as the n * sum(xy) - sum(x) * sum(y) formulation
+        correlation = np.where(n * denominator < 1e-10, 0.0, numerator / denominator)
+    return correlation
+
+
+def correlation(x: "np.ndarray", y: "np.ndarray") -> float:
+    """Pearson correlation coefficient of two 1-D series, 0.0 if undefined."""
+    if len(x) != len(y) or len(x) < 2:
+        return 0.0
+    dx = x - x.mean()
+    dy = y - y.mean()
+    denominator = float(np.sqrt((dx * dx).sum() * (dy * dy).sum()))
+    if len(x) * denominator < 1e-10:
+        return 0.0
+    return float((dx * dy).sum() / denominator)
+
+
+def group_stats(
+    values: "np.ndarray", groups: "np.ndarray", n_groups: int
+) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+    """
+    Count, mean and sample standard deviation of a 1-D series per group.
+
+    Groups are integer labels in 0 .. n_groups - 1. Means are NaN for empty
+    groups and standard deviations are NaN for groups with fewer than two
+    values. Groups holding a single repeated value have a standard deviation
+    of exactly 0.
+    """
+    counts = np.bincount(groups, minlength=n_groups)
+    totals = np.bincount(groups, weights=values, minlength=n_groups)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = totals / counts
+        deviations = values - means[groups]
+        squares = np.bincount(
+            groups, weights=deviations * deviations, minlength=n_groups
+        )
+        stds = np.sqrt(squares / (counts - 1))
+
+    labels, first_index = np.unique(groups, return_index=True)
+    first_value = np.zeros(n_groups)
+    first_value[labels] = values[first_index]
+    differing = np.bincount(
+        groups, weights=values != first_value[groups], minlength=n_groups
+    )
+    stds[differing == 0] = 0.0
+    stds[counts < 2] = np.nan
+    return counts, means, stds
+
+
+def exponential_smoothing(values: "np.ndarray", alpha: float) -> "np.ndarray":
+    """
+    Simple exponential smoothing seeded with the first value.
+
+    s[0] = x[0] and s[i] = alpha * x[i] + (1 - alpha) * s[i - 1].
+    """
+    if values.shape[-1] < 2:
+        return values.copy()
+
+    decay = 1.0 - alpha
+    if lfilter is not None:
+        first = values[..., :1]
+        rest = lfilter(
+            [alpha], [1.0, -decay], values[..., 1:], axis=-1, zi=decay * first
+        )[0]
+        return np.concatenate([first, rest], axis=-1)
+
+    smoothed = np.empty_like(values)
+    smoothed[..., 0] = values[..., 0]
+    for i in range(1, values.shape[-1]):
+        smoothed[..., i] = alpha * values[..., i] + decay * smoothed[..., i - 1]
+    return smoothed
+
+
+def day_offsets(dates) -> "np.ndarray":
+    """Whole days elapsed since the first datetime, as timedelta.days counts them."""
+    base = dates[0]
+    return np.fromiter(
+        ((date - base).days for date in dates), dtype=float, count=len(dates)
+    )
+
+
+def weekdays(dates) -> "np.ndarray":
+    """Weekday (Monday=0) of each date, given datetimes or ISO date strings."""
+    if dates and isinstance(dates[0], str):
+        days = np.asarray(dates, dtype="datetime64[D]").astype(np.int64)
+        # 1970-01-01 was a Thursday
+        return (days + 3) % 7
+    # Converting datetime objects to datetime64 is far slower than ordinals
+    ordinals = np.fromiter(
+        (date.toordinal() for date in dates), dtype=np.int64, count=len(dates)
+    )
+    # Ordinal 1 (0001-01-01) was a Monday
+    return (ordinals - 1) % 7
+
+
+def days_of_month(dates) -> "np.ndarray":
+    """Day of the month (1-31) of each datetime."""
+    return np.fromiter((date.day for date in dates), dtype=np.int64, count=len(dates))
+
+
+def first_seen_order(groups: "np.ndarray", present: Optional["np.ndarray"] = None):
+    """
+    Group labels in the order they first appear in the series.
+
+    Args:
+        groups: Integer group label of each point.
+        present: Optional boolean mask of groups to keep.
+
+    Returns:
+        List of group labels.
+    """
+    labels, first_index = np.unique(groups, return_index=True)
+    ordered = labels[np.argsort(first_index, kind="stable")]
+    if present is not None:
+        ordered = ordered[present[ordered]]
+    return ordered.tolist()
@@ -1,22 +1,29 @@
 """
 Caching layer for the Logs API to improve performance.
 
-This module provides in-memory caching for frequently accessed data
-and implements cache invalidation strategies.
+This module caches frequently accessed data on the shared application cache
+(leadfactory.cache) and implements tag-based invalidation strategies.
 """
 
 import hashlib
 import json
-import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
-from threading import Lock
-from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Optional
 
+from leadfactory.cache import CacheBackend, TieredCache, get_shared_backend
 from leadfactory.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Tag carried by every cached logs query result
+LOGS_QUERY_TAG = "logs_query"
+
+
+def _utc_timestamp() -> float:
+    """Current UTC time in seconds, used as the cache clock."""
+    return datetime.utcnow().replace(tzinfo=timezone.utc).timestamp()
+
 
 @dataclass
 class CacheEntry:
@@ -43,35 +50,50 @@ class CacheEntry:
 
 class LogsAPICache:
     """
-    In-memory cache for the Logs API with TTL and LRU eviction.
+    Cache for the Logs API with TTL, LRU eviction and tag invalidation.
 
     Features:
     - Time-based expiration (TTL)
-    - LRU eviction when memory limit is reached
+    - O(1) LRU eviction when the entry limit is reached
     - Query result caching with cache key generation
+    - Tag-based invalidation by key prefix
+    - Optional shared tier so gunicorn workers share results
     - Statistics and cache hit/miss tracking
     """
 
-    def __init__(self, max_entries: int = 1000, default_ttl: int = 300):
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        default_ttl: int = 300,
+        backend: Optional[CacheBackend] = None,
+    ):
         """
         Initialize the cache.
 
         Args:
             max_entries: Maximum number of entries to store
             default_ttl: Default TTL in seconds (5 minutes)
+            backend: Shared cache tier, or None to cache in process only
         """
         self.max_entries = max_entries
         self.default_ttl = default_ttl
-        self.cache: dict[str, CacheEntry] = {}
-        self.lock = Lock()
-
-        # Statistics
-        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired_cleanups": 0}
+        self.store = TieredCache(
+            "logs_api",
+            max_entries=max_entries,
+            default_ttl=default_ttl,
+            backend=backend,
+            clock=_utc_timestamp,
+        )
 
         logger.info(
             f"Cache initialized with max_entries={max_entries}, default_ttl={default_ttl}s"
         )
 
+    @property
+    def cache(self) -> dict[str, Any]:
+        """Entries held in process, least recently used first."""
+        return self.store.entries
+
     def _generate_cache_key(self, prefix: str, **kwargs) -> str:
         """Generate a cache key from parameters."""
         # Sort kwargs to ensure consistent key generation
@@ -80,85 +102,50 @@ class LogsAPICache:
         hash_obj = hashlib.md5(params_str.encode(), usedforsecurity=False)  # nosec
         return f"{prefix}:{hash_obj.hexdigest()}"
 
-    def _evict_lru(self):
-        """Evict least recently used entries."""
-        if len(self.cache) <= self.max_entries:
-            return
-
-        # Sort by last accessed time (oldest first)
-        sorted_entries = sorted(
-            self.cache.items(), key=lambda x: x[1].last_accessed or x[1].created_at
-        )
-
-        # Remove oldest entries until we're under the limit
-        entries_to_remove = len(self.cache) - self.max_entries + 1
-        for i in range(entries_to_remove):
-            key, _ = sorted_entries[i]
-            del self.cache[key]
-            self.stats["evictions"] += 1
-
-        logger.debug(f"Evicted {entries_to_remove} LRU entries")
-
-    def _cleanup_expired(self):
-        """Remove expired entries from cache."""
-        datetime.utcnow()
-        expired_keys = []
-
-        for key, entry in self.cache.items():
-            if entry.is_expired():
-                expired_keys.append(key)
-
-        for key in expired_keys:
-            del self.cache[key]
-            self.stats["expired_cleanups"] += 1
-
-        if expired_keys:
-            logger.debug(f"Cleaned up {len(expired_keys)} expired entries")
-
     def get(self, key: str) -> Optional[Any]:
         """Get a value from cache."""
-        with self.lock:
-            entry = self.cache.get(key)
+        return self.store.get(key)
 
-            if entry is None:
-                self.stats["misses"] += 1
-                return None
-
-            if entry.is_expired():
-                del self.cache[key]
-                self.stats["misses"] += 1
-                self.stats["expired_cleanups"] += 1
-                return None
-
-            self.stats["hits"] += 1
-            return entry.access()
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Set a value in cache.
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set a value in cache."""
-        with self.lock:
-            ttl = ttl if ttl is not None else self.default_ttl
+        Entries are tagged with their key prefix (the part before the first
+        ``:``) unless tags are given.
+        """
+        if tags is None:
+            tags = (key.split(":", 1)[0],)
+        self.store.set(key, value, ttl, tags)
 
-            self.cache[key] = CacheEntry(
-                data=value, created_at=datetime.utcnow(), ttl_seconds=ttl
-            )
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = None,
+        tags: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """Get a value from cache, computing it once on a miss.
 
-            # Cleanup and eviction
-            self._cleanup_expired()
-            self._evict_lru()
+        Concurrent misses for the key, in this process or other workers,
+        wait for a single computation. Entries are tagged like set().
+        """
+        if tags is None:
+            tags = (key.split(":", 1)[0],)
+        return self.store.get_or_set(key, compute, ttl, tags)
 
     def delete(self, key: str) -> bool:
         """Delete a specific key from cache."""
-        with self.lock:
-            if key in self.cache:
-                del self.cache[key]
-                return True
-            return False
+        return self.store.delete(key)
 
     def clear(self):
         """Clear all cache entries."""
-        with self.lock:
-            self.cache.clear()
-            logger.info("Cache cleared")
+        self.store.clear()
+        logger.info("Cache cleared")
 
     def get_logs_with_filters(
         self,
@@ -174,7 +161,7 @@ class LogsAPICache:
     ) -> Optional[tuple[list[dict[str, Any]], int]]:
         """Get cached logs query result."""
         cache_key = self._generate_cache_key(
-            "logs_query",
+            LOGS_QUERY_TAG,
             business_id=business_id,
             log_type=log_type,
             start_date=start_date.isoformat() if start_date else None,
@@ -204,7 +191,7 @@ class LogsAPICache:
     ) -> None:
         """Cache logs query result."""
         cache_key = self._generate_cache_key(
-            "logs_query",
+            LOGS_QUERY_TAG,
             business_id=business_id,
             log_type=log_type,
             start_date=start_date.isoformat() if start_date else None,
@@ -224,6 +211,61 @@ class LogsAPICache:
 
         self.set(cache_key, result, ttl)
 
+    def get_logs_page(
+        self, cursor: Optional[str], **filters: Any
+    ) -> Optional[tuple[list[dict[str, Any]], Optional[str]]]:
+        """Get a cached keyset page as (logs, next cursor)."""
+        return self.get(
+            self._generate_cache_key(LOGS_QUERY_TAG, cursor=cursor, **filters)
+        )
+
+    def set_logs_page(
+        self,
+        result: tuple[list[dict[str, Any]], Optional[str]],
+        cursor: Optional[str],
+        ttl: Optional[int] = None,
+        **filters: Any,
+    ) -> None:
+        """Cache a keyset page as (logs, next cursor)."""
+        cache_key = self._generate_cache_key(LOGS_QUERY_TAG, cursor=cursor, **filters)
+        self.set(cache_key, result, self._logs_page_ttl(ttl, filters))
+
+    def get_or_set_logs_page(
+        self,
+        cursor: Optional[str],
+        fetch: Callable[[], tuple[list[dict[str, Any]], Optional[str]]],
+        ttl: Optional[int] = None,
+        **filters: Any,
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        """Get a keyset page as (logs, next cursor), fetching it once on a miss."""
+        cache_key = self._generate_cache_key(LOGS_QUERY_TAG, cursor=cursor, **filters)
+        return self.get_or_set(cache_key, fetch, self._logs_page_ttl(ttl, filters))
+
+    @staticmethod
+    def _logs_page_ttl(ttl: Optional[int], filters: dict[str, Any]) -> Optional[int]:
+        if filters.get("search_query"):
+            return ttl or 60  # 1 minute for search results
+        return ttl
+
+    def get_logs_count(self, **filters: Any) -> Optional[int]:
+        """Get a cached approximate count of logs matching the filters."""
+        return self.get(self._generate_cache_key("logs_count", **filters))
+
+    def set_logs_count(self, count: int, ttl: Optional[int] = None, **filters: Any):
+        """Cache an approximate count of logs matching the filters."""
+        # Counts are estimates anyway, so they can be reused for longer
+        ttl = ttl or 300  # 5 minutes
+        self.set(self._generate_cache_key("logs_count", **filters), count, ttl)
+
+    def get_or_set_logs_count(
+        self, fetch: Callable[[], int], ttl: Optional[int] = None, **filters: Any
+    ) -> int:
+        """Get an approximate count of matching logs, fetching it once on a miss."""
+        ttl = ttl or 300  # 5 minutes
+        return self.get_or_set(
+            self._generate_cache_key("logs_count", **filters), fetch, ttl
+        )
+
     def get_log_statistics(self) -> Optional[dict[str, Any]]:
         """Get cached log statistics."""
         return self.get("log_statistics")
@@ -247,36 +289,50 @@ class LogsAPICache:
         ttl = ttl or 900  # 15 minutes
         self.set("businesses_with_logs", businesses, ttl)
 
+    def invalidate_tags(self, *tags: str) -> int:
+        """Invalidate every entry carrying any of the tags; return the count."""
+        count = self.store.invalidate_tags(*tags)
+        if count:
+            logger.info(f"Invalidated {count} cache entries tagged {', '.join(tags)}")
+        return count
+
     def invalidate_pattern(self, pattern: str):
-        """Invalidate cache entries matching a pattern."""
-        with self.lock:
-            keys_to_delete = [key for key in self.cache if pattern in key]
-            for key in keys_to_delete:
-                del self.cache[key]
+        """Invalidate cache entries matching a pattern.
 
-            if keys_to_delete:
-                logger.info(
-                    f"Invalidated {len(keys_to_delete)} cache entries matching pattern: {pattern}"
-                )
+        A pattern naming a tag, such as ``logs_query``, is invalidated through
+        the tag index. Any other pattern falls back to deleting in-process
+        keys that contain it.
+        """
+        if self.invalidate_tags(pattern):
+            return
+
+        keys_to_delete = [key for key in list(self.cache) if pattern in key]
+        for key in keys_to_delete:
+            self.store.delete(key)
+
+        if keys_to_delete:
+            logger.info(
+                f"Invalidated {len(keys_to_delete)} cache entries matching pattern: {pattern}"
+            )
 
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        with self.lock:
-            total_requests = self.stats["hits"] + self.stats["misses"]
-            hit_rate = (self.stats["hits"] / max(total_requests, 1)) * 100
-
-            return {
-                "size": len(self.cache),
-                "max_entries": self.max_entries,
-                "hit_rate": round(hit_rate, 2),
-                "total_hits": self.stats["hits"],
-                "total_misses": self.stats["misses"],
-                "total_evictions": self.stats["evictions"],
-                "expired_cleanups": self.stats["expired_cleanups"],
-                "memory_usage_percent": round(
-                    (len(self.cache) / self.max_entries) * 100, 2
-                ),
-            }
+        stats = self.store.get_stats()
+        return {
+            "size": stats["size"],
+            "max_entries": self.max_entries,
+            "hit_rate": round(stats["hit_rate"] * 100, 2),
+            "hits": stats["hits"],
+            "misses": stats["misses"],
+            "shared_hits": stats["shared_hits"],
+            "total_hits": stats["hits"],
+            "total_misses": stats["misses"],
+            "total_evictions": stats["evictions"],
+            "expired_cleanups": stats["expired"],
+            "invalidations": stats["invalidations"],
+            "shared": stats["shared"],
+            "memory_usage_percent": round((stats["size"] / self.max_entries) * 100, 2),
+        }
 
 
 # Global cache instance
@@ -284,10 +340,10 @@ _cache_instance = None
 
 
 def get_cache() -> LogsAPICache:
-    """Get the global cache instance."""
+    """Get the global cache instance, backed by the shared cache tier."""
     global _cache_instance
     if _cache_instance is None:
-        _cache_instance = LogsAPICache()
+        _cache_instance = LogsAPICache(backend=get_shared_backend())
     return _cache_instance
 
 
@@ -1,22 +1,25 @@
 """
 Cache management for API responses and frequently accessed data.
 
-Provides multi-level caching with Redis and in-memory caches for
-optimal performance.
+Provides multi-level caching on the shared application cache
+(leadfactory.cache): an in-process LRU tier in front of Redis when it is
+reachable, or the local SQLite shared tier otherwise.
 """
 
 import hashlib
-import json
 import logging
-import pickle
 import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 from functools import wraps
-from typing import Any, Callable, Dict, Optional, Union
+from typing import Any, Callable, Optional
 
-import redis
-from redis.exceptions import RedisError
+from leadfactory.cache import (
+    RedisCacheBackend,
+    TieredCache,
+    get_shared_backend,
+)
+from leadfactory.cache.backends import REDIS_AVAILABLE, RedisError
 
 logger = logging.getLogger(__name__)
 
@@ -52,89 +55,38 @@ class CacheManager:
     def __init__(self, config: CacheConfig = None):
         """Initialize cache manager."""
         self.config = config or CacheConfig()
-        self._memory_cache = {}
-        self._cache_stats = {"hits": 0, "misses": 0, "errors": 0, "evictions": 0}
-
-        # Initialize Redis connection
-        try:
-            self.redis_client = redis.from_url(
-                self.config.redis_url,
-                decode_responses=False,  # We'll handle encoding/decoding
-            )
-            self.redis_client.ping()
-            self.redis_available = True
-            logger.info("Redis cache connected successfully")
-        except (RedisError, Exception) as e:
-            logger.warning(f"Redis not available, using memory cache only: {e}")
-            self.redis_client = None
-            self.redis_available = False
+
+        # Prefer Redis as the shared tier, falling back to the local shared tier
+        backend = None
+        if REDIS_AVAILABLE:
+            try:
+                backend = RedisCacheBackend(
+                    self.config.redis_url, self.config.key_prefix
+                )
+                logger.info("Redis cache connected successfully")
+            except (RuntimeError, RedisError, OSError) as e:
+                logger.warning(f"Redis not available, using local shared cache: {e}")
+        if backend is None:
+            backend = get_shared_backend()
+
+        self.redis_available = isinstance(backend, RedisCacheBackend)
+        self.redis_client = backend.client if self.redis_available else None
+        self.cache = TieredCache(
+            self.config.key_prefix,
+            max_entries=self.config.max_memory_items,
+            default_ttl=self.config.default_ttl,
+            backend=backend,
+        )
 
     def _generate_key(self, key: str, namespace: Optional[str] = None) -> str:
         """Generate a namespaced cache key."""
-        parts = [self.config.key_prefix]
         if namespace:
-            parts.append(namespace)
-        parts.append(key)
-        return ":".join(parts)
-
-    def _serialize(self, value: Any) -> bytes:
-        """Serialize value for storage."""
-        try:
-            # Try JSON first (more portable)
-            return json.dumps(value).encode("utf-8")
-        except (TypeError, ValueError):
-            # Fall back to pickle for complex objects
-            return pickle.dumps(value)
-
-    def _deserialize(self, data: bytes) -> Any:
-        """Deserialize value from storage."""
-        if not data:
-            return None
-
-        try:
-            # Try JSON first
-            return json.loads(data.decode("utf-8"))
-        except (json.JSONDecodeError, UnicodeDecodeError):
-            # Fall back to pickle
-            return pickle.loads(data)
+            return f"{namespace}:{key}"
+        return key
 
     def get(self, key: str, namespace: Optional[str] = None) -> Optional[Any]:
         """Get value from cache."""
-        full_key = self._generate_key(key, namespace)
-
-        # Check memory cache first
-        if full_key in self._memory_cache:
-            entry = self._memory_cache[full_key]
-            if entry["expires_at"] > time.time():
-                self._cache_stats["hits"] += 1
-                logger.debug(f"Memory cache hit: {full_key}")
-                return entry["value"]
-            else:
-                # Expired, remove from memory
-                del self._memory_cache[full_key]
-
-        # Check Redis if available
-        if self.redis_available:
-            try:
-                data = self.redis_client.get(full_key)
-                if data:
-                    value = self._deserialize(data)
-
-                    # Store in memory cache for faster subsequent access
-                    ttl = self.redis_client.ttl(full_key)
-                    if ttl > 0:
-                        self._store_in_memory(full_key, value, ttl)
-
-                    self._cache_stats["hits"] += 1
-                    logger.debug(f"Redis cache hit: {full_key}")
-                    return value
-            except RedisError as e:
-                logger.warning(f"Redis get error: {e}")
-                self._cache_stats["errors"] += 1
-
-        self._cache_stats["misses"] += 1
-        logger.debug(f"Cache miss: {full_key}")
-        return None
+        return self.cache.get(self._generate_key(key, namespace))
 
     def set(
         self,
@@ -145,111 +97,63 @@ class CacheManager:
         cache_type: Optional[str] = None,
     ) -> bool:
         """Set value in cache."""
-        full_key = self._generate_key(key, namespace)
-
-        # Determine TTL
-        if ttl is None:
-            if cache_type and cache_type in self.config.ttl_configs:
-                ttl = self.config.ttl_configs[cache_type]
-            else:
-                ttl = self.config.default_ttl
-
-        # Store in memory cache
-        self._store_in_memory(full_key, value, ttl)
-
-        # Store in Redis if available
-        if self.redis_available:
-            try:
-                serialized = self._serialize(value)
-                self.redis_client.setex(full_key, ttl, serialized)
-                logger.debug(f"Cached {full_key} with TTL {ttl}s")
-                return True
-            except RedisError as e:
-                logger.warning(f"Redis set error: {e}")
-                self._cache_stats["errors"] += 1
-
+        self.cache.set(
+            self._generate_key(key, namespace),
+            value,
+            self._resolve_ttl(ttl, cache_type),
+            self._tags(namespace, cache_type),
+        )
         return True
 
-    def _store_in_memory(self, key: str, value: Any, ttl: int):
-        """Store value in memory cache with eviction if needed."""
-        # Evict oldest entries if at capacity
-        if len(self._memory_cache) >= self.config.max_memory_items:
-            # Find and remove oldest entry
-            oldest_key = min(
-                self._memory_cache.keys(),
-                key=lambda k: self._memory_cache[k]["created_at"],
-            )
-            del self._memory_cache[oldest_key]
-            self._cache_stats["evictions"] += 1
-
-        self._memory_cache[key] = {
-            "value": value,
-            "created_at": time.time(),
-            "expires_at": time.time() + ttl,
-        }
+    def _resolve_ttl(self, ttl: Optional[int], cache_type: Optional[str]) -> int:
+        """Determine TTL from an explicit value or the cache type."""
+        if ttl is not None:
+            return ttl
+        if cache_type and cache_type in self.config.ttl_configs:
+            return self.config.ttl_configs[cache_type]
+        return self.config.default_ttl
+
+    def _tags(self, namespace: Optional[str], cache_type: Optional[str]) -> list[str]:
+        """Tags for an entry: its namespace and cache type."""
+        tags = []
+        if namespace:
+            tags.append(f"namespace:{namespace}")
+        if cache_type:
+            tags.append(f"type:{cache_type}")
+        return tags
 
     def delete(self, key: str, namespace: Optional[str] = None) -> bool:
         """Delete value from cache."""
-        full_key = self._generate_key(key, namespace)
-
-        # Remove from memory cache
-        if full_key in self._memory_cache:
-            del self._memory_cache[full_key]
-
-        # Remove from Redis
-        if self.redis_available:
-            try:
-                self.redis_client.delete(full_key)
-                return True
-            except RedisError as e:
-                logger.warning(f"Redis delete error: {e}")
-                self._cache_stats["errors"] += 1
-
+        self.cache.delete(self._generate_key(key, namespace))
         return True
 
     def clear_namespace(self, namespace: str) -> int:
         """Clear all keys in a namespace."""
-        pattern = self._generate_key("*", namespace)
-        count = 0
-
-        # Clear from memory cache
-        keys_to_delete = [k for k in self._memory_cache if k.startswith(pattern[:-1])]
-        for key in keys_to_delete:
-            del self._memory_cache[key]
-            count += 1
-
-        # Clear from Redis
-        if self.redis_available:
-            try:
-                cursor = 0
-                while True:
-                    cursor, keys = self.redis_client.scan(
-                        cursor, match=pattern, count=100
-                    )
-                    if keys:
-                        self.redis_client.delete(*keys)
-                        count += len(keys)
-                    if cursor == 0:
-                        break
-            except RedisError as e:
-                logger.warning(f"Redis clear namespace error: {e}")
-                self._cache_stats["errors"] += 1
-
+        count = self.cache.invalidate_tags(f"namespace:{namespace}")
         logger.info(f"Cleared {count} keys from namespace {namespace}")
         return count
 
+    def clear_cache_type(self, cache_type: str) -> int:
+        """Clear all keys cached with a cache type."""
+        count = self.cache.invalidate_tags(f"type:{cache_type}")
+        logger.info(f"Cleared {count} keys of cache type {cache_type}")
+        return count
+
     def get_stats(self) -> dict[str, Any]:
         """Get cache statistics."""
-        total_requests = self._cache_stats["hits"] + self._cache_stats["misses"]
-        hit_rate = (
-            self._cache_stats["hits"] / total_requests if total_requests > 0 else 0
-        )
+        cache_stats = self.cache.get_stats()
+        total_requests = cache_stats["hits"] + cache_stats["misses"]
 
         stats = {
-            **self._cache_stats,
+            "hits": cache_stats["hits"],
+            "misses": cache_stats["misses"],
+            "evictions": cache_stats["evictions"],
+            "invalidations": cache_stats["invalidations"],
+            "shared_hits": cache_stats["shared_hits"],
             "total_requests": total_requests,
-            "hit_rate": hit_rate,
-            "memory_cache_size": len(self._memory_cache),
+            "hit_rate": cache_stats["hit_rate"],
+            "memory_cache_size": cache_stats["size"],
+            "shared_cache": cache_stats["shared"],
             "redis_available": self.redis_available,
         }
 
@@ -272,7 +176,11 @@ class CacheManager:
         cache_type: Optional[str] = None,
         key_func: Optional[Callable] = None,
     ):
-        """Decorator for caching function results."""
+        """Decorator for caching function results.
+
+        Concurrent misses for the same arguments share one call of the
+        wrapped function, across threads and worker processes.
+        """
 
         def decorator(func):
             @wraps(func)
@@ -289,16 +197,12 @@ class CacheManager:
                         ":".join(key_parts).encode(), usedforsecurity=False
                     ).hexdigest()
 
-                # Try to get from cache
-                cached_value = self.get(cache_key, namespace)
-                if cached_value is not None:
-                    return cached_value
-
-                # Call function and cache result
-                result = func(*args, **kwargs)
-                self.set(cache_key, result, ttl, namespace, cache_type)
-
-                return result
+                return self.cache.get_or_set(
+                    self._generate_key(cache_key, namespace),
+                    lambda: func(*args, **kwargs),
+                    self._resolve_ttl(ttl, cache_type),
+                    self._tags(namespace, cache_type),
+                )
 
             return wrapper
 
@@ -20,7 +20,7 @@ import threading
 from datetime import datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 from flask import Flask, Response, jsonify, request
 
@@ -32,6 +32,8 @@ except ImportError:
     SOCKETIO_AVAILABLE = False
     SocketIO = None
 
+from leadfactory.analytics.cost_analytics import cost_analytics_engine
+from leadfactory.cache import TieredCache, get_shared_backend
 from leadfactory.cost.cost_aggregation import cost_aggregation_service
 from leadfactory.cost.cost_tracking import cost_tracker
 from leadfactory.utils.logging import get_logger
@@ -58,10 +60,13 @@ class CostBreakdownAPI:
         self._lock = threading.Lock()
         self._clients = set()
 
-        # Cache for frequently accessed data
-        self._cache = {}
-        self._cache_expiry = {}
+        # Cache for frequently accessed data, shared across workers
         self._cache_duration = 300  # 5 minutes
+        self._cache = TieredCache(
+            "cost_breakdown",
+            default_ttl=self._cache_duration,
+            backend=get_shared_backend(),
+        )
 
         # Register routes
         self._register_routes()
@@ -139,6 +144,23 @@ class CostBreakdownAPI:
                 self.logger.error(f"Error in cost trends endpoint: {e}")
                 return jsonify({"error": str(e)}), 500
 
+        @self.app.route("/api/cost/trends/services")
+        def service_cost_trends():
+            """Get trend analysis for every service, or the given services."""
+            try:
+                service_types = request.args.getlist("service_type") or None
+                days_back = int(request.args.get("days_back", 30))
+                forecast_days = int(request.args.get("forecast_days", 7))
+
+                trends = self._get_service_cost_trends(
+                    days_back, forecast_days, service_types
+                )
+                return jsonify(trends)
+
+            except Exception as e:
+                self.logger.error(f"Error in service cost trends endpoint: {e}")
+                return jsonify({"error": str(e)}), 500
+
         @self.app.route("/api/cost/optimization")
         def cost_optimization():
             """Get cost optimization recommendations."""
@@ -246,10 +268,28 @@ class CostBreakdownAPI:
         # Generate cache key
         cache_key = f"breakdown_{service_type}_{time_period}_{operation_type}_{start_date}_{end_date}_{group_by}"
 
-        # Check cache
-        if self._is_cached(cache_key):
-            return self._get_cached(cache_key)
+        return self._get_or_compute(
+            cache_key,
+            lambda: self._compute_cost_breakdown(
+                service_type,
+                time_period,
+                operation_type,
+                start_date,
+                end_date,
+                group_by,
+            ),
+        )
 
+    def _compute_cost_breakdown(
+        self,
+        service_type: Optional[str],
+        time_period: str,
+        operation_type: Optional[str],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        group_by: Optional[List[str]],
+    ) -> Dict[str, Any]:
+        """Query the cost breakdown, bypassing the cache."""
         try:
             conn = sqlite3.connect(cost_tracker.db_path)
             cursor = conn.cursor()
@@ -407,9 +447,6 @@ class CostBreakdownAPI:
                 "generated_at": datetime.now().isoformat(),
             }
 
-            # Cache the result
-            self._cache_result(cache_key, breakdown)
-
             conn.close()
             return breakdown
 
@@ -553,9 +590,42 @@ class CostBreakdownAPI:
         """Get cost trend analysis and predictions."""
 
         cache_key = f"trends_{service_type}_{days_back}_{forecast_days}"
-        if self._is_cached(cache_key):
-            return self._get_cached(cache_key)
+        return self._get_or_compute(
+            cache_key,
+            lambda: self._compute_cost_trends(service_type, days_back, forecast_days),
+        )
+
+    def _get_service_cost_trends(
+        self,
+        days_back: int,
+        forecast_days: int,
+        service_types: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Get trend analysis keyed by service.
 
+        All services are loaded in one query and analyzed together by the
+        cost analytics engine, instead of one trends request per service.
+        """
+        services = ",".join(sorted(service_types)) if service_types else None
+        cache_key = f"trends_services_{services}_{days_back}_{forecast_days}"
+        return self._get_or_compute(
+            cache_key,
+            lambda: {
+                "analysis_period": {"days": days_back},
+                "forecast_days": forecast_days,
+                "services": cost_analytics_engine.analyze_service_cost_trends(
+                    days_back=days_back,
+                    forecast_days=forecast_days,
+                    service_types=service_types,
+                ),
+                "generated_at": datetime.now().isoformat(),
+            },
+        )
+
+    def _compute_cost_trends(
+        self, service_type: Optional[str], days_back: int, forecast_days: int
+    ) -> Dict[str, Any]:
+        """Analyze cost trends, bypassing the cache."""
         try:
             conn = sqlite3.connect(cost_tracker.db_path)
             cursor = conn.cursor()
@@ -628,7 +698,6 @@ class CostBreakdownAPI:
                 "generated_at": datetime.now().isoformat(),
             }
 
-            self._cache_result(cache_key, trends)
             conn.close()
 
             return trends
@@ -794,9 +863,12 @@ class CostBreakdownAPI:
         """Get cost optimization recommendations."""
 
         cache_key = f"optimization_{time_period}"
-        if self._is_cached(cache_key):
-            return self._get_cached(cache_key)
+        return self._get_or_compute(
+            cache_key, lambda: self._compute_optimization_recommendations(time_period)
+        )
 
+    def _compute_optimization_recommendations(self, time_period: str) -> Dict[str, Any]:
+        """Build optimization recommendations, bypassing the cache."""
         try:
             # Get cost breakdown by service
             service_breakdown = self._get_service_breakdown(None, None)
@@ -901,7 +973,6 @@ class CostBreakdownAPI:
                 },
             }
 
-            self._cache_result(cache_key, optimization)
             return optimization
 
         except Exception as e:
@@ -912,9 +983,12 @@ class CostBreakdownAPI:
         """Get budget utilization analysis and forecasting."""
 
         cache_key = f"budget_{year}_{month}"
-        if self._is_cached(cache_key):
-            return self._get_cached(cache_key)
+        return self._get_or_compute(
+            cache_key, lambda: self._compute_budget_utilization(year, month)
+        )
 
+    def _compute_budget_utilization(self, year: int, month: int) -> Dict[str, Any]:
+        """Analyze budget utilization, bypassing the cache."""
         try:
             # Get current month data from cost tracker
             monthly_costs = cost_tracker.get_monthly_costs(year, month)
@@ -1024,7 +1098,6 @@ class CostBreakdownAPI:
                 "generated_at": datetime.now().isoformat(),
             }
 
-            self._cache_result(cache_key, utilization)
             return utilization
 
         except Exception as e:
@@ -1037,9 +1110,15 @@ class CostBreakdownAPI:
         """Get ROI calculations and analysis."""
 
         cache_key = f"roi_{time_period}_{start_date}_{end_date}"
-        if self._is_cached(cache_key):
-            return self._get_cached(cache_key)
+        return self._get_or_compute(
+            cache_key,
+            lambda: self._compute_roi_analysis(time_period, start_date, end_date),
+        )
 
+    def _compute_roi_analysis(
+        self, time_period: str, start_date: Optional[str], end_date: Optional[str]
+    ) -> Dict[str, Any]:
+        """Calculate ROI, bypassing the cache."""
         try:
             # Try to get revenue data from cost aggregation service
             roi_data = {
@@ -1155,7 +1234,6 @@ class CostBreakdownAPI:
                     ],
                 }
 
-            self._cache_result(cache_key, roi_data)
             return roi_data
 
         except Exception as e:
@@ -1166,9 +1244,12 @@ class CostBreakdownAPI:
         """Get comprehensive cost summary dashboard data."""
 
         cache_key = f"summary_{time_period}"
-        if self._is_cached(cache_key):
-            return self._get_cached(cache_key)
+        return self._get_or_compute(
+            cache_key, lambda: self._compute_cost_summary(time_period)
+        )
 
+    def _compute_cost_summary(self, time_period: str) -> Dict[str, Any]:
+        """Build the cost summary, bypassing the cache."""
         try:
             current_date = datetime.now()
 
@@ -1231,7 +1312,6 @@ class CostBreakdownAPI:
                 "generated_at": datetime.now().isoformat(),
             }
 
-            self._cache_result(cache_key, summary)
             return summary
 
         except Exception as e:
@@ -1313,24 +1393,28 @@ class CostBreakdownAPI:
         streaming_thread.start()
         self.logger.info("Cost streaming thread started")
 
-    def _is_cached(self, key: str) -> bool:
-        """Check if data is cached and not expired."""
-        return (
-            key in self._cache
-            and key in self._cache_expiry
-            and datetime.now() < self._cache_expiry[key]
-        )
+    def _get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return a cached report, computing it once on a miss.
+
+        Concurrent requests for the same report, across workers, wait for a
+        single computation. Entries are tagged by report type.
+        """
+        return self._cache.get_or_set(key, compute, tags=[key.split("_", 1)[0]])
 
-    def _get_cached(self, key: str) -> Any:
-        """Get cached data."""
-        return self._cache.get(key)
+    def invalidate_cache(self, *report_types: str) -> int:
+        """Drop cached reports, optionally only the given report types.
 
-    def _cache_result(self, key: str, data: Any):
-        """Cache result with expiry."""
-        self._cache[key] = data
-        self._cache_expiry[key] = datetime.now() + timedelta(
-            seconds=self._cache_duration
-        )
+        Args:
+            report_types: Cache key prefixes such as "breakdown" or "trends"
+
+        Returns:
+            Number of cache entries invalidated
+        """
+        if not report_types:
+            size = self._cache.get_stats()["size"]
+            self._cache.clear()
+            return size
+        return self._cache.invalidate_tags(*report_types)
 
     def get_flask_app(self) -> Flask:
         """Get the Flask app instance."""
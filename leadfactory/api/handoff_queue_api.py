@@ -84,12 +84,13 @@ def bulk_qualify_businesses():
                 400,
             )
 
-        # Perform bulk qualification
+        # Start bulk qualification; progress is polled via /api/handoff/operations
         operation_id = queue_service.bulk_qualify(
             business_ids=business_ids,
             criteria_id=criteria_id,
             performed_by=performed_by,
             force_rescore=force_rescore,
+            run_async=True,
         )
 
         return (
@@ -100,6 +101,7 @@ def bulk_qualify_businesses():
                     "message": f"Bulk qualification started for {len(business_ids)} businesses",
                     "criteria_name": criteria.name,
                     "total_businesses": len(business_ids),
+                    "status_url": f"/api/handoff/operations/{operation_id}",
                 }
             ),
             202,
@@ -0,0 +1,302 @@
+"""
+Streaming writers for log exports.
+
+Each writer consumes an iterable of rows and yields the encoded file in
+chunks of roughly EXPORT_CHUNK_SIZE, so an export holds one chunk and one
+storage batch in memory however many logs it covers. Served as a WSGI
+response body, the generators are pulled only as fast as the client reads,
+which in turn paces the reads from the database cursor.
+"""
+
+import csv
+import io
+import json
+import re
+import zipfile
+import zlib
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional, Union
+from xml.sax.saxutils import escape, quoteattr
+
+# Target size of each chunk handed to the WSGI server
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+# Excel rejects cells longer than this
+XLSX_CELL_LIMIT = 32767
+
+# Control characters that are not allowed anywhere in an XML document
+_XML_ILLEGAL_CHARS = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+_SPREADSHEET_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_RELATIONSHIP_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOCUMENT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        f"{_XML_HEADER}"
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" '
+        'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/'
+        'vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        f'{_XML_HEADER}<Relationships xmlns="{_RELATIONSHIP_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOCUMENT_REL}/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        f'{_XML_HEADER}<Relationships xmlns="{_RELATIONSHIP_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOCUMENT_REL}/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_DOCUMENT_REL}/styles" '
+        'Target="styles.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/styles.xml": (
+        f'{_XML_HEADER}<styleSheet xmlns="{_SPREADSHEET_NS}">'
+        '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/>'
+        "</border></borders>"
+        '<cellStyleXfs count="1">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="1">'
+        '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/></cellXfs>'
+        "</styleSheet>"
+    ),
+}
+
+
+def _coalesce(pieces: Iterable[str], chunk_size: int) -> Iterator[str]:
+    """Join small string pieces into chunks of about chunk_size characters."""
+    buffer = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_csv(
+    rows: Iterable[dict[str, Any]],
+    columns: list[str],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Write rows as CSV, header first.
+
+    Args:
+        rows: Row dictionaries keyed by column name
+        columns: Column names, in output order
+        chunk_size: Approximate size of each yielded chunk
+
+    Yields:
+        CSV text chunks
+    """
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+
+    for row in rows:
+        writer.writerow(row)
+        if output.tell() >= chunk_size:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate()
+
+    if output.tell():
+        yield output.getvalue()
+
+
+def iter_ndjson(
+    records: Iterable[dict[str, Any]], chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Write records as newline-delimited JSON, one object per line."""
+    return _coalesce(
+        (json.dumps(record, default=str) + "\n" for record in records), chunk_size
+    )
+
+
+def iter_json(
+    records: Iterable[dict[str, Any]],
+    header: Optional[dict[str, Any]] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Write records as a single JSON document.
+
+    The document is ``{**header, "logs": [...], "total_logs": N}``. The total
+    is written after the logs, since it is only known once they have all
+    been streamed.
+
+    Args:
+        records: Log records to place in the "logs" array
+        header: Fields written before the "logs" array
+        chunk_size: Approximate size of each yielded chunk
+
+    Yields:
+        JSON text chunks
+    """
+
+    def pieces():
+        yield "{"
+        for key, value in (header or {}).items():
+            yield f"{json.dumps(key)}: {json.dumps(value, default=str)}, "
+        yield '"logs": ['
+
+        total = 0
+        for record in records:
+            yield (",\n" if total else "\n") + json.dumps(record, default=str)
+            total += 1
+
+        yield f'\n], "total_logs": {total}}}\n'
+
+    return _coalesce(pieces(), chunk_size)
+
+
+class _ChunkBuffer:
+    """Write-only, unseekable sink that collects bytes until drained.
+
+    ZipFile falls back to streaming mode (data descriptors after each member)
+    when its file object cannot tell or seek, which is what lets an XLSX
+    package be produced front to back.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        # The deflate stream hands over an empty string for most rows
+        if data:
+            self._chunks.append(bytes(data))
+            self.size += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
+
+
+def _xlsx_cell(value: Any) -> str:
+    """Render one worksheet cell as XML."""
+    if value is None or value == "":
+        return "<c/>"
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return f"<c><v>{value}</v></c>"
+    text = _XML_ILLEGAL_CHARS.sub("", str(value)[:XLSX_CELL_LIMIT])
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(text)}</t></is></c>'
+
+
+def _xlsx_row(values: Iterable[Any]) -> str:
+    return "<row>" + "".join(_xlsx_cell(value) for value in values) + "</row>"
+
+
+def iter_xlsx(
+    rows: Iterable[dict[str, Any]],
+    columns: list[str],
+    headers: Optional[dict[str, str]] = None,
+    widths: Optional[dict[str, int]] = None,
+    sheet_name: str = "Logs",
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Write rows as a single-sheet XLSX workbook.
+
+    The worksheet is written row by row with inline strings, so unlike
+    openpyxl/pandas nothing is buffered per row or per column.
+
+    Args:
+        rows: Row dictionaries keyed by column name
+        columns: Column names, in output order
+        headers: Header text per column; defaults to the column name
+        widths: Column width in characters per column; defaults to 20
+        sheet_name: Name of the worksheet
+        chunk_size: Approximate size of each yielded chunk
+
+    Yields:
+        Chunks of the zipped workbook
+    """
+    headers = headers or {}
+    widths = widths or {}
+    buffer = _ChunkBuffer()
+
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as package:
+        for name, content in _XLSX_PARTS.items():
+            package.writestr(name, content)
+        package.writestr(
+            "xl/workbook.xml",
+            f'{_XML_HEADER}<workbook xmlns="{_SPREADSHEET_NS}" '
+            f'xmlns:r="{_DOCUMENT_REL}"><sheets>'
+            f'<sheet name={quoteattr(sheet_name)} sheetId="1" r:id="rId1"/>'
+            "</sheets></workbook>",
+        )
+
+        # Entries are sized when they are closed; force_zip64 lets the sheet
+        # grow past 4 GiB without knowing its size up front
+        with package.open(
+            "xl/worksheets/sheet1.xml", mode="w", force_zip64=True
+        ) as sheet:
+            cols = "".join(
+                f'<col min="{i}" max="{i}" width="{widths.get(column, 20)}" '
+                'customWidth="1"/>'
+                for i, column in enumerate(columns, start=1)
+            )
+            sheet.write(
+                f'{_XML_HEADER}<worksheet xmlns="{_SPREADSHEET_NS}">'
+                f"<cols>{cols}</cols><sheetData>".encode()
+            )
+            sheet.write(
+                _xlsx_row(headers.get(column, column) for column in columns).encode()
+            )
+
+            for row in rows:
+                sheet.write(_xlsx_row(row.get(column) for column in columns).encode())
+                if buffer.size >= chunk_size:
+                    yield buffer.drain()
+
+            sheet.write(b"</sheetData></worksheet>")
+
+    yield buffer.drain()
+
+
+def gzip_chunks(chunks: Iterable[Union[str, bytes]], level: int = 6) -> Iterator[bytes]:
+    """
+    Gzip a stream of chunks on the fly.
+
+    Args:
+        chunks: Text (encoded as UTF-8) or bytes chunks
+        level: zlib compression level
+
+    Yields:
+        Chunks of a single gzip member
+    """
+    # wbits=31 selects the gzip container rather than a raw zlib stream
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -9,14 +9,11 @@ Implements Task 11: Web Interface for HTML and LLM Logs Browsing
 - Export capabilities in multiple formats
 """
 
-import csv
-import io
-import json
 import logging
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
 
 from flask import Flask, Response, jsonify, request, send_file
 from flask_cors import CORS
@@ -28,6 +25,14 @@ from leadfactory.api.input_validation import (
     validate_log_type,
     validate_request_args,
 )
+from leadfactory.api.log_export import (
+    gzip_chunks,
+    iter_csv,
+    iter_json,
+    iter_ndjson,
+    iter_xlsx,
+)
+from leadfactory.api.response_optimizer import decode_cursor, encode_cursor
 from leadfactory.storage import get_storage
 from leadfactory.utils.logging import get_logger
 
@@ -61,6 +66,35 @@ class LogSearchFilters:
     offset: int = 0
     sort_by: str = "timestamp"
     sort_order: str = "desc"
+    cursor: Optional[str] = None
+
+
+# Log types that can appear in a keyset cursor
+CURSOR_LOG_TYPES = ("llm", "raw_html")
+
+# Export format -> (mimetype, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "json": ("application/json", "json"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "xlsx": (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "xlsx",
+    ),
+}
+
+# XLSX header text and column widths for the tabular export columns
+XLSX_HEADERS = {
+    "id": "ID",
+    "business_id": "Business ID",
+    "log_type": "Log Type",
+    "timestamp": "Timestamp",
+    "content_length": "Content Length",
+    "content": "Content",
+    "file_path": "File Path",
+    "file_size": "File Size",
+}
+XLSX_WIDTHS = {"timestamp": 28, "content": 50, "file_path": 40}
 
 
 class LogsAPI:
@@ -136,6 +170,9 @@ class LogsAPI:
         - search: Search query for content
         - limit: Number of results (default: 50, max: 1000)
         - offset: Pagination offset (default: 0)
+        - cursor: next_cursor from a previous page; pages by keyset instead
+          of offset and reports an estimated total. First pages sorted by
+          timestamp are read by keyset too.
         - sort_by: Sort field (timestamp, business_id, log_type)
         - sort_order: Sort order (asc, desc)
         """
@@ -149,17 +186,17 @@ class LogsAPI:
                 return jsonify({"error": validation_error}), 400
 
             # Fetch logs from storage
-            logs, total_count = self._fetch_logs(filters)
+            if self._pages_by_keyset(filters):
+                logs, pagination = self._fetch_logs_by_cursor(filters)
+                total_count = pagination["total"]
+            else:
+                logs, total_count = self._fetch_logs(filters)
+                pagination = self._offset_pagination(filters, logs, total_count)
 
             # Format response
             response_data = {
                 "logs": [self._format_log_entry(log) for log in logs],
-                "pagination": {
-                    "limit": filters.limit,
-                    "offset": filters.offset,
-                    "total": total_count,
-                    "has_more": (filters.offset + filters.limit) < total_count,
-                },
+                "pagination": pagination,
                 "filters": asdict(filters),
             }
 
@@ -204,7 +241,8 @@ class LogsAPI:
             },
             "pagination": {
                 "limit": 50,
-                "offset": 0
+                "offset": 0,
+                "cursor": null
             },
             "sort": {
                 "by": "timestamp",
@@ -239,10 +277,20 @@ class LogsAPI:
                 offset=max(pagination.get("offset", 0), 0),  # Ensure non-negative
                 sort_by=sort_data.get("by", "timestamp"),
                 sort_order=sort_data.get("order", "desc"),
+                cursor=pagination.get("cursor"),
             )
 
             # Perform search
-            logs, total_count = self._search_logs(filters)
+            if filters.cursor:
+                validation_error = self._validate_filters(filters)
+                if validation_error:
+                    return jsonify({"error": validation_error}), 400
+            if self._pages_by_keyset(filters):
+                logs, page = self._fetch_logs_by_cursor(filters)
+                total_count = page["total"]
+            else:
+                logs, total_count = self._search_logs(filters)
+                page = self._offset_pagination(filters, logs, total_count)
 
             response_data = {
                 "logs": [self._format_log_entry(log) for log in logs],
@@ -251,12 +299,7 @@ class LogsAPI:
                     "total_results": total_count,
                     "execution_time_ms": 0,  # Could add timing if needed
                 },
-                "pagination": {
-                    "limit": filters.limit,
-                    "offset": filters.offset,
-                    "total": total_count,
-                    "has_more": (filters.offset + filters.limit) < total_count,
-                },
+                "pagination": page,
             }
 
             logger.info(
@@ -270,13 +313,17 @@ class LogsAPI:
 
     def export_logs(self) -> Response:
         """
-        Export logs in various formats (CSV, JSON).
+        Export logs in various formats (CSV, JSON, NDJSON, XLSX).
+
+        The export is streamed, so it covers every matching log however many
+        there are.
 
         Expected JSON payload:
         {
             "filters": { ... },
-            "format": "csv" | "json",
-            "include_content": true | false
+            "format": "csv" | "json" | "ndjson" | "xlsx",
+            "include_content": true | false,
+            "gzip": true | false
         }
         """
         try:
@@ -286,10 +333,14 @@ class LogsAPI:
 
             export_format = data.get("format", "csv").lower()
             include_content = data.get("include_content", False)
+            compress = bool(data.get("gzip", False))
             filter_data = data.get("filters", {})
 
-            if export_format not in ["csv", "json", "xlsx"]:
-                return jsonify({"error": "Format must be csv, json, or xlsx"}), 400
+            if export_format not in EXPORT_FORMATS:
+                return (
+                    jsonify({"error": "Format must be csv, json, ndjson, or xlsx"}),
+                    400,
+                )
 
             # Build filters for export
             filters = LogSearchFilters(
@@ -298,22 +349,13 @@ class LogsAPI:
                 start_date=self._parse_datetime(filter_data.get("start_date")),
                 end_date=self._parse_datetime(filter_data.get("end_date")),
                 search_query=filter_data.get("search_query"),
-                limit=10000,  # Large limit for export
-                offset=0,
                 sort_by="timestamp",
                 sort_order="desc",
             )
 
-            # Fetch logs for export
-            logs, total_count = self._fetch_logs(filters)
-
-            # Generate export file
-            if export_format == "csv":
-                return self._export_csv(logs, include_content)
-            elif export_format == "json":
-                return self._export_json(logs, include_content)
-            elif export_format == "xlsx":
-                return self._export_xlsx(logs, include_content)
+            return self._export_response(
+                self._iter_logs(filters), export_format, include_content, compress
+            )
 
         except Exception as e:
             logger.error(f"Error exporting logs: {e}")
@@ -365,6 +407,7 @@ class LogsAPI:
             offset=args.get("offset", 0, type=int),
             sort_by=args.get("sort_by", "timestamp"),
             sort_order=args.get("sort_order", "desc"),
+            cursor=args.get("cursor"),
         )
 
     def _validate_filters(self, filters: LogSearchFilters) -> Optional[str]:
@@ -381,6 +424,12 @@ class LogsAPI:
         if filters.sort_order not in ["asc", "desc"]:
             return "Sort order must be 'asc' or 'desc'"
 
+        if filters.cursor:
+            if filters.sort_by != "timestamp":
+                return "Cursor pagination requires sort_by=timestamp"
+            if self._decode_log_cursor(filters.cursor) is None:
+                return "Invalid cursor"
+
         if filters.log_type and filters.log_type not in [
             "html",
             "llm",
@@ -467,19 +516,7 @@ class LogsAPI:
                     )
 
             # Convert to LogEntry objects
-            logs = []
-            for log_data in logs_data:
-                log_entry = LogEntry(
-                    id=log_data.get("id"),
-                    business_id=log_data.get("business_id"),
-                    log_type=log_data.get("log_type"),
-                    content=log_data.get("content", ""),
-                    timestamp=log_data.get("timestamp", datetime.utcnow()),
-                    metadata=log_data.get("metadata", {}),
-                    file_path=log_data.get("file_path"),
-                    file_size=log_data.get("file_size"),
-                )
-                logs.append(log_entry)
+            logs = [self._log_entry_from_dict(log_data) for log_data in logs_data]
 
             return logs, total_count
 
@@ -487,6 +524,158 @@ class LogsAPI:
             logger.error(f"Error fetching logs: {e}")
             return [], 0
 
+    def _pages_by_keyset(self, filters: LogSearchFilters) -> bool:
+        """Whether a page is read by keyset rather than OFFSET.
+
+        Cursor pages always are. First pages sorted by timestamp are too when
+        the storage supports it, so the common case (opening the logs page or
+        running a search) avoids the exact COUNT and gets the same indexed
+        search as the pages that follow.
+        """
+        if filters.cursor:
+            return True
+        return (
+            filters.offset == 0
+            and filters.sort_by == "timestamp"
+            and hasattr(self.storage, "get_logs_page")
+        )
+
+    def _offset_pagination(
+        self, filters: LogSearchFilters, logs: list[LogEntry], total_count: int
+    ) -> dict[str, Any]:
+        """Pagination metadata for an offset page.
+
+        A next_cursor is included when sorting by timestamp so clients can
+        continue by keyset, if the storage supports it.
+        """
+        has_more = (filters.offset + filters.limit) < total_count
+        next_cursor = None
+        if (
+            has_more
+            and logs
+            and filters.sort_by == "timestamp"
+            and hasattr(self.storage, "get_logs_page")
+        ):
+            next_cursor = self._encode_log_cursor(logs[-1])
+
+        return {
+            "limit": filters.limit,
+            "offset": filters.offset,
+            "total": total_count,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+        }
+
+    def _encode_log_cursor(self, log: Union[LogEntry, dict[str, Any]]) -> str:
+        """Encode the keyset position of a log: (timestamp, log_type, id)."""
+        if isinstance(log, LogEntry):
+            timestamp, log_type, log_id = log.timestamp, log.log_type, log.id
+        else:
+            timestamp, log_type, log_id = log["timestamp"], log["log_type"], log["id"]
+
+        if isinstance(timestamp, datetime):
+            timestamp = timestamp.isoformat()
+        return encode_cursor(
+            {"timestamp": timestamp, "log_type": log_type, "id": log_id}
+        )
+
+    def _decode_log_cursor(self, cursor: str) -> Optional[dict[str, Any]]:
+        """Decode a cursor from _encode_log_cursor(), or None if it is invalid."""
+        position = decode_cursor(cursor)
+        if not position or position.get("log_type") not in CURSOR_LOG_TYPES:
+            return None
+
+        try:
+            return {
+                "timestamp": datetime.fromisoformat(position["timestamp"]),
+                "log_type": position["log_type"],
+                "id": int(position["id"]),
+            }
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _fetch_logs_by_cursor(
+        self, filters: LogSearchFilters
+    ) -> tuple[list[LogEntry], dict[str, Any]]:
+        """Fetch the page after filters.cursor by keyset, with caching.
+
+        Without a cursor this is the first page.
+
+        Returns:
+            Tuple of (logs, pagination metadata with an estimated total)
+        """
+        page_filters = {
+            "business_id": filters.business_id,
+            "log_type": filters.log_type,
+            "start_date": filters.start_date,
+            "end_date": filters.end_date,
+            "search_query": filters.search_query,
+            "limit": filters.limit,
+            "sort_order": filters.sort_order,
+        }
+
+        def fetch_page() -> tuple[list[dict[str, Any]], Optional[str]]:
+            # Read one extra row to learn whether another page follows
+            logs_data = self.storage.get_logs_page(
+                **{**page_filters, "limit": filters.limit + 1},
+                after=(
+                    self._decode_log_cursor(filters.cursor) if filters.cursor else None
+                ),
+            )
+            if len(logs_data) <= filters.limit:
+                return logs_data, None
+            logs_data = logs_data[: filters.limit]
+            return logs_data, self._encode_log_cursor(logs_data[-1])
+
+        if hasattr(self.storage, "get_logs_page"):
+            logs_data, next_cursor = self.cache.get_or_set_logs_page(
+                filters.cursor, fetch_page, **page_filters
+            )
+        else:
+            logs_data, next_cursor = [], None
+            logger.warning("Storage does not implement get_logs_page method")
+
+        logs = [self._log_entry_from_dict(log_data) for log_data in logs_data]
+        return logs, {
+            "limit": filters.limit,
+            "offset": filters.offset,
+            "cursor": filters.cursor,
+            "next_cursor": next_cursor,
+            "has_more": next_cursor is not None,
+            "total": self._estimate_log_count(filters),
+            "total_is_estimate": True,
+        }
+
+    def _estimate_log_count(self, filters: LogSearchFilters) -> int:
+        """Approximate number of logs matching the filters, cached."""
+        count_filters = {
+            "business_id": filters.business_id,
+            "log_type": filters.log_type,
+            "start_date": filters.start_date,
+            "end_date": filters.end_date,
+            "search_query": filters.search_query,
+        }
+
+        if not hasattr(self.storage, "estimate_logs_count"):
+            return 0
+        return self.cache.get_or_set_logs_count(
+            lambda: self.storage.estimate_logs_count(**count_filters),
+            **count_filters,
+        )
+
+    def _log_entry_from_dict(self, log_data: dict[str, Any]) -> LogEntry:
+        """Build a LogEntry from a storage row."""
+        return LogEntry(
+            id=log_data.get("id"),
+            business_id=log_data.get("business_id"),
+            log_type=log_data.get("log_type"),
+            content=log_data.get("content", ""),
+            timestamp=log_data.get("timestamp", datetime.utcnow()),
+            metadata=log_data.get("metadata", {}),
+            file_path=log_data.get("file_path"),
+            file_size=log_data.get("file_size"),
+        )
+
     def _fetch_log_by_id(self, log_id: int) -> Optional[LogEntry]:
         """Fetch a single log entry by ID."""
         try:
@@ -541,142 +730,168 @@ class LogsAPI:
 
         return formatted
 
-    def _export_csv(self, logs: list[LogEntry], include_content: bool) -> Response:
-        """Export logs as CSV."""
-        output = io.StringIO()
-
-        fieldnames = ["id", "business_id", "log_type", "timestamp", "content_length"]
+    def _export_columns(self, include_content: bool) -> list[str]:
+        """Columns of a tabular (CSV/XLSX) export, in output order."""
+        columns = ["id", "business_id", "log_type", "timestamp", "content_length"]
         if include_content:
-            fieldnames.append("content")
-        fieldnames.extend(["file_path", "file_size"])
-
-        writer = csv.DictWriter(output, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for log in logs:
-            row = {
-                "id": log.id,
-                "business_id": log.business_id,
-                "log_type": log.log_type,
-                "timestamp": (
-                    log.timestamp.isoformat()
-                    if isinstance(log.timestamp, datetime)
-                    else log.timestamp
-                ),
-                "content_length": len(log.content),
-                "file_path": log.file_path or "",
-                "file_size": log.file_size or "",
-            }
+            columns.append("content")
+        columns.extend(["file_path", "file_size"])
+        return columns
 
-            if include_content:
-                row["content"] = log.content
+    def _export_row(self, log: LogEntry, include_content: bool) -> dict[str, Any]:
+        """Flatten a log entry into a tabular export row."""
+        row = {
+            "id": log.id,
+            "business_id": log.business_id,
+            "log_type": log.log_type,
+            "timestamp": (
+                log.timestamp.isoformat()
+                if isinstance(log.timestamp, datetime)
+                else log.timestamp
+            ),
+            "content_length": len(log.content),
+            "file_path": log.file_path or "",
+            "file_size": log.file_size or "",
+        }
 
-            writer.writerow(row)
+        if include_content:
+            row["content"] = log.content
 
-        output.seek(0)
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        return row
 
-        return Response(
-            output.getvalue(),
-            mimetype="text/csv",
-            headers={
-                "Content-Disposition": f"attachment; filename=logs_export_{timestamp}.csv"
-            },
-        )
+    def _iter_logs(
+        self, filters: LogSearchFilters, batch_size: int = 1000
+    ) -> Iterator[LogEntry]:
+        """
+        Stream every log matching the filters, for exports.
 
-    def _export_json(self, logs: list[LogEntry], include_content: bool) -> Response:
-        """Export logs as JSON."""
-        export_data = {
-            "export_timestamp": datetime.utcnow().isoformat(),
-            "total_logs": len(logs),
-            "include_content": include_content,
-            "logs": [self._format_log_entry(log, include_content) for log in logs],
+        Reads through the storage's server-side cursor when it has one, and
+        otherwise pages through get_logs_with_filters ``batch_size`` logs at
+        a time. Neither path goes through the query cache, which is meant
+        for browser pages rather than bulk reads.
+        """
+        query_params = {
+            "business_id": filters.business_id,
+            "log_type": filters.log_type,
+            "start_date": filters.start_date,
+            "end_date": filters.end_date,
+            "search_query": filters.search_query,
+            "sort_order": filters.sort_order,
         }
+        query_params = {k: v for k, v in query_params.items() if v is not None}
+
+        if hasattr(self.storage, "iter_logs"):
+            rows = self.storage.iter_logs(batch_size=batch_size, **query_params)
+        elif hasattr(self.storage, "get_logs_with_filters"):
+            rows = self._iter_log_pages(query_params, batch_size)
+        else:
+            logger.warning("Storage does not implement iter_logs method")
+            rows = []
+
+        for log_data in rows:
+            yield self._log_entry_from_dict(log_data)
+
+    def _iter_log_pages(
+        self, query_params: dict[str, Any], batch_size: int
+    ) -> Iterator[dict[str, Any]]:
+        """Page through get_logs_with_filters by offset."""
+        offset = 0
+        while True:
+            logs_data, _ = self.storage.get_logs_with_filters(
+                limit=batch_size, offset=offset, sort_by="timestamp", **query_params
+            )
+            yield from logs_data
+
+            if len(logs_data) < batch_size:
+                break
+            offset += batch_size
+
+    def _export_response(
+        self,
+        logs: Iterable[LogEntry],
+        export_format: str,
+        include_content: bool,
+        compress: bool = False,
+        filename_prefix: str = "logs_export",
+    ) -> Response:
+        """
+        Build a streamed export response.
+
+        The body is generated while the client downloads it, so only one
+        chunk of output and one storage batch are held in memory at a time.
+
+        Args:
+            logs: Logs to export, consumed lazily
+            export_format: One of EXPORT_FORMATS
+            include_content: Whether to include full log content
+            compress: Gzip the body on the fly
+            filename_prefix: Prefix of the attachment filename
 
+        Returns:
+            Flask response streaming the export
+        """
+        if export_format == "csv":
+            body = iter_csv(
+                (self._export_row(log, include_content) for log in logs),
+                self._export_columns(include_content),
+            )
+        elif export_format == "xlsx":
+            body = iter_xlsx(
+                (self._export_row(log, include_content) for log in logs),
+                self._export_columns(include_content),
+                headers=XLSX_HEADERS,
+                widths=XLSX_WIDTHS,
+            )
+        elif export_format == "ndjson":
+            body = iter_ndjson(
+                self._format_log_entry(log, include_content) for log in logs
+            )
+        else:
+            body = iter_json(
+                (self._format_log_entry(log, include_content) for log in logs),
+                header={
+                    "export_timestamp": datetime.utcnow().isoformat(),
+                    "include_content": include_content,
+                },
+            )
+
+        mimetype, extension = EXPORT_FORMATS[export_format]
         timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        filename = f"{filename_prefix}_{timestamp}.{extension}"
+
+        if compress:
+            body = gzip_chunks(body)
+            mimetype = "application/gzip"
+            filename += ".gz"
 
         return Response(
-            json.dumps(export_data, indent=2),
-            mimetype="application/json",
+            body,
+            mimetype=mimetype,
             headers={
-                "Content-Disposition": f"attachment; filename=logs_export_{timestamp}.json"
+                "Content-Disposition": f"attachment; filename={filename}",
+                "Cache-Control": "no-cache",
+                # Ask proxies such as nginx to pass chunks through unbuffered
+                "X-Accel-Buffering": "no",
             },
         )
 
-    def _export_xlsx(self, logs: list[LogEntry], include_content: bool) -> Response:
-        """Export logs as Excel file."""
-        try:
-            import openpyxl
-            import pandas as pd
-            from openpyxl.utils.dataframe import dataframe_to_rows
-
-            # Convert logs to DataFrame
-            data = []
-            for log in logs:
-                row = {
-                    "ID": log.id,
-                    "Business ID": log.business_id,
-                    "Log Type": log.log_type,
-                    "Timestamp": (
-                        log.timestamp.isoformat()
-                        if isinstance(log.timestamp, datetime)
-                        else log.timestamp
-                    ),
-                    "Content Length": len(log.content),
-                    "File Path": log.file_path or "",
-                    "File Size": log.file_size or "",
-                }
+    def _export_csv(self, logs: Iterable[LogEntry], include_content: bool) -> Response:
+        """Export logs as CSV."""
+        return self._export_response(logs, "csv", include_content)
 
-                if include_content:
-                    row["Content"] = log.content[:32767]  # Excel cell limit
-
-                data.append(row)
-
-            df = pd.DataFrame(data)
-
-            # Create Excel file in memory
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine="openpyxl") as writer:
-                df.to_excel(writer, sheet_name="Logs", index=False)
-
-                # Add some formatting
-                worksheet = writer.sheets["Logs"]
-                for column in worksheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except (AttributeError, TypeError, ValueError):
-                            # Skip cells with problematic values
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    worksheet.column_dimensions[column_letter].width = adjusted_width
-
-            output.seek(0)
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-
-            return Response(
-                output.getvalue(),
-                mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                headers={
-                    "Content-Disposition": f"attachment; filename=logs_export_{timestamp}.xlsx"
-                },
-            )
+    def _export_json(self, logs: Iterable[LogEntry], include_content: bool) -> Response:
+        """Export logs as JSON."""
+        return self._export_response(logs, "json", include_content)
 
-        except ImportError:
-            logger.error("openpyxl and pandas required for Excel export")
-            return Response(
-                "Excel export requires additional dependencies (openpyxl, pandas)",
-                status=500,
-                mimetype="text/plain",
-            )
-        except Exception as e:
-            logger.error(f"Error creating Excel export: {e}")
-            return Response(
-                f"Error creating Excel export: {e}", status=500, mimetype="text/plain"
-            )
+    def _export_ndjson(
+        self, logs: Iterable[LogEntry], include_content: bool
+    ) -> Response:
+        """Export logs as newline-delimited JSON."""
+        return self._export_response(logs, "ndjson", include_content)
+
+    def _export_xlsx(self, logs: Iterable[LogEntry], include_content: bool) -> Response:
+        """Export logs as Excel file."""
+        return self._export_response(logs, "xlsx", include_content)
 
     def export_logs_stream(self) -> Response:
         """
@@ -685,8 +900,9 @@ class LogsAPI:
         Expected JSON payload:
         {
             "filters": { ... },
-            "format": "csv" | "json",
+            "format": "csv" | "json" | "ndjson" | "xlsx",
             "include_content": true | false,
+            "gzip": true | false,
             "chunk_size": 1000
         }
         """
@@ -697,128 +913,35 @@ class LogsAPI:
 
             export_format = data.get("format", "csv").lower()
             include_content = data.get("include_content", False)
+            compress = bool(data.get("gzip", False))
             chunk_size = data.get("chunk_size", 1000)
             filter_data = data.get("filters", {})
 
-            if export_format not in ["csv", "json"]:
-                return jsonify({"error": "Streaming format must be csv or json"}), 400
+            if export_format not in EXPORT_FORMATS:
+                return (
+                    jsonify({"error": "Format must be csv, json, ndjson, or xlsx"}),
+                    400,
+                )
 
             if chunk_size > 5000:
                 return jsonify({"error": "Chunk size too large (max 5000)"}), 400
 
-            # Build base filters
-            base_filters = LogSearchFilters(
+            filters = LogSearchFilters(
                 business_id=filter_data.get("business_id"),
                 log_type=filter_data.get("log_type"),
                 start_date=self._parse_datetime(filter_data.get("start_date")),
                 end_date=self._parse_datetime(filter_data.get("end_date")),
                 search_query=filter_data.get("search_query"),
-                limit=chunk_size,
-                offset=0,
                 sort_by="timestamp",
                 sort_order="desc",
             )
 
-            def generate_csv_stream():
-                """Generator for CSV streaming."""
-                # Write CSV header
-                fieldnames = [
-                    "id",
-                    "business_id",
-                    "log_type",
-                    "timestamp",
-                    "content_length",
-                ]
-                if include_content:
-                    fieldnames.append("content")
-                fieldnames.extend(["file_path", "file_size"])
-
-                yield ",".join(fieldnames) + "\n"
-
-                offset = 0
-                while True:
-                    base_filters.offset = offset
-                    logs, total_count = self._fetch_logs(base_filters)
-
-                    if not logs:
-                        break
-
-                    for log in logs:
-                        row_data = [
-                            str(log.id),
-                            str(log.business_id),
-                            log.log_type,
-                            (
-                                log.timestamp.isoformat()
-                                if isinstance(log.timestamp, datetime)
-                                else str(log.timestamp)
-                            ),
-                            str(len(log.content)),
-                        ]
-
-                        if include_content:
-                            # Escape CSV content
-                            content = log.content.replace('"', '""')
-                            row_data.append(f'"{content}"')
-
-                        row_data.extend([log.file_path or "", str(log.file_size or "")])
-
-                        yield ",".join(row_data) + "\n"
-
-                    offset += chunk_size
-
-                    # Stop if we've processed all available logs
-                    if len(logs) < chunk_size:
-                        break
-
-            def generate_json_stream():
-                """Generator for JSON streaming."""
-                yield '{"logs": [\n'
-
-                offset = 0
-                first_chunk = True
-
-                while True:
-                    base_filters.offset = offset
-                    logs, total_count = self._fetch_logs(base_filters)
-
-                    if not logs:
-                        break
-
-                    for i, log in enumerate(logs):
-                        if not first_chunk or (first_chunk and offset > 0) or i > 0:
-                            yield ",\n"
-
-                        log_data = self._format_log_entry(log, include_content)
-                        yield json.dumps(log_data, indent=2)
-
-                        first_chunk = False
-
-                    offset += chunk_size
-
-                    # Stop if we've processed all available logs
-                    if len(logs) < chunk_size:
-                        break
-
-                yield "\n]}"
-
-            # Select appropriate generator
-            if export_format == "csv":
-                generator = generate_csv_stream()
-                mimetype = "text/csv"
-                filename = f"logs_export_stream_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv"
-            else:
-                generator = generate_json_stream()
-                mimetype = "application/json"
-                filename = f"logs_export_stream_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
-
-            return Response(
-                generator,
-                mimetype=mimetype,
-                headers={
-                    "Content-Disposition": f"attachment; filename={filename}",
-                    "Cache-Control": "no-cache",
-                },
+            return self._export_response(
+                self._iter_logs(filters, batch_size=chunk_size),
+                export_format,
+                include_content,
+                compress=compress,
+                filename_prefix="logs_export_stream",
             )
 
         except Exception as e:
@@ -5,6 +5,8 @@ Provides response compression, pagination, and field filtering for
 optimal API performance.
 """
 
+import base64
+import binascii
 import gzip
 import io
 import json
@@ -18,6 +20,21 @@ from fastapi.responses import JSONResponse, StreamingResponse
 logger = logging.getLogger(__name__)
 
 
+def encode_cursor(position: dict[str, Any]) -> str:
+    """Encode a keyset position as an opaque, URL-safe pagination cursor."""
+    cursor_json = json.dumps(position, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(cursor_json.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Optional[dict[str, Any]]:
+    """Decode a cursor from encode_cursor(), or None if it is malformed."""
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+    return position if isinstance(position, dict) else None
+
+
 @dataclass
 class PaginationParams:
     """Pagination parameters for API responses."""
@@ -186,11 +203,7 @@ class ResponseOptimizer:
             "id": getattr(item, "id", None),
             "created_at": str(getattr(item, "created_at", "")),
         }
-
-        import base64
-
-        cursor_json = json.dumps(cursor_data, separators=(",", ":"))
-        return base64.urlsafe_b64encode(cursor_json.encode()).decode()
+        return encode_cursor(cursor_data)
 
     def _build_query_string(self, params: dict[str, Any]) -> str:
         """Build query string from parameters."""
@@ -0,0 +1,23 @@
+"""
+Shared application cache.
+
+TieredCache combines an O(1) in-process LRU/TTL tier with an optional
+shared tier (SQLite file or Redis) so cached values, tag invalidations and
+single-flight recomputation are shared across worker processes.
+"""
+
+from .backends import (
+    CacheBackend,
+    RedisCacheBackend,
+    SQLiteCacheBackend,
+    get_shared_backend,
+)
+from .tiered import TieredCache
+
+__all__ = [
+    "TieredCache",
+    "CacheBackend",
+    "SQLiteCacheBackend",
+    "RedisCacheBackend",
+    "get_shared_backend",
+]
@@ -0,0 +1,466 @@
+"""
+Shared tiers for the application cache.
+
+A shared tier holds serialized entries outside the process so every worker
+sees the same values, tag invalidations and single-flight locks.
+SQLiteCacheBackend keeps them in one WAL-mode file on the local host, which
+is enough for gunicorn workers on a single machine; RedisCacheBackend uses a
+Redis server when the optional redis package is installed.
+
+Invalidations are also appended to a sequence-numbered log (tag names, or
+``@key`` for single keys) so each process can drop the matching entries from
+its in-process tier without scanning it.
+"""
+
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Optional, Sequence
+
+try:
+    import redis
+    from redis.exceptions import RedisError
+
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    RedisError = Exception
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DB_PATH = str(Path(__file__).parent.parent / "data" / "shared_cache.db")
+
+# "sqlite" (default), "redis", or "memory" to disable the shared tier
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite").lower()
+CACHE_DB_PATH = os.getenv("CACHE_DB_PATH", DEFAULT_CACHE_DB_PATH)
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "leadfactory")
+
+# Expired rows and old invalidation records are purged once per this many writes.
+_PURGE_EVERY_WRITES = 500
+# Invalidation records older than this are purged; workers that have not
+# synced for longer simply miss them and rely on entry TTLs.
+_INVALIDATION_RETENTION_SECONDS = 3600
+
+# A stored entry: payload, absolute expiry time and the tags it was stored with
+StoredEntry = tuple[bytes, float, tuple[str, ...]]
+
+
+class CacheBackend(ABC):
+    """Interface for a shared cache tier."""
+
+    @abstractmethod
+    def get(self, key: str, now: float) -> Optional[StoredEntry]:
+        """Return the unexpired entry for key, or None."""
+
+    @abstractmethod
+    def set(
+        self, key: str, payload: bytes, expires_at: float, tags: Sequence[str]
+    ) -> None:
+        """Store an entry, replacing any previous value and tags for key."""
+
+    @abstractmethod
+    def invalidate(
+        self, keys: Sequence[str] = (), tags: Sequence[str] = (), now: float = 0.0
+    ) -> int:
+        """Delete entries by key or tag, record the invalidation and return the count."""
+
+    @abstractmethod
+    def invalidations_since(self, seq: int) -> tuple[int, list[str]]:
+        """Return the latest sequence number and the markers recorded after seq.
+
+        A negative seq returns only the latest sequence number, which is where
+        a newly started process begins following the log.
+        """
+
+    @abstractmethod
+    def acquire_lock(self, key: str, ttl: float, now: float) -> bool:
+        """Take the single-flight lock for key unless another holder has it."""
+
+    @abstractmethod
+    def release_lock(self, key: str) -> None:
+        """Release a single-flight lock taken with acquire_lock."""
+
+    def close(self) -> None:
+        """Release any resources held by the backend."""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Shared cache tier in a SQLite file used by every local worker process."""
+
+    def __init__(self, db_path: str):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            db_path: Path of the SQLite file shared by all workers
+        """
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._writes_since_purge = 0
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                cache_key TEXT PRIMARY KEY,
+                payload BLOB NOT NULL,
+                expires_at REAL NOT NULL,
+                tags TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_entries_expires
+                ON cache_entries(expires_at);
+            CREATE TABLE IF NOT EXISTS cache_tags (
+                tag TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                PRIMARY KEY (tag, cache_key)
+            );
+            CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags(cache_key);
+            CREATE TABLE IF NOT EXISTS cache_invalidations (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                marker TEXT NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS cache_locks (
+                cache_key TEXT PRIMARY KEY,
+                expires_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+        logger.info(f"Shared cache tier at {db_path}")
+
+    def get(self, key: str, now: float) -> Optional[StoredEntry]:
+        """Return the unexpired entry for key, or None."""
+        with self._lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT payload, expires_at, tags FROM cache_entries "
+                    "WHERE cache_key = ?",
+                    (key,),
+                ).fetchone()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to read shared cache: {e}")
+                return None
+        if row is None or row[1] <= now:
+            return None
+        return bytes(row[0]), row[1], tuple(json.loads(row[2]))
+
+    def set(
+        self, key: str, payload: bytes, expires_at: float, tags: Sequence[str]
+    ) -> None:
+        """Store an entry, replacing any previous value and tags for key."""
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache_entries "
+                    "(cache_key, payload, expires_at, tags) VALUES (?, ?, ?, ?)",
+                    (key, payload, expires_at, json.dumps(list(tags))),
+                )
+                self._conn.execute("DELETE FROM cache_tags WHERE cache_key = ?", (key,))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO cache_tags (tag, cache_key) VALUES (?, ?)",
+                    [(tag, key) for tag in tags],
+                )
+                self._writes_since_purge += 1
+                if self._writes_since_purge >= _PURGE_EVERY_WRITES:
+                    self._purge(time.time())
+                self._conn.commit()
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"Failed to write shared cache: {e}")
+
+    def invalidate(
+        self, keys: Sequence[str] = (), tags: Sequence[str] = (), now: float = 0.0
+    ) -> int:
+        """Delete entries by key or tag, record the invalidation and return the count."""
+        keys, tags = list(keys), list(tags)
+        with self._lock:
+            try:
+                doomed = set(keys)
+                if tags:
+                    placeholders = ",".join("?" * len(tags))
+                    doomed.update(
+                        row[0]
+                        for row in self._conn.execute(
+                            f"SELECT cache_key FROM cache_tags "  # nosec B608
+                            f"WHERE tag IN ({placeholders})",
+                            tags,
+                        )
+                    )
+                removed = 0
+                for key in doomed:
+                    removed += self._conn.execute(
+                        "DELETE FROM cache_entries WHERE cache_key = ?", (key,)
+                    ).rowcount
+                    self._conn.execute(
+                        "DELETE FROM cache_tags WHERE cache_key = ?", (key,)
+                    )
+                self._conn.executemany(
+                    "INSERT INTO cache_invalidations (marker, created_at) "
+                    "VALUES (?, ?)",
+                    [(f"@{key}", now) for key in keys] + [(tag, now) for tag in tags],
+                )
+                self._conn.commit()
+                return removed
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"Failed to invalidate shared cache: {e}")
+                return 0
+
+    def invalidations_since(self, seq: int) -> tuple[int, list[str]]:
+        """Return the latest sequence number and the markers recorded after seq."""
+        with self._lock:
+            try:
+                if seq < 0:
+                    row = self._conn.execute(
+                        "SELECT COALESCE(MAX(seq), 0) FROM cache_invalidations"
+                    ).fetchone()
+                    return row[0], []
+                rows = self._conn.execute(
+                    "SELECT seq, marker FROM cache_invalidations WHERE seq > ? "
+                    "ORDER BY seq",
+                    (seq,),
+                ).fetchall()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to read shared cache invalidations: {e}")
+                return seq, []
+        if not rows:
+            return seq, []
+        return rows[-1][0], [marker for _, marker in rows]
+
+    def acquire_lock(self, key: str, ttl: float, now: float) -> bool:
+        """Take the single-flight lock for key unless another holder has it."""
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "DELETE FROM cache_locks WHERE cache_key = ? AND expires_at <= ?",
+                    (key, now),
+                )
+                acquired = self._conn.execute(
+                    "INSERT OR IGNORE INTO cache_locks (cache_key, expires_at) "
+                    "VALUES (?, ?)",
+                    (key, now + ttl),
+                ).rowcount
+                self._conn.commit()
+                return bool(acquired)
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"Failed to take shared cache lock: {e}")
+                # Recompute locally rather than stall the caller
+                return True
+
+    def release_lock(self, key: str) -> None:
+        """Release a single-flight lock taken with acquire_lock."""
+        with self._lock:
+            try:
+                self._conn.execute(
+                    "DELETE FROM cache_locks WHERE cache_key = ?", (key,)
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Failed to release shared cache lock: {e}")
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _purge(self, now: float) -> None:
+        """Remove expired entries, stale locks and old invalidation records."""
+        self._conn.execute(
+            "DELETE FROM cache_tags WHERE cache_key IN "
+            "(SELECT cache_key FROM cache_entries WHERE expires_at <= ?)",
+            (now,),
+        )
+        self._conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+        self._conn.execute("DELETE FROM cache_locks WHERE expires_at <= ?", (now,))
+        self._conn.execute(
+            "DELETE FROM cache_invalidations WHERE created_at <= ?",
+            (now - _INVALIDATION_RETENTION_SECONDS,),
+        )
+        self._writes_since_purge = 0
+
+
+class RedisCacheBackend(CacheBackend):
+    """Shared cache tier in Redis, for workers spread across hosts."""
+
+    def __init__(self, url: str = REDIS_URL, key_prefix: str = CACHE_KEY_PREFIX):
+        """
+        Connect to Redis.
+
+        Args:
+            url: Redis connection URL
+            key_prefix: Prefix for every key this backend writes
+
+        Raises:
+            RuntimeError: If the redis package is not installed
+            RedisError: If the server cannot be reached
+        """
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("redis package is not installed")
+        self.client = redis.from_url(url, decode_responses=False)
+        self.client.ping()
+        self.prefix = f"{key_prefix}:cache"
+
+    def _entry_key(self, key: str) -> str:
+        return f"{self.prefix}:entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}:tag:{tag}"
+
+    def _lock_key(self, key: str) -> str:
+        return f"{self.prefix}:lock:{key}"
+
+    def get(self, key: str, now: float) -> Optional[StoredEntry]:
+        """Return the unexpired entry for key, or None."""
+        try:
+            pipe = self.client.pipeline()
+            pipe.hmget(self._entry_key(key), "payload", "tags")
+            pipe.pttl(self._entry_key(key))
+            (payload, tags), pttl = pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Redis cache get error: {e}")
+            return None
+        if payload is None:
+            return None
+        expires_at = now + pttl / 1000 if pttl >= 0 else math.inf
+        return payload, expires_at, tuple(json.loads(tags or b"[]"))
+
+    def set(
+        self, key: str, payload: bytes, expires_at: float, tags: Sequence[str]
+    ) -> None:
+        """Store an entry, replacing any previous value and tags for key."""
+        entry_key = self._entry_key(key)
+        ttl_ms = None
+        if expires_at != math.inf:
+            ttl_ms = max(int((expires_at - time.time()) * 1000), 1)
+        try:
+            pipe = self.client.pipeline()
+            pipe.delete(entry_key)
+            pipe.hset(entry_key, mapping={"payload": payload, "tags": json.dumps(tags)})
+            if ttl_ms is not None:
+                pipe.pexpire(entry_key, ttl_ms)
+            for tag in tags:
+                pipe.sadd(self._tag_key(tag), key)
+            pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Redis cache set error: {e}")
+
+    def invalidate(
+        self, keys: Sequence[str] = (), tags: Sequence[str] = (), now: float = 0.0
+    ) -> int:
+        """Delete entries by key or tag, record the invalidation and return the count."""
+        try:
+            doomed = set(keys)
+            for tag in tags:
+                doomed.update(
+                    member.decode() if isinstance(member, bytes) else member
+                    for member in self.client.smembers(self._tag_key(tag))
+                )
+            removed = 0
+            if doomed:
+                removed = self.client.delete(*(self._entry_key(k) for k in doomed))
+            pipe = self.client.pipeline()
+            for tag in tags:
+                pipe.delete(self._tag_key(tag))
+            for marker in [f"@{key}" for key in keys] + list(tags):
+                seq = self.client.incr(f"{self.prefix}:invalidation_seq")
+                pipe.zadd(f"{self.prefix}:invalidations", {f"{seq}|{marker}": seq})
+            pipe.zremrangebyrank(f"{self.prefix}:invalidations", 0, -10001)
+            pipe.execute()
+            return removed
+        except RedisError as e:
+            logger.warning(f"Redis cache invalidate error: {e}")
+            return 0
+
+    def invalidations_since(self, seq: int) -> tuple[int, list[str]]:
+        """Return the latest sequence number and the markers recorded after seq."""
+        try:
+            if seq < 0:
+                latest = self.client.get(f"{self.prefix}:invalidation_seq")
+                return int(latest or 0), []
+            rows = self.client.zrangebyscore(
+                f"{self.prefix}:invalidations", seq + 1, "+inf", withscores=True
+            )
+        except RedisError as e:
+            logger.warning(f"Redis cache invalidation read error: {e}")
+            return seq, []
+        if not rows:
+            return seq, []
+        markers = [
+            (member.decode() if isinstance(member, bytes) else member).split("|", 1)[1]
+            for member, _ in rows
+        ]
+        return int(rows[-1][1]), markers
+
+    def acquire_lock(self, key: str, ttl: float, now: float) -> bool:
+        """Take the single-flight lock for key unless another holder has it."""
+        try:
+            return bool(
+                self.client.set(
+                    self._lock_key(key), b"1", nx=True, px=max(int(ttl * 1000), 1)
+                )
+            )
+        except RedisError as e:
+            logger.warning(f"Redis cache lock error: {e}")
+            return True
+
+    def release_lock(self, key: str) -> None:
+        """Release a single-flight lock taken with acquire_lock."""
+        try:
+            self.client.delete(self._lock_key(key))
+        except RedisError as e:
+            logger.warning(f"Redis cache unlock error: {e}")
+
+    def close(self) -> None:
+        """Close the Redis connection pool."""
+        self.client.close()
+
+
+_shared_backend: Optional[CacheBackend] = None
+_shared_backend_loaded = False
+_shared_backend_lock = threading.Lock()
+
+
+def get_shared_backend() -> Optional[CacheBackend]:
+    """
+    Return the process-wide shared cache tier selected by CACHE_BACKEND.
+
+    Falls back from Redis to SQLite, and from SQLite to no shared tier, when
+    the preferred backend cannot be opened.
+
+    Returns:
+        The shared backend, or None when caches should stay in-process only
+    """
+    global _shared_backend, _shared_backend_loaded
+
+    with _shared_backend_lock:
+        if _shared_backend_loaded:
+            return _shared_backend
+        _shared_backend_loaded = True
+
+        if CACHE_BACKEND == "redis":
+            try:
+                _shared_backend = RedisCacheBackend(REDIS_URL, CACHE_KEY_PREFIX)
+                return _shared_backend
+            except (RuntimeError, RedisError, OSError) as e:
+                logger.warning(f"Redis cache unavailable, using SQLite tier: {e}")
+
+        if CACHE_BACKEND in ("redis", "sqlite"):
+            try:
+                _shared_backend = SQLiteCacheBackend(CACHE_DB_PATH)
+            except (OSError, sqlite3.Error) as e:
+                logger.error(f"Failed to open shared cache {CACHE_DB_PATH}: {e}")
+
+        return _shared_backend
@@ -0,0 +1,447 @@
+"""
+Two-tier application cache.
+
+TieredCache keeps live objects in an in-process LRU (an OrderedDict, so
+lookups, promotions and evictions are O(1)) with per-entry TTLs, in front of
+an optional shared tier from leadfactory.cache.backends. Entries carry tags,
+and a tag index makes invalidating a tag proportional to the entries it
+covers rather than a scan of every key. get_or_set gives single-flight
+(dogpile) protection: concurrent misses for one key, in this process and,
+with a shared tier, in other workers, wait for a single recomputation.
+"""
+
+import logging
+import math
+import pickle  # nosec B403 - only reads payloads this application wrote
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from leadfactory.cache.backends import CacheBackend
+from leadfactory.utils.metrics import (
+    CACHE_EVICTIONS,
+    CACHE_HITS,
+    CACHE_INVALIDATIONS,
+    CACHE_MISSES,
+    CACHE_RECOMPUTES,
+    record_metric,
+)
+
+logger = logging.getLogger(__name__)
+
+# How often waiters poll the shared tier while another worker recomputes
+_SHARED_WAIT_POLL_SECONDS = 0.05
+
+
+def serialize(value: Any) -> Optional[bytes]:
+    """
+    Serialize a value for the shared tier.
+
+    Always pickles, so a value read back from the shared tier has the same
+    types (tuples, non-string keys, datetimes) as the one held in process.
+    """
+    try:
+        return pickle.dumps(value)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        logger.warning(f"Not sharing unserializable cache value: {e}")
+        return None
+
+
+def deserialize(payload: bytes) -> Any:
+    """Reverse serialize()."""
+    return pickle.loads(payload)  # nosec B301
+
+
+@dataclass
+class _Entry:
+    """Value held by the in-process tier."""
+
+    value: Any
+    expires_at: float
+    tags: tuple[str, ...]
+
+
+class TieredCache:
+    """
+    In-process LRU/TTL cache with an optional shared tier.
+
+    Values are returned as stored in this process, so callers must not mutate
+    them. None is not cacheable; get() uses it to signal a miss. Shared-tier
+    errors are logged by the backend and the cache degrades to in-process only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = 1000,
+        default_ttl: float = 300,
+        backend: Optional[CacheBackend] = None,
+        sync_interval: float = 1.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            name: Cache name, used to namespace shared keys and label metrics
+            max_entries: Maximum number of entries held in process
+            default_ttl: Default TTL in seconds; zero or less never expires
+            backend: Shared tier, or None for an in-process cache
+            sync_interval: Seconds between checks for other workers' invalidations
+            clock: Time source in seconds
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.backend = backend
+        self.sync_interval = sync_interval
+        self._clock = clock
+
+        self.stats = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expired": 0,
+            "invalidations": 0,
+        }
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._tag_index: dict[str, set[str]] = {}
+        self._lock = threading.RLock()
+        self._flights: dict[str, threading.Event] = {}
+        self._next_sync = 0.0
+        self._invalidation_seq = backend.invalidations_since(-1)[0] if backend else 0
+
+        # Bind hot-path metric labels once rather than on every lookup
+        self._memory_hits = CACHE_HITS.labels(cache=name, tier="memory")
+        self._shared_hits = CACHE_HITS.labels(cache=name, tier="shared")
+        self._misses = CACHE_MISSES.labels(cache=name)
+        self._evictions = CACHE_EVICTIONS.labels(cache=name)
+
+    @property
+    def entries(self) -> OrderedDict:
+        """Entries held in process, least recently used first."""
+        return self._entries
+
+    def _shared_key(self, key: str) -> str:
+        return f"{self.name}:{key}"
+
+    def _shared_tag(self, tag: str) -> str:
+        return f"{self.name}:{tag}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        value = self._lookup(key)
+        if value is None:
+            with self._lock:
+                self.stats["misses"] += 1
+            record_metric(self._misses)
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """
+        Store a value in both tiers.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: TTL in seconds, defaulting to default_ttl; zero or less never expires
+            tags: Tags to invalidate the entry by
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = self._clock() + ttl if ttl > 0 else math.inf
+        entry = _Entry(value=value, expires_at=expires_at, tags=tuple(tags))
+
+        with self._lock:
+            self._store(key, entry)
+
+        if self.backend is not None:
+            payload = serialize(value)
+            if payload is not None:
+                self.backend.set(
+                    self._shared_key(key),
+                    payload,
+                    expires_at,
+                    [self.name] + [self._shared_tag(tag) for tag in entry.tags],
+                )
+
+    def delete(self, key: str) -> bool:
+        """Remove a key from both tiers; return whether it was cached."""
+        with self._lock:
+            removed = self._remove(key)
+        if self.backend is not None:
+            removed = (
+                self.backend.invalidate(keys=[self._shared_key(key)], now=self._clock())
+                > 0
+                or removed
+            )
+        if removed:
+            self._record_invalidations(1)
+        return removed
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Remove every entry carrying any of the tags from both tiers.
+
+        Args:
+            *tags: Tags to invalidate
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tag_index.get(tag, ()))
+            for key in keys:
+                self._remove(key)
+        count = len(keys)
+        if self.backend is not None and tags:
+            count = max(
+                count,
+                self.backend.invalidate(
+                    tags=[self._shared_tag(tag) for tag in tags], now=self._clock()
+                ),
+            )
+        self._record_invalidations(count)
+        return count
+
+    def clear(self) -> None:
+        """Remove every entry of this cache from both tiers."""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._tag_index.clear()
+        if self.backend is not None:
+            count = max(
+                count, self.backend.invalidate(tags=[self.name], now=self._clock())
+            )
+        self._record_invalidations(count)
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[float] = None,
+        tags: Iterable[str] = (),
+        wait_timeout: float = 30.0,
+    ) -> Any:
+        """
+        Return the cached value for key, computing and caching it on a miss.
+
+        Concurrent misses for the same key wait for one caller to compute the
+        value instead of all recomputing it. If the computing caller fails, a
+        waiter takes over. A None result is returned but not cached.
+
+        Args:
+            key: Cache key
+            compute: Zero-argument callable producing the value
+            ttl: TTL in seconds, defaulting to default_ttl
+            tags: Tags to invalidate the entry by
+            wait_timeout: Longest time to wait for another caller's computation
+
+        Returns:
+            The cached or freshly computed value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = threading.Event()
+
+            if not leader:
+                flight.wait(wait_timeout)
+                value = self._lookup(key)
+                if value is not None:
+                    record_metric(CACHE_RECOMPUTES, cache=self.name, role="waiter")
+                    return value
+                continue
+
+            try:
+                return self._compute_once(key, compute, ttl, tags, wait_timeout)
+            finally:
+                with self._lock:
+                    self._flights.pop(key, None)
+                flight.set()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                **self.stats,
+                "name": self.name,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "shared": self.backend is not None,
+            }
+
+    def _compute_once(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[float],
+        tags: Iterable[str],
+        wait_timeout: float,
+    ) -> Any:
+        """Compute a value as this process's leader for key."""
+        # Another thread may have finished between our miss and taking the lead
+        value = self._lookup(key)
+        if value is not None:
+            return value
+
+        shared_key = self._shared_key(key)
+        locked = False
+        if self.backend is not None:
+            locked = self.backend.acquire_lock(shared_key, wait_timeout, self._clock())
+            if not locked:
+                value = self._wait_for_shared(key, wait_timeout)
+                if value is not None:
+                    record_metric(CACHE_RECOMPUTES, cache=self.name, role="waiter")
+                    return value
+
+        try:
+            value = compute()
+            if value is not None:
+                self.set(key, value, ttl, tags)
+            record_metric(CACHE_RECOMPUTES, cache=self.name, role="leader")
+            return value
+        finally:
+            if locked:
+                self.backend.release_lock(shared_key)
+
+    def _wait_for_shared(self, key: str, wait_timeout: float) -> Optional[Any]:
+        """Poll the shared tier while another worker computes key."""
+        deadline = time.monotonic() + wait_timeout
+        shared_key = self._shared_key(key)
+        while time.monotonic() < deadline:
+            time.sleep(_SHARED_WAIT_POLL_SECONDS)
+            value = self._lookup(key)
+            if value is not None:
+                return value
+            # Lock released (or expired) without a value: compute it ourselves
+            if self.backend.acquire_lock(shared_key, 0, self._clock()):
+                return None
+        return None
+
+    def _lookup(self, key: str) -> Optional[Any]:
+        """Read a value from either tier, recording hits but not misses."""
+        now = self._clock()
+        with self._lock:
+            self._sync_invalidations(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.stats["hits"] += 1
+                    record_metric(self._memory_hits)
+                    return entry.value
+                self._remove(key)
+                self.stats["expired"] += 1
+
+        if self.backend is None:
+            return None
+
+        stored = self.backend.get(self._shared_key(key), now)
+        if stored is None:
+            return None
+        payload, expires_at, shared_tags = stored
+        try:
+            value = deserialize(payload)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable shared cache entry {key}: {e}")
+            return None
+
+        prefix = f"{self.name}:"
+        tags = tuple(
+            tag[len(prefix) :] for tag in shared_tags if tag.startswith(prefix)
+        )
+        with self._lock:
+            self._store(key, _Entry(value=value, expires_at=expires_at, tags=tags))
+            self.stats["hits"] += 1
+            self.stats["shared_hits"] += 1
+        record_metric(self._shared_hits)
+        return value
+
+    def _store(self, key: str, entry: _Entry) -> None:
+        """Insert into the in-process tier, evicting least recently used entries."""
+        self._remove(key)
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            old_key, old_entry = self._entries.popitem(last=False)
+            self._unindex(old_key, old_entry)
+            evicted += 1
+        if evicted:
+            self.stats["evictions"] += evicted
+            record_metric(self._evictions, evicted)
+
+    def _remove(self, key: str) -> bool:
+        """Drop a key from the in-process tier if present."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._unindex(key, entry)
+        return True
+
+    def _unindex(self, key: str, entry: _Entry) -> None:
+        for tag in entry.tags:
+            keys = self._tag_index.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_index[tag]
+
+    def _sync_invalidations(self, now: float) -> None:
+        """Apply invalidations made by other workers since the last check."""
+        if self.backend is None or now < self._next_sync:
+            return
+        self._next_sync = now + self.sync_interval
+        self._invalidation_seq, markers = self.backend.invalidations_since(
+            self._invalidation_seq
+        )
+
+        prefix = f"{self.name}:"
+        for marker in markers:
+            if marker == self.name:
+                self._entries.clear()
+                self._tag_index.clear()
+            elif marker.startswith("@" + prefix):
+                self._remove(marker[len(prefix) + 1 :])
+            elif marker.startswith(prefix):
+                for key in list(self._tag_index.get(marker[len(prefix) :], ())):
+                    self._remove(key)
+
+    def _record_invalidations(self, count: int) -> None:
+        if count:
+            with self._lock:
+                self.stats["invalidations"] += count
+            record_metric(CACHE_INVALIDATIONS, count, cache=self.name)
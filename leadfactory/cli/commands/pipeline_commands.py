@@ -252,3 +252,98 @@ def mockup(ctx, business_id: Optional[str], output: Optional[str], tier: Optiona
         if output:
             cmd.extend(["--output", output])
         subprocess.run(cmd)
+
+
+@click.command()
+@click.option(
+    "--scrape/--no-scrape",
+    "run_scrape",
+    default=True,
+    help="Scrape new businesses while the later stages run",
+)
+@click.option("--limit", default=50, help="Limit number of businesses to fetch per API")
+@click.option("--zip-code", help="Scrape only the specified ZIP code")
+@click.option("--vertical", help="Scrape only the specified vertical")
+@click.option(
+    "--backfill", is_flag=True, help="Also queue businesses that were never enriched"
+)
+@click.option("--batch-size", type=int, help="Businesses per micro-batch")
+@click.option("--workers", default=1, help="Workers per stage")
+@click.option(
+    "--barrier",
+    is_flag=True,
+    help="Finish each stage before starting the next, like run_nightly.sh",
+)
+@click.pass_context
+def stream(
+    ctx,
+    run_scrape: bool,
+    limit: int,
+    zip_code: Optional[str],
+    vertical: Optional[str],
+    backfill: bool,
+    batch_size: Optional[int],
+    workers: int,
+    barrier: bool,
+):
+    """Run all pipeline stages at once over micro-batches of businesses"""
+    click.echo("Streaming pipeline" + (" (barrier mode)" if barrier else ""))
+    if zip_code:
+        click.echo(f"ZIP code filter: {zip_code}")
+    if vertical:
+        click.echo(f"Vertical filter: {vertical}")
+
+    if ctx.obj["dry_run"]:
+        click.echo("DRY RUN: Would execute streaming pipeline")
+        return
+
+    from leadfactory.pipeline import stream_runner
+
+    # Dedupe keeps a single worker so two batches never merge the same cluster
+    stages = stream_runner.default_stages(
+        workers={stage: workers for stage in ("enrich", "score", "mockup", "email")}
+    )
+
+    source = None
+    if run_scrape:
+        verticals = None
+        if vertical:
+            from leadfactory.pipeline.scrape import (
+                VERTICALS_CONFIG_PATH,
+                load_yaml_config,
+            )
+
+            verticals = [
+                v
+                for v in load_yaml_config(VERTICALS_CONFIG_PATH).get("verticals", [])
+                if v.get("name") == vertical
+            ]
+            if not verticals:
+                click.echo(f"Error: Unknown vertical {vertical}", err=True)
+                ctx.exit(1)
+        source = stream_runner.scrape_source(
+            zip_codes=[zip_code] if zip_code else None,
+            verticals=verticals,
+            limit=limit,
+        )
+
+    options = {"source": source, "barrier": barrier}
+    if batch_size:
+        options["batch_size"] = batch_size
+    runner = stream_runner.StreamRunner(stages, **options)
+
+    if backfill:
+        queued = runner.storage.seed_stage_status(stages[0].name)
+        click.echo(f"Queued {len(queued)} businesses that were never enriched")
+
+    result = runner.run()
+    for name, stats in result.stages.items():
+        click.echo(
+            f"{name}: {stats.completed} completed, {stats.skipped} skipped, "
+            f"{stats.failed} failed in {stats.batches} batches"
+        )
+    if result.first_output_seconds is not None:
+        click.echo(f"First email after {result.first_output_seconds:.1f}s")
+    click.echo(
+        f"Processed {result.outputs} items in {result.elapsed_seconds:.1f} seconds"
+    )
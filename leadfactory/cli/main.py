@@ -86,6 +86,7 @@ pipeline.add_command(pipeline_commands.dedupe)
 pipeline.add_command(pipeline_commands.email)
 pipeline.add_command(pipeline_commands.score)
 pipeline.add_command(pipeline_commands.mockup)
+pipeline.add_command(pipeline_commands.stream)
 
 admin.add_command(admin_commands.db_setup)
 admin.add_command(admin_commands.migrate)
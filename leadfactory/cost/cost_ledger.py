@@ -0,0 +1,561 @@
+"""
+Write-Behind Cost Ledger
+------------------------
+This module buffers cost entries in memory and writes them to the cost
+tracking database in batched transactions, so recording a cost does not
+open, write and commit a SQLite connection on the calling thread.
+
+Durability comes from a per-process append-only journal: every entry is
+written to the journal before add_cost returns, and the journal is replayed
+on the next start if the process dies before its entries are flushed.
+Replays are idempotent because each entry carries a unique entry_id.
+
+The ledger also keeps running totals for the current day and month so that
+budget checks can be answered from memory, including entries that have not
+been flushed yet. Totals are shared by every process writing to the same
+database: they are re-read from the database and the other processes'
+journals whenever they are older than COST_LEDGER_TOTALS_TTL_SECONDS.
+"""
+
+import atexit
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager, suppress
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Optional
+
+from leadfactory.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Flush once this many entries are pending, or after this many seconds
+COST_LEDGER_BATCH_SIZE = int(os.environ.get("COST_LEDGER_BATCH_SIZE", "100"))
+COST_LEDGER_FLUSH_INTERVAL = float(
+    os.environ.get("COST_LEDGER_FLUSH_INTERVAL_SECONDS", "1.0")
+)
+# fsync the journal on every entry (survives power loss, not just crashes)
+COST_LEDGER_FSYNC = os.environ.get("COST_LEDGER_FSYNC", "false").lower() == "true"
+# Re-read spend recorded by other processes at most this often
+COST_LEDGER_TOTALS_TTL = float(os.environ.get("COST_LEDGER_TOTALS_TTL_SECONDS", "1.0"))
+
+
+@dataclass
+class CostEntry:
+    """A single cost entry awaiting a write to the costs table."""
+
+    entry_id: str
+    timestamp: str
+    service: str
+    operation: Optional[str]
+    amount: float
+    details: Optional[str]
+    batch_id: Optional[str]
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process with the given PID is running."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class CostLedger:
+    """Write-behind ledger for the costs table of one database file."""
+
+    def __init__(
+        self,
+        db_path: str,
+        default_budget: float = 0.0,
+        batch_size: int = COST_LEDGER_BATCH_SIZE,
+        flush_interval: float = COST_LEDGER_FLUSH_INTERVAL,
+        fsync: bool = COST_LEDGER_FSYNC,
+        totals_ttl: float = COST_LEDGER_TOTALS_TTL,
+    ):
+        """Initialize the ledger, replaying journals left by dead processes.
+
+        Args:
+            db_path: Path to the cost tracking SQLite database
+            default_budget: Budget recorded for a month seen for the first time
+            batch_size: Pending entries that trigger an early flush
+            flush_interval: Maximum seconds an entry stays unflushed
+            fsync: Whether to fsync the journal after every entry
+            totals_ttl: Seconds before totals are re-read from the database
+                and other processes' journals
+        """
+        self.db_path = db_path
+        self.default_budget = default_budget
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.totals_ttl = totals_ttl
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._open_connection()
+        self._recover_journals()
+        self._start()
+
+    def _open_connection(self) -> None:
+        self._conn_lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    def _start(self) -> None:
+        """Set up per-process state: journal, totals and the flush thread."""
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: list[CostEntry] = []
+        self._wake = threading.Event()
+        self._closed = False
+
+        # Journals are named by owning PID so a restart can tell live ones
+        # from those left behind by a crash
+        self.journal_path = (
+            f"{self.db_path}.journal-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        )
+        self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+        self._day_key = ""
+        self._month_key = (0, 0)
+        self._day_totals: dict[str, float] = defaultdict(float)
+        self._month_totals: dict[str, float] = defaultdict(float)
+        self._month_budget = 0.0
+        self._totals_loaded_at = float("-inf")
+        with self._lock:
+            self._refresh_totals(datetime.now())
+
+        self._thread = threading.Thread(
+            target=self._run, name="cost-ledger-flush", daemon=True
+        )
+        self._thread.start()
+
+    @contextmanager
+    def connection(self):
+        """Borrow the ledger's persistent connection.
+
+        Pending entries are flushed first so that queries see every
+        acknowledged cost.
+        """
+        self.flush()
+        with self._conn_lock:
+            yield self._conn
+
+    def record(
+        self,
+        timestamp: str,
+        service: str,
+        operation: Optional[str],
+        amount: float,
+        details: Optional[str] = None,
+        batch_id: Optional[str] = None,
+    ) -> CostEntry:
+        """Journal a cost entry and queue it for the next flush.
+
+        Args:
+            timestamp: ISO timestamp of the cost
+            service: Service name
+            operation: Operation name
+            amount: Cost amount in USD
+            details: JSON-encoded details
+            batch_id: Batch ID for batch-specific costs
+
+        Returns:
+            The queued entry
+        """
+        entry = CostEntry(
+            entry_id=uuid.uuid4().hex,
+            timestamp=timestamp,
+            service=service,
+            operation=operation,
+            amount=amount,
+            details=details,
+            batch_id=batch_id,
+        )
+        line = json.dumps(asdict(entry)) + "\n"
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cost ledger is closed")
+            self._journal.write(line)
+            self._journal.flush()
+            if self.fsync:
+                os.fsync(self._journal.fileno())
+
+            self._pending.append(entry)
+            self._roll(datetime.fromisoformat(timestamp))
+            self._day_totals[service] += amount
+            self._month_totals[service] += amount
+            should_wake = len(self._pending) >= self.batch_size
+
+        if should_wake:
+            self._wake.set()
+        return entry
+
+    def daily_total(self, service: Optional[str] = None) -> float:
+        """Get today's spend across processes, including unflushed entries."""
+        with self._lock:
+            self._current_totals()
+            if service:
+                return self._day_totals.get(service, 0.0)
+            return sum(self._day_totals.values())
+
+    def monthly_total(self, service: Optional[str] = None) -> float:
+        """Get this month's spend across processes, including unflushed entries."""
+        with self._lock:
+            self._current_totals()
+            if service:
+                return self._month_totals.get(service, 0.0)
+            return sum(self._month_totals.values())
+
+    def monthly_budget(self) -> float:
+        """Get this month's budget as last loaded or set."""
+        with self._lock:
+            self._current_totals()
+            return self._month_budget
+
+    def set_monthly_budget(self, year: int, month: int, amount: float) -> None:
+        """Update the cached budget after the monthly_budgets row changes."""
+        with self._lock:
+            if (year, month) == self._month_key:
+                self._month_budget = amount
+
+    def pending_count(self) -> int:
+        """Number of entries not yet written to the database."""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> int:
+        """Write pending entries to the database in one transaction.
+
+        Returns:
+            Number of entries written
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = self._pending
+                self._pending = []
+            if not batch:
+                return 0
+
+            try:
+                with self._conn_lock:
+                    self._write_entries(batch)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(batch)} cost entries: {e}")
+                with self._lock:
+                    self._pending = batch + self._pending
+                return 0
+
+            self._compact_journal()
+            logger.debug(f"Flushed {len(batch)} cost entries to {self.db_path}")
+            return len(batch)
+
+    def close(self) -> None:
+        """Flush remaining entries and stop the flush thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self.flush()
+        with self._lock:
+            self._journal.close()
+            if not self._pending and os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+        with self._conn_lock:
+            self._conn.close()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            if self._closed:
+                break
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Cost ledger flush thread error: {e}")
+
+    def _write_entries(self, entries: list[CostEntry]) -> None:
+        """Insert entries and bump monthly_budgets.spent in one transaction.
+
+        Entries already present (by entry_id) are skipped, so replaying a
+        journal that was partially flushed does not double count.
+        """
+        spent_by_month: dict[tuple[int, int], float] = defaultdict(float)
+        cursor = self._conn.cursor()
+        try:
+            for entry in entries:
+                cursor.execute(
+                    """
+                    INSERT OR IGNORE INTO costs
+                        (timestamp, service, operation, amount, details,
+                         batch_id, entry_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        entry.timestamp,
+                        entry.service,
+                        entry.operation,
+                        entry.amount,
+                        entry.details,
+                        entry.batch_id,
+                        entry.entry_id,
+                    ),
+                )
+                if cursor.rowcount:
+                    recorded = datetime.fromisoformat(entry.timestamp)
+                    spent_by_month[(recorded.year, recorded.month)] += entry.amount
+
+            for (year, month), amount in spent_by_month.items():
+                cursor.execute(
+                    """
+                    UPDATE monthly_budgets
+                    SET spent = spent + ?
+                    WHERE year = ? AND month = ?
+                    """,
+                    (amount, year, month),
+                )
+                if not cursor.rowcount:
+                    cursor.execute(
+                        """
+                        INSERT INTO monthly_budgets (year, month, budget, spent)
+                        VALUES (?, ?, ?, ?)
+                        """,
+                        (year, month, self.default_budget, amount),
+                    )
+            self._conn.commit()
+        except Exception:
+            self._conn.rollback()
+            raise
+
+    def _compact_journal(self) -> None:
+        """Rewrite the journal so it only holds entries still pending."""
+        with self._lock:
+            if self._journal.closed:
+                return
+            self._journal.close()
+            tmp_path = f"{self.journal_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for entry in self._pending:
+                    f.write(json.dumps(asdict(entry)) + "\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.journal_path)
+            self._journal = open(self.journal_path, "a", encoding="utf-8")
+
+    def _journal_paths(self) -> list[str]:
+        return glob.glob(f"{glob.escape(self.db_path)}.journal-*")
+
+    @staticmethod
+    def _read_journal(path: str) -> tuple[list[CostEntry], int]:
+        """Read a journal file.
+
+        Returns:
+            The readable entries and the number of unreadable lines
+
+        Raises:
+            FileNotFoundError: If another process removed the journal
+        """
+        entries = []
+        unreadable = 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(CostEntry(**json.loads(line)))
+                except (ValueError, TypeError):
+                    unreadable += 1
+        return entries, unreadable
+
+    def _recover_journals(self) -> None:
+        """Replay journals left behind by processes that are no longer running."""
+        for path in self._journal_paths():
+            owner = path.rsplit(".journal-", 1)[-1].split("-", 1)[0]
+            if not owner.isdigit() or _pid_alive(int(owner)):
+                continue
+
+            try:
+                entries, unreadable = self._read_journal(path)
+            except FileNotFoundError:
+                # Another process starting up recovered it first
+                continue
+            if unreadable:
+                # A torn final line from a crash mid-write was never
+                # acknowledged to the caller
+                logger.warning(f"Skipping {unreadable} unreadable lines in {path}")
+
+            if entries:
+                with self._conn_lock:
+                    self._write_entries(entries)
+                logger.info(f"Recovered {len(entries)} cost entries from {path}")
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+    def _current_totals(self) -> None:
+        """Roll to today and re-read the totals if they are older than totals_ttl.
+
+        The caller must hold self._lock.
+        """
+        now = datetime.now()
+        self._roll(now)
+        if time.monotonic() - self._totals_loaded_at >= self.totals_ttl:
+            self._refresh_totals(now)
+
+    def _refresh_totals(self, now: datetime) -> None:
+        """Load today's and this month's totals and budget across processes.
+
+        Totals are what the database holds plus the entries still waiting in
+        any process's journal, this one's included. The caller must hold
+        self._lock, so no entry of this process is recorded in between.
+        """
+        day_start = datetime.combine(now.date(), datetime.min.time()).isoformat()
+        month_start = datetime(now.year, now.month, 1).isoformat()
+
+        # Journals are read before the database: an entry flushed in between
+        # is then found in the database instead of being missed by both
+        journaled: dict[str, CostEntry] = {}
+        for path in self._journal_paths():
+            if path.endswith(".tmp"):
+                continue
+            try:
+                entries, _ = self._read_journal(path)
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.timestamp >= month_start:
+                    journaled[entry.entry_id] = entry
+
+        with self._conn_lock:
+            cursor = self._conn.cursor()
+            flushed = set()
+            entry_ids = list(journaled)
+            for start in range(0, len(entry_ids), 500):
+                chunk = entry_ids[start : start + 500]
+                cursor.execute(
+                    "SELECT entry_id FROM costs WHERE entry_id IN "
+                    f"({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                flushed.update(row[0] for row in cursor.fetchall())
+            cursor.execute(
+                """
+                SELECT service, SUM(amount) FROM costs
+                WHERE timestamp >= ?
+                GROUP BY service
+                """,
+                (day_start,),
+            )
+            day_totals = dict(cursor.fetchall())
+            cursor.execute(
+                """
+                SELECT service, SUM(amount) FROM costs
+                WHERE timestamp >= ?
+                GROUP BY service
+                """,
+                (month_start,),
+            )
+            month_totals = dict(cursor.fetchall())
+            cursor.execute(
+                "SELECT budget FROM monthly_budgets WHERE year = ? AND month = ?",
+                (now.year, now.month),
+            )
+            row = cursor.fetchone()
+
+        day_totals = defaultdict(float, day_totals)
+        month_totals = defaultdict(float, month_totals)
+        # An entry flushed after its ID was checked is counted twice until the
+        # next refresh, which errs on the side of the budget
+        for entry_id, entry in journaled.items():
+            if entry_id in flushed:
+                continue
+            month_totals[entry.service] += entry.amount
+            if entry.timestamp >= day_start:
+                day_totals[entry.service] += entry.amount
+
+        self._day_key = now.date().isoformat()
+        self._month_key = (now.year, now.month)
+        self._day_totals = day_totals
+        self._month_totals = month_totals
+        # The first flush of a new month inserts the row with default_budget
+        self._month_budget = row[0] if row else self.default_budget
+        self._totals_loaded_at = time.monotonic()
+
+    def _roll(self, now: datetime) -> None:
+        """Reset the running totals when the day or month changes."""
+        if now.date().isoformat() != self._day_key:
+            self._day_key = now.date().isoformat()
+            self._day_totals = defaultdict(float)
+            self._totals_loaded_at = float("-inf")
+        if (now.year, now.month) != self._month_key:
+            self._month_key = (now.year, now.month)
+            self._month_totals = defaultdict(float)
+            self._month_budget = self.default_budget
+            self._totals_loaded_at = float("-inf")
+
+    def _reset_after_fork(self) -> None:
+        """Give a forked child its own connection, journal and flush thread.
+
+        Entries pending in the parent stay the parent's responsibility.
+        """
+        self._open_connection()
+        self._start()
+
+
+_ledgers: dict[str, CostLedger] = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_cost_ledger(db_path: str, default_budget: float = 0.0) -> CostLedger:
+    """Get the process-wide ledger for a database file, creating it on first use.
+
+    Args:
+        db_path: Path to the cost tracking SQLite database
+        default_budget: Budget recorded for a month seen for the first time
+
+    Returns:
+        Shared CostLedger instance
+    """
+    key = os.path.abspath(db_path)
+    with _ledgers_lock:
+        ledger = _ledgers.get(key)
+        if ledger is None or ledger._closed:
+            ledger = CostLedger(db_path, default_budget=default_budget)
+            _ledgers[key] = ledger
+        return ledger
+
+
+def close_all_ledgers() -> None:
+    """Flush and close every process-wide ledger."""
+    with _ledgers_lock:
+        ledgers = list(_ledgers.values())
+        _ledgers.clear()
+    for ledger in ledgers:
+        try:
+            ledger.close()
+        except Exception as e:
+            logger.error(f"Error closing cost ledger {ledger.db_path}: {e}")
+
+
+def _reset_after_fork() -> None:
+    global _ledgers_lock
+    _ledgers_lock = threading.Lock()
+    for ledger in _ledgers.values():
+        ledger._reset_after_fork()
+
+
+atexit.register(close_all_ledgers)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
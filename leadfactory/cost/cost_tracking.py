@@ -27,6 +27,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+from leadfactory.cost.cost_ledger import get_cost_ledger
+
 # Import the unified logging system
 from leadfactory.utils.logging import get_logger
 
@@ -90,6 +92,9 @@ class CostTracker:
         )
         self.budget_gate_active = False
 
+        # Cost entries are written behind through a shared per-database ledger
+        self.ledger = get_cost_ledger(db_path, self.budget_gate_threshold)
+
         logger.info(f"Cost tracker initialized (db_path={db_path})")
 
     def _get_budget_constraints(self):
@@ -106,6 +111,7 @@ class CostTracker:
         """Initialize the cost tracking database."""
         # Create connection
         conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
         cursor = conn.cursor()
 
         # Create tables
@@ -118,11 +124,17 @@ class CostTracker:
                 operation TEXT,
                 amount REAL NOT NULL,
                 details TEXT,
-                batch_id TEXT
+                batch_id TEXT,
+                entry_id TEXT
             )
             """
         )
 
+        # Databases created before the write-behind ledger lack entry_id
+        cursor.execute("PRAGMA table_info(costs)")
+        if "entry_id" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE costs ADD COLUMN entry_id TEXT")
+
         cursor.execute(
             """
             CREATE TABLE IF NOT EXISTS batches (
@@ -160,6 +172,9 @@ class CostTracker:
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_costs_batch_id ON costs (batch_id)"
         )
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_costs_entry_id ON costs (entry_id)"
+        )
 
         # Commit and close
         conn.commit()
@@ -206,21 +221,16 @@ class CostTracker:
         # Record timestamp
         timestamp = datetime.now().isoformat()
 
-        # Insert into database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO costs (timestamp, service, operation, amount, details, batch_id)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (timestamp, service, operation, amount, details_json, batch_id),
+        # Journal the entry; it is written to the database in the next batch
+        self.ledger.record(
+            timestamp, service, operation, amount, details_json, batch_id
         )
-        conn.commit()
-        conn.close()
 
-        # Update monthly spent
-        self._update_monthly_spent(amount)
+        # Check if over budget and update metrics
+        budget = self.ledger.monthly_budget()
+        if metrics and budget > 0 and self.ledger.monthly_total() >= budget:
+            self.budget_gate_active = True
+            metrics.update_budget_gate_status(active=True)
 
         # Update metrics
         if metrics:
@@ -239,36 +249,8 @@ class CostTracker:
         Returns:
             Total cost for the day
         """
-        # Get today's date
-        today = datetime.now().date()
-        start_time = datetime.combine(today, datetime.min.time()).isoformat()
-        end_time = datetime.now().isoformat()
-
-        # Query database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        if service:
-            cursor.execute(
-                """
-                SELECT SUM(amount) FROM costs
-                WHERE timestamp >= ? AND timestamp <= ? AND service = ?
-                """,
-                (start_time, end_time, service),
-            )
-        else:
-            cursor.execute(
-                """
-                SELECT SUM(amount) FROM costs
-                WHERE timestamp >= ? AND timestamp <= ?
-                """,
-                (start_time, end_time),
-            )
-
-        result = cursor.fetchone()[0]
-        conn.close()
-
-        return result or 0.0
+        # Running totals include entries not yet flushed to the database
+        return self.ledger.daily_total(service)
 
     def get_monthly_cost(self, service: Optional[str] = None) -> float:
         """Get the total cost for the current month.
@@ -279,13 +261,8 @@ class CostTracker:
         Returns:
             Total cost for the month
         """
-        # Get current month
-        today = datetime.now()
-        year = today.year
-        month = today.month
-
-        # Get costs for this month
-        return self.get_monthly_costs(year, month).get("spent", 0.0)
+        # Running totals include entries not yet flushed to the database
+        return self.ledger.monthly_total(service)
 
     def get_monthly_costs(
         self, year: Optional[int] = None, month: Optional[int] = None
@@ -316,7 +293,18 @@ class CostTracker:
         end_time = end_date.isoformat()
 
         # Query database for costs
-        conn = sqlite3.connect(self.db_path)
+        with self.ledger.connection() as conn:
+            return self._query_monthly_costs(conn, year, month, start_time, end_time)
+
+    def _query_monthly_costs(
+        self,
+        conn: sqlite3.Connection,
+        year: int,
+        month: int,
+        start_time: str,
+        end_time: str,
+    ) -> dict[str, Any]:
+        """Aggregate a month's costs on an open connection."""
         cursor = conn.cursor()
 
         # Get total spent
@@ -367,8 +355,6 @@ class CostTracker:
                 operations[service] = {}
             operations[service][operation or "unknown"] = amount
 
-        conn.close()
-
         return {
             "year": year,
             "month": month,
@@ -391,28 +377,25 @@ class CostTracker:
         end_time = datetime.now().isoformat()
 
         # Query database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute(
-            """
-            SELECT service, operation, SUM(amount) FROM costs
-            WHERE timestamp >= ? AND timestamp <= ?
-            GROUP BY service, operation
-            """,
-            (start_time, end_time),
-        )
+        with self.ledger.connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT service, operation, SUM(amount) FROM costs
+                WHERE timestamp >= ? AND timestamp <= ?
+                GROUP BY service, operation
+                """,
+                (start_time, end_time),
+            )
+            rows = cursor.fetchall()
 
         # Build breakdown
         breakdown = {}
-        for row in cursor.fetchall():
-            service, operation, amount = row
+        for service, operation, amount in rows:
             if service not in breakdown:
                 breakdown[service] = {}
             breakdown[service][operation or "unknown"] = amount
 
-        conn.close()
-
         return breakdown
 
     def get_monthly_cost_breakdown(self) -> dict[str, dict[str, float]]:
@@ -453,101 +436,22 @@ class CostTracker:
         amount = max(0, amount)
 
         # Set budget in database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Check if budget exists
-        cursor.execute(
-            """
-            SELECT budget FROM monthly_budgets
-            WHERE year = ? AND month = ?
-            """,
-            (year, month),
-        )
-        result = cursor.fetchone()
-
-        if result:
-            # Update existing budget
-            cursor.execute(
-                """
-                UPDATE monthly_budgets
-                SET budget = ?
-                WHERE year = ? AND month = ?
-                """,
-                (amount, year, month),
-            )
-        else:
-            # Create new budget
+        with self.ledger.connection() as conn:
+            cursor = conn.cursor()
             cursor.execute(
                 """
                 INSERT INTO monthly_budgets (year, month, budget, spent)
                 VALUES (?, ?, ?, 0.0)
+                ON CONFLICT (year, month) DO UPDATE SET budget = excluded.budget
                 """,
                 (year, month, amount),
             )
-
-        conn.commit()
-        conn.close()
+            conn.commit()
+        self.ledger.set_monthly_budget(year, month, amount)
 
         logger.info(f"Monthly budget set: ${amount:.2f} for {year}-{month}")
         return True
 
-    def _update_monthly_spent(self, amount: float) -> None:
-        """Update the spent amount for the current month.
-
-        Args:
-            amount: Amount to add to spent
-        """
-        # Get current month
-        today = datetime.now()
-        year = today.year
-        month = today.month
-
-        # Update spent in database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Check if budget exists
-        cursor.execute(
-            """
-            SELECT budget, spent FROM monthly_budgets
-            WHERE year = ? AND month = ?
-            """,
-            (year, month),
-        )
-        result = cursor.fetchone()
-
-        if result:
-            # Update existing spent
-            budget, spent = result
-            new_spent = spent + amount
-            cursor.execute(
-                """
-                UPDATE monthly_budgets
-                SET spent = ?
-                WHERE year = ? AND month = ?
-                """,
-                (new_spent, year, month),
-            )
-
-            # Check if over budget and update metrics
-            if metrics and budget > 0 and new_spent >= budget:
-                self.budget_gate_active = True
-                metrics.update_budget_gate_status(active=True)
-        else:
-            # Create new budget with default values
-            default_budget = self.budget_gate_threshold
-            cursor.execute(
-                """
-                INSERT INTO monthly_budgets (year, month, budget, spent)
-                VALUES (?, ?, ?, ?)
-                """,
-                (year, month, default_budget, amount),
-            )
-
-        conn.commit()
-        conn.close()
-
     def is_budget_gate_active(self) -> bool:
         """Check if the budget gate is active.
 
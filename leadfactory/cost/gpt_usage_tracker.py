@@ -19,6 +19,7 @@ import json
 import sqlite3
 import threading
 import time
+from collections import defaultdict, deque
 from datetime import datetime, timedelta
 from functools import wraps
 from pathlib import Path
@@ -30,6 +31,120 @@ from leadfactory.utils.logging import get_logger
 logger = get_logger(__name__)
 
 
+class RollingSpendWindow:
+    """
+    In-memory spend totals over rolling day/week/month windows.
+
+    Costs are accumulated into per-minute buckets, and each window keeps a
+    running total per model that is adjusted as buckets enter and expire,
+    so reading the current totals is O(1) amortized instead of an
+    aggregate query over raw usage rows. Windows are resolved to the minute.
+    """
+
+    BUCKET_SECONDS = 60
+    WINDOWS = {
+        "daily": timedelta(days=1),
+        "weekly": timedelta(weeks=1),
+        "monthly": timedelta(days=30),
+    }
+
+    def __init__(self):
+        """Initialize an empty window."""
+        self._lock = threading.Lock()
+        self._buckets: dict[int, dict[str, float]] = {}
+        self._window_buckets = {window: deque() for window in self.WINDOWS}
+        self._window_totals = {window: defaultdict(float) for window in self.WINDOWS}
+        self._window_sizes = {
+            window: int(span.total_seconds()) // self.BUCKET_SECONDS
+            for window, span in self.WINDOWS.items()
+        }
+        self._longest_window = max(self._window_sizes, key=self._window_sizes.get)
+
+    def clear(self) -> None:
+        """Drop all accumulated spend."""
+        with self._lock:
+            self._buckets.clear()
+            for window in self.WINDOWS:
+                self._window_buckets[window].clear()
+                self._window_totals[window].clear()
+
+    def add(self, timestamp: float, model: str, cost: float) -> None:
+        """
+        Add spend for a model at a point in time.
+
+        Args:
+            timestamp: Unix timestamp of the usage
+            model: Model the spend is attributed to
+            cost: Cost in USD
+        """
+        if not cost:
+            return
+        minute = int(timestamp // self.BUCKET_SECONDS)
+        with self._lock:
+            bucket = self._buckets.get(minute)
+            if bucket is None:
+                # Late arrivals older than the newest bucket would break the
+                # ordering of the window queues, so fold them into it instead.
+                newest = self._newest_minute()
+                if newest is not None and minute < newest:
+                    minute = newest
+                    bucket = self._buckets[minute]
+                else:
+                    bucket = self._buckets[minute] = defaultdict(float)
+                    for window in self.WINDOWS:
+                        self._window_buckets[window].append(minute)
+            bucket[model] += cost
+            for window in self.WINDOWS:
+                self._window_totals[window][model] += cost
+
+    def totals(
+        self, model: Optional[str] = None, now: Optional[float] = None
+    ) -> dict[str, float]:
+        """
+        Get spend in each rolling window.
+
+        Args:
+            model: Only count spend for this model (default: all models)
+            now: Unix timestamp the windows end at (default: current time)
+
+        Returns:
+            Dictionary mapping window name (daily, weekly, monthly) to cost
+        """
+        current_minute = int(
+            (time.time() if now is None else now) // self.BUCKET_SECONDS
+        )
+        with self._lock:
+            self._expire(current_minute)
+            if model is None:
+                return {
+                    window: max(0.0, sum(totals.values()))
+                    for window, totals in self._window_totals.items()
+                }
+            return {
+                window: max(0.0, totals.get(model, 0.0))
+                for window, totals in self._window_totals.items()
+            }
+
+    def _newest_minute(self) -> Optional[int]:
+        queue = self._window_buckets[self._longest_window]
+        return queue[-1] if queue else None
+
+    def _expire(self, current_minute: int) -> None:
+        """Subtract buckets that have aged out of each window."""
+        for window, size in self._window_sizes.items():
+            queue = self._window_buckets[window]
+            totals = self._window_totals[window]
+            cutoff = current_minute - size
+            while queue and queue[0] < cutoff:
+                minute = queue.popleft()
+                for model, cost in self._buckets[minute].items():
+                    totals[model] -= cost
+                    if totals[model] <= 1e-12:
+                        del totals[model]
+                if window == self._longest_window:
+                    del self._buckets[minute]
+
+
 class GPTUsageTracker:
     """
     Tracks GPT API usage including tokens, costs, and request patterns.
@@ -57,6 +172,8 @@ class GPTUsageTracker:
         self.db_path = db_path or str(Path.home() / ".leadfactory" / "gpt_usage.db")
         self.cost_tracker = CostTracker()
         self._lock = threading.Lock()
+        self._spend_window = RollingSpendWindow()
+        self._spend_window_loaded = False
         self._init_database()
 
     def _init_database(self):
@@ -187,6 +304,9 @@ class GPTUsageTracker:
             conn.commit()
             conn.close()
 
+            if self._spend_window_loaded:
+                self._spend_window.add(timestamp, model, total_cost)
+
         # Track cost in the main cost tracker
         if success and total_cost > 0:
             self.cost_tracker.add_cost(
@@ -359,6 +479,69 @@ class GPTUsageTracker:
             "hourly_usage": hourly_usage,
         }
 
+    def get_spend_totals(self, model: Optional[str] = None) -> dict[str, float]:
+        """
+        Get spend over the rolling day, week and 30-day windows.
+
+        Totals come from an in-memory window kept current by track_usage; it
+        is built from the database on first use and after
+        invalidate_spend_cache().
+
+        Args:
+            model: Filter by specific model
+
+        Returns:
+            Dictionary with daily, weekly and monthly cost
+        """
+        if not self._spend_window_loaded:
+            self._load_spend_window()
+        return self._spend_window.totals(model)
+
+    def invalidate_spend_cache(self) -> None:
+        """
+        Rebuild the in-memory spend totals from the database on next use.
+
+        Call this after usage rows are written or removed outside this
+        tracker, e.g. by another process sharing the database.
+        """
+        with self._lock:
+            self._spend_window_loaded = False
+
+    def _load_spend_window(self) -> None:
+        """Load per-minute spend for the longest rolling window from SQLite."""
+        longest = max(RollingSpendWindow.WINDOWS.values())
+        start_timestamp = (datetime.now() - longest).timestamp()
+        bucket_seconds = RollingSpendWindow.BUCKET_SECONDS
+
+        with self._lock:
+            if self._spend_window_loaded:
+                return
+
+            conn = sqlite3.connect(self.db_path)
+            try:
+                cursor = conn.cursor()
+                cursor.execute(
+                    """
+                    SELECT CAST(timestamp / ? AS INTEGER) AS minute, model,
+                           SUM(total_cost)
+                    FROM gpt_usage
+                    WHERE timestamp >= ?
+                    GROUP BY minute, model
+                    ORDER BY minute
+                """,
+                    (bucket_seconds, start_timestamp),
+                )
+                rows = cursor.fetchall()
+            finally:
+                conn.close()
+
+            self._spend_window.clear()
+            for minute, model, cost in rows:
+                self._spend_window.add(minute * bucket_seconds, model, cost or 0.0)
+            self._spend_window_loaded = True
+
+        logger.debug(f"Loaded {len(rows)} spend buckets from {self.db_path}")
+
     def get_current_usage(self, period_hours: int = 1) -> dict[str, Any]:
         """
         Get current usage statistics for the specified period.
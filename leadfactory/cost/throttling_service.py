@@ -199,27 +199,12 @@ class ThrottlingService:
     ) -> dict[str, float]:
         """Get current budget utilization status."""
         try:
-            # Get usage for different periods using get_usage_stats
-            daily_usage = self.usage_tracker.get_usage_stats(
-                start_time=datetime.now() - timedelta(days=1),
-                end_time=datetime.now(),
-                model=model,
-            )
-            weekly_usage = self.usage_tracker.get_usage_stats(
-                start_time=datetime.now() - timedelta(weeks=1),
-                end_time=datetime.now(),
-                model=model,
-            )
-            monthly_usage = self.usage_tracker.get_usage_stats(
-                start_time=datetime.now() - timedelta(days=30),
-                end_time=datetime.now(),
-                model=model,
-            )
-
-            # Extract total costs from the summary
-            daily_cost = daily_usage.get("summary", {}).get("total_cost", 0.0)
-            weekly_cost = weekly_usage.get("summary", {}).get("total_cost", 0.0)
-            monthly_cost = monthly_usage.get("summary", {}).get("total_cost", 0.0)
+            # Rolling-window totals are kept in memory by the usage tracker,
+            # so this does not touch the database on every decision
+            spend = self.usage_tracker.get_spend_totals(model)
+            daily_cost = spend["daily"]
+            weekly_cost = spend["weekly"]
+            monthly_cost = spend["monthly"]
 
             # Get budget limits
             daily_limit = self.budget_config.get_budget_limit("daily", model, endpoint)
@@ -5,6 +5,8 @@ This module provides a unified interface for multiple LLM providers with
 automatic fallback, cost tracking, and intelligent error handling.
 """
 
+from .async_client import AsyncLLMClient, AsyncRateLimiter
+from .cache import LLMResponseCache
 from .client import LLMClient
 from .config import FallbackStrategy, LLMConfig
 from .exceptions import (
@@ -22,6 +24,9 @@ from .exceptions import (
 
 __all__ = [
     "LLMClient",
+    "AsyncLLMClient",
+    "AsyncRateLimiter",
+    "LLMResponseCache",
     "LLMConfig",
     "FallbackStrategy",
     "LLMError",
@@ -0,0 +1,694 @@
+"""
+Asynchronous LLM client with concurrent fan-out.
+
+AsyncLLMClient keeps LLMClient's provider fallback, cost limits, usage
+tracking and response cache, but issues provider requests on an event loop.
+Each provider is bounded by its own semaphore and an AsyncRateLimiter, so
+chat_completion_many() can fan a list of prompts out across providers
+without exceeding their RPM/TPM limits. Identical prompts that are in flight
+at the same time share a single provider call.
+
+A ``stub`` provider answers locally after a configurable delay so throughput
+can be measured without network access or API keys.
+"""
+
+import asyncio
+import copy
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Optional, Union
+
+from leadfactory.cost.per_service_cost_caps import (
+    can_execute_service_operation,
+)
+from leadfactory.cost.service_cost_decorators import ServiceCostCapExceeded
+
+from .cache import cache_namespace
+from .client import LLMClient
+from .config import LLMConfig
+from .exceptions import (
+    AllProvidersFailedError,
+    LLMQuotaExceededError,
+    LLMRateLimitError,
+    classify_error,
+)
+
+try:
+    import openai
+
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+try:
+    import anthropic
+
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Sliding window length used by the RPM/TPM limits
+RATE_LIMIT_WINDOW_SECONDS = 60.0
+
+# A chat_completion_many() item: a message list, or a dict with "messages" and
+# any chat_completion() keyword overrides.
+CompletionRequest = Union[list[dict[str, str]], dict[str, Any]]
+
+
+class AsyncRateLimiter:
+    """
+    Non-blocking requests-per-minute and tokens-per-minute limiter.
+
+    Admitted requests are kept in deques ordered by time together with a
+    running token total, so expiring old entries and checking both limits
+    costs O(1) amortized per request instead of rebuilding lists. Waiting
+    callers sleep on the event loop rather than blocking the thread.
+    """
+
+    def __init__(
+        self,
+        rpm: Optional[int] = None,
+        tpm: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        window: float = RATE_LIMIT_WINDOW_SECONDS,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rpm: Maximum requests per window, or None for no limit
+            tpm: Maximum tokens per window, or None for no limit
+            clock: Monotonic time source
+            window: Window length in seconds
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self._clock = clock
+        self._request_times: deque[float] = deque()
+        self._token_usage: deque[tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+
+    @property
+    def tokens_in_window(self) -> int:
+        """Tokens admitted during the current window."""
+        self._expire(self._clock())
+        return self._tokens_in_window
+
+    @property
+    def requests_in_window(self) -> int:
+        """Requests admitted during the current window."""
+        self._expire(self._clock())
+        return len(self._request_times)
+
+    def _expire(self, now: float) -> None:
+        """Drop entries that have left the window."""
+        cutoff = now - self.window
+        while self._request_times and self._request_times[0] <= cutoff:
+            self._request_times.popleft()
+        while self._token_usage and self._token_usage[0][0] <= cutoff:
+            self._tokens_in_window -= self._token_usage.popleft()[1]
+
+    def _delay(self, tokens: int, now: float) -> float:
+        """Seconds until a request for ``tokens`` fits both limits."""
+        delay = 0.0
+        if self.rpm and len(self._request_times) >= self.rpm:
+            delay = self._request_times[0] + self.window - now
+        if (
+            self.tpm
+            and self._token_usage
+            and self._tokens_in_window + tokens > self.tpm
+        ):
+            # Free enough of the oldest usage to make room for this request
+            needed = self._tokens_in_window + tokens - self.tpm
+            for timestamp, used in self._token_usage:
+                needed -= used
+                if needed <= 0:
+                    delay = max(delay, timestamp + self.window - now)
+                    break
+            else:
+                delay = max(delay, self._token_usage[-1][0] + self.window - now)
+        return delay
+
+    async def acquire(self, tokens: int = 1) -> float:
+        """
+        Wait until a request may be sent, then record it.
+
+        Args:
+            tokens: Estimated tokens the request will consume
+
+        Returns:
+            Seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            now = self._clock()
+            self._expire(now)
+            delay = self._delay(tokens, now)
+            if delay <= 0:
+                break
+            logger.debug(f"Rate limit: waiting {delay:.2f}s")
+            await asyncio.sleep(delay)
+            waited += delay
+
+        # No await between the check and the update, so concurrent tasks on
+        # the same loop cannot both claim the last slot.
+        self._request_times.append(now)
+        self._token_usage.append((now, tokens))
+        self._tokens_in_window += tokens
+        return waited
+
+
+class AsyncLLMClient(LLMClient):
+    """
+    Asynchronous counterpart of LLMClient.
+
+    Shares LLMClient's configuration, fallback order, cost limits, usage
+    tracking and response cache; only the provider calls, rate limiting and
+    concurrency control differ.
+    """
+
+    def __init__(
+        self,
+        config: Optional[LLMConfig] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        """
+        Initialize the async LLM client.
+
+        Args:
+            config: LLM configuration. If None, loads from environment.
+            max_concurrency: Cap on requests in flight across all providers
+                in chat_completion_many(). Defaults to no global cap.
+        """
+        self.max_concurrency = max_concurrency
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._http_session = None
+        self._http_session_loop: Optional[asyncio.AbstractEventLoop] = None
+        super().__init__(config)
+
+    def _initialize_providers(self):
+        """Initialize async provider clients."""
+        for name, provider_config in self.config.providers.items():
+            if not provider_config.enabled:
+                continue
+
+            try:
+                if name == "openai" and OPENAI_AVAILABLE and provider_config.api_key:
+                    self._provider_clients[name] = openai.AsyncOpenAI(
+                        api_key=provider_config.api_key, timeout=provider_config.timeout
+                    )
+                elif (
+                    name == "anthropic"
+                    and ANTHROPIC_AVAILABLE
+                    and provider_config.api_key
+                ):
+                    self._provider_clients[name] = anthropic.AsyncAnthropic(
+                        api_key=provider_config.api_key, timeout=provider_config.timeout
+                    )
+                elif (
+                    name == "ollama" and AIOHTTP_AVAILABLE and provider_config.base_url
+                ):
+                    self._provider_clients[name] = {
+                        "base_url": provider_config.base_url,
+                        "timeout": provider_config.timeout,
+                    }
+                elif name == "stub":
+                    self._provider_clients[name] = {
+                        "latency": float(
+                            provider_config.additional_config.get("latency", 0.0)
+                        ),
+                    }
+                else:
+                    continue
+
+                self._rate_limiters[name] = AsyncRateLimiter(
+                    rpm=provider_config.rate_limit_rpm,
+                    tpm=provider_config.rate_limit_tpm,
+                )
+                self._cost_tracker[name] = {
+                    "daily_cost": 0.0,
+                    "monthly_cost": 0.0,
+                    "cache_saved_tokens": 0,
+                    "cache_saved_cost": 0.0,
+                    "last_reset": time.time(),
+                }
+                logger.info(f"Async {name} client initialized")
+
+            except Exception as e:
+                logger.error(f"Failed to initialize async {name} provider: {e}")
+
+    def _get_semaphore(self, provider_name: str) -> asyncio.Semaphore:
+        """Return the concurrency limit for a provider on the running loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            # Semaphores bind to the loop they first wait on; start fresh when
+            # the client is reused from another asyncio.run().
+            self._semaphores = {}
+            self._semaphore_loop = loop
+
+        semaphore = self._semaphores.get(provider_name)
+        if semaphore is None:
+            provider_config = self.config.providers[provider_name]
+            limit = provider_config.additional_config.get(
+                "max_concurrency", self.config.max_concurrency_per_provider
+            )
+            semaphore = asyncio.Semaphore(max(1, int(limit)))
+            self._semaphores[provider_name] = semaphore
+        return semaphore
+
+    async def chat_completion(
+        self,
+        messages: list[dict[str, str]],
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        use_cache: bool = True,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """
+        Generate a chat completion using the best available provider.
+
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
+            model: Model to use (optional, uses provider default)
+            temperature: Sampling temperature (optional, uses config default)
+            max_tokens: Maximum tokens to generate (optional, uses config default)
+            use_cache: Set to False to bypass the response cache for this call
+            **kwargs: Additional provider-specific parameters
+
+        Returns:
+            Standardized response dictionary with content, usage, and metadata
+
+        Raises:
+            AllProvidersFailedError: If all providers fail
+            LLMQuotaExceededError: If cost limits are exceeded
+        """
+        temperature = temperature or self.config.default_temperature
+        max_tokens = max_tokens or self.config.default_max_tokens
+
+        if not (self.config.enable_caching and use_cache):
+            return await self._complete_with_fallback(
+                messages, model, temperature, max_tokens, None, **kwargs
+            )
+
+        cache_key = self._generate_cache_key(
+            messages, model, temperature, max_tokens, kwargs
+        )
+        cached = self._request_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Returning cached response")
+            self._track_usage(
+                cached.get("provider"),
+                cached.get("usage", {}),
+                cached=True,
+                model=cached.get("model"),
+            )
+            return cached
+
+        # Coalesce identical prompts that are already in flight
+        pending = self._inflight.get(cache_key)
+        if pending is not None:
+            response = await asyncio.shield(pending)
+            self._track_usage(
+                response.get("provider"),
+                response.get("usage", {}),
+                cached=True,
+                model=response.get("model"),
+            )
+            return copy.deepcopy(response)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            response = await self._complete_with_fallback(
+                messages, model, temperature, max_tokens, cache_key, **kwargs
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(response)
+            return response
+        finally:
+            self._inflight.pop(cache_key, None)
+
+    async def _complete_with_fallback(
+        self,
+        messages: list[dict[str, str]],
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        cache_key: Optional[str],
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Try providers in fallback order until one succeeds."""
+        estimated_tokens = self._estimate_tokens(messages, max_tokens)
+
+        provider_order = self.config.get_provider_order()
+        if not provider_order:
+            raise AllProvidersFailedError({"all": Exception("No providers available")})
+
+        provider_errors = {}
+
+        for attempt, provider_name in enumerate(provider_order):
+            if attempt >= self.config.max_fallback_attempts:
+                break
+
+            if provider_name not in self._provider_clients:
+                continue
+
+            try:
+                self._check_cost_limits(provider_name, estimated_tokens)
+
+                async with self._get_semaphore(provider_name):
+                    await self._rate_limiters[provider_name].acquire(estimated_tokens)
+                    logger.debug(f"Attempting request with provider: {provider_name}")
+                    response = await self._make_request_async(
+                        provider_name,
+                        messages,
+                        model,
+                        temperature,
+                        max_tokens,
+                        **kwargs,
+                    )
+
+                self._track_usage(provider_name, response.get("usage", {}))
+
+                if cache_key:
+                    self._request_cache.set(
+                        cache_key,
+                        response,
+                        namespace=cache_namespace(
+                            provider_name, response.get("model") or model
+                        ),
+                    )
+
+                logger.debug(f"Request successful with provider: {provider_name}")
+                return response
+
+            except LLMRateLimitError as e:
+                logger.warning(f"Rate limit hit for {provider_name}: {e}")
+                provider_errors[provider_name] = e
+                continue
+
+            except (LLMQuotaExceededError, Exception) as e:
+                classified_error = classify_error(e, provider_name)
+                logger.error(f"Provider {provider_name} failed: {classified_error}")
+                provider_errors[provider_name] = classified_error
+
+                if isinstance(classified_error, LLMQuotaExceededError):
+                    break
+
+                continue
+
+        raise AllProvidersFailedError(provider_errors)
+
+    async def chat_completion_many(
+        self,
+        requests: list[CompletionRequest],
+        **defaults,
+    ) -> list[Union[dict[str, Any], Exception]]:
+        """
+        Run many chat completions concurrently.
+
+        Args:
+            requests: Message lists, or dicts with "messages" plus any
+                chat_completion() keyword overrides for that item
+            **defaults: chat_completion() keyword arguments applied to every
+                item unless the item overrides them
+
+        Returns:
+            One entry per request, in request order: the response dictionary,
+            or the exception that request raised
+        """
+        limit = (
+            asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else None
+        )
+
+        async def run_one(request: CompletionRequest) -> dict[str, Any]:
+            if isinstance(request, dict):
+                options = {**defaults, **request}
+                messages = options.pop("messages")
+            else:
+                options = dict(defaults)
+                messages = request
+
+            if limit is None:
+                return await self.chat_completion(messages, **options)
+            async with limit:
+                return await self.chat_completion(messages, **options)
+
+        results = await asyncio.gather(
+            *(run_one(request) for request in requests), return_exceptions=True
+        )
+        failures = sum(1 for result in results if isinstance(result, Exception))
+        if failures:
+            logger.warning(f"{failures} of {len(results)} batched completions failed")
+        return results
+
+    async def _make_request_async(
+        self,
+        provider_name: str,
+        messages: list[dict[str, str]],
+        model: Optional[str],
+        temperature: float,
+        max_tokens: int,
+        **kwargs,
+    ) -> dict[str, Any]:
+        """Make a request to a specific provider."""
+        provider_config = self.config.providers[provider_name]
+        actual_model = model or provider_config.default_model
+
+        try:
+            if provider_name == "openai":
+                return await self._openai_request_async(
+                    messages, actual_model, temperature, max_tokens, **kwargs
+                )
+            elif provider_name == "anthropic":
+                return await self._anthropic_request_async(
+                    messages, actual_model, temperature, max_tokens, **kwargs
+                )
+            elif provider_name == "ollama":
+                return await self._ollama_request_async(
+                    messages, actual_model, temperature, max_tokens, **kwargs
+                )
+            elif provider_name == "stub":
+                return await self._stub_request_async(
+                    messages, actual_model, temperature, max_tokens, **kwargs
+                )
+            else:
+                raise ValueError(f"Unknown provider: {provider_name}")
+
+        except Exception as e:
+            raise classify_error(e, provider_name)
+
+    async def _openai_request_async(
+        self, messages, model, temperature, max_tokens, **kwargs
+    ):
+        """Make OpenAI API request."""
+        client = self._provider_clients["openai"]
+
+        estimated_cost = self._estimate_cost("openai", model, max_tokens)
+        if not can_execute_service_operation("openai", model, estimated_cost):
+            raise ServiceCostCapExceeded(
+                f"OpenAI daily cost cap would be exceeded. Estimated cost: ${estimated_cost:.4f}"
+            )
+
+        response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            **kwargs,
+        )
+
+        return {
+            "provider": "openai",
+            "model": model,
+            "choices": [
+                {
+                    "message": {
+                        "role": response.choices[0].message.role,
+                        "content": response.choices[0].message.content,
+                    },
+                    "finish_reason": response.choices[0].finish_reason,
+                }
+            ],
+            "usage": {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens,
+            },
+        }
+
+    async def _anthropic_request_async(
+        self, messages, model, temperature, max_tokens, **kwargs
+    ):
+        """Make Anthropic API request."""
+        client = self._provider_clients["anthropic"]
+
+        system_message = None
+        formatted_messages = []
+        for msg in messages:
+            if msg["role"] == "system":
+                system_message = msg["content"]
+            else:
+                formatted_messages.append(
+                    {"role": msg["role"], "content": msg["content"]}
+                )
+
+        request_params = {
+            "model": model,
+            "messages": formatted_messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            **kwargs,
+        }
+        if system_message:
+            request_params["system"] = system_message
+
+        response = await client.messages.create(**request_params)
+
+        return {
+            "provider": "anthropic",
+            "model": model,
+            "choices": [
+                {
+                    "message": {
+                        "role": "assistant",
+                        "content": response.content[0].text,
+                    },
+                    "finish_reason": response.stop_reason,
+                }
+            ],
+            "usage": {
+                "prompt_tokens": response.usage.input_tokens,
+                "completion_tokens": response.usage.output_tokens,
+                "total_tokens": response.usage.input_tokens
+                + response.usage.output_tokens,
+            },
+        }
+
+    def _get_http_session(self):
+        """Return the shared aiohttp session, creating it on the running loop."""
+        loop = asyncio.get_running_loop()
+        session = self._http_session
+        if session is None or session.closed or self._http_session_loop is not loop:
+            session = aiohttp.ClientSession()
+            self._http_session = session
+            self._http_session_loop = loop
+        return session
+
+    async def _ollama_request_async(
+        self, messages, model, temperature, max_tokens, **kwargs
+    ):
+        """Make Ollama API request."""
+        ollama_config = self._provider_clients["ollama"]
+
+        request_data = {
+            "model": model,
+            "messages": messages,
+            "options": {
+                "temperature": temperature,
+                "num_predict": max_tokens,
+                **kwargs,
+            },
+            "stream": False,
+        }
+
+        session = self._get_http_session()
+        async with session.post(
+            f"{ollama_config['base_url']}/api/chat",
+            json=request_data,
+            timeout=aiohttp.ClientTimeout(total=ollama_config["timeout"]),
+        ) as response:
+            response.raise_for_status()
+            data = await response.json()
+
+        return {
+            "provider": "ollama",
+            "model": model,
+            "choices": [
+                {
+                    "message": {
+                        "role": data["message"]["role"],
+                        "content": data["message"]["content"],
+                    },
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": data.get("prompt_eval_count", 0),
+                "completion_tokens": data.get("eval_count", 0),
+                "total_tokens": data.get("prompt_eval_count", 0)
+                + data.get("eval_count", 0),
+            },
+        }
+
+    async def _stub_request_async(
+        self, messages, model, temperature, max_tokens, **kwargs
+    ):
+        """Answer locally after the configured latency, echoing the last message."""
+        stub_config = self._provider_clients["stub"]
+        if stub_config["latency"] > 0:
+            await asyncio.sleep(stub_config["latency"])
+
+        prompt = messages[-1].get("content", "") if messages else ""
+        content = f"stub response: {prompt[:200]}"
+        prompt_tokens = self._estimate_tokens(messages, 0)
+        completion_tokens = min(max_tokens, max(1, len(content) // 4))
+
+        return {
+            "provider": "stub",
+            "model": model,
+            "choices": [
+                {
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    async def aclose(self):
+        """Close HTTP sessions and provider clients."""
+        if self._http_session is not None and not self._http_session.closed:
+            await self._http_session.close()
+        self._http_session = None
+
+        for name in ("openai", "anthropic"):
+            client = self._provider_clients.get(name)
+            close = getattr(client, "close", None)
+            if close is not None:
+                try:
+                    await close()
+                except Exception as e:
+                    logger.debug(f"Error closing async {name} client: {e}")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
@@ -0,0 +1,407 @@
+"""
+Tiered response cache for LLM completions.
+
+Responses are kept in an in-process LRU tier bounded by entry count, total
+payload bytes and a TTL, backed by an optional SQLite tier (WAL mode) that
+survives restarts and is shared by every worker process pointing at the same
+file. Entries are keyed by LLMClient._generate_cache_key and tagged with a
+``provider:model`` namespace so one provider or model can be inspected or
+invalidated without touching the rest.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from leadfactory.utils.metrics import (
+    LLM_CACHE_BYTES,
+    LLM_CACHE_HITS,
+    LLM_CACHE_MISSES,
+    LLM_CACHE_SAVED_COST,
+    LLM_CACHE_SAVED_TOKENS,
+    record_metric,
+)
+
+logger = logging.getLogger(__name__)
+
+# Expired rows are purged from the disk tier once per this many writes.
+_PURGE_EVERY_WRITES = 500
+
+DEFAULT_NAMESPACE = "default"
+
+
+def cache_namespace(provider: Optional[str], model: Optional[str]) -> str:
+    """Return the ``provider:model`` namespace for a cached response."""
+    return f"{provider or 'unknown'}:{model or 'default'}"
+
+
+@dataclass
+class CacheStats:
+    """Counters describing cache activity since creation."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    saved_tokens: int = 0
+    saved_cost: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered by either tier."""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        if not lookups:
+            return 0.0
+        return (self.memory_hits + self.disk_hits) / lookups
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert stats to a dictionary."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "saved_tokens": self.saved_tokens,
+            "saved_cost": self.saved_cost,
+            "hit_rate": self.hit_rate,
+        }
+
+
+@dataclass
+class _MemoryEntry:
+    """Serialized response held by the in-process tier."""
+
+    namespace: str
+    payload: bytes
+    expires_at: float
+
+
+class LLMResponseCache:
+    """
+    Two-tier LLM response cache.
+
+    Lookups check the in-process LRU first and fall back to the SQLite tier,
+    promoting disk hits into memory. Writes go to both tiers. Responses are
+    stored serialized, so every hit returns a fresh copy that callers may
+    mutate freely. Disk errors are logged and the cache degrades to memory
+    only rather than failing the request.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float = 7 * 86400,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of responses held in memory
+            max_bytes: Maximum total serialized size of responses held in memory
+            ttl_seconds: Lifetime of a cached response in either tier
+            db_path: SQLite file for the shared disk tier, or None for memory only
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.db_path = db_path
+        self.stats = CacheStats()
+
+        self._memory: OrderedDict[str, _MemoryEntry] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._writes_since_purge = 0
+
+        if db_path:
+            self._open_disk_tier(db_path)
+
+    def _open_disk_tier(self, db_path: str) -> None:
+        """Open (and create if needed) the SQLite tier."""
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, timeout=10.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_response_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_response_cache_namespace "
+                "ON llm_response_cache(namespace)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_response_cache_expires "
+                "ON llm_response_cache(expires_at)"
+            )
+            conn.commit()
+            self._conn = conn
+            logger.info(f"LLM response cache disk tier at {db_path}")
+        except (OSError, sqlite3.Error) as e:
+            logger.error(f"Failed to open LLM cache database {db_path}: {e}")
+            self._conn = None
+
+    @property
+    def disk_enabled(self) -> bool:
+        """Whether the SQLite tier is available."""
+        return self._conn is not None
+
+    @property
+    def memory_bytes(self) -> int:
+        """Total serialized size of responses held in memory."""
+        return self._memory_bytes
+
+    def get(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from LLMClient._generate_cache_key
+
+        Returns:
+            A copy of the cached response, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._memory.move_to_end(key)
+                    return self._record_hit(entry, "memory")
+                self._remove_memory(key)
+
+            entry = self._disk_get(key, now)
+            if entry is not None:
+                self._put_memory(key, entry)
+                return self._record_hit(entry, "disk")
+
+            self.stats.misses += 1
+        record_metric(LLM_CACHE_MISSES)
+        return None
+
+    def set(
+        self, key: str, response: dict[str, Any], namespace: str = DEFAULT_NAMESPACE
+    ) -> bool:
+        """
+        Store a response in both tiers.
+
+        Args:
+            key: Cache key from LLMClient._generate_cache_key
+            response: Response dictionary to cache
+            namespace: ``provider:model`` namespace for the response
+
+        Returns:
+            True if the response was cached, False if it could not be serialized
+        """
+        try:
+            payload = json.dumps(response, sort_keys=True).encode("utf-8")
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Not caching unserializable LLM response: {e}")
+            return False
+
+        now = time.time()
+        entry = _MemoryEntry(
+            namespace=namespace, payload=payload, expires_at=now + self.ttl_seconds
+        )
+        with self._lock:
+            self._put_memory(key, entry)
+            self._disk_set(key, entry, now)
+            self.stats.stores += 1
+            self.stats.bytes_written += len(payload)
+        record_metric(LLM_CACHE_BYTES, len(payload), operation="write")
+        return True
+
+    def delete(self, key: str) -> None:
+        """Remove a response from both tiers."""
+        with self._lock:
+            self._remove_memory(key)
+            if self._conn is not None:
+                try:
+                    self._conn.execute(
+                        "DELETE FROM llm_response_cache WHERE cache_key = ?", (key,)
+                    )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to delete LLM cache entry: {e}")
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """
+        Remove cached responses from both tiers.
+
+        Args:
+            namespace: Only clear this ``provider:model`` namespace
+        """
+        with self._lock:
+            if namespace is None:
+                self._memory.clear()
+                self._memory_bytes = 0
+            else:
+                for key in [
+                    key
+                    for key, entry in self._memory.items()
+                    if entry.namespace == namespace
+                ]:
+                    self._remove_memory(key)
+
+            if self._conn is not None:
+                try:
+                    if namespace is None:
+                        self._conn.execute("DELETE FROM llm_response_cache")
+                    else:
+                        self._conn.execute(
+                            "DELETE FROM llm_response_cache WHERE namespace = ?",
+                            (namespace,),
+                        )
+                    self._conn.commit()
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to clear LLM cache database: {e}")
+
+    def record_savings(self, namespace: str, tokens: int, cost: float) -> None:
+        """
+        Record the provider usage avoided by serving a response from cache.
+
+        Args:
+            namespace: ``provider:model`` namespace of the cached response
+            tokens: Tokens the original request consumed
+            cost: Estimated cost of the original request in dollars
+        """
+        with self._lock:
+            self.stats.saved_tokens += tokens
+            self.stats.saved_cost += cost
+        record_metric(LLM_CACHE_SAVED_TOKENS, tokens, namespace=namespace)
+        record_metric(LLM_CACHE_SAVED_COST, cost, namespace=namespace)
+
+    def namespace_counts(self) -> dict[str, int]:
+        """Return the number of unexpired responses per namespace."""
+        counts: dict[str, int] = {}
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    rows = self._conn.execute(
+                        "SELECT namespace, COUNT(*) FROM llm_response_cache "
+                        "WHERE expires_at > ? GROUP BY namespace",
+                        (time.time(),),
+                    ).fetchall()
+                    return dict(rows)
+                except sqlite3.Error as e:
+                    logger.error(f"Failed to count LLM cache entries: {e}")
+            now = time.time()
+            for entry in self._memory.values():
+                if entry.expires_at > now:
+                    counts[entry.namespace] = counts.get(entry.namespace, 0) + 1
+        return counts
+
+    def close(self) -> None:
+        """Close the disk tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._memory.get(key)
+            return entry is not None and entry.expires_at > time.time()
+
+    def __getitem__(self, key: str) -> dict[str, Any]:
+        response = self.get(key)
+        if response is None:
+            raise KeyError(key)
+        return response
+
+    def __setitem__(self, key: str, response: dict[str, Any]) -> None:
+        self.set(key, response)
+
+    def _record_hit(self, entry: _MemoryEntry, tier: str) -> dict[str, Any]:
+        """Update hit counters and decode a cached payload."""
+        if tier == "memory":
+            self.stats.memory_hits += 1
+        else:
+            self.stats.disk_hits += 1
+        self.stats.bytes_read += len(entry.payload)
+        record_metric(LLM_CACHE_HITS, namespace=entry.namespace, tier=tier)
+        record_metric(LLM_CACHE_BYTES, len(entry.payload), operation="read")
+        return json.loads(entry.payload)
+
+    def _put_memory(self, key: str, entry: _MemoryEntry) -> None:
+        """Insert into the LRU tier, evicting the oldest entries over the limits."""
+        self._remove_memory(key)
+        if len(entry.payload) > self.max_bytes or self.max_entries <= 0:
+            return
+        self._memory[key] = entry
+        self._memory_bytes += len(entry.payload)
+        while (
+            len(self._memory) > self.max_entries or self._memory_bytes > self.max_bytes
+        ):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted.payload)
+            self.stats.evictions += 1
+
+    def _remove_memory(self, key: str) -> None:
+        """Drop a key from the LRU tier if present."""
+        entry = self._memory.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= len(entry.payload)
+
+    def _disk_get(self, key: str, now: float) -> Optional[_MemoryEntry]:
+        """Read an unexpired entry from the SQLite tier."""
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT namespace, payload, expires_at FROM llm_response_cache "
+                "WHERE cache_key = ?",
+                (key,),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read LLM cache database: {e}")
+            return None
+        if row is None or row[2] <= now:
+            return None
+        return _MemoryEntry(namespace=row[0], payload=bytes(row[1]), expires_at=row[2])
+
+    def _disk_set(self, key: str, entry: _MemoryEntry, now: float) -> None:
+        """Write an entry to the SQLite tier, purging expired rows periodically."""
+        if self._conn is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache "
+                "(cache_key, namespace, payload, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, entry.namespace, entry.payload, now, entry.expires_at),
+            )
+            self._writes_since_purge += 1
+            if self._writes_since_purge >= _PURGE_EVERY_WRITES:
+                self._conn.execute(
+                    "DELETE FROM llm_response_cache WHERE expires_at <= ?", (now,)
+                )
+                self._writes_since_purge = 0
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to write LLM cache database: {e}")
@@ -20,6 +20,7 @@ from leadfactory.cost.service_cost_decorators import (
     enforce_service_cost_cap,
 )
 
+from .cache import LLMResponseCache, cache_namespace
 from .config import FallbackStrategy, LLMConfig
 from .exceptions import (
     AllProvidersFailedError,
@@ -73,7 +74,12 @@ class LLMClient:
         self._provider_clients = {}
         self._rate_limiters = {}
         self._cost_tracker = {}
-        self._request_cache = {}
+        self._request_cache = LLMResponseCache(
+            max_entries=self.config.cache_max_entries,
+            max_bytes=self.config.cache_max_bytes,
+            ttl_seconds=self.config.cache_ttl_seconds,
+            db_path=self.config.cache_db_path if self.config.enable_caching else None,
+        )
 
         # Validate configuration
         issues = self.config.validate()
@@ -137,6 +143,8 @@ class LLMClient:
                 self._cost_tracker[name] = {
                     "daily_cost": 0.0,
                     "monthly_cost": 0.0,
+                    "cache_saved_tokens": 0,
+                    "cache_saved_cost": 0.0,
                     "last_reset": time.time(),
                 }
 
@@ -149,6 +157,7 @@ class LLMClient:
         model: Optional[str] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None,
+        use_cache: bool = True,
         **kwargs,
     ) -> dict[str, Any]:
         """
@@ -159,6 +168,7 @@ class LLMClient:
             model: Model to use (optional, uses provider default)
             temperature: Sampling temperature (optional, uses config default)
             max_tokens: Maximum tokens to generate (optional, uses config default)
+            use_cache: Set to False to bypass the response cache for this call
             **kwargs: Additional provider-specific parameters
 
         Returns:
@@ -174,13 +184,20 @@ class LLMClient:
 
         # Check cache if enabled
         cache_key = None
-        if self.config.enable_caching:
+        if self.config.enable_caching and use_cache:
             cache_key = self._generate_cache_key(
                 messages, model, temperature, max_tokens, kwargs
             )
-            if cache_key in self._request_cache:
+            cached = self._request_cache.get(cache_key)
+            if cached is not None:
                 logger.debug("Returning cached response")
-                return self._request_cache[cache_key]
+                self._track_usage(
+                    cached.get("provider"),
+                    cached.get("usage", {}),
+                    cached=True,
+                    model=cached.get("model"),
+                )
+                return cached
 
         # Estimate tokens for cost calculation
         estimated_tokens = self._estimate_tokens(messages, max_tokens)
@@ -218,8 +235,14 @@ class LLMClient:
                 self._track_usage(provider_name, response.get("usage", {}))
 
                 # Cache response if enabled
-                if cache_key and self.config.enable_caching:
-                    self._request_cache[cache_key] = response
+                if cache_key:
+                    self._request_cache.set(
+                        cache_key,
+                        response,
+                        namespace=cache_namespace(
+                            provider_name, response.get("model") or model
+                        ),
+                    )
 
                 logger.info(f"Request successful with provider: {provider_name}")
                 return response
@@ -479,14 +502,35 @@ class LLMClient:
                 provider_name,
             )
 
-    def _track_usage(self, provider_name: str, usage: dict[str, int]):
-        """Track usage and costs."""
+    def _track_usage(
+        self,
+        provider_name: str,
+        usage: dict[str, int],
+        cached: bool = False,
+        model: Optional[str] = None,
+    ):
+        """
+        Track usage and costs.
+
+        Responses served from the cache are not billed; their tokens and the
+        cost the provider would have charged are recorded as cache savings.
+        """
         if not self.config.cost_config.cost_tracking_enabled:
             return
 
         total_tokens = usage.get("total_tokens", 0)
         cost = self.config.estimate_request_cost(total_tokens, provider_name)
 
+        if cached:
+            self._request_cache.record_savings(
+                cache_namespace(provider_name, model), total_tokens, cost
+            )
+            tracker = self._cost_tracker.get(provider_name)
+            if tracker is not None:
+                tracker["cache_saved_tokens"] += total_tokens
+                tracker["cache_saved_cost"] += cost
+            return
+
         tracker = self._cost_tracker[provider_name]
         tracker["daily_cost"] += cost
         tracker["monthly_cost"] += cost
@@ -532,16 +576,35 @@ class LLMClient:
                     {
                         "daily_cost": self._cost_tracker[name]["daily_cost"],
                         "monthly_cost": self._cost_tracker[name]["monthly_cost"],
+                        "cache_saved_tokens": self._cost_tracker[name][
+                            "cache_saved_tokens"
+                        ],
+                        "cache_saved_cost": self._cost_tracker[name][
+                            "cache_saved_cost"
+                        ],
                     }
                 )
 
         return status
 
-    def clear_cache(self):
-        """Clear the request cache."""
-        self._request_cache.clear()
+    def clear_cache(self, namespace: Optional[str] = None):
+        """
+        Clear the request cache.
+
+        Args:
+            namespace: Only clear responses cached for this ``provider:model``
+        """
+        self._request_cache.clear(namespace)
         logger.info("Request cache cleared")
 
+    def get_cache_stats(self) -> dict[str, Any]:
+        """Get hit, byte and savings counters for the request cache."""
+        stats = self._request_cache.stats.to_dict()
+        stats["memory_entries"] = len(self._request_cache)
+        stats["memory_bytes"] = self._request_cache.memory_bytes
+        stats["disk_enabled"] = self._request_cache.disk_enabled
+        return stats
+
     def reset_cost_tracking(self, provider_name: Optional[str] = None):
         """Reset cost tracking for one or all providers."""
         if provider_name:
@@ -8,6 +8,7 @@ fallback strategies, and cost controls.
 import os
 from dataclasses import dataclass, field
 from enum import Enum
+from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
@@ -15,6 +16,8 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+DEFAULT_CACHE_DB_PATH = str(Path(__file__).parent.parent / "data" / "llm_cache.db")
+
 
 class FallbackStrategy(Enum):
     """Available fallback strategies."""
@@ -67,6 +70,11 @@ class LLMConfig:
     default_temperature: float = 0.7
     default_max_tokens: int = 1000
     enable_caching: bool = True
+    cache_max_entries: int = 1000
+    cache_max_bytes: int = 64 * 1024 * 1024
+    cache_ttl_seconds: float = 7 * 86400
+    cache_db_path: Optional[str] = None
+    max_concurrency_per_provider: int = 8
     log_requests: bool = True
 
     @classmethod
@@ -88,6 +96,20 @@ class LLMConfig:
         config.enable_caching = (
             os.getenv("LLM_ENABLE_CACHING", "true").lower() == "true"
         )
+        config.cache_max_entries = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1000"))
+        config.cache_max_bytes = int(
+            os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        )
+        config.cache_ttl_seconds = float(
+            os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 86400))
+        )
+        # Shared on-disk cache tier; set LLM_CACHE_DB_PATH to "" to keep it in memory
+        config.cache_db_path = (
+            os.getenv("LLM_CACHE_DB_PATH", DEFAULT_CACHE_DB_PATH) or None
+        )
+        config.max_concurrency_per_provider = int(
+            os.getenv("LLM_MAX_CONCURRENCY_PER_PROVIDER", "8")
+        )
         config.log_requests = os.getenv("LLM_LOG_REQUESTS", "true").lower() == "true"
 
         # Load cost configuration
@@ -178,6 +200,23 @@ class LLMConfig:
             retry_delay=float(os.getenv("OLLAMA_RETRY_DELAY", "0.5")),
         )
 
+        # Local stub provider for offline runs and benchmarks (AsyncLLMClient only)
+        if os.getenv("LLM_STUB_ENABLED", "false").lower() == "true":
+            config.providers["stub"] = ProviderConfig(
+                name="stub",
+                default_model="stub",
+                rate_limit_rpm=(
+                    int(os.getenv("LLM_STUB_RATE_LIMIT_RPM"))
+                    if os.getenv("LLM_STUB_RATE_LIMIT_RPM")
+                    else None
+                ),
+                priority=int(os.getenv("LLM_STUB_PRIORITY", "0")),
+                additional_config={
+                    "latency": float(os.getenv("LLM_STUB_LATENCY_SECONDS", "0.05")),
+                    "max_concurrency": int(os.getenv("LLM_STUB_MAX_CONCURRENCY", "64")),
+                },
+            )
+
         return config
 
     def get_enabled_providers(self) -> list[ProviderConfig]:
@@ -9,6 +9,7 @@ Implements Feature 5: Engagement Tracking improvements.
 """
 
 import json
+import os
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
@@ -19,6 +20,11 @@ from leadfactory.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Track events through the buffered in-memory session engine
+ENGAGEMENT_SESSION_ENGINE = (
+    os.getenv("ENGAGEMENT_SESSION_ENGINE", "false").lower() == "true"
+)
+
 
 class EventType(Enum):
     """Types of engagement events."""
@@ -131,12 +137,107 @@ class ConversionFunnel:
         return data
 
 
+CONVERSION_EVENT_TYPES = {
+    EventType.PURCHASE,
+    EventType.SIGNUP,
+    EventType.FORM_SUBMIT,
+    EventType.DOWNLOAD,
+}
+
+
+def extract_device_type(user_agent: Optional[str]) -> Optional[str]:
+    """Extract device type from user agent."""
+    if not user_agent:
+        return None
+
+    user_agent_lower = user_agent.lower()
+
+    if any(
+        mobile in user_agent_lower for mobile in ["mobile", "android", "iphone", "ipad"]
+    ):
+        return "mobile"
+    elif "tablet" in user_agent_lower:
+        return "tablet"
+    else:
+        return "desktop"
+
+
+def start_session(session_id: str, user_id: str, event: EngagementEvent) -> UserSession:
+    """Create the session opened by its first event."""
+    return UserSession(
+        session_id=session_id,
+        user_id=user_id,
+        start_time=event.timestamp,
+        end_time=None,
+        total_events=1,
+        page_views=1 if event.event_type == EventType.PAGE_VIEW else 0,
+        unique_pages=(
+            1 if event.event_type == EventType.PAGE_VIEW and event.page_url else 0
+        ),
+        bounce_rate=0.0,
+        time_on_site=0.0,
+        conversion_events=[],
+        traffic_source=event.referrer,
+        campaign_id=event.campaign_id,
+        device_type=extract_device_type(event.user_agent),
+    )
+
+
+def advance_session(
+    session: UserSession,
+    event: EngagementEvent,
+    unique_pages: Optional[int] = None,
+) -> None:
+    """Apply a later event of the session to its running totals.
+
+    Args:
+        session: Session to update in place
+        event: Event that was tracked for the session
+        unique_pages: Distinct pages viewed so far, including this event's;
+            None keeps the current count
+    """
+    session.end_time = event.timestamp
+    session.total_events += 1
+
+    if event.event_type == EventType.PAGE_VIEW:
+        session.page_views += 1
+        if event.page_url and unique_pages:
+            session.unique_pages = unique_pages
+
+    # Calculate time on site
+    if session.start_time:
+        session.time_on_site = (event.timestamp - session.start_time).total_seconds()
+
+    # Calculate bounce rate (1 page view = 100% bounce)
+    session.bounce_rate = 1.0 if session.page_views == 1 else 0.0
+
+    # Track conversions
+    if event.event_type in CONVERSION_EVENT_TYPES:
+        if event.event_id not in session.conversion_events:
+            session.conversion_events.append(event.event_id)
+
+
 class EngagementAnalytics:
     """Service for tracking and analyzing user engagement."""
 
-    def __init__(self):
-        """Initialize the engagement analytics service."""
+    def __init__(self, session_engine: Optional[Any] = None):
+        """Initialize the engagement analytics service.
+
+        Args:
+            session_engine: EngagementSessionEngine that buffers tracked
+                events; when ENGAGEMENT_SESSION_ENGINE is set and none is
+                given, the process-wide engine is used
+        """
         self.storage = get_storage_instance()
+
+        if session_engine is None and ENGAGEMENT_SESSION_ENGINE:
+            from leadfactory.monitoring.engagement_sessions import (
+                get_shared_session_engine,
+            )
+
+            session_engine = get_shared_session_engine(self.storage)
+        self.session_engine = session_engine
+
         logger.info("Initialized EngagementAnalytics")
 
     def track_event(
@@ -196,6 +297,9 @@ class EngagementAnalytics:
                 ab_test_variant=ab_test_variant,
             )
 
+            if self.session_engine is not None:
+                return self.session_engine.track(event)
+
             # Store event
             success = self.storage.store_engagement_event(event.to_dict())
 
@@ -216,6 +320,16 @@ class EngagementAnalytics:
             logger.error(f"Error tracking event: {e}")
             return False
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write events buffered by the session engine to storage.
+
+        Returns:
+            True if everything tracked so far has been written
+        """
+        if self.session_engine is None:
+            return True
+        return self.session_engine.flush(timeout)
+
     def _update_session(
         self, session_id: str, user_id: str, event: EngagementEvent
     ) -> None:
@@ -226,53 +340,19 @@ class EngagementAnalytics:
 
             if not session_data:
                 # Create new session
-                session = UserSession(
-                    session_id=session_id,
-                    user_id=user_id,
-                    start_time=event.timestamp,
-                    end_time=None,
-                    total_events=1,
-                    page_views=1 if event.event_type == EventType.PAGE_VIEW else 0,
-                    unique_pages=(
-                        1
-                        if event.event_type == EventType.PAGE_VIEW and event.page_url
-                        else 0
-                    ),
-                    bounce_rate=0.0,
-                    time_on_site=0.0,
-                    conversion_events=[],
-                    traffic_source=event.referrer,
-                    campaign_id=event.campaign_id,
-                    device_type=self._extract_device_type(event.user_agent),
-                )
+                session = start_session(session_id, user_id, event)
             else:
                 # Update existing session
                 session = UserSession(**session_data)
-                session.end_time = event.timestamp
-                session.total_events += 1
-
-                if event.event_type == EventType.PAGE_VIEW:
-                    session.page_views += 1
-                    if event.page_url:
-                        # Get unique pages count
-                        unique_pages = self.storage.get_session_unique_pages(session_id)
-                        session.unique_pages = (
-                            len(unique_pages) if unique_pages else session.unique_pages
-                        )
-
-                # Calculate time on site
-                if session.start_time:
-                    session.time_on_site = (
-                        event.timestamp - session.start_time
-                    ).total_seconds()
 
-                # Calculate bounce rate (1 page view = 100% bounce)
-                session.bounce_rate = 1.0 if session.page_views == 1 else 0.0
+                unique_pages = None
+                if event.event_type == EventType.PAGE_VIEW and event.page_url:
+                    # Get unique pages count
+                    unique_pages = len(
+                        self.storage.get_session_unique_pages(session_id) or []
+                    )
 
-                # Track conversions
-                if self._is_conversion_event(event.event_type):
-                    if event.event_id not in session.conversion_events:
-                        session.conversion_events.append(event.event_id)
+                advance_session(session, event, unique_pages)
 
             # Store updated session
             self.storage.update_user_session(session.to_dict())
@@ -282,30 +362,11 @@ class EngagementAnalytics:
 
     def _extract_device_type(self, user_agent: Optional[str]) -> Optional[str]:
         """Extract device type from user agent."""
-        if not user_agent:
-            return None
-
-        user_agent_lower = user_agent.lower()
-
-        if any(
-            mobile in user_agent_lower
-            for mobile in ["mobile", "android", "iphone", "ipad"]
-        ):
-            return "mobile"
-        elif "tablet" in user_agent_lower:
-            return "tablet"
-        else:
-            return "desktop"
+        return extract_device_type(user_agent)
 
     def _is_conversion_event(self, event_type: EventType) -> bool:
         """Check if event type is a conversion event."""
-        conversion_events = {
-            EventType.PURCHASE,
-            EventType.SIGNUP,
-            EventType.FORM_SUBMIT,
-            EventType.DOWNLOAD,
-        }
-        return event_type in conversion_events
+        return event_type in CONVERSION_EVENT_TYPES
 
     def _check_conversions(
         self, user_id: str, session_id: str, event: EngagementEvent
@@ -458,6 +519,70 @@ class EngagementAnalytics:
             logger.error(f"Error getting user engagement summary: {e}")
             return {}
 
+    def get_user_engagement_summaries(
+        self, user_ids: List[str], days: int = 30
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get engagement summaries for many users at once.
+
+        Summaries match get_user_engagement_summary, but are built from
+        per-user aggregates fetched in a few grouped queries when the
+        storage backend supports it.
+
+        Args:
+            user_ids: User identifiers
+            days: Number of days to analyze
+
+        Returns:
+            Dictionary of engagement summaries keyed by user ID
+        """
+        if not hasattr(self.storage, "get_user_engagement_aggregates"):
+            return {
+                user_id: self.get_user_engagement_summary(user_id, days=days)
+                for user_id in user_ids
+            }
+
+        try:
+            end_date = datetime.utcnow()
+            start_date = end_date - timedelta(days=days)
+
+            aggregates = self.storage.get_user_engagement_aggregates(
+                user_ids, start_date, end_date
+            )
+
+            summaries = {}
+            for user_id in user_ids:
+                aggregate = aggregates.get(user_id, {})
+                event_types = aggregate.get("event_types", {})
+                total_sessions = aggregate.get("total_sessions", 0)
+                conversions = aggregate.get("conversions", 0)
+
+                avg_session_duration = 0
+                if total_sessions:
+                    avg_session_duration = (
+                        aggregate.get("total_time_on_site", 0) / total_sessions
+                    )
+
+                summaries[user_id] = {
+                    "user_id": user_id,
+                    "period_days": days,
+                    "total_events": sum(event_types.values()),
+                    "total_sessions": total_sessions,
+                    "total_page_views": aggregate.get("total_page_views", 0),
+                    "avg_session_duration": round(avg_session_duration, 2),
+                    "event_types": dict(event_types),
+                    "conversions": conversions,
+                    "conversion_rate": (
+                        conversions / total_sessions if total_sessions > 0 else 0
+                    ),
+                    "last_activity": aggregate.get("last_activity"),
+                }
+
+            return summaries
+
+        except Exception as e:
+            logger.error(f"Error getting user engagement summaries: {e}")
+            return {}
+
     def get_campaign_analytics(
         self, campaign_id: str, days: int = 30
     ) -> Dict[str, Any]:
@@ -591,6 +716,8 @@ class EngagementAnalytics:
             success = self.storage.create_conversion_funnel(funnel.to_dict())
 
             if success:
+                if self.session_engine is not None:
+                    self.session_engine.invalidate_funnels()
                 logger.info(f"Created conversion funnel: {name} ({funnel_id})")
                 return funnel_id
             else:
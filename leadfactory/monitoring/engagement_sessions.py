@@ -0,0 +1,554 @@
+"""In-memory session engine for engagement tracking.
+
+Tracking an event straight against storage costs four to six round trips:
+the event insert, a session read, a distinct-pages query over the whole
+session, the session upsert, a funnel definition read and a progress write
+per matching step. EngagementSessionEngine keeps hot sessions in memory
+together with the set of pages each has viewed, matches events against
+funnel definitions compiled once per refresh, and buffers the resulting
+writes. A background thread flushes them in micro-batches: one multi-row
+insert for events, one upsert per touched session, and multi-row writes for
+funnel progress and conversions, all in a single transaction.
+
+A session is read from storage only when it is not already in memory, and
+only sessions with nothing left to flush are evicted, so storage stays the
+source of truth across restarts. Sessions are owned by the process that
+holds them; route a session's events to a single worker.
+"""
+
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Pattern, Set, Tuple
+
+from leadfactory.monitoring.engagement_analytics import (
+    ConversionFunnel,
+    ConversionGoal,
+    EngagementEvent,
+    EventType,
+    UserSession,
+    advance_session,
+    start_session,
+)
+from leadfactory.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Configure with defaults from environment variables
+ENGAGEMENT_FLUSH_INTERVAL = float(os.getenv("ENGAGEMENT_FLUSH_INTERVAL", "1.0"))
+ENGAGEMENT_FLUSH_BATCH = int(os.getenv("ENGAGEMENT_FLUSH_BATCH", "1000"))
+ENGAGEMENT_MAX_BUFFERED_EVENTS = int(
+    os.getenv("ENGAGEMENT_MAX_BUFFERED_EVENTS", "100000")
+)
+ENGAGEMENT_SESSION_IDLE_SECONDS = float(
+    os.getenv("ENGAGEMENT_SESSION_IDLE_SECONDS", "1800")
+)
+ENGAGEMENT_MAX_SESSIONS = int(os.getenv("ENGAGEMENT_MAX_SESSIONS", "100000"))
+ENGAGEMENT_FUNNEL_REFRESH_SECONDS = float(
+    os.getenv("ENGAGEMENT_FUNNEL_REFRESH_SECONDS", "300")
+)
+# Longest the shared engine's final flush may hold up interpreter exit
+ENGAGEMENT_CLOSE_TIMEOUT = float(os.getenv("ENGAGEMENT_CLOSE_TIMEOUT", "30"))
+
+_EVENT_FIELDS = tuple(f.name for f in fields(EngagementEvent))
+_SESSION_FIELDS = tuple(f.name for f in fields(UserSession))
+_FUNNEL_FIELDS = {f.name for f in fields(ConversionFunnel)}
+
+
+@dataclass
+class _StepMatcher:
+    """One funnel step, with its page pattern compiled."""
+
+    index: int
+    properties: Tuple[Tuple[str, Any], ...]
+    page_pattern: Optional[Pattern] = None
+    invalid: bool = False
+
+    def matches(self, event: EngagementEvent) -> bool:
+        properties = event.properties or {}
+        for key, value in self.properties:
+            if properties.get(key) != value:
+                return False
+
+        if event.page_url:
+            # An invalid pattern fails only the events it is checked against
+            if self.invalid:
+                return False
+            if self.page_pattern is not None:
+                return self.page_pattern.match(event.page_url) is not None
+
+        return True
+
+
+class FunnelMatcher:
+    """Active funnels compiled into step matchers indexed by event type.
+
+    Matching follows EngagementAnalytics._event_matches_step: within each
+    funnel the first matching step wins, and steps without an event type
+    match any event.
+    """
+
+    def __init__(self, funnels: List[ConversionFunnel]):
+        self.funnels = funnels
+
+        compiled = []
+        for funnel in funnels:
+            steps = []
+            for index, step in enumerate(funnel.steps):
+                steps.append((step.get("event_type"), self._compile(index, step)))
+            compiled.append((funnel, steps))
+
+        self._by_event_type: Dict[str, List[Tuple[ConversionFunnel, List]]] = {}
+        for event_type in EventType:
+            candidates = []
+            for funnel, steps in compiled:
+                matchers = [
+                    matcher
+                    for step_type, matcher in steps
+                    if not step_type or step_type == event_type.value
+                ]
+                if matchers:
+                    candidates.append((funnel, matchers))
+            self._by_event_type[event_type.value] = candidates
+
+    @staticmethod
+    def _compile(index: int, step: Dict[str, Any]) -> _StepMatcher:
+        matcher = _StepMatcher(
+            index=index, properties=tuple((step.get("properties") or {}).items())
+        )
+        page_pattern = step.get("page_pattern")
+        if page_pattern:
+            try:
+                matcher.page_pattern = re.compile(page_pattern)
+            except re.error as e:
+                logger.error(f"Invalid page pattern in funnel step {index}: {e}")
+                matcher.invalid = True
+        return matcher
+
+    def match(self, event: EngagementEvent) -> Iterator[Tuple[ConversionFunnel, int]]:
+        """Yield (funnel, step index) for every funnel the event advances."""
+        for funnel, matchers in self._by_event_type.get(event.event_type.value, ()):
+            for matcher in matchers:
+                if matcher.matches(event):
+                    yield funnel, matcher.index
+                    break
+
+
+@dataclass
+class _SessionState:
+    """A session held in memory, with the pages it has viewed."""
+
+    session: UserSession
+    pages: Set[str] = field(default_factory=set)
+    last_seen: float = field(default_factory=time.monotonic)
+    dirty: bool = True
+
+
+def _session_from_row(row: Dict[str, Any]) -> UserSession:
+    data = {key: value for key, value in row.items() if key in _SESSION_FIELDS}
+    conversion_events = data.get("conversion_events")
+    if isinstance(conversion_events, str):
+        data["conversion_events"] = json.loads(conversion_events)
+    elif conversion_events is None:
+        data["conversion_events"] = []
+    return UserSession(**data)
+
+
+def _funnel_from_row(row: Dict[str, Any]) -> ConversionFunnel:
+    data = {key: value for key, value in row.items() if key in _FUNNEL_FIELDS}
+    if isinstance(data.get("steps"), str):
+        data["steps"] = json.loads(data["steps"])
+    data["steps"] = data.get("steps") or []
+    if not isinstance(data.get("goal_type"), ConversionGoal):
+        try:
+            data["goal_type"] = ConversionGoal(data.get("goal_type"))
+        except ValueError:
+            data["goal_type"] = ConversionGoal.ENGAGEMENT
+    return ConversionFunnel(**data)
+
+
+def _event_row(event: EngagementEvent) -> Dict[str, Any]:
+    """Same row as event.to_dict(), without asdict's recursive deep copy."""
+    row = {name: getattr(event, name) for name in _EVENT_FIELDS}
+    row["properties"] = dict(event.properties or {})
+    if isinstance(event.event_type, EventType):
+        row["event_type"] = event.event_type.value
+    if isinstance(event.timestamp, datetime):
+        row["timestamp"] = event.timestamp.isoformat()
+    return row
+
+
+def _session_row(session: UserSession) -> Dict[str, Any]:
+    """Same row as session.to_dict(), without asdict's recursive deep copy."""
+    row = {name: getattr(session, name) for name in _SESSION_FIELDS}
+    row["conversion_events"] = list(session.conversion_events)
+    if isinstance(session.start_time, datetime):
+        row["start_time"] = session.start_time.isoformat()
+    if isinstance(session.end_time, datetime):
+        row["end_time"] = session.end_time.isoformat()
+    return row
+
+
+class EngagementSessionEngine:
+    """Tracks engagement events in memory and writes them in micro-batches."""
+
+    def __init__(
+        self,
+        storage: Any,
+        flush_interval: float = ENGAGEMENT_FLUSH_INTERVAL,
+        flush_batch: int = ENGAGEMENT_FLUSH_BATCH,
+        max_buffered_events: int = ENGAGEMENT_MAX_BUFFERED_EVENTS,
+        session_idle_seconds: float = ENGAGEMENT_SESSION_IDLE_SECONDS,
+        max_sessions: int = ENGAGEMENT_MAX_SESSIONS,
+        funnel_refresh_seconds: float = ENGAGEMENT_FUNNEL_REFRESH_SECONDS,
+    ):
+        """Start the engine and its flush thread.
+
+        Args:
+            storage: Storage backend the batches are written to
+            flush_interval: Seconds between flushes when traffic is light
+            flush_batch: Buffered events that trigger an early flush
+            max_buffered_events: Events held before track() starts refusing
+                new ones, e.g. while storage is down
+            session_idle_seconds: Idle time after which a flushed session is
+                dropped from memory
+            max_sessions: Sessions kept in memory before the least recently
+                active flushed ones are dropped
+            funnel_refresh_seconds: Maximum age of the compiled funnels;
+                invalidate_funnels() refreshes them sooner
+        """
+        self.storage = storage
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.max_buffered_events = max_buffered_events
+        self.session_idle_seconds = session_idle_seconds
+        self.max_sessions = max_sessions
+        self.funnel_refresh_seconds = funnel_refresh_seconds
+
+        self._cond = threading.Condition()
+        self._sessions: "OrderedDict[str, _SessionState]" = OrderedDict()
+        self._events: List[Dict[str, Any]] = []
+        self._progress: Dict[Tuple[str, str, int], Dict[str, Any]] = {}
+        self._conversions: List[Dict[str, Any]] = []
+        self._flush_requested = False
+        # Set by flush(); cuts short the back-off after a failed write
+        self._retry_requested = False
+        self._flushed_generation = 0
+        self._tracked_generation = 0
+        self._closed = False
+
+        self._funnel_lock = threading.Lock()
+        self._funnels: Optional[FunnelMatcher] = None
+        self._funnels_loaded_at = 0.0
+
+        self.stats = {
+            "tracked": 0,
+            "rejected": 0,
+            "flushes": 0,
+            "flushed_events": 0,
+            "failed_flushes": 0,
+            "session_loads": 0,
+            "funnel_loads": 0,
+        }
+
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="engagement-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def track(self, event: EngagementEvent) -> bool:
+        """Record an event against its session and funnels.
+
+        The event is written with the next flush.
+
+        Returns:
+            True if the event was accepted, False if the engine is closed or
+            its buffer is full
+        """
+        matches = list(self._funnel_matcher().match(event))
+        row = _event_row(event)
+
+        with self._cond:
+            cached = event.session_id in self._sessions
+        loaded = None if cached else self._load_session(event.session_id)
+
+        with self._cond:
+            if self._closed or len(self._events) >= self.max_buffered_events:
+                self.stats["rejected"] += 1
+                logger.warning(
+                    f"Engagement session engine is closed or full, "
+                    f"dropping event {event.event_id}"
+                )
+                return False
+
+            state = self._sessions.get(event.session_id)
+            if state is None and loaded is None:
+                state = _SessionState(
+                    start_session(event.session_id, event.user_id, event)
+                )
+                if event.event_type == EventType.PAGE_VIEW and event.page_url:
+                    state.pages.add(event.page_url)
+                self._sessions[event.session_id] = state
+            else:
+                if state is None:
+                    state = loaded
+                    self._sessions[event.session_id] = state
+                if event.event_type == EventType.PAGE_VIEW and event.page_url:
+                    state.pages.add(event.page_url)
+                advance_session(state.session, event, len(state.pages))
+
+            state.dirty = True
+            state.last_seen = time.monotonic()
+            self._sessions.move_to_end(event.session_id)
+
+            self._events.append(row)
+            for funnel, step_index in matches:
+                self._progress[(funnel.funnel_id, event.user_id, step_index)] = {
+                    "funnel_id": funnel.funnel_id,
+                    "user_id": event.user_id,
+                    "session_id": event.session_id,
+                    "step_index": step_index,
+                    "timestamp": event.timestamp,
+                }
+                if step_index == len(funnel.steps) - 1:
+                    self._conversions.append(
+                        {
+                            "funnel_id": funnel.funnel_id,
+                            "user_id": event.user_id,
+                            "session_id": event.session_id,
+                            "conversion_time": event.timestamp.isoformat(),
+                            "goal_type": funnel.goal_type.value,
+                            "event_id": event.event_id,
+                            "campaign_id": event.campaign_id,
+                            "ab_test_variant": event.ab_test_variant,
+                        }
+                    )
+
+            self.stats["tracked"] += 1
+            self._tracked_generation += 1
+            if len(self._events) >= self.flush_batch:
+                self._flush_requested = True
+                self._cond.notify_all()
+
+        return True
+
+    def invalidate_funnels(self) -> None:
+        """Reload funnel definitions before the next event is matched."""
+        with self._funnel_lock:
+            self._funnels = None
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every event tracked so far has been written.
+
+        Returns:
+            True if the events were written, False on timeout or if the
+            write failed
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            target = self._tracked_generation
+            failures = self.stats["failed_flushes"]
+            self._flush_requested = True
+            self._retry_requested = True
+            self._cond.notify_all()
+            while self._flushed_generation < target:
+                if (
+                    self.stats["failed_flushes"] > failures
+                    or not self._flusher.is_alive()
+                ):
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush outstanding events and stop the flush thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._flusher.join(timeout)
+
+    def _funnel_matcher(self) -> FunnelMatcher:
+        matcher = self._funnels
+        if (
+            matcher is not None
+            and time.monotonic() - self._funnels_loaded_at < self.funnel_refresh_seconds
+        ):
+            return matcher
+
+        with self._funnel_lock:
+            # Another thread may have refreshed while we waited
+            if self._funnels is not None and (
+                time.monotonic() - self._funnels_loaded_at < self.funnel_refresh_seconds
+            ):
+                return self._funnels
+
+            funnels = []
+            for row in self.storage.get_active_conversion_funnels() or []:
+                try:
+                    funnels.append(_funnel_from_row(row))
+                except Exception as e:
+                    logger.error(f"Skipping invalid conversion funnel: {e}")
+
+            self._funnels = FunnelMatcher(funnels)
+            self._funnels_loaded_at = time.monotonic()
+            self.stats["funnel_loads"] += 1
+            return self._funnels
+
+    def _load_session(self, session_id: str) -> Optional[_SessionState]:
+        """Read a session that is not in memory, with its viewed pages."""
+        row = self.storage.get_user_session(session_id)
+        if not row:
+            return None
+
+        self.stats["session_loads"] += 1
+        pages = set(self.storage.get_session_unique_pages(session_id) or [])
+        return _SessionState(_session_from_row(row), pages, dirty=False)
+
+    def _flush_loop(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and not self._flush_requested:
+                    self._cond.wait(self.flush_interval)
+                closing = self._closed
+                self._flush_requested = False
+                self._retry_requested = False
+
+                events, self._events = self._events, []
+                progress, self._progress = self._progress, {}
+                conversions, self._conversions = self._conversions, []
+                sessions = [
+                    _session_row(state.session)
+                    for state in self._sessions.values()
+                    if state.dirty
+                ]
+                for state in self._sessions.values():
+                    state.dirty = False
+                generation = self._tracked_generation
+
+            written = self._write(
+                events, sessions, list(progress.values()), conversions
+            )
+
+            with self._cond:
+                if written:
+                    self._flushed_generation = generation
+                    self.stats["flushes"] += 1
+                    self.stats["flushed_events"] += len(events)
+                else:
+                    self.stats["failed_flushes"] += 1
+                    self._requeue(events, sessions, progress, conversions)
+                self._evict_idle()
+                self._cond.notify_all()
+
+                if closing:
+                    if self._events:
+                        logger.error(
+                            f"Discarding {len(self._events)} engagement events "
+                            "that could not be written"
+                        )
+                    return
+
+                if not written:
+                    # Back off instead of retrying on every tracked event
+                    self._cond.wait_for(
+                        lambda: self._closed or self._retry_requested,
+                        self.flush_interval,
+                    )
+                    self._flush_requested = True
+
+    def _requeue(
+        self,
+        events: List[Dict[str, Any]],
+        sessions: List[Dict[str, Any]],
+        progress: Dict[Tuple[str, str, int], Dict[str, Any]],
+        conversions: List[Dict[str, Any]],
+    ) -> None:
+        """Put a failed batch back in front of what arrived meanwhile."""
+        self._events[:0] = events
+        for key, row in progress.items():
+            self._progress.setdefault(key, row)
+        self._conversions[:0] = conversions
+        for session in sessions:
+            state = self._sessions.get(session["session_id"])
+            if state is not None:
+                state.dirty = True
+
+    def _write(
+        self,
+        events: List[Dict[str, Any]],
+        sessions: List[Dict[str, Any]],
+        progress: List[Dict[str, Any]],
+        conversions: List[Dict[str, Any]],
+    ) -> bool:
+        if not (events or sessions or progress or conversions):
+            return True
+
+        try:
+            if hasattr(self.storage, "store_engagement_batch"):
+                return bool(
+                    self.storage.store_engagement_batch(
+                        events, sessions, progress, conversions
+                    )
+                )
+
+            # Fallback for backends without batch writes
+            ok = all(self.storage.store_engagement_event(e) for e in events)
+            ok = all(self.storage.update_user_session(s) for s in sessions) and ok
+            for row in progress:
+                ok = (
+                    self.storage.update_funnel_progress(
+                        row["funnel_id"],
+                        row["user_id"],
+                        row["session_id"],
+                        row["step_index"],
+                        row["timestamp"],
+                    )
+                    and ok
+                )
+            ok = all(self.storage.record_conversion(c) for c in conversions) and ok
+            return ok
+        except Exception as e:
+            logger.error(f"Error flushing {len(events)} engagement events: {e}")
+            return False
+
+    def _evict_idle(self) -> None:
+        """Drop flushed sessions that went idle or exceed max_sessions."""
+        cutoff = time.monotonic() - self.session_idle_seconds
+        excess = len(self._sessions) - self.max_sessions
+        for session_id in list(self._sessions):
+            state = self._sessions[session_id]
+            # Sessions are ordered by activity, oldest first
+            if state.last_seen >= cutoff and excess <= 0:
+                break
+            if not state.dirty:
+                del self._sessions[session_id]
+                excess -= 1
+
+
+_shared_engine: Optional[EngagementSessionEngine] = None
+_shared_engine_lock = threading.Lock()
+
+
+def get_shared_session_engine(storage: Any) -> EngagementSessionEngine:
+    """Get the process-wide session engine, flushed and closed at exit.
+
+    Args:
+        storage: Storage backend used if the engine has not been created yet
+    """
+    global _shared_engine
+    with _shared_engine_lock:
+        if _shared_engine is None:
+            _shared_engine = EngagementSessionEngine(storage)
+            atexit.register(_shared_engine.close, ENGAGEMENT_CLOSE_TIMEOUT)
+        return _shared_engine
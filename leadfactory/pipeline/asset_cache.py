@@ -0,0 +1,342 @@
+"""
+Content-addressed cache for screenshot and mockup images.
+
+Rendered images are stored once per SHA-256 under ASSET_CACHE_DIR, so
+identical PNGs share one file however many businesses or runs produce them.
+The asset_cache table maps what an image was rendered from to its hash:
+
+- a screenshot is keyed by the normalized website URL plus a fingerprint of
+  the site, i.e. the hash of the HTML stored at scrape time or the
+  ETag/Last-Modified returned by a HEAD request;
+- a mockup is keyed by the hash of the screenshot it was made from and the
+  mockup size.
+
+When the key is unchanged, the capture or render is skipped and the cached
+image is used. Hits, misses and the time and bytes saved are reported
+through leadfactory.utils.metrics and stats().
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Union
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+from leadfactory.utils.logging import get_logger
+from leadfactory.utils.metrics import (
+    ASSET_CACHE_BYTES_SAVED,
+    ASSET_CACHE_LOOKUPS,
+    ASSET_CACHE_SECONDS_SAVED,
+    record_metric,
+)
+
+logger = get_logger(__name__)
+
+# Configure with defaults from environment variables
+ASSET_CACHE_DIR = os.getenv(
+    "ASSET_CACHE_DIR", os.path.join(tempfile.gettempdir(), "leadfactory_assets")
+)
+ASSET_CACHE_ENABLED = os.getenv("ASSET_CACHE_ENABLED", "true").lower() == "true"
+ASSET_CACHE_PROBE_TIMEOUT = float(os.getenv("ASSET_CACHE_PROBE_TIMEOUT", "5"))
+
+
+@dataclass
+class CachedAsset:
+    """An image in the content-addressed store."""
+
+    content_hash: str
+    file_path: str
+    size_bytes: int
+    render_seconds: float = 0.0
+    cache_key: Optional[str] = None
+
+
+def file_sha256(file_path: Union[str, Path]) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(65536), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a website URL for use in cache keys.
+
+    Adds https:// when there is no scheme, lowercases the scheme and host,
+    drops "www.", default ports, the fragment and a trailing slash.
+    """
+    url = url.strip()
+    if "://" not in url:
+        url = f"https://{url}"
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    port = parts.port
+    if port and not (
+        (scheme == "http" and port == 80) or (scheme == "https" and port == 443)
+    ):
+        host = f"{host}:{port}"
+
+    path = parts.path.rstrip("/")
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+def probe_site_fingerprint(
+    url: str, timeout: float = ASSET_CACHE_PROBE_TIMEOUT
+) -> Optional[str]:
+    """
+    Fingerprint a site from the validators of a HEAD request.
+
+    Returns the ETag or Last-Modified header, or None when the site sends
+    neither or cannot be reached.
+    """
+    if "://" not in url:
+        url = f"https://{url}"
+    try:
+        response = requests.head(url, timeout=timeout, allow_redirects=True)
+    except requests.RequestException as e:
+        logger.debug(f"Fingerprint probe failed for {url}: {e}")
+        return None
+
+    if response.status_code >= 400:
+        return None
+    etag = response.headers.get("ETag")
+    if etag and not etag.startswith("W/"):
+        return f"etag:{etag}"
+    last_modified = response.headers.get("Last-Modified")
+    if last_modified:
+        return f"last-modified:{last_modified}"
+    return None
+
+
+class AssetCache:
+    """Content-addressed image store with fingerprint-keyed lookups."""
+
+    def __init__(
+        self,
+        storage=None,
+        cache_dir: Union[str, Path] = ASSET_CACHE_DIR,
+        enabled: bool = ASSET_CACHE_ENABLED,
+        probe_sites: bool = True,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            storage: Storage backend holding the asset_cache table, defaults
+                to the current get_storage(); lookups are disabled if it has
+                no asset_cache methods
+            cache_dir: Directory of the content-addressed image files
+            enabled: Whether lookups may return cached images
+            probe_sites: Whether to send a HEAD request for a fingerprint
+                when no HTML from the scrape is stored for a business
+        """
+        self._storage = storage
+        self.cache_dir = Path(cache_dir)
+        self._enabled = enabled
+        self.probe_sites = probe_sites
+
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "seconds_saved": 0.0,
+            "bytes_saved": 0,
+            "deduplicated": 0,
+        }
+
+    @property
+    def storage(self):
+        """Storage backend of the cache."""
+        if self._storage is not None:
+            return self._storage
+        from leadfactory.storage import get_storage
+
+        return get_storage()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether lookups may return cached images."""
+        return self._enabled and hasattr(self.storage, "get_asset_cache_entry")
+
+    @staticmethod
+    def screenshot_key(website: str, fingerprint: str) -> str:
+        """Cache key of a screenshot of a site in a given state."""
+        key = f"{normalize_url(website)}|{fingerprint}"
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    @staticmethod
+    def mockup_key(screenshot_hash: str, variant: str = "1200x800") -> str:
+        """Cache key of a mockup rendered from a screenshot."""
+        return hashlib.sha256(f"{screenshot_hash}|{variant}".encode()).hexdigest()
+
+    def site_fingerprint(self, business: dict[str, Any]) -> Optional[str]:
+        """
+        Fingerprint of a business website's current state.
+
+        Prefers the hash of the HTML stored when the business was scraped,
+        then the site's ETag/Last-Modified. Returns None if neither is
+        available, in which case the site is always captured.
+        """
+        if hasattr(self.storage, "get_latest_html_fingerprint"):
+            html_hash = self.storage.get_latest_html_fingerprint(business["id"])
+            if isinstance(html_hash, str) and html_hash:
+                return f"html:{html_hash}"
+
+        if self.probe_sites and business.get("website"):
+            return probe_site_fingerprint(business["website"])
+        return None
+
+    def blob_path(self, content_hash: str) -> Path:
+        """Path of the stored image with a given hash."""
+        return self.cache_dir / content_hash[:2] / f"{content_hash}.png"
+
+    def lookup(
+        self, asset_type: str, cache_key: Optional[str]
+    ) -> Optional[CachedAsset]:
+        """
+        Get the cached image for a key.
+
+        Returns None, and counts a miss, when there is no entry or its image
+        file is gone.
+        """
+        if not cache_key or not self.enabled:
+            return None
+
+        storage = self.storage
+        entry = storage.get_asset_cache_entry(asset_type, cache_key)
+        if isinstance(entry, dict) and Path(entry["file_path"]).is_file():
+            cached = CachedAsset(
+                content_hash=entry["content_hash"],
+                file_path=entry["file_path"],
+                size_bytes=entry.get("size_bytes") or 0,
+                render_seconds=entry.get("render_seconds") or 0.0,
+                cache_key=cache_key,
+            )
+            storage.record_asset_cache_hit(asset_type, cache_key)
+            with self._lock:
+                self._stats["hits"] += 1
+                self._stats["seconds_saved"] += cached.render_seconds
+                self._stats["bytes_saved"] += cached.size_bytes
+            record_metric(ASSET_CACHE_LOOKUPS, asset_type=asset_type, result="hit")
+            record_metric(
+                ASSET_CACHE_SECONDS_SAVED, cached.render_seconds, asset_type=asset_type
+            )
+            record_metric(
+                ASSET_CACHE_BYTES_SAVED, cached.size_bytes, asset_type=asset_type
+            )
+            return cached
+
+        with self._lock:
+            self._stats["misses"] += 1
+        record_metric(ASSET_CACHE_LOOKUPS, asset_type=asset_type, result="miss")
+        return None
+
+    def store(
+        self,
+        asset_type: str,
+        source_path: Union[str, Path],
+        render_seconds: float = 0.0,
+        cache_key: Optional[str] = None,
+    ) -> CachedAsset:
+        """
+        Move a rendered image into the content-addressed store.
+
+        An image whose hash is already stored is dropped in favour of the
+        stored copy. The entry for cache_key, if given, is saved so the next
+        lookup with the same key is a hit.
+
+        Args:
+            asset_type: "screenshot" or "mockup"
+            source_path: Rendered image file; it is moved, not copied
+            render_seconds: Time it took to produce the image
+            cache_key: Key the image was rendered for
+
+        Returns:
+            The stored image
+        """
+        content_hash = file_sha256(source_path)
+        size_bytes = os.path.getsize(source_path)
+        blob_path = self.blob_path(content_hash)
+
+        if blob_path.is_file():
+            os.remove(source_path)
+            with self._lock:
+                self._stats["deduplicated"] += 1
+                self._stats["bytes_saved"] += size_bytes
+            record_metric(ASSET_CACHE_BYTES_SAVED, size_bytes, asset_type=asset_type)
+        else:
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            # Move through a temporary name so readers never see a partial file
+            tmp_path = blob_path.with_suffix(f".{os.getpid()}.tmp")
+            shutil.move(str(source_path), tmp_path)
+            os.replace(tmp_path, blob_path)
+
+        cached = CachedAsset(
+            content_hash=content_hash,
+            file_path=str(blob_path),
+            size_bytes=size_bytes,
+            render_seconds=render_seconds,
+            cache_key=cache_key,
+        )
+        if self.enabled and cache_key:
+            self.storage.save_asset_cache_entry(
+                asset_type,
+                cache_key,
+                content_hash,
+                cached.file_path,
+                size_bytes,
+                render_seconds,
+            )
+        return cached
+
+    def stats(self) -> dict[str, Any]:
+        """Hit rate and the render time and bytes saved by this process."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["lookups"] = lookups
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def log_stats(self):
+        """Log the cache statistics of this process."""
+        stats = self.stats()
+        if stats["lookups"] or stats["deduplicated"]:
+            logger.info(
+                f"Asset cache: {stats['hits']}/{stats['lookups']} hits "
+                f"({stats['hit_rate']:.0%}), {stats['deduplicated']} duplicate "
+                f"images, saved {stats['seconds_saved']:.1f}s and "
+                f"{stats['bytes_saved']} bytes"
+            )
+
+
+_asset_cache: Optional[AssetCache] = None
+_asset_cache_lock = threading.Lock()
+
+
+def get_asset_cache() -> AssetCache:
+    """Get the process-wide asset cache."""
+    global _asset_cache
+    with _asset_cache_lock:
+        if _asset_cache is None:
+            _asset_cache = AssetCache()
+        return _asset_cache
+
+
+def reset_asset_cache():
+    """Drop the process-wide asset cache (for tests)."""
+    global _asset_cache
+    with _asset_cache_lock:
+        _asset_cache = None
@@ -19,6 +19,12 @@ from typing import Any, Dict, List, Optional, Set, Tuple, Union
 project_root = str(Path(__file__).resolve().parent.parent.parent)
 sys.path.insert(0, project_root)
 
+from leadfactory.pipeline.dedupe_blocking import (
+    DEFAULT_MAX_BLOCK_SIZE,
+    BlockIndex,
+    generate_blocking_keys,
+)
+
 # Set up logging for import diagnostics
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -423,14 +429,34 @@ def make_dedupe_decision(
 class DuplicateDetector:
     """Detects duplicate businesses based on similarity."""
 
-    def __init__(self, similarity_threshold: float = 0.8):
+    def __init__(
+        self,
+        similarity_threshold: float = 0.8,
+        use_blocking: bool = True,
+        max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+    ):
         """
         Initialize duplicate detector.
 
         Args:
             similarity_threshold: Minimum similarity score to consider duplicates
+            use_blocking: Only compare businesses that share a blocking key
+                (phone, domain, email or name bucket) instead of every pair
+            max_block_size: Blocks larger than this produce no candidates
         """
         self.similarity_threshold = similarity_threshold
+        self.use_blocking = use_blocking
+        self.max_block_size = max_block_size
+
+    def _candidate_indexes(self, businesses: List[Dict[str, Any]]) -> List[List[int]]:
+        """Return, for each position, the later positions sharing a block."""
+        index = BlockIndex(max_block_size=self.max_block_size)
+        for position, business in enumerate(businesses):
+            index.add(position, generate_blocking_keys(business))
+        return [
+            sorted(j for j in index.candidates_for(i) if j > i)
+            for i in range(len(businesses))
+        ]
 
     def find_duplicates(self, businesses: List[Dict[str, Any]]) -> List[List[int]]:
         """
@@ -445,8 +471,8 @@ class DuplicateDetector:
         if not businesses:
             return []
 
-        # Build similarity matrix
         n = len(businesses)
+        candidates = self._candidate_indexes(businesses) if self.use_blocking else None
         duplicates = []
         processed = set()
 
@@ -457,7 +483,8 @@ class DuplicateDetector:
             group = [businesses[i]["id"]]
             processed.add(i)
 
-            for j in range(i + 1, n):
+            others = candidates[i] if candidates is not None else range(i + 1, n)
+            for j in others:
                 if j in processed:
                     continue
 
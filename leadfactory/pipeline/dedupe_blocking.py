@@ -0,0 +1,390 @@
+"""
+Blocking-key candidate generation for deduplication.
+
+Instead of comparing every business against every other business, each record
+is assigned a small set of normalized blocking keys (phone digits, registered
+domain, email, the full normalized name, and name-token/phonetic buckets
+scoped to a ZIP and to a city). Only businesses that share at least one key
+become candidate pairs, so the number of pairs that reach the Levenshtein
+matcher grows with block size rather than with the square of the table size.
+
+Keys are persisted in the ``dedupe_block_keys`` table and maintained
+incrementally as businesses are saved (see scrape.save_business), so
+candidate generation in the database is a join on an indexed key column
+instead of a full self-join. Businesses stored any other way are picked up by
+ensure_block_index, which must report the index complete before it replaces
+the self-join. A trigger on businesses queues every change to the fields keys
+are built from (in ``dedupe_block_key_updates``), whichever code path made
+it, and ensure_block_index re-keys those businesses so enrichment and manual
+edits don't leave stale keys behind.
+"""
+
+import logging
+import re
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Any, Optional
+
+from leadfactory.utils.e2e_db_connector import (
+    clear_block_index,
+    get_block_index_state,
+    get_block_key_updates,
+    get_businesses_for_blocking,
+    get_max_business_id,
+    mark_block_index_complete,
+    replace_block_keys,
+    upsert_block_keys,
+)
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever generate_blocking_keys changes, so stored keys are rebuilt
+# before the index is used again.
+BLOCK_KEY_VERSION = 2
+
+# Blocks larger than this are skipped when generating pairs; a key shared by
+# hundreds of businesses (e.g. a franchise call centre number) carries no signal.
+DEFAULT_MAX_BLOCK_SIZE = 200
+
+# Tokens that carry no identifying information in business names.
+NAME_STOPWORDS = frozenset(
+    {
+        "the",
+        "and",
+        "of",
+        "a",
+        "an",
+        "llc",
+        "inc",
+        "co",
+        "corp",
+        "corporation",
+        "company",
+        "ltd",
+        "pllc",
+        "pc",
+        "group",
+        "services",
+        "service",
+    }
+)
+
+# Second-level labels under which registrations happen one level deeper.
+_MULTI_PART_SUFFIXES = frozenset({"co", "com", "net", "org", "gov", "edu", "ac"})
+
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+def normalize_phone_key(phone: Optional[str]) -> Optional[str]:
+    """Return the last 10 digits of a phone number, or None if too short."""
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", str(phone))
+    if len(digits) < 7:
+        return None
+    return digits[-10:]
+
+
+def registered_domain(website: Optional[str]) -> Optional[str]:
+    """
+    Extract the registered domain from a website URL.
+
+    ``https://www.Example.co.uk/about`` becomes ``example.co.uk``.
+    """
+    if not website:
+        return None
+    host = str(website).strip().lower()
+    host = re.sub(r"^[a-z][a-z0-9+.-]*://", "", host)
+    host = re.split(r"[/?#:]", host, maxsplit=1)[0]
+    host = host.rsplit("@", 1)[-1].strip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    labels = [label for label in host.split(".") if label]
+    if len(labels) < 2:
+        return None
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _MULTI_PART_SUFFIXES:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def normalize_email_key(email: Optional[str]) -> Optional[str]:
+    """Return a lowercased email address, or None if it is not an address."""
+    if not email or "@" not in str(email):
+        return None
+    return str(email).strip().lower()
+
+
+def name_tokens(name: Optional[str]) -> list[str]:
+    """Split a business name into significant lowercase tokens."""
+    if not name:
+        return []
+    words = re.findall(r"[a-z0-9]+", str(name).lower().replace("'", ""))
+    return [word for word in words if word not in NAME_STOPWORDS and len(word) > 1]
+
+
+def soundex(word: str) -> str:
+    """Return the American Soundex code for a word."""
+    word = re.sub(r"[^a-z]", "", word.lower())
+    if not word:
+        return ""
+    code = word[0].upper()
+    previous = _SOUNDEX_CODES.get(word[0], "")
+    for char in word[1:]:
+        digit = _SOUNDEX_CODES.get(char, "")
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if char not in "hw":
+            previous = digit
+    return code.ljust(4, "0")
+
+
+def geo_scopes(business: dict[str, Any]) -> list[str]:
+    """
+    Return the geographic buckets used to scope name-based keys.
+
+    A business is bucketed by ZIP and by city, so the same business listed
+    under a neighbouring ZIP of the same city still shares name keys.
+    """
+    scopes = []
+    zip_code = str(business.get("zip") or business.get("zip_code") or "").strip()
+    if zip_code:
+        scopes.append(f"z{zip_code[:5]}")
+    city = str(business.get("city") or "").strip().lower()
+    state = str(business.get("state") or "").strip().lower()
+    if city:
+        scopes.append(f"c{city}|{state}")
+    return scopes or ["-"]
+
+
+def generate_blocking_keys(business: dict[str, Any]) -> set[str]:
+    """
+    Generate the blocking keys for a business record.
+
+    Args:
+        business: Business record with any of name, phone, email, website,
+            zip, city and state
+
+    Returns:
+        Set of blocking keys
+    """
+    keys = set()
+
+    phone = normalize_phone_key(business.get("phone"))
+    if phone:
+        keys.add(f"phone:{phone}")
+
+    domain = registered_domain(business.get("website"))
+    if domain:
+        keys.add(f"domain:{domain}")
+
+    email = normalize_email_key(business.get("email"))
+    if email:
+        keys.add(f"email:{email}")
+
+    tokens = name_tokens(business.get("name"))
+    if tokens:
+        # Unscoped, so an identical name matches across any geography; chain
+        # names shared by more than max_block_size businesses drop out
+        keys.add(f"fullname:{' '.join(tokens)}")
+        # Phonetic keys over tokens 1-2 and 2-3: together with the first-token
+        # key, a misspelling in any one of the first three tokens still leaves
+        # a shared key
+        codes = [soundex(token) for token in tokens[:3]]
+        phonetics = {"".join(codes[:2])}
+        if len(codes) == 3:
+            phonetics.add("".join(codes[1:]))
+        phonetics.discard("")
+        for scope in geo_scopes(business):
+            keys.add(f"name:{scope}:{tokens[0]}")
+            for phonetic in phonetics:
+                keys.add(f"phonetic:{scope}:{phonetic}")
+
+    return keys
+
+
+class BlockIndex:
+    """In-memory inverted index from blocking key to business IDs."""
+
+    def __init__(self, max_block_size: int = DEFAULT_MAX_BLOCK_SIZE):
+        """
+        Initialize the index.
+
+        Args:
+            max_block_size: Blocks with more members than this are ignored when
+                generating candidate pairs
+        """
+        self.max_block_size = max_block_size
+        self._blocks: dict[str, set[Any]] = defaultdict(set)
+        self._keys_by_id: dict[Any, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys_by_id)
+
+    def add(self, business_id: Any, keys: Iterable[str]) -> None:
+        """Add (or extend) the keys for a business."""
+        existing = self._keys_by_id.setdefault(business_id, set())
+        for key in keys:
+            if key not in existing:
+                existing.add(key)
+                self._blocks[key].add(business_id)
+
+    def add_business(self, business: dict[str, Any]) -> None:
+        """Index a business record by its ``id``."""
+        self.add(business["id"], generate_blocking_keys(business))
+
+    def remove(self, business_id: Any) -> None:
+        """Remove a business from every block it belongs to."""
+        for key in self._keys_by_id.pop(business_id, set()):
+            members = self._blocks.get(key)
+            if members is not None:
+                members.discard(business_id)
+                if not members:
+                    del self._blocks[key]
+
+    def candidates_for(self, business_id: Any) -> set[Any]:
+        """Return the IDs sharing at least one usable block with a business."""
+        candidates = set()
+        for key in self._keys_by_id.get(business_id, ()):
+            members = self._blocks[key]
+            if len(members) <= self.max_block_size:
+                candidates.update(members)
+        candidates.discard(business_id)
+        return candidates
+
+    def candidate_pairs(self) -> Iterator[tuple[Any, Any]]:
+        """
+        Yield each unordered candidate pair exactly once as ``(low, high)``.
+
+        Pairs are yielded in ascending order of the lower ID, then the higher.
+        """
+        for business_id in sorted(self._keys_by_id):
+            higher = (
+                other
+                for other in self.candidates_for(business_id)
+                if other > business_id
+            )
+            for other_id in sorted(higher):
+                yield business_id, other_id
+
+    def block_sizes(self) -> dict[str, int]:
+        """Return the number of members in each block."""
+        return {key: len(members) for key, members in self._blocks.items()}
+
+
+def build_block_index(
+    businesses: Iterable[dict[str, Any]],
+    max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+) -> BlockIndex:
+    """Build an in-memory block index over business records keyed by ``id``."""
+    index = BlockIndex(max_block_size=max_block_size)
+    for business in businesses:
+        index.add_business(business)
+    return index
+
+
+def _index_businesses(after_id: int, batch_size: int) -> tuple[int, bool]:
+    """Store keys for businesses past ``after_id``; return (count, success)."""
+    indexed = 0
+    while True:
+        businesses = get_businesses_for_blocking(after_id, batch_size)
+        if not businesses:
+            return indexed, True
+        rows = [
+            (key, business["id"])
+            for business in businesses
+            for key in sorted(generate_blocking_keys(business))
+        ]
+        if not upsert_block_keys(rows):
+            logger.error(f"Stopped block index rebuild after business {after_id}")
+            return indexed, False
+        indexed += len(businesses)
+        after_id = businesses[-1]["id"]
+
+
+def _rekey_updated_businesses(batch_size: int) -> bool:
+    """Regenerate keys for businesses queued as updated; return success."""
+    rekeyed = 0
+    while True:
+        businesses = get_block_key_updates(batch_size)
+        if businesses is None:
+            return False
+        if not businesses:
+            break
+        rows = [
+            (key, business["id"])
+            for business in businesses
+            for key in sorted(generate_blocking_keys(business))
+        ]
+        updates = [(business["id"], business["queued_at"]) for business in businesses]
+        if not replace_block_keys(rows, updates):
+            logger.error(f"Stopped re-keying after {rekeyed} updated businesses")
+            return False
+        rekeyed += len(businesses)
+    if rekeyed:
+        logger.info(f"Re-keyed {rekeyed} updated businesses")
+    return True
+
+
+def rebuild_block_index(batch_size: int = 5000) -> int:
+    """
+    Backfill blocking keys for every stored business.
+
+    Safe to re-run; existing keys are left in place.
+
+    Args:
+        batch_size: Number of businesses read and written per round trip
+
+    Returns:
+        Number of businesses indexed
+    """
+    indexed, _ = _index_businesses(0, batch_size)
+    logger.info(f"Indexed blocking keys for {indexed} businesses")
+    return indexed
+
+
+def ensure_block_index(batch_size: int = 5000) -> bool:
+    """
+    Bring the persisted block index up to date with the businesses table.
+
+    Indexes every business past the recorded watermark, or clears and
+    rebuilds the index when it was built with another BLOCK_KEY_VERSION (or
+    never completed), then advances the watermark. Businesses whose blocking
+    fields were updated since their keys were stored are re-keyed.
+
+    Args:
+        batch_size: Number of businesses read and written per round trip
+
+    Returns:
+        True if every stored business has current keys, so candidate pairs
+        can come from the index instead of a full self-join
+    """
+    # Read first: businesses saved from here on are indexed by save_business
+    # or by the next call
+    through_id = get_max_business_id()
+    state = get_block_index_state()
+    rebuild = not state or state["key_version"] != BLOCK_KEY_VERSION
+    if rebuild:
+        logger.info(f"Rebuilding blocking-key index (key version {BLOCK_KEY_VERSION})")
+        if not clear_block_index():
+            return False
+        after_id = 0
+    else:
+        after_id = state["indexed_through_id"]
+
+    if rebuild or after_id < through_id:
+        indexed, complete = _index_businesses(after_id, batch_size)
+        if not complete:
+            return False
+        logger.info(f"Indexed blocking keys for {indexed} businesses")
+        if not mark_block_index_complete(BLOCK_KEY_VERSION, through_id):
+            return False
+    return _rekey_updated_businesses(batch_size)
@@ -11,11 +11,12 @@ import threading
 import time
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
 
 from leadfactory.config.dedupe_config import DedupeConfig
+from leadfactory.pipeline.conflict_resolution import ConflictResolver
 from leadfactory.pipeline.dedupe_logging import DedupeLogger, dedupe_operation
 from leadfactory.storage.factory import get_storage
 from leadfactory.utils.e2e_db_connector import (
@@ -90,6 +91,53 @@ class BusinessCache:
             self._access_count.clear()
 
 
+class UnionFind:
+    """Disjoint sets over business IDs, with path halving and union by size."""
+
+    def __init__(self):
+        self._parent: Dict[int, int] = {}
+        self._size: Dict[int, int] = {}
+
+    def find(self, item: int) -> int:
+        """Return the representative of the set containing item."""
+        parent = self._parent
+        if item not in parent:
+            parent[item] = item
+            self._size[item] = 1
+            return item
+
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, item1: int, item2: int) -> None:
+        """Merge the sets containing item1 and item2."""
+        root1, root2 = self.find(item1), self.find(item2)
+        if root1 == root2:
+            return
+        if self._size[root1] < self._size[root2]:
+            root1, root2 = root2, root1
+        self._parent[root2] = root1
+        self._size[root1] += self._size[root2]
+
+    def groups(self) -> List[List[int]]:
+        """Return every set with more than one member, members sorted by ID."""
+        members = defaultdict(list)
+        for item in self._parent:
+            members[self.find(item)].append(item)
+        return [sorted(group) for group in members.values() if len(group) > 1]
+
+
+@dataclass
+class MergeCluster:
+    """A connected component of duplicates and how to merge it."""
+
+    primary_id: int
+    secondary_ids: List[int]
+    updates: Dict[str, Any] = field(default_factory=dict)
+
+
 class OptimizedDeduplicator:
     """Optimized deduplication processor with batch operations and caching."""
 
@@ -257,6 +305,221 @@ class OptimizedDeduplicator:
 
         return stats
 
+    def resolve_clusters(
+        self, pairs: List[Dict[str, Any]], fetch_size: int = 1000
+    ) -> Tuple[List[MergeCluster], Dict[str, int]]:
+        """
+        Group accepted duplicate pairs into clusters.
+
+        Pairs that pass _should_merge are unioned, so chains like A~B, B~C
+        become one cluster {A, B, C} that is merged once, rather than as
+        separate pairs that race to delete B. Each cluster gets a single
+        primary and a single set of field updates.
+
+        Args:
+            pairs: Duplicate pairs to resolve
+            fetch_size: Number of businesses fetched per query
+
+        Returns:
+            Tuple of (clusters, statistics)
+        """
+        stats = {"processed": 0, "flagged": 0, "errors": 0}
+
+        business_ids = list(
+            dict.fromkeys(
+                business_id
+                for pair in pairs
+                for business_id in (pair["business1_id"], pair["business2_id"])
+            )
+        )
+
+        # Every business is read exactly once, so skip the LRU cache
+        storage = get_storage()
+        businesses = {}
+        for i in range(0, len(business_ids), fetch_size):
+            for business in storage.get_businesses(business_ids[i : i + fetch_size]):
+                businesses[business["id"]] = business
+            self.metrics.batch_operations += 1
+
+        components = UnionFind()
+        for pair in pairs:
+            business1 = businesses.get(pair["business1_id"])
+            business2 = businesses.get(pair["business2_id"])
+
+            if not business1 or not business2:
+                logger.warning(
+                    f"Missing business data for pair {pair['business1_id']}, {pair['business2_id']}"
+                )
+                stats["errors"] += 1
+                continue
+
+            try:
+                if self._should_merge(business1, business2):
+                    components.union(business1["id"], business2["id"])
+                else:
+                    stats["flagged"] += 1
+                stats["processed"] += 1
+            except Exception as e:
+                logger.error(f"Error processing pair: {e}")
+                stats["errors"] += 1
+
+        resolver = ConflictResolver(self.config)
+        clusters = [
+            self._build_cluster([businesses[i] for i in group], resolver)
+            for group in components.groups()
+        ]
+
+        return clusters, stats
+
+    def _build_cluster(
+        self, members: List[Dict[str, Any]], resolver: ConflictResolver
+    ) -> MergeCluster:
+        """Choose a cluster's primary and resolve its conflicts once."""
+        primary = members[0]
+        for business in members[1:]:
+            primary_id, _ = self._select_primary(primary, business)
+            if primary_id != primary["id"]:
+                primary = business
+
+        # Fold every secondary into a working copy of the primary, so later
+        # secondaries only fill what earlier ones left open
+        merged = dict(primary)
+        secondary_ids = []
+        for business in members:
+            if business is primary:
+                continue
+            conflicts = resolver.identify_conflicts(merged, business)
+            merged.update(resolver.resolve_conflicts(conflicts, merged, business))
+            secondary_ids.append(business["id"])
+
+        updates = {
+            key: value
+            for key, value in merged.items()
+            if key not in ("id", "created_at", "updated_at")
+            and value != primary.get(key)
+        }
+        return MergeCluster(primary["id"], secondary_ids, updates)
+
+    def merge_clusters(
+        self,
+        clusters: List[MergeCluster],
+        chunk_size: int = 500,
+        parallel: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Merge clusters in chunks, one transaction per chunk.
+
+        Clusters are disjoint, so chunks touch disjoint rows and are merged
+        in parallel without contending for locks.
+
+        Args:
+            clusters: Clusters from resolve_clusters()
+            chunk_size: Number of clusters merged per transaction
+            parallel: Whether to merge chunks on the thread pool
+
+        Returns:
+            Statistics dictionary with merged and errors counts
+        """
+        stats = {"merged": 0, "errors": 0}
+        chunks = [
+            clusters[i : i + chunk_size] for i in range(0, len(clusters), chunk_size)
+        ]
+        if not chunks:
+            return stats
+
+        if parallel and self.max_workers > 1 and len(chunks) > 1:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                future_to_chunk = {
+                    executor.submit(self._merge_cluster_chunk, chunk): chunk
+                    for chunk in chunks
+                }
+                for future in as_completed(future_to_chunk):
+                    try:
+                        chunk_stats = future.result()
+                        self.metrics.parallel_operations += 1
+                    except Exception as e:
+                        logger.error(f"Error in parallel cluster merge: {e}")
+                        chunk_stats = {
+                            "merged": 0,
+                            "errors": sum(
+                                len(cluster.secondary_ids)
+                                for cluster in future_to_chunk[future]
+                            ),
+                        }
+                    for key in stats:
+                        stats[key] += chunk_stats[key]
+        else:
+            for chunk in chunks:
+                chunk_stats = self._merge_cluster_chunk(chunk)
+                for key in stats:
+                    stats[key] += chunk_stats[key]
+
+        return stats
+
+    def _merge_cluster_chunk(self, chunk: List[MergeCluster]) -> Dict[str, int]:
+        """Merge one chunk of clusters, in bulk if the storage supports it."""
+        stats = {"merged": 0, "errors": 0}
+        storage = get_storage()
+
+        if hasattr(storage, "merge_business_clusters"):
+            merged = storage.merge_business_clusters(
+                [
+                    (cluster.primary_id, cluster.secondary_ids, cluster.updates)
+                    for cluster in chunk
+                ]
+            )
+            self.metrics.batch_operations += 1
+            count = sum(len(cluster.secondary_ids) for cluster in chunk)
+            if not merged:
+                stats["errors"] += count
+                return stats
+            stats["merged"] += count
+            for cluster in chunk:
+                for secondary_id in cluster.secondary_ids:
+                    self.dedupe_logger.log_merge(
+                        cluster.primary_id, secondary_id, 0.9, "cluster_processing"
+                    )
+            return stats
+
+        # Fallback: merge one secondary at a time
+        for cluster in chunk:
+            for secondary_id in cluster.secondary_ids:
+                if self._merge_businesses_optimized(cluster.primary_id, secondary_id):
+                    stats["merged"] += 1
+                    self.dedupe_logger.log_merge(
+                        cluster.primary_id, secondary_id, 0.9, "cluster_processing"
+                    )
+                else:
+                    stats["errors"] += 1
+        return stats
+
+    def process_pairs_clustered(
+        self,
+        pairs: List[Dict[str, Any]],
+        chunk_size: int = 500,
+        parallel: bool = True,
+    ) -> Dict[str, int]:
+        """
+        Process duplicate pairs as clusters with bulk merges.
+
+        Args:
+            pairs: List of duplicate pairs to process
+            chunk_size: Number of clusters merged per transaction
+            parallel: Whether to merge chunks on the thread pool
+
+        Returns:
+            Statistics dictionary; "merged" counts merged-away businesses
+        """
+        clusters, stats = self.resolve_clusters(pairs)
+        stats.update(self.merge_clusters(clusters, chunk_size, parallel))
+        stats["clusters"] = len(clusters)
+
+        logger.info(
+            f"Resolved {stats['processed']} pairs into {len(clusters)} clusters, "
+            f"merged {stats['merged']} businesses"
+        )
+        return stats
+
     def _should_merge(
         self, business1: Dict[str, Any], business2: Dict[str, Any]
     ) -> bool:
@@ -373,6 +636,7 @@ def run_optimized_deduplication(
     limit: Optional[int] = None,
     use_parallel: bool = True,
     batch_size: int = 50,
+    use_clusters: bool = True,
 ) -> Dict[str, Any]:
     """
     Run optimized deduplication with performance tracking.
@@ -382,6 +646,8 @@ def run_optimized_deduplication(
         limit: Maximum number of pairs to process
         use_parallel: Whether to use parallel processing
         batch_size: Batch size for processing
+        use_clusters: Whether to merge connected pairs as clusters in bulk
+            transactions instead of pair by pair
 
     Returns:
         Results dictionary with stats and performance metrics
@@ -408,7 +674,10 @@ def run_optimized_deduplication(
         logger.info(f"Processing {len(pairs)} potential duplicate pairs...")
 
         # Choose processing method
-        if use_parallel and len(pairs) > 100:
+        if use_clusters:
+            logger.info("Using cluster processing...")
+            stats = deduplicator.process_pairs_clustered(pairs, parallel=use_parallel)
+        elif use_parallel and len(pairs) > 100:
             logger.info("Using parallel processing...")
             stats = deduplicator.process_pairs_parallel(pairs)
         else:
@@ -6,6 +6,7 @@ using the unified database connector from leadfactory.utils.e2e_db_connector.
 """
 
 import argparse
+import asyncio
 import json
 import logging
 import os
@@ -21,7 +22,7 @@ import requests
 from leadfactory.config.dedupe_config import DedupeConfig, load_dedupe_config
 
 # Import LLM fallback client
-from leadfactory.llm import LLMClient, LLMError
+from leadfactory.llm import AsyncLLMClient, LLMClient, LLMError
 
 # Import conflict resolution
 from leadfactory.pipeline.conflict_resolution import (
@@ -128,14 +129,7 @@ class LLMVerifier:
         # Try using LLM client with fallback first
         if self.llm_client:
             try:
-                messages = [
-                    {
-                        "role": "system",
-                        "content": "You are a data analyst specializing in business record deduplication. "
-                        "Analyze the provided business information and respond only in valid JSON format.",
-                    },
-                    {"role": "user", "content": prompt},
-                ]
+                messages = self._build_messages(prompt)
 
                 response = self.llm_client.chat_completion(
                     messages=messages,
@@ -162,6 +156,67 @@ class LLMVerifier:
         # Fallback to legacy Ollama implementation
         return self._verify_with_ollama(prompt)
 
+    def verify_duplicates_many(
+        self, pairs: list[tuple[dict, dict]]
+    ) -> list[tuple[bool, float, str]]:
+        """
+        Verify many business pairs concurrently.
+
+        Prompts are fanned out through AsyncLLMClient; pairs whose request
+        fails fall back to the legacy Ollama call one at a time. Must not be
+        called from inside a running event loop.
+
+        Args:
+            pairs: (business1, business2) tuples to verify
+
+        Returns:
+            One (is_duplicate, confidence, reasoning) tuple per pair, in order
+        """
+        prompts = [self._create_prompt(b1, b2) for b1, b2 in pairs]
+        responses: list[Any] = [None] * len(prompts)
+
+        if self.llm_client and prompts:
+            try:
+                responses = asyncio.run(self._complete_many(prompts))
+            except Exception as e:
+                logger.warning(
+                    f"Batched LLM verification failed, falling back to legacy Ollama: {e}"
+                )
+
+        results = []
+        for prompt, response in zip(prompts, responses):
+            if isinstance(response, dict):
+                results.append(
+                    self._parse_response(response["choices"][0]["message"]["content"])
+                )
+            else:
+                if isinstance(response, Exception):
+                    logger.warning(
+                        f"LLM client failed, falling back to legacy Ollama: {response}"
+                    )
+                results.append(self._verify_with_ollama(prompt))
+        return results
+
+    async def _complete_many(self, prompts: list[str]) -> list[Any]:
+        """Fan prompts out through an async client bound to the running loop."""
+        async with AsyncLLMClient(self.llm_client.config) as client:
+            return await client.chat_completion_many(
+                [self._build_messages(prompt) for prompt in prompts],
+                temperature=0.1,
+                max_tokens=500,
+            )
+
+    def _build_messages(self, prompt: str) -> list[dict[str, str]]:
+        """Wrap a verification prompt in chat messages."""
+        return [
+            {
+                "role": "system",
+                "content": "You are a data analyst specializing in business record deduplication. "
+                "Analyze the provided business information and respond only in valid JSON format.",
+            },
+            {"role": "user", "content": prompt},
+        ]
+
     def _verify_with_ollama(self, prompt: str) -> tuple[bool, float, str]:
         """Fallback verification using direct Ollama API."""
         try:
@@ -570,15 +625,48 @@ def flag_for_review(
     return review_id is not None
 
 
+def verify_pair_batch(
+    pairs: list[dict], verifier: LLMVerifier
+) -> list[Optional[tuple[bool, float, str]]]:
+    """
+    Verify a batch of duplicate pairs with one concurrent LLM fan-out.
+
+    Returns:
+        One (is_duplicate, confidence, reasoning) tuple per pair, in order, or
+        None for pairs whose business records could not be fetched
+    """
+    businesses = [
+        (
+            get_business_by_id(pair["business1_id"]),
+            get_business_by_id(pair["business2_id"]),
+        )
+        for pair in pairs
+    ]
+    found = [index for index, (b1, b2) in enumerate(businesses) if b1 and b2]
+    verifications: list[Optional[tuple[bool, float, str]]] = [None] * len(pairs)
+    results = verifier.verify_duplicates_many([businesses[index] for index in found])
+    for index, result in zip(found, results):
+        verifications[index] = result
+    return verifications
+
+
 def process_duplicate_pair(
     pair: dict,
     matcher: LevenshteinMatcher,
     config: DedupeConfig,
     verifier: Optional[LLMVerifier] = None,
+    verification: Optional[tuple[bool, float, str]] = None,
 ) -> bool:
     """
     Process a single duplicate pair.
 
+    Args:
+        pair: Duplicate pair with business1_id and business2_id
+        matcher: Name similarity matcher
+        config: Deduplication configuration
+        verifier: LLM verifier, used when no verification is supplied
+        verification: Result already obtained from verify_pair_batch()
+
     Returns:
         True if successfully processed, False otherwise
     """
@@ -615,10 +703,11 @@ def process_duplicate_pair(
     )
 
     # Use LLM verification if available
-    if verifier and config.use_llm_verification:
-        is_duplicate, confidence, reasoning = verifier.verify_duplicates(
-            business1, business2
-        )
+    if verification is None and verifier and config.use_llm_verification:
+        verification = verifier.verify_duplicates(business1, business2)
+
+    if verification is not None:
+        is_duplicate, confidence, reasoning = verification
         logger.info(
             f"LLM verification: is_duplicate={is_duplicate}, confidence={confidence}, reasoning={reasoning}"
         )
@@ -783,44 +872,59 @@ def deduplicate(
         stats = {"processed": 0, "merged": 0, "flagged": 0, "errors": 0}
         batch_id = f"batch_{int(time.time())}"
 
-        for i, pair in enumerate(duplicates):
-            try:
-                # Log batch progress every 10 items
-                if i % 10 == 0:
-                    dedupe_logger.log_batch_progress(
-                        batch_id=batch_id,
-                        processed=i,
-                        total=len(duplicates),
-                        errors=stats["errors"],
-                        merged=stats["merged"],
-                        flagged=stats["flagged"],
+        batch_size = max(config.batch_size, 1)
+        for start in range(0, len(duplicates), batch_size):
+            batch = duplicates[start : start + batch_size]
+            # Verify the whole batch concurrently before resolving pairs
+            verifications: list[Optional[tuple[bool, float, str]]] = [None] * len(batch)
+            if verifier:
+                try:
+                    verifications = verify_pair_batch(batch, verifier)
+                except Exception as e:
+                    logger.error(f"Error verifying batch at pair {start}: {e}")
+
+            for i, (pair, verification) in enumerate(zip(batch, verifications), start):
+                try:
+                    # Log batch progress every 10 items
+                    if i % 10 == 0:
+                        dedupe_logger.log_batch_progress(
+                            batch_id=batch_id,
+                            processed=i,
+                            total=len(duplicates),
+                            errors=stats["errors"],
+                            merged=stats["merged"],
+                            flagged=stats["flagged"],
+                        )
+
+                    # Process the pair
+                    process_op = dedupe_logger.start_operation(
+                        "process_pair",
+                        business1_id=pair.get("business1_id"),
+                        business2_id=pair.get("business2_id"),
                     )
 
-                # Process the pair
-                process_op = dedupe_logger.start_operation(
-                    "process_pair",
-                    business1_id=pair.get("business1_id"),
-                    business2_id=pair.get("business2_id"),
-                )
-
-                if process_duplicate_pair(pair, matcher, config, verifier):
-                    stats["processed"] += 1
-                    # Check if it was merged or flagged
-                    if pair.get("merged"):
-                        stats["merged"] += 1
-                    elif pair.get("flagged"):
-                        stats["flagged"] += 1
-                    dedupe_logger.end_operation(process_op, status="success")
-                else:
+                    if process_duplicate_pair(
+                        pair, matcher, config, verifier, verification
+                    ):
+                        stats["processed"] += 1
+                        # Check if it was merged or flagged
+                        if pair.get("merged"):
+                            stats["merged"] += 1
+                        elif pair.get("flagged"):
+                            stats["flagged"] += 1
+                        dedupe_logger.end_operation(process_op, status="success")
+                    else:
+                        stats["errors"] += 1
+                        dedupe_logger.end_operation(process_op, status="failure")
+
+                except Exception as e:
+                    logger.error(
+                        f"Error processing pair {pair.get('business1_id')}, {pair.get('business2_id')}: {e}"
+                    )
                     stats["errors"] += 1
-                    dedupe_logger.end_operation(process_op, status="failure")
-
-            except Exception as e:
-                logger.error(
-                    f"Error processing pair {pair.get('business1_id')}, {pair.get('business2_id')}: {e}"
-                )
-                stats["errors"] += 1
-                dedupe_logger.end_operation(process_op, status="error", error=str(e))
+                    dedupe_logger.end_operation(
+                        process_op, status="error", error=str(e)
+                    )
 
         # Final batch progress
         dedupe_logger.log_batch_progress(
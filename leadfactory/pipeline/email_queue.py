@@ -15,10 +15,12 @@ import re
 import sys
 import time
 from collections.abc import Sequence
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Optional
 
+import aiohttp
 import requests
 
 from leadfactory.config import load_config
@@ -96,6 +98,9 @@ def load_sendgrid_config():
 # Constants
 DEFAULT_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT_SECONDS", "30"))
 MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_EMAILS", "5"))
+# Sends per second allowed for each IP pool/subuser, and the burst above that
+EMAIL_SEND_RATE_PER_SECOND = float(os.getenv("EMAIL_SEND_RATE_PER_SECOND", "5"))
+EMAIL_SEND_BURST = int(os.getenv("EMAIL_SEND_BURST", str(MAX_CONCURRENT_REQUESTS)))
 DAILY_EMAIL_LIMIT = int(os.getenv("DAILY_EMAIL_LIMIT", "50"))
 BOUNCE_RATE_THRESHOLD = float(
     os.getenv("BOUNCE_RATE_THRESHOLD", "0.02")
@@ -109,6 +114,7 @@ MONTHLY_BUDGET = float(os.getenv("MONTHLY_BUDGET", "250"))  # $250 monthly budge
 # Current IP pool and subuser indices
 CURRENT_IP_POOL_INDEX = int(os.getenv("CURRENT_IP_POOL_INDEX", "0"))
 CURRENT_SUBUSER_INDEX = int(os.getenv("CURRENT_SUBUSER_INDEX", "0"))
+SENDGRID_MAIL_SEND_URL = "https://api.sendgrid.com/v3/mail/send"
 EMAIL_TEMPLATE_PATH = (
     Path(__file__).resolve().parent.parent.parent.joinpath("etc", "email_template.html")
 )
@@ -144,16 +150,20 @@ class SendGridEmailSender:
             "Content-Type": "application/json",
         }
 
-    def send_email(
+    @property
+    def rate_limit_key(self) -> str:
+        """Key identifying the IP pool/subuser this sender's rate limit applies to."""
+        return f"{self.ip_pool or 'default'}:{self.subuser or 'default'}"
+
+    def build_payload(
         self,
         to_email: str,
         to_name: str,
         subject: str,
         html_content: str,
         attachments: list[dict] = None,
-        is_dry_run: bool = False,
-    ) -> Optional[str]:
-        """Send an email via SendGrid.
+    ) -> dict:
+        """Build the SendGrid mail/send payload for a message.
 
         Args:
             to_email: Recipient email address.
@@ -161,28 +171,10 @@ class SendGridEmailSender:
             subject: Email subject.
             html_content: HTML content of the email.
             attachments: List of attachments to include.
-            is_dry_run: If True, don't actually send the email.
 
         Returns:
-            Message ID if successful, None otherwise.
+            Request payload.
         """
-        if attachments is None:
-            attachments = []
-        if is_dry_run:
-            logger.info(f"Dry run: would send email to {to_email}")
-            return f"dry-run-{int(time.time())}"
-
-        if not self.api_key:
-            error_msg = "SendGrid API key not found in environment variables"
-            logger.error(error_msg)
-            return None
-
-        if not all([subject, html_content]):
-            error_msg = "Missing required email content"
-            logger.error(error_msg)
-            return None
-
-        # Prepare the email payload
         payload = {
             "personalizations": [
                 {
@@ -217,6 +209,50 @@ class SendGridEmailSender:
                 payload["attachments"] = []
             payload["attachments"].extend(attachments)
 
+        return payload
+
+    def send_email(
+        self,
+        to_email: str,
+        to_name: str,
+        subject: str,
+        html_content: str,
+        attachments: list[dict] = None,
+        is_dry_run: bool = False,
+    ) -> Optional[str]:
+        """Send an email via SendGrid.
+
+        Args:
+            to_email: Recipient email address.
+            to_name: Recipient name.
+            subject: Email subject.
+            html_content: HTML content of the email.
+            attachments: List of attachments to include.
+            is_dry_run: If True, don't actually send the email.
+
+        Returns:
+            Message ID if successful, None otherwise.
+        """
+        if attachments is None:
+            attachments = []
+        if is_dry_run:
+            logger.info(f"Dry run: would send email to {to_email}")
+            return f"dry-run-{int(time.time())}"
+
+        if not self.api_key:
+            error_msg = "SendGrid API key not found in environment variables"
+            logger.error(error_msg)
+            return None
+
+        if not all([subject, html_content]):
+            error_msg = "Missing required email content"
+            logger.error(error_msg)
+            return None
+
+        payload = self.build_payload(
+            to_email, to_name, subject, html_content, attachments
+        )
+
         # Send the email via SendGrid API
         try:
             headers = {
@@ -225,7 +261,7 @@ class SendGridEmailSender:
             }
 
             response = requests.post(
-                "https://api.sendgrid.com/v3/mail/send",
+                SENDGRID_MAIL_SEND_URL,
                 headers=headers,
                 json=payload,
                 timeout=DEFAULT_TIMEOUT,
@@ -248,6 +284,66 @@ class SendGridEmailSender:
             logger.error(f"Unexpected error sending email: {str(e)}")
             return None
 
+    async def send_email_async(
+        self,
+        session: aiohttp.ClientSession,
+        to_email: str,
+        to_name: str,
+        subject: str,
+        html_content: str,
+        attachments: list[dict] = None,
+        is_dry_run: bool = False,
+    ) -> Optional[str]:
+        """Send an email via SendGrid on a shared aiohttp session.
+
+        Args:
+            session: Client session reused across sends.
+            to_email: Recipient email address.
+            to_name: Recipient name.
+            subject: Email subject.
+            html_content: HTML content of the email.
+            attachments: List of attachments to include.
+            is_dry_run: If True, don't actually send the email.
+
+        Returns:
+            Message ID if successful, None otherwise.
+        """
+        if is_dry_run:
+            logger.info(f"Dry run: would send email to {to_email}")
+            return f"dry-run-{int(time.time())}"
+
+        if not self.api_key:
+            logger.error("SendGrid API key not found in environment variables")
+            return None
+
+        if not all([subject, html_content]):
+            logger.error("Missing required email content")
+            return None
+
+        payload = self.build_payload(
+            to_email, to_name, subject, html_content, attachments
+        )
+
+        try:
+            async with session.post(
+                SENDGRID_MAIL_SEND_URL, headers=self.headers, json=payload
+            ) as response:
+                if response.status == 202:
+                    message_id = response.headers.get("X-Message-Id", "")
+                    logger.info(f"Email sent successfully to {to_email}")
+                    return message_id
+
+                error_msg = f"{response.status} - {await response.text()}"
+                logger.error(f"Failed to send email: {error_msg}")
+                return None
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"Network error sending email: {str(e)}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error sending email: {str(e)}")
+            return None
+
     def get_bounce_rate(
         self, days: int = 7, ip_pool: str = None, subuser: str = None
     ) -> float:
@@ -931,11 +1027,283 @@ def apply_template_replacements(template: str, business: dict) -> str:
     return html_content
 
 
+@dataclass
+class PreparedEmail:
+    """A rendered business email ready to hand to SendGrid."""
+
+    business: dict
+    recipient_email: str
+    original_email: str
+    subject: str
+    html_content: str
+    attachments: list[dict] = field(default_factory=list)
+
+    @property
+    def to_name(self) -> str:
+        return self.business.get("name", "Unknown Business")
+
+
+def _read_inline_image(path: str, filename: str) -> dict:
+    """Read an image file into an inline SendGrid attachment."""
+    with open(path, "rb") as f:
+        data = f.read()
+    return {
+        "content": base64.b64encode(data).decode(),
+        "filename": filename,
+        "type": "image/png",
+        "disposition": "inline",
+        "content_id": filename,
+    }
+
+
+def build_email_attachments(
+    business_id: int, screenshot_path: Optional[str], mockup_path: Optional[str]
+) -> list[dict]:
+    """Build the inline screenshot and mockup attachments for an email.
+
+    Args:
+        business_id: Business ID.
+        screenshot_path: Optional path to the website screenshot.
+        mockup_path: Path to the website mockup.
+
+    Returns:
+        List of attachments.
+
+    Raises:
+        Exception: If no mockup file is available.
+    """
+    attachments = []
+
+    # Add screenshot/thumbnail as inline attachment if available
+    if screenshot_path and os.path.exists(screenshot_path):
+        try:
+            attachments.append(
+                _read_inline_image(screenshot_path, "website-thumbnail.png")
+            )
+            logger.info(f"Embedded screenshot thumbnail for business {business_id}")
+        except Exception as e:
+            logger.warning(
+                f"Failed to read screenshot file {screenshot_path}: {str(e)}"
+            )
+            # Screenshot is optional, so we continue
+
+    # Add mockup as inline attachment
+    if mockup_path and os.path.exists(mockup_path):
+        try:
+            attachments.append(_read_inline_image(mockup_path, "website-mockup.png"))
+            logger.info(f"Embedded mockup image for business {business_id}")
+        except Exception as e:
+            logger.error(f"Failed to read mockup file {mockup_path}: {str(e)}")
+            raise Exception(f"Cannot send email without real mockup: {e}")
+    else:
+        # No real mockup available - cannot send email
+        logger.error(f"No real mockup file found for business {business_id}")
+        logger.error("Cannot send email without real mockup - failing email delivery")
+        raise Exception(
+            f"Email delivery requires real mockup, but none found for business {business_id}"
+        )
+
+    return attachments
+
+
+async def render_business_email(
+    business: dict, template: str, is_dry_run: bool = False
+) -> Optional[PreparedEmail]:
+    """Render the email for a business without sending it.
+
+    Applies the recipient override and unsubscribe guard, generates the
+    content and embeds the screenshot and mockup images. Database lookups
+    and file reads run in worker threads so concurrent renders do not block
+    the event loop.
+
+    Args:
+        business: Business dictionary with contact information.
+        template: Email template content.
+        is_dry_run: Unused; dry runs render exactly like real sends so the
+            mockup requirement is still enforced.
+
+    Returns:
+        Prepared email, or None if the business should not be emailed.
+    """
+    # Get recipient email (with override if set)
+    recipient_email = business.get("email", "")
+    if not recipient_email:
+        logger.warning(f"No email address for business {business.get('id')}")
+        return None
+
+    # Apply email override if set
+    email_override = os.getenv("EMAIL_OVERRIDE")
+    original_email = recipient_email
+    if email_override:
+        logger.info(
+            f"EMAIL_OVERRIDE active: Redirecting email from {original_email} to {email_override}"
+        )
+        recipient_email = email_override
+
+    # Check if email is unsubscribed
+    if await asyncio.to_thread(is_email_unsubscribed, recipient_email):
+        logger.info(f"Email {recipient_email} is unsubscribed, skipping")
+        return None
+
+    # Generate personalized email content from template
+    subject, html_content, text_content = await generate_email_content(
+        business, template
+    )
+
+    # Get mockup file path from assets table
+    mockup_path = None
+    try:
+        asset = await asyncio.to_thread(
+            storage.get_business_asset, business["id"], "mockup"
+        )
+        if asset:
+            mockup_path = asset.get("file_path")
+    except Exception as e:
+        logger.exception(
+            f"Error getting mockup asset for business {business['id']}: {str(e)}"
+        )
+
+    # Get screenshot (thumbnail) file path from assets table
+    screenshot_path = None
+    try:
+        screenshot_asset = await asyncio.to_thread(
+            storage.get_business_asset, business["id"], "screenshot"
+        )
+        if screenshot_asset:
+            screenshot_path = screenshot_asset.get("file_path")
+    except Exception as e:
+        logger.exception(
+            f"Error getting screenshot asset for business {business['id']}: {str(e)}"
+        )
+
+    attachments = await asyncio.to_thread(
+        build_email_attachments, business["id"], screenshot_path, mockup_path
+    )
+    return PreparedEmail(
+        business=business,
+        recipient_email=recipient_email,
+        original_email=original_email,
+        subject=subject,
+        html_content=html_content,
+        attachments=attachments,
+    )
+
+
+async def deliver_business_email(
+    prepared: PreparedEmail,
+    email_sender: SendGridEmailSender,
+    is_dry_run: bool = False,
+    session: Optional[aiohttp.ClientSession] = None,
+) -> bool:
+    """Send a rendered email and record the outcome.
+
+    Args:
+        prepared: Email returned by render_business_email.
+        email_sender: SendGrid email sender instance.
+        is_dry_run: If True, don't actually send emails.
+        session: Shared aiohttp session; when omitted the blocking
+            SendGridEmailSender.send_email is used.
+
+    Returns:
+        True if the email was sent (or simulated), False otherwise.
+    """
+    business = prepared.business
+    skip_sendgrid = os.getenv("SKIP_SENDGRID_API", "false").lower() == "true"
+
+    if is_dry_run:
+        logger.info(f"Dry run: would send email to {prepared.recipient_email}")
+        # Save email record even in dry run
+        await asyncio.to_thread(
+            save_email_record,
+            business_id=business["id"],
+            to_email=prepared.original_email,
+            to_name=prepared.to_name,
+            subject=prepared.subject,
+            message_id="dry-run-" + str(business["id"]),
+            status="sent",
+        )
+        return True
+    elif skip_sendgrid:
+        logger.info(
+            f"SKIP_SENDGRID_API enabled: simulating email send to {prepared.recipient_email}"
+        )
+        # Save email record for simulation
+        await asyncio.to_thread(
+            save_email_record,
+            business_id=business["id"],
+            to_email=prepared.original_email,
+            to_name=prepared.to_name,
+            subject=prepared.subject,
+            message_id="simulated-" + str(business["id"]),
+            status="sent",
+        )
+        return True
+
+    # Send the email
+    try:
+        send_kwargs = {
+            "to_email": prepared.recipient_email,
+            "to_name": prepared.to_name,
+            "subject": prepared.subject,
+            "html_content": prepared.html_content,  # Use processed HTML content
+            "attachments": prepared.attachments,
+        }
+        if session is not None:
+            message_id = await email_sender.send_email_async(session, **send_kwargs)
+        else:
+            message_id = email_sender.send_email(**send_kwargs)
+
+        if message_id:
+            logger.info(f"Email sent successfully with message ID: {message_id}")
+            # Save successful email record
+            await asyncio.to_thread(
+                save_email_record,
+                business_id=business["id"],
+                to_email=prepared.original_email,
+                to_name=prepared.to_name,
+                subject=prepared.subject,
+                message_id=message_id,
+                status="sent",
+            )
+            return True
+        else:
+            logger.error("Failed to send email: No message ID returned")
+            # Save failed email record
+            await asyncio.to_thread(
+                save_email_record,
+                business_id=business["id"],
+                to_email=prepared.original_email,
+                to_name=prepared.to_name,
+                subject=prepared.subject,
+                message_id=None,
+                status="failed",
+                error_message="No message ID returned",
+            )
+            return False
+
+    except Exception as e:
+        error_msg = f"Failed to send email: {str(e)}"
+        logger.error(error_msg)
+        # Save failed email record
+        await asyncio.to_thread(
+            save_email_record,
+            business_id=business["id"],
+            to_email=prepared.original_email,
+            to_name=prepared.to_name,
+            subject=prepared.subject,
+            message_id=None,
+            status="failed",
+            error_message=str(e),
+        )
+        return False
+
+
 async def send_business_email(
     business: dict,
     email_sender: SendGridEmailSender,
     template: str,
     is_dry_run: bool = False,
+    session: Optional[aiohttp.ClientSession] = None,
 ):
     """Send an email for a business.
 
@@ -944,209 +1312,218 @@ async def send_business_email(
         email_sender: SendGrid email sender instance.
         template: Email template content.
         is_dry_run: If True, don't actually send emails.
+        session: Optional shared aiohttp session to send on.
     """
     try:
-        # Check if SendGrid API should be skipped
-        skip_sendgrid = os.getenv("SKIP_SENDGRID_API", "false").lower() == "true"
-
-        # Get recipient email (with override if set)
-        recipient_email = business.get("email", "")
-        if not recipient_email:
-            logger.warning(f"No email address for business {business.get('id')}")
+        prepared = await render_business_email(business, template, is_dry_run)
+        if prepared is None:
             return False
+        return await deliver_business_email(
+            prepared, email_sender, is_dry_run, session=session
+        )
+    except Exception as e:
+        logger.exception(
+            f"Error sending email for business {business.get('id')}: {str(e)}"
+        )
+        return False
 
-        # Apply email override if set
-        email_override = os.getenv("EMAIL_OVERRIDE")
-        original_email = recipient_email
-        if email_override:
-            logger.info(
-                f"EMAIL_OVERRIDE active: Redirecting email from {original_email} to {email_override}"
-            )
-            recipient_email = email_override
 
-        # Check if email is unsubscribed
-        if is_email_unsubscribed(recipient_email):
-            logger.info(f"Email {recipient_email} is unsubscribed, skipping")
-            return False
+class AsyncTokenBucket:
+    """Token bucket rate limiter for coroutines on a single event loop."""
 
-        # Generate personalized email content from template
-        subject, html_content, text_content = await generate_email_content(
-            business, template
-        )
+    def __init__(self, rate: float, capacity: int):
+        """Initialize the bucket.
 
-        # Get mockup file path from assets table
-        mockup_path = None
-        try:
-            asset = storage.get_business_asset(business["id"], "mockup")
-            if asset:
-                mockup_path = asset.get("file_path")
-        except Exception as e:
-            logger.exception(
-                f"Error getting mockup asset for business {business['id']}: {str(e)}"
-            )
+        Args:
+            rate: Tokens added per second.
+            capacity: Maximum number of tokens (the allowed burst).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class EmailDispatcher:
+    """Render and send a batch of business emails concurrently.
+
+    Rendering (content generation and attachment encoding) runs ahead of
+    sending through a bounded queue, so the next emails are ready while
+    earlier ones are in flight. Sends share one aiohttp session, at most
+    ``max_concurrency`` are in flight at once, and each IP pool/subuser is
+    held to its own token bucket.
+    """
 
-        # Get screenshot (thumbnail) file path from assets table
-        screenshot_path = None
-        try:
-            screenshot_asset = storage.get_business_asset(business["id"], "screenshot")
-            if screenshot_asset:
-                screenshot_path = screenshot_asset.get("file_path")
-        except Exception as e:
-            logger.exception(
-                f"Error getting screenshot asset for business {business['id']}: {str(e)}"
-            )
+    def __init__(
+        self,
+        email_sender: SendGridEmailSender,
+        template: str,
+        is_dry_run: bool = False,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+        rate_per_second: float = EMAIL_SEND_RATE_PER_SECOND,
+        burst: int = EMAIL_SEND_BURST,
+    ):
+        """Initialize the dispatcher.
 
-        if is_dry_run:
-            logger.info(f"Dry run: would send email to {recipient_email}")
-            # Save email record even in dry run
-            save_email_record(
-                business_id=business["id"],
-                to_email=original_email,
-                to_name=business.get("name", "Unknown Business"),
-                subject=subject,
-                message_id="dry-run-" + str(business["id"]),
-                status="sent",
-            )
-            return True
-        elif skip_sendgrid:
-            logger.info(
-                f"SKIP_SENDGRID_API enabled: simulating email send to {recipient_email}"
-            )
-            # Save email record for simulation
-            save_email_record(
-                business_id=business["id"],
-                to_email=original_email,
-                to_name=business.get("name", "Unknown Business"),
-                subject=subject,
-                message_id="simulated-" + str(business["id"]),
-                status="sent",
-            )
-            return True
+        Args:
+            email_sender: SendGrid email sender instance.
+            template: Email template content.
+            is_dry_run: If True, don't actually send emails.
+            max_concurrency: Maximum renders and sends in flight at once.
+            rate_per_second: Sends per second for each IP pool/subuser.
+            burst: Sends allowed back to back before the rate applies.
+        """
+        self.email_sender = email_sender
+        self.template = template
+        self.is_dry_run = is_dry_run
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._buckets: dict[str, AsyncTokenBucket] = {}
+        self._sent = 0
+        self._failed = 0
+
+    def get_bucket(self, key: str) -> AsyncTokenBucket:
+        """Return the token bucket for an IP pool/subuser key."""
+        if key not in self._buckets:
+            self._buckets[key] = AsyncTokenBucket(self.rate_per_second, self.burst)
+        return self._buckets[key]
+
+    async def dispatch(self, businesses: Sequence[dict]) -> tuple[int, int]:
+        """Send emails for all businesses.
 
-        # Prepare attachments
-        attachments = []
+        Args:
+            businesses: Businesses to email.
 
-        # Add screenshot/thumbnail as inline attachment if available
-        if screenshot_path and os.path.exists(screenshot_path):
+        Returns:
+            tuple of (sent, failed) counts.
+        """
+        self._sent = self._failed = 0
+        pending: asyncio.Queue = asyncio.Queue()
+        for business in businesses:
+            pending.put_nowait(business)
+        rendered: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrency * 2)
+
+        timeout = aiohttp.ClientTimeout(total=DEFAULT_TIMEOUT)
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        async with aiohttp.ClientSession(
+            timeout=timeout, connector=connector
+        ) as session:
+            sender = asyncio.create_task(self._send_loop(rendered, session))
+            await asyncio.gather(
+                *(
+                    self._render_worker(pending, rendered)
+                    for _ in range(self.max_concurrency)
+                )
+            )
+            await rendered.put(None)
+            await sender
+
+        return self._sent, self._failed
+
+    async def _render_worker(
+        self, pending: asyncio.Queue, rendered: asyncio.Queue
+    ) -> None:
+        """Render queued businesses and hand them to the send loop."""
+        while not pending.empty():
+            business = pending.get_nowait()
+            logger.info(f"Processing business {business['id']}: {business['name']}")
             try:
-                # Read the screenshot file
-                with open(screenshot_path, "rb") as f:
-                    screenshot_data = f.read()
-                # Create embedded attachment with Content-ID
-                import base64
-
-                encoded_screenshot = base64.b64encode(screenshot_data).decode()
-                screenshot_attachment = {
-                    "content": encoded_screenshot,
-                    "filename": "website-thumbnail.png",
-                    "type": "image/png",
-                    "disposition": "inline",
-                    "content_id": "website-thumbnail.png",
-                }
-                attachments.append(screenshot_attachment)
-                logger.info(
-                    f"Embedded screenshot thumbnail for business {business['id']}"
+                prepared = await render_business_email(
+                    business, self.template, self.is_dry_run
                 )
             except Exception as e:
-                logger.warning(
-                    f"Failed to read screenshot file {screenshot_path}: {str(e)}"
+                logger.exception(
+                    f"Error sending email for business {business.get('id')}: {str(e)}"
                 )
-                # Screenshot is optional, so we continue
-
-        # Add mockup as inline attachment
-        if mockup_path and os.path.exists(mockup_path):
-            try:
-                # Read the mockup file
-                with open(mockup_path, "rb") as f:
-                    mockup_data = f.read()
-                # Create embedded attachment with Content-ID
-                encoded_content = base64.b64encode(mockup_data).decode()
-                attachment = {
-                    "content": encoded_content,
-                    "filename": "website-mockup.png",
-                    "type": "image/png",
-                    "disposition": "inline",
-                    "content_id": "website-mockup.png",
-                }
-                attachments.append(attachment)
-                logger.info(f"Embedded mockup image for business {business['id']}")
-            except Exception as e:
-                logger.error(f"Failed to read mockup file {mockup_path}: {str(e)}")
-                raise Exception(f"Cannot send email without real mockup: {e}")
-        else:
-            # No real mockup available - cannot send email
-            logger.error(f"No real mockup file found for business {business['id']}")
-            logger.error(
-                "Cannot send email without real mockup - failing email delivery"
-            )
-            raise Exception(
-                f"Email delivery requires real mockup, but none found for business {business['id']}"
-            )
+                prepared = None
 
-        # Send the email
+            if prepared is None:
+                self._record_result(business, False)
+            else:
+                await rendered.put(prepared)
+
+    async def _send_loop(
+        self, rendered: asyncio.Queue, session: aiohttp.ClientSession
+    ) -> None:
+        """Start a send for each rendered email, bounded by the semaphore."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        in_flight = set()
+        while True:
+            prepared = await rendered.get()
+            if prepared is None:
+                break
+            await semaphore.acquire()
+            task = asyncio.create_task(self._send_one(prepared, session, semaphore))
+            in_flight.add(task)
+            task.add_done_callback(in_flight.discard)
+        if in_flight:
+            await asyncio.gather(*in_flight)
+
+    async def _send_one(
+        self,
+        prepared: PreparedEmail,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
         try:
-            message_id = email_sender.send_email(
-                to_email=recipient_email,
-                to_name=business.get("name", "Unknown Business"),
-                subject=subject,
-                html_content=html_content,  # Use processed HTML content
-                attachments=attachments,
+            if not self.is_dry_run:
+                await self.get_bucket(self.email_sender.rate_limit_key).acquire()
+            success = await deliver_business_email(
+                prepared, self.email_sender, self.is_dry_run, session=session
             )
-
-            if message_id:
-                logger.info(f"Email sent successfully with message ID: {message_id}")
-                # Save successful email record
-                save_email_record(
-                    business_id=business["id"],
-                    to_email=original_email,
-                    to_name=business.get("name", "Unknown Business"),
-                    subject=subject,
-                    message_id=message_id,
-                    status="sent",
-                )
-                return True
-            else:
-                logger.error("Failed to send email: No message ID returned")
-                # Save failed email record
-                save_email_record(
-                    business_id=business["id"],
-                    to_email=original_email,
-                    to_name=business.get("name", "Unknown Business"),
-                    subject=subject,
-                    message_id=None,
-                    status="failed",
-                    error_message="No message ID returned",
-                )
-                return False
-
         except Exception as e:
-            error_msg = f"Failed to send email: {str(e)}"
-            logger.error(error_msg)
-            # Save failed email record
-            save_email_record(
-                business_id=business["id"],
-                to_email=original_email,
-                to_name=business.get("name", "Unknown Business"),
-                subject=subject,
-                message_id=None,
-                status="failed",
-                error_message=str(e),
+            logger.exception(
+                f"Error sending email for business {prepared.business.get('id')}: {str(e)}"
+            )
+            success = False
+        finally:
+            semaphore.release()
+        self._record_result(prepared.business, success)
+
+    def _record_result(self, business: dict, success: bool) -> None:
+        if success:
+            self._sent += 1
+            logger.info(
+                f"Email sent successfully to {business['name']} <{business['email']}>"
+            )
+        else:
+            self._failed += 1
+            logger.error(
+                f"Failed to send email to {business['name']} <{business.get('email')}>"
             )
-            return False
-
-    except Exception as e:
-        logger.exception(
-            f"Error sending email for business {business.get('id')}: {str(e)}"
-        )
-        return False
 
 
-async def process_business_email(business_id: int, dry_run: bool = None) -> bool:
+async def process_business_email(
+    business_id: int, dry_run: bool = None, force: bool = True
+) -> bool:
     """Process a single business for email sending.
 
     Args:
         business_id: The ID of the business to process
         dry_run: If True, don't actually send emails. If None, uses the global DRY_RUN setting.
+        force: If False, a business that already has an email recorded is not
+            emailed again.
 
     Returns:
         bool: True if successful, False otherwise.
@@ -1156,7 +1533,7 @@ async def process_business_email(business_id: int, dry_run: bool = None) -> bool
 
     try:
         # Get the business data
-        businesses = get_businesses_for_email(business_id=business_id, force=True)
+        businesses = get_businesses_for_email(business_id=business_id, force=force)
         if not businesses:
             logger.error(
                 f"Business ID {business_id} not found or not eligible for email"
@@ -1302,45 +1679,14 @@ def main() -> int:
             )
             return 1
 
-    # Process businesses
-    total_sent = 0
-    total_failed = 0
-
-    # Limit concurrent requests
+    # Render and send concurrently on a single event loop
     concurrent_limit = min(MAX_CONCURRENT_REQUESTS, len(businesses))
     logger.info(f"Processing up to {concurrent_limit} businesses concurrently")
 
-    # Process in batches for concurrency control
-    for i in range(0, len(businesses), concurrent_limit):
-        batch = businesses[i : i + concurrent_limit]
-        logger.info(f"Processing batch of {len(batch)} businesses")
-
-        for business in batch:
-            business_id = business["id"]
-            business_name = business["name"]
-            business_email = business["email"]
-
-            logger.info(f"Processing business {business_id}: {business_name}")
-
-            # Send the email
-            success = asyncio.run(
-                send_business_email(business, sender, template, DRY_RUN)
-            )
-
-            if success:
-                total_sent += 1
-                logger.info(
-                    f"Email sent successfully to {business_name} <{business_email}>"
-                )
-            else:
-                total_failed += 1
-                logger.error(
-                    f"Failed to send email to {business_name} <{business_email}>"
-                )
-
-            # Sleep to avoid hitting rate limits
-            if not DRY_RUN and i < len(businesses) - 1:
-                time.sleep(1)  # Sleep for 1 second between requests
+    dispatcher = EmailDispatcher(
+        sender, template, is_dry_run=DRY_RUN, max_concurrency=concurrent_limit
+    )
+    total_sent, total_failed = asyncio.run(dispatcher.dispatch(businesses))
 
     # Log the results
     logger.info(
@@ -6,9 +6,11 @@ This module provides functionality to generate mockups of business websites.
 
 import json
 import os
+import time
 from pathlib import Path
 from typing import Any, Optional
 
+from leadfactory.pipeline.asset_cache import file_sha256, get_asset_cache
 from leadfactory.storage import get_storage
 
 # Set up logging using unified logging system
@@ -33,7 +35,12 @@ def get_businesses_needing_mockups(limit: Optional[int] = None) -> list[dict]:
         return []
 
 
-def create_mockup_asset(business_id: int, mockup_path: str, mockup_url: str) -> bool:
+def create_mockup_asset(
+    business_id: int,
+    mockup_path: str,
+    mockup_url: str,
+    content_hash: Optional[str] = None,
+) -> bool:
     """Create a mockup asset record in the database."""
     try:
         storage = get_storage()
@@ -43,6 +50,7 @@ def create_mockup_asset(business_id: int, mockup_path: str, mockup_url: str) ->
             asset_type="mockup",
             file_path=mockup_path,
             url=mockup_url,
+            content_hash=content_hash,
         )
 
         if success:
@@ -71,6 +79,7 @@ def validate_mockup_dependencies(business_id: int) -> dict[str, Any]:
         "missing_dependencies": [],
         "business_data": None,
         "screenshot_path": None,
+        "screenshot_hash": None,
     }
 
     try:
@@ -89,6 +98,7 @@ def validate_mockup_dependencies(business_id: int) -> dict[str, Any]:
             missing_deps.append("screenshot_asset")
         else:
             validation_result["screenshot_path"] = screenshot_asset.get("file_path")
+            validation_result["screenshot_hash"] = screenshot_asset.get("content_hash")
 
         validation_result["missing_dependencies"] = missing_deps
         validation_result["valid"] = len(missing_deps) == 0
@@ -147,9 +157,42 @@ def generate_business_mockup(
         mockup_path = f"{mockup_dir}/{mockup_filename}"
         mockup_url = f"https://storage.example.com/mockups/{mockup_filename}"
 
+        screenshot_path = validation["screenshot_path"]
+
+        # A mockup depends only on its screenshot, so an identical screenshot
+        # reuses the mockup rendered from it before
+        asset_cache = get_asset_cache()
+        cache_key = None
+        screenshot_hash = validation.get("screenshot_hash")
+        if not screenshot_hash and screenshot_path and os.path.isfile(screenshot_path):
+            screenshot_hash = file_sha256(screenshot_path)
+        if screenshot_hash:
+            cache_key = asset_cache.mockup_key(screenshot_hash)
+            cached = asset_cache.lookup("mockup", cache_key)
+            if cached:
+                logger.info(
+                    f"Screenshot unchanged, reusing mockup "
+                    f"{cached.content_hash[:12]} for business {business_id}"
+                )
+                if create_mockup_asset(
+                    business_id, cached.file_path, mockup_url, cached.content_hash
+                ):
+                    return {
+                        "business_id": business_id,
+                        "mockup_url": mockup_url,
+                        "status": "generated",
+                        "cached": True,
+                        "content_hash": cached.content_hash,
+                    }
+                return {
+                    "business_id": business_id,
+                    "status": "failed",
+                    "error": "Failed to create mockup asset",
+                }
+
         # Generate mockup from screenshot
+        render_start = time.time()
         mockup_img = None
-        screenshot_path = validation["screenshot_path"]
 
         from PIL import Image, ImageDraw, ImageFont
 
@@ -169,8 +212,23 @@ def generate_business_mockup(
         mockup_img.save(mockup_path, "PNG")
         logger.info(f"Mockup saved to {mockup_path}")
 
+        content_hash = None
+        try:
+            stored = asset_cache.store(
+                "mockup",
+                mockup_path,
+                render_seconds=time.time() - render_start,
+                cache_key=cache_key,
+            )
+            mockup_path = stored.file_path
+            content_hash = stored.content_hash
+        except Exception as e:
+            logger.warning(f"Could not add mockup to asset cache: {e}")
+
         # Create the asset record
-        success = create_mockup_asset(business_id, mockup_path, mockup_url)
+        success = create_mockup_asset(
+            business_id, mockup_path, mockup_url, content_hash=content_hash
+        )
 
         if success:
             result = {
@@ -226,6 +284,7 @@ def generate_mockups_for_all_businesses(limit: Optional[int] = None) -> bool:
     logger.info(
         f"Mockup generation complete: {total_success}/{total_processed} successful"
     )
+    get_asset_cache().log_stats()
     return total_success > 0
 
 
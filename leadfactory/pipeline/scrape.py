@@ -5,10 +5,13 @@ This module provides functionality to scrape business data from various sources.
 """
 
 import argparse
+import functools
 import os
 import re
 import sys
+import threading
 import time
+from concurrent.futures import Executor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Optional, Tuple, Union
 
@@ -19,6 +22,7 @@ from leadfactory.config.json_retention_policy import (
     process_json_for_storage,
     should_store_json,
 )
+from leadfactory.pipeline.dedupe_blocking import generate_blocking_keys
 
 # Import storage abstraction
 from leadfactory.storage import get_storage_instance
@@ -38,6 +42,38 @@ from leadfactory.utils.metrics import (
     record_metric,
 )
 
+# HTTP connection pooling and place-detail concurrency
+SCRAPE_HTTP_POOL_SIZE = int(os.getenv("SCRAPE_HTTP_POOL_SIZE", "32"))
+SCRAPE_DETAIL_WORKERS = int(os.getenv("SCRAPE_DETAIL_WORKERS", "8"))
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """Return the process-wide pooled HTTP session used for API requests.
+
+    Reusing one session keeps TCP/TLS connections alive between calls to the
+    same API host instead of opening a new connection per request.
+    """
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=SCRAPE_HTTP_POOL_SIZE,
+                    pool_maxsize=SCRAPE_HTTP_POOL_SIZE,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _http_session = session
+    return _http_session
+
+
 # Import utility functions with conditional imports for testing
 has_io_imports = False
 try:
@@ -94,8 +130,8 @@ if not has_io_imports:
                 # Log the API request
                 logger.info(f"Making {method} request to {url}")
 
-                # Make the request
-                response = requests.request(
+                # Make the request over the shared keep-alive session
+                response = get_http_session().request(
                     method=method,
                     url=url,
                     headers=headers,
@@ -202,12 +238,21 @@ VERTICALS_CONFIG_PATH = str(
 class YelpAPI:
     """Yelp Fusion API client."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        rate_limiter: Optional[Any] = None,
+        base_url: str = YELP_API_BASE_URL,
+    ):
         """Initialize Yelp API client.
         Args:
             api_key: Yelp Fusion API key.
+            rate_limiter: Optional limiter whose acquire() is called before each request.
+            base_url: Yelp Fusion API base URL.
         """
         self.api_key = api_key
+        self.rate_limiter = rate_limiter
+        self.base_url = base_url
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Accept": "application/json",
@@ -233,7 +278,7 @@ class YelpAPI:
             If successful, error_message is None.
             If failed, businesses_list is an empty list.
         """
-        url = f"{YELP_API_BASE_URL}/businesses/search"
+        url = f"{self.base_url}/businesses/search"
         params = {
             "term": term,
             "location": location,
@@ -241,6 +286,8 @@ class YelpAPI:
             "limit": limit,
             "sort_by": sort_by,
         }
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
         response_data, error = make_api_request(
             url=url,
             headers=self.headers,
@@ -265,7 +312,9 @@ class YelpAPI:
             If successful, error_message is None.
             If failed, business_details is None.
         """
-        url = f"{YELP_API_BASE_URL}/businesses/{business_id}"
+        url = f"{self.base_url}/businesses/{business_id}"
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
         response_data, error = make_api_request(
             url=url,
             headers=self.headers,
@@ -282,12 +331,21 @@ class YelpAPI:
 class GooglePlacesAPI:
     """Google Places API client."""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        rate_limiter: Optional[Any] = None,
+        base_url: str = GOOGLE_PLACES_API_BASE_URL,
+    ):
         """Initialize Google Places API client.
         Args:
             api_key: Google Places API key.
+            rate_limiter: Optional limiter whose acquire() is called before each request.
+            base_url: Google Places API base URL.
         """
         self.api_key = api_key
+        self.rate_limiter = rate_limiter
+        self.base_url = base_url
 
     def search_places(
         self,
@@ -307,7 +365,7 @@ class GooglePlacesAPI:
             If successful, error_message is None.
             If failed, places_list is an empty list.
         """
-        url = f"{GOOGLE_PLACES_API_BASE_URL}/textsearch/json"
+        url = f"{self.base_url}/textsearch/json"
         params = {
             "query": query,
             "location": location,
@@ -315,6 +373,8 @@ class GooglePlacesAPI:
             "type": type_filter,
             "key": self.api_key,
         }
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
         response_data, error = make_api_request(
             url=url,
             params=params,
@@ -341,12 +401,14 @@ class GooglePlacesAPI:
             If successful, error_message is None.
             If failed, place_details is None.
         """
-        url = f"{GOOGLE_PLACES_API_BASE_URL}/details/json"
+        url = f"{self.base_url}/details/json"
         params = {
             "place_id": place_id,
             "fields": fields,
             "key": self.api_key,
         }
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
         response_data, error = make_api_request(
             url=url,
             params=params,
@@ -739,6 +801,9 @@ def save_business(
                     yelp_response_json,
                     google_response_json,
                 )
+                _index_business_for_dedupe(
+                    storage, existing_business_id, {**new_data, "zip": zip_code}
+                )
                 logger.info(
                     f"Found existing business {existing_business_id} by website: {website} (merged source: {source})"
                 )
@@ -778,6 +843,9 @@ def save_business(
                     yelp_response_json,
                     google_response_json,
                 )
+                _index_business_for_dedupe(
+                    storage, existing_business_id, {**new_data, "zip": zip_code}
+                )
                 logger.info(
                     f"Found existing business {existing_business_id} by phone: {phone} (merged source: {source})"
                 )
@@ -817,6 +885,9 @@ def save_business(
                     yelp_response_json,
                     google_response_json,
                 )
+                _index_business_for_dedupe(
+                    storage, existing_business_id, {**new_data, "zip": zip_code}
+                )
                 logger.info(
                     f"Found existing business {existing_business_id} by name+ZIP: {name} in {zip_code} (merged source: {source})"
                 )
@@ -842,6 +913,19 @@ def save_business(
             logger.info(
                 f"Created new business {business_id}: {name} in {zip_code} (source: {source}, source_id: {source_id})"
             )
+            _index_business_for_dedupe(
+                storage,
+                business_id,
+                {
+                    "name": name,
+                    "phone": phone,
+                    "email": email,
+                    "website": website,
+                    "city": city,
+                    "state": state,
+                    "zip": zip_code,
+                },
+            )
             return business_id
         else:
             logger.error(f"Failed to create business: {name} in {zip_code}")
@@ -852,6 +936,248 @@ def save_business(
         return None
 
 
+def save_businesses(records: list[dict[str, Any]]) -> list[Optional[int]]:
+    """Save a page of scraped businesses with set-based deduplication.
+
+    Applies the same matching order as save_business (source_id, then
+    website, phone and name+ZIP) and the same conflict resolution, but looks
+    up every record's matches with one query per key type and writes all new
+    and changed businesses in a single transaction. A record that matches an
+    earlier record in the same page is merged into it, just as it would be if
+    the records were saved one at a time.
+
+    Args:
+        records: save_business keyword arguments, one dict per business
+
+    Returns:
+        Business ID for each record in input order (None where saving failed)
+    """
+    if not records:
+        return []
+
+    try:
+        storage = get_storage_instance()
+        if not hasattr(storage, "bulk_upsert_businesses"):
+            return [save_business(**record) for record in records]
+
+        records = [
+            {
+                "city": "",
+                "state": "",
+                "website": None,
+                "email": None,
+                "phone": None,
+                "source": "manual",
+                "source_id": None,
+                "yelp_response_json": None,
+                "google_response_json": None,
+                **record,
+            }
+            for record in records
+        ]
+
+        def key(value: Optional[str]) -> Optional[str]:
+            return value.strip() if value and value.strip() else None
+
+        def name_zip_key(name: Optional[str], zip_code: Optional[str]):
+            if not name or not zip_code:
+                return None
+            return name.strip().lower(), zip_code.strip()
+
+        existing = storage.get_businesses_by_match_keys(
+            sorted({key(r["source_id"]) for r in records} - {None}),
+            sorted({key(r["website"]) for r in records} - {None}),
+            sorted({key(r["phone"]) for r in records} - {None}),
+            sorted({name_zip_key(r["name"], r["zip_code"]) for r in records} - {None}),
+        )
+
+        get_vertical_id = functools.lru_cache(maxsize=None)(storage.get_vertical_id)
+        get_vertical_name = functools.lru_cache(maxsize=None)(storage.get_vertical_name)
+
+        by_source_id: dict[tuple[str, str], dict] = {}
+        by_website: dict[str, dict] = {}
+        by_phone: dict[str, dict] = {}
+        by_name_zip: dict[tuple[str, str], dict] = {}
+
+        def index(business: dict) -> None:
+            if business.get("source_id"):
+                by_source_id.setdefault(
+                    (business["source_id"], business["source"]), business
+                )
+            if business.get("website"):
+                by_website.setdefault(business["website"], business)
+            if business.get("phone"):
+                by_phone.setdefault(business["phone"], business)
+            if business.get("name") and business.get("zip"):
+                by_name_zip.setdefault(
+                    (business["name"].lower(), business["zip"]), business
+                )
+
+        for row in existing:
+            index(
+                {
+                    **row,
+                    "yelp_response_json": None,
+                    "google_response_json": None,
+                    "changed": False,
+                }
+            )
+
+        new_businesses = []
+        updated_businesses = []
+        block_key_data = []
+        matched = []
+
+        for record in records:
+            source = record["source"]
+            source_id = key(record["source_id"])
+
+            # 1. Exact match from the same source is left untouched
+            if source_id and (source_id, source) in by_source_id:
+                matched.append(by_source_id[(source_id, source)])
+                continue
+
+            # 2-4. Website, phone, then name + ZIP
+            business = None
+            if key(record["website"]):
+                business = by_website.get(key(record["website"]))
+            if business is None and key(record["phone"]):
+                business = by_phone.get(key(record["phone"]))
+            if business is None:
+                name_zip = name_zip_key(record["name"], record["zip_code"])
+                if name_zip:
+                    business = by_name_zip.get(name_zip)
+
+            new_data = {
+                "name": record["name"],
+                "address": record["address"],
+                "city": record["city"],
+                "state": record["state"],
+                "phone": record["phone"],
+                "email": record["email"],
+                "website": record["website"],
+                "vertical": record["category"],
+                "yelp_response_json": record["yelp_response_json"],
+                "google_response_json": record["google_response_json"],
+            }
+
+            if business is None:
+                business = {
+                    "id": None,
+                    "name": record["name"],
+                    "address": record["address"],
+                    "city": record["city"],
+                    "state": record["state"],
+                    "zip": record["zip_code"],
+                    "phone": record["phone"],
+                    "email": record["email"],
+                    "website": record["website"],
+                    "vertical_id": (
+                        get_vertical_id(record["category"].lower())
+                        if record["category"]
+                        else None
+                    ),
+                    "source": source,
+                    "source_id": record["source_id"],
+                    "yelp_response_json": record["yelp_response_json"],
+                    "google_response_json": record["google_response_json"],
+                }
+                new_businesses.append(business)
+            else:
+                updates = _resolve_business_updates(
+                    business,
+                    new_data,
+                    source,
+                    business["source"],
+                    get_vertical_id,
+                    get_vertical_name,
+                )
+                for field in ("yelp_response_json", "google_response_json"):
+                    if new_data[field]:
+                        updates[field] = new_data[field]
+                combined_source = _combine_sources(business["source"], source)
+                if combined_source:
+                    updates["source"] = combined_source
+
+                if updates:
+                    business.update(updates)
+                    if business["id"] is not None and not business["changed"]:
+                        business["changed"] = True
+                        updated_businesses.append(business)
+
+            index(business)
+            matched.append(business)
+            block_key_data.append((business, {**new_data, "zip": record["zip_code"]}))
+
+        new_ids = storage.bulk_upsert_businesses(new_businesses, updated_businesses)
+        if new_ids is None or len(new_ids) != len(new_businesses):
+            logger.error(f"Failed to save page of {len(records)} businesses")
+            return [None] * len(records)
+
+        for business, business_id in zip(new_businesses, new_ids):
+            business["id"] = business_id
+
+        _index_businesses_for_dedupe(
+            storage, [(business["id"], data) for business, data in block_key_data]
+        )
+
+        logger.info(
+            f"Saved page of {len(records)} businesses: {len(new_businesses)} created, "
+            f"{len(updated_businesses)} updated"
+        )
+        return [business["id"] for business in matched]
+
+    except Exception as e:
+        logger.error(f"Error saving page of {len(records)} businesses: {str(e)}")
+        return [None] * len(records)
+
+
+def _index_business_for_dedupe(
+    storage, business_id: int, business_data: dict[str, Any]
+) -> None:
+    """Record dedupe blocking keys for a saved business.
+
+    Failures are logged and never fail the save; the keys can be backfilled
+    later with dedupe_blocking.rebuild_block_index().
+    """
+    try:
+        keys = generate_blocking_keys(business_data)
+        if keys:
+            storage.save_business_block_keys(business_id, keys)
+    except Exception as e:
+        logger.warning(f"Failed to index business {business_id} for dedupe: {e}")
+
+
+def _index_businesses_for_dedupe(
+    storage, businesses: list[tuple[int, dict[str, Any]]]
+) -> None:
+    """Record dedupe blocking keys for a page of saved businesses at once."""
+    try:
+        block_keys: dict[int, set[str]] = {}
+        for business_id, business_data in businesses:
+            block_keys.setdefault(business_id, set()).update(
+                generate_blocking_keys(business_data)
+            )
+        if any(block_keys.values()):
+            storage.save_block_keys_many(block_keys)
+    except Exception as e:
+        logger.warning(f"Failed to index {len(businesses)} businesses for dedupe: {e}")
+
+
+def _combine_sources(existing_source: str, new_source: str) -> Optional[str]:
+    """Return the combined source string (e.g. "google,yelp") after a merge.
+
+    Returns None when the existing sources already include the new one.
+    """
+    if existing_source == new_source:
+        return None
+    sources = existing_source.split(",") if existing_source else []
+    if new_source in sources:
+        return None
+    sources.append(new_source)
+    return ",".join(sorted(sources))
+
+
 def _update_business_source(
     storage,
     business_id: int,
@@ -877,49 +1203,44 @@ def _update_business_source(
     import json
 
     # If sources are different, combine them
-    if existing_source != new_source:
-        # Create combined source string (e.g., "yelp,google")
-        sources = existing_source.split(",") if existing_source else []
-        if new_source not in sources:
-            sources.append(new_source)
-            combined_source = ",".join(sorted(sources))
-
-            # Prepare JSON update fields
-            json_updates = []
-            json_params = []
-
-            if yelp_response_json and new_source == "yelp":
-                json_updates.append("yelp_response_json = %s")
-                json_params.append(json.dumps(yelp_response_json))
-
-            if google_response_json and new_source == "google":
-                json_updates.append("google_response_json = %s")
-                json_params.append(json.dumps(google_response_json))
-
-            # Build the update query
-            update_query = (
-                "UPDATE businesses SET source = %s, updated_at = CURRENT_TIMESTAMP"
-            )
-            params = [combined_source]
+    combined_source = _combine_sources(existing_source, new_source)
+    if combined_source:
+        # Prepare JSON update fields
+        json_updates = []
+        json_params = []
+
+        if yelp_response_json and new_source == "yelp":
+            json_updates.append("yelp_response_json = %s")
+            json_params.append(json.dumps(yelp_response_json))
+
+        if google_response_json and new_source == "google":
+            json_updates.append("google_response_json = %s")
+            json_params.append(json.dumps(google_response_json))
+
+        # Build the update query
+        update_query = (
+            "UPDATE businesses SET source = %s, updated_at = CURRENT_TIMESTAMP"
+        )
+        params = [combined_source]
 
-            if json_updates:
-                update_query += ", " + ", ".join(json_updates)
-                params.extend(json_params)
+        if json_updates:
+            update_query += ", " + ", ".join(json_updates)
+            params.extend(json_params)
 
-            if business_data:
-                for field, value in business_data.items():
-                    update_query += f", {field} = %s"
-                    params.append(value)
+        if business_data:
+            for field, value in business_data.items():
+                update_query += f", {field} = %s"
+                params.append(value)
 
-            update_query += " WHERE id = %s"
-            params.append(business_id)
+        update_query += " WHERE id = %s"
+        params.append(business_id)
 
-            # Update the business record with combined source and JSON data
-            storage.update_business(business_id, update_query, params)
+        # Update the business record with combined source and JSON data
+        storage.update_business(business_id, update_query, params)
 
-            logger.info(
-                f"Updated business {business_id} source from '{existing_source}' to '{combined_source}'"
-            )
+        logger.info(
+            f"Updated business {business_id} source from '{existing_source}' to '{combined_source}'"
+        )
 
 
 def _update_business_with_conflict_resolution(
@@ -939,6 +1260,84 @@ def _update_business_with_conflict_resolution(
     if not existing_business:
         return
 
+    updates = _resolve_business_updates(
+        existing_business,
+        new_data,
+        source,
+        existing_source,
+        storage.get_vertical_id,
+        storage.get_vertical_name,
+    )
+
+    # Apply updates if any
+    if updates:
+        set_clauses = []
+        values = []
+
+        for field, value in updates.items():
+            set_clauses.append(f"{field} = %s")
+            values.append(value)
+
+        # Add updated_at
+        set_clauses.append("updated_at = CURRENT_TIMESTAMP")
+        values.append(business_id)
+
+        update_query = f"""
+            UPDATE businesses
+            SET {", ".join(set_clauses)}
+            WHERE id = %s
+        """  # nosec B608
+
+        storage.update_business(business_id, update_query, values)
+        logger.info(
+            f"Business {business_id}: Applied conflict resolution updates from {source}"
+        )
+
+    # Always update JSON responses (these don't conflict, they accumulate)
+    json_updates = []
+    json_values = []
+
+    if new_data.get("yelp_response_json"):
+        json_updates.append("yelp_response_json = %s")
+        json_values.append(json.dumps(new_data["yelp_response_json"]))
+
+    if new_data.get("google_response_json"):
+        json_updates.append("google_response_json = %s")
+        json_values.append(json.dumps(new_data["google_response_json"]))
+
+    if json_updates:
+        json_values.append(business_id)
+        json_query = f"""
+            UPDATE businesses
+            SET {", ".join(json_updates)}, updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s
+        """  # nosec B608
+        storage.update_business(business_id, json_query, json_values)
+        logger.info(f"Business {business_id}: Updated JSON responses from {source}")
+
+
+def _resolve_business_updates(
+    existing_business: dict[str, Any],
+    new_data: dict,
+    source: str,
+    existing_source: str,
+    get_vertical_id,
+    get_vertical_name,
+) -> dict[str, Any]:
+    """Work out which fields of an existing business the new data should change.
+
+    Args:
+        existing_business: Current business record
+        new_data: Dictionary with new data fields
+        source: Source of new data (yelp, google, manual)
+        existing_source: Existing source(s) of the business
+        get_vertical_id: Callable mapping a vertical name to its ID
+        get_vertical_name: Callable mapping a vertical ID to its name
+
+    Returns:
+        Dictionary of column names and resolved values that differ from the
+        current record
+    """
     (
         current_name,
         current_address,
@@ -1001,10 +1400,10 @@ def _update_business_with_conflict_resolution(
     # Vertical conflict resolution (convert category to vertical_id)
     if new_data.get("vertical"):
         # Get vertical_id for the new category
-        vertical_id = storage.get_vertical_id(new_data["vertical"])
+        vertical_id = get_vertical_id(new_data["vertical"])
         if vertical_id and vertical_id != current_vertical_id:
             # Get current vertical name for comparison
-            current_vertical_name = storage.get_vertical_name(current_vertical_id)
+            current_vertical_name = get_vertical_name(current_vertical_id)
 
             resolved_vertical = _resolve_field_conflict(
                 current_vertical_name, new_data["vertical"], source, existing_source
@@ -1014,51 +1413,7 @@ def _update_business_with_conflict_resolution(
             if resolved_vertical != current_vertical_name:
                 updates["vertical_id"] = vertical_id
 
-    # Apply updates if any
-    if updates:
-        set_clauses = []
-        values = []
-
-        for field, value in updates.items():
-            set_clauses.append(f"{field} = %s")
-            values.append(value)
-
-        # Add updated_at
-        set_clauses.append("updated_at = CURRENT_TIMESTAMP")
-        values.append(business_id)
-
-        update_query = f"""
-            UPDATE businesses
-            SET {", ".join(set_clauses)}
-            WHERE id = %s
-        """  # nosec B608
-
-        storage.update_business(business_id, update_query, values)
-        logger.info(
-            f"Business {business_id}: Applied conflict resolution updates from {source}"
-        )
-
-    # Always update JSON responses (these don't conflict, they accumulate)
-    json_updates = []
-    json_values = []
-
-    if new_data.get("yelp_response_json"):
-        json_updates.append("yelp_response_json = %s")
-        json_values.append(json.dumps(new_data["yelp_response_json"]))
-
-    if new_data.get("google_response_json"):
-        json_updates.append("google_response_json = %s")
-        json_values.append(json.dumps(new_data["google_response_json"]))
-
-    if json_updates:
-        json_values.append(business_id)
-        json_query = f"""
-            UPDATE businesses
-            SET {", ".join(json_updates)}, updated_at = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """  # nosec B608
-        storage.update_business(business_id, json_query, json_values)
-        logger.info(f"Business {business_id}: Updated JSON responses from {source}")
+    return updates
 
 
 def _resolve_field_conflict(
@@ -1135,14 +1490,81 @@ def validate_api_keys() -> tuple[bool, str]:
     return True, ""
 
 
+def _place_postal_code(place_details: dict) -> Optional[str]:
+    """Return the postal code from a place's address components."""
+    for component in place_details.get("address_components", []):
+        if "postal_code" in component.get("types", []):
+            return component.get("short_name", "")
+    return None
+
+
+def filter_places_by_zip(
+    google_api: GooglePlacesAPI,
+    places: list[dict],
+    zip_code: str,
+    executor: Optional[Executor] = None,
+) -> list[tuple[dict, dict]]:
+    """Fetch place details and keep the places located in a ZIP code.
+    Detail lookups run concurrently on ``executor`` (or a temporary pool of
+    SCRAPE_DETAIL_WORKERS threads) and the fetched details are returned with
+    each place so they do not have to be requested again when saving.
+    Args:
+        google_api: GooglePlacesAPI instance for fetching details.
+        places: Places from a Google text search.
+        zip_code: ZIP code the places must be in.
+        executor: Optional executor to run detail lookups on.
+    Returns:
+        list of (place, place_details) tuples in search order.
+    """
+
+    def fetch(place: dict) -> tuple[Optional[dict], Optional[str]]:
+        return google_api.get_place_details(place.get("place_id", ""))
+
+    if executor is not None:
+        detail_results = list(executor.map(fetch, places))
+    elif len(places) > 1 and SCRAPE_DETAIL_WORKERS > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(SCRAPE_DETAIL_WORKERS, len(places)),
+            thread_name_prefix="place-details",
+        ) as pool:
+            detail_results = list(pool.map(fetch, places))
+    else:
+        detail_results = [fetch(place) for place in places]
+
+    matched = []
+    for place, (place_details, detail_error) in zip(places, detail_results):
+        if detail_error or place_details is None:
+            logger.debug(
+                f"Could not get details for place {place.get('name', 'Unknown')}: {detail_error}"
+            )
+            continue
+
+        place_zip = _place_postal_code(place_details)
+        if place_zip == zip_code:
+            matched.append((place, place_details))
+        else:
+            logger.debug(
+                f"Filtered out {place.get('name', 'Unknown')} - ZIP {place_zip} != {zip_code}"
+            )
+    return matched
+
+
 def scrape_businesses(
-    zip_code: str, vertical: dict, limit: int = 50
+    zip_code: str,
+    vertical: dict,
+    limit: int = 50,
+    yelp_api: Optional[YelpAPI] = None,
+    google_api: Optional[GooglePlacesAPI] = None,
+    detail_executor: Optional[Executor] = None,
 ) -> tuple[int, int]:
     """Scrape businesses for a specific ZIP code and vertical.
     Args:
         zip_code: ZIP code to scrape.
         vertical: Vertical information.
         limit: Maximum number of businesses to fetch per API.
+        yelp_api: Shared YelpAPI client (created from YELP_KEY if omitted).
+        google_api: Shared GooglePlacesAPI client (created from GOOGLE_KEY if omitted).
+        detail_executor: Optional executor for concurrent place-detail lookups.
     Returns:
         tuple of (yelp_count, google_count) - number of businesses scraped from each source.
     """
@@ -1178,9 +1600,11 @@ def scrape_businesses(
     if not google_api_key:
         logger.warning("No Google API key found in environment variables")
 
-    # Create API clients
-    yelp_api = YelpAPI(yelp_api_key) if yelp_api_key else None
-    google_api = GooglePlacesAPI(google_api_key) if google_api_key else None
+    # Create API clients unless shared ones were supplied
+    if yelp_api is None and yelp_api_key:
+        yelp_api = YelpAPI(yelp_api_key)
+    if google_api is None and google_api_key:
+        google_api = GooglePlacesAPI(google_api_key)
 
     # Get coordinates for the ZIP code (needed for Google Places API)
     coordinates = get_zip_coordinates(zip_code)
@@ -1218,11 +1642,13 @@ def scrape_businesses(
                 f"After ZIP filtering: {len(filtered_businesses)} businesses match exact ZIP {zip_code}"
             )
 
-            for business in filtered_businesses:
-                # Process and save business
-                business_id = process_yelp_business(business, vertical_name)
-                if business_id:
-                    yelp_count += 1
+            # Save the whole page in a few round trips
+            yelp_count += save_scraped_page(
+                [
+                    _build_record(_yelp_business_record, business, vertical_name)
+                    for business in filtered_businesses
+                ]
+            )
 
     # Search Google Places using the google_alias
     if google_api and coordinates and google_alias:
@@ -1243,42 +1669,27 @@ def scrape_businesses(
                     f"Found {len(places)} places on Google (before ZIP filtering)"
                 )
                 # Filter to only places that are actually in the target ZIP code
-                filtered_places = []
-                for place in places:
-                    # Get detailed place info to check ZIP code
-                    place_details, detail_error = google_api.get_place_details(
-                        place.get("place_id", "")
-                    )
-                    if detail_error:
-                        logger.debug(
-                            f"Could not get details for place {place.get('name', 'Unknown')}: {detail_error}"
-                        )
-                        continue
-
-                    # Check if the place's ZIP code matches
-                    place_zip = None
-                    address_components = place_details.get("address_components", [])
-                    for component in address_components:
-                        if "postal_code" in component.get("types", []):
-                            place_zip = component.get("short_name", "")
-                            break
-
-                    if place_zip == zip_code:
-                        filtered_places.append(place)
-                    else:
-                        logger.debug(
-                            f"Filtered out {place.get('name', 'Unknown')} - ZIP {place_zip} != {zip_code}"
-                        )
+                filtered_places = filter_places_by_zip(
+                    google_api, places, zip_code, executor=detail_executor
+                )
 
                 logger.info(
                     f"After ZIP filtering: {len(filtered_places)} places match exact ZIP {zip_code}"
                 )
 
-                for place in filtered_places:
-                    # Process and save place
-                    business_id = process_google_place(place, vertical_name, google_api)
-                    if business_id:
-                        google_count += 1
+                # Save the whole page, reusing the details fetched above
+                google_count += save_scraped_page(
+                    [
+                        _build_record(
+                            _google_place_record,
+                            place,
+                            vertical_name,
+                            google_api,
+                            details=place_details,
+                        )
+                        for place, place_details in filtered_places
+                    ]
+                )
 
     # Log the results
     logger.info(
@@ -1292,68 +1703,163 @@ def scrape_businesses(
     return yelp_count, google_count
 
 
-def process_yelp_business(business: dict, category: str) -> Optional[int]:
-    """Process and save a business from Yelp.
+def _yelp_business_record(business: dict, category: str) -> Optional[dict[str, Any]]:
+    """Build save_business arguments from a Yelp business.
     Args:
         business: Business data from Yelp API.
         category: Business category/vertical.
     Returns:
-        ID of the saved business, or None if saving failed.
+        Keyword arguments for save_business, or None if the business lacks a
+        name or ZIP code.
     """
-    try:
-        # Extract business data
-        name = business.get("name")
-        if not name:
-            return None
+    # Extract business data
+    name = business.get("name")
+    if not name:
+        return None
 
-        # Get address components
-        location = business.get("location", {})
-        address_parts = location.get("display_address", [])
-        address = ", ".join(address_parts) if address_parts else ""
-        zip_code = location.get("zip_code", "")
-        if not zip_code:
+    # Get address components
+    location = business.get("location", {})
+    address_parts = location.get("display_address", [])
+    address = ", ".join(address_parts) if address_parts else ""
+    zip_code = location.get("zip_code", "")
+    if not zip_code:
+        return None
+
+    # Parse city and state from address
+    city, state = parse_city_state_from_address(address)
+
+    # Process JSON response according to retention policy
+    processed_yelp_json = (
+        process_json_for_storage(business) if should_store_json() else None
+    )
+
+    return {
+        "name": name,
+        "address": address,
+        "zip_code": zip_code,
+        "category": category,
+        "city": city,
+        "state": state,
+        "phone": business.get("display_phone", ""),
+        "website": business.get("url", ""),
+        "source": "yelp",
+        "source_id": business.get("id", ""),
+        "yelp_response_json": processed_yelp_json,
+    }
+
+
+def _google_place_record(
+    place: dict,
+    category: str,
+    google_api: GooglePlacesAPI,
+    details: Optional[dict] = None,
+) -> Optional[dict[str, Any]]:
+    """Build save_business arguments from a Google place.
+    Args:
+        place: Place data from Google Places API.
+        category: Business category/vertical.
+        google_api: GooglePlacesAPI instance for fetching details.
+        details: Place details already fetched for this place, if any.
+    Returns:
+        Keyword arguments for save_business, or None if the place lacks a
+        name, ZIP code or details.
+    """
+    # Extract place data
+    name = place.get("name")
+    if not name:
+        return None
+
+    # Get address components
+    address = place.get("formatted_address", "")
+    zip_code = ""
+
+    # Extract ZIP code from address components
+    address_components = place.get("address_components") or (details or {}).get(
+        "address_components", []
+    )
+    if address_components:
+        for component in address_components:
+            if "postal_code" in component.get("types", []):
+                zip_code = component.get("long_name", "")
+                break
+
+    # If we couldn't find a ZIP code, try to extract it from the formatted address
+    if not zip_code and address:
+        # Look for 5-digit number that might be a ZIP code
+        zip_match = re.search(r"\b(\d{5})\b", address)
+        if zip_match:
+            zip_code = zip_match.group(1)
+
+    if not zip_code:
+        return None
+
+    # Get place ID for details lookup
+    place_id = place.get("place_id")
+    if not place_id:
+        return None
+
+    # Get detailed information unless the caller already fetched it
+    if details is None:
+        details, error = google_api.get_place_details(place_id)
+        if error or not details:
             return None
 
-        # Parse city and state from address
-        city, state = parse_city_state_from_address(address)
+    # Parse city and state from address
+    city, state = parse_city_state_from_address(address)
+
+    # Process JSON response according to retention policy
+    processed_google_json = (
+        process_json_for_storage(place) if should_store_json() else None
+    )
 
-        # Get other business details
-        phone = business.get("display_phone", "")
-        website = business.get("url", "")
-        yelp_id = business.get("id", "")
+    return {
+        "name": name,
+        "address": address,
+        "zip_code": zip_code,
+        "category": category,
+        "city": city,
+        "state": state,
+        "phone": details.get("formatted_phone_number", ""),
+        "website": details.get("website", ""),
+        "source": "google",
+        "source_id": place_id,
+        "google_response_json": processed_google_json,
+    }
 
-        # Process JSON response according to retention policy
-        processed_yelp_json = (
-            process_json_for_storage(business) if should_store_json() else None
+
+def _save_website_email(business_id: int, website: str) -> None:
+    """Extract an email from a business website and store it on the business."""
+    email = extract_email_from_website(website, business_id)
+    if email:
+        # Update business with email
+        storage = get_storage_instance()
+        storage.update_business(
+            business_id,
+            "UPDATE businesses SET email = %s WHERE id = %s",
+            [email, business_id],
         )
+        logger.info(f"Updated business {business_id} with email: {email}")
+
+
+def process_yelp_business(business: dict, category: str) -> Optional[int]:
+    """Process and save a business from Yelp.
+    Args:
+        business: Business data from Yelp API.
+        category: Business category/vertical.
+    Returns:
+        ID of the saved business, or None if saving failed.
+    """
+    try:
+        record = _yelp_business_record(business, category)
+        if not record:
+            return None
 
         # Save to database
-        business_id = save_business(
-            name=name,
-            address=address,
-            zip_code=zip_code,
-            category=category,
-            city=city,
-            state=state,
-            phone=phone,
-            website=website,
-            source="yelp",
-            source_id=yelp_id,
-            yelp_response_json=processed_yelp_json,
-        )
+        business_id = save_business(**record)
 
         # Try to extract email from website if provided
-        if business_id and website:
-            email = extract_email_from_website(website, business_id)
-            if email:
-                # Update business with email
-                storage = get_storage_instance()
-                storage.update_business(
-                    business_id,
-                    "UPDATE businesses SET email = %s WHERE id = %s",
-                    [email, business_id],
-                )
-                logger.info(f"Updated business {business_id} with email: {email}")
+        if business_id and record["website"]:
+            _save_website_email(business_id, record["website"])
 
         return business_id
     except Exception as e:
@@ -1362,92 +1868,31 @@ def process_yelp_business(business: dict, category: str) -> Optional[int]:
 
 
 def process_google_place(
-    place: dict, category: str, google_api: GooglePlacesAPI
+    place: dict,
+    category: str,
+    google_api: GooglePlacesAPI,
+    details: Optional[dict] = None,
 ) -> Optional[int]:
     """Process and save a place from Google.
     Args:
         place: Place data from Google Places API.
         category: Business category/vertical.
         google_api: GooglePlacesAPI instance for fetching details.
+        details: Place details already fetched for this place, if any.
     Returns:
         ID of the saved business, or None if saving failed.
     """
     try:
-        # Extract place data
-        name = place.get("name")
-        if not name:
+        record = _google_place_record(place, category, google_api, details=details)
+        if not record:
             return None
 
-        # Get address components
-        address = place.get("formatted_address", "")
-        zip_code = ""
-
-        # Extract ZIP code from address components
-        if "address_components" in place:
-            for component in place["address_components"]:
-                if "postal_code" in component.get("types", []):
-                    zip_code = component.get("long_name", "")
-                    break
-
-        # If we couldn't find a ZIP code, try to extract it from the formatted address
-        if not zip_code and address:
-            # Look for 5-digit number that might be a ZIP code
-            zip_match = re.search(r"\b(\d{5})\b", address)
-            if zip_match:
-                zip_code = zip_match.group(1)
-
-        if not zip_code:
-            return None
-
-        # Get place ID for details lookup
-        place_id = place.get("place_id")
-        if not place_id:
-            return None
-
-        # Get detailed information
-        details, error = google_api.get_place_details(place_id)
-        if error or not details:
-            return None
-
-        # Parse city and state from address
-        city, state = parse_city_state_from_address(address)
-
-        # Get other business details
-        phone = details.get("formatted_phone_number", "")
-        website = details.get("website", "")
-
-        # Process JSON response according to retention policy
-        processed_google_json = (
-            process_json_for_storage(place) if should_store_json() else None
-        )
-
         # Save to database
-        business_id = save_business(
-            name=name,
-            address=address,
-            zip_code=zip_code,
-            category=category,
-            city=city,
-            state=state,
-            phone=phone,
-            website=website,
-            source="google",
-            source_id=place_id,
-            google_response_json=processed_google_json,
-        )
+        business_id = save_business(**record)
 
         # Try to extract email from website if provided
-        if business_id and website:
-            email = extract_email_from_website(website, business_id)
-            if email:
-                # Update business with email
-                storage = get_storage_instance()
-                storage.update_business(
-                    business_id,
-                    "UPDATE businesses SET email = %s WHERE id = %s",
-                    [email, business_id],
-                )
-                logger.info(f"Updated business {business_id} with email: {email}")
+        if business_id and record["website"]:
+            _save_website_email(business_id, record["website"])
 
         return business_id
     except Exception as e:
@@ -1455,6 +1900,36 @@ def process_google_place(
         return None
 
 
+def _build_record(builder, *args, **kwargs) -> Optional[dict[str, Any]]:
+    """Call a record builder, logging and skipping records that fail to parse."""
+    try:
+        return builder(*args, **kwargs)
+    except Exception as e:
+        logger.exception(f"Error processing scraped business: {str(e)}")
+        return None
+
+
+def save_scraped_page(records: list[Optional[dict[str, Any]]]) -> int:
+    """Save one page of scraped records and look up emails for new businesses.
+    Args:
+        records: save_business keyword arguments; None entries are skipped.
+    Returns:
+        Number of businesses saved.
+    """
+    records = [record for record in records if record]
+    saved = 0
+    for record, business_id in zip(records, save_businesses(records)):
+        if not business_id:
+            continue
+        saved += 1
+        if record["website"]:
+            try:
+                _save_website_email(business_id, record["website"])
+            except Exception as e:
+                logger.warning(f"Failed to extract email for {business_id}: {e}")
+    return saved
+
+
 def get_zip_coordinates(zip_code: str) -> Optional[str]:
     """Get coordinates for a ZIP code.
     This is a simplified implementation that would normally use a geocoding API.
@@ -1537,6 +2012,12 @@ def main() -> int:
     parser.add_argument(
         "--vertical", type=str, help="Process only the specified vertical"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of ZIP/vertical combinations to scrape concurrently",
+    )
     parser.add_argument(
         "--log-level",
         choices=["DEBUG", "INFO", "WARNING", "ERROR"],
@@ -1624,51 +2105,22 @@ def main() -> int:
                 },
             )
 
-            # Process each ZIP code and vertical combination
-            total_yelp = 0
-            total_google = 0
-            processed_combinations = 0
-
-            for zip_info in zip_codes:
-                zip_code = zip_info.get("zip_code")
-                if not zip_code:
-                    continue
-
-                for vertical in verticals:
-                    vertical_name = vertical.get("name", "unknown")
-
-                    # Log the current combination we're processing
-                    logger.info(
-                        f"Processing ZIP code {zip_code} for vertical {vertical_name}",
-                        extra={
-                            "zip_code": zip_code,
-                            "vertical": vertical_name,
-                            "limit": args.limit,
-                            "operation": "scrape_zip_vertical",
-                            "batch_id": batch_id,
-                        },
-                    )
+            # Process every ZIP code and vertical combination concurrently
+            from leadfactory.pipeline.scrape_engine import (
+                SCRAPE_MAX_WORKERS,
+                ScrapeEngine,
+            )
 
-                    # Scrape businesses for this ZIP code and vertical
-                    yelp_count, google_count = scrape_businesses(
-                        zip_code, vertical, args.limit
-                    )
-                    total_yelp += yelp_count
-                    total_google += google_count
-                    processed_combinations += 1
-
-                    # Log the results for this combination
-                    logger.info(
-                        f"Completed scraping for ZIP {zip_code} and vertical {vertical_name}",
-                        extra={
-                            "zip_code": zip_code,
-                            "vertical": vertical_name,
-                            "yelp_count": yelp_count,
-                            "google_count": google_count,
-                            "total_count": yelp_count + google_count,
-                            "batch_id": batch_id,
-                        },
-                    )
+            engine = ScrapeEngine(max_workers=args.workers or SCRAPE_MAX_WORKERS)
+            result = engine.run(
+                [z["zip_code"] for z in zip_codes if z.get("zip_code")],
+                verticals,
+                args.limit,
+                batch_id=batch_id,
+            )
+            total_yelp = result.yelp_count
+            total_google = result.google_count
+            processed_combinations = result.combinations
 
             # Log the final results with structured data
             logger.info(
@@ -1678,6 +2130,8 @@ def main() -> int:
                     "yelp_count": total_yelp,
                     "google_count": total_google,
                     "processed_combinations": processed_combinations,
+                    "failed_combinations": result.failed_combinations,
+                    "businesses_per_second": result.businesses_per_second,
                     "zip_count": len(zip_codes),
                     "vertical_count": len(verticals),
                     "batch_id": batch_id,
@@ -0,0 +1,267 @@
+"""
+Concurrent scrape engine for ZIP code × vertical sweeps.
+
+Runs scrape_businesses for many ZIP/vertical combinations on a bounded
+thread pool. All combinations share one Yelp and one Google client, each
+guarded by a token-bucket rate limiter, a shared executor for place-detail
+lookups, and the pooled keep-alive HTTP session from the scrape module.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from leadfactory.pipeline import scrape as scrape_module
+from leadfactory.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Configure with defaults from environment variables
+SCRAPE_MAX_WORKERS = int(os.getenv("SCRAPE_MAX_WORKERS", "4"))
+SCRAPE_YELP_RATE_PER_SECOND = float(os.getenv("SCRAPE_YELP_RATE_PER_SECOND", "5"))
+SCRAPE_GOOGLE_RATE_PER_SECOND = float(os.getenv("SCRAPE_GOOGLE_RATE_PER_SECOND", "10"))
+
+
+class ApiRateLimiter:
+    """
+    Thread-safe token bucket limiting the request rate to one API.
+
+    Callers reserve a token under the lock and sleep outside it, so waiting
+    threads are released in arrival order at the configured rate.
+    """
+
+    def __init__(self, rate_per_second: float, burst: Optional[int] = None):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate_per_second: Sustained requests per second; 0 disables limiting
+            burst: Requests allowed back to back after an idle period
+                (defaults to one second's worth)
+        """
+        self.rate = rate_per_second
+        self.capacity = burst or max(1, int(rate_per_second))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Block until a request may be sent.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+@dataclass
+class ScrapeResult:
+    """Totals for one engine run."""
+
+    yelp_count: int = 0
+    google_count: int = 0
+    combinations: int = 0
+    failed_combinations: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def total_businesses(self) -> int:
+        """Businesses saved from both sources."""
+        return self.yelp_count + self.google_count
+
+    @property
+    def businesses_per_second(self) -> float:
+        """Throughput of the run."""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.total_businesses / self.elapsed_seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a dictionary."""
+        return {
+            "yelp_count": self.yelp_count,
+            "google_count": self.google_count,
+            "total_businesses": self.total_businesses,
+            "combinations": self.combinations,
+            "failed_combinations": self.failed_combinations,
+            "elapsed_seconds": self.elapsed_seconds,
+            "businesses_per_second": self.businesses_per_second,
+        }
+
+
+class ScrapeEngine:
+    """Scrape ZIP code × vertical combinations concurrently."""
+
+    def __init__(
+        self,
+        max_workers: int = SCRAPE_MAX_WORKERS,
+        detail_workers: int = scrape_module.SCRAPE_DETAIL_WORKERS,
+        yelp_rate_per_second: float = SCRAPE_YELP_RATE_PER_SECOND,
+        google_rate_per_second: float = SCRAPE_GOOGLE_RATE_PER_SECOND,
+        yelp_base_url: str = scrape_module.YELP_API_BASE_URL,
+        google_base_url: str = scrape_module.GOOGLE_PLACES_API_BASE_URL,
+    ):
+        """
+        Initialize the engine.
+
+        Args:
+            max_workers: ZIP/vertical combinations scraped at the same time
+            detail_workers: Google place-detail lookups in flight at the same time
+            yelp_rate_per_second: Yelp request rate limit (0 for none)
+            google_rate_per_second: Google request rate limit (0 for none)
+            yelp_base_url: Yelp Fusion API base URL
+            google_base_url: Google Places API base URL
+        """
+        self.max_workers = max(1, max_workers)
+        self.detail_workers = max(1, detail_workers)
+        self.yelp_limiter = ApiRateLimiter(yelp_rate_per_second)
+        self.google_limiter = ApiRateLimiter(google_rate_per_second)
+        self.yelp_base_url = yelp_base_url
+        self.google_base_url = google_base_url
+
+    def _build_clients(self):
+        """Create the shared, rate-limited API clients."""
+        yelp_key = os.getenv("YELP_KEY")
+        google_key = os.getenv("GOOGLE_KEY")
+        yelp_api = (
+            scrape_module.YelpAPI(
+                yelp_key, rate_limiter=self.yelp_limiter, base_url=self.yelp_base_url
+            )
+            if yelp_key
+            else None
+        )
+        google_api = (
+            scrape_module.GooglePlacesAPI(
+                google_key,
+                rate_limiter=self.google_limiter,
+                base_url=self.google_base_url,
+            )
+            if google_key
+            else None
+        )
+        return yelp_api, google_api
+
+    def run(
+        self,
+        zip_codes: list[str],
+        verticals: list[dict],
+        limit: int = 50,
+        batch_id: Optional[str] = None,
+        on_combination_done: Optional[Callable[[str, str], None]] = None,
+    ) -> ScrapeResult:
+        """
+        Scrape every ZIP code for every vertical.
+
+        Args:
+            zip_codes: ZIP codes to scrape
+            verticals: Vertical configurations
+            limit: Maximum number of businesses to fetch per API
+            batch_id: Identifier added to log records
+            on_combination_done: Called with the ZIP code and vertical name
+                as soon as a combination has been scraped and saved, so
+                later stages can start on it before the sweep is over
+
+        Returns:
+            ScrapeResult with per-source counts and throughput
+
+        Raises:
+            ValueError: If required API keys are missing
+        """
+        is_valid, error_message = scrape_module.validate_api_keys()
+        if not is_valid:
+            logger.error(error_message)
+            raise ValueError(error_message)
+
+        yelp_api, google_api = self._build_clients()
+        combinations = [
+            (zip_code, vertical) for zip_code in zip_codes for vertical in verticals
+        ]
+        result = ScrapeResult()
+        start = time.perf_counter()
+
+        detail_executor = ThreadPoolExecutor(
+            max_workers=self.detail_workers, thread_name_prefix="place-details"
+        )
+        with (
+            detail_executor,
+            ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="scrape"
+            ) as executor,
+        ):
+            futures = {
+                executor.submit(
+                    scrape_module.scrape_businesses,
+                    zip_code,
+                    vertical,
+                    limit,
+                    yelp_api=yelp_api,
+                    google_api=google_api,
+                    detail_executor=detail_executor,
+                ): (zip_code, vertical.get("name", "unknown"))
+                for zip_code, vertical in combinations
+            }
+
+            for future in as_completed(futures):
+                zip_code, vertical_name = futures[future]
+                result.combinations += 1
+                try:
+                    yelp_count, google_count = future.result()
+                except Exception as e:
+                    result.failed_combinations += 1
+                    logger.error(
+                        f"Scraping failed for ZIP {zip_code} and vertical {vertical_name}: {e}",
+                        extra={
+                            "zip_code": zip_code,
+                            "vertical": vertical_name,
+                            "batch_id": batch_id,
+                        },
+                    )
+                    continue
+
+                result.yelp_count += yelp_count
+                result.google_count += google_count
+                logger.info(
+                    f"Completed scraping for ZIP {zip_code} and vertical {vertical_name}",
+                    extra={
+                        "zip_code": zip_code,
+                        "vertical": vertical_name,
+                        "yelp_count": yelp_count,
+                        "google_count": google_count,
+                        "total_count": yelp_count + google_count,
+                        "batch_id": batch_id,
+                    },
+                )
+                if on_combination_done:
+                    try:
+                        on_combination_done(zip_code, vertical_name)
+                    except Exception as e:
+                        logger.error(
+                            f"Combination callback failed for ZIP {zip_code} "
+                            f"and vertical {vertical_name}: {e}"
+                        )
+
+        result.elapsed_seconds = time.perf_counter() - start
+        logger.info(
+            f"Scraped {result.total_businesses} businesses from "
+            f"{result.combinations} combinations in {result.elapsed_seconds:.1f}s "
+            f"({result.businesses_per_second:.1f} businesses/s)"
+        )
+        return result
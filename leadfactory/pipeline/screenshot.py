@@ -7,13 +7,33 @@ import argparse
 import logging
 import os
 import tempfile
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+from leadfactory.pipeline.asset_cache import get_asset_cache
 from leadfactory.storage import get_storage
 
 logger = logging.getLogger(__name__)
 
+_screenshot_dir_path: Optional[str] = None
+_screenshot_dir_lock = threading.Lock()
+
+
+def _screenshot_dir() -> str:
+    """Directory for screenshot files, created once per process."""
+    global _screenshot_dir_path
+    with _screenshot_dir_lock:
+        if _screenshot_dir_path is None:
+            path = os.getenv("SCREENSHOT_DIR")
+            if path:
+                os.makedirs(path, exist_ok=True)
+            else:
+                path = tempfile.mkdtemp(prefix="screenshots_")  # nosec B108
+            _screenshot_dir_path = path
+        return _screenshot_dir_path
+
 
 def _capture_with_screenshotone_retry(
     api_url: str, params: dict, screenshot_path: str, website: str, max_retries: int = 3
@@ -145,7 +165,10 @@ def get_businesses_needing_screenshots(limit: Optional[int] = None) -> list[dict
 
 
 def create_screenshot_asset(
-    business_id: int, screenshot_path: str, screenshot_url: str
+    business_id: int,
+    screenshot_path: str,
+    screenshot_url: str,
+    content_hash: Optional[str] = None,
 ) -> bool:
     """Create a screenshot asset record in the database."""
     try:
@@ -156,6 +179,7 @@ def create_screenshot_asset(
             asset_type="screenshot",
             file_path=screenshot_path,
             url=screenshot_url,
+            content_hash=content_hash,
         )
 
         if success:
@@ -178,16 +202,34 @@ def generate_business_screenshot(business: dict) -> bool:
 
     logger.info(f"Generating screenshot for {business_name} ({website})")
 
-    # Create screenshots directory if it doesn't exist
-    screenshot_dir = tempfile.mkdtemp(prefix="screenshots_")  # nosec B108
-    os.makedirs(screenshot_dir, exist_ok=True)
+    screenshot_dir = _screenshot_dir()
 
     screenshot_filename = f"screenshot_{business_id}.png"
     screenshot_path = f"{screenshot_dir}/{screenshot_filename}"
+    # Create storage URL (for now, use a placeholder URL)
+    screenshot_url = f"https://storage.example.com/screenshots/{screenshot_filename}"
+
+    # Reuse the last capture if the site has not changed since
+    asset_cache = get_asset_cache()
+    cache_key = None
+    fingerprint = asset_cache.site_fingerprint(business)
+    if fingerprint:
+        cache_key = asset_cache.screenshot_key(website, fingerprint)
+        cached = asset_cache.lookup("screenshot", cache_key)
+        if cached:
+            logger.info(
+                f"Website unchanged since last capture, reusing screenshot "
+                f"{cached.content_hash[:12]} for business {business_id}"
+            )
+            return _record_screenshot_asset(
+                business_id, cached.file_path, screenshot_url, cached.content_hash
+            )
 
     # Check if we have ScreenshotOne API key for real screenshots
     screenshot_one_key = os.getenv("SCREENSHOT_ONE_KEY")
     screenshot_success = False
+    is_placeholder = False
+    capture_start = time.time()
 
     if screenshot_one_key:
         # Use real ScreenshotOne API
@@ -219,10 +261,8 @@ def generate_business_screenshot(business: dict) -> bool:
         logger.info("Attempting local screenshot capture using Playwright")
 
         try:
-            from .screenshot_local import (
-                capture_screenshot_sync,
-                is_playwright_available,
-            )
+            from .screenshot_local import is_playwright_available
+            from .screenshot_pool import capture_screenshot_pooled
 
             # Check if Playwright is available
             if not is_playwright_available():
@@ -263,13 +303,14 @@ def generate_business_screenshot(business: dict) -> bool:
 
                     logger.info(f"Created placeholder screenshot at {screenshot_path}")
                     screenshot_success = True
+                    is_placeholder = True
                 else:
                     raise Exception(
                         "Playwright not available for local screenshot capture"
                     )
             else:
-                # Use Playwright for local screenshot
-                screenshot_success = capture_screenshot_sync(
+                # Use the shared Playwright browser pool for local screenshot
+                screenshot_success = capture_screenshot_pooled(
                     url=website,
                     output_path=screenshot_path,
                     viewport_width=1280,
@@ -304,11 +345,36 @@ def generate_business_screenshot(business: dict) -> bool:
         logger.error("All screenshot methods failed")
         raise Exception("Failed to generate screenshot")
 
-    # Create storage URL (for now, use a placeholder URL)
-    screenshot_url = f"https://storage.example.com/screenshots/{screenshot_filename}"
+    # Move the capture into the content-addressed store; placeholders are
+    # never cached as the site's screenshot
+    content_hash = None
+    try:
+        stored = asset_cache.store(
+            "screenshot",
+            screenshot_path,
+            render_seconds=time.time() - capture_start,
+            cache_key=None if is_placeholder else cache_key,
+        )
+        screenshot_path = stored.file_path
+        content_hash = stored.content_hash
+    except Exception as e:
+        logger.warning(f"Could not add screenshot to asset cache: {e}")
+
+    return _record_screenshot_asset(
+        business_id, screenshot_path, screenshot_url, content_hash
+    )
 
-    # Create the asset record
-    success = create_screenshot_asset(business_id, screenshot_path, screenshot_url)
+
+def _record_screenshot_asset(
+    business_id: int,
+    screenshot_path: str,
+    screenshot_url: str,
+    content_hash: Optional[str],
+) -> bool:
+    """Create the screenshot asset, raising if that fails."""
+    success = create_screenshot_asset(
+        business_id, screenshot_path, screenshot_url, content_hash=content_hash
+    )
 
     if success:
         logger.info(f"Successfully generated screenshot for business {business_id}")
@@ -327,6 +393,12 @@ def main():
     parser.add_argument(
         "--limit", type=int, help="Limit number of businesses to process"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of screenshots to generate concurrently "
+        "(default: SCREENSHOT_POOL_SIZE)",
+    )
 
     args = parser.parse_args()
 
@@ -352,22 +424,40 @@ def main():
             logger.info("No businesses need screenshots")
             return 0
 
-        total_processed = 0
-        total_success = 0
+        from .screenshot_pool import SCREENSHOT_POOL_SIZE, get_shared_browser_pool
 
-        for business in businesses:
-            total_processed += 1
+        def process(business: dict) -> bool:
             try:
-                if generate_business_screenshot(business):
-                    total_success += 1
+                return bool(generate_business_screenshot(business))
             except Exception as e:
                 logger.exception(
                     f"Error generating screenshot for business {business['id']}: {e}"
                 )
+                return False
+
+        # Local captures share one browser pool, so the workers only bound how
+        # many businesses are in flight; the pool bounds concurrent pages.
+        workers = max(1, args.workers or SCREENSHOT_POOL_SIZE)
+        pool = get_shared_browser_pool()
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(process, businesses))
+            stats = pool.stats()
+        finally:
+            pool.close()
+        get_asset_cache().log_stats()
+
+        total_processed = len(results)
+        total_success = sum(results)
 
         logger.info(
             f"Screenshot generation complete: {total_success}/{total_processed} successful"
         )
+        if stats:
+            logger.info(
+                f"Local capture throughput {stats['throughput_per_second']:.2f}/s, "
+                f"p95 latency {stats['p95_seconds']:.2f}s"
+            )
 
         # Return failure exit code if no screenshots were generated successfully
         if total_processed > 0 and total_success == 0:
@@ -15,6 +15,8 @@ from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
 
 class LocalScreenshotCapture:
     """Captures screenshots using Playwright."""
@@ -113,48 +115,15 @@ class LocalScreenshotCapture:
 
         page = None
         try:
-            # Ensure URL has protocol
-            if not url.startswith(("http://", "https://")):
-                url = f"https://{url}"
-
             # Create a new page with viewport settings
             page = await self.browser.new_page(
                 viewport={"width": viewport_width, "height": viewport_height}
             )
 
             # Set user agent to appear as a real browser
-            await page.set_extra_http_headers(
-                {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-                }
-            )
+            await page.set_extra_http_headers({"User-Agent": USER_AGENT})
 
-            logger.info(f"Navigating to {url}")
-
-            # Navigate to the page
-            response = await page.goto(url, wait_until="networkidle", timeout=timeout)
-
-            if not response or response.status >= 400:
-                logger.error(
-                    f"Failed to load {url}: HTTP {response.status if response else 'No response'}"
-                )
-                return False
-
-            # Wait a bit for any dynamic content to load
-            await page.wait_for_timeout(2000)
-
-            # Take screenshot
-            await page.screenshot(path=output_path, full_page=full_page, type="png")
-
-            # Check if file was created
-            if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
-                logger.info(
-                    f"Screenshot saved to {output_path} ({os.path.getsize(output_path)} bytes)"
-                )
-                return True
-            else:
-                logger.error(f"Screenshot file not created or empty: {output_path}")
-                return False
+            return await render_screenshot(page, url, output_path, full_page, timeout)
 
         except asyncio.TimeoutError:
             logger.error(f"Timeout loading {url}")
@@ -167,6 +136,60 @@ class LocalScreenshotCapture:
                 await page.close()
 
 
+async def render_screenshot(
+    page,
+    url: str,
+    output_path: str,
+    full_page: bool = False,
+    timeout: int = 30000,
+) -> bool:
+    """
+    Load a URL in an open page and save a PNG screenshot of it.
+
+    Navigation and screenshot errors are raised to the caller.
+
+    Args:
+        page: Playwright page to use
+        url: Website URL to capture
+        output_path: Path to save the screenshot
+        full_page: Whether to capture full page or just viewport
+        timeout: Page load timeout in milliseconds
+
+    Returns:
+        True if a non-empty screenshot was saved, False otherwise
+    """
+    # Ensure URL has protocol
+    if not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+
+    logger.info(f"Navigating to {url}")
+
+    # Navigate to the page
+    response = await page.goto(url, wait_until="networkidle", timeout=timeout)
+
+    if not response or response.status >= 400:
+        logger.error(
+            f"Failed to load {url}: HTTP {response.status if response else 'No response'}"
+        )
+        return False
+
+    # Wait a bit for any dynamic content to load
+    await page.wait_for_timeout(2000)
+
+    # Take screenshot
+    await page.screenshot(path=output_path, full_page=full_page, type="png")
+
+    # Check if file was created
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        logger.info(
+            f"Screenshot saved to {output_path} ({os.path.getsize(output_path)} bytes)"
+        )
+        return True
+    else:
+        logger.error(f"Screenshot file not created or empty: {output_path}")
+        return False
+
+
 def capture_screenshot_sync(
     url: str,
     output_path: str,
@@ -0,0 +1,551 @@
+"""
+Long-lived Playwright browser pool for local screenshot capture.
+
+Launching Chromium dominates the time of a one-off local screenshot. The
+pool starts one browser and keeps a fixed number of browser contexts open,
+handing one context to each capture, so concurrency is bounded by the pool
+size and no capture pays for a cold start.
+
+Contexts are replaced after a number of pages, and the whole browser is
+restarted once its processes grow past a memory limit. Capture counts,
+capture times, recent throughput and p95 latency are reported through
+leadfactory.utils.metrics.
+
+BrowserPool is asynchronous. SharedBrowserPool runs one on a background
+event loop for synchronous callers such as generate_business_screenshot.
+"""
+
+import asyncio
+import atexit
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence, Tuple
+
+from leadfactory.pipeline.screenshot_local import (
+    USER_AGENT,
+    LocalScreenshotCapture,
+    render_screenshot,
+)
+from leadfactory.utils.metrics import (
+    SCREENSHOT_BROWSER_RECYCLES,
+    SCREENSHOT_CAPTURE_TIME,
+    SCREENSHOT_CAPTURES,
+    SCREENSHOT_LATENCY_P95,
+    SCREENSHOT_THROUGHPUT,
+    record_metric,
+)
+
+try:
+    import psutil
+
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Configure with defaults from environment variables
+SCREENSHOT_POOL_SIZE = int(os.getenv("SCREENSHOT_POOL_SIZE", "4"))
+SCREENSHOT_PAGES_PER_CONTEXT = int(os.getenv("SCREENSHOT_PAGES_PER_CONTEXT", "50"))
+SCREENSHOT_BROWSER_MAX_MEMORY_MB = float(
+    os.getenv("SCREENSHOT_BROWSER_MAX_MEMORY_MB", "2048")
+)
+SCREENSHOT_CAPTURE_TIMEOUT = float(os.getenv("SCREENSHOT_CAPTURE_TIMEOUT", "45"))
+
+# Window used for the throughput gauge, in seconds
+THROUGHPUT_WINDOW = 60.0
+
+
+@dataclass
+class CaptureResult:
+    """Outcome of one pooled screenshot capture."""
+
+    url: str
+    output_path: str
+    success: bool
+    elapsed_seconds: float
+    error: Optional[str] = None
+
+
+class _PooledContext:
+    """A browser context and the number of pages it has rendered."""
+
+    def __init__(self, context):
+        self.context = context
+        self.pages_used = 0
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of a list of values, 0.0 if empty."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class BrowserPool:
+    """Fixed set of reusable Playwright browser contexts."""
+
+    def __init__(
+        self,
+        size: int = SCREENSHOT_POOL_SIZE,
+        pages_per_context: int = SCREENSHOT_PAGES_PER_CONTEXT,
+        max_memory_mb: Optional[float] = SCREENSHOT_BROWSER_MAX_MEMORY_MB,
+        capture_timeout: float = SCREENSHOT_CAPTURE_TIMEOUT,
+        browser_type: str = "chromium",
+        viewport_width: int = 1280,
+        viewport_height: int = 800,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Number of browser contexts, i.e. concurrent captures
+            pages_per_context: Pages a context renders before it is replaced
+            max_memory_mb: Memory of the browser processes above which the
+                browser is restarted; None or 0 disables the check
+            capture_timeout: Default time limit for one capture, in seconds
+            browser_type: "chromium", "firefox" or "webkit"
+            viewport_width: Default viewport width of new contexts
+            viewport_height: Default viewport height of new contexts
+        """
+        self.size = max(1, size)
+        self.pages_per_context = max(1, pages_per_context)
+        self.max_memory_mb = max_memory_mb or None
+        self.capture_timeout = capture_timeout
+        self.viewport = {"width": viewport_width, "height": viewport_height}
+
+        self._browser = LocalScreenshotCapture()
+        self._browser.browser_type = browser_type
+        self._slots: Optional[asyncio.Queue] = None
+        self._restart_task: Optional[asyncio.Task] = None
+        # Captures waiting for or holding a context; stop() waits for them
+        self._active = 0
+        self._idle: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._latencies = deque(maxlen=1000)
+        self._completions = deque()
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.stop()
+
+    @property
+    def started(self) -> bool:
+        """Whether the browser is running and accepting captures."""
+        return self._slots is not None and not self._stopping
+
+    async def start(self):
+        """Launch the browser and open the pool's contexts."""
+        await self._browser.start()
+        self._slots = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        try:
+            for _ in range(self.size):
+                self._slots.put_nowait(await self._new_slot())
+        except Exception:
+            await self.stop()
+            raise
+        logger.info(f"Started screenshot browser pool with {self.size} contexts")
+
+    async def stop(self):
+        """
+        Close every context and the browser.
+
+        New captures are refused; captures already queued or running finish
+        first, each within its own time limit.
+        """
+        self._stopping = True
+        try:
+            if self._idle is not None:
+                await self._idle.wait()
+            if self._restart_task and not self._restart_task.done():
+                self._restart_task.cancel()
+                await asyncio.gather(self._restart_task, return_exceptions=True)
+            if self._slots is not None:
+                while not self._slots.empty():
+                    await self._close_slot(self._slots.get_nowait())
+                self._slots = None
+            await self._browser.stop()
+        finally:
+            self._stopping = False
+
+    async def capture(
+        self,
+        url: str,
+        output_path: str,
+        full_page: bool = False,
+        timeout: Optional[float] = None,
+        viewport_width: Optional[int] = None,
+        viewport_height: Optional[int] = None,
+    ) -> CaptureResult:
+        """
+        Capture one screenshot on the next free context.
+
+        Args:
+            url: Website URL to capture
+            output_path: Path to save the screenshot
+            full_page: Whether to capture full page or just viewport
+            timeout: Time limit for the whole capture in seconds, defaults
+                to the pool's capture_timeout
+            viewport_width: Viewport width, defaults to the pool's
+            viewport_height: Viewport height, defaults to the pool's
+
+        Returns:
+            CaptureResult for the URL
+        """
+        if not self.started:
+            raise RuntimeError("Browser pool not started. Call start() first.")
+
+        self._active += 1
+        self._idle.clear()
+        try:
+            return await self._capture(
+                url, output_path, full_page, timeout, viewport_width, viewport_height
+            )
+        finally:
+            self._active -= 1
+            if not self._active:
+                self._idle.set()
+
+    async def _capture(
+        self,
+        url: str,
+        output_path: str,
+        full_page: bool,
+        timeout: Optional[float],
+        viewport_width: Optional[int],
+        viewport_height: Optional[int],
+    ) -> CaptureResult:
+        timeout = timeout or self.capture_timeout
+        slot = await self._slots.get()
+        start = time.perf_counter()
+        success = False
+        error = None
+        page = None
+        try:
+            page = await slot.context.new_page()
+            viewport = {
+                "width": viewport_width or self.viewport["width"],
+                "height": viewport_height or self.viewport["height"],
+            }
+            if viewport != self.viewport:
+                await page.set_viewport_size(viewport)
+
+            success = await asyncio.wait_for(
+                render_screenshot(
+                    page,
+                    url,
+                    output_path,
+                    full_page=full_page,
+                    timeout=int(timeout * 1000),
+                ),
+                timeout=timeout,
+            )
+            if not success:
+                error = "Page could not be captured"
+        except asyncio.TimeoutError:
+            error = f"Timed out after {timeout}s"
+            logger.error(f"Timeout capturing screenshot of {url}")
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Error capturing screenshot of {url}: {e}")
+        finally:
+            if page:
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Error closing page for {url}: {e}")
+            slot.pages_used += 1
+            await self._release(slot)
+
+        elapsed = time.perf_counter() - start
+        self._record(elapsed, success)
+        return CaptureResult(
+            url=url,
+            output_path=output_path,
+            success=success,
+            elapsed_seconds=elapsed,
+            error=error,
+        )
+
+    async def capture_many(
+        self,
+        targets: Sequence[Tuple[str, str]],
+        full_page: bool = False,
+        timeout: Optional[float] = None,
+    ) -> list[CaptureResult]:
+        """
+        Capture many screenshots, at most one per context at a time.
+
+        Args:
+            targets: (url, output_path) pairs
+            full_page: Whether to capture full pages or just viewports
+            timeout: Time limit per capture in seconds
+
+        Returns:
+            CaptureResults in input order
+        """
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(
+                self.capture(url, output_path, full_page=full_page, timeout=timeout)
+                for url, output_path in targets
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+        if results:
+            succeeded = len([result for result in results if result.success])
+            p95 = percentile([result.elapsed_seconds for result in results], 95)
+            logger.info(
+                f"Captured {succeeded}/{len(results)} screenshots in {elapsed:.1f}s "
+                f"({len(results) / elapsed:.2f}/s, p95 {p95:.2f}s)"
+            )
+        return list(results)
+
+    def stats(self) -> dict[str, Any]:
+        """Recent throughput and latency of the pool."""
+        latencies = list(self._latencies)
+        return {
+            "captures": len(latencies),
+            "throughput_per_second": self._throughput(),
+            "p50_seconds": percentile(latencies, 50),
+            "p95_seconds": percentile(latencies, 95),
+            "browser_memory_mb": self.browser_memory_mb(),
+        }
+
+    def browser_memory_mb(self) -> Optional[float]:
+        """
+        Resident memory of the browser processes in megabytes.
+
+        Playwright runs the browser as a child of this process, so this is
+        the memory of all child processes. Returns None without psutil.
+        """
+        if not PSUTIL_AVAILABLE:
+            return None
+        try:
+            children = psutil.Process().children(recursive=True)
+            total = 0
+            for child in children:
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    continue
+            return total / (1024 * 1024)
+        except psutil.Error:
+            return None
+
+    async def _new_slot(self) -> _PooledContext:
+        context = await self._browser.browser.new_context(
+            viewport=self.viewport, extra_http_headers={"User-Agent": USER_AGENT}
+        )
+        return _PooledContext(context)
+
+    async def _close_slot(self, slot: _PooledContext):
+        try:
+            await slot.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser context: {e}")
+
+    async def _release(self, slot: _PooledContext):
+        """Return a context to the pool, replacing it if it is worn out."""
+        if self._stopping:
+            # Queued captures may still need it; stop() closes it afterwards
+            self._slots.put_nowait(slot)
+            return
+
+        if slot.pages_used >= self.pages_per_context:
+            await self._close_slot(slot)
+            try:
+                slot = await self._new_slot()
+            except Exception as e:
+                # Keep the pool at full size; captures on it will fail fast
+                logger.error(f"Failed to open replacement browser context: {e}")
+            record_metric(SCREENSHOT_BROWSER_RECYCLES, reason="pages")
+
+        self._slots.put_nowait(slot)
+
+        if self.max_memory_mb and (
+            self._restart_task is None or self._restart_task.done()
+        ):
+            memory_mb = self.browser_memory_mb()
+            if memory_mb is not None and memory_mb > self.max_memory_mb:
+                logger.info(
+                    f"Screenshot browser uses {memory_mb:.0f} MB, "
+                    f"restarting (limit {self.max_memory_mb:.0f} MB)"
+                )
+                self._restart_task = asyncio.create_task(self._restart_browser())
+
+    async def _restart_browser(self):
+        """Take every context out of the pool and restart the browser."""
+        slots = []
+        try:
+            for _ in range(self.size):
+                slots.append(await self._slots.get())
+        except asyncio.CancelledError:
+            for slot in slots:
+                self._slots.put_nowait(slot)
+            raise
+        for slot in slots:
+            await self._close_slot(slot)
+        try:
+            await self._browser.stop()
+            await self._browser.start()
+            slots = [await self._new_slot() for _ in range(self.size)]
+            record_metric(SCREENSHOT_BROWSER_RECYCLES, reason="memory")
+        except Exception as e:
+            logger.error(f"Failed to restart screenshot browser: {e}")
+        for slot in slots:
+            self._slots.put_nowait(slot)
+
+    def _throughput(self) -> float:
+        now = time.monotonic()
+        while self._completions and now - self._completions[0] > THROUGHPUT_WINDOW:
+            self._completions.popleft()
+        if not self._completions:
+            return 0.0
+        span = max(now - self._completions[0], 1.0)
+        return len(self._completions) / span
+
+    def _record(self, elapsed: float, success: bool):
+        self._latencies.append(elapsed)
+        self._completions.append(time.monotonic())
+
+        record_metric(SCREENSHOT_CAPTURES, result="success" if success else "failure")
+        record_metric(SCREENSHOT_CAPTURE_TIME, elapsed)
+        SCREENSHOT_THROUGHPUT.set(self._throughput())
+        SCREENSHOT_LATENCY_P95.set(percentile(self._latencies, 95))
+
+
+class SharedBrowserPool:
+    """
+    Synchronous front end for a BrowserPool.
+
+    The pool runs on its own event loop in a daemon thread and is started on
+    first use. Methods may be called from any number of threads; the pool's
+    size still bounds how many captures run at once.
+    """
+
+    def __init__(self, **pool_kwargs):
+        """
+        Initialize the shared pool.
+
+        Args:
+            **pool_kwargs: Arguments passed to BrowserPool
+        """
+        self._pool_kwargs = pool_kwargs
+        self._pool: Optional[BrowserPool] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _ensure_started(self) -> BrowserPool:
+        with self._lock:
+            if self._pool is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="screenshot-pool", daemon=True
+                )
+                thread.start()
+                pool = BrowserPool(**self._pool_kwargs)
+                try:
+                    asyncio.run_coroutine_threadsafe(pool.start(), loop).result()
+                except Exception:
+                    loop.call_soon_threadsafe(loop.stop)
+                    thread.join()
+                    loop.close()
+                    raise
+                self._pool, self._loop, self._thread = pool, loop, thread
+            return self._pool
+
+    def capture(self, url: str, output_path: str, **kwargs) -> CaptureResult:
+        """Capture one screenshot; see BrowserPool.capture."""
+        pool = self._ensure_started()
+        return self._run(pool.capture(url, output_path, **kwargs))
+
+    def capture_many(
+        self, targets: Sequence[Tuple[str, str]], **kwargs
+    ) -> list[CaptureResult]:
+        """Capture many screenshots; see BrowserPool.capture_many."""
+        pool = self._ensure_started()
+        return self._run(pool.capture_many(targets, **kwargs))
+
+    def stats(self) -> dict[str, Any]:
+        """Recent throughput and latency, empty if the pool never started."""
+        return self._pool.stats() if self._pool else {}
+
+    def close(self):
+        """Stop the pool and its event loop."""
+        with self._lock:
+            if self._pool is None:
+                return
+            try:
+                self._run(self._pool.stop())
+            except Exception as e:
+                logger.warning(f"Error stopping screenshot browser pool: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._pool, self._loop, self._thread = None, None, None
+
+
+_shared_pool: Optional[SharedBrowserPool] = None
+_shared_pool_lock = threading.Lock()
+
+
+def get_shared_browser_pool() -> SharedBrowserPool:
+    """Get the process-wide screenshot browser pool, closed at exit."""
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = SharedBrowserPool()
+            atexit.register(_shared_pool.close)
+        return _shared_pool
+
+
+def capture_screenshot_pooled(
+    url: str,
+    output_path: str,
+    viewport_width: int = 1280,
+    viewport_height: int = 800,
+    full_page: bool = False,
+    timeout: int = 30000,
+) -> bool:
+    """
+    Capture a screenshot on the shared browser pool.
+
+    Takes the same arguments as capture_screenshot_sync, including the
+    timeout in milliseconds.
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        result = get_shared_browser_pool().capture(
+            url,
+            output_path,
+            full_page=full_page,
+            timeout=timeout / 1000,
+            viewport_width=viewport_width,
+            viewport_height=viewport_height,
+        )
+        return result.success
+    except Exception as e:
+        logger.error(f"Failed to capture screenshot: {e}")
+        return False
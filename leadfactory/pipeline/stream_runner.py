@@ -0,0 +1,581 @@
+"""
+Micro-batch pipeline runner.
+
+Runs enrich, dedupe, score, mockup and email in one process, with every
+stage working at the same time instead of waiting for the previous stage to
+finish the whole night's work as bin/run_nightly.sh does.
+
+Work is tracked per business in processing_status. Workers claim batches
+with FOR UPDATE SKIP LOCKED, and a finished batch is recorded and handed to
+the next stage in one transaction. In-process, the handed-on batch goes
+straight onto the next stage's bounded queue, so a slow stage holds back the
+ones before it rather than piling up claimed work. Rows a crashed worker
+left in "processing" are claimed again once their lease expires, so a
+restarted runner, or several runners side by side, pick up where the
+previous one stopped.
+"""
+
+import asyncio
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+from leadfactory.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Configure with defaults from environment variables
+PIPELINE_STREAM_BATCH_SIZE = int(os.getenv("PIPELINE_STREAM_BATCH_SIZE", "25"))
+PIPELINE_STREAM_QUEUE_SIZE = int(os.getenv("PIPELINE_STREAM_QUEUE_SIZE", "4"))
+PIPELINE_STREAM_LEASE_SECONDS = float(os.getenv("PIPELINE_STREAM_LEASE_SECONDS", "900"))
+PIPELINE_STREAM_POLL_SECONDS = float(os.getenv("PIPELINE_STREAM_POLL_SECONDS", "1"))
+
+# Processes a batch of business IDs; returns a status per business
+# ("completed", "skipped" or "failed"). Businesses left out count as failed.
+BatchProcessor = Callable[[list[int]], dict[int, str]]
+
+# Produces new businesses, calling its argument whenever some were saved
+WorkSource = Callable[[Callable[[], None]], Any]
+
+
+@dataclass
+class StreamStage:
+    """One stage of the stream and the number of workers running it."""
+
+    name: str
+    process: BatchProcessor
+    workers: int = 1
+
+
+@dataclass
+class StageStats:
+    """Counters for one stage of a run."""
+
+    batches: int = 0
+    completed: int = 0
+    skipped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the counters to a dictionary."""
+        return {
+            "batches": self.batches,
+            "completed": self.completed,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "busy_seconds": self.busy_seconds,
+        }
+
+
+@dataclass
+class StreamRunResult:
+    """Totals for one runner pass."""
+
+    stages: dict[str, StageStats] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+    first_output_seconds: Optional[float] = None
+
+    @property
+    def outputs(self) -> int:
+        """Businesses that completed the last stage."""
+        if not self.stages:
+            return 0
+        return list(self.stages.values())[-1].completed
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the result to a dictionary."""
+        return {
+            "stages": {name: stats.to_dict() for name, stats in self.stages.items()},
+            "elapsed_seconds": self.elapsed_seconds,
+            "first_output_seconds": self.first_output_seconds,
+            "outputs": self.outputs,
+        }
+
+
+class _StageState:
+    """Queue, completion flag and live worker count of one stage."""
+
+    def __init__(self, queue_size: int):
+        self.inbox: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+        self.done = threading.Event()
+        self.workers = 0
+
+
+class StreamRunner:
+    """Run pipeline stages concurrently over micro-batches of businesses."""
+
+    def __init__(
+        self,
+        stages: list[StreamStage],
+        storage=None,
+        source: Optional[WorkSource] = None,
+        batch_size: int = PIPELINE_STREAM_BATCH_SIZE,
+        queue_size: int = PIPELINE_STREAM_QUEUE_SIZE,
+        lease_seconds: float = PIPELINE_STREAM_LEASE_SECONDS,
+        poll_seconds: float = PIPELINE_STREAM_POLL_SECONDS,
+        barrier: bool = False,
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            stages: Stages in pipeline order
+            storage: Storage with the stage claim methods (defaults to the
+                configured storage)
+            source: Producer of new businesses for the first stage, such as
+                scrape_source(); without one the runner only drains work
+                already waiting in processing_status
+            batch_size: Businesses per claimed or seeded batch
+            queue_size: Batches each stage buffers before its upstream blocks
+            lease_seconds: Age after which another worker may reclaim a
+                "processing" row; keep it well above a batch's queue wait
+                plus processing time
+            poll_seconds: How long an idle worker waits before claiming
+                from the database again
+            barrier: Run each stage to completion before starting the next,
+                like bin/run_nightly.sh
+        """
+        if not stages:
+            raise ValueError("At least one stage is required")
+
+        if storage is None:
+            from leadfactory.storage.factory import get_storage
+
+            storage = get_storage()
+        if not hasattr(storage, "claim_stage_batch"):
+            raise RuntimeError(
+                f"{type(storage).__name__} does not support claiming stage batches"
+            )
+
+        self.stages = stages
+        self.storage = storage
+        self.source = source
+        self.batch_size = max(1, batch_size)
+        self.queue_size = queue_size
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self.barrier = barrier
+
+        self._states: list[_StageState] = []
+        self._source_done = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._seed_after = 0
+        self._start = 0.0
+        self._result = StreamRunResult()
+
+    def stop(self) -> None:
+        """Ask the workers to stop after their current batch."""
+        self._stop.set()
+
+    def run(self) -> StreamRunResult:
+        """
+        Process everything the source produces and everything waiting.
+
+        Returns:
+            StreamRunResult with per-stage counters and timings
+        """
+        self._states = [_StageState(self.queue_size) for _ in self.stages]
+        self._source_done.clear()
+        self._stop.clear()
+        self._result = StreamRunResult(
+            stages={stage.name: StageStats() for stage in self.stages}
+        )
+        self._start = time.perf_counter()
+
+        if self.barrier:
+            self._run_source()
+            for index in range(len(self.stages)):
+                for thread in self._start_workers(index):
+                    thread.join()
+        else:
+            if not self.source:
+                self._source_done.set()
+            threads = [
+                thread
+                for index in range(len(self.stages))
+                for thread in self._start_workers(index)
+            ]
+            if self.source:
+                threads.append(self._start_thread(self._run_source, "stream-source"))
+            for thread in threads:
+                thread.join()
+
+        self._result.elapsed_seconds = time.perf_counter() - self._start
+        logger.info(
+            f"Stream run finished {self._result.outputs} businesses in "
+            f"{self._result.elapsed_seconds:.1f}s",
+            extra=self._result.to_dict(),
+        )
+        return self._result
+
+    def _start_thread(self, target, name, *args) -> threading.Thread:
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        return thread
+
+    def _start_workers(self, index: int) -> list[threading.Thread]:
+        stage = self.stages[index]
+        workers = max(1, stage.workers)
+        self._states[index].workers = workers
+        return [
+            self._start_thread(self._work, f"stream-{stage.name}-{n}", index)
+            for n in range(workers)
+        ]
+
+    def _run_source(self) -> None:
+        """Run the source, seeding the first stage as businesses arrive."""
+        try:
+            if self.source:
+                self._seed_after = self.storage.get_max_business_id()
+                self.source(self._seed)
+                self._seed()
+        except Exception as e:
+            logger.error(f"Stream source failed: {e}")
+        finally:
+            self._source_done.set()
+
+    def _seed(self) -> None:
+        """Queue businesses saved by the source for the first stage."""
+        business_ids = self.storage.seed_stage_status(
+            self.stages[0].name,
+            after_id=self._seed_after,
+            status="pending" if self.barrier else "processing",
+        )
+        if self.barrier:
+            return
+        for i in range(0, len(business_ids), self.batch_size):
+            self._put(0, business_ids[i : i + self.batch_size])
+
+    def _upstream_done(self, index: int) -> bool:
+        if index == 0:
+            return self._source_done.is_set()
+        return self._states[index - 1].done.is_set()
+
+    def _work(self, index: int) -> None:
+        """Worker loop: take batches until upstream is done and none are left."""
+        state = self._states[index]
+        try:
+            while not self._stop.is_set():
+                # Checked first: once upstream is done, an empty inbox and an
+                # empty claim mean there is nothing left for this stage
+                upstream_done = self._upstream_done(index)
+                batch = self._next_batch(index, wait=not upstream_done)
+                if batch:
+                    self._process(index, batch)
+                elif upstream_done:
+                    break
+        finally:
+            with self._lock:
+                state.workers -= 1
+                if state.workers == 0:
+                    state.done.set()
+
+    def _next_batch(self, index: int, wait: bool) -> list[int]:
+        """Take a handed-on batch, or claim one from processing_status."""
+        inbox = self._states[index].inbox
+        try:
+            return inbox.get_nowait()
+        except queue.Empty:
+            pass
+
+        batch = self.storage.claim_stage_batch(
+            self.stages[index].name, self.batch_size, self.lease_seconds
+        )
+        if batch or not wait:
+            return batch
+
+        try:
+            return inbox.get(timeout=self.poll_seconds)
+        except queue.Empty:
+            return []
+
+    def _process(self, index: int, batch: list[int]) -> None:
+        """Run a batch through a stage, record it and hand it on."""
+        stage = self.stages[index]
+        started = time.perf_counter()
+        try:
+            statuses = stage.process(batch) or {}
+        except Exception as e:
+            logger.error(f"Stage {stage.name} failed on a batch of {len(batch)}: {e}")
+            statuses = {}
+        outcomes = [
+            (business_id, statuses.get(business_id, "failed")) for business_id in batch
+        ]
+        busy = time.perf_counter() - started
+
+        last = index == len(self.stages) - 1
+        handed_on = self.storage.complete_stage_batch(
+            stage.name,
+            outcomes,
+            None if last else self.stages[index + 1].name,
+            "pending" if self.barrier else "processing",
+        )
+        if handed_on is None:
+            # Left in "processing"; reclaimed once the lease expires
+            logger.error(f"Could not record {stage.name} batch of {len(batch)}")
+
+        with self._lock:
+            stats = self._result.stages[stage.name]
+            stats.batches += 1
+            stats.busy_seconds += busy
+            for _, status in outcomes:
+                if status == "completed":
+                    stats.completed += 1
+                elif status == "skipped":
+                    stats.skipped += 1
+                else:
+                    stats.failed += 1
+            if last and stats.completed and self._result.first_output_seconds is None:
+                self._result.first_output_seconds = time.perf_counter() - self._start
+
+        if handed_on and not last and not self.barrier:
+            self._put(index + 1, handed_on)
+
+    def _put(self, index: int, batch: list[int]) -> None:
+        """Queue a batch for a stage, blocking while its queue is full."""
+        inbox = self._states[index].inbox
+        while not self._stop.is_set():
+            try:
+                inbox.put(batch, timeout=self.poll_seconds)
+                return
+            except queue.Full:
+                continue
+
+
+def _load_businesses(business_ids: list[int]) -> dict[int, dict[str, Any]]:
+    from leadfactory.storage.factory import get_storage
+
+    return {
+        business["id"]: business
+        for business in get_storage().get_businesses_by_ids(business_ids)
+    }
+
+
+def enrich_batch(business_ids: list[int]) -> dict[int, str]:
+    """Enrich a batch of businesses with enrich_business()."""
+    from leadfactory.pipeline.enrich import enrich_business
+
+    businesses = _load_businesses(business_ids)
+    statuses = {}
+    for business_id in business_ids:
+        business = businesses.get(business_id)
+        if business is None:
+            # Merged away or deleted since it was queued
+            statuses[business_id] = "skipped"
+        elif enrich_business(business):
+            statuses[business_id] = "completed"
+        else:
+            statuses[business_id] = "failed"
+    return statuses
+
+
+def dedupe_batch(business_ids: list[int]) -> dict[int, str]:
+    """
+    Merge a batch of businesses with their duplicates.
+
+    Candidates come from the blocking-key index, limited to pairs involving
+    the batch, and are merged as clusters. Until the index covers every
+    stored business, candidates come from the full self-join instead.
+    Businesses merged into another one are skipped by the later stages.
+    """
+    from leadfactory.config.dedupe_config import load_dedupe_config
+    from leadfactory.pipeline.dedupe_blocking import ensure_block_index
+    from leadfactory.pipeline.dedupe_performance import OptimizedDeduplicator
+    from leadfactory.utils.e2e_db_connector import (
+        get_blocked_duplicate_pairs,
+        get_potential_duplicate_pairs,
+    )
+
+    statuses = dict.fromkeys(business_ids, "completed")
+    if ensure_block_index():
+        pairs = get_blocked_duplicate_pairs(business_ids=business_ids)
+    else:
+        pairs = [
+            pair
+            for pair in get_potential_duplicate_pairs(use_blocking=False)
+            if pair["business1_id"] in statuses or pair["business2_id"] in statuses
+        ]
+    if not pairs:
+        return statuses
+
+    deduplicator = OptimizedDeduplicator(load_dedupe_config(), max_workers=1)
+    clusters, _ = deduplicator.resolve_clusters(pairs)
+    merged = deduplicator.merge_clusters(clusters, parallel=False)
+    for cluster in clusters:
+        for business_id in cluster.secondary_ids:
+            if business_id in statuses:
+                statuses[business_id] = "failed" if merged["errors"] else "skipped"
+        if merged["errors"] and cluster.primary_id in statuses:
+            statuses[cluster.primary_id] = "failed"
+    return statuses
+
+
+def make_score_batch(audit_threshold: Optional[int] = None) -> BatchProcessor:
+    """
+    Create a processor that scores and saves a batch of businesses.
+
+    Businesses below the audit threshold are skipped, so they get no mockup
+    or email.
+    """
+    from leadfactory.pipeline.score import (
+        meets_audit_threshold,
+        save_business_score,
+        score_business,
+    )
+
+    def score_batch(business_ids: list[int]) -> dict[int, str]:
+        businesses = _load_businesses(business_ids)
+        statuses = {}
+        for business_id in business_ids:
+            business = businesses.get(business_id)
+            if business is None:
+                statuses[business_id] = "skipped"
+                continue
+            score = score_business(business)
+            if not save_business_score(business_id, score):
+                statuses[business_id] = "failed"
+            elif meets_audit_threshold(score, audit_threshold):
+                statuses[business_id] = "completed"
+            else:
+                statuses[business_id] = "skipped"
+        return statuses
+
+    return score_batch
+
+
+def mockup_batch(business_ids: list[int]) -> dict[int, str]:
+    """Generate mockups for a batch of businesses."""
+    from leadfactory.pipeline.mockup import generate_business_mockup
+
+    return {
+        business_id: (
+            "completed"
+            if generate_business_mockup(business_id).get("status") == "generated"
+            else "failed"
+        )
+        for business_id in business_ids
+    }
+
+
+def make_email_batch(dry_run: Optional[bool] = None) -> BatchProcessor:
+    """
+    Create a processor that sends a batch of emails concurrently.
+
+    A business whose lease expired after its email went out (a crash before
+    the batch completed, say) is claimed again; businesses that already
+    have an email recorded are skipped rather than emailed twice.
+    """
+    from leadfactory.pipeline.email_queue import process_business_email
+    from leadfactory.storage.factory import get_storage
+
+    async def send_all(business_ids):
+        return await asyncio.gather(
+            *(
+                process_business_email(business_id, dry_run, force=False)
+                for business_id in business_ids
+            ),
+            return_exceptions=True,
+        )
+
+    def email_batch(business_ids: list[int]) -> dict[int, str]:
+        storage = get_storage()
+        emailed = set()
+        if hasattr(storage, "get_emailed_business_ids"):
+            emailed = storage.get_emailed_business_ids(business_ids)
+
+        statuses = dict.fromkeys(business_ids, "skipped")
+        to_send = [
+            business_id for business_id in business_ids if business_id not in emailed
+        ]
+        if to_send:
+            results = asyncio.run(send_all(to_send))
+            for business_id, result in zip(to_send, results):
+                statuses[business_id] = "completed" if result is True else "failed"
+        return statuses
+
+    return email_batch
+
+
+def default_stages(
+    dry_run: Optional[bool] = None,
+    audit_threshold: Optional[int] = None,
+    workers: Optional[dict[str, int]] = None,
+) -> list[StreamStage]:
+    """
+    Build the stages bin/run_nightly.sh runs after scraping.
+
+    Args:
+        dry_run: Passed to the email stage
+        audit_threshold: Minimum score for a business to get a mockup and
+            email (defaults to the scoring configuration)
+        workers: Worker count per stage name; stages not listed get one
+
+    Returns:
+        Stages in pipeline order
+    """
+    workers = workers or {}
+    processors = [
+        ("enrich", enrich_batch),
+        ("dedupe", dedupe_batch),
+        ("score", make_score_batch(audit_threshold)),
+        ("mockup", mockup_batch),
+        ("email", make_email_batch(dry_run)),
+    ]
+    return [
+        StreamStage(name, process, workers=workers.get(name, 1))
+        for name, process in processors
+    ]
+
+
+def scrape_source(
+    zip_codes: Optional[list[str]] = None,
+    verticals: Optional[list[dict]] = None,
+    limit: int = 50,
+    engine=None,
+) -> WorkSource:
+    """
+    Create a source that scrapes ZIP codes and verticals with ScrapeEngine.
+
+    Each finished ZIP/vertical combination seeds the first stage, so the
+    first leads are enriched while the rest are still being scraped.
+
+    Args:
+        zip_codes: ZIP codes to scrape (defaults to the active ZIP codes)
+        verticals: Vertical configurations (defaults to the verticals config)
+        limit: Maximum number of businesses to fetch per API
+        engine: ScrapeEngine to use
+
+    Returns:
+        Source to pass to StreamRunner
+    """
+
+    def run(notify: Callable[[], None]):
+        from leadfactory.pipeline import scrape as scrape_module
+        from leadfactory.pipeline.scrape_engine import ScrapeEngine
+
+        sweep_zip_codes = zip_codes
+        if sweep_zip_codes is None:
+            sweep_zip_codes = [
+                z["zip_code"]
+                for z in scrape_module.get_active_zip_codes()
+                if z.get("zip_code")
+            ]
+        sweep_verticals = verticals
+        if sweep_verticals is None:
+            sweep_verticals = scrape_module.load_yaml_config(
+                scrape_module.VERTICALS_CONFIG_PATH
+            ).get("verticals", [])
+
+        return (engine or ScrapeEngine()).run(
+            sweep_zip_codes,
+            sweep_verticals,
+            limit,
+            on_combination_done=lambda zip_code, vertical: notify(),
+        )
+
+    return run
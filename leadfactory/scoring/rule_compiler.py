@@ -0,0 +1,496 @@
+"""
+Rule compilation for the scoring engine.
+
+This module turns parsed scoring rules into predicate closures once per load,
+so scoring a business no longer re-interprets rule conditions. Compiled
+predicates match the results of RuleEvaluator for the legacy condition keys
+and also understand the keys produced by
+SimplifiedYamlParser.convert_to_legacy_format().
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from leadfactory.utils.logging import get_logger
+
+from .rule_evaluator import RuleEvaluator
+from .yaml_parser import RuleCondition
+
+logger = get_logger(__name__)
+
+VERSION_PATTERN = re.compile(r"(\d+(?:\.\d+)*)")
+
+LOCATION_FIELDS = ("location", "city", "state", "country", "region", "address")
+
+_MISSING = object()
+
+
+class BusinessView:
+    """
+    Business record with derived values cached across rule evaluations.
+
+    Every rule of a rule set reads the same business, so normalised values
+    such as the lower-cased tech stack are computed once per business rather
+    than once per rule.
+    """
+
+    __slots__ = ("data", "_tech_stack", "_social", "_locations", "_text", "_numbers")
+
+    def __init__(self, data: dict[str, Any]):
+        """
+        Initialize the view.
+
+        Args:
+            data: Business data dictionary.
+        """
+        self.data = data
+        self._tech_stack = None
+        self._social = _MISSING
+        self._locations = None
+        self._text = {}
+        self._numbers = {}
+
+    def tech_stack(self) -> tuple[str, Any]:
+        """Return the tech stack kind ("list", "dict" or "") and its names."""
+        cached = self._tech_stack
+        if cached is None:
+            tech_stack = self.data.get("tech_stack", [])
+            if isinstance(tech_stack, list):
+                cached = ("list", tuple(str(tech).lower() for tech in tech_stack))
+            elif isinstance(tech_stack, dict):
+                cached = ("dict", frozenset(k.lower() for k in tech_stack))
+            else:
+                cached = ("", ())
+            self._tech_stack = cached
+        return cached
+
+    def social_platforms(self) -> Optional[frozenset]:
+        """Return lower-cased social media platform names, if any."""
+        cached = self._social
+        if cached is _MISSING:
+            social_media = self.data.get("social_media", {})
+            if isinstance(social_media, (dict, list)):
+                cached = frozenset(name.lower() for name in social_media)
+            else:
+                cached = None
+            self._social = cached
+        return cached
+
+    def text(self, field: str) -> Optional[str]:
+        """Return a lower-cased string field, or None if it is not a string."""
+        try:
+            return self._text[field]
+        except KeyError:
+            value = self.data.get(field, "")
+            text = value.lower() if isinstance(value, str) else None
+            self._text[field] = text
+            return text
+
+    def locations(self) -> tuple[str, ...]:
+        """Return the lower-cased location fields, address last."""
+        cached = self._locations
+        if cached is None:
+            cached = tuple(
+                value for value in map(self.text, LOCATION_FIELDS) if value is not None
+            )
+            self._locations = cached
+        return cached
+
+    def number(self, field: str) -> Optional[float]:
+        """Return a numeric field as a float, or None if missing or invalid."""
+        try:
+            return self._numbers[field]
+        except KeyError:
+            number = _to_float(self.data.get(field))
+            self._numbers[field] = number
+            return number
+
+
+Predicate = Callable[[BusinessView], bool]
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A rule or multiplier paired with its compiled predicate."""
+
+    name: str
+    description: Optional[str]
+    value: Any
+    matches: Predicate
+
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert a value to float, returning None if it is missing or invalid."""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _parse_version(version: Any) -> Optional[tuple[int, ...]]:
+    """Parse a dotted version into an integer tuple, or None if it is not one."""
+    try:
+        return tuple(int(part) for part in str(version).split("."))
+    except (ValueError, AttributeError):
+        return None
+
+
+def _always_false(view: BusinessView) -> bool:
+    return False
+
+
+def _always_true(view: BusinessView) -> bool:
+    return True
+
+
+def _numeric(field: str, threshold: Any, operator: str) -> Predicate:
+    limit = _to_float(threshold)
+    if limit is None:
+        return _always_false
+
+    if operator == "gt":
+
+        def predicate(view: BusinessView) -> bool:
+            value = view.number(field)
+            return value is not None and value > limit
+
+    else:
+
+        def predicate(view: BusinessView) -> bool:
+            value = view.number(field)
+            return value is not None and value < limit
+
+    return predicate
+
+
+def _tech_contains_any(technologies: list[str]) -> Predicate:
+    wanted = tuple(tech.lower() for tech in technologies)
+
+    def predicate(view: BusinessView) -> bool:
+        kind, names = view.tech_stack()
+        if kind == "list":
+            return any(tech in name for tech in wanted for name in names)
+        if kind == "dict":
+            return any(tech in names for tech in wanted)
+        return False
+
+    return predicate
+
+
+def _tech_version(spec: dict[str, Any], operator: str) -> Predicate:
+    technology = spec["technology"]
+    version = spec["version"]
+    technology_lower = technology.lower()
+    threshold_parts = _parse_version(version)
+    threshold_text = str(version)
+
+    def compare(found: Any) -> bool:
+        found_parts = _parse_version(found) if threshold_parts is not None else None
+        if found_parts is None:
+            if operator == "lt":
+                return str(found) < threshold_text
+            return str(found) > threshold_text
+        if operator == "lt":
+            return found_parts < threshold_parts
+        return found_parts > threshold_parts
+
+    def predicate(view: BusinessView) -> bool:
+        tech_stack = view.data.get("tech_stack", {})
+        if isinstance(tech_stack, dict):
+            found = tech_stack.get(technology)
+            if found:
+                return compare(found)
+        elif isinstance(tech_stack, list):
+            for tech in tech_stack:
+                if isinstance(tech, str) and technology_lower in tech.lower():
+                    match = VERSION_PATTERN.search(tech)
+                    if match:
+                        return compare(match.group(1))
+        return False
+
+    return predicate
+
+
+def _text_contains_any(field: str, values: list[str], negate: bool) -> Predicate:
+    wanted = tuple(value.lower() for value in values)
+
+    def predicate(view: BusinessView) -> bool:
+        text = view.text(field)
+        matched = text is not None and any(value in text for value in wanted)
+        return matched is not negate
+
+    return predicate
+
+
+def _location_in(locations: list[str], negate: bool) -> Predicate:
+    wanted = tuple(location.lower() for location in locations)
+
+    def predicate(view: BusinessView) -> bool:
+        matched = any(
+            location in field for field in view.locations() for location in wanted
+        )
+        return matched is not negate
+
+    return predicate
+
+
+def _has_social_media(platforms: list[str]) -> Predicate:
+    wanted = tuple(platform.lower() for platform in platforms)
+
+    def predicate(view: BusinessView) -> bool:
+        present = view.social_platforms()
+        return present is not None and any(p in present for p in wanted)
+
+    return predicate
+
+
+def _social_metric(metric: str, thresholds: dict[str, Any]) -> Predicate:
+    limits = [(platform, _to_float(limit)) for platform, limit in thresholds.items()]
+
+    def predicate(view: BusinessView) -> bool:
+        social_media = view.data.get("social_media", {})
+        if not isinstance(social_media, dict):
+            return False
+        for platform, limit in limits:
+            platform_data = social_media.get(platform, {})
+            if isinstance(platform_data, dict):
+                value = _to_float(platform_data.get(metric, 0))
+                if value is not None and limit is not None and value > limit:
+                    return True
+        return False
+
+    return predicate
+
+
+def _flag(field: str, expected: Any) -> Predicate:
+    def predicate(view: BusinessView) -> bool:
+        return view.data.get(field, False) == expected
+
+    return predicate
+
+
+def _category_contains_any(categories: Any) -> Predicate:
+    if isinstance(categories, str):
+        categories = [categories]
+    wanted = tuple(str(category).lower() for category in categories)
+
+    def predicate(view: BusinessView) -> bool:
+        category = view.data.get("category")
+        if isinstance(category, str):
+            values = (category.lower(),)
+        elif isinstance(category, (list, tuple, set)):
+            values = tuple(str(item).lower() for item in category)
+        else:
+            return False
+        return any(c in value for c in wanted for value in values)
+
+    return predicate
+
+
+def _state_in(states: Any) -> Predicate:
+    if isinstance(states, str):
+        states = [states]
+    wanted = frozenset(str(state).lower() for state in states)
+
+    def predicate(view: BusinessView) -> bool:
+        state = view.text("state")
+        return state is not None and state in wanted
+
+    return predicate
+
+
+class RuleCompiler:
+    """Compiles scoring rule conditions into predicate closures."""
+
+    def __init__(self, evaluator: Optional[RuleEvaluator] = None):
+        """
+        Initialize the rule compiler.
+
+        Args:
+            evaluator: Evaluator used for conditions that cannot be compiled.
+        """
+        self.logger = get_logger(__name__ + ".RuleCompiler")
+        self.evaluator = evaluator or RuleEvaluator()
+
+    def compile_rules(self, rules: list[Any]) -> list[CompiledRule]:
+        """
+        Compile scoring rules.
+
+        Args:
+            rules: Rules exposing name, description, score and condition.
+
+        Returns:
+            Compiled rules whose value is the score adjustment.
+        """
+        return [
+            self._compile(rule, rule.score, "rule", {"score": rule.score})
+            for rule in rules
+        ]
+
+    def compile_multipliers(self, multipliers: list[Any]) -> list[CompiledRule]:
+        """
+        Compile scoring multipliers.
+
+        Args:
+            multipliers: Multipliers exposing name, description, multiplier and
+                condition.
+
+        Returns:
+            Compiled multipliers whose value is the multiplier factor.
+        """
+        return [
+            self._compile(
+                multiplier,
+                multiplier.multiplier,
+                "multiplier",
+                {"value": multiplier.multiplier},
+            )
+            for multiplier in multipliers
+        ]
+
+    def compile_condition(self, condition: Any) -> Predicate:
+        """
+        Compile a single condition.
+
+        The first populated key decides the check, in the same order that
+        RuleEvaluator uses. Conditions may be RuleCondition models, objects
+        with condition attributes, or plain dictionaries.
+
+        Args:
+            condition: Condition to compile.
+
+        Returns:
+            Predicate over a BusinessView. It may raise for malformed data.
+        """
+        if isinstance(condition, dict):
+            get = condition.get
+        else:
+
+            def get(key: str) -> Any:
+                return getattr(condition, key, None)
+
+        for key in ("all_of", "any_of", "none_of"):
+            sub_conditions = get(key)
+            if sub_conditions:
+                predicates = tuple(
+                    self.compile_condition(RuleCondition(**sub_condition))
+                    for sub_condition in sub_conditions
+                )
+                if key == "all_of":
+                    return lambda view: all(p(view) for p in predicates)
+                if key == "any_of":
+                    return lambda view: any(p(view) for p in predicates)
+                return lambda view: not any(p(view) for p in predicates)
+
+        value = get("tech_stack_contains")
+        if value:
+            return _tech_contains_any([value])
+        value = get("tech_stack_contains_any")
+        if value:
+            return _tech_contains_any(value)
+        value = get("tech_stack_version_lt")
+        if value:
+            return _tech_version(value, "lt")
+        value = get("tech_stack_version_gt")
+        if value:
+            return _tech_version(value, "gt")
+
+        value = get("vertical_in")
+        if value:
+            return _text_contains_any("vertical", value, negate=False)
+        value = get("vertical_not_in")
+        if value:
+            return _text_contains_any("vertical", value, negate=True)
+        value = get("location_in")
+        if value:
+            return _location_in(value, negate=False)
+        value = get("location_not_in")
+        if value:
+            return _location_in(value, negate=True)
+
+        for field in ("employee_count", "revenue", "founded_year"):
+            for operator in ("gt", "lt"):
+                value = get(f"{field}_{operator}")
+                if value is not None:
+                    return _numeric(field, value, operator)
+
+        value = get("has_social_media")
+        if value:
+            return _has_social_media(value)
+        value = get("social_followers_gt")
+        if value:
+            return _social_metric("followers", value)
+        value = get("social_engagement_gt")
+        if value:
+            return _social_metric("engagement", value)
+
+        for field in ("has_contact_form", "has_phone_number", "has_email"):
+            value = get(field)
+            if value is not None:
+                return _flag(field, value)
+
+        for operator in ("gt", "lt"):
+            value = get(f"page_count_{operator}")
+            if value is not None:
+                return _numeric("page_count", value, operator)
+
+        # Keys produced by SimplifiedYamlParser.convert_to_legacy_format()
+        for key, field, operator in (
+            ("performance_score_lt", "performance_score", "lt"),
+            ("performance_score_gt", "performance_score", "gt"),
+            ("lcp_gt", "lcp", "gt"),
+            ("cls_gt", "cls", "gt"),
+        ):
+            value = get(key)
+            if value is not None:
+                return _numeric(field, value, operator)
+
+        for key in ("category_contains", "category_contains_any"):
+            value = get(key)
+            if value:
+                return _category_contains_any(value)
+
+        for key in ("state_in", "state_equals"):
+            value = get(key)
+            if value:
+                return _state_in(value)
+
+        # If no conditions are specified, match every business
+        return _always_true
+
+    def _compile(
+        self, rule: Any, value: Any, kind: str, extra: dict[str, Any]
+    ) -> CompiledRule:
+        """Compile one rule, falling back to the interpreter if compilation fails."""
+        try:
+            predicate = self.compile_condition(rule.condition)
+        except Exception as e:
+            self.logger.warning(
+                f"Could not compile {kind} '{rule.name}', interpreting it instead: {e}"
+            )
+            condition = rule.condition
+
+            def predicate(view: BusinessView) -> bool:
+                return bool(self.evaluator._evaluate_condition(view.data, condition))
+
+        name = rule.name
+
+        def matches(view: BusinessView) -> bool:
+            try:
+                return bool(predicate(view))
+            except Exception as e:
+                self.logger.error(
+                    f"Error evaluating {kind} '{name}': {e}",
+                    extra={kind: name, "error": str(e)},
+                )
+                return False
+
+        return CompiledRule(
+            name=name,
+            description=getattr(rule, "description", None),
+            value=value,
+            matches=matches,
+        )
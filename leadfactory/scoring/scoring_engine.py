@@ -13,6 +13,7 @@ from leadfactory.utils.metrics import (
     record_metric,
 )
 
+from .rule_compiler import BusinessView, CompiledRule, RuleCompiler
 from .rule_evaluator import RuleEvaluator
 from .yaml_parser import ScoringRulesParser
 
@@ -33,10 +34,12 @@ class ScoringEngine:
         self.logger = get_logger(__name__ + ".ScoringEngine")
         self.parser = ScoringRulesParser(config_path)
         self.evaluator = RuleEvaluator()
+        self.compiler = RuleCompiler(self.evaluator)
         self.config = None
         self.rules = []
         self.multipliers = []
         self.settings = None
+        self._compiled = None
 
         self.logger.info("Initialized ScoringEngine")
 
@@ -49,6 +52,7 @@ class ScoringEngine:
             self.rules = self.parser.get_enabled_rules()
             self.multipliers = self.parser.get_enabled_multipliers()
             self.settings = self.parser.get_settings()
+            self._compile_rules()
 
             self.logger.info(
                 f"Loaded {len(self.rules)} rules and "
@@ -147,12 +151,121 @@ class ScoringEngine:
 
         return results
 
-    def _calculate_score(self, business: dict[str, Any]) -> dict[str, Any]:
+    def score_batch(self, businesses: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Score a batch of businesses column by column.
+
+        Each compiled rule is evaluated across the whole batch before moving
+        on to the next one, and per-business logging and timers are skipped.
+        Results are identical to score_businesses().
+
+        Args:
+            businesses: List of business data dictionaries.
+
+        Returns:
+            List of scoring results, in input order.
+        """
+        if not self.rules:
+            raise RuntimeError("No rules loaded. Call load_rules() first.")
+
+        rules, multipliers = self._compile_rules()
+        results = []
+
+        with MetricsTimer("scoring.score_batch"):
+            views = [BusinessView(business) for business in businesses]
+            pending = [
+                index
+                for index, business in enumerate(businesses)
+                if not (
+                    isinstance(business, dict)
+                    and business.get("ai_status") == "AI-Uncertain"
+                )
+            ]
+
+            matched_rules = [[] for _ in businesses]
+            for rule in rules:
+                matches = rule.matches
+                for index in pending:
+                    if matches(views[index]):
+                        matched_rules[index].append(rule)
+
+            matched_multipliers = [[] for _ in businesses]
+            for multiplier in multipliers:
+                matches = multiplier.matches
+                for index in pending:
+                    if matches(views[index]):
+                        matched_multipliers[index].append(multiplier)
+
+            scored = 0
+            for index, business in enumerate(businesses):
+                try:
+                    result = self._calculate_score(
+                        business, (matched_rules[index], matched_multipliers[index])
+                    )
+                    scored += 1
+                    results.append(
+                        {
+                            "business_id": business.get("id"),
+                            "business_name": business.get("name"),
+                            **result,
+                        }
+                    )
+                except Exception as e:
+                    self.logger.error(
+                        f"Error scoring business {business.get('name', 'unknown')}: {e}"
+                    )
+                    results.append(
+                        {
+                            "business_id": business.get("id"),
+                            "business_name": business.get("name"),
+                            "error": str(e),
+                            "score": 0,
+                        }
+                    )
+
+            if scored:
+                record_metric(LEADS_SCORED, scored)
+
+        self.logger.info(f"Scored {scored} of {len(businesses)} businesses in batch")
+        return results
+
+    def _compile_rules(self) -> tuple[list[CompiledRule], list[CompiledRule]]:
+        """
+        Return compiled rules and multipliers, compiling them if needed.
+
+        Rules are recompiled whenever self.rules or self.multipliers has been
+        replaced since the last compilation.
+
+        Returns:
+            Tuple of (compiled_rules, compiled_multipliers).
+        """
+        compiled = self._compiled
+        if (
+            compiled is None
+            or compiled[0] is not self.rules
+            or compiled[1] is not self.multipliers
+        ):
+            compiled = (
+                self.rules,
+                self.multipliers,
+                self.compiler.compile_rules(self.rules),
+                self.compiler.compile_multipliers(self.multipliers),
+            )
+            self._compiled = compiled
+        return compiled[2], compiled[3]
+
+    def _calculate_score(
+        self,
+        business: dict[str, Any],
+        matched: Optional[tuple[list[CompiledRule], list[CompiledRule]]] = None,
+    ) -> dict[str, Any]:
         """
         Calculate the score for a business.
 
         Args:
             business: Business data dictionary.
+            matched: Rules and multipliers already known to match, as computed
+                by score_batch(). Evaluated here when omitted.
 
         Returns:
             Detailed scoring result.
@@ -184,6 +297,15 @@ class ScoringEngine:
                 },
             }
 
+        if matched is None:
+            rules, multipliers = self._compile_rules()
+            view = BusinessView(business)
+            matched = (
+                [rule for rule in rules if rule.matches(view)],
+                [multiplier for multiplier in multipliers if multiplier.matches(view)],
+            )
+        matched_rules, matched_multipliers = matched
+
         # Start with base score
         base_score = self.settings.base_score
         score = base_score
@@ -191,23 +313,21 @@ class ScoringEngine:
         applied_multipliers = []
 
         # Apply rules
-        for rule in self.rules:
-            matched, adjustment = self.evaluator.evaluate_rule(business, rule)
-            if matched:
-                score += adjustment
-                adjustments.append(
-                    {
-                        "rule": rule.name,
-                        "description": rule.description,
-                        "adjustment": adjustment,
-                        "score_after": score,
-                    }
-                )
+        for rule in matched_rules:
+            score += rule.value
+            adjustments.append(
+                {
+                    "rule": rule.name,
+                    "description": rule.description,
+                    "adjustment": rule.value,
+                    "score_after": score,
+                }
+            )
 
         # Apply multipliers
         final_multiplier = 1.0
-        for multiplier in self.multipliers:
-            mult_value = self.evaluator.evaluate_multiplier(business, multiplier)
+        for multiplier in matched_multipliers:
+            mult_value = multiplier.value
             if mult_value != 1.0:
                 final_multiplier *= mult_value
                 applied_multipliers.append(
@@ -13,6 +13,7 @@ import yaml
 from leadfactory.utils.logging import get_logger
 from leadfactory.utils.metrics import LEADS_SCORED, MetricsTimer, record_metric
 
+from .rule_compiler import BusinessView, RuleCompiler
 from .rule_evaluator import RuleEvaluator
 from .simplified_yaml_parser import SimplifiedYamlParser
 from .yaml_parser import ScoringRulesParser
@@ -34,9 +35,12 @@ class UnifiedScoringEngine:
         self.legacy_parser = None
         self.simplified_parser = None
         self.evaluator = RuleEvaluator()
+        self.compiler = RuleCompiler(self.evaluator)
         self.config = None
         self.rules = []
         self.multipliers = []
+        self.compiled_rules = []
+        self.compiled_multipliers = []
         self.settings = None
 
         self.logger.info("Initialized UnifiedScoringEngine")
@@ -55,6 +59,11 @@ class UnifiedScoringEngine:
             else:
                 self._load_legacy_rules()
 
+            self.compiled_rules = self.compiler.compile_rules(self.rules)
+            self.compiled_multipliers = self.compiler.compile_multipliers(
+                self.multipliers
+            )
+
             self.logger.info(
                 f"Successfully loaded {len(self.rules)} rules and "
                 f"{len(self.multipliers)} multipliers in {self.format_type} format"
@@ -222,6 +231,7 @@ class UnifiedScoringEngine:
 
     def _create_rule_object(self, rule_dict: dict[str, Any]) -> Any:
         """Create a rule object that matches the expected interface."""
+        create_condition = self._create_condition_object
 
         # Create a simple object with the required attributes
         class UnifiedRule:
@@ -229,9 +239,7 @@ class UnifiedScoringEngine:
                 self.name = data["name"]
                 self.description = data.get("description", "")
                 self.score = data.get("score", 0)
-                self.condition = self._create_condition_object(
-                    data.get("condition", {})
-                )
+                self.condition = create_condition(data.get("condition", {}))
                 self.enabled = True
                 self.priority = data.get("priority", 0)
 
@@ -239,15 +247,14 @@ class UnifiedScoringEngine:
 
     def _create_multiplier_object(self, mult_dict: dict[str, Any]) -> Any:
         """Create a multiplier object that matches the expected interface."""
+        create_condition = self._create_condition_object
 
         class UnifiedMultiplier:
             def __init__(self, data):
                 self.name = data["name"]
                 self.description = data.get("description", "")
                 self.multiplier = data.get("multiplier", 1.0)
-                self.condition = self._create_condition_object(
-                    data.get("condition", {})
-                )
+                self.condition = create_condition(data.get("condition", {}))
                 self.enabled = True
 
         return UnifiedMultiplier(mult_dict)
@@ -273,7 +280,7 @@ class UnifiedScoringEngine:
         Returns:
             Dictionary containing score and scoring details
         """
-        if not self.rules:
+        if self.settings is None:
             raise RuntimeError("No rules loaded. Call load_rules() first.")
 
         with MetricsTimer(LEADS_SCORED, score_range="unknown"):
@@ -285,16 +292,17 @@ class UnifiedScoringEngine:
                 rule_scores = []
                 total_adjustment = 0
 
-                for rule in self.rules:
-                    if self.evaluator.evaluate_condition(rule.condition, business_data):
+                view = BusinessView(business_data)
+                for rule in self.compiled_rules:
+                    if rule.matches(view):
                         rule_scores.append(
                             {
                                 "rule": rule.name,
                                 "description": rule.description,
-                                "score_adjustment": rule.score,
+                                "score_adjustment": rule.value,
                             }
                         )
-                        total_adjustment += rule.score
+                        total_adjustment += rule.value
 
                 # Calculate preliminary score
                 preliminary_score = base_score + total_adjustment
@@ -303,18 +311,16 @@ class UnifiedScoringEngine:
                 final_multiplier = 1.0
                 applied_multipliers = []
 
-                for multiplier in self.multipliers:
-                    if self.evaluator.evaluate_condition(
-                        multiplier.condition, business_data
-                    ):
+                for multiplier in self.compiled_multipliers:
+                    if multiplier.matches(view):
                         applied_multipliers.append(
                             {
                                 "multiplier": multiplier.name,
                                 "description": multiplier.description,
-                                "factor": multiplier.multiplier,
+                                "factor": multiplier.value,
                             }
                         )
-                        final_multiplier *= multiplier.multiplier
+                        final_multiplier *= multiplier.value
 
                 # Calculate final score
                 final_score = preliminary_score * final_multiplier
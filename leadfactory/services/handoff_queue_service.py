@@ -8,12 +8,15 @@ Implements Feature 5 Extension: TR-4 Bulk Qualify for Handoff.
 """
 
 import json
+import threading
 import uuid
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Dict, List, Optional, Tuple
 
+from psycopg2.extras import execute_values
+
 from leadfactory.services.qualification_engine import (
     QualificationEngine,
     QualificationResult,
@@ -192,109 +195,105 @@ class HandoffQueueService:
         criteria_id: int,
         performed_by: Optional[str] = None,
         force_rescore: bool = False,
+        run_async: bool = False,
     ) -> str:
         """Qualify multiple businesses and add to handoff queue.
 
+        Businesses are qualified chunk by chunk. The qualified leads of each
+        chunk are added to the queue with one multi-row insert, and the
+        operation record is updated after every chunk so its progress can
+        be polled.
+
         Args:
             business_ids: List of business IDs to qualify
             criteria_id: Qualification criteria ID
             performed_by: User performing the operation
             force_rescore: Whether to force re-scoring businesses
+            run_async: Whether to return right away and qualify in a
+                background thread
 
         Returns:
             Operation ID for tracking
         """
         operation_id = str(uuid.uuid4())
 
-        try:
-            logger.info(f"Starting bulk qualification operation {operation_id}")
+        logger.info(f"Starting bulk qualification operation {operation_id}")
 
-            # Create operation record
-            operation = BulkOperation(
-                operation_id=operation_id,
-                operation_type=BulkOperationType.QUALIFY,
-                criteria_id=criteria_id,
-                business_ids=business_ids,
-                performed_by=performed_by,
-            )
+        # Create operation record
+        operation = BulkOperation(
+            operation_id=operation_id,
+            operation_type=BulkOperationType.QUALIFY,
+            criteria_id=criteria_id,
+            business_ids=business_ids,
+            performed_by=performed_by,
+        )
 
-            self._create_bulk_operation(operation)
+        self._create_bulk_operation(operation)
 
-            # Qualify businesses
-            qualification_results = self.qualification_engine.qualify_businesses_bulk(
-                business_ids, criteria_id, force_rescore
-            )
+        if run_async:
+            threading.Thread(
+                target=self._run_bulk_qualify,
+                args=(operation, force_rescore),
+                name=f"bulk-qualify-{operation_id}",
+                daemon=True,
+            ).start()
+            return operation_id
 
-            success_count = 0
-            failure_count = 0
+        self._run_bulk_qualify(operation, force_rescore, raise_errors=True)
+        return operation_id
 
-            for result in qualification_results:
-                try:
-                    if result.status.value == "qualified":
-                        # Add to handoff queue
-                        queue_entry = HandoffQueueEntry(
-                            id=None,
-                            business_id=result.business_id,
-                            qualification_criteria_id=criteria_id,
-                            qualification_score=result.score,
-                            qualification_details=result.details,
-                            priority=self._calculate_priority(result),
-                            notes=result.notes,
-                        )
+    def _run_bulk_qualify(
+        self,
+        operation: BulkOperation,
+        force_rescore: bool = False,
+        raise_errors: bool = False,
+    ) -> None:
+        """Qualify the businesses of a bulk operation and queue qualified leads.
 
-                        entry_id = self._add_to_queue(queue_entry)
-                        if entry_id:
-                            success_count += 1
-                            logger.debug(
-                                f"Added business {result.business_id} to handoff queue"
-                            )
-                        else:
-                            failure_count += 1
-                            logger.warning(
-                                f"Failed to add business {result.business_id} to queue"
-                            )
-                    else:
-                        # Business didn't qualify, still count as processed
-                        success_count += 1
-                        logger.debug(
-                            f"Business {result.business_id} did not qualify: {result.status.value}"
-                        )
+        Args:
+            operation: Bulk operation to run
+            force_rescore: Whether to force re-scoring businesses
+            raise_errors: Whether to re-raise an error after recording it
+        """
+        operation_id = operation.operation_id
+        operation.operation_details = {
+            "processed_count": 0,
+            "qualified_count": 0,
+            "rejected_count": 0,
+            "insufficient_data_count": 0,
+        }
 
-                except Exception as e:
-                    logger.error(
-                        f"Error processing qualification result for business {result.business_id}: {e}"
-                    )
-                    failure_count += 1
+        try:
+            for (
+                qualification_results
+            ) in self.qualification_engine.iter_qualification_chunks(
+                operation.business_ids, operation.criteria_id, force_rescore
+            ):
+                success_count, failure_count = self._queue_qualified_results(
+                    qualification_results, operation.criteria_id
+                )
+
+                # Record progress
+                operation.success_count += success_count
+                operation.failure_count += failure_count
+                details = operation.operation_details
+                details["processed_count"] += len(qualification_results)
+                for result in qualification_results:
+                    count_key = f"{result.status.value}_count"
+                    if count_key in details:
+                        details[count_key] += 1
+
+                self._update_bulk_operation(operation)
 
             # Update operation status
-            operation.success_count = success_count
-            operation.failure_count = failure_count
             operation.completed_at = datetime.utcnow()
             operation.status = "completed"
-            operation.operation_details = {
-                "qualified_count": len(
-                    [r for r in qualification_results if r.status.value == "qualified"]
-                ),
-                "rejected_count": len(
-                    [r for r in qualification_results if r.status.value == "rejected"]
-                ),
-                "insufficient_data_count": len(
-                    [
-                        r
-                        for r in qualification_results
-                        if r.status.value == "insufficient_data"
-                    ]
-                ),
-            }
-
             self._update_bulk_operation(operation)
 
             logger.info(
-                f"Bulk qualification {operation_id} completed: {success_count} success, {failure_count} failed"
+                f"Bulk qualification {operation_id} completed: {operation.success_count} success, {operation.failure_count} failed"
             )
 
-            return operation_id
-
         except Exception as e:
             logger.error(f"Error in bulk qualification {operation_id}: {e}")
 
@@ -307,7 +306,63 @@ class HandoffQueueService:
             except:
                 pass
 
-            raise
+            if raise_errors:
+                raise
+
+    def _queue_qualified_results(
+        self, qualification_results: List[QualificationResult], criteria_id: int
+    ) -> Tuple[int, int]:
+        """Add the qualified businesses of a chunk to the handoff queue.
+
+        Args:
+            qualification_results: Qualification results of one chunk
+            criteria_id: Qualification criteria ID
+
+        Returns:
+            Tuple of (success count, failure count)
+        """
+        success_count = 0
+        failure_count = 0
+        queue_entries = []
+
+        for result in qualification_results:
+            try:
+                if result.status.value == "qualified":
+                    queue_entries.append(
+                        HandoffQueueEntry(
+                            id=None,
+                            business_id=result.business_id,
+                            qualification_criteria_id=criteria_id,
+                            qualification_score=result.score,
+                            qualification_details=result.details,
+                            priority=self._calculate_priority(result),
+                            notes=result.notes,
+                        )
+                    )
+                else:
+                    # Business didn't qualify, still count as processed
+                    success_count += 1
+                    logger.debug(
+                        f"Business {result.business_id} did not qualify: {result.status.value}"
+                    )
+
+            except Exception as e:
+                logger.error(
+                    f"Error processing qualification result for business {result.business_id}: {e}"
+                )
+                failure_count += 1
+
+        if queue_entries:
+            entry_ids = self._add_to_queue_bulk(queue_entries)
+            added_count = len([entry_id for entry_id in entry_ids if entry_id])
+            success_count += added_count
+            failure_count += len(queue_entries) - added_count
+            if added_count < len(queue_entries):
+                logger.warning(
+                    f"Failed to add {len(queue_entries) - added_count} businesses to queue"
+                )
+
+        return success_count, failure_count
 
     def bulk_assign(
         self,
@@ -485,6 +540,58 @@ class HandoffQueueService:
             logger.error(f"Error adding to handoff queue: {e}")
             return None
 
+    def _add_to_queue_bulk(
+        self, queue_entries: List[HandoffQueueEntry]
+    ) -> List[Optional[int]]:
+        """Add many entries to the handoff queue with one multi-row insert.
+
+        Args:
+            queue_entries: Queue entries to add
+
+        Returns:
+            Created entry IDs in input order, all None if the insert failed
+        """
+        if not queue_entries:
+            return []
+
+        try:
+            with self.storage.cursor() as cursor:
+                rows = execute_values(
+                    cursor,
+                    """
+                    INSERT INTO handoff_queue
+                    (business_id, qualification_criteria_id, status, priority,
+                     qualification_score, qualification_details, notes,
+                     engagement_summary, source_campaign_id)
+                    VALUES %s
+                    RETURNING id
+                    """,
+                    [
+                        (
+                            queue_entry.business_id,
+                            queue_entry.qualification_criteria_id,
+                            queue_entry.status.value,
+                            queue_entry.priority,
+                            queue_entry.qualification_score,
+                            json.dumps(queue_entry.qualification_details),
+                            queue_entry.notes,
+                            json.dumps(queue_entry.engagement_summary),
+                            queue_entry.source_campaign_id,
+                        )
+                        for queue_entry in queue_entries
+                    ],
+                    page_size=len(queue_entries),
+                    fetch=True,
+                )
+
+                return [row[0] for row in rows]
+
+        except Exception as e:
+            logger.error(
+                f"Error adding {len(queue_entries)} entries to handoff queue: {e}"
+            )
+            return [None] * len(queue_entries)
+
     def get_queue_entry(self, entry_id: int) -> Optional[HandoffQueueEntry]:
         """Get handoff queue entry by ID.
 
@@ -25,6 +25,7 @@ from PIL import Image
 
 from leadfactory.storage import get_storage
 from leadfactory.storage.supabase_storage import SupabaseStorage
+from leadfactory.utils.metrics import ASSET_CACHE_BYTES_SAVED, record_metric
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +42,7 @@ class MockupUploadResult:
     upload_duration: Optional[float] = None
     error_message: Optional[str] = None
     retry_count: int = 0
+    deduplicated: bool = False
 
 
 @dataclass
@@ -67,6 +69,7 @@ class MockupPNGUploader:
     - CDN URL generation
     - Comprehensive error logging
     - Business linking and asset tracking
+    - Skips the upload of images already uploaded, found by content hash
     """
 
     def __init__(self, bucket_name: str = "mockups"):
@@ -131,6 +134,17 @@ class MockupPNGUploader:
                 logger.error(f"Input validation failed: {validation_error}")
                 return result
 
+            # An identical image that is already uploaded is linked, not
+            # uploaded again
+            content_hash = self._calculate_file_hash(png_path)
+            uploaded_asset = self._find_uploaded_mockup(content_hash)
+            if uploaded_asset:
+                self._reuse_uploaded_mockup(
+                    result, uploaded_asset, png_path, business_id, mockup_type
+                )
+                result.upload_duration = time.time() - start_time
+                return result
+
             # Validate and potentially optimize image
             processed_image_path = self._process_image(
                 png_path, optimize, max_width, quality
@@ -152,7 +166,11 @@ class MockupPNGUploader:
 
                 # Link to business in database
                 linking_success = self._link_to_business(
-                    business_id, upload_result["storage_path"], cdn_url, metadata
+                    business_id,
+                    upload_result["storage_path"],
+                    cdn_url,
+                    metadata,
+                    content_hash=content_hash,
                 )
 
                 if linking_success:
@@ -211,6 +229,67 @@ class MockupPNGUploader:
 
         return None
 
+    def _find_uploaded_mockup(self, content_hash: str) -> Optional[dict[str, Any]]:
+        """Find an uploaded mockup asset made from an identical image."""
+        if not hasattr(self.storage, "get_assets_by_content_hash"):
+            return None
+        try:
+            assets = self.storage.get_assets_by_content_hash(content_hash, "mockup")
+        except Exception as e:
+            logger.warning(f"Error looking up mockup by content hash: {e}")
+            return None
+        if not isinstance(assets, list):
+            return None
+
+        # Uploaded mockups have a bucket path; local renders have a file path
+        for asset in assets:
+            file_path = asset.get("file_path") or ""
+            if file_path.startswith("mockups/"):
+                return asset
+        return None
+
+    def _reuse_uploaded_mockup(
+        self,
+        result: MockupUploadResult,
+        asset: dict[str, Any],
+        png_path: Path,
+        business_id: int,
+        mockup_type: str,
+    ):
+        """Point a business at an already uploaded copy of its mockup."""
+        storage_path = asset["file_path"]
+        cdn_url = asset.get("url")
+        if not cdn_url or self._is_url_expired(str(asset.get("created_at"))):
+            cdn_url = self._generate_cdn_url(storage_path)
+
+        if asset.get("business_id") == business_id:
+            linked = True
+        else:
+            metadata = self._generate_metadata(png_path, business_id, mockup_type)
+            linked = self._link_to_business(
+                business_id,
+                storage_path,
+                cdn_url,
+                metadata,
+                content_hash=asset.get("content_hash"),
+            )
+
+        if not linked:
+            result.error_message = "Failed to link mockup to business in database"
+            return
+
+        file_size = png_path.stat().st_size
+        result.success = True
+        result.storage_path = storage_path
+        result.cdn_url = cdn_url
+        result.file_size = file_size
+        result.deduplicated = True
+        record_metric(ASSET_CACHE_BYTES_SAVED, file_size, asset_type="mockup")
+        logger.info(
+            f"Mockup for business {business_id} is already uploaded at "
+            f"{storage_path}, skipping upload"
+        )
+
     def _process_image(
         self, image_path: Path, optimize: bool, max_width: int, quality: int
     ) -> Path:
@@ -400,6 +479,7 @@ class MockupPNGUploader:
         storage_path: str,
         cdn_url: str,
         metadata: MockupImageMetadata,
+        content_hash: Optional[str] = None,
     ) -> bool:
         """Link the uploaded mockup to the business in the database."""
         try:
@@ -409,6 +489,7 @@ class MockupPNGUploader:
                 asset_type="mockup",
                 file_path=storage_path,
                 url=cdn_url,
+                content_hash=content_hash,
                 metadata={
                     "mockup_type": metadata.mockup_type,
                     "dimensions": f"{metadata.optimized_dimensions[0]}x{metadata.optimized_dimensions[1]}",
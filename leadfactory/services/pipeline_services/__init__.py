@@ -14,6 +14,7 @@ from .base_service import (
 from .dedupe_service import DedupeService, create_dedupe_service
 from .email_service import EmailService, create_email_service
 from .enrich_service import EnrichService, create_enrich_service
+from .in_memory_kafka import InMemoryKafkaBroker
 from .kafka_integration import (
     KafkaManager,
     WorkflowManager,
@@ -38,6 +39,7 @@ __all__ = [
     "orchestrator",
     # Messaging and workflows
     "KafkaManager",
+    "InMemoryKafkaBroker",
     "WorkflowManager",
     "kafka_manager",
     "workflow_manager",
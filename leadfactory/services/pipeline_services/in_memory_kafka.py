@@ -0,0 +1,429 @@
+"""
+In-process stand-in for a Kafka cluster.
+
+Implements the parts of the aiokafka producer and consumer API that
+KafkaManager uses, on top of per-partition logs held in memory, so pipeline
+consumers can be exercised and load-tested without a broker. Keys are
+hashed to partitions, producers buffer records for linger_ms and send them
+in batches, and consumer groups share partitions and commit offsets.
+Optional per-request latencies make round trips cost what they would on a
+real cluster.
+
+Limitations: everything runs on one event loop; partitions are assigned
+round-robin whenever a group member starts or stops; there is no
+retention, replication or transactions.
+"""
+
+import asyncio
+import time
+import zlib
+from collections import namedtuple
+from typing import Any, Callable, Optional
+
+try:
+    from aiokafka.errors import IllegalStateError, ProducerClosed
+except ImportError:
+
+    class IllegalStateError(Exception):
+        """Raised when committing a partition the consumer is not assigned."""
+
+    class ProducerClosed(Exception):
+        """Raised when sending through a stopped producer."""
+
+
+TopicPartition = namedtuple("TopicPartition", ["topic", "partition"])
+ConsumerRecord = namedtuple(
+    "ConsumerRecord", ["topic", "partition", "offset", "timestamp", "key", "value"]
+)
+RecordMetadata = namedtuple(
+    "RecordMetadata", ["topic", "partition", "offset", "timestamp"]
+)
+
+
+class InMemoryKafkaBroker:
+    """Topics, partition logs and committed offsets for one process."""
+
+    def __init__(
+        self,
+        topics: Optional[dict[str, int]] = None,
+        default_partitions: int = 4,
+        request_latency: float = 0.0,
+    ):
+        """
+        Initialize the broker.
+
+        Args:
+            topics: Partition count per topic; other topics are created on
+                first use with default_partitions
+            default_partitions: Partitions for topics created on first use
+            request_latency: Seconds each produce, fetch and commit request
+                takes, to model network round trips
+        """
+        self.default_partitions = default_partitions
+        self.request_latency = request_latency
+        self._logs: dict[TopicPartition, list[tuple]] = {}
+        self._partitions: dict[str, int] = {}
+        self._committed: dict[tuple[str, TopicPartition], int] = {}
+        self._groups: dict[str, list["InMemoryConsumer"]] = {}
+        self._round_robin = 0
+        self._data: Optional[asyncio.Event] = None
+        self.stats = {"produce_requests": 0, "fetch_requests": 0, "commits": 0}
+
+        for topic, partitions in (topics or {}).items():
+            self.create_topic(topic, partitions)
+
+    def create_topic(self, topic: str, partitions: Optional[int] = None) -> None:
+        """Create a topic if it does not exist yet."""
+        if topic in self._partitions:
+            return
+        self._partitions[topic] = partitions or self.default_partitions
+        for partition in range(self._partitions[topic]):
+            self._logs[TopicPartition(topic, partition)] = []
+
+    def partitions_for(self, topic: str) -> list[TopicPartition]:
+        """Partitions of a topic, creating it if needed."""
+        self.create_topic(topic)
+        return [
+            TopicPartition(topic, partition)
+            for partition in range(self._partitions[topic])
+        ]
+
+    def partition_for(self, topic: str, key: Optional[bytes]) -> int:
+        """Partition a record goes to: keyed by hash, else round-robin."""
+        self.create_topic(topic)
+        count = self._partitions[topic]
+        if key is None:
+            self._round_robin += 1
+            return self._round_robin % count
+        return zlib.crc32(key) % count
+
+    def end_offset(self, tp: TopicPartition) -> int:
+        """Offset the next record appended to a partition will get."""
+        return len(self._logs[tp])
+
+    def committed(self, group_id: str, tp: TopicPartition) -> Optional[int]:
+        """Offset committed by a consumer group, if any."""
+        return self._committed.get((group_id, tp))
+
+    def producer(self, **kwargs) -> "InMemoryProducer":
+        """Create a producer; accepts the aiokafka producer options used here."""
+        return InMemoryProducer(self, **kwargs)
+
+    def consumer(self, *topics: str, **kwargs) -> "InMemoryConsumer":
+        """Create a consumer; accepts the aiokafka consumer options used here."""
+        return InMemoryConsumer(self, topics, **kwargs)
+
+    async def _request(self, kind: str) -> None:
+        self.stats[kind] += 1
+        if self.request_latency:
+            await asyncio.sleep(self.request_latency)
+
+    def _append(self, topic: str, key: Optional[bytes], value: bytes) -> RecordMetadata:
+        tp = TopicPartition(topic, self.partition_for(topic, key))
+        timestamp = int(time.time() * 1000)
+        log = self._logs[tp]
+        log.append((key, value, timestamp))
+        return RecordMetadata(topic, tp.partition, len(log) - 1, timestamp)
+
+    def _notify(self) -> None:
+        if self._data is not None:
+            self._data.set()
+
+    async def _wait_for_data(self, timeout: float) -> None:
+        if self._data is None:
+            self._data = asyncio.Event()
+        self._data.clear()
+        try:
+            await asyncio.wait_for(self._data.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _join(self, consumer: "InMemoryConsumer") -> None:
+        self._groups.setdefault(consumer.group_id, []).append(consumer)
+        await self._rebalance(consumer.group_id)
+
+    async def _leave(self, consumer: "InMemoryConsumer") -> None:
+        members = self._groups.get(consumer.group_id, [])
+        if consumer in members:
+            members.remove(consumer)
+            consumer._positions = {}
+            await self._rebalance(consumer.group_id)
+
+    async def _rebalance(self, group_id: str) -> None:
+        """
+        Spread the group's partitions round-robin over its members.
+
+        Like a Kafka rebalance, every member gives up the partitions it is
+        losing (running its listener's on_partitions_revoked) before any
+        member is handed new ones.
+        """
+        members = list(self._groups.get(group_id, []))
+        if not members:
+            return
+        topics = sorted({topic for member in members for topic in member.topics})
+        partitions = [tp for topic in topics for tp in self.partitions_for(topic)]
+        assignments = [
+            partitions[index :: len(members)] for index in range(len(members))
+        ]
+        for member, assignment in zip(members, assignments):
+            await member._revoke(assignment)
+        for member, assignment in zip(members, assignments):
+            await member._assign(assignment)
+
+
+class InMemoryProducer:
+    """Producer that buffers records for linger_ms and sends them in batches."""
+
+    def __init__(
+        self,
+        broker: InMemoryKafkaBroker,
+        value_serializer: Optional[Callable[[Any], bytes]] = None,
+        linger_ms: int = 0,
+        max_batch_size: int = 16384,
+        **_options,
+    ):
+        self.broker = broker
+        self.value_serializer = value_serializer or (lambda value: value)
+        self.linger_ms = linger_ms
+        self.max_batch_size = max_batch_size
+        self._pending: list[tuple] = []
+        self._pending_bytes = 0
+        self._linger_task: Optional[asyncio.Task] = None
+        self._flushing: set[asyncio.Task] = set()
+        self._closed = False
+
+    async def start(self) -> None:
+        """Nothing to connect to."""
+        self._closed = False
+
+    async def stop(self) -> None:
+        """Send whatever is still buffered and refuse further sends."""
+        self._closed = True
+        await self.flush()
+
+    async def send(
+        self, topic: str, value: Any = None, key: Optional[bytes] = None
+    ) -> asyncio.Future:
+        """
+        Buffer a record.
+
+        Returns:
+            Future resolving to the record's RecordMetadata once its batch
+            has been sent
+        """
+        if self._closed:
+            raise ProducerClosed()
+        data = self.value_serializer(value)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((topic, key, data, future))
+        self._pending_bytes += len(data) + len(key or b"")
+
+        if self._pending_bytes >= self.max_batch_size or not self.linger_ms:
+            self._send_pending()
+        elif self._linger_task is None:
+            self._linger_task = asyncio.create_task(self._linger())
+        return future
+
+    async def send_and_wait(
+        self, topic: str, value: Any = None, key: Optional[bytes] = None
+    ) -> RecordMetadata:
+        """Send a record and wait until it is stored."""
+        return await (await self.send(topic, value=value, key=key))
+
+    async def flush(self) -> None:
+        """Send the buffered records and wait for every batch in flight."""
+        self._send_pending()
+        if self._flushing:
+            await asyncio.gather(*self._flushing)
+
+    async def _linger(self) -> None:
+        await asyncio.sleep(self.linger_ms / 1000)
+        self._linger_task = None
+        self._send_pending()
+
+    def _send_pending(self) -> None:
+        if self._linger_task is not None:
+            self._linger_task.cancel()
+            self._linger_task = None
+        if not self._pending:
+            return
+        batch, self._pending, self._pending_bytes = self._pending, [], 0
+        task = asyncio.create_task(self._send_batch(batch))
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def _send_batch(self, batch: list[tuple]) -> None:
+        await self.broker._request("produce_requests")
+        for topic, key, data, future in batch:
+            metadata = self.broker._append(topic, key, data)
+            if not future.done():
+                future.set_result(metadata)
+        self.broker._notify()
+
+
+class InMemoryConsumer:
+    """Consumer group member reading assigned partitions from the broker."""
+
+    def __init__(
+        self,
+        broker: InMemoryKafkaBroker,
+        topics: tuple[str, ...] = (),
+        group_id: str = "default",
+        value_deserializer: Optional[Callable[[bytes], Any]] = None,
+        auto_offset_reset: str = "latest",
+        **_options,
+    ):
+        self.broker = broker
+        self.topics = topics
+        self.group_id = group_id
+        self.value_deserializer = value_deserializer or (lambda value: value)
+        self.auto_offset_reset = auto_offset_reset
+        self._positions: dict[TopicPartition, int] = {}
+        self._revoking: set[TopicPartition] = set()
+        self._listener = None
+        self._next_partition = 0
+        self._started = False
+
+    def subscribe(self, topics: tuple[str, ...] = (), listener=None) -> None:
+        """Set the topics to consume and an optional rebalance listener."""
+        self.topics = tuple(topics)
+        self._listener = listener
+
+    async def start(self) -> None:
+        """Join the consumer group."""
+        for topic in self.topics:
+            self.broker.create_topic(topic)
+        self._started = True
+        await self.broker._join(self)
+
+    async def stop(self) -> None:
+        """Leave the consumer group."""
+        if self._started:
+            self._started = False
+            await self.broker._leave(self)
+
+    def assignment(self) -> set[TopicPartition]:
+        """Partitions currently assigned to this consumer."""
+        return set(self._positions)
+
+    def position(self, tp: TopicPartition) -> int:
+        """Offset of the next record this consumer will fetch."""
+        return self._positions[tp]
+
+    async def committed(self, tp: TopicPartition) -> Optional[int]:
+        """Offset committed for a partition by this consumer's group."""
+        return self.broker.committed(self.group_id, tp)
+
+    async def getmany(
+        self, timeout_ms: int = 0, max_records: Optional[int] = None
+    ) -> dict[TopicPartition, list[ConsumerRecord]]:
+        """
+        Fetch records from the assigned partitions.
+
+        Waits up to timeout_ms for records to arrive, then returns at most
+        max_records of them, grouped by partition.
+        """
+        deadline = time.monotonic() + timeout_ms / 1000
+        while True:
+            batch = self._fetch(max_records)
+            remaining = deadline - time.monotonic()
+            if batch or remaining <= 0 or not self._started:
+                break
+            await self.broker._wait_for_data(remaining)
+        await self.broker._request("fetch_requests")
+        return batch
+
+    async def getone(self) -> ConsumerRecord:
+        """Wait for the next record."""
+        while True:
+            batch = await self.getmany(timeout_ms=1000, max_records=1)
+            for records in batch.values():
+                return records[0]
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> ConsumerRecord:
+        if not self._started:
+            raise StopAsyncIteration
+        return await self.getone()
+
+    async def commit(self, offsets: Optional[dict[TopicPartition, int]] = None):
+        """Commit the given offsets, or the current position of every partition."""
+        if offsets is None:
+            offsets = dict(self._positions)
+        unassigned = set(offsets) - set(self._positions)
+        if unassigned:
+            raise IllegalStateError(
+                f"Partitions {sorted(unassigned)} are not assigned to this consumer"
+            )
+        await self.broker._request("commits")
+        for tp, offset in offsets.items():
+            self.broker._committed[(self.group_id, tp)] = offset
+
+    async def _revoke(self, keep: list[TopicPartition]) -> None:
+        revoked = set(self._positions) - set(keep)
+        if not revoked:
+            return
+        # Stop fetching from the partitions while the listener wraps them up
+        self._revoking = revoked
+        try:
+            if self._listener is not None:
+                await self._listener.on_partitions_revoked(revoked)
+        finally:
+            self._revoking = set()
+            for tp in revoked:
+                self._positions.pop(tp, None)
+
+    async def _assign(self, partitions: list[TopicPartition]) -> None:
+        positions = {}
+        for tp in partitions:
+            if tp in self._positions:
+                positions[tp] = self._positions[tp]
+                continue
+            committed = self.broker.committed(self.group_id, tp)
+            if committed is not None:
+                positions[tp] = committed
+            elif self.auto_offset_reset == "earliest":
+                positions[tp] = 0
+            else:
+                positions[tp] = self.broker.end_offset(tp)
+        assigned = set(positions) - set(self._positions)
+        self._positions = positions
+        if assigned and self._listener is not None:
+            await self._listener.on_partitions_assigned(assigned)
+
+    def _fetch(
+        self, max_records: Optional[int]
+    ) -> dict[TopicPartition, list[ConsumerRecord]]:
+        batch = {}
+        budget = max_records or float("inf")
+        # Start from a different partition each time so none is starved
+        partitions = sorted(set(self._positions) - self._revoking)
+        if partitions:
+            self._next_partition = (self._next_partition + 1) % len(partitions)
+            partitions = (
+                partitions[self._next_partition :] + partitions[: self._next_partition]
+            )
+        for tp in partitions:
+            if budget <= 0:
+                break
+            position = self._positions[tp]
+            log = self.broker._logs[tp]
+            entries = log[position : position + int(min(budget, len(log)))]
+            if not entries:
+                continue
+            batch[tp] = [
+                ConsumerRecord(
+                    tp.topic,
+                    tp.partition,
+                    position + index,
+                    timestamp,
+                    key,
+                    self.value_deserializer(value),
+                )
+                for index, (key, value, timestamp) in enumerate(entries)
+            ]
+            self._positions[tp] = position + len(entries)
+            budget -= len(entries)
+        return batch
@@ -8,22 +8,43 @@ event streaming, and workflow coordination.
 import asyncio
 import json
 import logging
+import os
 import uuid
+from collections import deque
 from dataclasses import asdict, dataclass
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 
 try:
-    from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
+    from aiokafka import (
+        AIOKafkaConsumer,
+        AIOKafkaProducer,
+        ConsumerRebalanceListener,
+    )
     from aiokafka.errors import KafkaError
 
     KAFKA_AVAILABLE = True
 except ImportError:
     KAFKA_AVAILABLE = False
+    KafkaError = Exception
+    ConsumerRebalanceListener = object
 
 
 logger = logging.getLogger(__name__)
 
+# Producer batching: wait up to linger_ms to fill a batch of up to
+# batch_bytes per partition before sending it
+KAFKA_PRODUCER_LINGER_MS = int(os.getenv("KAFKA_PRODUCER_LINGER_MS", "5"))
+KAFKA_PRODUCER_BATCH_BYTES = int(os.getenv("KAFKA_PRODUCER_BATCH_BYTES", "65536"))
+
+# Batched consumer: records per fetch (also the cap on records in flight),
+# concurrent handlers, and how long a fetch waits for records
+KAFKA_CONSUMER_MAX_RECORDS = int(os.getenv("KAFKA_CONSUMER_MAX_RECORDS", "500"))
+KAFKA_CONSUMER_CONCURRENCY = int(os.getenv("KAFKA_CONSUMER_CONCURRENCY", "16"))
+KAFKA_CONSUMER_FETCH_TIMEOUT_MS = int(
+    os.getenv("KAFKA_CONSUMER_FETCH_TIMEOUT_MS", "500")
+)
+
 
 @dataclass
 class PipelineMessage:
@@ -45,6 +66,136 @@ class PipelineMessage:
             self.message_id = str(uuid.uuid4())
 
 
+class OffsetTracker:
+    """
+    Tracks which fetched offsets have been handled, per partition.
+
+    Handlers finish out of order, but a partition can only be committed up
+    to its lowest offset still being processed; everything below that has
+    completed and everything from it on is redelivered after a restart.
+    """
+
+    def __init__(self):
+        """Initialize offset tracker."""
+        self._pending: dict[Any, deque] = {}
+        self._done: dict[Any, set[int]] = {}
+        self._fetched: dict[Any, int] = {}
+        self._committed: dict[Any, int] = {}
+
+    def track(self, tp: Any, offset: int) -> None:
+        """Record that an offset was fetched; offsets arrive in order."""
+        self._pending.setdefault(tp, deque()).append(offset)
+        self._done.setdefault(tp, set())
+        self._fetched[tp] = offset + 1
+
+    def complete(self, tp: Any, offset: int) -> None:
+        """Record that an offset has been handled."""
+        if tp not in self._pending:
+            # Partition was revoked while the record was in flight
+            return
+        pending, done = self._pending[tp], self._done[tp]
+        done.add(offset)
+        while pending and pending[0] in done:
+            done.discard(pending.popleft())
+
+    def commit_offsets(self, partitions: Optional[set] = None) -> dict[Any, int]:
+        """Commit position per partition, for partitions that moved."""
+        offsets = {}
+        for tp, pending in self._pending.items():
+            if partitions is not None and tp not in partitions:
+                continue
+            position = pending[0] if pending else self._fetched[tp]
+            if self._committed.get(tp) != position:
+                offsets[tp] = position
+        return offsets
+
+    def mark_committed(self, offsets: dict[Any, int]) -> None:
+        """Record offsets the broker accepted."""
+        self._committed.update(offsets)
+
+    def forget(self, partitions: set) -> None:
+        """Stop tracking partitions this consumer no longer owns."""
+        for tp in partitions:
+            for state in (self._pending, self._done, self._fetched, self._committed):
+                state.pop(tp, None)
+
+
+class _KeyedDispatcher:
+    """
+    Runs handlers concurrently, up to a limit, one at a time per key.
+
+    A record waits for the previous record with the same key to finish
+    before it takes a handler slot, so ordering holds within a key while
+    different keys proceed in parallel. Records without a key are not
+    ordered.
+    """
+
+    def __init__(self, concurrency: int):
+        self._slots = asyncio.Semaphore(concurrency)
+        self._tails: dict[Any, asyncio.Task] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._by_partition: dict[Any, set[asyncio.Task]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._tasks)
+
+    def submit(self, tp: Any, key: Any, func: Callable, *args) -> asyncio.Task:
+        key = (tp, key) if key is not None else None
+        previous = self._tails.get(key) if key is not None else None
+        task = asyncio.create_task(self._run(previous, func, *args))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        partition_tasks = self._by_partition.setdefault(tp, set())
+        partition_tasks.add(task)
+        task.add_done_callback(partition_tasks.discard)
+        if key is not None:
+            self._tails[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        return task
+
+    def _release(self, key: Any, task: asyncio.Task) -> None:
+        if self._tails.get(key) is task:
+            del self._tails[key]
+
+    async def _run(self, previous: Optional[asyncio.Task], func: Callable, *args):
+        if previous is not None:
+            await asyncio.wait([previous])
+        async with self._slots:
+            await func(*args)
+
+    async def wait_any(self) -> None:
+        if self._tasks:
+            await asyncio.wait(self._tasks, return_when=asyncio.FIRST_COMPLETED)
+
+    async def join(self, partitions: Optional[set] = None) -> None:
+        if partitions is None:
+            tasks = set(self._tasks)
+        else:
+            tasks = set().union(*(self._by_partition.get(tp, ()) for tp in partitions))
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def cancel(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await self.join()
+
+
+class _RevokedPartitionHandler(ConsumerRebalanceListener):
+    """Hands revoked partitions to a callback before they change owner."""
+
+    def __init__(self, on_revoked: Callable):
+        self._on_revoked = on_revoked
+
+    async def on_partitions_revoked(self, revoked):
+        if revoked:
+            await self._on_revoked(set(revoked))
+
+    async def on_partitions_assigned(self, assigned):
+        pass
+
+
 class KafkaManager:
     """
     Manages Kafka producers and consumers for pipeline processing.
@@ -53,13 +204,23 @@ class KafkaManager:
     and consuming them for distributed processing.
     """
 
-    def __init__(self, bootstrap_servers: str = "localhost:9092"):
-        """Initialize Kafka manager."""
+    def __init__(self, bootstrap_servers: str = "localhost:9092", broker=None):
+        """
+        Initialize Kafka manager.
+
+        Args:
+            bootstrap_servers: Kafka brokers to connect to
+            broker: Optional InMemoryKafkaBroker to use instead of a cluster,
+                for tests and load tests
+        """
         self.bootstrap_servers = bootstrap_servers
+        self.broker = broker
         self.producer = None
         self.consumers = {}
         self.topic_handlers = {}
         self.running = False
+        # Set by each batched consume loop once it has drained and committed
+        self._consume_loops_done: set[asyncio.Event] = set()
 
         # Pipeline topics configuration
         self.topics = {
@@ -73,25 +234,40 @@ class KafkaManager:
             "pipeline.errors": {"partitions": 1, "replication": 1},
         }
 
-        if not KAFKA_AVAILABLE:
+        if not self._clients_available:
             logger.warning("aiokafka not available, using mock implementation")
 
+    @property
+    def _clients_available(self) -> bool:
+        return KAFKA_AVAILABLE or self.broker is not None
+
     async def start(self):
         """Start Kafka connections."""
-        if not KAFKA_AVAILABLE:
+        if not self._clients_available:
             logger.info("Kafka mock mode - no actual connections")
             self.running = True
             return
 
         try:
-            # Initialize producer
-            self.producer = AIOKafkaProducer(
-                bootstrap_servers=self.bootstrap_servers,
-                value_serializer=lambda v: json.dumps(v, default=str).encode("utf-8"),
-                compression_type="gzip",
-                acks="all",
-                retries=3,
-            )
+            # Initialize producer; records are batched per partition for up
+            # to linger_ms instead of being sent one request at a time
+            producer_options = {
+                "value_serializer": lambda v: json.dumps(v, default=str).encode(
+                    "utf-8"
+                ),
+                "linger_ms": KAFKA_PRODUCER_LINGER_MS,
+                "max_batch_size": KAFKA_PRODUCER_BATCH_BYTES,
+            }
+            if self.broker is not None:
+                self.producer = self.broker.producer(**producer_options)
+            else:
+                self.producer = AIOKafkaProducer(
+                    bootstrap_servers=self.bootstrap_servers,
+                    compression_type="gzip",
+                    acks="all",
+                    retries=3,
+                    **producer_options,
+                )
             await self.producer.start()
 
             self.running = True
@@ -103,14 +279,21 @@ class KafkaManager:
 
     async def stop(self):
         """Stop Kafka connections."""
-        if not KAFKA_AVAILABLE:
+        if not self._clients_available:
             self.running = False
             return
 
         self.running = False
 
+        # Batched consumers finish their in-flight records, which may publish
+        # retries, and commit them before any client is stopped
+        if self._consume_loops_done:
+            await asyncio.gather(
+                *(done.wait() for done in list(self._consume_loops_done))
+            )
+
         # Stop all consumers
-        for consumer in self.consumers.values():
+        for consumer in list(self.consumers.values()):
             await consumer.stop()
 
         # Stop producer
@@ -119,6 +302,44 @@ class KafkaManager:
 
         logger.info("Kafka manager stopped")
 
+    def _create_consumer(
+        self,
+        topics: list[str],
+        consumer_group: str,
+        auto_offset_reset: str,
+        listener: Optional[ConsumerRebalanceListener] = None,
+    ):
+        """Create a manually committed consumer for the given topics."""
+        consumer_options = {
+            "group_id": consumer_group,
+            "value_deserializer": lambda m: json.loads(m.decode("utf-8")),
+            "auto_offset_reset": auto_offset_reset,
+            "enable_auto_commit": False,
+        }
+        if self.broker is not None:
+            consumer = self.broker.consumer(**consumer_options)
+        else:
+            consumer = AIOKafkaConsumer(
+                bootstrap_servers=self.bootstrap_servers, **consumer_options
+            )
+        consumer.subscribe(topics=topics, listener=listener)
+        return consumer
+
+    @staticmethod
+    def _message_key(message: PipelineMessage) -> bytes:
+        """
+        Partition key for a message.
+
+        Keyed by business so one business's tasks stay in order on one
+        partition while different businesses spread across all of them;
+        workflow tasks are keyed by execution.
+        """
+        for field in ("business_id", "execution_id"):
+            value = message.payload.get(field)
+            if value is not None:
+                return str(value).encode("utf-8")
+        return message.message_id.encode("utf-8")
+
     async def publish_task(
         self,
         task_type: str,
@@ -148,13 +369,10 @@ class KafkaManager:
             max_retries=max_retries,
         )
 
-        if KAFKA_AVAILABLE and self.producer and self.running:
+        if self._clients_available and self.producer and self.running:
             try:
-                # Use priority as partition key for load balancing
-                partition_key = str(priority).encode("utf-8")
-
                 await self.producer.send_and_wait(
-                    topic, value=asdict(message), key=partition_key
+                    topic, value=asdict(message), key=self._message_key(message)
                 )
 
                 logger.debug(f"Published task {message.message_id} to {topic}")
@@ -168,6 +386,62 @@ class KafkaManager:
 
         return message.message_id
 
+    async def publish_tasks(
+        self,
+        task_type: str,
+        payloads: list[dict[str, Any]],
+        priority: int = 5,
+        max_retries: int = 3,
+    ) -> list[str]:
+        """
+        Publish many pipeline tasks, letting the producer batch them.
+
+        All records are handed to the producer before waiting on any, so
+        they go out in a few batched requests rather than one round trip
+        per task.
+
+        Args:
+            task_type: Type of task (scrape, enrich, etc.)
+            payloads: Task data, one task per payload
+            priority: Priority level (1-10, lower is higher priority)
+            max_retries: Maximum retry attempts
+
+        Returns:
+            Message IDs, in payload order
+        """
+        topic = f"{task_type}.requests"
+
+        messages = [
+            PipelineMessage(
+                message_id=str(uuid.uuid4()),
+                task_type=task_type,
+                payload=payload,
+                priority=priority,
+                max_retries=max_retries,
+            )
+            for payload in payloads
+        ]
+
+        if self._clients_available and self.producer and self.running:
+            try:
+                deliveries = [
+                    await self.producer.send(
+                        topic, value=asdict(message), key=self._message_key(message)
+                    )
+                    for message in messages
+                ]
+                await asyncio.gather(*deliveries)
+
+                logger.debug(f"Published {len(messages)} tasks to {topic}")
+
+            except KafkaError as e:
+                logger.error(f"Failed to publish tasks to {topic}: {e}")
+                raise
+        else:
+            logger.info(f"Mock publish: {len(messages)} {task_type} tasks")
+
+        return [message.message_id for message in messages]
+
     async def subscribe_to_tasks(
         self,
         task_types: list[str],
@@ -182,20 +456,13 @@ class KafkaManager:
             handler: Async function to process messages
             consumer_group: Kafka consumer group ID
         """
-        if not KAFKA_AVAILABLE:
+        if not self._clients_available:
             logger.info(f"Mock subscription to {task_types}")
             return
 
         topics = [f"{task_type}.requests" for task_type in task_types]
 
-        consumer = AIOKafkaConsumer(
-            *topics,
-            bootstrap_servers=self.bootstrap_servers,
-            group_id=consumer_group,
-            value_deserializer=lambda m: json.loads(m.decode("utf-8")),
-            auto_offset_reset="latest",
-            enable_auto_commit=False,
-        )
+        consumer = self._create_consumer(topics, consumer_group, "latest")
 
         try:
             await consumer.start()
@@ -238,13 +505,208 @@ class KafkaManager:
         finally:
             await consumer.stop()
 
+    async def consume_tasks_batched(
+        self,
+        task_types: list[str],
+        handler: Callable[[PipelineMessage], Any],
+        consumer_group: str = "pipeline_workers",
+        max_records: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        fetch_timeout_ms: Optional[int] = None,
+        auto_offset_reset: str = "latest",
+    ) -> dict[str, int]:
+        """
+        Consume pipeline tasks in batches with concurrent handlers.
+
+        High-throughput alternative to subscribe_to_tasks. Records are
+        fetched up to max_records at a time and handled by up to
+        concurrency handlers at once; records with the same key (the same
+        business) are still handled one after another in offset order.
+        Offsets are committed once per fetch, up to the lowest record still
+        in flight on each partition, so a crash redelivers unfinished work
+        (at-least-once, as before). When a rebalance revokes partitions,
+        their dispatched records are finished and committed before the
+        partitions move to another member. Failed messages are retried or
+        sent to the error topic exactly like subscribe_to_tasks does.
+
+        Runs until stop() is called; stop() waits for it to finish the
+        records in flight and commit them before closing the clients.
+
+        Args:
+            task_types: List of task types to consume
+            handler: Async function to process messages
+            consumer_group: Kafka consumer group ID
+            max_records: Records per fetch and cap on records in flight
+            concurrency: Handlers running at once
+            fetch_timeout_ms: How long a fetch waits for records
+            auto_offset_reset: Where a new consumer group starts reading
+
+        Returns:
+            Counts of batches fetched, messages processed and failed, and
+            offset commits
+        """
+        stats = {"batches": 0, "processed": 0, "failed": 0, "commits": 0}
+        if not self._clients_available:
+            logger.info(f"Mock subscription to {task_types}")
+            return stats
+
+        max_records = max_records or KAFKA_CONSUMER_MAX_RECORDS
+        fetch_timeout_ms = fetch_timeout_ms or KAFKA_CONSUMER_FETCH_TIMEOUT_MS
+        topics = [f"{task_type}.requests" for task_type in task_types]
+
+        tracker = OffsetTracker()
+        dispatcher = _KeyedDispatcher(concurrency or KAFKA_CONSUMER_CONCURRENCY)
+
+        async def process(tp, record):
+            if await self._process_record(record, handler, stats):
+                tracker.complete(tp, record.offset)
+
+        async def release_partitions(revoked):
+            # Let the records already dispatched for these partitions finish
+            # and commit them while this member still owns the partitions;
+            # committing them later would fail, or roll back the new owner
+            await dispatcher.join(revoked)
+            offsets = tracker.commit_offsets(revoked)
+            if offsets:
+                try:
+                    await consumer.commit(offsets)
+                    stats["commits"] += 1
+                except KafkaError as e:
+                    logger.warning(f"Commit of revoked partitions failed: {e}")
+            tracker.forget(revoked)
+
+        consumer = self._create_consumer(
+            topics,
+            consumer_group,
+            auto_offset_reset,
+            listener=_RevokedPartitionHandler(release_partitions),
+        )
+
+        loop_done = asyncio.Event()
+        self._consume_loops_done.add(loop_done)
+        drained = False
+        try:
+            await consumer.start()
+            self.consumers[consumer_group] = consumer
+
+            logger.info(
+                f"Started batched consumer {consumer_group} for topics: {topics}"
+            )
+
+            while self.running:
+                # Hold at most max_records in memory
+                while dispatcher.in_flight >= max_records:
+                    await dispatcher.wait_any()
+
+                batch = await consumer.getmany(
+                    timeout_ms=fetch_timeout_ms,
+                    max_records=max_records - dispatcher.in_flight,
+                )
+                if batch:
+                    stats["batches"] += 1
+
+                for tp, records in batch.items():
+                    for record in records:
+                        tracker.track(tp, record.offset)
+                        dispatcher.submit(tp, record.key, process, tp, record)
+
+                try:
+                    await self._commit_completed(consumer, tracker, stats)
+                except KafkaError as e:
+                    # Offsets stay tracked; the next batch commits them
+                    logger.warning(f"Offset commit for {consumer_group} failed: {e}")
+
+            await dispatcher.join()
+            drained = True
+
+        except Exception as e:
+            logger.error(f"Consumer {consumer_group} error: {e}")
+        finally:
+            try:
+                if not drained:
+                    await dispatcher.cancel()
+                try:
+                    await self._commit_completed(consumer, tracker, stats)
+                except Exception as e:
+                    logger.error(f"Final commit for {consumer_group} failed: {e}")
+                await consumer.stop()
+            finally:
+                # stop() waits on this event, so it must be set however the
+                # loop ended
+                if self.consumers.get(consumer_group) is consumer:
+                    del self.consumers[consumer_group]
+                self._consume_loops_done.discard(loop_done)
+                loop_done.set()
+
+        return stats
+
+    async def _process_record(
+        self,
+        record: Any,
+        handler: Callable[[PipelineMessage], Any],
+        stats: dict[str, int],
+    ) -> bool:
+        """
+        Handle one consumed record.
+
+        Returns:
+            True once the record is settled (handled, retried or sent to the
+            error topic) and its offset may be committed
+        """
+        try:
+            pipeline_message = PipelineMessage(**record.value)
+        except TypeError as e:
+            logger.error(
+                f"Skipping malformed message at {record.topic}[{record.partition}]"
+                f"@{record.offset}: {e}"
+            )
+            stats["failed"] += 1
+            return True
+
+        try:
+            await handler(pipeline_message)
+            stats["processed"] += 1
+            logger.debug(f"Processed message {pipeline_message.message_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            stats["failed"] += 1
+            error = str(e)
+
+        try:
+            if pipeline_message.retry_count < pipeline_message.max_retries:
+                pipeline_message.retry_count += 1
+                await self.publish_retry(pipeline_message)
+            else:
+                await self.publish_error(pipeline_message, error)
+            return True
+        except KafkaError as publish_error:
+            # Leave the offset uncommitted so the message is redelivered
+            logger.error(
+                f"Could not requeue message {pipeline_message.message_id}: "
+                f"{publish_error}"
+            )
+            return False
+
+    async def _commit_completed(
+        self, consumer: Any, tracker: OffsetTracker, stats: dict[str, int]
+    ):
+        """Commit every partition up to its lowest offset still in flight."""
+        offsets = tracker.commit_offsets()
+        if not offsets:
+            return
+        await consumer.commit(offsets)
+        tracker.mark_committed(offsets)
+        stats["commits"] += 1
+
     async def publish_retry(self, message: PipelineMessage):
         """Publish a message for retry."""
         topic = f"{message.task_type}.requests"
 
-        if KAFKA_AVAILABLE and self.producer:
+        if self._clients_available and self.producer:
             await self.producer.send_and_wait(
-                topic, value=asdict(message), key=str(message.priority).encode("utf-8")
+                topic, value=asdict(message), key=self._message_key(message)
             )
 
         logger.info(
@@ -259,7 +721,7 @@ class KafkaManager:
             "failed_at": datetime.utcnow().isoformat(),
         }
 
-        if KAFKA_AVAILABLE and self.producer:
+        if self._clients_available and self.producer:
             await self.producer.send_and_wait("pipeline.errors", value=error_data)
 
         logger.error(f"Message {message.message_id} failed permanently: {error}")
@@ -273,7 +735,7 @@ class KafkaManager:
             "event_id": str(uuid.uuid4()),
         }
 
-        if KAFKA_AVAILABLE and self.producer:
+        if self._clients_available and self.producer:
             await self.producer.send_and_wait("pipeline.events", value=event_data)
 
         logger.debug(f"Published event: {event_type}")
@@ -9,7 +9,9 @@ import asyncio
 import contextlib
 import json
 import logging
-from dataclasses import asdict, dataclass
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, replace
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -30,6 +32,7 @@ class PipelineStage:
     timeout_seconds: int = 300
     retry_attempts: int = 3
     required: bool = True
+    max_concurrency: int = 4  # Batches in flight at once when streaming
 
 
 @dataclass
@@ -41,6 +44,10 @@ class WorkflowDefinition:
     stages: list[PipelineStage]
     global_timeout_seconds: int = 3600
     parallel_execution: bool = False
+    streaming: bool = False
+    stream_batch_size: int = 25  # Business IDs per downstream request
+    stream_input_key: str = "zip_codes"  # Input list split across source stages
+    stream_linger_seconds: float = 0.5  # Longest a partial batch waits
 
 
 class PipelineOrchestrator:
@@ -115,6 +122,9 @@ class PipelineOrchestrator:
         )
 
         self.workflows["default"] = default_workflow
+        self.workflows["streaming"] = replace(
+            default_workflow, name="lead_processing_streaming", streaming=True
+        )
 
     async def execute_workflow(
         self,
@@ -158,8 +168,16 @@ class PipelineOrchestrator:
 
         try:
             # Execute stages in dependency order
-            if workflow.parallel_execution:
-                result = await self._execute_stages_parallel(execution_context)
+            if workflow.streaming:
+                result = await asyncio.wait_for(
+                    self._execute_stages_streaming(execution_context),
+                    workflow.global_timeout_seconds,
+                )
+            elif workflow.parallel_execution:
+                result = await asyncio.wait_for(
+                    self._execute_stages_parallel(execution_context),
+                    workflow.global_timeout_seconds,
+                )
             else:
                 result = await self._execute_stages_sequential(execution_context)
 
@@ -221,6 +239,170 @@ class PipelineOrchestrator:
 
         return results
 
+    async def _execute_stages_parallel(self, context: dict[str, Any]) -> dict[str, Any]:
+        """
+        Execute workflow stages as soon as their dependencies complete.
+
+        Independent stages run concurrently. Missing or failed dependencies
+        are handled as in _execute_stages_sequential: a required stage fails
+        the workflow, an optional one is skipped.
+        """
+        workflow = context["workflow"]
+        pending = self._runnable_stages(workflow)
+        stage_names = {stage.name for stage in pending}
+        running: dict[asyncio.Task, PipelineStage] = {}
+        unavailable = {s.name for s in workflow.stages} - stage_names
+        results = {}
+
+        try:
+            while pending or running:
+                # Start every stage whose dependencies have all completed;
+                # a skipped stage may make later ones unrunnable in turn
+                changed = True
+                while changed:
+                    changed = False
+                    for stage in list(pending):
+                        missing = [
+                            dep for dep in stage.dependencies if dep in unavailable
+                        ]
+                        if missing:
+                            pending.remove(stage)
+                            unavailable.add(stage.name)
+                            changed = True
+                            if stage.required:
+                                raise RuntimeError(
+                                    f"Stage {stage.name} dependency {missing[0]} not satisfied"
+                                )
+                            logger.warning(
+                                f"Skipping optional stage {stage.name} due to missing dependency {missing[0]}"
+                            )
+                        elif all(
+                            dep in context["stages_completed"]
+                            for dep in stage.dependencies
+                        ):
+                            pending.remove(stage)
+                            task = asyncio.create_task(
+                                self._execute_timed_stage(stage, context, dict(results))
+                            )
+                            running[task] = stage
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    stage = running.pop(task)
+                    try:
+                        stage_result = task.result()
+                    except Exception as e:
+                        context["stages_failed"].append(stage.name)
+                        unavailable.add(stage.name)
+
+                        if stage.required:
+                            logger.error(f"Required stage {stage.name} failed: {e}")
+                            raise
+                        logger.warning(f"Optional stage {stage.name} failed: {e}")
+                        results[stage.name] = {"error": str(e), "status": "failed"}
+                    else:
+                        results[stage.name] = stage_result
+                        context["stages_completed"].append(stage.name)
+                        context["stage_results"][stage.name] = stage_result
+                        logger.info(f"Stage {stage.name} completed successfully")
+        finally:
+            for task in running:
+                task.cancel()
+
+        return results
+
+    async def _execute_timed_stage(
+        self,
+        stage: PipelineStage,
+        context: dict[str, Any],
+        previous_results: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Execute a stage and record how long it took."""
+        started = time.monotonic()
+        try:
+            return await self._execute_stage(stage, context, previous_results)
+        finally:
+            context.setdefault("stage_metrics", {})[stage.name] = {
+                "duration_seconds": time.monotonic() - started
+            }
+
+    async def _execute_stages_streaming(
+        self, context: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Execute workflow stages as a stream of business ID micro-batches.
+
+        Source stages are called once per item of the workflow's
+        stream_input_key input, and every business ID they return flows on
+        to the dependent stages in batches of stream_batch_size, so scraping,
+        enrichment, scoring, mockups and emails overlap instead of each
+        waiting for the whole previous stage.
+        """
+        return await _StreamingRun(self, context).run()
+
+    def _runnable_stages(self, workflow: WorkflowDefinition) -> list[PipelineStage]:
+        """
+        Order stages topologically, leaving out ones that cannot run.
+
+        Stages whose dependencies are not part of the workflow, directly or
+        through a skipped stage, are skipped when optional and fail the
+        workflow when required.
+        """
+        stages = {stage.name: stage for stage in workflow.stages}
+
+        # Kahn's algorithm, as in PipelineDAG.topological_sort
+        in_degree = {
+            stage.name: len([dep for dep in stage.dependencies if dep in stages])
+            for stage in workflow.stages
+        }
+        dependents = defaultdict(list)
+        for stage in workflow.stages:
+            for dep in stage.dependencies:
+                if dep in stages:
+                    dependents[dep].append(stage.name)
+
+        queue = deque(name for name, degree in in_degree.items() if degree == 0)
+        order = []
+        while queue:
+            name = queue.popleft()
+            order.append(stages[name])
+            for dependent in dependents[name]:
+                in_degree[dependent] -= 1
+                if in_degree[dependent] == 0:
+                    queue.append(dependent)
+
+        if len(order) != len(stages):
+            remaining = sorted(set(stages) - {stage.name for stage in order})
+            raise ValueError(
+                f"Workflow {workflow.name} has a dependency cycle between stages: "
+                f"{remaining}"
+            )
+
+        runnable = []
+        skipped = set()
+        for stage in order:
+            missing = [
+                dep for dep in stage.dependencies if dep not in stages or dep in skipped
+            ]
+            if not missing:
+                runnable.append(stage)
+            elif stage.required:
+                raise RuntimeError(
+                    f"Stage {stage.name} dependency {missing[0]} not satisfied"
+                )
+            else:
+                logger.warning(
+                    f"Skipping optional stage {stage.name} due to missing dependency {missing[0]}"
+                )
+                skipped.add(stage.name)
+
+        return runnable
+
     async def _execute_stage(
         self,
         stage: PipelineStage,
@@ -228,10 +410,6 @@ class PipelineOrchestrator:
         previous_results: dict[str, Any],
     ) -> dict[str, Any]:
         """Execute a single pipeline stage."""
-        service_info = self.registry.get_service(stage.service_name)
-        if not service_info:
-            raise RuntimeError(f"Service {stage.service_name} not found in registry")
-
         # Prepare request data
         request_data = {
             "task_id": f"{context['execution_id']}_{stage.name}",
@@ -243,26 +421,25 @@ class PipelineOrchestrator:
             },
         }
 
+        return await self._call_service(stage, request_data)
+
+    async def _call_service(
+        self, stage: PipelineStage, request_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Send a task to a stage's service, retrying with backoff."""
+        service_info = self.registry.get_service(stage.service_name)
+        if not service_info:
+            raise RuntimeError(f"Service {stage.service_name} not found in registry")
+
         # Make HTTP request to service
         service_url = f"http://{service_info['host']}:{service_info['port']}/process"
 
         for attempt in range(stage.retry_attempts + 1):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        service_url,
-                        json=request_data,
-                        timeout=aiohttp.ClientTimeout(total=stage.timeout_seconds),
-                    ) as response:
-                        response.raise_for_status()
-                        result = await response.json()
-
-                        if result["status"] == "success":
-                            return result["result"]
-                        else:
-                            raise RuntimeError(
-                                f"Stage failed: {result.get('error', 'Unknown error')}"
-                            )
+                return await asyncio.wait_for(
+                    self._post_task(service_url, request_data, stage.timeout_seconds),
+                    stage.timeout_seconds,
+                )
 
             except Exception as e:
                 if attempt < stage.retry_attempts:
@@ -276,6 +453,26 @@ class PipelineOrchestrator:
                         f"Stage {stage.name} failed after {stage.retry_attempts} retries: {e}"
                     )
 
+    async def _post_task(
+        self, service_url: str, request_data: dict[str, Any], timeout_seconds: int
+    ) -> dict[str, Any]:
+        """Post one task to a service and return its result."""
+        async with aiohttp.ClientSession() as session:
+            async with session.post(
+                service_url,
+                json=request_data,
+                timeout=aiohttp.ClientTimeout(total=timeout_seconds),
+            ) as response:
+                response.raise_for_status()
+                result = await response.json()
+
+                if result["status"] == "success":
+                    return result["result"]
+                else:
+                    raise RuntimeError(
+                        f"Stage failed: {result.get('error', 'Unknown error')}"
+                    )
+
     async def _cleanup_execution(self, execution_id: str, delay: int = 3600):
         """Clean up execution context after delay."""
         await asyncio.sleep(delay)
@@ -323,6 +520,283 @@ class PipelineOrchestrator:
         return health_status
 
 
+class _StreamingRun:
+    """State of one streaming workflow execution."""
+
+    def __init__(self, orchestrator: PipelineOrchestrator, context: dict[str, Any]):
+        self.orchestrator = orchestrator
+        self.context = context
+        self.workflow: WorkflowDefinition = context["workflow"]
+        self.stages = orchestrator._runnable_stages(self.workflow)
+
+        self.dependents: dict[str, list[str]] = {s.name: [] for s in self.stages}
+        for stage in self.stages:
+            for dep in stage.dependencies:
+                self.dependents[dep].append(stage.name)
+        self.sinks = {s.name for s in self.stages if not self.dependents[s.name]}
+
+        self.inboxes: dict[str, asyncio.Queue] = {}
+        self.semaphores: dict[str, asyncio.Semaphore] = {}
+        self.stage_metrics = {
+            stage.name: {
+                "batches": 0,
+                "failed_batches": 0,
+                "processed": 0,
+                "failed": 0,
+                "busy_seconds": 0.0,
+            }
+            for stage in self.stages
+        }
+        self.batch_count = 0
+        self.start_time = 0.0
+        self.first_seen: dict[Any, float] = {}
+        self.sink_hits: dict[Any, int] = defaultdict(int)
+        self.latencies: list[float] = []
+        self.first_completion: Optional[float] = None
+
+    async def run(self) -> dict[str, Any]:
+        """Run every stage until the sources are exhausted and drained."""
+        self.start_time = time.monotonic()
+        for stage in self.stages:
+            self.inboxes[stage.name] = asyncio.Queue()
+            self.semaphores[stage.name] = asyncio.Semaphore(
+                max(1, stage.max_concurrency)
+            )
+
+        tasks = [
+            asyncio.create_task(
+                self._run_stage(stage)
+                if stage.dependencies
+                else self._run_source(stage)
+            )
+            for stage in self.stages
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return self._summarize()
+
+    async def _run_source(self, stage: PipelineStage) -> None:
+        """Call a source stage once per item of the streamed input."""
+        input_data = self.context["input_data"]
+        items = input_data.get(self.workflow.stream_input_key)
+        if isinstance(items, list) and items:
+            requests = [
+                {**input_data, self.workflow.stream_input_key: [item]} for item in items
+            ]
+        else:
+            requests = [dict(input_data)]
+
+        inflight: set[asyncio.Task] = set()
+        for metadata in requests:
+            await self._dispatch(stage, None, metadata, inflight)
+        if inflight:
+            await asyncio.gather(*list(inflight))
+        self._close(stage)
+
+    async def _run_stage(self, stage: PipelineStage) -> None:
+        """Batch business IDs as upstream stages emit them."""
+        inbox = self.inboxes[stage.name]
+        batch_size = max(1, self.workflow.stream_batch_size)
+        expected = len(stage.dependencies)
+        open_upstreams = expected
+        arrivals: dict[Any, int] = defaultdict(int)
+        pending: list = []
+        deadline = 0.0
+        inflight: set[asyncio.Task] = set()
+
+        while open_upstreams:
+            try:
+                if pending:
+                    item = await asyncio.wait_for(
+                        inbox.get(), max(0.0, deadline - time.monotonic())
+                    )
+                else:
+                    item = await inbox.get()
+            except asyncio.TimeoutError:
+                # Don't hold a partial batch back while upstream is slow
+                await self._dispatch(stage, pending, None, inflight)
+                pending = []
+                continue
+
+            if item is None:
+                open_upstreams -= 1
+                continue
+
+            for business_id in item:
+                # A lead is ready once every dependency has passed it on
+                arrivals[business_id] += 1
+                if arrivals[business_id] == expected:
+                    del arrivals[business_id]
+                    if not pending:
+                        deadline = (
+                            time.monotonic() + self.workflow.stream_linger_seconds
+                        )
+                    pending.append(business_id)
+
+            while len(pending) >= batch_size:
+                await self._dispatch(stage, pending[:batch_size], None, inflight)
+                pending = pending[batch_size:]
+                deadline = time.monotonic() + self.workflow.stream_linger_seconds
+
+        if pending:
+            await self._dispatch(stage, pending, None, inflight)
+        if inflight:
+            await asyncio.gather(*list(inflight))
+        self._close(stage)
+
+    async def _dispatch(
+        self,
+        stage: PipelineStage,
+        business_ids: Optional[list],
+        metadata: Optional[dict[str, Any]],
+        inflight: set,
+    ) -> None:
+        """Start a batch once the stage has a free concurrency slot."""
+        semaphore = self.semaphores[stage.name]
+        await semaphore.acquire()
+        task = asyncio.create_task(
+            self._process_batch(stage, business_ids, metadata, semaphore)
+        )
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
+
+    async def _process_batch(
+        self,
+        stage: PipelineStage,
+        business_ids: Optional[list],
+        metadata: Optional[dict[str, Any]],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        metrics = self.stage_metrics[stage.name]
+        try:
+            self.batch_count += 1
+            if metadata is None:
+                metadata = {**self.context["input_data"], "business_ids": business_ids}
+            request_data = {
+                "task_id": (
+                    f"{self.context['execution_id']}_{stage.name}_{self.batch_count}"
+                ),
+                "priority": 5,
+                "metadata": {**metadata, "stage_name": stage.name},
+            }
+
+            started = time.monotonic()
+            try:
+                result = await self.orchestrator._call_service(stage, request_data)
+            except Exception as e:
+                metrics["failed_batches"] += 1
+                metrics["failed"] += len(business_ids or [])
+                metrics["last_error"] = str(e)
+                logger.warning(f"Stage {stage.name} batch failed: {e}")
+                # Leads that failed an optional stage carry on without it
+                output = [] if stage.required else list(business_ids or [])
+            else:
+                metrics["processed"] += len(business_ids or [])
+                output = self._output_ids(result, business_ids)
+            finally:
+                metrics["batches"] += 1
+                metrics["busy_seconds"] += time.monotonic() - started
+
+            self._emit(stage, output, source=business_ids is None)
+        finally:
+            semaphore.release()
+
+    @staticmethod
+    def _output_ids(result: Any, business_ids: Optional[list]) -> list:
+        """Business IDs a stage passes on to its dependents."""
+        if not isinstance(result, dict):
+            return list(business_ids or [])
+        if isinstance(result.get("business_ids"), list):
+            return result["business_ids"]
+        failed = set(result.get("failed_business_ids") or [])
+        return [i for i in business_ids or [] if i not in failed]
+
+    def _emit(self, stage: PipelineStage, business_ids: list, source: bool) -> None:
+        now = time.monotonic()
+        if source:
+            for business_id in business_ids:
+                self.first_seen.setdefault(business_id, now)
+
+        if stage.name in self.sinks:
+            for business_id in business_ids:
+                self.sink_hits[business_id] += 1
+                if self.sink_hits[business_id] == len(self.sinks):
+                    del self.sink_hits[business_id]
+                    self.latencies.append(
+                        now - self.first_seen.get(business_id, self.start_time)
+                    )
+                    if self.first_completion is None:
+                        self.first_completion = now - self.start_time
+
+        if business_ids:
+            for dependent in self.dependents[stage.name]:
+                self.inboxes[dependent].put_nowait(list(business_ids))
+
+    def _close(self, stage: PipelineStage) -> None:
+        """Tell dependents this stage will emit nothing more."""
+        for dependent in self.dependents[stage.name]:
+            self.inboxes[dependent].put_nowait(None)
+
+    def _summarize(self) -> dict[str, Any]:
+        results = {}
+        for stage in self.stages:
+            metrics = self.stage_metrics[stage.name]
+            if metrics["failed_batches"]:
+                self.context["stages_failed"].append(stage.name)
+            else:
+                self.context["stages_completed"].append(stage.name)
+            status = (
+                "failed"
+                if metrics["failed_batches"]
+                and metrics["failed_batches"] == metrics["batches"]
+                else "completed"
+            )
+            results[stage.name] = {"status": status, **metrics}
+            self.context["stage_results"][stage.name] = results[stage.name]
+
+        latencies = sorted(self.latencies)
+        lead_latency = {
+            "leads_started": len(self.first_seen),
+            "leads_completed": len(latencies),
+            "first_lead_seconds": self.first_completion,
+        }
+        if latencies:
+            lead_latency.update(
+                {
+                    "mean_seconds": sum(latencies) / len(latencies),
+                    "p50_seconds": _percentile(latencies, 0.5),
+                    "p95_seconds": _percentile(latencies, 0.95),
+                    "max_seconds": latencies[-1],
+                }
+            )
+        self.context["lead_latency"] = lead_latency
+        self.context["stage_metrics"] = self.stage_metrics
+
+        logger.info(
+            f"Streamed {len(latencies)}/{len(self.first_seen)} leads through "
+            f"{len(self.stages)} stages in {self.batch_count} batches"
+        )
+
+        for stage in self.stages:
+            if stage.required and results[stage.name]["status"] == "failed":
+                raise RuntimeError(
+                    f"Required stage {stage.name} failed for every batch: "
+                    f"{self.stage_metrics[stage.name].get('last_error')}"
+                )
+
+        return results
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    index = min(len(values) - 1, max(0, int(round(fraction * len(values))) - 1))
+    return values[index]
+
+
 # Global orchestrator instance
 orchestrator = PipelineOrchestrator()
 
@@ -63,3 +63,8 @@ class ScoreService(BasePipelineService):
             "average_score": 75.5,
             "high_score_count": scored_count // 3,
         }
+
+
+def create_score_service() -> ScoreService:
+    config = ServiceConfig(service_name="score", port=8004, debug=True)
+    return ScoreService(config)
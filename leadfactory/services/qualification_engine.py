@@ -11,7 +11,7 @@ import json
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from leadfactory.monitoring.engagement_analytics import EngagementAnalytics
 from leadfactory.scoring.scoring_engine import ScoringEngine
@@ -20,6 +20,9 @@ from leadfactory.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Number of businesses fetched and evaluated together in bulk qualification
+BULK_CHUNK_SIZE = 500
+
 
 class QualificationStatus(Enum):
     """Status values for qualification results."""
@@ -185,18 +188,52 @@ class QualificationEngine:
             List of QualificationResult objects
         """
         results = []
+        for chunk_results in self.iter_qualification_chunks(
+            business_ids, criteria_id, force_rescore
+        ):
+            results.extend(chunk_results)
+        return results
+
+    def iter_qualification_chunks(
+        self,
+        business_ids: List[int],
+        criteria_id: int,
+        force_rescore: bool = False,
+        chunk_size: int = BULK_CHUNK_SIZE,
+    ) -> Iterator[List[QualificationResult]]:
+        """Qualify businesses chunk by chunk, yielding each chunk's results.
+
+        The criteria are loaded once. Each chunk fetches its businesses and
+        engagement summaries with a few set-based queries, re-scores the
+        businesses that need it as one batch and saves their scores together.
+        Results are the same as calling qualify_business for each ID.
+
+        Args:
+            business_ids: List of business IDs to qualify
+            criteria_id: Qualification criteria ID
+            force_rescore: Whether to force re-scoring businesses
+            chunk_size: Number of businesses fetched and evaluated at a time
 
+        Yields:
+            Lists of QualificationResult objects, in input order
+        """
         logger.info(f"Starting bulk qualification of {len(business_ids)} businesses")
 
-        for business_id in business_ids:
+        criteria = self.get_criteria_by_id(criteria_id)
+        qualified_count = 0
+        processed_count = 0
+
+        for start in range(0, len(business_ids), chunk_size):
+            chunk = business_ids[start : start + chunk_size]
             try:
-                result = self.qualify_business(business_id, criteria_id, force_rescore)
-                results.append(result)
+                chunk_results = self._qualify_chunk(
+                    chunk, criteria_id, criteria, force_rescore
+                )
             except Exception as e:
                 logger.error(
-                    f"Error in bulk qualification for business {business_id}: {e}"
+                    f"Error in bulk qualification for businesses {chunk[0]}-{chunk[-1]}: {e}"
                 )
-                results.append(
+                chunk_results = [
                     QualificationResult(
                         business_id=business_id,
                         status=QualificationStatus.REJECTED,
@@ -205,22 +242,174 @@ class QualificationEngine:
                         details={"error": str(e)},
                         notes=f"Error during bulk qualification: {e}",
                     )
-                )
+                    for business_id in chunk
+                ]
+
+            processed_count += len(chunk_results)
+            qualified_count += len(
+                [r for r in chunk_results if r.status == QualificationStatus.QUALIFIED]
+            )
+            yield chunk_results
 
-        qualified_count = len(
-            [r for r in results if r.status == QualificationStatus.QUALIFIED]
-        )
         logger.info(
-            f"Bulk qualification completed: {qualified_count}/{len(results)} qualified"
+            f"Bulk qualification completed: {qualified_count}/{processed_count} qualified"
+        )
+
+    def _qualify_chunk(
+        self,
+        business_ids: List[int],
+        criteria_id: int,
+        criteria: Optional[QualificationCriteria],
+        force_rescore: bool,
+    ) -> List[QualificationResult]:
+        """Qualify one chunk of businesses against already loaded criteria.
+
+        Args:
+            business_ids: Business IDs in the chunk
+            criteria_id: Qualification criteria ID
+            criteria: Loaded criteria, or None if they were not found
+            force_rescore: Whether to force re-scoring businesses
+
+        Returns:
+            List of QualificationResult objects, in input order
+        """
+        businesses = self._get_businesses_by_ids(business_ids)
+
+        evaluable = {}
+        if criteria and criteria.is_active:
+            evaluable = {
+                business_id: business
+                for business_id, business in businesses.items()
+                if not self._check_required_fields(business, criteria.required_fields)
+            }
+
+        scores = self._rescore_businesses(
+            [
+                business
+                for business in evaluable.values()
+                if force_rescore or business.get("score", 0) == 0
+            ]
         )
 
+        engagement_summaries = {}
+        if evaluable and criteria.engagement_requirements:
+            summaries = self.engagement_analytics.get_user_engagement_summaries(
+                [f"business_{business_id}" for business_id in evaluable], days=30
+            )
+            engagement_summaries = {
+                business_id: summaries.get(f"business_{business_id}", {})
+                for business_id in evaluable
+            }
+
+        results = []
+        for business_id in business_ids:
+            business = businesses.get(business_id)
+            if not business:
+                result = QualificationResult(
+                    business_id=business_id,
+                    status=QualificationStatus.REJECTED,
+                    score=0,
+                    criteria_id=criteria_id,
+                    details={"error": "Business not found"},
+                    notes="Business not found in database",
+                )
+            elif not criteria:
+                result = QualificationResult(
+                    business_id=business_id,
+                    status=QualificationStatus.REJECTED,
+                    score=0,
+                    criteria_id=criteria_id,
+                    details={"error": "Criteria not found"},
+                    notes="Qualification criteria not found",
+                )
+            elif not criteria.is_active:
+                result = QualificationResult(
+                    business_id=business_id,
+                    status=QualificationStatus.REJECTED,
+                    score=0,
+                    criteria_id=criteria_id,
+                    details={"error": "Criteria inactive"},
+                    notes="Qualification criteria is not active",
+                )
+            else:
+                try:
+                    result = self._evaluate_qualification(
+                        business,
+                        criteria,
+                        force_rescore,
+                        scores=scores,
+                        engagement_summaries=engagement_summaries,
+                    )
+                except Exception as e:
+                    logger.error(f"Error qualifying business {business_id}: {e}")
+                    result = QualificationResult(
+                        business_id=business_id,
+                        status=QualificationStatus.REJECTED,
+                        score=0,
+                        criteria_id=criteria_id,
+                        details={"error": str(e)},
+                        notes=f"Error during qualification: {e}",
+                    )
+            results.append(result)
+
         return results
 
+    def _get_businesses_by_ids(self, business_ids: List[int]) -> Dict[int, Dict]:
+        """Fetch businesses for a chunk, keyed by ID.
+
+        Falls back to one lookup per ID for storage backends without a
+        bulk fetch.
+        """
+        unique_ids = list(dict.fromkeys(business_ids))
+        if hasattr(self.storage, "get_businesses_by_ids"):
+            businesses = self.storage.get_businesses_by_ids(unique_ids)
+        else:
+            businesses = [
+                business
+                for business in map(self.storage.get_business_by_id, unique_ids)
+                if business
+            ]
+        return {business["id"]: business for business in businesses}
+
+    def _rescore_businesses(self, businesses: List[Dict[str, Any]]) -> Dict[int, int]:
+        """Re-score a batch of businesses and save their new scores.
+
+        Args:
+            businesses: Business data dictionaries to re-score
+
+        Returns:
+            New scores by business ID, empty if re-scoring failed
+        """
+        if not businesses:
+            return {}
+
+        try:
+            self.scoring_engine.load_rules()
+            score_results = self.scoring_engine.score_batch(businesses)
+        except Exception as e:
+            logger.warning(f"Could not re-score {len(businesses)} businesses: {e}")
+            return {}
+
+        scores = {
+            business["id"]: score_result.get("score", 0)
+            for business, score_result in zip(businesses, score_results)
+        }
+
+        if hasattr(self.storage, "update_business_scores"):
+            self.storage.update_business_scores(scores)
+        else:
+            for business_id, score in scores.items():
+                self.storage.update_business_score(business_id, score)
+
+        return scores
+
     def _evaluate_qualification(
         self,
         business: Dict[str, Any],
         criteria: QualificationCriteria,
         force_rescore: bool = False,
+        scores: Optional[Dict[int, int]] = None,
+        engagement_summaries: Optional[Dict[int, Dict[str, Any]]] = None,
     ) -> QualificationResult:
         """Evaluate a business against qualification criteria.
 
@@ -228,6 +417,10 @@ class QualificationEngine:
             business: Business data dictionary
             criteria: Qualification criteria
             force_rescore: Whether to force re-scoring
+            scores: Scores already re-computed for a batch, by business ID.
+                When given, the business is not re-scored on its own.
+            engagement_summaries: Engagement summaries prefetched for a batch,
+                by business ID
 
         Returns:
             QualificationResult with evaluation details
@@ -262,7 +455,10 @@ class QualificationEngine:
 
         # 2. Check business score
         current_score = business.get("score", 0)
-        if force_rescore or current_score == 0:
+        if (force_rescore or current_score == 0) and scores is not None:
+            # Re-scored with the rest of the batch
+            current_score = scores.get(business_id, current_score)
+        elif force_rescore or current_score == 0:
             try:
                 # Re-score the business
                 self.scoring_engine.load_rules()
@@ -300,7 +496,13 @@ class QualificationEngine:
         engagement_passed = True
         if criteria.engagement_requirements:
             engagement_data = self._check_engagement_requirements(
-                business_id, criteria.engagement_requirements
+                business_id,
+                criteria.engagement_requirements,
+                (
+                    engagement_summaries.get(business_id, {})
+                    if engagement_summaries is not None
+                    else None
+                ),
             )
             details["engagement_data"] = engagement_data
 
@@ -364,26 +566,34 @@ class QualificationEngine:
         return missing_fields
 
     def _check_engagement_requirements(
-        self, business_id: int, requirements: Dict[str, Any]
+        self,
+        business_id: int,
+        requirements: Dict[str, Any],
+        engagement_summary: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Check engagement requirements for a business.
 
         Args:
             business_id: Business ID to check
             requirements: Engagement requirements dictionary
+            engagement_summary: Prefetched engagement summary, fetched for
+                the business if not given
 
         Returns:
             Dictionary with engagement check results
         """
         try:
-            # Use business_id as user_id for engagement tracking
-            # In a real system, you'd have a proper mapping
-            user_id = f"business_{business_id}"
-
-            # Get engagement summary
-            engagement_summary = self.engagement_analytics.get_user_engagement_summary(
-                user_id, days=30
-            )
+            if engagement_summary is None:
+                # Use business_id as user_id for engagement tracking
+                # In a real system, you'd have a proper mapping
+                user_id = f"business_{business_id}"
+
+                # Get engagement summary
+                engagement_summary = (
+                    self.engagement_analytics.get_user_engagement_summary(
+                        user_id, days=30
+                    )
+                )
 
             results = {
                 "engagement_summary": engagement_summary,
@@ -332,6 +332,8 @@ class StorageInterface(ABC):
         asset_type: str,
         file_path: Optional[str] = None,
         url: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        metadata: Optional[dict[str, Any]] = None,
     ) -> bool:
         """
         Create an asset record.
@@ -341,6 +343,8 @@ class StorageInterface(ABC):
             asset_type: Type of asset (e.g., 'screenshot')
             file_path: Path to the asset file
             url: URL of the asset
+            content_hash: SHA-256 of the asset file, if known
+            metadata: Additional asset details, such as image dimensions
 
         Returns:
             True if successful, False otherwise
@@ -869,13 +873,14 @@ class StorageInterface(ABC):
 
     @abstractmethod
     def get_pending_webhook_retries(
-        self, limit: Optional[int] = None
+        self, limit: Optional[int] = None, due_only: bool = True
     ) -> list[dict[str, Any]]:
         """
         Get pending webhook retry items.
 
         Args:
             limit: Maximum number of items to return
+            due_only: Only return items whose retry time has passed
 
         Returns:
             List of retry item dictionaries
@@ -7,20 +7,29 @@ wrapping the existing e2e_db_connector functionality.
 
 import json
 import logging
+import uuid
 from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import psycopg2
 import psycopg2.extras
 
 from leadfactory.config.json_retention_policy import get_retention_expiry_date
 from leadfactory.utils.e2e_db_connector import (
+    bulk_upsert_businesses,
     check_connection,
+    claim_stage_batch,
+    complete_stage_batch,
     db_connection,
     db_cursor,
     execute_query,
     execute_transaction,
+    get_businesses_by_match_keys,
+    get_max_business_id,
+    merge_business_clusters,
+    seed_stage_status,
+    upsert_block_keys,
     validate_schema,
 )
 
@@ -247,6 +256,47 @@ class PostgresStorage(StorageInterface):
             logger.error(f"Error getting businesses {business_ids}: {e}")
             return []
 
+    def get_businesses_by_ids(self, business_ids: list[int]) -> list[dict[str, Any]]:
+        """
+        Get full business records for many IDs with a single query.
+
+        Unlike get_businesses(), every column is returned, as with
+        get_business_by_id(). Unknown IDs are skipped.
+        """
+        if not business_ids:
+            return []
+
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(
+                    "SELECT * FROM businesses WHERE id = ANY(%s) ORDER BY id",
+                    (list(business_ids),),
+                )
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to get {len(business_ids)} businesses by ID: {e}")
+            return []
+
+    def get_emailed_business_ids(self, business_ids: list[int]) -> set[int]:
+        """Get the IDs among business_ids that already have an email recorded."""
+        if not business_ids:
+            return set()
+
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(
+                    "SELECT DISTINCT business_id FROM emails"
+                    " WHERE business_id = ANY(%s)",
+                    (list(business_ids),),
+                )
+                return {row[0] for row in cursor.fetchall()}
+        except Exception as e:
+            logger.error(
+                f"Failed to check emails for {len(business_ids)} businesses: {e}"
+            )
+            return set()
+
     def merge_businesses(self, primary_id: int, secondary_id: int) -> bool:
         """Merge two business records, keeping primary and removing secondary."""
         try:
@@ -259,6 +309,17 @@ class PostgresStorage(StorageInterface):
             logger.error(f"Error merging businesses {primary_id}, {secondary_id}: {e}")
             return False
 
+    def merge_business_clusters(
+        self, clusters: list[tuple[int, list[int], dict[str, Any]]]
+    ) -> bool:
+        """
+        Merge clusters of duplicates in a single transaction.
+
+        Each cluster is (primary_id, secondary_ids, updates); the secondaries
+        are folded into the primary, which then receives the updates.
+        """
+        return merge_business_clusters(clusters)
+
     def get_processing_status(
         self, business_id: int, stage: str
     ) -> Optional[dict[str, Any]]:
@@ -325,6 +386,46 @@ class PostgresStorage(StorageInterface):
             )
             return False
 
+    def get_max_business_id(self) -> int:
+        """Get the highest business ID stored so far."""
+        return get_max_business_id()
+
+    def seed_stage_status(
+        self, stage: str, after_id: int = 0, status: str = "pending"
+    ) -> list[int]:
+        """
+        Add a status row for a stage to every business that has none.
+
+        Returns the IDs of the seeded businesses.
+        """
+        return seed_stage_status(stage, after_id, status)
+
+    def claim_stage_batch(
+        self, stage: str, batch_size: int, lease_seconds: float = 900
+    ) -> list[int]:
+        """
+        Claim a batch of businesses waiting for a stage.
+
+        Uses FOR UPDATE SKIP LOCKED, so concurrent workers never claim the
+        same business; rows whose lease expired are claimed again.
+        """
+        return claim_stage_batch(stage, batch_size, lease_seconds)
+
+    def complete_stage_batch(
+        self,
+        stage: str,
+        outcomes: list[tuple[int, str]],
+        next_stage: Optional[str] = None,
+        next_status: str = "processing",
+    ) -> Optional[list[int]]:
+        """
+        Record (business_id, status) outcomes for a claimed batch.
+
+        Completed businesses are queued for next_stage in the same
+        transaction; returns their IDs, or None if nothing was recorded.
+        """
+        return complete_stage_batch(stage, outcomes, next_stage, next_status)
+
     def save_stage_results(
         self, business_id: int, stage: str, results: dict[str, Any]
     ) -> bool:
@@ -563,6 +664,92 @@ class PostgresStorage(StorageInterface):
             logger.error(f"Failed to create business {name}: {e}")
             return None
 
+    def save_business_block_keys(self, business_id: int, block_keys: set[str]) -> bool:
+        """Add dedupe blocking keys for a business, keeping existing ones."""
+        return upsert_block_keys([(key, business_id) for key in sorted(block_keys)])
+
+    def save_block_keys_many(self, block_keys: dict[int, set[str]]) -> bool:
+        """Add dedupe blocking keys for many businesses in one statement."""
+        return upsert_block_keys(
+            [
+                (key, business_id)
+                for business_id, keys in block_keys.items()
+                for key in sorted(keys)
+            ]
+        )
+
+    def get_businesses_by_match_keys(
+        self,
+        source_ids: list[str],
+        websites: list[str],
+        phones: list[str],
+        name_zips: list[tuple[str, str]],
+    ) -> list[dict[str, Any]]:
+        """Get all businesses matching any source ID, website, phone or name+ZIP."""
+        return get_businesses_by_match_keys(source_ids, websites, phones, name_zips)
+
+    def bulk_upsert_businesses(
+        self,
+        new_businesses: list[dict[str, Any]],
+        updated_businesses: list[dict[str, Any]],
+    ) -> Optional[list[int]]:
+        """
+        Create and update many businesses in a single transaction.
+
+        Args:
+            new_businesses: Businesses to create, with the create_business
+                fields and a resolved vertical_id
+            updated_businesses: Resolved field values for existing businesses,
+                keyed like the businesses table and including id
+
+        Returns:
+            IDs of the created businesses in input order, or None on failure
+        """
+
+        def dump(value):
+            return json.dumps(value) if value else None
+
+        new_rows = [
+            (
+                business["name"],
+                business["address"],
+                business["city"],
+                business["state"],
+                business["zip"],
+                business["phone"],
+                business["email"],
+                business["website"],
+                business["vertical_id"],
+                business["source"],
+                business["source_id"],
+                dump(business["yelp_response_json"]),
+                dump(business["google_response_json"]),
+                (
+                    get_retention_expiry_date()
+                    if business["yelp_response_json"]
+                    or business["google_response_json"]
+                    else None
+                ),
+            )
+            for business in new_businesses
+        ]
+        updated_rows = [
+            (
+                business["id"],
+                business["name"],
+                business["address"],
+                business["phone"],
+                business["email"],
+                business["website"],
+                business["vertical_id"],
+                business["source"],
+                dump(business["yelp_response_json"]),
+                dump(business["google_response_json"]),
+            )
+            for business in updated_businesses
+        ]
+        return bulk_upsert_businesses(new_rows, updated_rows)
+
     def get_business(self, business_id: int) -> Optional[dict[str, Any]]:
         """Get business by ID (alias for get_business_by_id)."""
         return self.get_business_by_id(business_id)
@@ -774,23 +961,165 @@ class PostgresStorage(StorageInterface):
             return []
 
     def create_asset(
-        self, business_id: int, asset_type: str, file_path: str = None, url: str = None
+        self,
+        business_id: int,
+        asset_type: str,
+        file_path: str = None,
+        url: str = None,
+        content_hash: str = None,
+        metadata: dict[str, Any] = None,
     ) -> bool:
-        """Create an asset record."""
+        """Create an asset record, with the SHA-256 of the image if known."""
         try:
             with self.cursor() as cursor:
                 cursor.execute(
                     """
-                    INSERT INTO assets (business_id, asset_type, file_path, url)
-                    VALUES (%s, %s, %s, %s)
+                    INSERT INTO assets (business_id, asset_type, file_path, url, content_hash, metadata)
+                    VALUES (%s, %s, %s, %s, %s, %s)
                     """,
-                    (business_id, asset_type, file_path, url),
+                    (
+                        business_id,
+                        asset_type,
+                        file_path,
+                        url,
+                        content_hash,
+                        json.dumps(metadata) if metadata else None,
+                    ),
                 )
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Failed to create asset: {e}")
             return False
 
+    def get_assets_by_content_hash(
+        self, content_hash: str, asset_type: Optional[str] = None
+    ) -> list[dict[str, Any]]:
+        """Get asset records for an image hash, newest first."""
+        try:
+            with self.cursor() as cursor:
+                query = """
+                    SELECT id, business_id, asset_type, file_path, url, content_hash, created_at
+                    FROM assets
+                    WHERE content_hash = %s
+                """
+                params = [content_hash]
+                if asset_type:
+                    query += " AND asset_type = %s"
+                    params.append(asset_type)
+                query += " ORDER BY created_at DESC"
+
+                cursor.execute(query, params)
+                columns = [desc[0] for desc in cursor.description]
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to get assets by content hash: {e}")
+            return []
+
+    def get_asset_cache_entry(
+        self, asset_type: str, cache_key: str
+    ) -> Optional[dict[str, Any]]:
+        """Get the cached asset for a URL fingerprint key."""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT asset_type, cache_key, content_hash, file_path, size_bytes,
+                           render_seconds, hit_count, created_at, last_hit_at
+                    FROM asset_cache
+                    WHERE asset_type = %s AND cache_key = %s
+                    """,
+                    (asset_type, cache_key),
+                )
+                result = cursor.fetchone()
+                if not result:
+                    return None
+                columns = [desc[0] for desc in cursor.description]
+                return dict(zip(columns, result))
+        except Exception as e:
+            logger.error(f"Failed to get asset cache entry: {e}")
+            return None
+
+    def save_asset_cache_entry(
+        self,
+        asset_type: str,
+        cache_key: str,
+        content_hash: str,
+        file_path: str,
+        size_bytes: int,
+        render_seconds: float,
+    ) -> bool:
+        """Insert or replace the cached asset for a URL fingerprint key."""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO asset_cache (
+                        asset_type, cache_key, content_hash, file_path,
+                        size_bytes, render_seconds
+                    )
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (asset_type, cache_key) DO UPDATE SET
+                        content_hash = EXCLUDED.content_hash,
+                        file_path = EXCLUDED.file_path,
+                        size_bytes = EXCLUDED.size_bytes,
+                        render_seconds = EXCLUDED.render_seconds,
+                        hit_count = 0,
+                        created_at = NOW(),
+                        last_hit_at = NULL
+                    """,
+                    (
+                        asset_type,
+                        cache_key,
+                        content_hash,
+                        file_path,
+                        size_bytes,
+                        render_seconds,
+                    ),
+                )
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Failed to save asset cache entry: {e}")
+            return False
+
+    def record_asset_cache_hit(self, asset_type: str, cache_key: str) -> bool:
+        """Count a hit on a cached asset."""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(
+                    """
+                    UPDATE asset_cache
+                    SET hit_count = hit_count + 1, last_hit_at = NOW()
+                    WHERE asset_type = %s AND cache_key = %s
+                    """,
+                    (asset_type, cache_key),
+                )
+                return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Failed to record asset cache hit: {e}")
+            return False
+
+    def get_latest_html_fingerprint(self, business_id: int) -> Optional[str]:
+        """Get the content hash of the most recently stored HTML for a business."""
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT content_hash
+                    FROM raw_html_storage
+                    WHERE business_id = %s AND content_hash IS NOT NULL
+                    ORDER BY created_at DESC
+                    LIMIT 1
+                    """,
+                    (business_id,),
+                )
+                result = cursor.fetchone()
+                return result[0] if result else None
+        except Exception as e:
+            logger.error(
+                f"Failed to get HTML fingerprint for business {business_id}: {e}"
+            )
+            return None
+
     def get_businesses_needing_mockups(self, limit: int = None) -> list[dict[str, Any]]:
         """Get businesses that need mockups generated."""
         try:
@@ -836,7 +1165,7 @@ class PostgresStorage(StorageInterface):
             with self.cursor() as cursor:
                 cursor.execute(
                     """
-                    SELECT id, business_id, asset_type, file_path, url, created_at
+                    SELECT id, business_id, asset_type, file_path, url, content_hash, created_at
                     FROM assets
                     WHERE business_id = %s AND asset_type = %s
                     ORDER BY created_at DESC
@@ -1405,97 +1734,33 @@ class PostgresStorage(StorageInterface):
         sort_by: str = "timestamp",
         sort_order: str = "desc",
     ) -> tuple[list[dict[str, Any]], int]:
-        """Get logs with filtering, pagination, and search."""
+        """
+        Get logs with filtering, offset pagination, search and an exact count.
+
+        Filters are applied to each log table before the UNION, with the same
+        indexed conditions (and search semantics) as get_logs_page().
+        """
         try:
             with self.cursor() as cursor:
-                # Build base query to union LLM logs and HTML storage
-                base_queries = []
-
-                # Query LLM logs
-                if not log_type or log_type == "llm":
-                    llm_query = """
-                        SELECT
-                            id,
-                            business_id,
-                            'llm' as log_type,
-                            COALESCE(prompt_text, '') as content,
-                            created_at as timestamp,
-                            JSONB_BUILD_OBJECT(
-                                'operation', operation,
-                                'model_version', model_version,
-                                'tokens_prompt', tokens_prompt,
-                                'tokens_completion', tokens_completion,
-                                'duration_ms', duration_ms,
-                                'status', status,
-                                'metadata', metadata
-                            ) as metadata,
-                            NULL as file_path,
-                            COALESCE(LENGTH(prompt_text) + LENGTH(response_json::text), 0) as content_length
-                        FROM llm_logs
-                        WHERE 1=1
-                    """
-                    base_queries.append(llm_query)
-
-                # Query raw HTML storage
-                if not log_type or log_type == "raw_html":
-                    html_query = """
-                        SELECT
-                            id,
-                            business_id,
-                            'raw_html' as log_type,
-                            COALESCE(original_url, '') as content,
-                            created_at as timestamp,
-                            JSONB_BUILD_OBJECT(
-                                'original_url', original_url,
-                                'compression_ratio', compression_ratio,
-                                'content_hash', content_hash,
-                                'size_bytes', size_bytes
-                            ) as metadata,
-                            html_path as file_path,
-                            COALESCE(size_bytes, 0) as content_length
-                        FROM raw_html_storage
-                        WHERE 1=1
-                    """
-                    base_queries.append(html_query)
-
-                if not base_queries:
-                    return [], 0
-
-                # Combine queries
-                main_query = f"({') UNION ALL ('.join(base_queries)})"
-
-                # Count query for pagination
-                count_query = f"SELECT COUNT(*) FROM ({main_query}) as combined_logs"
-
-                # Add filters
-                filter_conditions = []
+                branch_queries = []
                 filter_params = []
+                for branch, select in self._LOG_PAGE_SELECTS.items():
+                    if log_type and log_type != branch:
+                        continue
 
-                if business_id is not None:
-                    filter_conditions.append("business_id = %s")
-                    filter_params.append(business_id)
-
-                if start_date:
-                    filter_conditions.append("timestamp >= %s")
-                    filter_params.append(start_date)
-
-                if end_date:
-                    filter_conditions.append("timestamp <= %s")
-                    filter_params.append(end_date)
-
-                if search_query:
-                    filter_conditions.append("content ILIKE %s")
-                    filter_params.append(f"%{search_query}%")
-
-                # Apply filters to both count and data queries
-                if filter_conditions:
-                    filter_clause = " WHERE " + " AND ".join(filter_conditions)
-                    count_query = f"SELECT COUNT(*) FROM ({main_query}) as combined_logs{filter_clause}"
-                    main_query = (
-                        f"SELECT * FROM ({main_query}) as combined_logs{filter_clause}"
+                    conditions, branch_params = self._log_filter_conditions(
+                        branch, business_id, start_date, end_date, search_query
                     )
-                else:
-                    main_query = f"SELECT * FROM ({main_query}) as combined_logs"
+                    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+                    branch_queries.append(f"{select}{where}")
+                    filter_params.extend(branch_params)
+
+                if not branch_queries:
+                    return [], 0
+
+                union_query = " UNION ALL ".join(branch_queries)
+                count_query = f"SELECT COUNT(*) FROM ({union_query}) as combined_logs"
+                main_query = f"SELECT * FROM ({union_query}) as combined_logs"
 
                 # Get total count
                 cursor.execute(count_query, filter_params)
@@ -1507,7 +1772,11 @@ class PostgresStorage(StorageInterface):
                     sort_by = "timestamp"
 
                 sort_order = "DESC" if sort_order.lower() == "desc" else "ASC"
-                main_query += f" ORDER BY {sort_by} {sort_order} LIMIT %s OFFSET %s"
+                # log_type and id break ties so pages line up with keyset order
+                main_query += (
+                    f" ORDER BY {sort_by} {sort_order}, log_type {sort_order},"
+                    f" id {sort_order} LIMIT %s OFFSET %s"
+                )
 
                 # Execute data query
                 data_params = filter_params + [limit, offset]
@@ -1532,6 +1801,314 @@ class PostgresStorage(StorageInterface):
             logger.error(f"Error fetching logs with filters: {e}")
             return [], 0
 
+    # Per-table SELECTs for the logs browser, in keyset order (timestamp, log_type, id)
+    _LOG_PAGE_SELECTS = {
+        "llm": """
+            SELECT
+                id,
+                business_id,
+                'llm' as log_type,
+                COALESCE(prompt_text, '') as content,
+                created_at as timestamp,
+                JSONB_BUILD_OBJECT(
+                    'operation', operation,
+                    'model_version', model_version,
+                    'tokens_prompt', tokens_prompt,
+                    'tokens_completion', tokens_completion,
+                    'duration_ms', duration_ms,
+                    'status', status,
+                    'metadata', metadata
+                ) as metadata,
+                NULL as file_path,
+                COALESCE(content_length, 0) as content_length
+            FROM llm_logs
+        """,
+        "raw_html": """
+            SELECT
+                id,
+                business_id,
+                'raw_html' as log_type,
+                COALESCE(original_url, '') as content,
+                created_at as timestamp,
+                JSONB_BUILD_OBJECT(
+                    'original_url', original_url,
+                    'compression_ratio', compression_ratio,
+                    'content_hash', content_hash,
+                    'size_bytes', size_bytes
+                ) as metadata,
+                html_path as file_path,
+                COALESCE(size_bytes, 0) as content_length
+            FROM raw_html_storage
+        """,
+    }
+
+    def _log_filter_conditions(
+        self,
+        log_type: str,
+        business_id: Optional[int],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        search_query: Optional[str],
+    ) -> tuple[list[str], list[Any]]:
+        """Build WHERE conditions for one log table, using its own indexes."""
+        conditions = []
+        params = []
+
+        if business_id is not None:
+            conditions.append("business_id = %s")
+            params.append(business_id)
+
+        if start_date:
+            conditions.append("created_at >= %s")
+            params.append(start_date)
+
+        if end_date:
+            conditions.append("created_at <= %s")
+            params.append(end_date)
+
+        if search_query:
+            if log_type == "llm":
+                # GIN index on the search_vector column
+                conditions.append("search_vector @@ plainto_tsquery('simple', %s)")
+                params.append(search_query)
+            else:
+                # Trigram index on original_url
+                conditions.append("original_url ILIKE %s")
+                params.append(f"%{search_query}%")
+
+        return conditions, params
+
+    def get_logs_page(
+        self,
+        business_id: Optional[int] = None,
+        log_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        search_query: Optional[str] = None,
+        limit: int = 50,
+        after: Optional[dict[str, Any]] = None,
+        sort_order: str = "desc",
+    ) -> list[dict[str, Any]]:
+        """
+        Get one page of logs by keyset rather than OFFSET.
+
+        Logs are ordered by (timestamp, log_type, id). Each table is filtered,
+        positioned after the keyset and limited on its own, so every page
+        costs an index range scan of at most ``limit`` rows per table no
+        matter how deep it is.
+
+        Args:
+            business_id: Filter by business ID
+            log_type: Filter by log type
+            start_date: Filter by start date
+            end_date: Filter by end date
+            search_query: Full-text search over prompts and HTML source URLs
+            limit: Number of results to return
+            after: Keyset position of the previous page's last log, with
+                "timestamp", "log_type" and "id"; None for the first page
+            sort_order: Sort order (asc, desc)
+
+        Returns:
+            List of log dictionaries
+        """
+        try:
+            descending = sort_order.lower() != "asc"
+            direction = "DESC" if descending else "ASC"
+            operator = "<" if descending else ">"
+
+            branch_queries = []
+            params = []
+            for branch, select in self._LOG_PAGE_SELECTS.items():
+                if log_type and log_type != branch:
+                    continue
+
+                conditions, branch_params = self._log_filter_conditions(
+                    branch, business_id, start_date, end_date, search_query
+                )
+                if after:
+                    # Rows of other log types at the cursor's timestamp sort
+                    # before or after it depending on their log_type
+                    if branch == after["log_type"]:
+                        conditions.append(f"(created_at, id) {operator} (%s, %s)")
+                        branch_params.extend([after["timestamp"], after["id"]])
+                    elif (branch > after["log_type"]) == descending:
+                        conditions.append(f"created_at {operator} %s")
+                        branch_params.append(after["timestamp"])
+                    else:
+                        conditions.append(f"created_at {operator}= %s")
+                        branch_params.append(after["timestamp"])
+
+                where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+                order = f" ORDER BY created_at {direction}, id {direction} LIMIT %s"
+                branch_queries.append(f"({select}{where}{order})")
+                params.extend(branch_params + [limit])
+
+            if not branch_queries:
+                return []
+
+            query = f"""
+                SELECT * FROM ({' UNION ALL '.join(branch_queries)}) as combined_logs
+                ORDER BY timestamp {direction}, log_type {direction}, id {direction}
+                LIMIT %s
+            """
+            params.append(limit)
+
+            with self.cursor() as cursor:
+                cursor.execute(query, params)
+                columns = [desc[0] for desc in cursor.description]
+                logs = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+            for log in logs:
+                if isinstance(log.get("metadata"), str):
+                    try:
+                        log["metadata"] = json.loads(log["metadata"])
+                    except (json.JSONDecodeError, TypeError):
+                        log["metadata"] = {}
+
+            logger.info(f"Retrieved page of {len(logs)} logs")
+            return logs
+
+        except Exception as e:
+            logger.error(f"Error fetching logs page: {e}")
+            return []
+
+    def iter_logs(
+        self,
+        business_id: Optional[int] = None,
+        log_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        search_query: Optional[str] = None,
+        batch_size: int = 1000,
+        sort_order: str = "desc",
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream every log matching the filters, for exports.
+
+        Rows are read through a server-side (named) cursor ``batch_size`` at a
+        time, so memory use does not depend on how many logs match. The
+        connection stays checked out until the generator is exhausted or
+        closed, and rows are only fetched as the caller consumes them.
+
+        Args:
+            business_id: Filter by business ID
+            log_type: Filter by log type
+            start_date: Filter by start date
+            end_date: Filter by end date
+            search_query: Full-text search over prompts and HTML source URLs
+            batch_size: Rows fetched from the server per round trip
+            sort_order: Sort order (asc, desc)
+
+        Yields:
+            Log dictionaries ordered by (timestamp, log_type, id)
+
+        Raises:
+            Exception: Query and fetch errors are logged and re-raised, so a
+                streamed export aborts instead of ending short as if complete
+        """
+        direction = "DESC" if sort_order.lower() != "asc" else "ASC"
+
+        branch_queries = []
+        params = []
+        for branch, select in self._LOG_PAGE_SELECTS.items():
+            if log_type and log_type != branch:
+                continue
+
+            conditions, branch_params = self._log_filter_conditions(
+                branch, business_id, start_date, end_date, search_query
+            )
+            where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+            branch_queries.append(f"{select}{where}")
+            params.extend(branch_params)
+
+        if not branch_queries:
+            return
+
+        query = f"""
+            SELECT * FROM ({' UNION ALL '.join(branch_queries)}) as combined_logs
+            ORDER BY timestamp {direction}, log_type {direction}, id {direction}
+        """
+
+        try:
+            with self.connection() as conn:
+                cursor = conn.cursor(name=f"logs_export_{uuid.uuid4().hex}")
+                cursor.itersize = batch_size
+                try:
+                    cursor.execute(query, params)
+                    columns = None
+                    exported = 0
+                    while True:
+                        rows = cursor.fetchmany(batch_size)
+                        if not rows:
+                            break
+                        if columns is None:
+                            columns = [desc[0] for desc in cursor.description]
+
+                        for row in rows:
+                            log = dict(zip(columns, row))
+                            if isinstance(log.get("metadata"), str):
+                                try:
+                                    log["metadata"] = json.loads(log["metadata"])
+                                except (json.JSONDecodeError, TypeError):
+                                    log["metadata"] = {}
+                            yield log
+                        exported += len(rows)
+                finally:
+                    cursor.close()
+                    # Named cursors live in a transaction; end it before the
+                    # connection goes back to the pool
+                    conn.rollback()
+
+            logger.info(f"Streamed {exported} logs")
+
+        except Exception as e:
+            logger.error(f"Error streaming logs: {e}")
+            raise
+
+    def estimate_logs_count(
+        self,
+        business_id: Optional[int] = None,
+        log_type: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        search_query: Optional[str] = None,
+    ) -> int:
+        """
+        Estimate how many logs match the filters from planner statistics.
+
+        Runs EXPLAIN for each log table instead of COUNT(*), so the cost does
+        not grow with the number of matching rows.
+
+        Returns:
+            Estimated number of matching logs, or 0 on error
+        """
+        try:
+            total = 0
+            with self.cursor() as cursor:
+                for branch, table in (
+                    ("llm", "llm_logs"),
+                    ("raw_html", "raw_html_storage"),
+                ):
+                    if log_type and log_type != branch:
+                        continue
+
+                    conditions, params = self._log_filter_conditions(
+                        branch, business_id, start_date, end_date, search_query
+                    )
+                    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+                    cursor.execute(
+                        f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {table}{where}", params
+                    )
+                    plan = cursor.fetchone()[0]
+                    if isinstance(plan, str):
+                        plan = json.loads(plan)
+                    total += int(plan[0]["Plan"]["Plan Rows"])
+            return total
+
+        except Exception as e:
+            logger.error(f"Error estimating log count: {e}")
+            return 0
+
     def get_log_by_id(self, log_id: int) -> Optional[dict[str, Any]]:
         """Get a single log entry by ID."""
         try:
@@ -1555,7 +2132,7 @@ class PostgresStorage(StorageInterface):
                             'metadata', metadata
                         ) as metadata,
                         NULL as file_path,
-                        COALESCE(LENGTH(prompt_text) + LENGTH(response_json::text), 0) as content_length
+                        COALESCE(content_length, 0) as content_length
                     FROM llm_logs
                     WHERE id = %s
                 """,
@@ -3747,6 +4324,152 @@ class PostgresStorage(StorageInterface):
             logger.error(f"Error recording conversion: {e}")
             return False
 
+    def store_engagement_batch(
+        self,
+        events: List[Dict[str, Any]],
+        sessions: List[Dict[str, Any]],
+        funnel_progress: Optional[List[Dict[str, Any]]] = None,
+        conversions: Optional[List[Dict[str, Any]]] = None,
+    ) -> bool:
+        """Write a micro-batch of engagement data in one transaction.
+
+        Events, session upserts, funnel progress and conversions each go in
+        with a single multi-row statement. Sessions and funnel progress must
+        contain at most one row per key, since a single upsert cannot touch
+        the same row twice.
+        """
+        funnel_progress = funnel_progress or []
+        conversions = conversions or []
+
+        try:
+            with self.connection() as conn:
+                with conn.cursor() as cursor:
+                    if events:
+                        psycopg2.extras.execute_values(
+                            cursor,
+                            """
+                            INSERT INTO engagement_events
+                            (event_id, user_id, session_id, event_type, timestamp,
+                             properties, page_url, referrer, user_agent, ip_address,
+                             campaign_id, ab_test_variant)
+                            VALUES %s
+                            ON CONFLICT (event_id) DO NOTHING
+                            """,
+                            [
+                                (
+                                    event.get("event_id"),
+                                    event.get("user_id"),
+                                    event.get("session_id"),
+                                    event.get("event_type"),
+                                    event.get("timestamp"),
+                                    json.dumps(event.get("properties", {})),
+                                    event.get("page_url"),
+                                    event.get("referrer"),
+                                    event.get("user_agent"),
+                                    event.get("ip_address"),
+                                    event.get("campaign_id"),
+                                    event.get("ab_test_variant"),
+                                )
+                                for event in events
+                            ],
+                            page_size=1000,
+                        )
+
+                    if sessions:
+                        psycopg2.extras.execute_values(
+                            cursor,
+                            """
+                            INSERT INTO user_sessions
+                            (session_id, user_id, start_time, end_time, total_events,
+                             page_views, unique_pages, bounce_rate, time_on_site,
+                             conversion_events, traffic_source, campaign_id,
+                             device_type)
+                            VALUES %s
+                            ON CONFLICT (session_id) DO UPDATE SET
+                                end_time = EXCLUDED.end_time,
+                                total_events = EXCLUDED.total_events,
+                                page_views = EXCLUDED.page_views,
+                                unique_pages = EXCLUDED.unique_pages,
+                                bounce_rate = EXCLUDED.bounce_rate,
+                                time_on_site = EXCLUDED.time_on_site,
+                                conversion_events = EXCLUDED.conversion_events,
+                                updated_at = CURRENT_TIMESTAMP
+                            """,
+                            [
+                                (
+                                    session.get("session_id"),
+                                    session.get("user_id"),
+                                    session.get("start_time"),
+                                    session.get("end_time"),
+                                    session.get("total_events"),
+                                    session.get("page_views"),
+                                    session.get("unique_pages"),
+                                    session.get("bounce_rate"),
+                                    session.get("time_on_site"),
+                                    json.dumps(session.get("conversion_events", [])),
+                                    session.get("traffic_source"),
+                                    session.get("campaign_id"),
+                                    session.get("device_type"),
+                                )
+                                for session in sessions
+                            ],
+                            page_size=1000,
+                        )
+
+                    if funnel_progress:
+                        psycopg2.extras.execute_values(
+                            cursor,
+                            """
+                            INSERT INTO funnel_progress
+                            (funnel_id, user_id, session_id, step_index, timestamp)
+                            VALUES %s
+                            ON CONFLICT (funnel_id, user_id, step_index) DO UPDATE SET
+                                timestamp = EXCLUDED.timestamp
+                            """,
+                            [
+                                (
+                                    progress["funnel_id"],
+                                    progress["user_id"],
+                                    progress["session_id"],
+                                    progress["step_index"],
+                                    progress["timestamp"],
+                                )
+                                for progress in funnel_progress
+                            ],
+                            page_size=1000,
+                        )
+
+                    if conversions:
+                        psycopg2.extras.execute_values(
+                            cursor,
+                            """
+                            INSERT INTO conversions
+                            (funnel_id, user_id, session_id, conversion_time,
+                             goal_type, event_id, campaign_id, ab_test_variant)
+                            VALUES %s
+                            """,
+                            [
+                                (
+                                    conversion.get("funnel_id"),
+                                    conversion.get("user_id"),
+                                    conversion.get("session_id"),
+                                    conversion.get("conversion_time"),
+                                    conversion.get("goal_type"),
+                                    conversion.get("event_id"),
+                                    conversion.get("campaign_id"),
+                                    conversion.get("ab_test_variant"),
+                                )
+                                for conversion in conversions
+                            ],
+                            page_size=1000,
+                        )
+
+                conn.commit()
+                return True
+        except Exception as e:
+            logger.error(f"Error storing engagement batch of {len(events)} events: {e}")
+            return False
+
     def get_user_events(
         self, user_id: str, start_date: datetime, end_date: datetime
     ) -> List[Dict[str, Any]]:
@@ -3813,6 +4536,93 @@ class PostgresStorage(StorageInterface):
             logger.error(f"Error getting user conversions: {e}")
             return []
 
+    def get_user_engagement_aggregates(
+        self, user_ids: List[str], start_date: datetime, end_date: datetime
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Get event, session and conversion aggregates for many users at once.
+
+        Runs one grouped query per table instead of fetching every row for
+        every user.
+
+        Returns:
+            Dictionary keyed by user ID with event_types (event count per
+            type), last_activity, total_sessions, total_page_views,
+            total_time_on_site and conversions. Users without any activity
+            in the range are left out.
+        """
+        if not user_ids:
+            return {}
+
+        aggregates = {}
+
+        def aggregate_for(user_id):
+            return aggregates.setdefault(
+                user_id,
+                {
+                    "event_types": {},
+                    "last_activity": None,
+                    "total_sessions": 0,
+                    "total_page_views": 0,
+                    "total_time_on_site": 0,
+                    "conversions": 0,
+                },
+            )
+
+        params = (list(user_ids), start_date, end_date)
+        try:
+            with self.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT user_id, event_type, COUNT(*), MAX(timestamp)
+                    FROM engagement_events
+                    WHERE user_id = ANY(%s) AND timestamp BETWEEN %s AND %s
+                    GROUP BY user_id, event_type
+                    """,
+                    params,
+                )
+                for user_id, event_type, count, last_activity in cursor.fetchall():
+                    aggregate = aggregate_for(user_id)
+                    aggregate["event_types"][event_type] = count
+                    if (
+                        aggregate["last_activity"] is None
+                        or last_activity > aggregate["last_activity"]
+                    ):
+                        aggregate["last_activity"] = last_activity
+
+                cursor.execute(
+                    """
+                    SELECT user_id, COUNT(*), COALESCE(SUM(page_views), 0),
+                           COALESCE(SUM(time_on_site), 0)
+                    FROM user_sessions
+                    WHERE user_id = ANY(%s) AND start_time BETWEEN %s AND %s
+                    GROUP BY user_id
+                    """,
+                    params,
+                )
+                for user_id, sessions, page_views, time_on_site in cursor.fetchall():
+                    aggregate = aggregate_for(user_id)
+                    aggregate["total_sessions"] = sessions
+                    aggregate["total_page_views"] = page_views
+                    aggregate["total_time_on_site"] = time_on_site
+
+                cursor.execute(
+                    """
+                    SELECT user_id, COUNT(*)
+                    FROM conversions
+                    WHERE user_id = ANY(%s) AND conversion_time BETWEEN %s AND %s
+                    GROUP BY user_id
+                    """,
+                    params,
+                )
+                for user_id, conversions in cursor.fetchall():
+                    aggregate_for(user_id)["conversions"] = conversions
+
+            return aggregates
+        except Exception as e:
+            logger.error(f"Error getting user engagement aggregates: {e}")
+            return {}
+
     def update_business_score(self, business_id: int, score: int) -> bool:
         """Update business score."""
         try:
@@ -3826,6 +4636,29 @@ class PostgresStorage(StorageInterface):
             logger.error(f"Error updating business score: {e}")
             return False
 
+    def update_business_scores(self, scores: Dict[int, int]) -> bool:
+        """Update the scores of many businesses in one statement."""
+        if not scores:
+            return True
+
+        try:
+            with self.cursor() as cursor:
+                psycopg2.extras.execute_values(
+                    cursor,
+                    """
+                    UPDATE businesses AS b
+                    SET score = v.score, updated_at = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v(id, score)
+                    WHERE b.id = v.id
+                    """,
+                    list(scores.items()),
+                    page_size=1000,
+                )
+                return True
+        except Exception as e:
+            logger.error(f"Error updating {len(scores)} business scores: {e}")
+            return False
+
     # Webhook Management Methods
     def store_webhook_event(self, event_data: dict[str, Any]) -> bool:
         """Store a webhook event."""
@@ -4000,7 +4833,7 @@ class PostgresStorage(StorageInterface):
             return False
 
     def get_pending_webhook_retries(
-        self, limit: Optional[int] = None
+        self, limit: Optional[int] = None, due_only: bool = True
     ) -> list[dict[str, Any]]:
         """Get pending webhook retry items."""
         try:
@@ -4009,9 +4842,10 @@ class PostgresStorage(StorageInterface):
                     SELECT event_id, webhook_name, retry_attempt, next_retry_time,
                            priority, error_count, last_error, created_at
                     FROM webhook_retries
-                    WHERE next_retry_time <= NOW()
-                    ORDER BY priority DESC, next_retry_time ASC
                 """
+                if due_only:
+                    query += " WHERE next_retry_time <= NOW()"
+                query += " ORDER BY priority DESC, next_retry_time ASC"
 
                 params = []
                 if limit:
@@ -0,0 +1,410 @@
+"""
+Database Connection Pool Module
+
+This module provides a process-wide, thread-safe PostgreSQL connection pool
+used by the e2e_db_connector context managers. Connections are health-checked
+on checkout, prefer being handed back to the thread or asyncio task that last
+used them, and report checkout/wait/handshake metrics through
+leadfactory.utils.metrics.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
+
+from leadfactory.utils.metrics import (
+    DB_POOL_CHECKOUTS,
+    DB_POOL_CONNECTIONS,
+    DB_POOL_HANDSHAKE_TIME,
+    DB_POOL_WAIT_TIME,
+    record_metric,
+)
+
+logger = logging.getLogger(__name__)
+
+# Configure with defaults from environment variables
+DB_POOL_ENABLED = os.getenv("DB_POOL_ENABLED", "true").lower() == "true"
+DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+DB_POOL_HEALTH_CHECK_INTERVAL = float(
+    os.getenv("DB_POOL_HEALTH_CHECK_INTERVAL_SECONDS", "30")
+)
+DB_POOL_MAX_LIFETIME = float(os.getenv("DB_POOL_MAX_LIFETIME_SECONDS", "3600"))
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available within the timeout."""
+
+
+@dataclass
+class PoolStats:
+    """Counters describing pool activity since creation."""
+
+    checkouts: int = 0
+    waits: int = 0
+    wait_time_total: float = 0.0
+    connections_created: int = 0
+    connections_discarded: int = 0
+    handshake_time_total: float = 0.0
+    health_check_failures: int = 0
+    affinity_hits: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert stats to a dictionary."""
+        return {
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_time_total": self.wait_time_total,
+            "connections_created": self.connections_created,
+            "connections_discarded": self.connections_discarded,
+            "handshake_time_total": self.handshake_time_total,
+            "health_check_failures": self.health_check_failures,
+            "affinity_hits": self.affinity_hits,
+        }
+
+
+@dataclass
+class _PooledConnection:
+    """Bookkeeping wrapper around a raw psycopg2 connection."""
+
+    conn: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    owner: Optional[Any] = None
+
+
+def get_affinity_key() -> Any:
+    """
+    Return the identity used for connection affinity.
+
+    Inside a running event loop this is the current asyncio task, otherwise it
+    is the current thread.
+    """
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return ("task", id(task))
+    return ("thread", threading.get_ident())
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of PostgreSQL connections for a single DSN.
+
+    Checkout blocks (up to ``timeout`` seconds) when ``max_size`` connections
+    are in use. Idle connections are validated before reuse once they have
+    been idle longer than ``health_check_interval`` seconds, and connections
+    older than ``max_lifetime`` seconds are recycled.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = DB_POOL_MIN_SIZE,
+        max_size: int = DB_POOL_MAX_SIZE,
+        timeout: float = DB_POOL_TIMEOUT,
+        health_check_interval: float = DB_POOL_HEALTH_CHECK_INTERVAL,
+        max_lifetime: float = DB_POOL_MAX_LIFETIME,
+        connect: Optional[Callable[[str], Any]] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            dsn: Database connection string
+            min_size: Number of connections opened eagerly and kept warm
+            max_size: Maximum number of simultaneously open connections
+            timeout: Seconds to wait for a free connection before failing
+            health_check_interval: Idle seconds after which a connection is
+                validated with ``SELECT 1`` before being handed out
+            max_lifetime: Seconds after which a connection is recycled
+            connect: Connection factory (defaults to ``psycopg2.connect``)
+        """
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size < 0 or min_size > max_size:
+            raise ValueError("min_size must be between 0 and max_size")
+
+        self.dsn = dsn
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self.max_lifetime = max_lifetime
+        self._connect = connect or psycopg2.connect
+
+        self._idle: deque[_PooledConnection] = deque()
+        self._in_use: dict[int, _PooledConnection] = {}
+        self._opening = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+        self._stats_lock = threading.Lock()
+        self.stats = PoolStats()
+
+        for _ in range(min_size):
+            try:
+                self._idle.append(self._open())
+            except Exception as e:
+                logger.warning(f"Failed to pre-open pooled connection: {e}")
+                break
+        self._report_sizes()
+
+    @property
+    def size(self) -> int:
+        """Total number of open connections (idle and in use)."""
+        with self._cond:
+            return len(self._idle) + len(self._in_use) + self._opening
+
+    def _open(self) -> _PooledConnection:
+        """Open a new connection, recording handshake time."""
+        start = time.perf_counter()
+        conn = self._connect(self.dsn)
+        elapsed = time.perf_counter() - start
+        with self._stats_lock:
+            self.stats.connections_created += 1
+            self.stats.handshake_time_total += elapsed
+        record_metric(DB_POOL_HANDSHAKE_TIME, elapsed)
+        return _PooledConnection(conn=conn)
+
+    def _discard(self, pooled: _PooledConnection) -> None:
+        """Close a connection that is no longer usable."""
+        with self._stats_lock:
+            self.stats.connections_discarded += 1
+        try:
+            if not pooled.conn.closed:
+                pooled.conn.close()
+        except Exception as e:
+            logger.debug(f"Error closing discarded connection: {e}")
+
+    def _is_healthy(self, pooled: _PooledConnection) -> bool:
+        """Validate an idle connection before handing it out."""
+        if pooled.conn.closed:
+            return False
+        now = time.monotonic()
+        if self.max_lifetime and now - pooled.created_at > self.max_lifetime:
+            return False
+        if now - pooled.last_used < self.health_check_interval:
+            return True
+        try:
+            with pooled.conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            pooled.conn.rollback()
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled connection failed health check: {e}")
+            with self._stats_lock:
+                self.stats.health_check_failures += 1
+            return False
+
+    def _take_idle(self, key: Any) -> Optional[_PooledConnection]:
+        """Pop an idle connection, preferring one last used by ``key``."""
+        for pooled in self._idle:
+            if pooled.owner == key:
+                self._idle.remove(pooled)
+                with self._stats_lock:
+                    self.stats.affinity_hits += 1
+                return pooled
+        if self._idle:
+            return self._idle.pop()
+        return None
+
+    def getconn(self, timeout: Optional[float] = None) -> Any:
+        """
+        Check a connection out of the pool.
+
+        Args:
+            timeout: Seconds to wait for a free connection (defaults to the
+                pool timeout)
+
+        Returns:
+            An open psycopg2 connection
+
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+        """
+        timeout = self.timeout if timeout is None else timeout
+        key = get_affinity_key()
+        deadline = time.monotonic() + timeout
+        waited = False
+        wait_start = time.perf_counter()
+
+        while True:
+            pooled = None
+            open_new = False
+            with self._cond:
+                if self._closed:
+                    raise psycopg2.pool.PoolError("connection pool is closed")
+                pooled = self._take_idle(key)
+                if pooled is None:
+                    if len(self._in_use) + self._opening < self.max_size:
+                        self._opening += 1
+                        open_new = True
+                    else:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            record_metric(DB_POOL_CHECKOUTS, 1, result="timeout")
+                            raise PoolTimeoutError(
+                                f"Timed out after {timeout}s waiting for a "
+                                f"database connection (max_size={self.max_size})"
+                            )
+                        waited = True
+                        self._cond.wait(remaining)
+                        continue
+
+            if open_new:
+                try:
+                    pooled = self._open()
+                finally:
+                    with self._cond:
+                        self._opening -= 1
+                        if pooled is None:
+                            self._cond.notify()
+            elif not self._is_healthy(pooled):
+                self._discard(pooled)
+                continue
+
+            with self._cond:
+                pooled.owner = key
+                self._in_use[id(pooled.conn)] = pooled
+            with self._stats_lock:
+                self.stats.checkouts += 1
+                if waited:
+                    self.stats.waits += 1
+                    self.stats.wait_time_total += time.perf_counter() - wait_start
+
+            record_metric(DB_POOL_CHECKOUTS, 1, result="waited" if waited else "ok")
+            if waited:
+                record_metric(DB_POOL_WAIT_TIME, time.perf_counter() - wait_start)
+            self._report_sizes()
+            return pooled.conn
+
+    def putconn(self, conn: Any, close: bool = False) -> None:
+        """
+        Return a connection to the pool.
+
+        Any open transaction is rolled back, matching the semantics of closing
+        an unpooled connection without committing.
+
+        Args:
+            conn: Connection previously returned by ``getconn``
+            close: Close the connection instead of keeping it idle
+        """
+        with self._cond:
+            pooled = self._in_use.pop(id(conn), None)
+        if pooled is None:
+            logger.warning("Attempted to return a connection not owned by the pool")
+            return
+
+        if not close and not conn.closed:
+            try:
+                status = conn.get_transaction_status()
+                if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+                    close = True
+                elif status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception as e:
+                logger.warning(f"Failed to reset pooled connection: {e}")
+                close = True
+
+        with self._cond:
+            if close or conn.closed or self._closed:
+                self._discard(pooled)
+            else:
+                pooled.last_used = time.monotonic()
+                self._idle.append(pooled)
+            self._cond.notify()
+        self._report_sizes()
+
+    def closeall(self) -> None:
+        """Close every idle connection and refuse further checkouts."""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._cond.notify_all()
+        self._report_sizes()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Return pool configuration, current sizes and activity counters."""
+        with self._stats_lock:
+            stats = self.stats.to_dict()
+        with self._cond:
+            stats.update(
+                {
+                    "min_size": self.min_size,
+                    "max_size": self.max_size,
+                    "idle": len(self._idle),
+                    "in_use": len(self._in_use),
+                }
+            )
+        return stats
+
+    def _report_sizes(self) -> None:
+        """Publish idle/in-use gauges."""
+        try:
+            DB_POOL_CONNECTIONS.labels(state="idle").set(len(self._idle))
+            DB_POOL_CONNECTIONS.labels(state="in_use").set(len(self._in_use))
+        except Exception as e:
+            logger.debug(f"Failed to report pool sizes: {e}")
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_connection_pool(dsn: str) -> ConnectionPool:
+    """
+    Get the process-wide pool for a DSN, creating it on first use.
+
+    Pools are dropped and recreated after ``fork()`` so that child processes
+    never share sockets with their parent.
+    """
+    with _pools_lock:
+        pool = _pools.get(dsn)
+        if pool is None:
+            pool = ConnectionPool(dsn)
+            _pools[dsn] = pool
+            logger.info(
+                f"Created database connection pool "
+                f"(min={pool.min_size}, max={pool.max_size})"
+            )
+        return pool
+
+
+def close_all_pools() -> None:
+    """Close and forget every process-wide pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.closeall()
+
+
+def get_pool_stats() -> dict[str, dict[str, Any]]:
+    """Return statistics for every process-wide pool, keyed by pool index."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {f"pool_{i}": pool.get_stats() for i, pool in enumerate(pools)}
+
+
+def _reset_after_fork() -> None:
+    """Forget inherited pools in a forked child without closing parent sockets."""
+    global _pools_lock
+    _pools.clear()
+    _pools_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -6,8 +6,10 @@ and executing queries. It loads configuration from the .env.e2e file when
 E2E_MODE is enabled.
 """
 
+import json
 import logging
 import os
+import re
 import sys
 from collections.abc import Generator
 from contextlib import contextmanager
@@ -15,6 +17,9 @@ from pathlib import Path
 from typing import Any, Optional
 
 import psycopg2
+from psycopg2.extras import execute_values
+
+from leadfactory.utils import db_pool
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -119,21 +124,56 @@ def db_connection() -> Generator[psycopg2.extensions.connection, None, None]:
     """
     Context manager for database connections.
 
+    Connections are checked out of the process-wide pool (see
+    leadfactory.utils.db_pool) and returned on exit; uncommitted work is rolled
+    back on return, exactly as closing an unpooled connection would. Set
+    DB_POOL_ENABLED=false to open a dedicated connection per call instead.
+
     Usage:
         with db_connection() as conn:
             # Use connection
     """
     conn = None
+    pool = None
+    broken = False
     try:
         conn_string = get_db_connection_string()
-        conn = psycopg2.connect(conn_string)
+        if db_pool.DB_POOL_ENABLED:
+            pool = db_pool.get_connection_pool(conn_string)
+            conn = pool.getconn()
+        else:
+            conn = psycopg2.connect(conn_string)
         yield conn
     except Exception as e:
         logger.error(f"Database connection error: {e}")
+        broken = isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
         raise
     finally:
         if conn is not None:
-            conn.close()
+            if pool is not None:
+                pool.putconn(conn, close=broken)
+            else:
+                conn.close()
+
+
+@contextmanager
+def db_transaction() -> Generator[psycopg2.extensions.connection, None, None]:
+    """
+    Context manager for a database transaction.
+
+    Commits when the block exits normally and rolls back if it raises.
+
+    Usage:
+        with db_transaction() as conn:
+            # Use connection
+    """
+    with db_connection() as conn:
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
 
 
 @contextmanager
@@ -268,19 +308,12 @@ def validate_schema() -> bool:
 # ===== DEDUPLICATION FUNCTIONS =====
 
 
-def get_potential_duplicate_pairs(limit: Optional[int] = None) -> list[dict[str, Any]]:
-    """
-    Get potential duplicate business pairs from the database.
+# Whether candidate pairs come from the persisted blocking-key index
+# (see leadfactory.pipeline.dedupe_blocking) rather than a full self-join.
+DEDUPE_USE_BLOCKING = os.getenv("DEDUPE_USE_BLOCKING", "true").lower() == "true"
+DEDUPE_MAX_BLOCK_SIZE = int(os.getenv("DEDUPE_MAX_BLOCK_SIZE", "200"))
 
-    Args:
-        limit: Maximum number of pairs to return
-
-    Returns:
-        List of potential duplicate pairs
-    """
-    query = """
-    WITH business_pairs AS (
-        SELECT
+_DUPLICATE_PAIR_COLUMNS = """
             b1.id AS business1_id,
             b2.id AS business2_id,
             b1.name AS business1_name,
@@ -308,9 +341,9 @@ def get_potential_duplicate_pairs(limit: Optional[int] = None) -> list[dict[str,
                      AND levenshtein(LOWER(b1.name), LOWER(b2.name)) / GREATEST(LENGTH(b1.name), LENGTH(b2.name))::float < 0.3
                      THEN 0.8 ELSE 0 END
             ) AS similarity_score
-        FROM businesses b1
-        INNER JOIN businesses b2 ON b1.id < b2.id
-        WHERE
+"""
+
+_DUPLICATE_PAIR_FILTERS = """
             -- Not already processed
             NOT EXISTS (
                 SELECT 1 FROM dedupe_log dl
@@ -331,6 +364,40 @@ def get_potential_duplicate_pairs(limit: Optional[int] = None) -> list[dict[str,
                 OR (b1.name IS NOT NULL AND b2.name IS NOT NULL
                     AND levenshtein(LOWER(b1.name), LOWER(b2.name)) / GREATEST(LENGTH(b1.name), LENGTH(b2.name))::float < 0.3)
             )
+"""
+
+
+def get_potential_duplicate_pairs(
+    limit: Optional[int] = None, use_blocking: Optional[bool] = None
+) -> list[dict[str, Any]]:
+    """
+    Get potential duplicate business pairs from the database.
+
+    Args:
+        limit: Maximum number of pairs to return
+        use_blocking: Generate candidates from the blocking-key index instead
+            of a full self-join. Defaults to DEDUPE_USE_BLOCKING once the index
+            has been brought up to date with every stored business.
+
+    Returns:
+        List of potential duplicate pairs
+    """
+    if use_blocking is None:
+        # Imported here; dedupe_blocking imports this module
+        from leadfactory.pipeline.dedupe_blocking import ensure_block_index
+
+        use_blocking = DEDUPE_USE_BLOCKING and ensure_block_index()
+    if use_blocking:
+        return get_blocked_duplicate_pairs(limit)
+
+    query = f"""
+    WITH business_pairs AS (
+        SELECT
+{_DUPLICATE_PAIR_COLUMNS}
+        FROM businesses b1
+        INNER JOIN businesses b2 ON b1.id < b2.id
+        WHERE
+{_DUPLICATE_PAIR_FILTERS}
     )
     SELECT * FROM business_pairs
     WHERE similarity_score > 0.5
@@ -350,6 +417,453 @@ def get_potential_duplicate_pairs(limit: Optional[int] = None) -> list[dict[str,
         return []
 
 
+def get_blocked_duplicate_pairs(
+    limit: Optional[int] = None,
+    max_block_size: int = DEDUPE_MAX_BLOCK_SIZE,
+    business_ids: Optional[list[int]] = None,
+) -> list[dict[str, Any]]:
+    """
+    Get potential duplicate pairs from businesses sharing a blocking key.
+
+    Only pairs that share at least one key in dedupe_block_keys are scored, and
+    keys shared by more than ``max_block_size`` businesses are ignored. The
+    returned rows have the same shape as get_potential_duplicate_pairs.
+
+    Args:
+        limit: Maximum number of pairs to return
+        max_block_size: Largest block that still produces candidate pairs
+        business_ids: Only return pairs involving at least one of these
+            businesses
+
+    Returns:
+        List of potential duplicate pairs
+    """
+    params: list[Any] = [max_block_size]
+    pair_filter = ""
+    if business_ids is not None:
+        if not business_ids:
+            return []
+        pair_filter = (
+            "\n        WHERE k1.business_id = ANY(%s) OR k2.business_id = ANY(%s)"
+        )
+        params.extend([list(business_ids), list(business_ids)])
+
+    query = f"""
+    WITH usable_blocks AS (
+        SELECT block_key
+        FROM dedupe_block_keys
+        GROUP BY block_key
+        HAVING COUNT(*) BETWEEN 2 AND %s
+    ),
+    candidate_pairs AS (
+        SELECT DISTINCT k1.business_id AS id1, k2.business_id AS id2
+        FROM usable_blocks ub
+        INNER JOIN dedupe_block_keys k1 ON k1.block_key = ub.block_key
+        INNER JOIN dedupe_block_keys k2
+            ON k2.block_key = k1.block_key AND k1.business_id < k2.business_id{pair_filter}
+    ),
+    business_pairs AS (
+        SELECT
+{_DUPLICATE_PAIR_COLUMNS}
+        FROM candidate_pairs cp
+        INNER JOIN businesses b1 ON b1.id = cp.id1
+        INNER JOIN businesses b2 ON b2.id = cp.id2
+        WHERE
+{_DUPLICATE_PAIR_FILTERS}
+    )
+    SELECT * FROM business_pairs
+    WHERE similarity_score > 0.5
+    ORDER BY similarity_score DESC
+    """
+
+    if limit:
+        query += f" LIMIT {int(limit)}"
+
+    try:
+        with db_cursor() as cursor:
+            cursor.execute(query, tuple(params))
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Error getting blocked duplicate pairs: {e}")
+        return []
+
+
+def get_block_index_state() -> Optional[dict[str, Any]]:
+    """
+    Get how far the blocking-key index has been backfilled.
+
+    Returns:
+        Dictionary with key_version and indexed_through_id, or None if the
+        index has never been completed
+    """
+    try:
+        with db_cursor() as cursor:
+            cursor.execute(
+                "SELECT to_regclass('public.dedupe_block_index_state') IS NOT NULL"
+            )
+            if not cursor.fetchone()[0]:
+                return None
+            cursor.execute(
+                "SELECT key_version, indexed_through_id FROM dedupe_block_index_state"
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            return {"key_version": row[0], "indexed_through_id": row[1]}
+    except Exception as e:
+        logger.warning(f"Error checking block index state: {e}")
+        return None
+
+
+def mark_block_index_complete(key_version: int, indexed_through_id: int) -> bool:
+    """
+    Record that every business up to an ID has blocking keys of a version.
+
+    Args:
+        key_version: Version of the key format the index was built with
+        indexed_through_id: Highest business ID covered by the index
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO dedupe_block_index_state
+                    (id, key_version, indexed_through_id, completed_at)
+                VALUES (1, %s, %s, NOW())
+                ON CONFLICT (id) DO UPDATE SET
+                    key_version = EXCLUDED.key_version,
+                    indexed_through_id = EXCLUDED.indexed_through_id,
+                    completed_at = EXCLUDED.completed_at
+                """,
+                (key_version, indexed_through_id),
+            )
+            return True
+    except Exception as e:
+        logger.error(f"Error recording block index state: {e}")
+        return False
+
+
+def clear_block_index() -> bool:
+    """
+    Delete every blocking key and the index watermark, ahead of a rebuild.
+
+    Returns:
+        True if successful, False otherwise
+    """
+    try:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM dedupe_block_index_state")
+            cursor.execute("DELETE FROM dedupe_block_keys")
+            cursor.execute("DELETE FROM dedupe_block_key_updates")
+            return True
+    except Exception as e:
+        logger.error(f"Error clearing block index: {e}")
+        return False
+
+
+def upsert_block_keys(rows: list[tuple[str, int]]) -> bool:
+    """
+    Store (block_key, business_id) rows, ignoring ones that already exist.
+
+    Args:
+        rows: Blocking key and business ID tuples
+
+    Returns:
+        True if successful, False otherwise
+    """
+    if not rows:
+        return True
+
+    try:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            execute_values(
+                cursor,
+                """
+                INSERT INTO dedupe_block_keys (block_key, business_id)
+                VALUES %s
+                ON CONFLICT (block_key, business_id) DO NOTHING
+                """,
+                rows,
+                page_size=1000,
+            )
+            return True
+    except Exception as e:
+        logger.error(f"Error storing {len(rows)} block keys: {e}")
+        return False
+
+
+def get_block_key_updates(batch_size: int = 5000) -> Optional[list[dict[str, Any]]]:
+    """
+    Get businesses whose blocking fields changed since their keys were stored.
+
+    Updates are queued by a trigger on businesses, so edits made outside
+    save_business (enrichment, manual fixes) are included.
+
+    Args:
+        batch_size: Maximum number of businesses to return
+
+    Returns:
+        List of business dictionaries with the blocking fields and queued_at,
+        or None if the queue could not be read
+    """
+    query = """
+    SELECT b.id, b.name, b.phone, b.email, b.website, b.city, b.state, b.zip,
+           u.queued_at
+    FROM dedupe_block_key_updates u
+    INNER JOIN businesses b ON b.id = u.business_id
+    ORDER BY u.business_id
+    LIMIT %s
+    """
+
+    try:
+        with db_cursor() as cursor:
+            cursor.execute(query, (batch_size,))
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Error getting block key updates: {e}")
+        return None
+
+
+def replace_block_keys(
+    rows: list[tuple[str, int]], updates: list[tuple[int, Any]]
+) -> bool:
+    """
+    Replace the blocking keys of updated businesses and dequeue them.
+
+    A business updated again after it was read keeps its queue entry (its
+    queued_at no longer matches), so it is re-keyed on the next pass.
+
+    Args:
+        rows: New blocking key and business ID tuples
+        updates: (business_id, queued_at) tuples as returned by
+            get_block_key_updates
+
+    Returns:
+        True if successful, False otherwise
+    """
+    if not updates:
+        return True
+
+    try:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "DELETE FROM dedupe_block_keys WHERE business_id = ANY(%s)",
+                ([business_id for business_id, _ in updates],),
+            )
+            if rows:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO dedupe_block_keys (block_key, business_id)
+                    VALUES %s
+                    ON CONFLICT (block_key, business_id) DO NOTHING
+                    """,
+                    rows,
+                    page_size=1000,
+                )
+            execute_values(
+                cursor,
+                """
+                DELETE FROM dedupe_block_key_updates u
+                USING (VALUES %s) AS done (business_id, queued_at)
+                WHERE u.business_id = done.business_id
+                  AND u.queued_at = done.queued_at
+                """,
+                updates,
+                template="(%s, %s::timestamp)",
+                page_size=1000,
+            )
+            return True
+    except Exception as e:
+        logger.error(f"Error replacing block keys for {len(updates)} businesses: {e}")
+        return False
+
+
+def get_businesses_for_blocking(
+    after_id: int = 0, batch_size: int = 5000
+) -> list[dict[str, Any]]:
+    """
+    Get the fields used for blocking keys, paging by ascending business ID.
+
+    Args:
+        after_id: Only return businesses with an ID greater than this
+        batch_size: Maximum number of businesses to return
+
+    Returns:
+        List of business dictionaries
+    """
+    query = """
+    SELECT id, name, phone, email, website, city, state, zip
+    FROM businesses
+    WHERE id > %s
+    ORDER BY id
+    LIMIT %s
+    """
+
+    try:
+        with db_cursor() as cursor:
+            cursor.execute(query, (after_id, batch_size))
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    except Exception as e:
+        logger.error(f"Error getting businesses for blocking: {e}")
+        return []
+
+
+def get_businesses_by_match_keys(
+    source_ids: list[str],
+    websites: list[str],
+    phones: list[str],
+    name_zips: list[tuple[str, str]],
+) -> list[dict[str, Any]]:
+    """
+    Get every business matching any of the scraper's deduplication keys.
+
+    Runs one set-based query per key type on a single connection, instead of
+    one lookup per scraped record and key.
+
+    Args:
+        source_ids: Source-specific IDs
+        websites: Website URLs
+        phones: Phone numbers
+        name_zips: (name, ZIP code) tuples, names compared case-insensitively
+
+    Returns:
+        List of matching business dictionaries, ordered by ID
+    """
+    lookups = []
+    if source_ids:
+        lookups.append(("source_id = ANY(%s)", (list(source_ids),)))
+    if websites:
+        lookups.append(("website = ANY(%s) AND website != ''", (list(websites),)))
+    if phones:
+        lookups.append(("phone = ANY(%s) AND phone != ''", (list(phones),)))
+    if name_zips:
+        lookups.append(
+            (
+                "(LOWER(name), zip) IN (SELECT * FROM unnest(%s::text[], %s::text[]))",
+                (
+                    [name.lower() for name, _ in name_zips],
+                    [zip_code for _, zip_code in name_zips],
+                ),
+            )
+        )
+    if not lookups:
+        return []
+
+    businesses = {}
+    try:
+        with db_cursor() as cursor:
+            for condition, params in lookups:
+                cursor.execute(
+                    f"SELECT * FROM businesses WHERE {condition} ORDER BY id",  # nosec B608
+                    params,
+                )
+                columns = [desc[0] for desc in cursor.description]
+                for row in cursor.fetchall():
+                    business = dict(zip(columns, row))
+                    businesses.setdefault(business["id"], business)
+    except Exception as e:
+        logger.error(f"Error getting businesses by match keys: {e}")
+        return []
+
+    return sorted(businesses.values(), key=lambda business: business["id"])
+
+
+def bulk_upsert_businesses(
+    new_rows: list[tuple], updated_rows: list[tuple]
+) -> Optional[list[int]]:
+    """
+    Insert new businesses and update existing ones in one transaction.
+
+    New rows are written with a single multi-row INSERT ... RETURNING and
+    updates with a single UPDATE ... FROM (VALUES ...). JSON responses in
+    updated rows only overwrite stored ones when not NULL.
+
+    Args:
+        new_rows: Tuples of (name, address, city, state, zip, phone, email,
+            website, vertical_id, source, source_id, yelp_response_json,
+            google_response_json, json_retention_expires_at)
+        updated_rows: Tuples of (id, name, address, phone, email, website,
+            vertical_id, source, yelp_response_json, google_response_json)
+
+    Returns:
+        IDs of the inserted businesses in input order, or None if the
+        transaction failed
+    """
+    try:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            new_ids = []
+            if new_rows:
+                inserted = execute_values(
+                    cursor,
+                    """
+                    INSERT INTO businesses (
+                        name, address, city, state, zip, phone, email, website,
+                        vertical_id, created_at, updated_at, status, processed,
+                        source, source_id, yelp_response_json, google_response_json,
+                        json_retention_expires_at
+                    ) VALUES %s
+                    RETURNING id
+                    """,
+                    new_rows,
+                    template="""(
+                        %s, %s, %s, %s, %s, %s, %s, %s, %s,
+                        CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'pending', FALSE,
+                        %s, %s, %s::jsonb, %s::jsonb, %s
+                    )""",
+                    page_size=1000,
+                    fetch=True,
+                )
+                new_ids = [row[0] for row in inserted]
+            if updated_rows:
+                execute_values(
+                    cursor,
+                    """
+                    UPDATE businesses AS b
+                    SET name = v.name,
+                        address = v.address,
+                        phone = v.phone,
+                        email = v.email,
+                        website = v.website,
+                        vertical_id = v.vertical_id,
+                        source = v.source,
+                        yelp_response_json = COALESCE(
+                            v.yelp_response_json, b.yelp_response_json
+                        ),
+                        google_response_json = COALESCE(
+                            v.google_response_json, b.google_response_json
+                        ),
+                        updated_at = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v (
+                        id, name, address, phone, email, website, vertical_id,
+                        source, yelp_response_json, google_response_json
+                    )
+                    WHERE b.id = v.id
+                    """,
+                    updated_rows,
+                    template="(%s::integer, %s, %s, %s, %s, %s, %s::integer, %s, %s::jsonb, %s::jsonb)",
+                    page_size=1000,
+                )
+            return new_ids
+    except Exception as e:
+        logger.error(
+            f"Error upserting {len(new_rows)} new and {len(updated_rows)} "
+            f"updated businesses: {e}"
+        )
+        return None
+
+
 def get_business_details(business_id: int) -> Optional[dict[str, Any]]:
     """
     Get detailed business information including JSON responses.
@@ -424,6 +938,291 @@ def merge_business_records(primary_id: int, secondary_id: int) -> bool:
         return False
 
 
+# Tables whose rows follow a business into the one it is merged into
+MERGE_CHILD_TABLES = ("emails", "assets")
+
+_COLUMN_NAME = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+def merge_business_clusters(
+    clusters: list[tuple[int, list[int], dict[str, Any]]],
+) -> bool:
+    """
+    Merge clusters of duplicate businesses in one transaction.
+
+    Does what merge_business_records does for every (primary, secondary)
+    pair, but set-based: child rows of all secondaries are repointed with one
+    UPDATE ... FROM (VALUES ...) per table, all primaries receive their
+    resolved field updates in one UPDATE, every merge is logged with one
+    multi-row INSERT and all secondaries are removed with one DELETE.
+
+    Args:
+        clusters: Tuples of (primary_id, secondary_ids, updates), where
+            updates maps businesses columns to the values to give the primary
+
+    Returns:
+        True if every cluster was merged, False if the transaction was
+        rolled back
+    """
+    mapping = [
+        (secondary_id, primary_id)
+        for primary_id, secondary_ids, _ in clusters
+        for secondary_id in secondary_ids
+    ]
+    if not mapping:
+        return True
+
+    patches = [
+        (primary_id, json.dumps(updates, default=str))
+        for primary_id, _, updates in clusters
+        if updates
+    ]
+    columns = sorted({column for _, _, updates in clusters for column in updates})
+    invalid = [column for column in columns if not _COLUMN_NAME.match(column)]
+    if invalid:
+        logger.error(f"Refusing to merge with invalid column names: {invalid}")
+        return False
+
+    try:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+
+            for table in MERGE_CHILD_TABLES:
+                execute_values(
+                    cursor,
+                    f"""
+                    UPDATE {table} AS child
+                    SET business_id = m.primary_id
+                    FROM (VALUES %s) AS m (secondary_id, primary_id)
+                    WHERE child.business_id = m.secondary_id
+                    """,
+                    mapping,
+                    template="(%s::integer, %s::integer)",
+                    page_size=1000,
+                )
+
+            if patches:
+                # Each patch only carries some of the columns; the others
+                # keep the primary's value
+                assignments = ", ".join(
+                    f"{column} = CASE WHEN v.patch ? '{column}'"
+                    f" THEN r.{column} ELSE b.{column} END"
+                    for column in columns
+                )
+                execute_values(
+                    cursor,
+                    f"""
+                    UPDATE businesses AS b
+                    SET {assignments}, updated_at = CURRENT_TIMESTAMP
+                    FROM (VALUES %s) AS v (id, patch),
+                         jsonb_populate_record(NULL::businesses, v.patch) AS r
+                    WHERE b.id = v.id
+                    """,
+                    patches,
+                    template="(%s::integer, %s::jsonb)",
+                    page_size=1000,
+                )
+
+            execute_values(
+                cursor,
+                "INSERT INTO dedupe_log (primary_id, secondary_id) VALUES %s",
+                [(primary_id, secondary_id) for secondary_id, primary_id in mapping],
+                page_size=1000,
+            )
+            cursor.execute(
+                "DELETE FROM businesses WHERE id = ANY(%s)",
+                ([secondary_id for secondary_id, _ in mapping],),
+            )
+
+            logger.info(
+                f"Merged {len(mapping)} businesses into {len(clusters)} primaries"
+            )
+            return True
+
+    except Exception as e:
+        logger.error(f"Error merging {len(clusters)} business clusters: {e}")
+        return False
+
+
+def get_max_business_id() -> int:
+    """
+    Get the highest business ID stored so far.
+
+    Returns:
+        The largest businesses.id, or 0 if there are no businesses
+    """
+    try:
+        with db_cursor() as cursor:
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM businesses")
+            return int(cursor.fetchone()[0])
+    except Exception as e:
+        logger.error(f"Error getting max business ID: {e}")
+        return 0
+
+
+def seed_stage_status(
+    stage: str, after_id: int = 0, status: str = "pending"
+) -> list[int]:
+    """
+    Add a processing_status row for every business that has none for a stage.
+
+    Args:
+        stage: Pipeline stage to seed
+        after_id: Only seed businesses with a higher ID
+        status: Status given to the new rows; "processing" when the caller
+            hands the businesses straight to a worker
+
+    Returns:
+        IDs of the businesses that were seeded, in ascending order
+    """
+    try:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT INTO processing_status (business_id, stage, status)
+                SELECT b.id, %s, %s
+                FROM businesses b
+                WHERE b.id > %s
+                  AND NOT EXISTS (
+                      SELECT 1 FROM processing_status ps
+                      WHERE ps.business_id = b.id AND ps.stage = %s
+                  )
+                ORDER BY b.id
+                ON CONFLICT (business_id, stage) DO NOTHING
+                RETURNING business_id
+                """,
+                (stage, status, after_id, stage),
+            )
+            return sorted(row[0] for row in cursor.fetchall())
+    except Exception as e:
+        logger.error(f"Error seeding {stage} stage status: {e}")
+        return []
+
+
+def claim_stage_batch(
+    stage: str, batch_size: int, lease_seconds: float = 900
+) -> list[int]:
+    """
+    Claim up to batch_size businesses waiting for a stage.
+
+    Pending rows, and rows left in "processing" for longer than the lease by
+    a worker that died, are switched to "processing" in one statement. Rows
+    locked by a concurrent claim are skipped rather than waited for, so any
+    number of workers and processes can claim from the same stage.
+
+    Args:
+        stage: Pipeline stage to claim work for
+        batch_size: Maximum number of businesses to claim
+        lease_seconds: Age after which a "processing" row is reclaimed
+
+    Returns:
+        IDs of the claimed businesses, in ascending order
+    """
+    try:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                UPDATE processing_status AS ps
+                SET status = 'processing', updated_at = CURRENT_TIMESTAMP
+                FROM (
+                    SELECT business_id
+                    FROM processing_status
+                    WHERE stage = %s
+                      AND (
+                          status = 'pending'
+                          OR (
+                              status = 'processing'
+                              AND updated_at
+                                  < CURRENT_TIMESTAMP - %s * INTERVAL '1 second'
+                          )
+                      )
+                    ORDER BY business_id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                ) AS claimable
+                WHERE ps.stage = %s AND ps.business_id = claimable.business_id
+                RETURNING ps.business_id
+                """,
+                (stage, lease_seconds, batch_size, stage),
+            )
+            return sorted(row[0] for row in cursor.fetchall())
+    except Exception as e:
+        logger.error(f"Error claiming {stage} batch: {e}")
+        return []
+
+
+def complete_stage_batch(
+    stage: str,
+    outcomes: list[tuple[int, str]],
+    next_stage: Optional[str] = None,
+    next_status: str = "processing",
+) -> Optional[list[int]]:
+    """
+    Record the outcome of a claimed batch and queue its survivors, atomically.
+
+    Only rows still in "processing" are updated, so a status the stage wrote
+    itself (such as "skipped") is kept. Every business whose row ends up
+    "completed" gets a row for next_stage unless it already has one.
+
+    Args:
+        stage: Pipeline stage the batch was claimed for
+        outcomes: (business_id, status) tuples
+        next_stage: Stage that completed businesses move on to
+        next_status: Status of the new next_stage rows; "processing" when
+            the caller hands them straight to the next stage's workers
+
+    Returns:
+        IDs of the businesses queued for next_stage, in ascending order, or
+        None if the transaction was rolled back
+    """
+    if not outcomes:
+        return []
+
+    try:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            execute_values(
+                cursor,
+                """
+                UPDATE processing_status AS ps
+                SET status = v.status, updated_at = CURRENT_TIMESTAMP
+                FROM (VALUES %s) AS v (business_id, stage, status)
+                WHERE ps.business_id = v.business_id
+                  AND ps.stage = v.stage
+                  AND ps.status = 'processing'
+                """,
+                [(business_id, stage, status) for business_id, status in outcomes],
+                template="(%s::integer, %s, %s)",
+                page_size=1000,
+            )
+
+            if not next_stage:
+                return []
+
+            cursor.execute(
+                """
+                INSERT INTO processing_status (business_id, stage, status)
+                SELECT business_id, %s, %s
+                FROM processing_status
+                WHERE stage = %s AND business_id = ANY(%s) AND status = 'completed'
+                ON CONFLICT (business_id, stage) DO NOTHING
+                RETURNING business_id
+                """,
+                (
+                    next_stage,
+                    next_status,
+                    stage,
+                    [business_id for business_id, _ in outcomes],
+                ),
+            )
+            return sorted(row[0] for row in cursor.fetchall())
+    except Exception as e:
+        logger.error(f"Error completing {stage} batch of {len(outcomes)}: {e}")
+        return None
+
+
 def update_business_fields(business_id: int, updates: dict[str, Any]) -> bool:
     """
     Update specific fields of a business record.
@@ -627,6 +1426,50 @@ def create_dedupe_tables() -> bool:
         "CREATE INDEX IF NOT EXISTS idx_dedupe_log_secondary_id ON dedupe_log(secondary_id)",
         "CREATE INDEX IF NOT EXISTS idx_dedupe_review_queue_business1 ON dedupe_review_queue(business1_id)",
         "CREATE INDEX IF NOT EXISTS idx_dedupe_review_queue_business2 ON dedupe_review_queue(business2_id)",
+        """
+        CREATE TABLE IF NOT EXISTS dedupe_block_keys (
+            block_key TEXT NOT NULL,
+            business_id INTEGER NOT NULL REFERENCES businesses(id) ON DELETE CASCADE,
+            created_at TIMESTAMP DEFAULT NOW(),
+            PRIMARY KEY (block_key, business_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_dedupe_block_keys_business ON dedupe_block_keys(business_id)",
+        """
+        CREATE TABLE IF NOT EXISTS dedupe_block_index_state (
+            id SMALLINT PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+            key_version INTEGER NOT NULL,
+            indexed_through_id INTEGER NOT NULL,
+            completed_at TIMESTAMP NOT NULL DEFAULT NOW()
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS dedupe_block_key_updates (
+            business_id INTEGER PRIMARY KEY REFERENCES businesses(id) ON DELETE CASCADE,
+            queued_at TIMESTAMP NOT NULL DEFAULT clock_timestamp()
+        )
+        """,
+        """
+        CREATE OR REPLACE FUNCTION queue_dedupe_block_key_update()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO dedupe_block_key_updates (business_id, queued_at)
+            VALUES (NEW.id, clock_timestamp())
+            ON CONFLICT (business_id) DO UPDATE SET queued_at = EXCLUDED.queued_at;
+            RETURN NEW;
+        END;
+        $$ language 'plpgsql'
+        """,
+        "DROP TRIGGER IF EXISTS queue_dedupe_block_key_update ON businesses",
+        """
+        CREATE TRIGGER queue_dedupe_block_key_update
+            AFTER UPDATE OF name, phone, email, website, city, state, zip ON businesses
+            FOR EACH ROW
+            WHEN ((OLD.name, OLD.phone, OLD.email, OLD.website, OLD.city, OLD.state, OLD.zip)
+                  IS DISTINCT FROM
+                  (NEW.name, NEW.phone, NEW.email, NEW.website, NEW.city, NEW.state, NEW.zip))
+            EXECUTE FUNCTION queue_dedupe_block_key_update()
+        """,
         "CREATE EXTENSION IF NOT EXISTS fuzzystrmatch",
     ]
 
@@ -203,6 +203,136 @@ if METRICS_AVAILABLE:
         "Total GPU scaling events",
         ["action", "provider", "instance_type"],
     )
+
+    # Database connection pool metrics
+    DB_POOL_CHECKOUTS = Counter(
+        "db_pool_checkouts_total",
+        "Total database connection pool checkouts",
+        ["result"],
+    )
+    DB_POOL_WAIT_TIME = Histogram(
+        "db_pool_wait_seconds",
+        "Time spent waiting for a free pooled database connection",
+    )
+    DB_POOL_HANDSHAKE_TIME = Histogram(
+        "db_pool_handshake_seconds",
+        "Time spent opening new database connections",
+    )
+    DB_POOL_CONNECTIONS = Gauge(
+        "db_pool_connections", "Pooled database connections", ["state"]
+    )
+
+    # LLM response cache metrics
+    LLM_CACHE_HITS = Counter(
+        "llm_cache_hits_total", "LLM response cache hits", ["namespace", "tier"]
+    )
+    LLM_CACHE_MISSES = Counter("llm_cache_misses_total", "LLM response cache misses")
+    LLM_CACHE_BYTES = Counter(
+        "llm_cache_bytes_total",
+        "Bytes read from and written to the LLM response cache",
+        ["operation"],
+    )
+    LLM_CACHE_SAVED_TOKENS = Counter(
+        "llm_cache_saved_tokens_total",
+        "Tokens served from the LLM response cache instead of a provider",
+        ["namespace"],
+    )
+    LLM_CACHE_SAVED_COST = Counter(
+        "llm_cache_saved_cost_dollars_total",
+        "Estimated provider spend avoided by LLM response cache hits",
+        ["namespace"],
+    )
+
+    # Local screenshot browser pool metrics
+    SCREENSHOT_CAPTURES = Counter(
+        "screenshot_captures_total",
+        "Screenshots captured with the local browser pool",
+        ["result"],
+    )
+    SCREENSHOT_CAPTURE_TIME = Histogram(
+        "screenshot_capture_seconds",
+        "Time to capture one screenshot with the local browser pool",
+        buckets=(0.5, 1, 2, 3, 5, 7.5, 10, 15, 20, 30, 45, 60),
+    )
+    SCREENSHOT_THROUGHPUT = Gauge(
+        "screenshot_throughput_per_second",
+        "Screenshots completed per second over the last minute",
+    )
+    SCREENSHOT_LATENCY_P95 = Gauge(
+        "screenshot_capture_p95_seconds",
+        "95th percentile capture time of recent screenshots",
+    )
+    SCREENSHOT_BROWSER_RECYCLES = Counter(
+        "screenshot_browser_recycles_total",
+        "Browser contexts and browsers recycled by the screenshot pool",
+        ["reason"],
+    )
+
+    # Screenshot and mockup asset cache metrics
+    ASSET_CACHE_LOOKUPS = Counter(
+        "asset_cache_lookups_total",
+        "Screenshot and mockup asset cache lookups",
+        ["asset_type", "result"],
+    )
+    ASSET_CACHE_SECONDS_SAVED = Counter(
+        "asset_cache_seconds_saved_total",
+        "Capture and render time avoided by asset cache hits",
+        ["asset_type"],
+    )
+    ASSET_CACHE_BYTES_SAVED = Counter(
+        "asset_cache_bytes_saved_total",
+        "Image bytes not rewritten or re-uploaded because of asset cache hits",
+        ["asset_type"],
+    )
+
+    # Shared application cache metrics
+    CACHE_HITS = Counter(
+        "cache_hits_total", "Shared application cache hits", ["cache", "tier"]
+    )
+    CACHE_MISSES = Counter(
+        "cache_misses_total", "Shared application cache misses", ["cache"]
+    )
+    CACHE_EVICTIONS = Counter(
+        "cache_evictions_total",
+        "Entries evicted from the in-process cache tier to stay within its limit",
+        ["cache"],
+    )
+    CACHE_INVALIDATIONS = Counter(
+        "cache_invalidations_total",
+        "Cache entries removed by key, tag or clear invalidation",
+        ["cache"],
+    )
+    CACHE_RECOMPUTES = Counter(
+        "cache_recomputes_total",
+        "Values computed by get_or_set, by whether this caller led or waited",
+        ["cache", "role"],
+    )
+
+    # Webhook intake log and consumer metrics
+    WEBHOOK_INTAKE_EVENTS = Counter(
+        "webhook_intake_events_total",
+        "Webhooks received by the intake endpoint",
+        ["webhook", "result"],
+    )
+    WEBHOOK_INTAKE_LATENCY = Histogram(
+        "webhook_intake_latency_seconds",
+        "Time to validate a webhook and durably append it to the intake log",
+        ["webhook"],
+        buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1),
+    )
+    WEBHOOK_CONSUMER_EVENTS = Counter(
+        "webhook_consumer_events_total",
+        "Intake log events handled by the webhook consumers",
+        ["event_type", "result"],
+    )
+    WEBHOOK_CONSUMER_LAG_EVENTS = Gauge(
+        "webhook_consumer_lag_events",
+        "Intake log events appended but not yet processed",
+    )
+    WEBHOOK_CONSUMER_LAG_SECONDS = Gauge(
+        "webhook_consumer_lag_seconds",
+        "Age of the oldest unprocessed intake log event",
+    )
 else:
     # Define a more robust placeholder metric class that logs metric operations when Prometheus isn't available
     class LoggingNoOpMetric:
@@ -392,6 +522,136 @@ else:
         ["action", "provider", "instance_type"],
     )
 
+    # Database connection pool metrics
+    DB_POOL_CHECKOUTS = LoggingNoOpMetric(
+        "db_pool_checkouts_total",
+        "Total database connection pool checkouts",
+        ["result"],
+    )
+    DB_POOL_WAIT_TIME = LoggingNoOpMetric(
+        "db_pool_wait_seconds",
+        "Time spent waiting for a free pooled database connection",
+    )
+    DB_POOL_HANDSHAKE_TIME = LoggingNoOpMetric(
+        "db_pool_handshake_seconds",
+        "Time spent opening new database connections",
+    )
+    DB_POOL_CONNECTIONS = LoggingNoOpMetric(
+        "db_pool_connections", "Pooled database connections", ["state"]
+    )
+
+    # LLM response cache metrics
+    LLM_CACHE_HITS = LoggingNoOpMetric(
+        "llm_cache_hits_total", "LLM response cache hits", ["namespace", "tier"]
+    )
+    LLM_CACHE_MISSES = LoggingNoOpMetric(
+        "llm_cache_misses_total", "LLM response cache misses"
+    )
+    LLM_CACHE_BYTES = LoggingNoOpMetric(
+        "llm_cache_bytes_total",
+        "Bytes read from and written to the LLM response cache",
+        ["operation"],
+    )
+    LLM_CACHE_SAVED_TOKENS = LoggingNoOpMetric(
+        "llm_cache_saved_tokens_total",
+        "Tokens served from the LLM response cache instead of a provider",
+        ["namespace"],
+    )
+    LLM_CACHE_SAVED_COST = LoggingNoOpMetric(
+        "llm_cache_saved_cost_dollars_total",
+        "Estimated provider spend avoided by LLM response cache hits",
+        ["namespace"],
+    )
+
+    # Local screenshot browser pool metrics
+    SCREENSHOT_CAPTURES = LoggingNoOpMetric(
+        "screenshot_captures_total",
+        "Screenshots captured with the local browser pool",
+        ["result"],
+    )
+    SCREENSHOT_CAPTURE_TIME = LoggingNoOpMetric(
+        "screenshot_capture_seconds",
+        "Time to capture one screenshot with the local browser pool",
+    )
+    SCREENSHOT_THROUGHPUT = LoggingNoOpMetric(
+        "screenshot_throughput_per_second",
+        "Screenshots completed per second over the last minute",
+    )
+    SCREENSHOT_LATENCY_P95 = LoggingNoOpMetric(
+        "screenshot_capture_p95_seconds",
+        "95th percentile capture time of recent screenshots",
+    )
+    SCREENSHOT_BROWSER_RECYCLES = LoggingNoOpMetric(
+        "screenshot_browser_recycles_total",
+        "Browser contexts and browsers recycled by the screenshot pool",
+        ["reason"],
+    )
+
+    # Screenshot and mockup asset cache metrics
+    ASSET_CACHE_LOOKUPS = LoggingNoOpMetric(
+        "asset_cache_lookups_total",
+        "Screenshot and mockup asset cache lookups",
+        ["asset_type", "result"],
+    )
+    ASSET_CACHE_SECONDS_SAVED = LoggingNoOpMetric(
+        "asset_cache_seconds_saved_total",
+        "Capture and render time avoided by asset cache hits",
+        ["asset_type"],
+    )
+    ASSET_CACHE_BYTES_SAVED = LoggingNoOpMetric(
+        "asset_cache_bytes_saved_total",
+        "Image bytes not rewritten or re-uploaded because of asset cache hits",
+        ["asset_type"],
+    )
+
+    # Shared application cache metrics
+    CACHE_HITS = LoggingNoOpMetric(
+        "cache_hits_total", "Shared application cache hits", ["cache", "tier"]
+    )
+    CACHE_MISSES = LoggingNoOpMetric(
+        "cache_misses_total", "Shared application cache misses", ["cache"]
+    )
+    CACHE_EVICTIONS = LoggingNoOpMetric(
+        "cache_evictions_total",
+        "Entries evicted from the in-process cache tier to stay within its limit",
+        ["cache"],
+    )
+    CACHE_INVALIDATIONS = LoggingNoOpMetric(
+        "cache_invalidations_total",
+        "Cache entries removed by key, tag or clear invalidation",
+        ["cache"],
+    )
+    CACHE_RECOMPUTES = LoggingNoOpMetric(
+        "cache_recomputes_total",
+        "Values computed by get_or_set, by whether this caller led or waited",
+        ["cache", "role"],
+    )
+
+    # Webhook intake log and consumer metrics
+    WEBHOOK_INTAKE_EVENTS = LoggingNoOpMetric(
+        "webhook_intake_events_total",
+        "Webhooks received by the intake endpoint",
+        ["webhook", "result"],
+    )
+    WEBHOOK_INTAKE_LATENCY = LoggingNoOpMetric(
+        "webhook_intake_latency_seconds",
+        "Time to validate a webhook and durably append it to the intake log",
+        ["webhook"],
+    )
+    WEBHOOK_CONSUMER_EVENTS = LoggingNoOpMetric(
+        "webhook_consumer_events_total",
+        "Intake log events handled by the webhook consumers",
+        ["event_type", "result"],
+    )
+    WEBHOOK_CONSUMER_LAG_EVENTS = LoggingNoOpMetric(
+        "webhook_consumer_lag_events",
+        "Intake log events appended but not yet processed",
+    )
+    WEBHOOK_CONSUMER_LAG_SECONDS = LoggingNoOpMetric(
+        "webhook_consumer_lag_seconds",
+        "Age of the oldest unprocessed intake log event",
+    )
+
 
 def initialize_metrics():
     """
@@ -12,6 +12,9 @@ import hashlib
 import hmac
 import json
 import logging
+import threading
+import time
+from collections import Counter
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
@@ -35,6 +38,9 @@ except ImportError:
         def execute(self, *args, **kwargs):
             pass
 
+        def executemany(self, *args, **kwargs):
+            pass
+
         def fetchall(self):
             return []
 
@@ -131,6 +137,14 @@ class SendGridWebhookHandler:
             "critical": 0.005,  # 0.5% spam rate critical
             "block": 0.01,  # 1% spam rate blocks sending
         }
+        # Rolling send/bounce/spam counts used by process_webhook_batch so the
+        # rate checks don't re-count the event tables for every bounce. They
+        # are reloaded from the database every rate_refresh_seconds to pick up
+        # sends and events recorded by other processes.
+        self.rate_window_hours = 24
+        self.rate_refresh_seconds = 300
+        self._rate_counters: Optional[dict[str, float]] = None
+        self._rate_lock = threading.Lock()
 
     def verify_signature(self, payload: bytes, signature: str) -> bool:
         """Verify the webhook signature from SendGrid.
@@ -208,6 +222,229 @@ class SendGridWebhookHandler:
 
         return event_counts
 
+    def process_webhook_batch(self, events: list[dict[str, Any]]) -> dict[str, int]:
+        """Process a webhook POST in a single pass.
+
+        Events are grouped by type and each group is written with one
+        multi-row statement inside a single transaction. Bounce and spam
+        thresholds are checked once per batch against rolling counters
+        instead of re-counting the tables after every bounce.
+
+        Status updates are applied per batch rather than per event: delivered
+        first, then soft bounce increments, then the suppression statuses
+        (hard_bounced, blocked, spam_complaint, unsubscribed), where the last
+        event for an address wins.
+
+        Args:
+            events: List of webhook event dictionaries
+
+        Returns:
+            Dictionary with counts of processed events by type
+
+        Raises:
+            Exception: If the batch could not be written. Every write is an
+                upsert and events already on record are not counted again,
+                so the caller should answer with an error status and let
+                SendGrid redeliver the whole batch.
+        """
+        event_counts: Counter = Counter()
+        bounce_rows: dict[tuple, tuple] = {}
+        spam_rows: dict[tuple, tuple] = {}
+        unsubscribe_rows: dict[tuple, tuple] = {}
+        delivered_rows: list[tuple] = []
+        suppressed: dict[str, str] = {}
+        now = datetime.now().isoformat()
+
+        for index, event_data in enumerate(events):
+            event_type = (
+                event_data.get("event") if isinstance(event_data, dict) else None
+            )
+            if not event_type:
+                logger.warning("Event missing 'event' field, skipping")
+                continue
+
+            event_counts[event_type] += 1
+            email = event_data.get("email")
+            # Redelivered events share an sg_event_id; events without one
+            # are never collapsed.
+            key = (email, event_data.get("sg_event_id") or index)
+
+            if event_type in [EventType.BOUNCE.value, EventType.DROPPED.value]:
+                bounce_event = BounceEvent.from_webhook_data(event_data)
+                bounce_rows[key] = (
+                    bounce_event.email,
+                    bounce_event.event,
+                    bounce_event.bounce_type,
+                    bounce_event.reason,
+                    bounce_event.status,
+                    bounce_event.message_id,
+                    bounce_event.sg_event_id,
+                    bounce_event.sg_message_id,
+                    bounce_event.timestamp,
+                    now,
+                )
+                if bounce_event.bounce_type == BounceType.HARD.value:
+                    suppressed[email] = "hard_bounced"
+                elif bounce_event.bounce_type == BounceType.BLOCK.value:
+                    suppressed[email] = "blocked"
+            elif event_type == EventType.SPAM_REPORT.value:
+                spam_rows[key] = self._event_row(event_data, now)
+                suppressed[email] = "spam_complaint"
+            elif event_type in [
+                EventType.UNSUBSCRIBE.value,
+                EventType.GROUP_UNSUBSCRIBE.value,
+            ]:
+                unsubscribe_rows[key] = self._event_row(event_data, now)
+                suppressed[email] = "unsubscribed"
+            elif event_type == EventType.DELIVERED.value:
+                delivered_rows.append(
+                    (now, now, email, event_data.get("sg_message_id"))
+                )
+
+        if not (bounce_rows or spam_rows or unsubscribe_rows or delivered_rows):
+            return dict(event_counts)
+
+        # Load (or refresh) the counters before writing so they never
+        # include this batch twice.
+        self._get_rate_counters()
+
+        try:
+            with DatabaseConnection(self.db_path) as db:
+                # A redelivered batch must not count its bounces twice; only
+                # events not already on record bump counters.
+                recorded = self._recorded_events(
+                    db,
+                    "email_bounces",
+                    [(row[0], row[6]) for row in bounce_rows.values()],
+                )
+                new_bounces = [
+                    row
+                    for row in bounce_rows.values()
+                    if (row[0], row[6]) not in recorded
+                ]
+                recorded = self._recorded_events(
+                    db, "email_spam_reports", [row[:2] for row in spam_rows.values()]
+                )
+                new_spam = [
+                    row for row in spam_rows.values() if row[:2] not in recorded
+                ]
+                soft_bounces = Counter(
+                    row[0]
+                    for row in new_bounces
+                    if row[2] not in (BounceType.HARD.value, BounceType.BLOCK.value)
+                )
+
+                if bounce_rows:
+                    db.executemany(
+                        """
+                        INSERT OR REPLACE INTO email_bounces
+                        (email, event_type, bounce_type, reason, status, message_id,
+                         sg_event_id, sg_message_id, timestamp, created_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                        list(bounce_rows.values()),
+                    )
+                if spam_rows:
+                    db.executemany(
+                        """
+                        INSERT OR REPLACE INTO email_spam_reports
+                        (email, sg_event_id, sg_message_id, timestamp, created_at)
+                        VALUES (?, ?, ?, ?, ?)
+                    """,
+                        list(spam_rows.values()),
+                    )
+                if unsubscribe_rows:
+                    db.executemany(
+                        """
+                        INSERT OR REPLACE INTO email_unsubscribes
+                        (email, sg_event_id, sg_message_id, timestamp, created_at)
+                        VALUES (?, ?, ?, ?, ?)
+                    """,
+                        list(unsubscribe_rows.values()),
+                    )
+                if delivered_rows:
+                    db.executemany(
+                        """
+                        UPDATE email_queue
+                        SET status = 'delivered', delivered_at = ?, updated_at = ?
+                        WHERE recipient_email = ? AND message_id = ?
+                    """,
+                        delivered_rows,
+                    )
+                if soft_bounces:
+                    db.executemany(
+                        """
+                        UPDATE email_queue
+                        SET soft_bounce_count = COALESCE(soft_bounce_count, 0) + ?,
+                            updated_at = ?
+                        WHERE recipient_email = ?
+                    """,
+                        [(count, now, email) for email, count in soft_bounces.items()],
+                    )
+                if suppressed:
+                    db.executemany(
+                        """
+                        UPDATE email_queue
+                        SET status = ?, updated_at = ?
+                        WHERE recipient_email = ?
+                    """,
+                        [(status, now, email) for email, status in suppressed.items()],
+                    )
+                db.commit()
+        except Exception as e:
+            logger.error(f"Error writing batch of {len(events)} webhook events: {e}")
+            raise
+
+        logger.info(
+            f"Ingested {sum(event_counts.values())} webhook events: "
+            f"{len(bounce_rows)} bounces, {len(spam_rows)} spam reports, "
+            f"{len(unsubscribe_rows)} unsubscribes, {len(delivered_rows)} delivered"
+        )
+
+        bounce_rate, spam_rate = self._update_rate_counters(new_bounces, new_spam)
+        if bounce_rows:
+            self._check_bounce_rate_thresholds(bounce_rate)
+        if spam_rows:
+            self._check_spam_rate_thresholds(spam_rate)
+
+        return dict(event_counts)
+
+    @staticmethod
+    def _recorded_events(db, table: str, keys: list[tuple]) -> set[tuple]:
+        """Return the (email, sg_event_id) keys already stored in a table.
+
+        Args:
+            db: Open DatabaseConnection
+            table: email_bounces or email_spam_reports
+            keys: (email, sg_event_id) pairs; pairs without an ID are skipped
+
+        Returns:
+            The pairs from keys that the table already holds
+        """
+        event_ids = sorted({event_id for _, event_id in keys if event_id})
+        recorded = set()
+        for start in range(0, len(event_ids), 500):
+            chunk = event_ids[start : start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            db.execute(
+                f"SELECT email, sg_event_id FROM {table} "
+                f"WHERE sg_event_id IN ({placeholders})",
+                chunk,
+            )
+            recorded.update((row[0], row[1]) for row in db.fetchall())
+        return recorded & set(keys)
+
+    @staticmethod
+    def _event_row(event_data: dict[str, Any], created_at: str) -> tuple:
+        """Build an email_spam_reports/email_unsubscribes row."""
+        return (
+            event_data.get("email"),
+            event_data.get("sg_event_id"),
+            event_data.get("sg_message_id"),
+            event_data.get("timestamp"),
+            created_at,
+        )
+
     def _process_bounce_event(self, event_data: dict[str, Any]) -> None:
         """Process a bounce or dropped event.
 
@@ -455,11 +692,19 @@ class SendGridWebhookHandler:
         except Exception as e:
             logger.error(f"Error marking email as delivered: {e}")
 
-    def _check_bounce_rate_thresholds(self) -> None:
-        """Check if bounce rate thresholds are exceeded and take action."""
+    def _check_bounce_rate_thresholds(
+        self, bounce_rate: Optional[float] = None
+    ) -> None:
+        """Check if bounce rate thresholds are exceeded and take action.
+
+        Args:
+            bounce_rate: Precomputed bounce rate; queried from the database
+                when not given
+        """
         try:
-            # Calculate current bounce rate (last 24 hours)
-            bounce_rate = self._calculate_recent_bounce_rate(hours=24)
+            if bounce_rate is None:
+                # Calculate current bounce rate (last 24 hours)
+                bounce_rate = self._calculate_recent_bounce_rate(hours=24)
 
             if bounce_rate >= self.bounce_thresholds["block"]:
                 logger.critical(
@@ -482,11 +727,17 @@ class SendGridWebhookHandler:
         except Exception as e:
             logger.error(f"Error checking bounce rate thresholds: {e}")
 
-    def _check_spam_rate_thresholds(self) -> None:
-        """Check if spam rate thresholds are exceeded and take action."""
+    def _check_spam_rate_thresholds(self, spam_rate: Optional[float] = None) -> None:
+        """Check if spam rate thresholds are exceeded and take action.
+
+        Args:
+            spam_rate: Precomputed spam rate; queried from the database when
+                not given
+        """
         try:
-            # Calculate current spam rate (last 24 hours)
-            spam_rate = self._calculate_recent_spam_rate(hours=24)
+            if spam_rate is None:
+                # Calculate current spam rate (last 24 hours)
+                spam_rate = self._calculate_recent_spam_rate(hours=24)
 
             if spam_rate >= self.spam_thresholds["block"]:
                 logger.critical(
@@ -571,6 +822,84 @@ class SendGridWebhookHandler:
             logger.error(f"Error calculating spam rate: {e}")
             return 0.0
 
+    def _get_rate_counters(self) -> dict[str, float]:
+        """Return the rolling counters, reloading them when they are stale."""
+        with self._rate_lock:
+            counters = self._rate_counters
+            if (
+                counters is None
+                or time.monotonic() - counters["loaded_at"] >= self.rate_refresh_seconds
+            ):
+                counters = self._load_rate_counters()
+                self._rate_counters = counters
+            return counters
+
+    def _load_rate_counters(self) -> dict[str, float]:
+        """Count sends, bounces and spam reports in the rate window."""
+        cutoff_time = datetime.now().timestamp() - (self.rate_window_hours * 3600)
+        counters = {
+            "sent": 0,
+            "bounces": 0,
+            "spam_reports": 0,
+            "cutoff": cutoff_time,
+            "loaded_at": time.monotonic(),
+        }
+        try:
+            with DatabaseConnection(self.db_path) as db:
+                db.execute(
+                    """
+                    SELECT
+                        (SELECT COUNT(*) FROM email_queue
+                         WHERE created_at > ? AND status != 'pending'),
+                        (SELECT COUNT(*) FROM email_bounces WHERE timestamp > ?),
+                        (SELECT COUNT(*) FROM email_spam_reports WHERE timestamp > ?)
+                """,
+                    (
+                        datetime.fromtimestamp(cutoff_time).isoformat(),
+                        cutoff_time,
+                        cutoff_time,
+                    ),
+                )
+                row = db.fetchone()
+                if row:
+                    counters["sent"] = row[0] or 0
+                    counters["bounces"] = row[1] or 0
+                    counters["spam_reports"] = row[2] or 0
+        except Exception as e:
+            logger.error(f"Error loading webhook rate counters: {e}")
+        return counters
+
+    def _update_rate_counters(self, bounce_rows, spam_rows) -> tuple[float, float]:
+        """Add a committed batch to the counters and return the new rates.
+
+        Args:
+            bounce_rows: email_bounces rows written by the batch
+            spam_rows: email_spam_reports rows written by the batch
+
+        Returns:
+            Tuple of (bounce_rate, spam_rate)
+        """
+
+        def in_window(timestamp: Any, cutoff: float) -> bool:
+            try:
+                return float(timestamp) > cutoff
+            except (TypeError, ValueError):
+                return False
+
+        with self._rate_lock:
+            counters = self._rate_counters
+            cutoff = counters["cutoff"]
+            counters["bounces"] += sum(
+                1 for row in bounce_rows if in_window(row[8], cutoff)
+            )
+            counters["spam_reports"] += sum(
+                1 for row in spam_rows if in_window(row[3], cutoff)
+            )
+            sent = counters["sent"]
+            if sent <= 0:
+                return 0.0, 0.0
+            return counters["bounces"] / sent, counters["spam_reports"] / sent
+
     def _trigger_email_sending_block(self, reason: str) -> None:
         """Trigger a block on email sending."""
         logger.critical(f"BLOCKING EMAIL SENDING: {reason}")
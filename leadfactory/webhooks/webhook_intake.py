@@ -0,0 +1,620 @@
+#!/usr/bin/env python3
+"""
+Durable intake log and asynchronous consumers for incoming webhooks.
+
+Processing a webhook inline ties the HTTP response to the slowest handler
+and storage write. With the intake log the endpoint only validates the
+webhook, appends it to a local SQLite log and acknowledges it, and
+WebhookIntakeConsumer drains the log in the background.
+
+Appends are group-committed: a single writer thread commits every append
+that queued up while the previous commit was being fsync'd, so under load
+many webhooks share one fsync and each caller returns once its own entry is
+on disk. Entries carry a dedupe key (the provider's event ID, or a hash of
+the payload) so a redelivered webhook is appended only once. Consumers
+record finished entries in a separate table; the log itself is never
+rewritten, only purged once processed entries age out.
+"""
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from leadfactory.utils.logging import get_logger
+from leadfactory.utils.metrics import (
+    WEBHOOK_CONSUMER_EVENTS,
+    WEBHOOK_CONSUMER_LAG_EVENTS,
+    WEBHOOK_CONSUMER_LAG_SECONDS,
+    record_metric,
+)
+from leadfactory.webhooks.dead_letter_queue import (
+    DeadLetterQueueManager,
+    DeadLetterReason,
+)
+from leadfactory.webhooks.webhook_retry_manager import WebhookRetryManager
+from leadfactory.webhooks.webhook_validator import (
+    WebhookEvent,
+    WebhookEventType,
+    WebhookStatus,
+)
+
+logger = get_logger(__name__)
+
+# Configure with defaults from environment variables
+WEBHOOK_INTAKE_LOG_PATH = os.getenv(
+    "WEBHOOK_INTAKE_LOG_PATH",
+    str(Path(__file__).parent.parent / "data" / "webhook_intake.db"),
+)
+WEBHOOK_INTAKE_MAX_BATCH = int(os.getenv("WEBHOOK_INTAKE_MAX_BATCH", "500"))
+WEBHOOK_INTAKE_RETENTION_HOURS = float(
+    os.getenv("WEBHOOK_INTAKE_RETENTION_HOURS", "168")
+)
+WEBHOOK_CONSUMER_CONCURRENCY = int(os.getenv("WEBHOOK_CONSUMER_CONCURRENCY", "4"))
+WEBHOOK_CONSUMER_MAX_IN_FLIGHT = int(os.getenv("WEBHOOK_CONSUMER_MAX_IN_FLIGHT", "200"))
+
+# Payload fields providers use for a unique event ID, in order of preference
+DEDUPE_ID_FIELDS = ("event_id", "sg_event_id", "id")
+
+
+def dedupe_key(event: WebhookEvent) -> str:
+    """Return the key used to drop redelivered webhooks.
+
+    Args:
+        event: Validated webhook event
+
+    Returns:
+        The provider's event ID if the payload has one, otherwise a hash of
+        the payload, prefixed with the webhook name
+    """
+    payload = event.payload
+    if isinstance(payload, dict):
+        for field_name in DEDUPE_ID_FIELDS:
+            value = payload.get(field_name)
+            if value:
+                return f"{event.webhook_name}:{value}"
+
+    digest = hashlib.sha256(
+        json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{event.webhook_name}:sha256:{digest}"
+
+
+def event_from_dict(data: Dict[str, Any]) -> WebhookEvent:
+    """Rebuild a WebhookEvent from WebhookEvent.to_dict() output."""
+    processed_at = data.get("processed_at")
+    return WebhookEvent(
+        event_id=data["event_id"],
+        webhook_name=data.get("webhook_name", ""),
+        event_type=WebhookEventType(data.get("event_type", "custom")),
+        payload=data.get("payload") or {},
+        headers=data.get("headers") or {},
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        source_ip=data.get("source_ip"),
+        user_agent=data.get("user_agent"),
+        status=WebhookStatus(data.get("status", "pending")),
+        retry_count=data.get("retry_count", 0),
+        last_error=data.get("last_error"),
+        processed_at=datetime.fromisoformat(processed_at) if processed_at else None,
+        signature_verified=data.get("signature_verified", False),
+    )
+
+
+@dataclass
+class IntakeRecord:
+    """An entry read back from the intake log."""
+
+    seq: int
+    dedupe_key: str
+    event: WebhookEvent
+    received_at: float
+
+
+@dataclass
+class _PendingWrite:
+    """A write waiting for the next group commit."""
+
+    kind: str  # "append", "done" or "flush"
+    params: Tuple = ()
+    result: Optional[int] = None
+    error: Optional[Exception] = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+class WebhookIntakeLog:
+    """Append-only, SQLite-backed log of accepted webhooks."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_batch: int = WEBHOOK_INTAKE_MAX_BATCH,
+        append_timeout: float = 10.0,
+    ):
+        """Open (or create) the intake log.
+
+        Args:
+            path: SQLite database file; defaults to WEBHOOK_INTAKE_LOG_PATH
+            max_batch: Maximum number of writes in one commit
+            append_timeout: Seconds append() waits for its commit
+        """
+        self.path = str(path or WEBHOOK_INTAKE_LOG_PATH)
+        self.max_batch = max_batch
+        self.append_timeout = append_timeout
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._create_schema()
+        self._read_conn = self._connect()
+        self._read_lock = threading.Lock()
+
+        self._queue: List[_PendingWrite] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._listeners: List[Callable[[], None]] = []
+
+        self.stats = {"appended": 0, "duplicates": 0, "commits": 0}
+
+        self._writer = threading.Thread(
+            target=self._writer_loop, name="webhook-intake-writer", daemon=True
+        )
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # FULL makes every commit fsync; group commit amortizes it
+        conn.execute("PRAGMA synchronous=FULL")
+        return conn
+
+    def _create_schema(self):
+        conn = self._connect()
+        try:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS intake_log (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    dedupe_key TEXT NOT NULL UNIQUE,
+                    webhook_name TEXT NOT NULL,
+                    event_type TEXT NOT NULL,
+                    event_json TEXT NOT NULL,
+                    received_at REAL NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS intake_done (
+                    seq INTEGER PRIMARY KEY,
+                    outcome TEXT NOT NULL,
+                    finished_at REAL NOT NULL
+                );
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def append(self, event: WebhookEvent) -> Optional[int]:
+        """Durably append a validated event.
+
+        Blocks until the commit that contains the event has been fsync'd.
+
+        Args:
+            event: Validated webhook event
+
+        Returns:
+            The log sequence number, or None if an event with the same
+            dedupe key is already in the log
+
+        Raises:
+            Exception: If the event could not be written
+        """
+        write = _PendingWrite(
+            "append",
+            (
+                dedupe_key(event),
+                event.webhook_name,
+                event.event_type.value,
+                json.dumps(event.to_dict(), default=str),
+                time.time(),
+            ),
+        )
+        self._submit(write)
+        if not write.done.wait(self.append_timeout):
+            raise TimeoutError("Timed out waiting for the webhook intake log")
+        if write.error:
+            raise write.error
+        return write.result
+
+    def mark_done(self, seq: int, outcome: str):
+        """Record that an entry has been handled.
+
+        The write is committed with the next group commit; until then a
+        restarted consumer may see the entry again.
+
+        Args:
+            seq: Log sequence number
+            outcome: How the entry was handled
+        """
+        self._submit(_PendingWrite("done", (seq, outcome, time.time())))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every write submitted so far has been committed."""
+        write = _PendingWrite("flush")
+        self._submit(write)
+        return write.done.wait(timeout)
+
+    def _submit(self, write: _PendingWrite):
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Webhook intake log is closed")
+            self._queue.append(write)
+            self._cond.notify()
+
+    def _writer_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not self._closed:
+                        self._cond.wait()
+                    if not self._queue:
+                        return
+                    batch = self._queue[: self.max_batch]
+                    del self._queue[: self.max_batch]
+                self._commit(conn, batch)
+        finally:
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[_PendingWrite]):
+        appended = 0
+        try:
+            for write in batch:
+                if write.kind == "append":
+                    cursor = conn.execute(
+                        """
+                        INSERT OR IGNORE INTO intake_log
+                        (dedupe_key, webhook_name, event_type, event_json, received_at)
+                        VALUES (?, ?, ?, ?, ?)
+                        """,
+                        write.params,
+                    )
+                    write.result = cursor.lastrowid if cursor.rowcount else None
+                    appended += 1 if cursor.rowcount else 0
+                elif write.kind == "done":
+                    conn.execute(
+                        "INSERT OR REPLACE INTO intake_done (seq, outcome, finished_at) "
+                        "VALUES (?, ?, ?)",
+                        write.params,
+                    )
+            conn.commit()
+        except Exception as e:
+            logger.error(f"Error committing {len(batch)} webhook intake writes: {e}")
+            conn.rollback()
+            appended = 0
+            for write in batch:
+                write.result = None
+                write.error = e
+        finally:
+            self.stats["commits"] += 1
+            self.stats["appended"] += appended
+            self.stats["duplicates"] += sum(
+                1
+                for write in batch
+                if write.kind == "append" and write.error is None and not write.result
+            )
+            for write in batch:
+                write.done.set()
+
+        if appended:
+            for listener in list(self._listeners):
+                try:
+                    listener()
+                except Exception as e:
+                    logger.debug(f"Webhook intake listener failed: {e}")
+
+    def subscribe(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Call callback from the writer thread after new entries commit.
+
+        Returns:
+            Function that removes the subscription
+        """
+        self._listeners.append(callback)
+        return lambda: self._listeners.remove(callback)
+
+    def read_pending(self, after_seq: int = 0, limit: int = 100) -> List[IntakeRecord]:
+        """Return unhandled entries in log order.
+
+        Args:
+            after_seq: Only return entries after this sequence number
+            limit: Maximum number of entries
+
+        Returns:
+            List of IntakeRecord
+        """
+        with self._read_lock:
+            rows = self._read_conn.execute(
+                """
+                SELECT l.seq, l.dedupe_key, l.event_json, l.received_at
+                FROM intake_log l
+                LEFT JOIN intake_done d ON d.seq = l.seq
+                WHERE l.seq > ? AND d.seq IS NULL
+                ORDER BY l.seq
+                LIMIT ?
+                """,
+                (after_seq, limit),
+            ).fetchall()
+
+        records = []
+        for seq, key, event_json, received_at in rows:
+            try:
+                event = event_from_dict(json.loads(event_json))
+            except Exception as e:
+                logger.error(f"Skipping unreadable intake log entry {seq}: {e}")
+                self.mark_done(seq, "unreadable")
+                continue
+            records.append(IntakeRecord(seq, key, event, received_at))
+        return records
+
+    def lag(self) -> Tuple[int, float]:
+        """Return (unhandled entries, age in seconds of the oldest one)."""
+        with self._read_lock:
+            count, oldest = self._read_conn.execute(
+                """
+                SELECT COUNT(*), MIN(l.received_at)
+                FROM intake_log l
+                LEFT JOIN intake_done d ON d.seq = l.seq
+                WHERE d.seq IS NULL
+                """
+            ).fetchone()
+        return count or 0, max(0.0, time.time() - oldest) if oldest else 0.0
+
+    def purge_processed(
+        self, older_than_hours: float = WEBHOOK_INTAKE_RETENTION_HOURS
+    ) -> int:
+        """Delete handled entries older than the retention period.
+
+        Redeliveries are only recognised while the original entry is kept,
+        so the retention period is also the dedupe window.
+
+        Returns:
+            Number of entries deleted
+        """
+        cutoff = time.time() - older_than_hours * 3600
+        with self._read_lock:
+            conn = self._read_conn
+            cursor = conn.execute(
+                """
+                DELETE FROM intake_log WHERE seq IN (
+                    SELECT seq FROM intake_done WHERE finished_at < ?
+                )
+                """,
+                (cutoff,),
+            )
+            conn.execute("DELETE FROM intake_done WHERE finished_at < ?", (cutoff,))
+            conn.commit()
+        return cursor.rowcount
+
+    def close(self):
+        """Commit outstanding writes and stop the writer thread."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._writer.join()
+        with self._read_lock:
+            self._read_conn.close()
+
+
+class WebhookIntakeConsumer:
+    """Drains the intake log with per-event-type concurrency limits."""
+
+    def __init__(
+        self,
+        intake_log: WebhookIntakeLog,
+        handler: Callable[[WebhookEvent], bool],
+        retry_manager: Optional[WebhookRetryManager] = None,
+        dead_letter_manager: Optional[DeadLetterQueueManager] = None,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        default_concurrency: int = WEBHOOK_CONSUMER_CONCURRENCY,
+        max_in_flight: int = WEBHOOK_CONSUMER_MAX_IN_FLIGHT,
+        poll_interval: float = 1.0,
+        purge_interval: float = 3600.0,
+    ):
+        """Initialize the consumer.
+
+        Args:
+            intake_log: Log to drain
+            handler: Processes one event, returning True on success
+            retry_manager: Receives events whose handler failed
+            dead_letter_manager: Receives events the retry manager refuses
+            concurrency_limits: Concurrent events per event type value,
+                e.g. {"payment_success": 2}
+            default_concurrency: Limit for event types not listed
+            max_in_flight: Maximum events being processed at once
+            poll_interval: Seconds between log polls when idle
+            purge_interval: Seconds between purges of handled entries
+        """
+        self.intake_log = intake_log
+        self.handler = handler
+        self.retry_manager = retry_manager
+        self.dead_letter_manager = dead_letter_manager
+        self.concurrency_limits = dict(concurrency_limits or {})
+        self.default_concurrency = default_concurrency
+        self.max_in_flight = max_in_flight
+        self.poll_interval = poll_interval
+        self.purge_interval = purge_interval
+
+        self.stats = {"processed": 0, "retried": 0, "dead_lettered": 0, "failed": 0}
+
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[int, asyncio.Task] = {}
+        self._cursor = 0
+        self._running = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._last_purge = time.monotonic()
+
+    async def run(self):
+        """Consume the log until stop() is called."""
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        unsubscribe = self.intake_log.subscribe(self._notify)
+        self._running = True
+        logger.info("Started webhook intake consumer")
+
+        try:
+            while self._running:
+                self._wakeup.clear()
+                dispatched = await self.dispatch_pending()
+                await self._report_lag()
+                await self._maybe_purge()
+
+                if len(self._in_flight) >= self.max_in_flight:
+                    await asyncio.wait(
+                        list(self._in_flight.values()),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                elif not dispatched:
+                    with contextlib.suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(
+                            self._wakeup.wait(), timeout=self.poll_interval
+                        )
+        finally:
+            unsubscribe()
+            await self.join()
+            self._running = False
+            logger.info("Stopped webhook intake consumer")
+
+    async def dispatch_pending(self) -> int:
+        """Start processing unhandled log entries up to max_in_flight.
+
+        Returns:
+            Number of entries dispatched
+        """
+        capacity = self.max_in_flight - len(self._in_flight)
+        if capacity <= 0:
+            return 0
+
+        records = await asyncio.to_thread(
+            self.intake_log.read_pending, self._cursor, capacity
+        )
+        for record in records:
+            self._cursor = max(self._cursor, record.seq)
+            task = asyncio.create_task(self._consume(record))
+            self._in_flight[record.seq] = task
+            task.add_done_callback(
+                lambda _task, seq=record.seq: self._in_flight.pop(seq, None)
+            )
+        return len(records)
+
+    async def join(self):
+        """Wait for every dispatched entry to finish."""
+        while self._in_flight:
+            await asyncio.gather(
+                *list(self._in_flight.values()), return_exceptions=True
+            )
+
+    def stop(self):
+        """Stop consuming once in-flight events finish."""
+        self._running = False
+        self._notify()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    def start_background(self) -> threading.Thread:
+        """Run the consumer on its own event loop in a daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=asyncio.run,
+                args=(self.run(),),
+                name="webhook-intake-consumer",
+                daemon=True,
+            )
+            self._thread.start()
+        return self._thread
+
+    def _notify(self):
+        if self._loop and self._wakeup and not self._loop.is_closed():
+            with contextlib.suppress(RuntimeError):
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _semaphore(self, event_type: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(event_type)
+        if semaphore is None:
+            limit = self.concurrency_limits.get(event_type, self.default_concurrency)
+            semaphore = asyncio.Semaphore(max(1, limit))
+            self._semaphores[event_type] = semaphore
+        return semaphore
+
+    async def _consume(self, record: IntakeRecord):
+        event_type = record.event.event_type.value
+        async with self._semaphore(event_type):
+            try:
+                outcome = await asyncio.to_thread(self._process, record.event)
+            except Exception as e:
+                logger.error(f"Error consuming intake entry {record.seq}: {e}")
+                outcome = "failed"
+
+        self.stats[outcome] += 1
+        record_metric(WEBHOOK_CONSUMER_EVENTS, event_type=event_type, result=outcome)
+        self.intake_log.mark_done(record.seq, outcome)
+
+    def _process(self, event: WebhookEvent) -> str:
+        """Run the handler and hand failures off; returns the outcome."""
+        try:
+            if self.handler(event):
+                return "processed"
+            error = "Processing failed"
+        except Exception as e:
+            error = str(e)
+
+        logger.warning(f"Webhook event {event.event_id} failed: {error}")
+
+        if self.retry_manager and self.retry_manager.schedule_retry(
+            event_id=event.event_id,
+            webhook_name=event.webhook_name,
+            retry_attempt=event.retry_count + 1,
+            error=error,
+        ):
+            return "retried"
+
+        if self.dead_letter_manager:
+            self.dead_letter_manager.add_event(
+                webhook_event=event.to_dict(),
+                reason=DeadLetterReason.MAX_RETRIES_EXCEEDED,
+                last_error=error,
+            )
+            return "dead_lettered"
+
+        return "failed"
+
+    async def _report_lag(self):
+        try:
+            count, age = await asyncio.to_thread(self.intake_log.lag)
+        except Exception as e:
+            logger.debug(f"Could not read webhook intake lag: {e}")
+            return
+        WEBHOOK_CONSUMER_LAG_EVENTS.set(count)
+        WEBHOOK_CONSUMER_LAG_SECONDS.set(age)
+
+    async def _maybe_purge(self):
+        if time.monotonic() - self._last_purge < self.purge_interval:
+            return
+        self._last_purge = time.monotonic()
+        try:
+            purged = await asyncio.to_thread(self.intake_log.purge_processed)
+            if purged:
+                logger.info(f"Purged {purged} handled webhook intake entries")
+        except Exception as e:
+            logger.error(f"Error purging webhook intake log: {e}")
@@ -8,6 +8,7 @@ a unified webhook processing experience.
 """
 
 import json
+import time
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
@@ -18,10 +19,16 @@ from leadfactory.pipeline.error_handling import (
     PipelineError,
 )
 from leadfactory.utils.logging import get_logger
+from leadfactory.utils.metrics import (
+    WEBHOOK_INTAKE_EVENTS,
+    WEBHOOK_INTAKE_LATENCY,
+    record_metric,
+)
 from leadfactory.webhooks.dead_letter_queue import (
     DeadLetterQueueManager,
     DeadLetterReason,
 )
+from leadfactory.webhooks.webhook_intake import WebhookIntakeConsumer, WebhookIntakeLog
 from leadfactory.webhooks.webhook_monitor import WebhookMonitor
 from leadfactory.webhooks.webhook_retry_manager import WebhookRetryManager
 from leadfactory.webhooks.webhook_validator import (
@@ -44,6 +51,7 @@ class WebhookIntegrationService:
         webhook_monitor: Optional[WebhookMonitor] = None,
         retry_manager: Optional[WebhookRetryManager] = None,
         dead_letter_manager: Optional[DeadLetterQueueManager] = None,
+        intake_log: Optional[WebhookIntakeLog] = None,
     ):
         """Initialize the integration service.
 
@@ -53,12 +61,15 @@ class WebhookIntegrationService:
             webhook_monitor: Webhook health monitor
             retry_manager: Webhook retry manager
             dead_letter_manager: Dead letter queue manager
+            intake_log: Intake log used by accept_webhook; opened on first use
         """
         self.engagement_analytics = engagement_analytics or EngagementAnalytics()
         self.error_manager = error_manager or ErrorPropagationManager()
         self.webhook_monitor = webhook_monitor or WebhookMonitor()
         self.retry_manager = retry_manager or WebhookRetryManager()
         self.dead_letter_manager = dead_letter_manager or DeadLetterQueueManager()
+        self._intake_log = intake_log
+        self.intake_consumer: Optional[WebhookIntakeConsumer] = None
 
         # Create the main webhook validator with integrated services
         self.webhook_validator = WebhookValidator(
@@ -197,6 +208,131 @@ class WebhookIntegrationService:
 
         return result
 
+    @property
+    def intake_log(self) -> WebhookIntakeLog:
+        """Durable log that accept_webhook appends to."""
+        if self._intake_log is None:
+            self._intake_log = WebhookIntakeLog()
+        return self._intake_log
+
+    def accept_webhook(
+        self,
+        webhook_name: str,
+        payload: bytes,
+        headers: Dict[str, str],
+        source_ip: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Validate a webhook and append it to the intake log.
+
+        Handlers run later in the intake consumer (see
+        start_intake_consumer), so the response only waits for validation
+        and one group-committed write.
+
+        Args:
+            webhook_name: Name of the webhook
+            payload: Raw webhook payload
+            headers: HTTP headers
+            source_ip: Source IP address
+
+        Returns:
+            Result dictionary; success is False when the webhook was
+            rejected or could not be written and the sender should retry
+        """
+        start_time = time.perf_counter()
+        result = {
+            "success": False,
+            "event_id": None,
+            "status": "rejected",
+            "message": "",
+            "duplicate": False,
+            "intake_ms": 0,
+        }
+
+        try:
+            event = self.webhook_validator.validate_webhook(
+                webhook_name, payload, headers, source_ip
+            )
+        except Exception as validation_error:
+            result["message"] = f"Validation error: {validation_error}"
+            self._handle_validation_error(webhook_name, validation_error, headers)
+            record_metric(
+                WEBHOOK_INTAKE_EVENTS, webhook=webhook_name, result="rejected"
+            )
+            return result
+
+        result["event_id"] = event.event_id
+
+        try:
+            seq = self.intake_log.append(event)
+        except Exception as e:
+            logger.error(f"Error appending webhook {event.event_id} to intake log: {e}")
+            result["status"] = "failed"
+            result["message"] = f"Intake error: {e}"
+            record_metric(WEBHOOK_INTAKE_EVENTS, webhook=webhook_name, result="failed")
+            return result
+
+        elapsed = time.perf_counter() - start_time
+        result["success"] = True
+        result["duplicate"] = seq is None
+        result["status"] = "duplicate" if seq is None else "accepted"
+        result["message"] = (
+            "Webhook already received" if seq is None else "Webhook accepted"
+        )
+        result["intake_ms"] = round(elapsed * 1000, 2)
+
+        record_metric(
+            WEBHOOK_INTAKE_EVENTS, webhook=webhook_name, result=result["status"]
+        )
+        record_metric(WEBHOOK_INTAKE_LATENCY, elapsed, webhook=webhook_name)
+        return result
+
+    def start_intake_consumer(self, **kwargs) -> WebhookIntakeConsumer:
+        """Start draining the intake log in a background thread.
+
+        Failed events are handed to the retry manager, and to the dead
+        letter queue once the retry manager refuses them.
+
+        Args:
+            **kwargs: Options for WebhookIntakeConsumer, such as
+                concurrency_limits
+
+        Returns:
+            The running consumer
+        """
+        if self.intake_consumer is None:
+            self.intake_consumer = WebhookIntakeConsumer(
+                self.intake_log,
+                self._process_intake_event,
+                retry_manager=self.retry_manager,
+                dead_letter_manager=self.dead_letter_manager,
+                **kwargs,
+            )
+            self.intake_consumer.start_background()
+        return self.intake_consumer
+
+    def _process_intake_event(self, event: WebhookEvent) -> bool:
+        """Run the registered handlers for an event read from the intake log."""
+        try:
+            success = self.webhook_validator.process_webhook(event)
+        except Exception as e:
+            self.error_manager.record_error(
+                PipelineError.from_exception(
+                    exception=e,
+                    stage="webhook_processing",
+                    operation=f"process_{event.webhook_name}",
+                    context={
+                        "event_id": event.event_id,
+                        "webhook_name": event.webhook_name,
+                        "event_type": event.event_type.value,
+                    },
+                )
+            )
+            raise
+
+        if success:
+            self._track_webhook_success(event)
+        return success
+
     def _handle_email_delivery(self, event: WebhookEvent) -> bool:
         """Handle email delivery events."""
         try:
@@ -717,6 +853,13 @@ class WebhookIntegrationService:
             # Stop retry queue
             self.retry_manager.stop_queue()
 
+            # Drain in-flight intake events, then commit the log
+            if self.intake_consumer:
+                self.intake_consumer.stop()
+                self.intake_consumer = None
+            if self._intake_log:
+                self._intake_log.close()
+
             logger.info("WebhookIntegrationService shutdown completed")
 
         except Exception as e:
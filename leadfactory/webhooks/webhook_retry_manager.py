@@ -4,11 +4,18 @@ Webhook-specific retry management with intelligent backoff and circuit breakers.
 
 This module extends the general retry mechanisms with webhook-specific logic,
 including priority queues, batch processing, and webhook-specific failure patterns.
+
+Pending retries are scheduled in memory on a min-heap keyed by next retry time;
+the queue processor sleeps until the earliest item is due and dispatches due
+items in priority order. Storage is only written for durability and read once
+as a warm-start snapshot when the processor starts.
 """
 
 import asyncio
 import heapq
+import itertools
 import json
+import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -54,7 +61,7 @@ class WebhookRetryItem:
     event_id: str
     webhook_name: str
     retry_attempt: int
-    next_retry_time: datetime
+    next_retry_time: datetime = field(default_factory=datetime.utcnow)
     priority: WebhookPriority = WebhookPriority.NORMAL
     error_count: int = 0
     last_error: Optional[str] = None
@@ -67,6 +74,41 @@ class WebhookRetryItem:
             return self.priority.value > other.priority.value
         return self.next_retry_time < other.next_retry_time
 
+    def to_storage_dict(self) -> Dict[str, Any]:
+        """Convert to the row format used by the webhook_retries table."""
+        return {
+            "event_id": self.event_id,
+            "webhook_name": self.webhook_name,
+            "retry_attempt": self.retry_attempt,
+            "next_retry_time": self.next_retry_time,
+            "priority": self.priority.name.lower(),
+            "error_count": self.error_count,
+            "last_error": self.last_error,
+            "created_at": self.created_at,
+        }
+
+    @classmethod
+    def from_storage_dict(cls, data: Dict[str, Any]) -> "WebhookRetryItem":
+        """Create a retry item from a stored row.
+
+        Priority may be a WebhookPriority, its name in any case, or its value.
+        """
+        data = dict(data)
+        priority = data.get("priority") or WebhookPriority.NORMAL
+        if isinstance(priority, str):
+            priority = WebhookPriority[priority.upper()]
+        elif not isinstance(priority, WebhookPriority):
+            priority = WebhookPriority(priority)
+        data["priority"] = priority
+
+        for key in ("next_retry_time", "created_at"):
+            if isinstance(data.get(key), str):
+                data[key] = datetime.fromisoformat(data[key])
+        if data.get("created_at") is None:
+            data.pop("created_at", None)
+
+        return cls(**data)
+
 
 class WebhookRetryManager:
     """Enhanced retry manager specifically for webhooks."""
@@ -89,11 +131,23 @@ class WebhookRetryManager:
         self.batch_size = batch_size
         self.queue_check_interval = queue_check_interval
 
-        # Priority queue for retry items
+        # Every pending retry item; dispatch order comes from the heaps below
         self.retry_queue: List[WebhookRetryItem] = []
         self.queue_status = RetryQueueStatus.IDLE
         self.current_retries: Set[str] = set()
 
+        # Scheduler state: items waiting for their retry time keyed by
+        # (next_retry_time, sequence), and due items waiting for a batch slot.
+        # Together they hold the same items as retry_queue.
+        self._timers: List[tuple] = []
+        self._ready: List[WebhookRetryItem] = []
+        # Index of each item in retry_queue, keyed by id(item)
+        self._positions: Dict[int, int] = {}
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
         # Webhook-specific retry configurations
         self.webhook_retry_configs: Dict[str, RetryConfig] = {}
         self.webhook_circuit_breakers: Dict[str, CircuitBreaker] = {}
@@ -261,12 +315,11 @@ class WebhookRetryManager:
                 last_error=error,
             )
 
-            # Add to priority queue
-            heapq.heappush(self.retry_queue, retry_item)
-            self.stats["items_in_queue"] = len(self.retry_queue)
+            # Add to the scheduler
+            self._push_items([retry_item])
 
             # Store in persistent storage
-            self.storage.store_webhook_retry_item(retry_item.__dict__)
+            self.storage.store_webhook_retry_item(retry_item.to_storage_dict())
 
             logger.info(
                 f"Scheduled retry for event {event_id} at {next_retry_time} "
@@ -323,20 +376,109 @@ class WebhookRetryManager:
         # Default to normal priority
         return WebhookPriority.NORMAL
 
+    def _push_items(self, items: List[WebhookRetryItem]):
+        """Add items to the queue and wake the processor if it is sleeping."""
+        with self._lock:
+            self._sync_timers()
+            for item in items:
+                self._positions[id(item)] = len(self.retry_queue)
+                self.retry_queue.append(item)
+                heapq.heappush(
+                    self._timers, (item.next_retry_time, next(self._sequence), item)
+                )
+            self.stats["items_in_queue"] = len(self.retry_queue)
+        self._wake()
+
+    def _sync_timers(self):
+        """Rebuild the scheduler state if retry_queue was changed directly."""
+        if len(self._positions) == len(self.retry_queue) and len(self._timers) + len(
+            self._ready
+        ) == len(self.retry_queue):
+            return
+        self._positions = {id(item): i for i, item in enumerate(self.retry_queue)}
+        self._timers = [
+            (item.next_retry_time, next(self._sequence), item)
+            for item in self.retry_queue
+        ]
+        heapq.heapify(self._timers)
+        self._ready = []
+
+    def _take_ready_batch(self, current_time: datetime) -> List[WebhookRetryItem]:
+        """Pop the highest-priority batch of items due at current_time."""
+        with self._lock:
+            self._sync_timers()
+            while self._timers and self._timers[0][0] <= current_time:
+                heapq.heappush(self._ready, heapq.heappop(self._timers)[2])
+
+            batch = [
+                heapq.heappop(self._ready)
+                for _ in range(min(self.batch_size, len(self._ready)))
+            ]
+            for item in batch:
+                self._remove_from_queue(item)
+            self.stats["items_in_queue"] = len(self.retry_queue)
+            return batch
+
+    def _remove_from_queue(self, item: WebhookRetryItem):
+        """Remove a dispatched item from retry_queue in constant time."""
+        position = self._positions.pop(id(item))
+        last = self.retry_queue.pop()
+        if last is not item:
+            self.retry_queue[position] = last
+            self._positions[id(last)] = position
+
+    def _seconds_until_next_retry(self) -> Optional[float]:
+        """Seconds until the next item is due, or None if nothing is queued."""
+        with self._lock:
+            self._sync_timers()
+            if self._ready:
+                return 0.0
+            if not self._timers:
+                return None
+            delay = (self._timers[0][0] - datetime.utcnow()).total_seconds()
+            return max(delay, 0.0)
+
+    def _wake(self):
+        """Wake the queue processor; safe to call from any thread."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+        try:
+            if loop.is_running():
+                loop.call_soon_threadsafe(wakeup.set)
+        except RuntimeError:
+            # Loop closed between the check and the call
+            pass
+
+    async def _sleep(self, timeout: Optional[float]):
+        """Sleep until timeout elapses or the processor is woken."""
+        if timeout is not None and timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
     async def process_retry_queue(self):
-        """Process the retry queue in batches."""
+        """Process the retry queue in priority-ordered batches as items fall due."""
         if self.queue_status != RetryQueueStatus.IDLE:
             logger.debug("Retry queue processor already running")
             return
 
         self.queue_status = RetryQueueStatus.RUNNING
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
         logger.info("Started retry queue processor")
 
         try:
-            while self.queue_status == RetryQueueStatus.RUNNING:
-                # Load items from persistent storage if queue is empty
-                if not self.retry_queue:
-                    await self._load_retry_items_from_storage()
+            # Warm start from the durable snapshot
+            await self._load_retry_items_from_storage()
+
+            while self.queue_status != RetryQueueStatus.STOPPED:
+                if self.queue_status == RetryQueueStatus.PAUSED:
+                    await self._sleep(self.queue_check_interval)
+                    continue
 
                 # Process ready items
                 await self._process_ready_items()
@@ -345,47 +487,42 @@ class WebhookRetryManager:
                 self.stats["items_in_queue"] = len(self.retry_queue)
                 self.stats["last_queue_check"] = datetime.utcnow().isoformat()
 
-                # Wait before next check
-                await asyncio.sleep(self.queue_check_interval)
+                # Sleep until the next item is due or a new one is scheduled
+                await self._sleep(self._seconds_until_next_retry())
 
         except Exception as e:
             logger.error(f"Error in retry queue processor: {e}")
         finally:
+            self._loop = None
+            self._wakeup = None
             self.queue_status = RetryQueueStatus.IDLE
             logger.info("Retry queue processor stopped")
 
     async def _load_retry_items_from_storage(self):
-        """Load retry items from persistent storage."""
+        """Load all persisted retry items into the scheduler."""
         try:
-            # Get pending retry items from storage
-            stored_items = self.storage.get_pending_webhook_retries(
-                limit=self.batch_size * 2
-            )
-
-            for item_data in stored_items:
-                # Convert to WebhookRetryItem
-                item = WebhookRetryItem(**item_data)
-                heapq.heappush(self.retry_queue, item)
-
-            if stored_items:
-                logger.debug(f"Loaded {len(stored_items)} retry items from storage")
+            stored_items = self.storage.get_pending_webhook_retries(due_only=False)
+
+            with self._lock:
+                queued = {item.event_id for item in self.retry_queue}
+                items = []
+                for item_data in stored_items:
+                    item = WebhookRetryItem.from_storage_dict(item_data)
+                    if item.event_id not in queued:
+                        queued.add(item.event_id)
+                        items.append(item)
+                if items:
+                    self._push_items(items)
+
+            if items:
+                logger.debug(f"Loaded {len(items)} retry items from storage")
 
         except Exception as e:
             logger.error(f"Error loading retry items from storage: {e}")
 
     async def _process_ready_items(self):
-        """Process items that are ready for retry."""
-        current_time = datetime.utcnow()
-        ready_items = []
-
-        # Find items ready for processing
-        while (
-            self.retry_queue
-            and self.retry_queue[0].next_retry_time <= current_time
-            and len(ready_items) < self.batch_size
-        ):
-            item = heapq.heappop(self.retry_queue)
-            ready_items.append(item)
+        """Process the highest-priority batch of items that are due."""
+        ready_items = self._take_ready_batch(datetime.utcnow())
 
         if not ready_items:
             return
@@ -401,32 +538,30 @@ class WebhookRetryManager:
 
         # Handle results
         for item, result in zip(ready_items, results):
-            if isinstance(result, Exception):
-                logger.error(f"Error processing retry item {item.event_id}: {result}")
-                # Reschedule with increased attempt count
-                self.schedule_retry(
-                    item.event_id,
-                    item.webhook_name,
-                    item.retry_attempt + 1,
-                    str(result),
-                    item.priority,
-                )
-            elif result:
+            if result and not isinstance(result, Exception):
                 # Success
                 self.stats["successful_retries"] += 1
                 # Remove from storage
                 self.storage.remove_webhook_retry_item(item.event_id)
+                continue
+
+            if isinstance(result, Exception):
+                logger.error(f"Error processing retry item {item.event_id}: {result}")
+                error = str(result)
             else:
                 # Failed but not an exception
                 self.stats["failed_retries"] += 1
-                # Reschedule with increased attempt count
-                self.schedule_retry(
-                    item.event_id,
-                    item.webhook_name,
-                    item.retry_attempt + 1,
-                    "Retry handler returned False",
-                    item.priority,
-                )
+                error = "Retry handler returned False"
+
+            # Replace the stored row with the rescheduled attempt
+            self.storage.remove_webhook_retry_item(item.event_id)
+            self.schedule_retry(
+                item.event_id,
+                item.webhook_name,
+                item.retry_attempt + 1,
+                error,
+                item.priority,
+            )
 
         self.stats["total_retries"] += len(ready_items)
 
@@ -452,13 +587,11 @@ class WebhookRetryManager:
                     return False
 
                 # Import here to avoid circular imports
-                from leadfactory.webhooks.webhook_validator import (
-                    WebhookEvent,
-                    WebhookStatus,
-                )
+                from leadfactory.webhooks.webhook_intake import event_from_dict
+                from leadfactory.webhooks.webhook_validator import WebhookStatus
 
                 # Convert to WebhookEvent
-                event = WebhookEvent(**event_data)
+                event = event_from_dict(event_data)
                 event.status = WebhookStatus.RETRYING
                 event.retry_count = item.retry_attempt
 
@@ -516,17 +649,20 @@ class WebhookRetryManager:
     def pause_queue(self):
         """Pause the retry queue processing."""
         self.queue_status = RetryQueueStatus.PAUSED
+        self._wake()
         logger.info("Paused retry queue processing")
 
     def resume_queue(self):
         """Resume the retry queue processing."""
         if self.queue_status == RetryQueueStatus.PAUSED:
             self.queue_status = RetryQueueStatus.RUNNING
+            self._wake()
             logger.info("Resumed retry queue processing")
 
     def stop_queue(self):
         """Stop the retry queue processing."""
         self.queue_status = RetryQueueStatus.STOPPED
+        self._wake()
         logger.info("Stopped retry queue processing")
 
     def get_queue_stats(self) -> Dict[str, Any]:
@@ -566,20 +702,24 @@ class WebhookRetryManager:
         Args:
             webhook_name: Optional webhook name to filter by
         """
-        if webhook_name:
-            # Remove items for specific webhook
-            self.retry_queue = [
-                item for item in self.retry_queue if item.webhook_name != webhook_name
-            ]
-            # Re-heapify after modification
-            heapq.heapify(self.retry_queue)
-            logger.info(f"Cleared retry queue for webhook: {webhook_name}")
-        else:
-            # Clear entire queue
-            self.retry_queue.clear()
-            logger.info("Cleared entire retry queue")
+        with self._lock:
+            if webhook_name:
+                # Remove items for specific webhook
+                self.retry_queue = [
+                    item
+                    for item in self.retry_queue
+                    if item.webhook_name != webhook_name
+                ]
+                logger.info(f"Cleared retry queue for webhook: {webhook_name}")
+            else:
+                # Clear entire queue
+                self.retry_queue.clear()
+                logger.info("Cleared entire retry queue")
 
-        self.stats["items_in_queue"] = len(self.retry_queue)
+            # Rebuild the scheduler state from what is left
+            self._positions = {}
+            self._sync_timers()
+            self.stats["items_in_queue"] = len(self.retry_queue)
 
     def force_retry_event(
         self, event_id: str, priority: WebhookPriority = WebhookPriority.HIGH
@@ -609,8 +749,7 @@ class WebhookRetryManager:
                 priority=priority,
             )
 
-            heapq.heappush(self.retry_queue, retry_item)
-            self.stats["items_in_queue"] = len(self.retry_queue)
+            self._push_items([retry_item])
 
             logger.info(f"Forced immediate retry for event {event_id}")
             return True
@@ -348,8 +348,10 @@ def perform_bulk_qualification(handoff_context):
     handoff_context['qualification_results'] = results
 
     # Mock the service call
-    handoff_context['qualification_engine'].qualify_businesses_bulk = MagicMock(return_value=results)
-    handoff_context['handoff_service']._add_to_queue = MagicMock(return_value=1)
+    handoff_context['qualification_engine'].iter_qualification_chunks = MagicMock(return_value=iter([results]))
+    handoff_context['handoff_service']._add_to_queue_bulk = MagicMock(
+        side_effect=lambda entries: list(range(1, len(entries) + 1))
+    )
     handoff_context['handoff_service']._create_bulk_operation = MagicMock(return_value=True)
     handoff_context['handoff_service']._update_bulk_operation = MagicMock(return_value=True)
 
@@ -581,7 +583,12 @@ def qualified_added_to_queue(handoff_context):
     qualified_count = len([r for r in handoff_context['qualification_results']
                           if r.status == QualificationStatus.QUALIFIED])
 
-    assert handoff_context['handoff_service']._add_to_queue.call_count == qualified_count
+    queued = [
+        entry
+        for call in handoff_context['handoff_service']._add_to_queue_bulk.call_args_list
+        for entry in call[0][0]
+    ]
+    assert len(queued) == qualified_count
 
 
 @then("an operation record should track the qualification process")
@@ -294,6 +294,8 @@ def test_server(test_database):
             return None
 
         storage.get_logs_with_filters = get_logs_with_filters
+        # No keyset paging, so every page is read by offset
+        del storage.get_logs_page
         storage.get_log_statistics = get_log_statistics
         storage.get_businesses_with_logs = get_businesses_with_logs
         storage.get_available_log_types = lambda: ["llm", "raw_html"]
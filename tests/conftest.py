@@ -11,6 +11,13 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+# Keep LLM response caching in-process so cached completions never leak
+# between test runs through the shared on-disk cache.
+os.environ.setdefault("LLM_CACHE_DB_PATH", "")
+# Likewise keep application caches in-process instead of writing the shared
+# SQLite tier into leadfactory/data.
+os.environ.setdefault("CACHE_BACKEND", "memory")
+
 # Create a mock for track_api_cost that will be used in tests
 mock_track_api_cost = MagicMock(return_value=True)
 mock_track_api_cost.__name__ = "mock_track_api_cost"
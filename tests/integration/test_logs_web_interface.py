@@ -217,11 +217,11 @@ class TestLogsWebInterfaceIntegration:
             cursor.execute(count_query, params)
             total_count = cursor.fetchone()[0]
 
-            # Data query with pagination
-            if sort_by == "timestamp":
-                sort_by = "created_at"
+            # Data query with pagination, ties broken as in keyset order
+            direction = sort_order.upper()
             data_query = (
-                f"{query} ORDER BY {sort_by} {sort_order.upper()} LIMIT ? OFFSET ?"
+                f"{query} ORDER BY {sort_by} {direction}, log_type {direction},"
+                f" id {direction} LIMIT ? OFFSET ?"
             )
             cursor.execute(data_query, params + [limit, offset])
 
@@ -241,6 +241,27 @@ class TestLogsWebInterfaceIntegration:
             conn.close()
             return logs, total_count
 
+        def get_logs_page(after=None, limit=50, sort_order="desc", **kwargs):
+            logs, _ = get_logs_with_filters(
+                limit=1_000_000, offset=0, sort_order=sort_order, **kwargs
+            )
+            if after:
+                position = (
+                    after["timestamp"].isoformat(sep=" "),
+                    after["log_type"],
+                    after["id"],
+                )
+
+                def follows(log):
+                    key = (log["timestamp"], log["log_type"], log["id"])
+                    return key < position if sort_order == "desc" else key > position
+
+                logs = [log for log in logs if follows(log)]
+            return logs[:limit]
+
+        def estimate_logs_count(**kwargs):
+            return get_logs_with_filters(limit=1, offset=0, **kwargs)[1]
+
         def get_log_by_id(log_id):
             conn = sqlite3.connect(test_db)
             cursor = conn.cursor()
@@ -368,7 +389,21 @@ class TestLogsWebInterfaceIntegration:
             conn.close()
             return [{"id": row[0], "name": row[1], "website": row[2]} for row in rows]
 
+        def iter_logs(batch_size=1000, **kwargs):
+            offset = 0
+            while True:
+                logs, _ = get_logs_with_filters(
+                    limit=batch_size, offset=offset, **kwargs
+                )
+                yield from logs
+                if len(logs) < batch_size:
+                    break
+                offset += batch_size
+
         storage.get_logs_with_filters = get_logs_with_filters
+        storage.get_logs_page = get_logs_page
+        storage.estimate_logs_count = estimate_logs_count
+        storage.iter_logs = iter_logs
         storage.get_log_by_id = get_log_by_id
         storage.get_log_statistics = get_log_statistics
         storage.get_available_log_types = get_available_log_types
@@ -0,0 +1,95 @@
+"""
+Throughput benchmark for AsyncLLMClient.
+
+Uses the offline stub provider with a fixed per-request latency so the
+comparison measures scheduling only: awaiting completions one at a time (how
+callers used the synchronous client) against chat_completion_many() fan-out.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from leadfactory.llm.async_client import AsyncLLMClient
+from leadfactory.llm.config import LLMConfig, ProviderConfig
+
+PROMPTS = 200
+STUB_LATENCY = 0.02
+
+
+def make_client(max_concurrency, rpm=None):
+    config = LLMConfig()
+    config.enable_caching = False
+    config.providers = {
+        "stub": ProviderConfig(
+            name="stub",
+            default_model="stub",
+            rate_limit_rpm=rpm,
+            additional_config={
+                "latency": STUB_LATENCY,
+                "max_concurrency": max_concurrency,
+            },
+        )
+    }
+    return AsyncLLMClient(config)
+
+
+def make_prompts(count):
+    return [
+        [{"role": "user", "content": f"Are businesses {i} and {i + 1} duplicates?"}]
+        for i in range(count)
+    ]
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestAsyncLLMClientPerformance:
+    """Compare sequential and fanned-out completion throughput."""
+
+    def test_fan_out_throughput(self):
+        prompts = make_prompts(PROMPTS)
+
+        async def sequential():
+            client = make_client(max_concurrency=1)
+            return [await client.chat_completion(messages) for messages in prompts]
+
+        async def fanned_out():
+            client = make_client(max_concurrency=50)
+            return await client.chat_completion_many(prompts)
+
+        start = time.perf_counter()
+        sequential_results = asyncio.run(sequential())
+        sequential_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fanned_results = asyncio.run(fanned_out())
+        fanned_time = time.perf_counter() - start
+
+        print(f"\nSequential: {PROMPTS / sequential_time:.0f} req/s")
+        print(f"Fan-out (50 concurrent): {PROMPTS / fanned_time:.0f} req/s")
+        print(f"Speedup: {sequential_time / fanned_time:.1f}x")
+
+        assert len(fanned_results) == len(sequential_results) == PROMPTS
+        assert not any(isinstance(result, Exception) for result in fanned_results)
+        assert [r["choices"] for r in fanned_results] == [
+            r["choices"] for r in sequential_results
+        ]
+        assert sequential_time / fanned_time > 5
+
+    def test_limiter_overhead(self):
+        """Limiter accounting should stay flat as the window fills."""
+        client = make_client(max_concurrency=1000, rpm=1_000_000)
+        client._provider_clients["stub"]["latency"] = 0.0
+        prompts = make_prompts(5000)
+
+        start = time.perf_counter()
+        results = asyncio.run(client.chat_completion_many(prompts))
+        elapsed = time.perf_counter() - start
+
+        per_request_ms = elapsed / len(prompts) * 1000
+        print(f"\n{len(prompts)} zero-latency requests: {per_request_ms:.3f} ms each")
+
+        assert not any(isinstance(result, Exception) for result in results)
+        assert client._rate_limiters["stub"].requests_in_window == len(prompts)
+        assert per_request_ms < 2.0
@@ -0,0 +1,142 @@
+"""
+Round-trip benchmark for set-based bulk qualification.
+
+Qualifies 5k businesses against criteria with engagement requirements, once
+through qualify_business() per ID and once through
+QualificationEngine.iter_qualification_chunks(). Storage is simulated with a
+fixed latency per query, so the comparison measures database round trips
+rather than SQL execution, and both paths must produce the same results.
+"""
+
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from leadfactory.monitoring.engagement_analytics import EngagementAnalytics
+from leadfactory.services.qualification_engine import (
+    QualificationCriteria,
+    QualificationEngine,
+)
+
+BUSINESS_COUNT = 5_000
+QUERY_LATENCY = 0.0001
+
+
+class SimulatedStorage:
+    """In-memory businesses and engagement data with per-query latency."""
+
+    def __init__(self, businesses, engagement):
+        self.businesses = {business["id"]: business for business in businesses}
+        self.engagement = engagement
+        self.queries = 0
+
+    def _round_trip(self):
+        self.queries += 1
+        time.sleep(QUERY_LATENCY)
+
+    def get_business_by_id(self, business_id):
+        self._round_trip()
+        return self.businesses.get(business_id)
+
+    def get_businesses_by_ids(self, business_ids):
+        self._round_trip()
+        return [self.businesses[i] for i in business_ids if i in self.businesses]
+
+    def get_user_events(self, user_id, start_date, end_date):
+        self._round_trip()
+        return []
+
+    def get_user_sessions(self, user_id, start_date, end_date):
+        self._round_trip()
+        page_views, time_on_site = self.engagement.get(user_id, (0, 0))
+        if not page_views:
+            return []
+        return [{"page_views": page_views, "time_on_site": time_on_site}]
+
+    def get_user_conversions(self, user_id, start_date, end_date):
+        self._round_trip()
+        return []
+
+    def get_user_engagement_aggregates(self, user_ids, start_date, end_date):
+        for _ in range(3):
+            self._round_trip()
+        return {
+            user_id: {
+                "total_sessions": 1,
+                "total_page_views": self.engagement[user_id][0],
+                "total_time_on_site": self.engagement[user_id][1],
+            }
+            for user_id in user_ids
+            if self.engagement.get(user_id, (0, 0))[0]
+        }
+
+
+def make_engine(storage):
+    engine = QualificationEngine()
+    engine.storage = storage
+    engine.engagement_analytics = EngagementAnalytics()
+    engine.engagement_analytics.storage = storage
+    engine.scoring_engine = MagicMock()
+    return engine
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestBulkQualificationPerformance:
+    """Compare per-ID and chunked bulk qualification."""
+
+    def test_bulk_qualification_5k(self):
+        businesses = [
+            {
+                "id": i,
+                "name": f"Business {i}",
+                "email": f"owner{i}@example.com" if i % 7 else "",
+                "website": f"https://business{i}.com" if i % 5 else "",
+                "score": 40 + i % 60,
+            }
+            for i in range(1, BUSINESS_COUNT + 1)
+        ]
+        engagement = {
+            f"business_{i}": (i % 6, 30 * (i % 4)) for i in range(1, BUSINESS_COUNT + 1)
+        }
+        criteria = QualificationCriteria(
+            id=1,
+            name="Benchmark",
+            description="Benchmark criteria",
+            min_score=50,
+            required_fields=["name", "email"],
+            engagement_requirements={"min_page_views": 2, "min_session_duration": 30},
+            custom_rules={"has_website": True},
+        )
+        business_ids = [business["id"] for business in businesses]
+
+        single_storage = SimulatedStorage(businesses, engagement)
+        single_engine = make_engine(single_storage)
+        single_engine.get_criteria_by_id = MagicMock(return_value=criteria)
+        start = time.perf_counter()
+        expected = [single_engine.qualify_business(i, 1) for i in business_ids]
+        single_seconds = time.perf_counter() - start
+
+        bulk_storage = SimulatedStorage(businesses, engagement)
+        bulk_engine = make_engine(bulk_storage)
+        bulk_engine.get_criteria_by_id = MagicMock(return_value=criteria)
+        start = time.perf_counter()
+        results = bulk_engine.qualify_businesses_bulk(business_ids, 1)
+        bulk_seconds = time.perf_counter() - start
+
+        print(
+            f"\nPer ID: {single_storage.queries} queries, "
+            f"{BUSINESS_COUNT / single_seconds:.0f} businesses/s"
+        )
+        print(
+            f"Bulk: {bulk_storage.queries} queries, "
+            f"{BUSINESS_COUNT / bulk_seconds:.0f} businesses/s"
+        )
+        print(f"Speedup: {single_seconds / bulk_seconds:.1f}x")
+
+        assert [(r.business_id, r.status, r.score, r.notes) for r in results] == [
+            (r.business_id, r.status, r.score, r.notes) for r in expected
+        ]
+        assert bulk_storage.queries * 100 < single_storage.queries
+        assert bulk_seconds < single_seconds
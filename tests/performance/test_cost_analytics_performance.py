@@ -0,0 +1,103 @@
+"""
+Performance benchmark for cost time-series analysis.
+
+Runs the numeric core of CostAnalyticsEngine.analyze_cost_trends (trend
+decomposition, seasonality, forecasting, anomaly and change-point detection,
+volatility) over synthetic series from 1k to 1M points. The pure-Python
+implementation is quadratic in places, so it is only timed on the smaller
+series, where the two backends are also checked against each other.
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from leadfactory.analytics.cost_analytics import CostAnalyticsEngine  # noqa: E402
+
+COMPARED_SIZES = [1_000, 5_000]
+VECTORIZED_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+
+
+def make_series(points, seed=42):
+    """Build hourly-granularity style cost data as daily points."""
+    rng = random.Random(seed)
+    start = datetime(2000, 1, 1)
+    dates = [start + timedelta(days=i) for i in range(points)]
+    costs = [
+        max(0.01, 20 + 5 * (i % 7 in (5, 6)) + 0.001 * i + rng.gauss(0, 2))
+        for i in range(points)
+    ]
+    historical_data = [
+        {"date": date.strftime("%Y-%m-%d"), "cost": cost}
+        for date, cost in zip(dates, costs)
+    ]
+    return costs, dates, historical_data
+
+
+def analyze(engine, costs, dates, historical_data):
+    """Run every analysis step and return the results and elapsed seconds."""
+    start = time.perf_counter()
+    results = {
+        "trend_components": engine._decompose_trend(costs),
+        "seasonality": engine._detect_seasonality(costs, dates),
+        "forecasts": engine._generate_advanced_forecast(costs, dates, 30),
+        "anomalies": engine._detect_advanced_anomalies(historical_data, costs),
+        "trend_metrics": engine._calculate_trend_metrics(costs, dates),
+        "change_points": engine._detect_change_points(costs, dates),
+        "volatility_analysis": engine._analyze_volatility(costs),
+    }
+    return results, time.perf_counter() - start
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+@pytest.mark.parametrize("points", COMPARED_SIZES)
+def test_vectorized_analysis_speedup(points):
+    """The NumPy backend should be much faster and agree with pure Python."""
+    costs, dates, historical_data = make_series(points)
+    vectorized = CostAnalyticsEngine(vectorized=True)
+    reference = CostAnalyticsEngine(vectorized=False)
+
+    fast, fast_time = analyze(vectorized, costs, dates, historical_data)
+    slow, slow_time = analyze(reference, costs, dates, historical_data)
+
+    print(f"\n{points:>9,} points: pure Python {slow_time:.3f}s")
+    print(f"{points:>9,} points: vectorized  {fast_time:.3f}s")
+
+    assert fast["trend_components"]["trend"] == pytest.approx(
+        slow["trend_components"]["trend"]
+    )
+    assert [c["index"] for c in fast["change_points"]] == [
+        c["index"] for c in slow["change_points"]
+    ]
+    assert [a["date"] for a in fast["anomalies"]] == [
+        a["date"] for a in slow["anomalies"]
+    ]
+    assert fast["volatility_analysis"]["rolling_volatilities"] == pytest.approx(
+        slow["volatility_analysis"]["rolling_volatilities"]
+    )
+    assert fast_time < slow_time / 10
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+@pytest.mark.parametrize("points", VECTORIZED_SIZES)
+def test_vectorized_analysis_scales_linearly(points):
+    """The NumPy backend should analyze a million points in seconds."""
+    costs, dates, historical_data = make_series(points)
+    engine = CostAnalyticsEngine(vectorized=True)
+
+    results, elapsed = analyze(engine, costs, dates, historical_data)
+
+    print(
+        f"\n{points:>9,} points: vectorized {elapsed:.3f}s "
+        f"({elapsed / points * 1e6:.2f} us per point)"
+    )
+
+    assert "error" not in results["trend_components"]
+    assert len(results["trend_components"]["trend"]) == points
+    assert elapsed < max(1.0, points * 2e-5)
@@ -0,0 +1,108 @@
+"""
+Performance benchmark for cost recording.
+
+Measures the overhead CostTracker.add_cost adds per scraped business with the
+write-behind ledger, against the previous connect/insert/commit/close path
+that also updated monthly_budgets on every call.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+import pytest
+
+from leadfactory.cost.cost_ledger import close_all_ledgers
+from leadfactory.cost.cost_tracking import CostTracker
+
+# Cost events recorded for one business: place search/details, PageSpeed, LLM
+COSTS_PER_BUSINESS = [
+    (0.017, "google", "place-details"),
+    (0.0, "pagespeed", "runPagespeed"),
+    (0.004, "openai", "gpt-4o-mini"),
+]
+BUSINESSES = 300
+
+
+def record_costs_direct(db_path, amount, service, operation, details):
+    """The add_cost write path before the ledger: one transaction per cost."""
+    timestamp = datetime.now().isoformat()
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        """
+        INSERT INTO costs (timestamp, service, operation, amount, details, batch_id)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        (timestamp, service, operation, amount, json.dumps(details), None),
+    )
+    conn.commit()
+    conn.close()
+
+    now = datetime.now()
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT budget, spent FROM monthly_budgets WHERE year = ? AND month = ?",
+        (now.year, now.month),
+    )
+    row = cursor.fetchone()
+    if row:
+        cursor.execute(
+            "UPDATE monthly_budgets SET spent = ? WHERE year = ? AND month = ?",
+            (row[1] + amount, now.year, now.month),
+        )
+    else:
+        cursor.execute(
+            "INSERT INTO monthly_budgets (year, month, budget, spent) VALUES (?, ?, ?, ?)",
+            (now.year, now.month, 1000.0, amount),
+        )
+    conn.commit()
+    conn.close()
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+def test_cost_recording_overhead_per_business():
+    """Write-behind recording should cost far less per business than direct writes."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        direct_db = os.path.join(tmp_dir, "direct.db")
+        ledger_db = os.path.join(tmp_dir, "ledger.db")
+        CostTracker(db_path=direct_db)
+        tracker = CostTracker(db_path=ledger_db)
+
+        start = time.perf_counter()
+        for business_id in range(BUSINESSES):
+            for amount, service, operation in COSTS_PER_BUSINESS:
+                record_costs_direct(
+                    direct_db, amount, service, operation, {"business_id": business_id}
+                )
+        direct_per_business = (time.perf_counter() - start) / BUSINESSES
+
+        start = time.perf_counter()
+        for business_id in range(BUSINESSES):
+            for amount, service, operation in COSTS_PER_BUSINESS:
+                tracker.add_cost(
+                    amount, service, operation, {"business_id": business_id}
+                )
+                # Budget checks are answered from memory
+                tracker.get_daily_cost(service)
+        ledger_per_business = (time.perf_counter() - start) / BUSINESSES
+
+        start = time.perf_counter()
+        tracker.ledger.flush()
+        final_flush = time.perf_counter() - start
+
+        with tracker.ledger.connection() as conn:
+            rows = conn.execute("SELECT COUNT(*) FROM costs").fetchone()[0]
+        close_all_ledgers()
+
+    print(f"\nDirect writes: {direct_per_business * 1000:.3f} ms per business")
+    print(f"Write-behind:  {ledger_per_business * 1000:.3f} ms per business")
+    print(f"Final flush of remaining entries: {final_flush * 1000:.3f} ms")
+
+    assert rows == BUSINESSES * len(COSTS_PER_BUSINESS)
+    assert ledger_per_business < direct_per_business / 3
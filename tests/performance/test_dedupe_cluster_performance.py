@@ -0,0 +1,162 @@
+"""
+Performance benchmark for cluster-based dedupe resolution.
+
+Runs 100k candidate pairs through the pairwise path (one merge per accepted
+pair) and the cluster path (union-find over accepted pairs, one bulk merge
+per chunk of clusters) against a storage stub that charges a fixed latency
+per database round trip and a small cost per row touched. The per-merge
+audit log is stubbed out in both runs, since it costs the same either way.
+"""
+
+import random
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from leadfactory.config.dedupe_config import DedupeConfig
+from leadfactory.pipeline.dedupe_performance import OptimizedDeduplicator
+
+PAIR_COUNT = 100000
+
+# Simulated cost of a database round trip and of each row it touches
+ROUND_TRIP_SECONDS = 0.0002
+ROW_SECONDS = 0.000002
+
+
+class SimulatedStorage:
+    """Storage stub that sleeps like a remote database would."""
+
+    def __init__(self, businesses):
+        self.businesses = businesses
+        self.round_trips = 0
+        self.merged_rows = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self, rows):
+        with self._lock:
+            self.round_trips += 1
+        time.sleep(ROUND_TRIP_SECONDS + rows * ROW_SECONDS)
+
+    def get_businesses(self, business_ids):
+        self._round_trip(len(business_ids))
+        return [self.businesses[i] for i in business_ids if i in self.businesses]
+
+    def merge_businesses(self, primary_id, secondary_id):
+        # merge_business_records repoints two child tables, logs and deletes
+        for _ in range(4):
+            self._round_trip(1)
+        with self._lock:
+            self.merged_rows += 1
+        return True
+
+    def merge_business_clusters(self, clusters):
+        rows = sum(len(secondary_ids) for _, secondary_ids, _ in clusters)
+        # Child tables, primary updates, dedupe log and delete
+        for _ in range(5):
+            self._round_trip(rows)
+        with self._lock:
+            self.merged_rows += rows
+        return True
+
+
+def generate_pairs(count, seed=42):
+    """
+    Generate candidate pairs over clusters of 2-6 duplicates.
+
+    Each cluster contributes a chain of pairs plus some redundant pairs
+    between non-adjacent members; one pair in twenty links two unrelated
+    businesses and is rejected by _should_merge.
+    """
+    rng = random.Random(seed)
+    businesses = {}
+    pairs = []
+    next_id = 1
+    while len(pairs) < count:
+        size = rng.randint(2, 6)
+        members = list(range(next_id, next_id + size))
+        next_id += size
+        for business_id in members:
+            businesses[business_id] = {
+                "id": business_id,
+                "name": f"Business {members[0]}",
+                "address": rng.choice([None, f"{members[0]} Main St"]),
+                "phone": rng.choice([None, f"555{members[0]:07d}"]),
+                "email": None,
+                "website": f"https://business{members[0]}.example",
+                "category": rng.choice([None, "Plumbing", "Plumbing & Heating"]),
+            }
+        for first, second in zip(members, members[1:]):
+            pairs.append({"business1_id": first, "business2_id": second})
+        for _ in range(size // 3):
+            first, second = rng.sample(members, 2)
+            pairs.append({"business1_id": first, "business2_id": second})
+        if rng.random() < 0.05 and next_id > 20:
+            pairs.append(
+                {
+                    "business1_id": members[0],
+                    "business2_id": rng.randrange(1, next_id - size),
+                }
+            )
+    return businesses, pairs[:count]
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+@pytest.mark.large_scale
+def test_cluster_vs_pairwise_merges():
+    """Cluster merges should need far fewer round trips and less wall time."""
+    businesses, pairs = generate_pairs(PAIR_COUNT)
+    config = DedupeConfig()
+
+    pairwise_storage = SimulatedStorage(businesses)
+    with patch(
+        "leadfactory.pipeline.dedupe_performance.get_storage",
+        return_value=pairwise_storage,
+    ):
+        deduplicator = OptimizedDeduplicator(config, max_workers=4)
+        deduplicator.dedupe_logger = Mock()
+        start = time.perf_counter()
+        pairwise_stats = deduplicator.process_pairs_parallel(pairs)
+        pairwise_seconds = time.perf_counter() - start
+
+    cluster_storage = SimulatedStorage(businesses)
+    with patch(
+        "leadfactory.pipeline.dedupe_performance.get_storage",
+        return_value=cluster_storage,
+    ):
+        deduplicator = OptimizedDeduplicator(config, max_workers=4)
+        deduplicator.dedupe_logger = Mock()
+        start = time.perf_counter()
+        cluster_stats = deduplicator.process_pairs_clustered(pairs)
+        cluster_seconds = time.perf_counter() - start
+
+    print(
+        f"\n{PAIR_COUNT} pairs, {cluster_stats['clusters']} clusters\n"
+        f"pairwise: {pairwise_seconds:.2f}s, {pairwise_storage.round_trips} round"
+        f" trips, {pairwise_stats['merged']} merges\n"
+        f"clusters: {cluster_seconds:.2f}s, {cluster_storage.round_trips} round"
+        f" trips, {cluster_stats['merged']} merges"
+    )
+
+    assert cluster_stats["processed"] == pairwise_stats["processed"] == PAIR_COUNT
+    assert cluster_stats["flagged"] == pairwise_stats["flagged"]
+
+    # Every business outside its cluster's primary is merged exactly once;
+    # the pairwise path merges once per accepted pair, redundant pairs included
+    members = {
+        business_id
+        for pair in pairs
+        for business_id in (pair["business1_id"], pair["business2_id"])
+    }
+    assert cluster_stats["merged"] == cluster_storage.merged_rows
+    assert cluster_stats["merged"] <= len(members) - cluster_stats["clusters"]
+    assert pairwise_stats["merged"] > cluster_stats["merged"]
+
+    assert cluster_storage.round_trips * 50 < pairwise_storage.round_trips
+    assert cluster_seconds * 5 < pairwise_seconds
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
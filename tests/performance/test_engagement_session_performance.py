@@ -0,0 +1,185 @@
+"""
+Throughput benchmark for engagement tracking.
+
+Tracks synthetic page views, form submits and signups spread over many
+sessions through EngagementAnalytics.track_event, once straight against
+storage and once through EngagementSessionEngine, with a storage stub that
+charges a fixed latency per round trip and a small cost per row written.
+The engine has to sustain TARGET_EVENTS_PER_SECOND including its final
+flush.
+"""
+
+import random
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from leadfactory.monitoring.engagement_analytics import EngagementAnalytics
+from leadfactory.monitoring.engagement_sessions import EngagementSessionEngine
+
+TARGET_EVENTS_PER_SECOND = 5000
+ENGINE_EVENTS = 50000
+DIRECT_EVENTS = 1000
+SESSIONS = 2000
+
+# Simulated cost of a database round trip and of each row it writes
+ROUND_TRIP_SECONDS = 0.0005
+ROW_SECONDS = 0.000005
+
+FUNNELS = [
+    {
+        "funnel_id": f"funnel{i}",
+        "name": f"Funnel {i}",
+        "steps": [
+            {"event_type": "page_view", "page_pattern": rf"https://example\.com/{i}"},
+            {"event_type": "form_submit", "properties": {"form": f"form{i}"}},
+            {"event_type": "signup"},
+        ],
+        "goal_type": "signup",
+        "time_window_hours": 24,
+        "is_active": True,
+    }
+    for i in range(5)
+]
+
+
+class SimulatedStorage:
+    """Engagement storage stub that sleeps like a remote database would."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self, rows=1):
+        with self._lock:
+            self.round_trips += 1
+            self.rows += rows
+        time.sleep(ROUND_TRIP_SECONDS + rows * ROW_SECONDS)
+
+    def store_engagement_event(self, event):
+        self._round_trip()
+        return True
+
+    def get_user_session(self, session_id):
+        self._round_trip()
+        return None
+
+    def get_session_unique_pages(self, session_id):
+        self._round_trip()
+        return []
+
+    def update_user_session(self, session):
+        self._round_trip()
+        return True
+
+    def get_active_conversion_funnels(self):
+        self._round_trip()
+        return FUNNELS
+
+    def update_funnel_progress(self, *args):
+        self._round_trip()
+        return True
+
+    def record_conversion(self, conversion):
+        self._round_trip()
+        return True
+
+    def store_engagement_batch(self, events, sessions, progress, conversions):
+        # One statement per non-empty table, in one transaction
+        for rows in (events, sessions, progress, conversions):
+            if rows:
+                self._round_trip(len(rows))
+        return True
+
+
+def generate_events(count, seed=7):
+    rng = random.Random(seed)
+    events = []
+    for _ in range(count):
+        session = rng.randrange(SESSIONS)
+        funnel = rng.randrange(len(FUNNELS))
+        roll = rng.random()
+        if roll < 0.85:
+            event = (
+                "page_view",
+                {},
+                f"https://example.com/{funnel}/{rng.randrange(20)}",
+            )
+        elif roll < 0.95:
+            event = ("form_submit", {"form": f"form{funnel}"}, None)
+        else:
+            event = ("signup", {}, None)
+        events.append((f"user{session}", f"session{session}") + event)
+    return events
+
+
+def track_all(analytics, events):
+    start = time.perf_counter()
+    for user_id, session_id, event_type, properties, page_url in events:
+        assert analytics.track_event(
+            user_id=user_id,
+            session_id=session_id,
+            event_type=event_type,
+            properties=properties,
+            page_url=page_url,
+            user_agent="Mozilla/5.0 (iPhone)",
+        )
+    assert analytics.flush(timeout=60)
+    return time.perf_counter() - start
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+def test_session_engine_throughput():
+    """The engine should track TARGET_EVENTS_PER_SECOND on one thread."""
+    direct_storage = SimulatedStorage()
+    with patch(
+        "leadfactory.monitoring.engagement_analytics.get_storage_instance",
+        return_value=direct_storage,
+    ):
+        analytics = EngagementAnalytics()
+    direct_seconds = track_all(analytics, generate_events(DIRECT_EVENTS))
+
+    engine_storage = SimulatedStorage()
+    engine = EngagementSessionEngine(engine_storage, flush_interval=0.25)
+    with patch(
+        "leadfactory.monitoring.engagement_analytics.get_storage_instance",
+        return_value=engine_storage,
+    ):
+        analytics = EngagementAnalytics(session_engine=engine)
+    try:
+        engine_seconds = track_all(analytics, generate_events(ENGINE_EVENTS))
+    finally:
+        engine.close()
+
+    direct_rate = DIRECT_EVENTS / direct_seconds
+    engine_rate = ENGINE_EVENTS / engine_seconds
+    print(
+        f"\ndirect: {direct_rate:,.0f} events/s,"
+        f" {direct_storage.round_trips / DIRECT_EVENTS:.2f} round trips/event\n"
+        f"engine: {engine_rate:,.0f} events/s,"
+        f" {engine_storage.round_trips / ENGINE_EVENTS:.4f} round trips/event,"
+        f" {engine.stats['flushes']} flushes, {engine.stats['funnel_loads']}"
+        f" funnel loads"
+    )
+
+    assert engine.stats["flushed_events"] == ENGINE_EVENTS
+    assert engine.stats["funnel_loads"] == 1
+    assert engine_rate >= TARGET_EVENTS_PER_SECOND
+    # Each session is read once when it first shows up, then every flush
+    # costs at most one statement per table
+    assert engine_storage.round_trips <= (
+        1 + SESSIONS + 4 * (engine.stats["flushes"] + engine.stats["failed_flushes"])
+    )
+    assert direct_storage.round_trips >= 4 * DIRECT_EVENTS
+    assert (
+        engine_storage.round_trips / ENGINE_EVENTS * 20
+        < direct_storage.round_trips / DIRECT_EVENTS
+    )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
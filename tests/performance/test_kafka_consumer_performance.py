@@ -0,0 +1,125 @@
+"""
+Performance benchmark for batched Kafka consumption.
+
+Publishes 400 enrich tasks for 100 businesses to an in-memory broker whose
+produce, fetch and commit requests each cost a network round trip, then
+drains them twice: with subscribe_to_tasks, which handles and commits one
+message at a time, and with consume_tasks_batched. Handlers simulate a
+short I/O-bound call. The batched consumer has to be several times faster,
+with far fewer commits, and still handle each business's tasks in order.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from leadfactory.services.pipeline_services.in_memory_kafka import (
+    InMemoryKafkaBroker,
+)
+from leadfactory.services.pipeline_services.kafka_integration import KafkaManager
+
+BUSINESSES = 100
+TASKS_PER_BUSINESS = 4
+ROUND_TRIP_SECONDS = 0.002
+HANDLER_SECONDS = 0.005
+
+
+async def drain(batched):
+    broker = InMemoryKafkaBroker(
+        topics={"enrich.requests": 8}, request_latency=ROUND_TRIP_SECONDS
+    )
+    manager = KafkaManager(broker=broker)
+    await manager.start()
+    total = BUSINESSES * TASKS_PER_BUSINESS
+
+    publish_started = time.perf_counter()
+    await manager.publish_tasks(
+        "enrich",
+        [
+            {"business_id": business_id, "step": step}
+            for step in range(TASKS_PER_BUSINESS)
+            for business_id in range(BUSINESSES)
+        ],
+    )
+    publish_seconds = time.perf_counter() - publish_started
+    produce_requests = broker.stats["produce_requests"]
+
+    handled = {}
+
+    async def handler(message):
+        await asyncio.sleep(HANDLER_SECONDS)
+        handled.setdefault(message.payload["business_id"], []).append(
+            message.payload["step"]
+        )
+
+    if batched:
+        consume = manager.consume_tasks_batched(
+            ["enrich"],
+            handler,
+            max_records=200,
+            concurrency=32,
+            fetch_timeout_ms=20,
+            auto_offset_reset="earliest",
+        )
+    else:
+        # subscribe_to_tasks starts at the latest offset; point the group
+        # at the beginning of each partition first
+        for tp in broker.partitions_for("enrich.requests"):
+            broker._committed[("pipeline_workers", tp)] = 0
+        consume = manager.subscribe_to_tasks(["enrich"], handler)
+
+    started = time.perf_counter()
+    task = asyncio.create_task(consume)
+    while sum(map(len, handled.values())) < total:
+        await asyncio.sleep(0.005)
+    elapsed = time.perf_counter() - started
+
+    manager.running = False
+    if batched:
+        await task
+    else:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    return {
+        "elapsed": elapsed,
+        "publish_seconds": publish_seconds,
+        "produce_requests": produce_requests,
+        "commits": broker.stats["commits"],
+        "handled": handled,
+    }
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+def test_batched_consumer_vs_sequential():
+    """Batched fetch with concurrent handlers should drain much faster."""
+    sequential = asyncio.run(drain(batched=False))
+    batched = asyncio.run(drain(batched=True))
+    total = BUSINESSES * TASKS_PER_BUSINESS
+
+    print(
+        f"\n{total} tasks, published in {batched['produce_requests']} requests"
+        f" ({batched['publish_seconds']:.2f}s)\n"
+        f"sequential: {sequential['elapsed']:.2f}s"
+        f" ({total / sequential['elapsed']:.0f} msg/s),"
+        f" {sequential['commits']} commits\n"
+        f"batched: {batched['elapsed']:.2f}s"
+        f" ({total / batched['elapsed']:.0f} msg/s),"
+        f" {batched['commits']} commits"
+    )
+
+    for run in (sequential, batched):
+        assert len(run["handled"]) == BUSINESSES
+        assert all(
+            steps == list(range(TASKS_PER_BUSINESS))
+            for steps in run["handled"].values()
+        )
+    assert batched["produce_requests"] < total / 10
+    assert batched["commits"] * 10 < sequential["commits"]
+    assert batched["elapsed"] * 5 < sequential["elapsed"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
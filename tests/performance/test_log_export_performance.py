@@ -0,0 +1,94 @@
+"""
+Peak memory of log exports as the export grows.
+
+Each measurement runs in a fresh interpreter that exports EXPORT_ROWS (or ten
+times as many) 2 KB LLM logs through LogsAPI._export_response and reports the
+peak memory the export itself allocated, traced with tracemalloc. Process RSS
+is not used: a child forked from a large pytest process reports the parent's
+high-water mark. Streaming exports should peak at the same memory for both
+sizes; materializing the logs first, as the export endpoint used to, grows
+with the export.
+"""
+
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+EXPORT_ROWS = 20000
+
+EXPORT_SCRIPT = textwrap.dedent(
+    """
+    import random
+    import sys
+    import tracemalloc
+    from datetime import datetime
+    from unittest.mock import Mock
+
+    from leadfactory.api.logs_api import LogsAPI, LogSearchFilters
+
+    count, export_format, materialize = int(sys.argv[1]), sys.argv[2], sys.argv[3]
+
+    def rows():
+        rng = random.Random(count)
+        for i in range(count):
+            yield {
+                "id": i,
+                "business_id": i % 1000,
+                "log_type": "llm",
+                "content": rng.randbytes(1024).hex(),
+                "timestamp": datetime(2024, 1, 1),
+                "metadata": {"operation": "mockup"},
+            }
+
+    api = LogsAPI()
+    api.cache = Mock()
+    api.storage = Mock()
+    api.storage.iter_logs.side_effect = lambda **kwargs: rows()
+
+    tracemalloc.start()
+    logs = api._iter_logs(LogSearchFilters())
+    if materialize == "1":
+        logs = list(logs)
+
+    exported = 0
+    for chunk in api._export_response(logs, export_format, True).response:
+        exported += len(chunk)
+
+    print(tracemalloc.get_traced_memory()[1] // 2**20, exported)
+    """
+)
+
+
+def peak_memory_mb(count, export_format, materialize=False):
+    result = subprocess.run(
+        [sys.executable, "-c", EXPORT_SCRIPT, str(count), export_format]
+        + ["1" if materialize else "0"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    peak, exported = result.stdout.split()[-2:]
+    return int(peak), int(exported)
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestLogExportPerformance:
+    """Peak memory of streamed and materialized exports."""
+
+    @pytest.mark.parametrize("export_format", ["csv", "json", "xlsx"])
+    def test_peak_memory_is_flat(self, export_format):
+        small, _ = peak_memory_mb(EXPORT_ROWS, export_format)
+        large, exported = peak_memory_mb(EXPORT_ROWS * 10, export_format)
+        materialized, _ = peak_memory_mb(EXPORT_ROWS * 10, export_format, True)
+
+        print(
+            f"\n{export_format}: {exported / 2**20:.0f} MB exported, peak memory"
+            f" {small} MB for {EXPORT_ROWS} logs, {large} MB for"
+            f" {EXPORT_ROWS * 10} logs, {materialized} MB materialized"
+        )
+
+        assert large - small < 16
+        assert materialized - small > 10 * (large - small)
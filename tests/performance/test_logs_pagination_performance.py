@@ -0,0 +1,197 @@
+"""
+Latency benchmark for the logs browser queries on PostgreSQL.
+
+Seeds llm_logs and raw_html_storage with LOGS_BENCHMARK_ROWS rows (10M by
+default, 80% LLM logs) in a scratch schema of the database at
+LOGS_BENCHMARK_DATABASE_URL, applies the log search migration, then reports
+p50/p95 latency for:
+
+- pages at increasing depth, by OFFSET (get_logs_with_filters) and by
+  keyset (get_logs_page)
+- searches, by substring scan with an exact count and by the full-text and
+  trigram indexes with an estimated count
+
+Skipped unless LOGS_BENCHMARK_DATABASE_URL points at a disposable database.
+"""
+
+import os
+import random
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+DATABASE_URL = os.getenv("LOGS_BENCHMARK_DATABASE_URL")
+ROWS = int(os.getenv("LOGS_BENCHMARK_ROWS", "10000000"))
+SAMPLES = 20
+PAGE_SIZE = 50
+SCHEMA = "logs_benchmark"
+MIGRATIONS = Path(__file__).resolve().parents[2] / "db" / "migrations"
+WORDS = ["pizza", "plumbing", "dentist", "roofing", "bakery", "lawyer", "florist"]
+
+pytestmark = pytest.mark.skipif(
+    not DATABASE_URL, reason="LOGS_BENCHMARK_DATABASE_URL not set"
+)
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return samples[len(samples) // 2], samples[int(len(samples) * 0.95)]
+
+
+def timed(call):
+    start = time.perf_counter()
+    result = call()
+    return time.perf_counter() - start, result
+
+
+@pytest.fixture(scope="module")
+def connection():
+    import psycopg2
+
+    conn = psycopg2.connect(DATABASE_URL)
+    conn.autocommit = True
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        cursor.execute(f"CREATE SCHEMA {SCHEMA}")
+        cursor.execute(f"SET search_path TO {SCHEMA}, public")
+        cursor.execute("CREATE TABLE businesses (id SERIAL PRIMARY KEY, name TEXT)")
+        cursor.execute(
+            "INSERT INTO businesses (name) SELECT 'biz ' || i"
+            " FROM generate_series(1, 1000) AS i"
+        )
+        cursor.execute((MIGRATIONS / "postgres_llm_logs.sql").read_text())
+        cursor.execute((MIGRATIONS / "postgres_raw_html_storage.sql").read_text())
+
+        llm_rows = ROWS * 4 // 5
+        cursor.execute(
+            """
+            INSERT INTO llm_logs (business_id, operation, model_version,
+                                  prompt_text, response_json, created_at)
+            SELECT 1 + i %% 1000, 'mockup', 'gpt-4o',
+                   'Write copy for a ' || (%s::text[])[1 + i %% 7]
+                       || ' business, request ' || i,
+                   '{"content": "ok"}'::jsonb,
+                   TIMESTAMP '2024-01-01' + i * INTERVAL '1 second'
+            FROM generate_series(1, %s) AS i
+            """,
+            (WORDS, llm_rows),
+        )
+        cursor.execute(
+            """
+            INSERT INTO raw_html_storage (business_id, html_path, original_url,
+                                          size_bytes, created_at)
+            SELECT 1 + i %% 1000, '/html/' || i || '.html.gz',
+                   'https://' || (%s::text[])[1 + i %% 7] || i || '.example.com',
+                   10000 + i %% 5000,
+                   TIMESTAMP '2024-01-01' + (i * 4) * INTERVAL '1 second'
+            FROM generate_series(1, %s) AS i
+            """,
+            (WORDS, ROWS - llm_rows),
+        )
+        cursor.execute((MIGRATIONS / "add_log_search_index.sql").read_text())
+        cursor.execute("ANALYZE")
+
+    yield conn
+
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def storage(connection):
+    from leadfactory.storage.postgres_storage import PostgresStorage
+
+    storage = PostgresStorage()
+
+    @contextmanager
+    def cursor():
+        with connection.cursor() as cur:
+            yield cur
+
+    storage.cursor = cursor
+    return storage
+
+
+def keyset_position(connection, offset):
+    """The (timestamp, log_type, id) of the row just before offset."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT timestamp, log_type, id FROM (
+                SELECT created_at AS timestamp, 'llm' AS log_type, id FROM llm_logs
+                UNION ALL
+                SELECT created_at, 'raw_html', id FROM raw_html_storage
+            ) AS combined_logs
+            ORDER BY timestamp DESC, log_type DESC, id DESC
+            OFFSET %s LIMIT 1
+            """,
+            (offset - 1,),
+        )
+        timestamp, log_type, log_id = cursor.fetchone()
+    return {"timestamp": timestamp, "log_type": log_type, "id": log_id}
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+@pytest.mark.large_scale
+class TestLogsPaginationPerformance:
+    """Compare OFFSET with keyset pages, and scans with indexed search."""
+
+    def test_deep_pages(self, connection, storage):
+        rng = random.Random(42)
+        offsets = sorted(rng.randrange(1, ROWS - PAGE_SIZE) for _ in range(SAMPLES))
+
+        offset_times = []
+        keyset_times = []
+        for offset in offsets:
+            after = keyset_position(connection, offset)
+
+            elapsed, (offset_logs, _) = timed(
+                lambda: storage.get_logs_with_filters(limit=PAGE_SIZE, offset=offset)
+            )
+            offset_times.append(elapsed)
+
+            elapsed, keyset_logs = timed(
+                lambda: storage.get_logs_page(limit=PAGE_SIZE, after=after)
+            )
+            keyset_times.append(elapsed)
+
+            assert [log["id"] for log in keyset_logs] == [
+                log["id"] for log in offset_logs
+            ]
+
+        for name, times in (("OFFSET", offset_times), ("Keyset", keyset_times)):
+            p50, p95 = percentiles(times)
+            print(f"\n{name} pages: p50 {p50 * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms")
+
+        assert percentiles(keyset_times)[1] < percentiles(offset_times)[1]
+
+    def test_search(self, storage):
+        scan_times = []
+        indexed_times = []
+        for word in WORDS * (SAMPLES // len(WORDS) + 1):
+            elapsed, (logs, _) = timed(
+                lambda: storage.get_logs_with_filters(
+                    search_query=word, limit=PAGE_SIZE
+                )
+            )
+            scan_times.append(elapsed)
+            assert logs
+
+            elapsed, logs = timed(
+                lambda: (
+                    storage.get_logs_page(search_query=word, limit=PAGE_SIZE),
+                    storage.estimate_logs_count(search_query=word),
+                )
+            )
+            indexed_times.append(elapsed)
+            assert logs[0] and logs[1] > 0
+
+        for name, times in (("Substring", scan_times), ("Indexed", indexed_times)):
+            p50, p95 = percentiles(times)
+            print(f"\n{name} search: p50 {p50 * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms")
+
+        assert percentiles(indexed_times)[1] < percentiles(scan_times)[1]
@@ -0,0 +1,110 @@
+"""
+Performance benchmark for streaming pipeline execution.
+
+Runs the default six-stage lead workflow over 20 zip codes (500 leads) once
+sequentially, where every stage waits for the whole previous stage, and once
+as a stream of micro-batches. Services are simulated with a fixed latency
+per request plus a cost per zip code or business processed. The stream has
+to deliver its first finished lead long before the sequential run finishes
+anything, and finish the whole workload sooner.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from leadfactory.services.pipeline_services.base_service import ServiceRegistry
+from leadfactory.services.pipeline_services.orchestrator import PipelineOrchestrator
+
+ZIP_CODES = [f"{10000 + i}" for i in range(20)]
+LEADS_PER_ZIP = 25
+
+# Simulated service cost: per request, and per zip code or business
+REQUEST_SECONDS = 0.01
+ITEM_SECONDS = {
+    "scrape": 0.05,
+    "enrich": 0.002,
+    "dedupe": 0.0005,
+    "score": 0.0005,
+    "mockup": 0.003,
+    "email": 0.001,
+}
+
+
+class SimulatedServices:
+    """Stands in for _post_task; works with both request layouts."""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def __call__(self, service_url, request_data, timeout_seconds):
+        self.requests += 1
+        metadata = request_data["metadata"]
+        stage = metadata["stage_name"]
+
+        if stage == "scrape":
+            zip_codes = metadata.get("zip_codes") or metadata["input_data"]["zip_codes"]
+            business_ids = [
+                f"{zip_code}-{i}"
+                for zip_code in zip_codes
+                for i in range(LEADS_PER_ZIP)
+            ]
+            items = len(zip_codes)
+        else:
+            business_ids = metadata.get("business_ids")
+            if business_ids is None:
+                business_ids = metadata["previous_results"]["scrape"]["business_ids"]
+            items = len(business_ids)
+
+        await asyncio.sleep(REQUEST_SECONDS + items * ITEM_SECONDS[stage])
+        return {"business_ids": business_ids}
+
+
+def make_orchestrator():
+    registry = ServiceRegistry()
+    for port, name in enumerate(ITEM_SECONDS, start=8001):
+        registry.register_service(name, "localhost", port)
+    orchestrator = PipelineOrchestrator(registry)
+    orchestrator._post_task = SimulatedServices()
+    return orchestrator
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_streaming_vs_sequential():
+    """Streaming should cut time to first lead and total wall time."""
+    input_data = {"zip_codes": ZIP_CODES, "verticals": ["hvac"]}
+
+    sequential = make_orchestrator()
+    start = time.perf_counter()
+    await sequential.execute_workflow("default", input_data, execution_id="seq")
+    sequential_seconds = time.perf_counter() - start
+
+    streaming = make_orchestrator()
+    start = time.perf_counter()
+    results = await streaming.execute_workflow(
+        "streaming", input_data, execution_id="stream"
+    )
+    streaming_seconds = time.perf_counter() - start
+    latency = streaming.get_execution_status("stream")["lead_latency"]
+
+    print(
+        f"\n{len(ZIP_CODES) * LEADS_PER_ZIP} leads\n"
+        f"sequential: {sequential_seconds:.2f}s to first and last lead,"
+        f" {sequential._post_task.requests} requests\n"
+        f"streaming: {latency['first_lead_seconds']:.2f}s to first lead,"
+        f" {streaming_seconds:.2f}s to last, p50 {latency['p50_seconds']:.2f}s,"
+        f" p95 {latency['p95_seconds']:.2f}s,"
+        f" {streaming._post_task.requests} requests"
+    )
+
+    assert latency["leads_completed"] == len(ZIP_CODES) * LEADS_PER_ZIP
+    assert results["email"]["processed"] == len(ZIP_CODES) * LEADS_PER_ZIP
+    assert latency["first_lead_seconds"] * 5 < sequential_seconds
+    assert streaming_seconds * 2 < sequential_seconds
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
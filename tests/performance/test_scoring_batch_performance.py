@@ -0,0 +1,164 @@
+"""
+Throughput benchmark for compiled batch scoring.
+
+Scores 100k synthetic businesses against a rule set covering every legacy
+condition type, once through the interpreted RuleEvaluator path the engine
+used per business and once through ScoringEngine.score_batch(), and checks
+that both produce the same scores.
+"""
+
+import random
+import time
+
+import pytest
+import yaml
+
+from leadfactory.scoring import ScoringEngine
+
+BUSINESS_COUNT = 100_000
+
+RULES = [
+    {"name": "jquery", "condition": {"tech_stack_contains": "jQuery"}, "score": 10},
+    {
+        "name": "cms",
+        "condition": {"tech_stack_contains_any": ["WordPress", "Joomla", "Drupal"]},
+        "score": 8,
+    },
+    {
+        "name": "old_jquery",
+        "condition": {
+            "tech_stack_version_lt": {"technology": "jQuery", "version": "3.0.0"}
+        },
+        "score": 12,
+    },
+    {"name": "trades", "condition": {"vertical_in": ["HVAC", "Plumbing"]}, "score": 5},
+    {"name": "not_saas", "condition": {"vertical_not_in": ["SaaS"]}, "score": 3},
+    {"name": "northeast", "condition": {"location_in": ["NY", "NJ", "CT"]}, "score": 4},
+    {"name": "small_team", "condition": {"employee_count_lt": 50}, "score": 6},
+    {"name": "revenue", "condition": {"revenue_gt": 500000}, "score": 7},
+    {"name": "established", "condition": {"founded_year_lt": 2005}, "score": 2},
+    {
+        "name": "social",
+        "condition": {"has_social_media": ["facebook", "instagram"]},
+        "score": 3,
+    },
+    {
+        "name": "followers",
+        "condition": {"social_followers_gt": {"facebook": 1000}},
+        "score": 4,
+    },
+    {"name": "no_form", "condition": {"has_contact_form": False}, "score": 9},
+    {"name": "small_site", "condition": {"page_count_lt": 5}, "score": 5},
+    {
+        "name": "modernise",
+        "condition": {
+            "all_of": [
+                {"tech_stack_contains": "jQuery"},
+                {"any_of": [{"page_count_lt": 10}, {"has_email": False}]},
+            ]
+        },
+        "score": 6,
+    },
+    {
+        "name": "exclude_enterprise",
+        "condition": {"none_of": [{"employee_count_lt": 500}]},
+        "score": -30,
+    },
+]
+
+MULTIPLIERS = [
+    {
+        "name": "trades_boost",
+        "condition": {"vertical_in": ["HVAC", "Plumbing"]},
+        "multiplier": 1.2,
+    }
+]
+
+
+def make_businesses(count):
+    rng = random.Random(42)
+    stacks = [
+        ["jQuery 1.12.4", "WordPress"],
+        ["React 18.2", "Node.js"],
+        ["jQuery 3.6.0", "Drupal"],
+        ["Vue", "Nginx"],
+    ]
+    return [
+        {
+            "id": i,
+            "name": f"Business {i}",
+            "tech_stack": rng.choice(stacks),
+            "vertical": rng.choice(["HVAC", "Plumbing", "SaaS", "Retail"]),
+            "city": rng.choice(["Albany", "Austin", "Newark"]),
+            "state": rng.choice(["NY", "TX", "NJ"]),
+            "employee_count": rng.randint(1, 1000),
+            "revenue": rng.randint(10_000, 2_000_000),
+            "founded_year": rng.randint(1970, 2023),
+            "social_media": {"facebook": {"followers": rng.randint(0, 5000)}},
+            "has_contact_form": rng.random() < 0.5,
+            "has_email": rng.random() < 0.5,
+            "page_count": rng.randint(1, 40),
+        }
+        for i in range(count)
+    ]
+
+
+def interpreted_scores(engine, businesses):
+    """Score with the per-business RuleEvaluator loop the engine used before."""
+    evaluator = engine.evaluator
+    settings = engine.settings
+    scores = []
+    for business in businesses:
+        score = settings.base_score
+        for rule in engine.rules:
+            matched, adjustment = evaluator.evaluate_rule(business, rule)
+            if matched:
+                score += adjustment
+        final_multiplier = 1.0
+        for multiplier in engine.multipliers:
+            final_multiplier *= evaluator.evaluate_multiplier(business, multiplier)
+        if final_multiplier != 1.0:
+            score = int(score * final_multiplier)
+        scores.append(max(settings.min_score, min(score, settings.max_score)))
+    return scores
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestScoringBatchPerformance:
+    """Compare interpreted and compiled batch scoring throughput."""
+
+    def test_score_batch_100k(self, tmp_path):
+        config_file = tmp_path / "rules.yml"
+        config_file.write_text(
+            yaml.dump(
+                {
+                    "settings": {
+                        "base_score": 50,
+                        "min_score": 0,
+                        "max_score": 100,
+                        "high_score_threshold": 75,
+                    },
+                    "rules": RULES,
+                    "multipliers": MULTIPLIERS,
+                }
+            )
+        )
+        engine = ScoringEngine(str(config_file))
+        engine.load_rules()
+        businesses = make_businesses(BUSINESS_COUNT)
+
+        start = time.perf_counter()
+        expected = interpreted_scores(engine, businesses)
+        interpreted_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = engine.score_batch(businesses)
+        batch_seconds = time.perf_counter() - start
+
+        print(f"\nInterpreted: {BUSINESS_COUNT / interpreted_seconds:.0f} businesses/s")
+        print(f"Compiled batch: {BUSINESS_COUNT / batch_seconds:.0f} businesses/s")
+        print(f"Speedup: {interpreted_seconds / batch_seconds:.1f}x")
+
+        assert [result["score"] for result in results] == expected
+        assert batch_seconds < interpreted_seconds
@@ -0,0 +1,169 @@
+"""
+Throughput benchmark for the concurrent scrape engine.
+
+Serves fake Yelp and Google Places endpoints from a local HTTP server with a
+fixed per-request latency, then compares a sequential sweep (one combination
+and one detail lookup at a time, like the old main() loop) with the default
+concurrent configuration. save_businesses is replaced by an in-memory counter
+so the comparison measures network scheduling only.
+"""
+
+import json
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from leadfactory.pipeline import scrape
+from leadfactory.pipeline.scrape_engine import ScrapeEngine
+
+ZIP_CODES = ["10001", "90210", "60601", "30301"]
+VERTICALS = [
+    {"name": "hvac", "yelp_alias": "hvac", "google_alias": "hvac"},
+    {"name": "plumbers", "yelp_alias": "plumbing", "google_alias": "plumber"},
+]
+PLACES_PER_SEARCH = 5
+LATENCY = 0.02
+
+
+class FakeApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests_seen = Counter()
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        with self.lock:
+            self.requests_seen[parsed.path] += 1
+        time.sleep(LATENCY)
+
+        if parsed.path == "/yelp/businesses/search":
+            zip_code = params["location"]
+            body = {
+                "businesses": [
+                    {
+                        "id": f"{zip_code}-{params['term']}-{i}",
+                        "name": f"Yelp {params['term']} {i}",
+                        "location": {
+                            "display_address": ["1 Main St", f"Town, ST {zip_code}"],
+                            "zip_code": zip_code,
+                        },
+                        "display_phone": "(555) 555-0100",
+                        "url": "",
+                    }
+                    for i in range(PLACES_PER_SEARCH)
+                ]
+            }
+        elif parsed.path == "/google/textsearch/json":
+            body = {
+                "status": "OK",
+                "results": [
+                    {
+                        "place_id": f"{params['query']}-{i}",
+                        "name": f"Google {params['query']} {i}",
+                        "formatted_address": "1 Main St, Town, ST",
+                    }
+                    for i in range(PLACES_PER_SEARCH)
+                ],
+            }
+        elif parsed.path == "/google/details/json":
+            zip_code = params["place_id"].split(" in ")[1].split("-")[0]
+            body = {
+                "status": "OK",
+                "result": {
+                    "formatted_phone_number": "(555) 555-0101",
+                    "website": "",
+                    "address_components": [
+                        {
+                            "types": ["postal_code"],
+                            "long_name": zip_code,
+                            "short_name": zip_code,
+                        }
+                    ],
+                },
+            }
+        else:
+            body = {}
+
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    monkeypatch.setenv("YELP_KEY", "yelp")
+    monkeypatch.setenv("GOOGLE_KEY", "google")
+    FakeApiHandler.requests_seen.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeApiHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def saved():
+    counts = Counter()
+    lock = threading.Lock()
+
+    def fake_save(records):
+        with lock:
+            counts.update(record["source"] for record in records)
+            return list(range(1, len(records) + 1))
+
+    with patch.object(scrape, "save_businesses", side_effect=fake_save):
+        yield counts
+
+
+def run_engine(base_url, **engine_kwargs):
+    engine = ScrapeEngine(
+        yelp_base_url=f"{base_url}/yelp",
+        google_base_url=f"{base_url}/google",
+        yelp_rate_per_second=0,
+        google_rate_per_second=0,
+        **engine_kwargs,
+    )
+    return engine.run(ZIP_CODES, VERTICALS, limit=PLACES_PER_SEARCH)
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestScrapeEnginePerformance:
+    """Compare sequential and concurrent scrape throughput."""
+
+    def test_concurrent_sweep_throughput(self, fake_api, saved):
+        expected = len(ZIP_CODES) * len(VERTICALS) * PLACES_PER_SEARCH * 2
+
+        sequential = run_engine(fake_api, max_workers=1, detail_workers=1)
+        sequential_details = FakeApiHandler.requests_seen["/google/details/json"]
+        FakeApiHandler.requests_seen.clear()
+
+        concurrent = run_engine(fake_api, max_workers=8, detail_workers=16)
+        concurrent_details = FakeApiHandler.requests_seen["/google/details/json"]
+
+        print(f"\nSequential: {sequential.businesses_per_second:.0f} businesses/s")
+        print(f"Concurrent: {concurrent.businesses_per_second:.0f} businesses/s")
+        print(
+            f"Speedup: {sequential.elapsed_seconds / concurrent.elapsed_seconds:.1f}x"
+        )
+
+        assert sequential.total_businesses == concurrent.total_businesses == expected
+        assert sequential.failed_combinations == concurrent.failed_combinations == 0
+        # Each place's details are fetched once and reused when saving
+        places = len(ZIP_CODES) * len(VERTICALS) * PLACES_PER_SEARCH
+        assert sequential_details == concurrent_details == places
+        assert sequential.elapsed_seconds / concurrent.elapsed_seconds > 3
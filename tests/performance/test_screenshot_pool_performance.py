@@ -0,0 +1,114 @@
+"""
+Throughput benchmark for pooled local screenshot capture.
+
+Captures 40 pages once with a fresh browser per screenshot, as
+capture_screenshot_sync does, and once through a BrowserPool. The browser is
+simulated with fixed launch, context and render latencies, so the comparison
+measures browser lifecycle overhead rather than real page loads.
+"""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from leadfactory.pipeline import screenshot_pool
+from leadfactory.pipeline.screenshot_pool import BrowserPool, percentile
+
+PAGE_COUNT = 40
+POOL_SIZE = 4
+LAUNCH_LATENCY = 0.05
+CONTEXT_LATENCY = 0.005
+RENDER_LATENCY = 0.01
+
+
+class SimulatedBrowser:
+    """LocalScreenshotCapture stand-in with launch and context latency."""
+
+    launches = 0
+
+    def __init__(self):
+        self.browser = MagicMock()
+        self.browser.new_context = AsyncMock(side_effect=self._new_context)
+
+    async def start(self):
+        SimulatedBrowser.launches += 1
+        await asyncio.sleep(LAUNCH_LATENCY)
+
+    async def stop(self):
+        pass
+
+    async def _new_context(self, **kwargs):
+        await asyncio.sleep(CONTEXT_LATENCY)
+        context = MagicMock()
+        context.new_page = AsyncMock(side_effect=lambda: AsyncMock())
+        context.close = AsyncMock()
+        return context
+
+
+async def simulated_render(page, url, output_path, **kwargs):
+    await asyncio.sleep(RENDER_LATENCY)
+    return True
+
+
+async def capture_cold(url, output_path):
+    """One browser, context and page per screenshot."""
+    start = time.perf_counter()
+    browser = SimulatedBrowser()
+    await browser.start()
+    context = await browser.browser.new_context()
+    page = await context.new_page()
+    await simulated_render(page, url, output_path)
+    await browser.stop()
+    return time.perf_counter() - start
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestScreenshotPoolPerformance:
+    """Compare cold-start and pooled screenshot capture."""
+
+    def test_pooled_capture_throughput(self):
+        targets = [
+            (f"https://business{i}.com", f"/tmp/shot_{i}.png")
+            for i in range(PAGE_COUNT)
+        ]
+
+        async def run_cold():
+            return [await capture_cold(url, path) for url, path in targets]
+
+        SimulatedBrowser.launches = 0
+        start = time.perf_counter()
+        cold_latencies = asyncio.run(run_cold())
+        cold_seconds = time.perf_counter() - start
+        cold_launches = SimulatedBrowser.launches
+
+        async def run_pooled():
+            pool = BrowserPool(size=POOL_SIZE, max_memory_mb=None)
+            pool._browser = SimulatedBrowser()
+            async with pool:
+                return await pool.capture_many(targets)
+
+        SimulatedBrowser.launches = 0
+        with patch.object(screenshot_pool, "render_screenshot", simulated_render):
+            start = time.perf_counter()
+            results = asyncio.run(run_pooled())
+            pooled_seconds = time.perf_counter() - start
+        pooled_latencies = [result.elapsed_seconds for result in results]
+
+        print(
+            f"\nCold start: {cold_launches} launches, "
+            f"{PAGE_COUNT / cold_seconds:.1f} pages/s, "
+            f"p95 {percentile(cold_latencies, 95) * 1000:.0f} ms"
+        )
+        print(
+            f"Pooled: {SimulatedBrowser.launches} launch, "
+            f"{PAGE_COUNT / pooled_seconds:.1f} pages/s, "
+            f"p95 {percentile(pooled_latencies, 95) * 1000:.0f} ms"
+        )
+        print(f"Speedup: {cold_seconds / pooled_seconds:.1f}x")
+
+        assert all(result.success for result in results)
+        assert SimulatedBrowser.launches == 1
+        assert pooled_seconds * 5 < cold_seconds
@@ -0,0 +1,146 @@
+"""
+Ingestion benchmark for SendGrid webhook events.
+
+Replays a 1k-event bounce storm against a SQLite database with 20k queued
+emails, once through process_webhook_events() and once through
+process_webhook_batch(), and reports events/s. Both paths must leave the
+event tables and email_queue in the same state.
+"""
+
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from leadfactory.webhooks.sendgrid_webhook import (
+    SendGridWebhookHandler,
+    create_webhook_tables,
+)
+
+EVENT_COUNT = 1_000
+QUEUED_EMAILS = 20_000
+
+
+class SqliteConnection:
+    """DatabaseConnection backed by a SQLite file."""
+
+    def __init__(self, db_path=None):
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.conn.close()
+
+    def execute(self, *args):
+        self.cursor.execute(*args)
+
+    def executemany(self, *args):
+        self.cursor.executemany(*args)
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def commit(self):
+        self.conn.commit()
+
+
+def create_database(path):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE email_queue (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "recipient_email TEXT, message_id TEXT, status TEXT, "
+        "created_at TEXT, updated_at TEXT)"
+    )
+    conn.execute("CREATE INDEX idx_queue_email ON email_queue(recipient_email)")
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+    conn.executemany(
+        "INSERT INTO email_queue (recipient_email, message_id, status, created_at) "
+        "VALUES (?, ?, 'sent', ?)",
+        [(f"user{i}@example.com", f"msg{i}", now) for i in range(QUEUED_EMAILS)],
+    )
+    conn.commit()
+    conn.close()
+    create_webhook_tables(path)
+
+
+def bounce_storm():
+    now = int(time.time())
+    events = []
+    for i in range(EVENT_COUNT):
+        email = f"user{i * 7 % QUEUED_EMAILS}@example.com"
+        if i % 10 < 6:
+            event = {"event": "bounce", "type": ("hard", "soft", "block")[i % 3]}
+        elif i % 10 < 8:
+            event = {"event": "delivered", "sg_message_id": f"msg{i * 7}"}
+        elif i % 10 == 8:
+            event = {"event": "spamreport"}
+        else:
+            event = {"event": "open"}
+        event.update(email=email, sg_event_id=f"evt{i}", timestamp=now)
+        events.append(event)
+    return events
+
+
+def database_state(path):
+    conn = sqlite3.connect(path)
+    try:
+        return [
+            conn.execute(
+                "SELECT recipient_email, status, soft_bounce_count, "
+                "delivered_at IS NOT NULL FROM email_queue ORDER BY id"
+            ).fetchall(),
+            conn.execute(
+                "SELECT email, bounce_type, sg_event_id FROM email_bounces "
+                "ORDER BY sg_event_id"
+            ).fetchall(),
+            conn.execute(
+                "SELECT email, sg_event_id FROM email_spam_reports "
+                "ORDER BY sg_event_id"
+            ).fetchall(),
+        ]
+    finally:
+        conn.close()
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestSendGridWebhookIngestionPerformance:
+    """Compare per-event and batched webhook ingestion."""
+
+    def test_bounce_storm_ingestion(self, tmp_path):
+        events = bounce_storm()
+        per_event_path = str(tmp_path / "per_event.db")
+        batch_path = str(tmp_path / "batch.db")
+
+        with patch(
+            "leadfactory.webhooks.sendgrid_webhook.DatabaseConnection",
+            SqliteConnection,
+            create=True,
+        ):
+            create_database(per_event_path)
+            create_database(batch_path)
+
+            handler = SendGridWebhookHandler(db_path=per_event_path)
+            start = time.perf_counter()
+            expected = handler.process_webhook_events(events)
+            per_event_seconds = time.perf_counter() - start
+
+            handler = SendGridWebhookHandler(db_path=batch_path)
+            start = time.perf_counter()
+            counts = handler.process_webhook_batch(events)
+            batch_seconds = time.perf_counter() - start
+
+        print(f"\nPer event: {EVENT_COUNT / per_event_seconds:.0f} events/s")
+        print(f"Batch: {EVENT_COUNT / batch_seconds:.0f} events/s")
+        print(f"Speedup: {per_event_seconds / batch_seconds:.1f}x")
+
+        assert counts == expected
+        assert database_state(batch_path) == database_state(per_event_path)
+        assert batch_seconds * 10 < per_event_seconds
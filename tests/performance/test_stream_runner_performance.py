@@ -0,0 +1,147 @@
+"""
+Performance benchmark for the micro-batch pipeline runner.
+
+Scrapes 10 ZIP codes (250 leads) and runs them through enrich, dedupe,
+score, mockup and email twice: once in barrier mode, which schedules the
+stages the way bin/run_nightly.sh does (every stage finishes the whole
+night's work before the next one starts), and once streaming. Stage work is
+simulated with a fixed cost per batch plus a cost per business, and every
+processing_status call pays a database round trip. Streaming has to email
+its first lead long before the barrier run, and finish sooner overall.
+"""
+
+import threading
+import time
+
+import pytest
+
+from leadfactory.pipeline.stream_runner import StreamRunner, StreamStage
+
+ZIP_CODES = 10
+LEADS_PER_ZIP = 25
+SCRAPE_SECONDS_PER_ZIP = 0.05
+
+# Simulated stage cost: per batch, and per business in the batch
+BATCH_SECONDS = 0.01
+BUSINESS_SECONDS = {
+    "enrich": 0.004,
+    "dedupe": 0.0005,
+    "score": 0.0005,
+    "mockup": 0.004,
+    "email": 0.002,
+}
+ROUND_TRIP_SECONDS = 0.001
+
+
+class SimulatedStageStore:
+    """processing_status stand-in that sleeps like a database round trip."""
+
+    def __init__(self):
+        self.rows = {}
+        self.businesses = 0
+        self.round_trips = 0
+        self.lock = threading.Lock()
+
+    def _round_trip(self):
+        with self.lock:
+            self.round_trips += 1
+        time.sleep(ROUND_TRIP_SECONDS)
+
+    def add_businesses(self, count):
+        with self.lock:
+            self.businesses += count
+
+    def get_max_business_id(self):
+        self._round_trip()
+        return 0
+
+    def seed_stage_status(self, stage, after_id=0, status="pending"):
+        self._round_trip()
+        with self.lock:
+            seeded = [
+                business_id
+                for business_id in range(after_id + 1, self.businesses + 1)
+                if (business_id, stage) not in self.rows
+            ]
+            for business_id in seeded:
+                self.rows[(business_id, stage)] = status
+            return seeded
+
+    def claim_stage_batch(self, stage, batch_size, lease_seconds=900):
+        self._round_trip()
+        with self.lock:
+            claimed = sorted(
+                business_id
+                for (business_id, row_stage), status in self.rows.items()
+                if row_stage == stage and status == "pending"
+            )[:batch_size]
+            for business_id in claimed:
+                self.rows[(business_id, stage)] = "processing"
+            return claimed
+
+    def complete_stage_batch(
+        self, stage, outcomes, next_stage=None, next_status="processing"
+    ):
+        self._round_trip()
+        with self.lock:
+            for business_id, status in outcomes:
+                self.rows[(business_id, stage)] = status
+            if not next_stage:
+                return []
+            for business_id, _ in outcomes:
+                self.rows[(business_id, next_stage)] = next_status
+            return [business_id for business_id, _ in outcomes]
+
+
+def simulated_stage(name):
+    def process(business_ids):
+        time.sleep(BATCH_SECONDS + len(business_ids) * BUSINESS_SECONDS[name])
+        return dict.fromkeys(business_ids, "completed")
+
+    return StreamStage(name, process)
+
+
+def run_pipeline(barrier):
+    store = SimulatedStageStore()
+
+    def scrape(notify):
+        for _ in range(ZIP_CODES):
+            time.sleep(SCRAPE_SECONDS_PER_ZIP)
+            store.add_businesses(LEADS_PER_ZIP)
+            notify()
+
+    runner = StreamRunner(
+        [simulated_stage(name) for name in BUSINESS_SECONDS],
+        storage=store,
+        source=scrape,
+        batch_size=25,
+        poll_seconds=0.01,
+        barrier=barrier,
+    )
+    return runner.run(), store
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+def test_streaming_vs_nightly_barrier():
+    """Streaming should cut time to first email and total wall time."""
+    barrier, barrier_store = run_pipeline(barrier=True)
+    streaming, streaming_store = run_pipeline(barrier=False)
+
+    print(
+        f"\n{ZIP_CODES * LEADS_PER_ZIP} leads\n"
+        f"barrier (run_nightly.sh): first email {barrier.first_output_seconds:.2f}s,"
+        f" total {barrier.elapsed_seconds:.2f}s,"
+        f" {barrier_store.round_trips} round trips\n"
+        f"streaming: first email {streaming.first_output_seconds:.2f}s,"
+        f" total {streaming.elapsed_seconds:.2f}s,"
+        f" {streaming_store.round_trips} round trips"
+    )
+
+    assert barrier.outputs == streaming.outputs == ZIP_CODES * LEADS_PER_ZIP
+    assert streaming.first_output_seconds * 5 < barrier.first_output_seconds
+    assert streaming.elapsed_seconds * 2 < barrier.elapsed_seconds
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-s"])
@@ -0,0 +1,100 @@
+"""
+Benchmarks for the shared tiered cache.
+
+Fills a 1,000-entry cache and keeps inserting past capacity, comparing the
+O(1) OrderedDict eviction with the sort-by-last-access eviction the API
+caches used before; then sends 32 concurrent misses for one expensive key
+through get_or_set() from four workers sharing a SQLite tier and counts how
+many times the value is recomputed.
+"""
+
+import threading
+import time
+
+import pytest
+
+from leadfactory.cache import SQLiteCacheBackend, TieredCache
+
+CAPACITY = 1000
+INSERTS = 20000
+STAMPEDE_THREADS = 32
+COMPUTE_SECONDS = 0.2
+
+
+class SortedEvictionCache:
+    """The previous dict cache: expiry scan and full sort on every set."""
+
+    def __init__(self, max_entries, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache = {}
+
+    def set(self, key, value):
+        now = time.time()
+        self.cache[key] = (value, now, now + self.ttl)
+        expired = [k for k, entry in self.cache.items() if entry[2] <= now]
+        for old_key in expired:
+            del self.cache[old_key]
+        if len(self.cache) > self.max_entries:
+            entries = sorted(self.cache.items(), key=lambda item: item[1][1])
+            for old_key, _ in entries[: len(self.cache) - self.max_entries + 1]:
+                del self.cache[old_key]
+
+
+def time_inserts(cache):
+    start = time.perf_counter()
+    for i in range(INSERTS):
+        cache.set(f"key{i}", i)
+    return time.perf_counter() - start
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestTieredCachePerformance:
+    """Measure eviction cost and recomputation under a stampede."""
+
+    def test_eviction_at_capacity(self):
+        sorted_seconds = time_inserts(SortedEvictionCache(CAPACITY))
+        tiered = TieredCache("bench", max_entries=CAPACITY)
+        tiered_seconds = time_inserts(tiered)
+
+        print(
+            f"\nSorted eviction: {INSERTS / sorted_seconds:.0f} sets/s, "
+            f"LRU eviction: {INSERTS / tiered_seconds:.0f} sets/s"
+        )
+
+        assert tiered.get_stats()["size"] == CAPACITY
+        assert tiered_seconds < sorted_seconds
+
+    def test_stampede_single_flight(self, tmp_path):
+        backend = SQLiteCacheBackend(str(tmp_path / "shared_cache.db"))
+        workers = [TieredCache("bench", backend=backend) for _ in range(4)]
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(COMPUTE_SECONDS)
+            return {"report": "value"}
+
+        def request(i):
+            workers[i % len(workers)].get_or_set("report", compute)
+
+        threads = [
+            threading.Thread(target=request, args=(i,)) for i in range(STAMPEDE_THREADS)
+        ]
+        start = time.perf_counter()
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            backend.close()
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"\n{STAMPEDE_THREADS} concurrent misses: {len(calls)} recompute(s) "
+            f"in {elapsed:.2f}s"
+        )
+
+        assert len(calls) == 1
@@ -0,0 +1,141 @@
+"""
+Latency benchmark for the webhook intake log.
+
+Sends 400 SendGrid webhooks from 16 concurrent request threads, once through
+WebhookIntegrationService.process_webhook() and once through
+accept_webhook(), against storage that takes 5 ms per write. Reports
+request latency, requests/s and how many appends shared each fsync, then
+drains the intake log with the consumer to check that every webhook is
+processed.
+"""
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import pytest
+
+from leadfactory.webhooks.webhook_integration import WebhookIntegrationService
+from leadfactory.webhooks.webhook_intake import WebhookIntakeConsumer, WebhookIntakeLog
+
+REQUEST_COUNT = 400
+REQUEST_THREADS = 16
+STORAGE_LATENCY = 0.005
+
+
+def slow_storage():
+    storage = Mock()
+
+    def write(*args, **kwargs):
+        time.sleep(STORAGE_LATENCY)
+        return True
+
+    storage.store_webhook_event.side_effect = write
+    storage.update_webhook_event.side_effect = write
+    return storage
+
+
+def make_service(intake_log=None):
+    with (
+        patch(
+            "leadfactory.webhooks.webhook_validator.get_storage_instance",
+            return_value=slow_storage(),
+        ),
+        patch("leadfactory.webhooks.webhook_integration.EngagementAnalytics"),
+        patch("leadfactory.webhooks.webhook_integration.ErrorPropagationManager"),
+    ):
+        service = WebhookIntegrationService(
+            webhook_monitor=Mock(),
+            retry_manager=Mock(),
+            dead_letter_manager=Mock(),
+            intake_log=intake_log,
+        )
+    service.webhook_validator.webhook_configs["sendgrid"].rate_limit_per_minute = (
+        REQUEST_COUNT * 10
+    )
+    return service
+
+
+def payloads():
+    return [
+        json.dumps(
+            {
+                "email": f"user{i}@example.com",
+                "event": "delivered",
+                "timestamp": 1234567890 + i,
+                "sg_event_id": f"evt{i}",
+            }
+        ).encode("utf-8")
+        for i in range(REQUEST_COUNT)
+    ]
+
+
+def send_all(send):
+    headers = {"Content-Type": "application/json"}
+
+    def request(payload):
+        start = time.perf_counter()
+        result = send("sendgrid", payload, headers)
+        return time.perf_counter() - start, result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=REQUEST_THREADS) as executor:
+        responses = list(executor.map(request, payloads()))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in responses)
+    return {
+        "results": [result for _, result in responses],
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "rps": REQUEST_COUNT / elapsed,
+    }
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestWebhookIntakePerformance:
+    """Compare inline processing with acknowledge-then-process intake."""
+
+    def test_intake_latency(self, tmp_path):
+        inline = send_all(make_service().process_webhook)
+
+        intake_log = WebhookIntakeLog(tmp_path / "intake.db")
+        service = make_service(intake_log)
+        try:
+            intake = send_all(service.accept_webhook)
+            intake_commits = intake_log.stats["commits"]
+
+            consumer = WebhookIntakeConsumer(
+                intake_log,
+                service._process_intake_event,
+                default_concurrency=REQUEST_THREADS,
+            )
+
+            async def drain():
+                while await consumer.dispatch_pending():
+                    await consumer.join()
+
+            start = time.perf_counter()
+            asyncio.run(drain())
+            drain_seconds = time.perf_counter() - start
+            intake_log.flush()
+            lag = intake_log.lag()
+        finally:
+            intake_log.close()
+
+        for name, run in (("Inline", inline), ("Intake", intake)):
+            print(
+                f"\n{name}: p50 {run['p50'] * 1000:.1f} ms, "
+                f"p95 {run['p95'] * 1000:.1f} ms, {run['rps']:.0f} requests/s"
+            )
+        print(f"Appends per fsync'd commit: {REQUEST_COUNT / intake_commits:.1f}")
+        print(f"Consumer drained {REQUEST_COUNT} events in {drain_seconds:.2f}s")
+
+        assert all(result["success"] for result in inline["results"])
+        assert all(result["status"] == "accepted" for result in intake["results"])
+        assert consumer.stats["processed"] == REQUEST_COUNT
+        assert lag[0] == 0
+        assert intake["p95"] < inline["p95"]
@@ -0,0 +1,118 @@
+"""
+Dispatch benchmark for the webhook retry scheduler.
+
+Warm-starts WebhookRetryManager from a 20k-row retry snapshot whose items fall
+due over two seconds, behind a critical retry that is not due for an hour,
+and runs process_retry_queue until every due item has been dispatched.
+Reports how late items were dispatched relative to their retry time, the
+dispatch rate, and how often storage was read.
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from leadfactory.webhooks.webhook_retry_manager import (
+    WebhookPriority,
+    WebhookRetryItem,
+    WebhookRetryManager,
+)
+
+RETRY_COUNT = 20_000
+SPREAD_SECONDS = 2.0
+PRIORITIES = list(WebhookPriority)
+
+
+class RetryStorage:
+    """In-memory webhook_retries table that counts reads and deletes."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.reads = 0
+        self.removed = 0
+
+    def get_pending_webhook_retries(self, limit=None, due_only=True):
+        self.reads += 1
+        return self.rows
+
+    def remove_webhook_retry_item(self, event_id):
+        self.removed += 1
+        return True
+
+
+def snapshot(start):
+    rows = [
+        WebhookRetryItem(
+            event_id="blocked-critical",
+            webhook_name="stripe",
+            retry_attempt=1,
+            next_retry_time=start + timedelta(hours=1),
+            priority=WebhookPriority.CRITICAL,
+        ).to_storage_dict()
+    ]
+    for i in range(RETRY_COUNT):
+        rows.append(
+            WebhookRetryItem(
+                event_id=f"evt{i}",
+                webhook_name="sendgrid",
+                retry_attempt=1,
+                next_retry_time=start
+                + timedelta(seconds=SPREAD_SECONDS * i / RETRY_COUNT),
+                priority=PRIORITIES[i % len(PRIORITIES)],
+            ).to_storage_dict()
+        )
+    return rows
+
+
+@pytest.mark.performance
+@pytest.mark.benchmark
+class TestWebhookRetrySchedulerPerformance:
+    """Measure dispatch latency of the heap-based retry scheduler."""
+
+    def test_large_backlog_dispatch(self):
+        start = datetime.utcnow() + timedelta(seconds=0.5)
+        storage = RetryStorage(snapshot(start))
+
+        with patch(
+            "leadfactory.webhooks.webhook_retry_manager.get_storage_instance",
+            return_value=storage,
+        ):
+            manager = WebhookRetryManager(max_concurrent_retries=50, batch_size=200)
+
+        lateness = []
+
+        async def process_retry_item(item, semaphore):
+            lateness.append((datetime.utcnow() - item.next_retry_time).total_seconds())
+            return True
+
+        manager._process_retry_item = process_retry_item
+
+        async def run():
+            task = asyncio.create_task(manager.process_retry_queue())
+            while len(lateness) < RETRY_COUNT:
+                await asyncio.sleep(0.01)
+            manager.stop_queue()
+            await task
+
+        began = time.perf_counter()
+        asyncio.run(run())
+        elapsed = time.perf_counter() - began
+
+        lateness.sort()
+        p50 = lateness[len(lateness) // 2]
+        p99 = lateness[int(len(lateness) * 0.99)]
+        print(
+            f"\nDispatched {RETRY_COUNT} retries in {elapsed:.2f}s "
+            f"({RETRY_COUNT / SPREAD_SECONDS:.0f}/s offered)"
+        )
+        print(f"Lateness: p50 {p50 * 1000:.1f} ms, p99 {p99 * 1000:.1f} ms")
+        print(f"Storage reads: {storage.reads}")
+
+        assert min(lateness) >= 0
+        assert p99 < 0.25
+        assert storage.reads == 1
+        assert [item.event_id for item in manager.retry_queue] == ["blocked-critical"]
+        assert storage.removed == RETRY_COUNT
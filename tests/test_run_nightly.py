@@ -5,6 +5,7 @@ Tests for the nightly batch processing script.
 import os
 import shutil
 import subprocess
+import sys
 import tempfile
 import unittest
 from unittest.mock import MagicMock, call, patch
@@ -179,5 +180,71 @@ class TestRunNightly(unittest.TestCase):
         self.assertTrue(mock_run.called, "Supabase usage check was not called")
 
 
+class TestRunNightlyStream(unittest.TestCase):
+    """Test that --stream launches the CLI the way the shell runs it."""
+
+    def setUp(self):
+        """Copy the script into a scratch project that links the real package."""
+        repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.project_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.project_dir, "bin"))
+        self.script_path = os.path.join(self.project_dir, "bin", "run_nightly.sh")
+        shutil.copy(os.path.join(repo_root, "bin", "run_nightly.sh"), self.script_path)
+        os.symlink(
+            os.path.join(repo_root, "leadfactory"),
+            os.path.join(self.project_dir, "leadfactory"),
+        )
+
+        # python shim: record every call, run CLI invocations for real with
+        # --help appended so nothing is processed, and no-op the rest
+        self.bin_dir = tempfile.mkdtemp()
+        self.calls_file = os.path.join(self.bin_dir, "calls.log")
+        shim = os.path.join(self.bin_dir, "python")
+        with open(shim, "w") as f:
+            f.write(
+                "#!/bin/bash\n"
+                f'echo "$PWD $*" >> "{self.calls_file}"\n'
+                'if [ "$1 $2" = "-m leadfactory.cli.main" ]; then\n'
+                f'    exec "{sys.executable}" "$@" --help\n'
+                "fi\n"
+                "exit 0\n"
+            )
+        os.chmod(shim, 0o755)
+
+    def tearDown(self):
+        """Clean up after tests."""
+        shutil.rmtree(self.project_dir)
+        shutil.rmtree(self.bin_dir)
+
+    def test_stream_runs_cli_module(self):
+        result = subprocess.run(
+            ["bash", self.script_path, "--stream", "--debug", "--limit=10"],
+            cwd=self.bin_dir,
+            env={
+                "PATH": f"{self.bin_dir}{os.pathsep}{os.environ['PATH']}",
+                "HOME": os.environ.get("HOME", self.bin_dir),
+            },
+            capture_output=True,
+            text=True,
+            timeout=300,
+        )
+
+        self.assertEqual(
+            result.returncode,
+            0,
+            f"Script failed with output: {result.stdout} {result.stderr}",
+        )
+        self.assertIn("Completed stage 6: Streaming Pipeline", result.stdout)
+        self.assertIn("Run all pipeline stages at once", result.stdout)
+
+        with open(self.calls_file) as f:
+            calls = f.read().splitlines()
+        self.assertIn(
+            f"{self.project_dir} -m leadfactory.cli.main --verbose pipeline stream"
+            " --limit=10",
+            calls,
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,217 @@
+"""
+Unit tests for the vectorized CostAnalyticsEngine backend.
+
+Each analysis is run through both the NumPy kernels and the pure-Python
+implementation, and the results are compared.
+"""
+
+import os
+import random
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from leadfactory.analytics import timeseries  # noqa: E402
+from leadfactory.analytics.cost_analytics import CostAnalyticsEngine  # noqa: E402
+
+# Keys whose values depend on the wall clock rather than the data
+VOLATILE_KEYS = {"generated_at"}
+
+
+def assert_equivalent(vectorized, reference, path="result", abs_tol=1e-9):
+    """Recursively compare two analysis results with a float tolerance."""
+    if isinstance(reference, dict):
+        assert isinstance(vectorized, dict), path
+        assert list(vectorized) == list(reference), path
+        for key in reference:
+            if key not in VOLATILE_KEYS:
+                assert_equivalent(
+                    vectorized[key], reference[key], f"{path}.{key}", abs_tol
+                )
+    elif isinstance(reference, (list, tuple)):
+        assert len(vectorized) == len(reference), path
+        for index, (left, right) in enumerate(zip(vectorized, reference)):
+            assert_equivalent(left, right, f"{path}[{index}]", abs_tol)
+    elif isinstance(reference, float) or isinstance(vectorized, float):
+        assert vectorized == pytest.approx(reference, rel=1e-9, abs=abs_tol), path
+    else:
+        assert vectorized == reference, path
+
+
+def make_history(days, seed, start=datetime(2024, 1, 1), spikes=True):
+    """Build a daily cost history with trend, weekly pattern, noise and spikes."""
+    rng = random.Random(seed)
+    history = []
+    for day in range(days):
+        cost = 20 + 0.05 * day + 5 * (day % 7 in (5, 6)) + rng.gauss(0, 2)
+        if spikes and rng.random() < 0.03:
+            cost *= rng.choice([0.2, 3.0])
+        if day == days // 2:
+            cost += 15
+        history.append(
+            {
+                "date": (start + timedelta(days=day)).strftime("%Y-%m-%d"),
+                "cost": round(max(cost, 0.01), 4),
+                "transaction_count": 1,
+                "avg_transaction_cost": 1.0,
+            }
+        )
+    return history
+
+
+@pytest.fixture
+def engines():
+    """A vectorized engine and a pure-Python reference engine."""
+    return CostAnalyticsEngine(vectorized=True), CostAnalyticsEngine(vectorized=False)
+
+
+class TestVectorizedCostAnalytics:
+    """Test that the vectorized backend matches the pure-Python one."""
+
+    @pytest.mark.parametrize("days,seed", [(7, 1), (14, 2), (30, 3), (90, 4), (365, 5)])
+    def test_full_analysis_matches(self, engines, days, seed):
+        """Test that a complete trend analysis is numerically equivalent."""
+        vectorized, reference = engines
+        history = make_history(days, seed)
+
+        assert_equivalent(
+            vectorized._analyze_series("openai", history, 30),
+            reference._analyze_series("openai", history, 30),
+        )
+
+    def test_constant_series_matches(self, engines):
+        """Test that windows without spread are treated exactly as zero."""
+        vectorized, reference = engines
+        history = [
+            {
+                "date": (datetime(2024, 3, 1) + timedelta(days=day)).strftime(
+                    "%Y-%m-%d"
+                ),
+                "cost": 0.1,
+                "transaction_count": 1,
+                "avg_transaction_cost": 0.1,
+            }
+            for day in range(60)
+        ]
+
+        result = vectorized._analyze_series(None, history, 7)
+
+        assert result["anomalies"] == []
+        assert result["change_points"] == []
+        assert result["trend_metrics"]["correlation"] == 0.0
+        # The raw-sum correlation of the reference leaves rounding noise here
+        assert_equivalent(
+            result, reference._analyze_series(None, history, 7), abs_tol=1e-6
+        )
+
+    def test_step_change_detected(self, engines):
+        """Test that change points agree on a series with a level shift."""
+        vectorized, reference = engines
+        costs = [10.0 + (day % 3) * 0.5 for day in range(50)] + [
+            30.0 + (day % 3) * 0.5 for day in range(50)
+        ]
+        dates = [datetime(2024, 1, 1) + timedelta(days=day) for day in range(100)]
+
+        change_points = vectorized._detect_change_points(costs, dates)
+
+        assert change_points
+        assert change_points[0]["type"] == "increase"
+        assert_equivalent(change_points, reference._detect_change_points(costs, dates))
+
+    def test_batch_matches_individual_series(self, engines):
+        """Test that stacked multi-series processing matches per-series calls."""
+        vectorized, reference = engines
+        series = [
+            [item["cost"] for item in make_history(days, seed)]
+            for days, seed in [(60, 1), (60, 2), (45, 3), (10, 4), (60, 5)]
+        ]
+        dates = [
+            [datetime(2024, 1, 1) + timedelta(days=day) for day in range(len(costs))]
+            for costs in series
+        ]
+
+        assert_equivalent(
+            vectorized._decompose_trend_batch(series),
+            [reference._decompose_trend(costs) for costs in series],
+        )
+        assert_equivalent(
+            vectorized._detect_change_points_batch(series, dates),
+            [
+                reference._detect_change_points(costs, day_list)
+                for costs, day_list in zip(series, dates)
+            ],
+        )
+
+    def test_analyze_service_cost_trends(self, engines):
+        """Test that per-service analysis matches analyze_cost_trends()."""
+        vectorized, reference = engines
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "costs.db")
+            conn = sqlite3.connect(db_path)
+            conn.execute(
+                "CREATE TABLE costs (timestamp TEXT, service TEXT, amount REAL)"
+            )
+            start = datetime.now() - timedelta(days=40)
+            for seed, service in enumerate(["openai", "semrush", "screenshot"]):
+                days = 5 if service == "screenshot" else 40
+                for item in make_history(days, seed, start=start):
+                    conn.execute(
+                        "INSERT INTO costs VALUES (?, ?, ?)",
+                        (item["date"] + "T12:00:00", service, item["cost"]),
+                    )
+            conn.commit()
+            conn.close()
+
+            with patch("leadfactory.analytics.cost_analytics.cost_tracker") as tracker:
+                tracker.db_path = db_path
+                results = vectorized.analyze_service_cost_trends(
+                    days_back=60, forecast_days=14
+                )
+                expected = {
+                    service: reference.analyze_cost_trends(service, 60, 14)
+                    for service in ["openai", "semrush", "screenshot"]
+                }
+
+        assert set(results) == {"openai", "semrush", "screenshot"}
+        assert results["screenshot"]["error"] == "Insufficient data for trend analysis"
+        for service, analysis in expected.items():
+            assert_equivalent(results[service], analysis, service)
+
+
+class TestTimeseriesKernels:
+    """Test cases for the NumPy time-series kernels."""
+
+    def test_rolling_mean_var(self):
+        """Test rolling windows against direct computation on a 2-D batch."""
+        rng = np.random.default_rng(7)
+        values = rng.normal(1000.0, 5.0, size=(3, 200))
+
+        means, variances = timeseries.rolling_mean_var(values, 9)
+
+        windows = np.lib.stride_tricks.sliding_window_view(values, 9, axis=-1)
+        np.testing.assert_allclose(means, windows.mean(axis=-1), rtol=1e-12)
+        np.testing.assert_allclose(variances, windows.var(axis=-1, ddof=1), rtol=1e-8)
+
+    def test_calendar_helpers(self):
+        """Test weekday and day-of-month extraction."""
+        dates = [datetime(2024, 2, 27) + timedelta(days=day) for day in range(5)]
+
+        assert timeseries.weekdays(dates).tolist() == [d.weekday() for d in dates]
+        assert timeseries.days_of_month(dates).tolist() == [d.day for d in dates]
+        assert timeseries.weekdays(["2024-01-01"]).tolist() == [0]
+
+    def test_exponential_smoothing(self):
+        """Test smoothing against the recurrence."""
+        values = np.array([3.0, 5.0, 4.0, 10.0, 2.0])
+        expected = [3.0]
+        for value in values[1:]:
+            expected.append(0.3 * value + 0.7 * expected[-1])
+
+        np.testing.assert_allclose(
+            timeseries.exponential_smoothing(values, 0.3), expected
+        )
@@ -0,0 +1,90 @@
+"""
+Unit tests for report caching in the cost breakdown API.
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from flask import Flask
+
+from leadfactory.api.cost_breakdown_api import CostBreakdownAPI
+from leadfactory.cache import TieredCache
+
+
+def make_api():
+    with patch.object(CostBreakdownAPI, "_start_streaming_thread"):
+        api = CostBreakdownAPI(Flask(__name__))
+    api._cache = TieredCache("cost_breakdown_test", default_ttl=300)
+    return api
+
+
+def test_concurrent_requests_compute_a_report_once():
+    api = make_api()
+    computed = []
+    results = []
+
+    def slow_summary(time_period):
+        computed.append(time_period)
+        time.sleep(0.05)
+        return {"time_period": time_period}
+
+    with patch.object(api, "_compute_cost_summary", side_effect=slow_summary):
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(api._get_cost_summary("daily"))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert computed == ["daily"]
+        assert results == [{"time_period": "daily"}] * 8
+
+        # Invalidating the report type recomputes it on the next request
+        assert api.invalidate_cache("summary") == 1
+        api._get_cost_summary("daily")
+        assert computed == ["daily", "daily"]
+
+
+def test_failed_reports_are_not_cached():
+    api = make_api()
+
+    with patch.object(
+        api, "_compute_budget_utilization", side_effect=[RuntimeError("locked"), {}]
+    ) as compute:
+        with pytest.raises(RuntimeError):
+            api._get_budget_utilization(2024, 1)
+        assert api._get_budget_utilization(2024, 1) == {}
+
+    assert compute.call_count == 2
+
+
+def test_service_trends_come_from_one_grouped_analysis():
+    api = make_api()
+    analysis = {"openai": {"summary": {}}, "semrush": {"summary": {}}}
+
+    with (
+        patch("leadfactory.api.cost_breakdown_api.cost_analytics_engine") as engine,
+        api.app.test_client() as client,
+    ):
+        engine.analyze_service_cost_trends.return_value = analysis
+        first = client.get("/api/cost/trends/services?days_back=60&forecast_days=14")
+        second = client.get("/api/cost/trends/services?days_back=60&forecast_days=14")
+        only_openai = client.get("/api/cost/trends/services?service_type=openai")
+
+    assert first.status_code == second.status_code == only_openai.status_code == 200
+    assert first.get_json()["services"] == analysis
+    assert engine.analyze_service_cost_trends.call_count == 2
+    assert engine.analyze_service_cost_trends.call_args_list[0].kwargs == {
+        "days_back": 60,
+        "forecast_days": 14,
+        "service_types": None,
+    }
+    assert engine.analyze_service_cost_trends.call_args_list[1].kwargs[
+        "service_types"
+    ] == ["openai"]
@@ -0,0 +1,162 @@
+"""
+Unit tests for the streaming log export writers.
+"""
+
+import csv
+import gzip
+import hashlib
+import io
+import json
+import zipfile
+from xml.etree import ElementTree
+
+import pytest
+
+from leadfactory.api.log_export import (
+    XLSX_CELL_LIMIT,
+    gzip_chunks,
+    iter_csv,
+    iter_json,
+    iter_ndjson,
+    iter_xlsx,
+)
+
+SHEET_NS = {"s": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
+
+
+def make_rows(count):
+    return (
+        {"id": i, "log_type": "llm", "content": f'prompt {i}, with "quotes"\n'}
+        for i in range(count)
+    )
+
+
+def read_sheet(data):
+    """Return the worksheet rows of an XLSX file as lists of cell text."""
+    package = zipfile.ZipFile(io.BytesIO(data))
+    assert package.testzip() is None
+    sheet = ElementTree.fromstring(package.read("xl/worksheets/sheet1.xml"))
+    return [
+        ["".join(cell.itertext()) for cell in row]
+        for row in sheet.iterfind("s:sheetData/s:row", SHEET_NS)
+    ]
+
+
+class TestCsvWriter:
+    """Test CSV export streaming."""
+
+    def test_round_trip(self):
+        """Test that quoted fields and newlines survive the writer."""
+        text = "".join(iter_csv(make_rows(3), ["id", "content"]))
+
+        rows = list(csv.DictReader(io.StringIO(text)))
+        assert len(rows) == 3
+        assert rows[1] == {"id": "1", "content": 'prompt 1, with "quotes"\n'}
+
+    def test_chunking(self):
+        """Test that output is yielded in bounded chunks."""
+        chunks = list(iter_csv(make_rows(1000), ["id", "content"], chunk_size=1024))
+
+        assert len(chunks) > 10
+        assert max(len(chunk) for chunk in chunks) < 2048
+
+    def test_header_only(self):
+        """Test exporting no rows."""
+        assert "".join(iter_csv([], ["id", "content"])) == "id,content\r\n"
+
+
+class TestJsonWriters:
+    """Test JSON and NDJSON export streaming."""
+
+    def test_json_document(self):
+        """Test that the streamed document parses and counts its logs."""
+        text = "".join(
+            iter_json(make_rows(5), header={"export_timestamp": "now"}, chunk_size=64)
+        )
+
+        data = json.loads(text)
+        assert data["export_timestamp"] == "now"
+        assert data["total_logs"] == 5
+        assert [log["id"] for log in data["logs"]] == [0, 1, 2, 3, 4]
+
+    def test_json_document_empty(self):
+        """Test that an empty export is still valid JSON."""
+        assert json.loads("".join(iter_json([]))) == {"logs": [], "total_logs": 0}
+
+    def test_ndjson(self):
+        """Test one JSON object per line."""
+        lines = "".join(iter_ndjson(make_rows(4))).splitlines()
+
+        assert [json.loads(line)["id"] for line in lines] == [0, 1, 2, 3]
+
+
+class TestXlsxWriter:
+    """Test streaming XLSX export."""
+
+    def test_workbook(self):
+        """Test that the package is a readable workbook with typed cells."""
+        data = b"".join(
+            iter_xlsx(
+                make_rows(3),
+                ["id", "log_type", "content"],
+                headers={"id": "ID", "log_type": "Log Type"},
+            )
+        )
+
+        rows = read_sheet(data)
+        assert rows[0] == ["ID", "Log Type", "content"]
+        assert rows[1] == ["0", "llm", 'prompt 0, with "quotes"\n']
+        assert len(rows) == 4
+
+        package = zipfile.ZipFile(io.BytesIO(data))
+        sheet = package.read("xl/worksheets/sheet1.xml").decode()
+        assert '<c><v>0</v></c><c t="inlineStr">' in sheet
+        assert "xl/workbook.xml" in package.namelist()
+        assert "[Content_Types].xml" in package.namelist()
+
+    def test_escaping_and_limits(self):
+        """Test XML escaping, illegal characters and the cell size limit."""
+        rows = [
+            {"content": "<b>&amp;</b>\x00\x1b"},
+            {"content": "x" * (XLSX_CELL_LIMIT + 10)},
+            {"content": None},
+        ]
+
+        sheet = read_sheet(b"".join(iter_xlsx(rows, ["content"])))
+
+        assert sheet[1] == ["<b>&amp;</b>"]
+        assert len(sheet[2][0]) == XLSX_CELL_LIMIT
+        assert sheet[3] == [""]
+
+    def test_chunking(self):
+        """Test that the workbook is yielded as it is written."""
+        rows = (
+            {"id": i, "content": hashlib.sha256(str(i).encode()).hexdigest()}
+            for i in range(5000)
+        )
+
+        chunks = list(iter_xlsx(rows, ["id", "content"], chunk_size=4096))
+
+        assert len(chunks) > 5
+        assert len(read_sheet(b"".join(chunks))) == 5001
+
+
+class TestGzip:
+    """Test on-the-fly gzip compression."""
+
+    @pytest.mark.parametrize("as_bytes", [False, True])
+    def test_round_trip(self, as_bytes):
+        """Test that compressed chunks form a single gzip stream."""
+        chunks = [f"line {i}\n" for i in range(1000)]
+        if as_bytes:
+            chunks = [chunk.encode() for chunk in chunks]
+
+        data = b"".join(gzip_chunks(chunks))
+
+        assert gzip.decompress(data).decode() == "".join(
+            chunk if isinstance(chunk, str) else chunk.decode() for chunk in chunks
+        )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
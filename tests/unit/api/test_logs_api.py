@@ -4,8 +4,12 @@ Unit tests for the Logs API endpoints and functionality.
 Tests API endpoints, data formatting, filtering, export functionality, and error handling.
 """
 
+import gzip
 import io
 import json
+import random
+import tracemalloc
+import zipfile
 from datetime import datetime
 from unittest.mock import MagicMock, Mock, patch
 
@@ -118,6 +122,9 @@ class TestLogsAPI:
         cache.get_logs_with_filters.return_value = None
         cache.get_log_statistics.return_value = None
         cache.get_businesses_with_logs.return_value = None
+        # Keyset pages and counts miss and are fetched from storage
+        cache.get_or_set_logs_page.side_effect = lambda cursor, fetch, **kw: fetch()
+        cache.get_or_set_logs_count.side_effect = lambda fetch, **kw: fetch()
         cache.get_stats.return_value = {
             "size": 0,
             "hit_rate": 0.0,
@@ -265,6 +272,115 @@ class TestLogsAPI:
         mock_storage.get_logs_with_filters.assert_called_once()
         mock_cache.set_logs_with_filters.assert_called_once()
 
+    def test_log_cursor_round_trip(self, logs_api):
+        """Test encoding and decoding keyset cursors."""
+        timestamp = datetime(2024, 1, 2, 3, 4, 5)
+        cursor = logs_api._encode_log_cursor(
+            {"timestamp": timestamp, "log_type": "llm", "id": 42}
+        )
+
+        assert logs_api._decode_log_cursor(cursor) == {
+            "timestamp": timestamp,
+            "log_type": "llm",
+            "id": 42,
+        }
+        assert logs_api._decode_log_cursor("not-a-cursor") is None
+
+    def test_validate_filters_cursor(self, logs_api):
+        """Test cursor validation."""
+        cursor = logs_api._encode_log_cursor(
+            {"timestamp": datetime.utcnow(), "log_type": "llm", "id": 1}
+        )
+
+        assert logs_api._validate_filters(LogSearchFilters(cursor=cursor)) is None
+        assert (
+            logs_api._validate_filters(LogSearchFilters(cursor="bad"))
+            == "Invalid cursor"
+        )
+        assert "sort_by=timestamp" in logs_api._validate_filters(
+            LogSearchFilters(cursor=cursor, sort_by="business_id")
+        )
+
+    def test_fetch_logs_by_cursor(self, logs_api, mock_cache, mock_storage):
+        """Test keyset page fetching with next cursor and estimated total."""
+        timestamp = datetime(2024, 1, 2)
+        mock_storage.get_logs_page.return_value = [
+            {"id": i, "log_type": "llm", "timestamp": timestamp, "content": ""}
+            for i in (5, 4, 3)
+        ]
+        mock_storage.estimate_logs_count.return_value = 1000
+        cursor = logs_api._encode_log_cursor(
+            {"timestamp": timestamp, "log_type": "llm", "id": 6}
+        )
+
+        logs, pagination = logs_api._fetch_logs_by_cursor(
+            LogSearchFilters(limit=2, cursor=cursor)
+        )
+
+        assert [log.id for log in logs] == [5, 4]
+        kwargs = mock_storage.get_logs_page.call_args.kwargs
+        assert kwargs["limit"] == 3
+        assert kwargs["after"] == {"timestamp": timestamp, "log_type": "llm", "id": 6}
+        assert logs_api._decode_log_cursor(pagination["next_cursor"])["id"] == 4
+        assert pagination["has_more"] is True
+        assert pagination["total"] == 1000
+        assert pagination["total_is_estimate"] is True
+        mock_cache.get_or_set_logs_page.assert_called_once()
+        assert mock_cache.get_or_set_logs_page.call_args.args[0] == cursor
+        mock_cache.get_or_set_logs_count.assert_called_once()
+
+    def test_offset_page_includes_next_cursor(self, logs_api):
+        """Test that offset pages hand over to keyset pagination."""
+        logs = [
+            LogEntry(
+                id=7,
+                business_id=1,
+                log_type="raw_html",
+                content="",
+                timestamp=datetime(2024, 1, 2),
+                metadata={},
+            )
+        ]
+
+        pagination = logs_api._offset_pagination(
+            LogSearchFilters(limit=1), logs, total_count=10
+        )
+
+        assert pagination["has_more"] is True
+        assert logs_api._decode_log_cursor(pagination["next_cursor"])["id"] == 7
+
+    def test_first_page_read_by_keyset(self, logs_api, flask_app, mock_cache):
+        """Test that first pages skip OFFSET and the exact count."""
+        logs_api.storage.get_logs_page.return_value = []
+        logs_api.storage.estimate_logs_count.return_value = 0
+
+        with flask_app.test_client() as client:
+            first = client.get("/api/logs?limit=10&search=pizza")
+            searched = client.post(
+                "/api/logs/search",
+                json={"query": "pizza", "pagination": {"limit": 10}},
+            )
+            deeper = client.get("/api/logs?limit=10&offset=10&search=pizza")
+
+        assert first.status_code == searched.status_code == 200
+        assert first.get_json()["pagination"]["total_is_estimate"] is True
+        assert searched.get_json()["pagination"]["total_is_estimate"] is True
+        for call in logs_api.storage.get_logs_page.call_args_list:
+            assert call.kwargs["after"] is None
+            assert call.kwargs["search_query"] == "pizza"
+        assert logs_api.storage.get_logs_page.call_count == 2
+        # Page-number jumps still read by offset with an exact count
+        assert deeper.status_code == 200
+        logs_api.storage.get_logs_with_filters.assert_called_once()
+
+    def test_first_page_by_offset_without_keyset_storage(self, logs_api):
+        """Test that storages without get_logs_page keep offset pages."""
+        logs_api.storage = Mock(spec=["get_logs_with_filters"])
+        logs_api.storage.get_logs_with_filters.return_value = ([], 0)
+
+        assert logs_api._pages_by_keyset(LogSearchFilters()) is False
+        assert logs_api._pages_by_keyset(LogSearchFilters(sort_by="id")) is False
+
     def test_fetch_log_by_id(self, logs_api, mock_storage):
         """Test fetching single log by ID."""
         # Setup storage to return log data
@@ -384,6 +500,118 @@ class TestLogsAPI:
         assert "logs" in data
         assert len(data["logs"]) == 1
 
+    def make_log_rows(self, count, content_size=600):
+        """Yield storage rows lazily, with hard-to-compress content."""
+        timestamp = datetime(2024, 1, 1)
+        for i in range(count):
+            yield {
+                "id": i,
+                "business_id": i % 50,
+                "log_type": "llm",
+                "content": random.Random(i).randbytes(content_size // 2).hex(),
+                "timestamp": timestamp,
+                "metadata": {"operation": "mockup"},
+            }
+
+    def test_iter_logs_streams_from_storage(self, logs_api, mock_cache, mock_storage):
+        """Test that exports read through the storage iterator, uncached."""
+        mock_storage.iter_logs.return_value = self.make_log_rows(3)
+
+        logs = list(logs_api._iter_logs(LogSearchFilters(log_type="llm")))
+
+        assert [log.id for log in logs] == [0, 1, 2]
+        mock_storage.iter_logs.assert_called_once_with(
+            batch_size=1000, log_type="llm", sort_order="desc"
+        )
+        mock_storage.get_logs_with_filters.assert_not_called()
+        mock_cache.get_logs_with_filters.assert_not_called()
+
+    def test_iter_logs_pages_without_iterator(self, logs_api):
+        """Test the offset paging fallback for storages without iter_logs."""
+        rows = list(self.make_log_rows(5))
+        storage = Mock(spec=["get_logs_with_filters"])
+        storage.get_logs_with_filters.side_effect = [
+            (rows[:2], 5),
+            (rows[2:4], 5),
+            (rows[4:], 5),
+        ]
+        logs_api.storage = storage
+
+        logs = list(logs_api._iter_logs(LogSearchFilters(), batch_size=2))
+
+        assert [log.id for log in logs] == [0, 1, 2, 3, 4]
+        offsets = [
+            call.kwargs["offset"]
+            for call in storage.get_logs_with_filters.call_args_list
+        ]
+        assert offsets == [0, 2, 4]
+
+    def test_export_ndjson(self, logs_api):
+        """Test NDJSON export."""
+        logs = [logs_api._log_entry_from_dict(row) for row in self.make_log_rows(2)]
+
+        response = logs_api._export_ndjson(logs, include_content=False)
+
+        assert response.mimetype == "application/x-ndjson"
+        lines = response.get_data(as_text=True).splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [0, 1]
+
+    def test_export_xlsx(self, logs_api):
+        """Test XLSX export without openpyxl or pandas."""
+        logs = [logs_api._log_entry_from_dict(row) for row in self.make_log_rows(2)]
+
+        response = logs_api._export_xlsx(logs, include_content=True)
+
+        assert response.status_code == 200
+        assert "logs_export_" in response.headers["Content-Disposition"]
+        package = zipfile.ZipFile(io.BytesIO(response.get_data()))
+        sheet = package.read("xl/worksheets/sheet1.xml").decode()
+        assert "Business ID" in sheet
+        assert sheet.count("<row>") == 3
+
+    def test_export_gzip(self, logs_api):
+        """Test gzip compression of an export."""
+        logs = (logs_api._log_entry_from_dict(row) for row in self.make_log_rows(3))
+
+        response = logs_api._export_response(logs, "csv", False, compress=True)
+
+        assert response.mimetype == "application/gzip"
+        assert ".csv.gz" in response.headers["Content-Disposition"]
+        lines = gzip.decompress(response.get_data()).decode().splitlines()
+        assert len(lines) == 4
+
+    @pytest.mark.parametrize(
+        "export_format,compress",
+        [("csv", False), ("json", False), ("ndjson", True), ("xlsx", False)],
+    )
+    def test_export_memory_is_flat(
+        self, logs_api, mock_storage, export_format, compress
+    ):
+        """Test that peak memory does not grow with the size of the export."""
+
+        def peak_memory(count):
+            mock_storage.iter_logs.return_value = self.make_log_rows(count)
+            tracemalloc.start()
+            try:
+                response = logs_api._export_response(
+                    logs_api._iter_logs(LogSearchFilters()),
+                    export_format,
+                    include_content=True,
+                    compress=compress,
+                )
+                exported = sum(len(chunk) for chunk in response.response)
+                return tracemalloc.get_traced_memory()[1], exported
+            finally:
+                tracemalloc.stop()
+
+        small_peak, _ = peak_memory(1000)
+        large_peak, large_size = peak_memory(10000)
+
+        # Ten times the logs for the same peak, which is a fraction of the
+        # size of the export
+        assert large_peak < small_peak * 1.2
+        assert large_size > 5 * large_peak
+
     def test_get_available_log_types(self, logs_api, mock_storage):
         """Test getting available log types."""
         mock_storage.get_available_log_types.return_value = [
@@ -546,7 +774,7 @@ class TestLogsAPIEndpoints:
 
     @patch("leadfactory.api.logs_api.get_storage")
     @patch("leadfactory.api.logs_api.get_cache")
-    def test_export_logs_endpoint(self, mock_cache, mock_storage, client):
+    def test_export_logs_endpoint(self, mock_cache, mock_storage):
         """Test POST /api/logs/export endpoint."""
         # Setup mocks
         mock_cache_instance = Mock()
@@ -555,8 +783,13 @@ class TestLogsAPIEndpoints:
 
         mock_storage_instance = Mock()
         mock_storage_instance.get_logs_with_filters.return_value = ([], 0)
+        mock_storage_instance.iter_logs.return_value = iter([])
         mock_storage.return_value = mock_storage_instance
 
+        # Build the app while storage is patched, so the export streams from
+        # the mock rather than a real database
+        client = create_logs_app().test_client()
+
         export_data = {
             "format": "csv",
             "include_content": False,
@@ -571,6 +804,8 @@ class TestLogsAPIEndpoints:
 
         assert response.status_code == 200
         assert response.mimetype == "text/csv"
+        response.get_data()
+        mock_storage_instance.iter_logs.assert_called_once()
 
     @patch("leadfactory.api.logs_api.get_storage")
     @patch("leadfactory.api.logs_api.get_cache")
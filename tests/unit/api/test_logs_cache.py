@@ -240,6 +240,43 @@ class TestLogsAPICache:
         assert logs == test_logs
         assert count == total_count
 
+    def test_logs_page_and_count_caching(self):
+        """Test keyset page and approximate count caching."""
+        cache = LogsAPICache(max_entries=10, default_ttl=300)
+        page = ([{"id": 1}], "next")
+
+        cache.set_logs_page(page, "cursor1", business_id=123, limit=50)
+        cache.set_logs_count(1000, business_id=123)
+
+        assert cache.get_logs_page("cursor1", business_id=123, limit=50) == page
+        assert cache.get_logs_page("cursor2", business_id=123, limit=50) is None
+        assert cache.get_logs_count(business_id=123) == 1000
+        assert cache.get_logs_count(business_id=456) is None
+
+        # Pages are logs queries; counts outlive them
+        cache.invalidate_pattern("logs_query")
+        assert cache.get_logs_page("cursor1", business_id=123, limit=50) is None
+        assert cache.get_logs_count(business_id=123) == 1000
+
+    def test_logs_page_and_count_fetched_once(self):
+        """Test that page and count misses are fetched once, then served."""
+        cache = LogsAPICache(max_entries=10, default_ttl=300)
+        fetch_page = Mock(return_value=([{"id": 1}], None))
+        fetch_count = Mock(return_value=0)
+
+        for _ in range(3):
+            assert cache.get_or_set_logs_page(
+                None, fetch_page, business_id=123, limit=50
+            ) == ([{"id": 1}], None)
+            assert cache.get_or_set_logs_count(fetch_count, business_id=123) == 0
+
+        fetch_page.assert_called_once()
+        fetch_count.assert_called_once()
+        assert cache.get_logs_page(None, business_id=123, limit=50) == (
+            [{"id": 1}],
+            None,
+        )
+
     def test_statistics_caching(self):
         """Test statistics caching methods."""
         cache = LogsAPICache(max_entries=10, default_ttl=300)
@@ -0,0 +1,233 @@
+"""Tests for the shared tiered cache."""
+
+import threading
+import time
+
+import pytest
+
+from leadfactory.cache import SQLiteCacheBackend, TieredCache
+from leadfactory.cache.tiered import deserialize, serialize
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = SQLiteCacheBackend(str(tmp_path / "shared_cache.db"))
+    yield backend
+    backend.close()
+
+
+class TestSerialization:
+    """Test payload encoding for the shared tier."""
+
+    def test_values_keep_their_types(self):
+        value = {"when": (1, 2), "items": {3}, 4: [1, 2.5, "x", None]}
+        restored = deserialize(serialize(value))
+
+        assert restored == value
+        assert isinstance(restored["when"], tuple)
+        assert 4 in restored
+
+    def test_unpicklable_values_are_not_shared(self):
+        assert serialize(lambda: None) is None
+
+
+class TestInProcessTier:
+    """Test the LRU/TTL tier without a shared backend."""
+
+    def test_set_get_and_miss(self):
+        cache = TieredCache("test")
+        cache.set("k", {"v": 1})
+
+        assert cache.get("k") == {"v": 1}
+        assert cache.get("missing") is None
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["shared"] is False
+
+    def test_lru_eviction_keeps_recently_used(self):
+        cache = TieredCache("test", max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert list(cache.entries) == ["a", "c"]
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = TieredCache("test", default_ttl=10, clock=clock)
+        cache.set("short", 1)
+        cache.set("forever", 2, ttl=0)
+
+        clock.now += 11
+
+        assert cache.get("short") is None
+        assert cache.get("forever") == 2
+        assert cache.get_stats()["expired"] == 1
+
+    def test_invalidate_tags(self):
+        cache = TieredCache("test")
+        cache.set("a", 1, tags=["reports"])
+        cache.set("b", 2, tags=["reports", "daily"])
+        cache.set("c", 3, tags=["daily"])
+
+        assert cache.invalidate_tags("reports") == 2
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+        assert cache.invalidate_tags("reports") == 0
+
+    def test_delete_and_clear(self):
+        cache = TieredCache("test")
+        cache.set("a", 1, tags=["t"])
+        cache.set("b", 2)
+
+        assert cache.delete("a") is True
+        assert cache.delete("a") is False
+        cache.clear()
+        assert cache.get_stats()["size"] == 0
+        assert cache.invalidate_tags("t") == 0
+
+
+class TestSharedTier:
+    """Test two workers sharing one SQLite tier."""
+
+    def test_value_is_visible_to_other_worker(self, backend):
+        first = TieredCache("test", backend=backend)
+        second = TieredCache("test", backend=backend)
+        first.set("k", {"v": 1}, tags=["t"])
+
+        assert second.get("k") == {"v": 1}
+        assert second.get_stats()["shared_hits"] == 1
+        # Promoted to the in-process tier with its tags
+        assert second.invalidate_tags("t") == 1
+
+    def test_caches_with_different_names_do_not_collide(self, backend):
+        TieredCache("one", backend=backend).set("k", 1)
+
+        assert TieredCache("two", backend=backend).get("k") is None
+
+    def test_invalidation_reaches_other_worker(self, backend):
+        clock = FakeClock()
+        first = TieredCache("test", backend=backend, clock=clock)
+        second = TieredCache("test", backend=backend, clock=clock)
+        first.set("a", 1, tags=["t"])
+        first.set("b", 2)
+        assert second.get("a") == 1
+        assert second.get("b") == 2
+
+        first.invalidate_tags("t")
+        first.delete("b")
+        clock.now += second.sync_interval
+
+        assert second.get("a") is None
+        assert second.get("b") is None
+
+    def test_clear_reaches_other_worker(self, backend):
+        clock = FakeClock()
+        first = TieredCache("test", backend=backend, clock=clock)
+        second = TieredCache("test", backend=backend, clock=clock)
+        first.set("a", 1)
+        assert second.get("a") == 1
+
+        first.clear()
+        clock.now += second.sync_interval
+
+        assert second.get("a") is None
+
+    def test_shared_entries_expire(self, backend):
+        clock = FakeClock()
+        first = TieredCache("test", backend=backend, clock=clock)
+        second = TieredCache("test", backend=backend, clock=clock)
+        first.set("k", 1, ttl=5)
+
+        clock.now += 6
+
+        assert second.get("k") is None
+
+
+class TestGetOrSet:
+    """Test single-flight recomputation."""
+
+    def test_computes_once_then_hits(self):
+        cache = TieredCache("test")
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return "value"
+
+        assert cache.get_or_set("k", compute) == "value"
+        assert cache.get_or_set("k", compute) == "value"
+        assert len(calls) == 1
+
+    def test_none_is_not_cached(self):
+        cache = TieredCache("test")
+        calls = []
+
+        cache.get_or_set("k", lambda: calls.append(1))
+        cache.get_or_set("k", lambda: calls.append(1))
+
+        assert len(calls) == 2
+
+    @pytest.mark.parametrize("shared", [False, True])
+    def test_concurrent_misses_compute_once(self, backend, shared):
+        caches = [
+            TieredCache("test", backend=backend if shared else None)
+            for _ in range(2 if shared else 1)
+        ]
+        calls = []
+        results = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.1)
+            return "value"
+
+        def worker(i):
+            results.append(caches[i % len(caches)].get_or_set("k", compute))
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["value"] * 8
+        assert len(calls) == 1
+
+    def test_waiter_takes_over_when_leader_fails(self):
+        cache = TieredCache("test")
+        started = threading.Event()
+        errors = []
+
+        def failing():
+            started.set()
+            time.sleep(0.05)
+            raise RuntimeError("boom")
+
+        def leader():
+            try:
+                cache.get_or_set("k", failing)
+            except RuntimeError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        started.wait(1)
+        value = cache.get_or_set("k", lambda: "recovered")
+        thread.join()
+
+        assert value == "recovered"
+        assert len(errors) == 1
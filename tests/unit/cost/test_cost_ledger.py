@@ -0,0 +1,207 @@
+"""
+Unit tests for the write-behind cost ledger.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime
+
+import pytest
+
+from leadfactory.cost.cost_ledger import CostLedger, close_all_ledgers
+from leadfactory.cost.cost_tracking import CostTracker
+
+
+@pytest.fixture
+def db_path():
+    """Create a cost tracking database in a temporary directory."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "costs.db")
+        yield path
+        close_all_ledgers()
+
+
+@pytest.fixture
+def tracker(db_path):
+    """Create a CostTracker backed by the temporary database."""
+    return CostTracker(db_path=db_path)
+
+
+def count_rows(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT COUNT(*), SUM(amount) FROM costs").fetchone()
+    finally:
+        conn.close()
+
+
+class TestCostLedger:
+    """Test cases for CostLedger."""
+
+    def test_add_cost_is_written_behind(self, tracker, db_path):
+        """Test that costs are batched rather than written per call."""
+        tracker.ledger.flush_interval = 60
+        tracker.add_cost(1.5, "openai", "gpt-4o")
+        tracker.add_cost(0.5, "semrush", "domain-overview")
+
+        assert tracker.ledger.pending_count() == 2
+        assert count_rows(db_path)[0] == 0
+
+        assert tracker.ledger.flush() == 2
+        assert count_rows(db_path) == (2, 2.0)
+
+    def test_totals_include_unflushed_entries(self, tracker):
+        """Test that daily and monthly totals are answered from memory."""
+        tracker.add_cost(1.5, "openai", "gpt-4o")
+        tracker.add_cost(0.5, "semrush", "domain-overview")
+
+        assert tracker.get_daily_cost() == pytest.approx(2.0)
+        assert tracker.get_daily_cost("openai") == pytest.approx(1.5)
+        assert tracker.get_monthly_cost() == pytest.approx(2.0)
+        assert tracker.get_monthly_cost("semrush") == pytest.approx(0.5)
+
+    def test_queries_flush_first(self, tracker):
+        """Test that SQL-backed reads see unflushed entries."""
+        tracker.add_cost(1.5, "openai", "gpt-4o")
+
+        breakdown = tracker.get_daily_cost_breakdown()
+        monthly = tracker.get_monthly_costs()
+
+        assert breakdown == {"openai": {"gpt-4o": 1.5}}
+        assert monthly["spent"] == pytest.approx(1.5)
+        assert tracker.ledger.pending_count() == 0
+
+    def test_monthly_spent_updated_in_batch(self, tracker):
+        """Test that monthly_budgets.spent is incremented by each flush."""
+        tracker.set_monthly_budget(100.0)
+        tracker.add_cost(2.0, "openai", "gpt-4o")
+        tracker.add_cost(3.0, "openai", "gpt-4o")
+
+        with tracker.ledger.connection() as conn:
+            budget, spent = conn.execute(
+                "SELECT budget, spent FROM monthly_budgets"
+            ).fetchone()
+
+        assert (budget, spent) == (100.0, 5.0)
+
+    def test_batch_size_triggers_flush(self, db_path):
+        """Test that reaching the batch size wakes the flush thread."""
+        CostTracker(db_path=db_path)
+        ledger = CostLedger(db_path, batch_size=3, flush_interval=60)
+        now = datetime.now().isoformat()
+        for _ in range(3):
+            ledger.record(now, "openai", "gpt-4o", 1.0)
+
+        for _ in range(100):
+            if ledger.pending_count() == 0:
+                break
+            time.sleep(0.01)
+
+        assert ledger.pending_count() == 0
+        assert count_rows(db_path) == (3, 3.0)
+        ledger.close()
+
+    def test_journal_replayed_after_crash(self, db_path):
+        """Test that acknowledged but unflushed costs survive a crash."""
+        CostTracker(db_path=db_path)
+        ledger = CostLedger(db_path, flush_interval=60)
+        now = datetime.now().isoformat()
+        ledger.record(now, "openai", "gpt-4o", 1.0)
+        ledger.record(now, "openai", "gpt-4o", 2.0)
+        ledger.flush()
+        ledger.record(now, "openai", "gpt-4o", 4.0)
+
+        # Simulate a crash: the journal is left behind by a dead process
+        crashed_journal = f"{db_path}.journal-999999999"
+        os.rename(ledger.journal_path, crashed_journal)
+        with open(crashed_journal, "a") as f:
+            f.write('{"entry_id": "torn')
+
+        recovered = CostLedger(db_path, flush_interval=60)
+
+        assert count_rows(db_path) == (3, 7.0)
+        assert not os.path.exists(crashed_journal)
+        assert recovered.monthly_total() == pytest.approx(7.0)
+        recovered.close()
+
+    def test_replay_is_idempotent(self, db_path):
+        """Test that replaying already-flushed entries does not double count."""
+        CostTracker(db_path=db_path)
+        ledger = CostLedger(db_path, flush_interval=60)
+        entry = ledger.record(datetime.now().isoformat(), "openai", "gpt-4o", 1.0)
+        ledger.flush()
+
+        with open(f"{db_path}.journal-999999999", "w") as f:
+            f.write(json.dumps(entry.__dict__) + "\n")
+        CostLedger(db_path, flush_interval=60).close()
+
+        with ledger.connection() as conn:
+            spent = conn.execute("SELECT spent FROM monthly_budgets").fetchone()[0]
+        assert count_rows(db_path) == (1, 1.0)
+        assert spent == 1.0
+        ledger.close()
+
+    def test_close_flushes_and_removes_journal(self, db_path):
+        """Test that closing a ledger flushes and cleans up its journal."""
+        CostTracker(db_path=db_path)
+        ledger = CostLedger(db_path, flush_interval=60)
+        ledger.record(datetime.now().isoformat(), "openai", "gpt-4o", 1.0)
+
+        ledger.close()
+
+        assert count_rows(db_path) == (1, 1.0)
+        assert not os.path.exists(ledger.journal_path)
+
+    def test_totals_shared_across_processes(self, db_path):
+        """Test that each ledger's totals include the other's spend, once."""
+        CostTracker(db_path=db_path)
+        first = CostLedger(db_path, flush_interval=60, totals_ttl=0)
+        second = CostLedger(db_path, flush_interval=60, totals_ttl=0)
+        now = datetime.now().isoformat()
+
+        first.record(now, "openai", "gpt-4o", 1.0)
+        assert second.daily_total() == pytest.approx(1.0)
+
+        first.flush()
+        second.record(now, "semrush", "domain-overview", 2.0)
+        assert second.monthly_total() == pytest.approx(3.0)
+        assert first.daily_total("semrush") == pytest.approx(2.0)
+        assert first.monthly_total() == pytest.approx(3.0)
+
+        first.close()
+        second.close()
+
+    def test_totals_reread_after_ttl(self, db_path):
+        """Test that other processes' spend shows up once the totals expire."""
+        CostTracker(db_path=db_path)
+        first = CostLedger(db_path, flush_interval=60)
+        second = CostLedger(db_path, flush_interval=60, totals_ttl=60)
+        now = datetime.now().isoformat()
+
+        first.record(now, "openai", "gpt-4o", 1.0)
+        assert second.daily_total() == 0.0
+
+        second.totals_ttl = 0
+        assert second.daily_total() == pytest.approx(1.0)
+
+        first.close()
+        second.close()
+
+    def test_recovery_tolerates_journal_removed_by_another_process(
+        self, db_path, monkeypatch
+    ):
+        """Test that a dead journal recovered concurrently elsewhere is skipped."""
+        CostTracker(db_path=db_path)
+        monkeypatch.setattr(
+            CostLedger,
+            "_journal_paths",
+            lambda self: [f"{db_path}.journal-999999999"],
+        )
+
+        ledger = CostLedger(db_path, flush_interval=60)
+
+        assert ledger.monthly_total() == 0.0
+        ledger.close()
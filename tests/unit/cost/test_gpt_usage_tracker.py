@@ -18,6 +18,7 @@ import pytest
 
 from leadfactory.cost.gpt_usage_tracker import (
     GPTUsageTracker,
+    RollingSpendWindow,
     get_gpt_usage_tracker,
     gpt_usage_tracker,
 )
@@ -235,6 +236,63 @@ class TestGPTUsageTracker:
         )  # 0.005 + 0.015 = 0.02
         assert abs(result["total_cost"] - expected_cost) < 0.0001
 
+    def test_spend_totals_match_usage_stats(self, tracker):
+        """Test that in-memory spend totals agree with the database."""
+        tracker.track_usage("gpt-4o", "chat_completion", 1000, 500)
+        # Later usage is added to the loaded window rather than re-read
+        tracker.get_spend_totals()
+        tracker.track_usage("gpt-4o", "chat_completion", 2000, 1000)
+        tracker.track_usage("gpt-3.5-turbo", "chat_completion", 1000, 1000)
+
+        totals = tracker.get_spend_totals("gpt-4o")
+        stats = tracker.get_usage_stats(model="gpt-4o")
+
+        assert totals["daily"] == pytest.approx(stats["summary"]["total_cost"])
+        assert totals["monthly"] == pytest.approx(0.0375)
+        assert tracker.get_spend_totals()["daily"] == pytest.approx(0.0410)
+
+    def test_spend_totals_rebuilt_after_invalidation(self, tracker, temp_db):
+        """Test that rows written elsewhere are picked up after invalidation."""
+        tracker.get_spend_totals()
+        other = GPTUsageTracker(db_path=temp_db)
+        other.track_usage("gpt-4o", "chat_completion", 1000, 0)
+
+        assert tracker.get_spend_totals()["daily"] == 0
+        tracker.invalidate_spend_cache()
+        assert tracker.get_spend_totals()["daily"] == pytest.approx(0.005)
+
+
+class TestRollingSpendWindow:
+    """Test cases for the rolling spend window."""
+
+    def test_buckets_expire_per_window(self):
+        """Test that spend leaves each window as it ages out."""
+        window = RollingSpendWindow()
+        now = 1_700_000_000.0
+        window.add(now - 3 * 86400, "gpt-4o", 3.0)
+        window.add(now - 2 * 3600, "gpt-4o", 2.0)
+        window.add(now - 60, "gpt-4o-mini", 1.0)
+
+        assert window.totals(now=now) == {
+            "daily": pytest.approx(3.0),
+            "weekly": pytest.approx(6.0),
+            "monthly": pytest.approx(6.0),
+        }
+        assert window.totals("gpt-4o", now=now)["daily"] == pytest.approx(2.0)
+
+        later = window.totals(now=now + 8 * 86400)
+        assert later == {"daily": 0.0, "weekly": 0.0, "monthly": pytest.approx(6.0)}
+        assert window.totals(now=now + 31 * 86400)["monthly"] == 0.0
+
+    def test_late_arrival_counted(self):
+        """Test that out-of-order spend is still counted."""
+        window = RollingSpendWindow()
+        now = 1_700_000_000.0
+        window.add(now, "gpt-4o", 1.0)
+        window.add(now - 600, "gpt-4o", 1.0)
+
+        assert window.totals(now=now)["daily"] == pytest.approx(2.0)
+
 
 class TestGPTUsageTrackerDecorator:
     """Test cases for the gpt_usage_tracker decorator."""
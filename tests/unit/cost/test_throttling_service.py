@@ -158,11 +158,11 @@ class TestThrottlingService(unittest.TestCase):
     def test_get_budget_status_success(self):
         """Test successful budget status retrieval."""
         # Mock usage tracker responses
-        self.mock_usage_tracker.get_usage_stats.side_effect = [
-            {"summary": {"total_cost": 50.0}},  # daily
-            {"summary": {"total_cost": 200.0}},  # weekly
-            {"summary": {"total_cost": 500.0}},  # monthly
-        ]
+        self.mock_usage_tracker.get_spend_totals.return_value = {
+            "daily": 50.0,
+            "weekly": 200.0,
+            "monthly": 500.0,
+        }
 
         # Mock budget config responses
         self.mock_budget_config.get_budget_limit.side_effect = [
@@ -183,7 +183,7 @@ class TestThrottlingService(unittest.TestCase):
     def test_get_budget_status_error_handling(self):
         """Test budget status error handling."""
         # Mock usage tracker to raise exception
-        self.mock_usage_tracker.get_usage_stats.side_effect = Exception(
+        self.mock_usage_tracker.get_spend_totals.side_effect = Exception(
             "Database error"
         )
 
@@ -294,11 +294,11 @@ class TestThrottlingService(unittest.TestCase):
     def test_should_throttle_allow(self):
         """Test throttling decision when request should be allowed."""
         # Mock budget status - low utilization
-        self.mock_usage_tracker.get_usage_stats.side_effect = [
-            {"summary": {"total_cost": 10.0}},  # daily
-            {"summary": {"total_cost": 50.0}},  # weekly
-            {"summary": {"total_cost": 100.0}},  # monthly
-        ]
+        self.mock_usage_tracker.get_spend_totals.return_value = {
+            "daily": 10.0,
+            "weekly": 50.0,
+            "monthly": 100.0,
+        }
 
         self.mock_budget_config.get_budget_limit.side_effect = [
             100.0,  # daily limit
@@ -318,11 +318,11 @@ class TestThrottlingService(unittest.TestCase):
     def test_should_throttle_reject_over_budget(self):
         """Test throttling decision when cost exceeds budget."""
         # Mock budget status - high utilization
-        self.mock_usage_tracker.get_usage_stats.side_effect = [
-            {"summary": {"total_cost": 95.0}},  # daily
-            {"summary": {"total_cost": 400.0}},  # weekly
-            {"summary": {"total_cost": 1800.0}},  # monthly
-        ]
+        self.mock_usage_tracker.get_spend_totals.return_value = {
+            "daily": 95.0,
+            "weekly": 400.0,
+            "monthly": 1800.0,
+        }
 
         self.mock_budget_config.get_budget_limit.side_effect = [
             100.0,  # daily limit
@@ -345,11 +345,11 @@ class TestThrottlingService(unittest.TestCase):
     def test_should_throttle_downgrade(self):
         """Test throttling decision with graceful degradation."""
         # Mock budget status - high utilization
-        self.mock_usage_tracker.get_usage_stats.side_effect = [
-            {"summary": {"total_cost": 95.0}},  # daily
-            {"summary": {"total_cost": 400.0}},  # weekly
-            {"summary": {"total_cost": 1800.0}},  # monthly
-        ]
+        self.mock_usage_tracker.get_spend_totals.return_value = {
+            "daily": 95.0,
+            "weekly": 400.0,
+            "monthly": 1800.0,
+        }
 
         self.mock_budget_config.get_budget_limit.side_effect = [
             100.0,  # daily limit
@@ -373,11 +373,11 @@ class TestThrottlingService(unittest.TestCase):
     def test_should_throttle_delay(self):
         """Test throttling decision with delay."""
         # Mock budget status - warning level utilization
-        self.mock_usage_tracker.get_usage_stats.side_effect = [
-            {"summary": {"total_cost": 85.0}},  # daily
-            {"summary": {"total_cost": 350.0}},  # weekly
-            {"summary": {"total_cost": 1500.0}},  # monthly
-        ]
+        self.mock_usage_tracker.get_spend_totals.return_value = {
+            "daily": 85.0,
+            "weekly": 350.0,
+            "monthly": 1500.0,
+        }
 
         self.mock_budget_config.get_budget_limit.side_effect = [
             100.0,  # daily limit
@@ -611,8 +611,10 @@ class TestConcurrency(unittest.TestCase):
     def test_concurrent_throttling_decisions(self):
         """Test concurrent throttling decisions."""
         # Mock dependencies
-        self.service.usage_tracker.get_usage_stats.return_value = {
-            "summary": {"total_cost": 50.0}
+        self.service.usage_tracker.get_spend_totals.return_value = {
+            "daily": 50.0,
+            "weekly": 50.0,
+            "monthly": 50.0,
         }
         self.service.budget_config.get_budget_limit.return_value = 100.0
         self.service.budget_config.get_alert_thresholds.return_value = [
@@ -0,0 +1,217 @@
+"""Tests for the asynchronous LLM client."""
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from leadfactory.llm.async_client import AsyncLLMClient, AsyncRateLimiter
+from leadfactory.llm.config import FallbackStrategy, LLMConfig, ProviderConfig
+from leadfactory.llm.exceptions import AllProvidersFailedError, LLMConnectionError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_config(latency=0.0, max_concurrency=None, **provider_overrides):
+    config = LLMConfig()
+    config.fallback_strategy = FallbackStrategy.QUALITY_OPTIMIZED
+    additional = {"latency": latency}
+    if max_concurrency is not None:
+        additional["max_concurrency"] = max_concurrency
+    config.providers = {
+        "stub": ProviderConfig(
+            name="stub",
+            default_model="stub",
+            priority=2,
+            additional_config=additional,
+            **provider_overrides,
+        ),
+    }
+    return config
+
+
+def prompt(text):
+    return [{"role": "user", "content": text}]
+
+
+class TestAsyncRateLimiter:
+    """Test the deque-based RPM/TPM limiter."""
+
+    @pytest.mark.asyncio
+    async def test_no_limits_never_waits(self):
+        limiter = AsyncRateLimiter()
+        for _ in range(100):
+            assert await limiter.acquire(1000) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_rpm_waits_for_oldest_request_to_expire(self):
+        clock = FakeClock()
+        limiter = AsyncRateLimiter(rpm=2, clock=clock)
+        await limiter.acquire()
+        clock.now += 10
+        await limiter.acquire()
+
+        async def fake_sleep(delay):
+            clock.now += delay
+
+        with patch("leadfactory.llm.async_client.asyncio.sleep", fake_sleep):
+            waited = await limiter.acquire()
+
+        assert waited == pytest.approx(50.0)
+        assert limiter.requests_in_window == 2
+
+    @pytest.mark.asyncio
+    async def test_tpm_tracks_running_total(self):
+        clock = FakeClock()
+        limiter = AsyncRateLimiter(tpm=1000, clock=clock)
+        await limiter.acquire(400)
+        clock.now += 20
+        await limiter.acquire(400)
+        assert limiter.tokens_in_window == 800
+
+        async def fake_sleep(delay):
+            clock.now += delay
+
+        # Needs the first 400 tokens to expire, not the whole window
+        with patch("leadfactory.llm.async_client.asyncio.sleep", fake_sleep):
+            waited = await limiter.acquire(500)
+
+        assert waited == pytest.approx(40.0)
+        assert limiter.tokens_in_window == 900
+
+    @pytest.mark.asyncio
+    async def test_window_expiry(self):
+        clock = FakeClock()
+        limiter = AsyncRateLimiter(rpm=1, tpm=100, clock=clock)
+        await limiter.acquire(100)
+        clock.now += 61
+        assert limiter.requests_in_window == 0
+        assert limiter.tokens_in_window == 0
+        assert await limiter.acquire(100) == 0.0
+
+
+class TestAsyncLLMClient:
+    """Test AsyncLLMClient fallback, fan-out and caching."""
+
+    @pytest.mark.asyncio
+    async def test_stub_completion(self):
+        client = AsyncLLMClient(make_config())
+        response = await client.chat_completion(prompt("hello"))
+
+        assert response["provider"] == "stub"
+        assert response["choices"][0]["message"]["content"] == "stub response: hello"
+        assert response["usage"]["total_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_many_preserves_order_and_errors(self):
+        client = AsyncLLMClient(make_config())
+        original = client._stub_request_async
+
+        async def flaky(messages, *args, **kwargs):
+            if messages[-1]["content"] == "bad":
+                raise ConnectionError("connection reset")
+            return await original(messages, *args, **kwargs)
+
+        with patch.object(client, "_stub_request_async", flaky):
+            results = await client.chat_completion_many(
+                [prompt("one"), prompt("bad"), {"messages": prompt("three")}]
+            )
+
+        assert results[0]["choices"][0]["message"]["content"].endswith("one")
+        assert isinstance(results[1], AllProvidersFailedError)
+        assert isinstance(results[1].provider_errors["stub"], LLMConnectionError)
+        assert results[2]["choices"][0]["message"]["content"].endswith("three")
+
+    @pytest.mark.asyncio
+    async def test_per_provider_concurrency_is_bounded(self):
+        client = AsyncLLMClient(make_config(max_concurrency=3))
+        active = 0
+        peak = 0
+
+        async def tracked(messages, model, temperature, max_tokens, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {
+                "provider": "stub",
+                "model": model,
+                "choices": [{"message": {"role": "assistant", "content": "ok"}}],
+                "usage": {"total_tokens": 1},
+            }
+
+        with patch.object(client, "_stub_request_async", tracked):
+            results = await client.chat_completion_many(
+                [prompt(str(i)) for i in range(20)]
+            )
+
+        assert len(results) == 20
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_next_provider(self):
+        config = make_config()
+        config.providers["backup"] = ProviderConfig(
+            name="backup", default_model="backup", priority=1
+        )
+        client = AsyncLLMClient(config)
+        client._provider_clients["backup"] = {"latency": 0.0}
+        client._rate_limiters["backup"] = AsyncRateLimiter()
+        client._cost_tracker["backup"] = dict(client._cost_tracker["stub"])
+
+        async def make_request(provider_name, messages, model, *args, **kwargs):
+            if provider_name == "stub":
+                raise LLMConnectionError("down", provider_name)
+            return {
+                "provider": provider_name,
+                "model": "backup",
+                "choices": [{"message": {"role": "assistant", "content": "ok"}}],
+                "usage": {"total_tokens": 5},
+            }
+
+        with patch.object(client, "_make_request_async", make_request):
+            response = await client.chat_completion(prompt("hello"))
+
+        assert response["provider"] == "backup"
+
+    @pytest.mark.asyncio
+    async def test_identical_inflight_prompts_share_one_call(self):
+        client = AsyncLLMClient(make_config(latency=0.01))
+        calls = 0
+        original = client._stub_request_async
+
+        async def counted(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return await original(*args, **kwargs)
+
+        with patch.object(client, "_stub_request_async", counted):
+            results = await client.chat_completion_many([prompt("same")] * 5)
+
+        assert calls == 1
+        assert all(result == results[0] for result in results)
+        assert client._cost_tracker["stub"]["cache_saved_tokens"] > 0
+
+    @pytest.mark.asyncio
+    async def test_use_cache_false_skips_coalescing(self):
+        client = AsyncLLMClient(make_config())
+        results = await client.chat_completion_many(
+            [prompt("same")] * 3, use_cache=False
+        )
+
+        assert len(results) == 3
+        assert len(client._request_cache) == 0
+
+    def test_reusable_across_event_loops(self):
+        client = AsyncLLMClient(make_config(max_concurrency=2))
+        first = asyncio.run(client.chat_completion_many([prompt("a"), prompt("b")]))
+        second = asyncio.run(client.chat_completion_many([prompt("c"), prompt("d")]))
+
+        assert [r["provider"] for r in first + second] == ["stub"] * 4
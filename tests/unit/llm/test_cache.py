@@ -0,0 +1,214 @@
+"""Tests for the tiered LLM response cache."""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from leadfactory.llm.cache import LLMResponseCache, cache_namespace
+from leadfactory.llm.client import LLMClient
+from leadfactory.llm.config import LLMConfig, ProviderConfig
+
+
+def make_response(content="Hello!", provider="openai", model="gpt-4", tokens=100):
+    return {
+        "provider": provider,
+        "model": model,
+        "choices": [
+            {
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": tokens - 10,
+            "completion_tokens": 10,
+            "total_tokens": tokens,
+        },
+    }
+
+
+class TestLLMResponseCache:
+    """Test the in-process and disk tiers."""
+
+    def test_memory_round_trip_returns_copy(self):
+        cache = LLMResponseCache()
+        cache.set("k", make_response(), namespace="openai:gpt-4")
+
+        first = cache.get("k")
+        first["choices"][0]["message"]["content"] = "mutated"
+
+        assert cache.get("k")["choices"][0]["message"]["content"] == "Hello!"
+        assert cache.stats.memory_hits == 2
+        assert cache.stats.bytes_read > 0
+
+    def test_miss_is_counted(self):
+        cache = LLMResponseCache()
+        assert cache.get("missing") is None
+        assert cache.stats.misses == 1
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = LLMResponseCache(max_entries=2)
+        cache.set("a", make_response("a"))
+        cache.set("b", make_response("b"))
+        cache.get("a")
+        cache.set("c", make_response("c"))
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.stats.evictions == 1
+
+    def test_byte_limit_evicts(self):
+        payload_size = len(json.dumps(make_response("a" * 100), sort_keys=True))
+        cache = LLMResponseCache(max_bytes=payload_size + 10)
+        cache.set("a", make_response("a" * 100))
+        cache.set("b", make_response("b" * 100))
+
+        assert len(cache) == 1
+        assert "b" in cache
+        assert cache.memory_bytes == payload_size
+
+    def test_ttl_expiry(self):
+        cache = LLMResponseCache(ttl_seconds=10)
+        with patch("leadfactory.llm.cache.time.time", return_value=1000.0):
+            cache.set("k", make_response())
+        with patch("leadfactory.llm.cache.time.time", return_value=1011.0):
+            assert cache.get("k") is None
+        assert len(cache) == 0
+
+    def test_disk_tier_shared_between_instances(self, tmp_path):
+        db_path = str(tmp_path / "llm_cache.db")
+        writer = LLMResponseCache(db_path=db_path)
+        writer.set("k", make_response(), namespace="openai:gpt-4")
+
+        reader = LLMResponseCache(db_path=db_path)
+        assert reader.get("k") == make_response()
+        assert reader.stats.disk_hits == 1
+
+        # Promoted into memory on the first disk hit
+        reader.get("k")
+        assert reader.stats.memory_hits == 1
+        writer.close()
+        reader.close()
+
+    def test_disk_tier_honours_ttl(self, tmp_path):
+        db_path = str(tmp_path / "llm_cache.db")
+        cache = LLMResponseCache(ttl_seconds=10, db_path=db_path)
+        with patch("leadfactory.llm.cache.time.time", return_value=1000.0):
+            cache.set("k", make_response())
+
+        other = LLMResponseCache(ttl_seconds=10, db_path=db_path)
+        with patch("leadfactory.llm.cache.time.time", return_value=1011.0):
+            assert other.get("k") is None
+
+    def test_clear_namespace(self, tmp_path):
+        cache = LLMResponseCache(db_path=str(tmp_path / "llm_cache.db"))
+        cache.set("a", make_response(), namespace="openai:gpt-4")
+        cache.set("b", make_response(provider="ollama"), namespace="ollama:llama3")
+
+        cache.clear("openai:gpt-4")
+
+        assert cache.get("a") is None
+        assert cache.get("b") is not None
+        assert cache.namespace_counts() == {"ollama:llama3": 1}
+
+    def test_unwritable_disk_degrades_to_memory(self, tmp_path):
+        blocker = tmp_path / "not_a_dir"
+        blocker.write_text("")
+        cache = LLMResponseCache(db_path=str(blocker / "llm_cache.db"))
+
+        assert not cache.disk_enabled
+        cache.set("k", make_response())
+        assert cache.get("k") is not None
+
+    def test_unserializable_response_is_not_cached(self):
+        cache = LLMResponseCache()
+        assert cache.set("k", {"value": object()}) is False
+        assert len(cache) == 0
+
+    def test_cache_namespace(self):
+        assert cache_namespace("openai", "gpt-4") == "openai:gpt-4"
+        assert cache_namespace("ollama", None) == "ollama:default"
+
+
+class TestLLMClientCaching:
+    """Test cache integration in LLMClient.chat_completion."""
+
+    def create_client(self, db_path=None):
+        config = LLMConfig()
+        config.cache_db_path = db_path
+        config.providers = {
+            "openai": ProviderConfig(
+                name="openai",
+                default_model="gpt-4",
+                cost_per_1k_tokens=0.03,
+            ),
+        }
+        client = LLMClient(config)
+        # Register a fake provider client so chat_completion will try it
+        client._provider_clients["openai"] = object()
+        client._cost_tracker["openai"] = {
+            "daily_cost": 0.0,
+            "monthly_cost": 0.0,
+            "cache_saved_tokens": 0,
+            "cache_saved_cost": 0.0,
+            "last_reset": time.time(),
+        }
+        client._rate_limiters["openai"] = type(
+            "NoLimit", (), {"wait_if_needed": lambda self, tokens=1: None}
+        )()
+        return client
+
+    def test_hit_records_savings_instead_of_cost(self):
+        client = self.create_client()
+        messages = [{"role": "user", "content": "Hello"}]
+
+        with patch.object(
+            client, "_make_request", return_value=make_response(tokens=1000)
+        ) as mock_request:
+            client.chat_completion(messages)
+            client.chat_completion(messages)
+
+        assert mock_request.call_count == 1
+        tracker = client._cost_tracker["openai"]
+        assert tracker["monthly_cost"] == pytest.approx(0.03)
+        assert tracker["cache_saved_tokens"] == 1000
+        assert tracker["cache_saved_cost"] == pytest.approx(0.03)
+
+        stats = client.get_cache_stats()
+        assert stats["memory_hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["saved_tokens"] == 1000
+
+    def test_use_cache_false_bypasses_cache(self):
+        client = self.create_client()
+        messages = [{"role": "user", "content": "Hello"}]
+
+        with patch.object(
+            client, "_make_request", return_value=make_response()
+        ) as mock_request:
+            client.chat_completion(messages, use_cache=False)
+            client.chat_completion(messages, use_cache=False)
+
+        assert mock_request.call_count == 2
+        assert len(client._request_cache) == 0
+        # use_cache is not forwarded to the provider
+        assert "use_cache" not in mock_request.call_args.kwargs
+
+    def test_disk_cache_survives_new_client(self, tmp_path):
+        db_path = str(tmp_path / "llm_cache.db")
+        messages = [{"role": "user", "content": "Hello"}]
+
+        first = self.create_client(db_path)
+        with patch.object(first, "_make_request", return_value=make_response()):
+            first.chat_completion(messages)
+
+        second = self.create_client(db_path)
+        with patch.object(second, "_make_request") as mock_request:
+            response = second.chat_completion(messages)
+
+        mock_request.assert_not_called()
+        assert response["choices"][0]["message"]["content"] == "Hello!"
+        assert second._request_cache.namespace_counts() == {"openai:gpt-4": 1}
@@ -261,6 +261,39 @@ class TestEngagementAnalytics(unittest.TestCase):
         self.assertEqual(summary["conversions"], 1)
         self.assertEqual(summary["conversion_rate"], 0.5)
 
+    def test_get_user_engagement_summaries(self):
+        """Test getting engagement summaries for many users from aggregates."""
+        self.analytics.storage.get_user_engagement_aggregates.return_value = {
+            "user123": {
+                "event_types": {"page_view": 1, "email_open": 1, "purchase": 1},
+                "last_activity": "2023-01-01T12:10:00",
+                "total_sessions": 2,
+                "total_page_views": 7,
+                "total_time_on_site": 900,
+                "conversions": 1,
+            }
+        }
+
+        summaries = self.analytics.get_user_engagement_summaries(
+            ["user123", "user456"], days=30
+        )
+
+        summary = summaries["user123"]
+        self.assertEqual(summary["user_id"], "user123")
+        self.assertEqual(summary["total_events"], 3)
+        self.assertEqual(summary["total_sessions"], 2)
+        self.assertEqual(summary["total_page_views"], 7)
+        self.assertEqual(summary["avg_session_duration"], 450.0)
+        self.assertEqual(summary["conversions"], 1)
+        self.assertEqual(summary["conversion_rate"], 0.5)
+        self.assertEqual(summary["last_activity"], "2023-01-01T12:10:00")
+
+        # Users without activity get an empty summary, not a missing one
+        self.assertEqual(summaries["user456"]["total_sessions"], 0)
+        self.assertEqual(summaries["user456"]["avg_session_duration"], 0)
+        self.assertEqual(summaries["user456"]["conversion_rate"], 0)
+        self.analytics.storage.get_user_events.assert_not_called()
+
     def test_get_campaign_analytics(self):
         """Test getting campaign analytics."""
         # Mock campaign data
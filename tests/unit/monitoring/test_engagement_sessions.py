@@ -0,0 +1,357 @@
+"""Unit tests for the in-memory engagement session engine."""
+
+import json
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+from leadfactory.monitoring import engagement_analytics, engagement_sessions
+from leadfactory.monitoring.engagement_analytics import (
+    ConversionFunnel,
+    ConversionGoal,
+    EngagementAnalytics,
+    EngagementEvent,
+    EventType,
+)
+from leadfactory.monitoring.engagement_sessions import (
+    EngagementSessionEngine,
+    FunnelMatcher,
+)
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+FUNNEL_ROW = {
+    "funnel_id": "funnel1",
+    "name": "Signup",
+    "steps": json.dumps(
+        [
+            {"event_type": "page_view", "page_pattern": r"https://example\.com/"},
+            {"event_type": "form_submit", "properties": {"form": "signup"}},
+            {"event_type": "signup"},
+        ]
+    ),
+    "goal_type": "signup",
+    "time_window_hours": 24,
+    "is_active": True,
+    "created_at": START,
+}
+
+
+def make_event(index, event_type=EventType.PAGE_VIEW, session_id="s1", **kwargs):
+    kwargs.setdefault("page_url", f"https://example.com/{index % 2}")
+    return EngagementEvent(
+        event_id=f"e{index}",
+        user_id="u1",
+        session_id=session_id,
+        event_type=event_type,
+        timestamp=START + timedelta(seconds=index),
+        properties=kwargs.pop("properties", {}),
+        **kwargs,
+    )
+
+
+def make_storage():
+    storage = Mock()
+    storage.get_user_session.return_value = None
+    storage.get_session_unique_pages.return_value = []
+    storage.get_active_conversion_funnels.return_value = []
+    storage.store_engagement_batch.return_value = True
+    return storage
+
+
+class TestEngagementSessionEngine(unittest.TestCase):
+    """Test session tracking, funnel matching and micro-batch flushes."""
+
+    def setUp(self):
+        self.storage = make_storage()
+        self.engine = EngagementSessionEngine(self.storage, flush_interval=60)
+
+    def tearDown(self):
+        self.engine.close()
+
+    def batch(self, call=-1):
+        return self.storage.store_engagement_batch.call_args_list[call][0]
+
+    def test_session_kept_in_memory(self):
+        """Test that one flush writes every event and one row per session."""
+        for i in range(3):
+            self.assertTrue(self.engine.track(make_event(i)))
+
+        self.assertTrue(self.engine.flush(timeout=5))
+
+        events, sessions, progress, conversions = self.batch()
+        self.assertEqual([e["event_id"] for e in events], ["e0", "e1", "e2"])
+        self.assertEqual(len(sessions), 1)
+        self.assertEqual(sessions[0]["total_events"], 3)
+        self.assertEqual(sessions[0]["page_views"], 3)
+        self.assertEqual(sessions[0]["unique_pages"], 2)
+        self.assertEqual(sessions[0]["time_on_site"], 2.0)
+        self.assertEqual(self.storage.get_user_session.call_count, 1)
+        self.storage.get_session_unique_pages.assert_not_called()
+        self.storage.store_engagement_event.assert_not_called()
+
+    def test_stored_session_loaded_once(self):
+        """Test resuming a session that is only in storage."""
+        self.storage.get_user_session.return_value = {
+            "session_id": "s1",
+            "user_id": "u1",
+            "start_time": START - timedelta(seconds=10),
+            "end_time": START,
+            "total_events": 4,
+            "page_views": 1,
+            "unique_pages": 1,
+            "bounce_rate": 1.0,
+            "time_on_site": 10.0,
+            "conversion_events": '["old"]',
+            "traffic_source": None,
+            "campaign_id": None,
+            "device_type": "desktop",
+            "updated_at": START,
+        }
+        self.storage.get_session_unique_pages.return_value = ["https://example.com/0"]
+
+        for i in range(4):
+            self.engine.track(make_event(i))
+        self.engine.track(make_event(4, EventType.PURCHASE))
+        self.engine.flush(timeout=5)
+
+        session = self.batch()[1][0]
+        self.assertEqual(session["total_events"], 9)
+        self.assertEqual(session["page_views"], 5)
+        self.assertEqual(session["unique_pages"], 2)
+        self.assertEqual(session["bounce_rate"], 0.0)
+        self.assertEqual(session["conversion_events"], ["old", "e4"])
+        self.assertEqual(self.storage.get_user_session.call_count, 1)
+        self.assertEqual(self.storage.get_session_unique_pages.call_count, 1)
+
+    def test_only_changed_sessions_are_written(self):
+        self.engine.track(make_event(0, session_id="a"))
+        self.engine.track(make_event(1, session_id="b"))
+        self.engine.flush(timeout=5)
+        self.engine.track(make_event(2, session_id="b"))
+        self.engine.flush(timeout=5)
+
+        self.assertEqual([s["session_id"] for s in self.batch()[1]], ["b"])
+
+    def test_funnels_compiled_once(self):
+        """Test funnel progress and conversions without per-event lookups."""
+        self.storage.get_active_conversion_funnels.return_value = [FUNNEL_ROW]
+
+        self.engine.track(make_event(0))
+        self.engine.track(make_event(1))
+        self.engine.track(
+            make_event(2, EventType.FORM_SUBMIT, properties={"form": "signup"})
+        )
+        self.engine.track(make_event(3, EventType.SIGNUP))
+        self.engine.flush(timeout=5)
+
+        _, _, progress, conversions = self.batch()
+        # Repeated hits on a step collapse into its latest timestamp
+        self.assertEqual(
+            [(p["step_index"], p["timestamp"]) for p in progress],
+            [
+                (0, START + timedelta(seconds=1)),
+                (1, START + timedelta(seconds=2)),
+                (2, START + timedelta(seconds=3)),
+            ],
+        )
+        self.assertEqual(len(conversions), 1)
+        self.assertEqual(conversions[0]["event_id"], "e3")
+        self.assertEqual(conversions[0]["goal_type"], "signup")
+        self.assertEqual(self.storage.get_active_conversion_funnels.call_count, 1)
+
+    def test_invalidate_funnels(self):
+        self.engine.track(make_event(0))
+        self.storage.get_active_conversion_funnels.return_value = [FUNNEL_ROW]
+        self.engine.track(make_event(1))
+        self.engine.invalidate_funnels()
+        self.engine.track(make_event(2))
+        self.engine.flush(timeout=5)
+
+        self.assertEqual(self.storage.get_active_conversion_funnels.call_count, 2)
+        self.assertEqual(len(self.batch()[2]), 1)
+
+    def test_flush_triggered_by_batch_size(self):
+        engine = EngagementSessionEngine(self.storage, flush_interval=60, flush_batch=5)
+        try:
+            for i in range(5):
+                engine.track(make_event(i))
+
+            deadline = time.monotonic() + 5
+            while engine.stats["flushes"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            self.assertEqual(engine.stats["flushed_events"], 5)
+        finally:
+            engine.close()
+
+    def test_failed_flush_is_retried(self):
+        self.storage.store_engagement_batch.side_effect = [False, True]
+        self.engine.track(make_event(0))
+        self.assertFalse(self.engine.flush(timeout=5))
+        self.engine.track(make_event(1))
+        self.assertTrue(self.engine.flush(timeout=5))
+
+        events, sessions, _, _ = self.batch(1)
+        self.assertEqual([e["event_id"] for e in events], ["e0", "e1"])
+        self.assertEqual(sessions[0]["total_events"], 2)
+
+    def test_full_buffer_rejects_events(self):
+        engine = EngagementSessionEngine(
+            self.storage, flush_interval=60, max_buffered_events=2, flush_batch=10
+        )
+        try:
+            self.assertTrue(engine.track(make_event(0)))
+            self.assertTrue(engine.track(make_event(1)))
+            self.assertFalse(engine.track(make_event(2)))
+            self.assertEqual(engine.stats["rejected"], 1)
+        finally:
+            engine.close()
+
+    def test_idle_sessions_evicted_after_flush(self):
+        engine = EngagementSessionEngine(
+            self.storage, flush_interval=60, session_idle_seconds=0
+        )
+        try:
+            engine.track(make_event(0))
+            engine.flush(timeout=5)
+            engine.track(make_event(1))
+        finally:
+            engine.close()
+
+        self.assertEqual(self.storage.get_user_session.call_count, 2)
+
+    def test_close_flushes(self):
+        self.engine.track(make_event(0))
+        self.engine.close()
+
+        self.assertEqual(len(self.batch()[0]), 1)
+        self.assertFalse(self.engine.track(make_event(1)))
+
+    def test_fallback_without_batch_writes(self):
+        storage = make_storage()
+        del storage.store_engagement_batch
+        storage.store_engagement_event.return_value = True
+        storage.update_user_session.return_value = True
+        engine = EngagementSessionEngine(storage, flush_interval=60)
+        try:
+            engine.track(make_event(0))
+            engine.track(make_event(1))
+            self.assertTrue(engine.flush(timeout=5))
+        finally:
+            engine.close()
+
+        self.assertEqual(storage.store_engagement_event.call_count, 2)
+        self.assertEqual(storage.update_user_session.call_count, 1)
+
+
+class TestFunnelMatcher(unittest.TestCase):
+    """Test that compiled matching agrees with _event_matches_step."""
+
+    def test_matches_like_event_matches_step(self):
+        steps = [
+            {
+                "event_type": "page_view",
+                "page_pattern": r"https://example\.com/pricing",
+            },
+            {"properties": {"plan": "pro"}},
+            {"event_type": "purchase", "properties": {"plan": "pro"}},
+            {"event_type": "page_view", "page_pattern": "("},
+        ]
+        funnels = [
+            ConversionFunnel(f"f{i}", f"Funnel {i}", [step], ConversionGoal.PURCHASE)
+            for i, step in enumerate(steps)
+        ]
+        matcher = FunnelMatcher(funnels)
+        analytics = EngagementAnalytics.__new__(EngagementAnalytics)
+
+        events = [
+            make_event(0, page_url="https://example.com/pricing"),
+            make_event(1, page_url="https://example.com/about"),
+            make_event(2, page_url=None),
+            make_event(3, EventType.PURCHASE, properties={"plan": "pro"}),
+            make_event(4, EventType.PURCHASE, properties={"plan": "basic"}),
+            make_event(5, EventType.SIGNUP, properties={"plan": "pro"}),
+        ]
+        for event in events:
+            expected = {
+                funnel.funnel_id
+                for funnel in funnels
+                if analytics._event_matches_step(event, funnel.steps[0])
+            }
+            matched = {funnel.funnel_id for funnel, _ in matcher.match(event)}
+            self.assertEqual(matched, expected, event.event_id)
+
+    def test_first_matching_step_wins(self):
+        funnel = ConversionFunnel(
+            "f",
+            "Funnel",
+            [{"event_type": "page_view"}, {"event_type": "page_view"}],
+            ConversionGoal.ENGAGEMENT,
+        )
+
+        self.assertEqual(
+            [index for _, index in FunnelMatcher([funnel]).match(make_event(0))], [0]
+        )
+
+
+class TestEngagementAnalyticsWithEngine(unittest.TestCase):
+    """Test that EngagementAnalytics hands events to the session engine."""
+
+    def test_track_event_uses_engine(self):
+        engine = Mock()
+        engine.track.return_value = True
+        analytics = EngagementAnalytics(session_engine=engine)
+        analytics.storage = Mock()
+
+        result = analytics.track_event(
+            user_id="u1",
+            session_id="s1",
+            event_type="page_view",
+            properties={},
+            page_url="https://example.com/",
+        )
+
+        self.assertTrue(result)
+        event = engine.track.call_args[0][0]
+        self.assertEqual(event.event_type, EventType.PAGE_VIEW)
+        analytics.storage.store_engagement_event.assert_not_called()
+        analytics.storage.get_user_session.assert_not_called()
+
+    def test_new_funnel_invalidates_engine(self):
+        engine = Mock()
+        analytics = EngagementAnalytics(session_engine=engine)
+        analytics.storage = Mock()
+        analytics.storage.create_conversion_funnel.return_value = True
+
+        analytics.create_conversion_funnel("Signup", [], "signup")
+
+        engine.invalidate_funnels.assert_called_once()
+
+    def test_instances_share_one_engine_closed_at_exit(self):
+        storage = make_storage()
+        with (
+            patch.object(engagement_analytics, "ENGAGEMENT_SESSION_ENGINE", True),
+            patch.object(engagement_sessions, "_shared_engine", None),
+            patch.object(
+                engagement_analytics, "get_storage_instance", return_value=storage
+            ),
+            patch.object(engagement_sessions.atexit, "register") as register,
+        ):
+            first = EngagementAnalytics()
+            second = EngagementAnalytics()
+
+        engine = first.session_engine
+        try:
+            self.assertIsInstance(engine, EngagementSessionEngine)
+            self.assertIs(second.session_engine, engine)
+            register.assert_called_once_with(
+                engine.close, engagement_sessions.ENGAGEMENT_CLOSE_TIMEOUT
+            )
+        finally:
+            engine.close(timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,266 @@
+"""
+Unit tests for the content-addressed screenshot and mockup cache.
+"""
+
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+from PIL import Image
+
+from leadfactory.pipeline import asset_cache as asset_cache_module
+from leadfactory.pipeline.asset_cache import (
+    AssetCache,
+    file_sha256,
+    normalize_url,
+    probe_site_fingerprint,
+)
+
+
+class FakeAssetStorage:
+    """Keeps asset_cache rows in a dict."""
+
+    def __init__(self, html_hashes=None):
+        self.entries = {}
+        self.html_hashes = html_hashes or {}
+        self.hits = 0
+
+    def get_latest_html_fingerprint(self, business_id):
+        return self.html_hashes.get(business_id)
+
+    def get_asset_cache_entry(self, asset_type, cache_key):
+        return self.entries.get((asset_type, cache_key))
+
+    def save_asset_cache_entry(
+        self, asset_type, cache_key, content_hash, file_path, size_bytes, seconds
+    ):
+        self.entries[(asset_type, cache_key)] = {
+            "content_hash": content_hash,
+            "file_path": file_path,
+            "size_bytes": size_bytes,
+            "render_seconds": seconds,
+        }
+        return True
+
+    def record_asset_cache_hit(self, asset_type, cache_key):
+        self.hits += 1
+        return True
+
+
+def write_png(path, color="red"):
+    Image.new("RGB", (64, 48), color=color).save(path, "PNG")
+    return str(path)
+
+
+@pytest.fixture
+def storage():
+    return FakeAssetStorage(html_hashes={1: "abc123"})
+
+
+@pytest.fixture
+def cache(storage, tmp_path):
+    return AssetCache(storage=storage, cache_dir=tmp_path / "assets")
+
+
+class TestNormalizeUrl:
+    """Test cases for URL normalization."""
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://www.Example.com/",
+            "example.com",
+            "HTTPS://example.com:443",
+            "https://example.com/#contact",
+        ],
+    )
+    def test_equivalent_urls(self, url):
+        assert normalize_url(url) == "https://example.com"
+
+    def test_path_and_query_are_kept(self):
+        assert (
+            normalize_url("http://www.example.com:8080/menu/?lang=en")
+            == "http://example.com:8080/menu?lang=en"
+        )
+
+
+class TestSiteFingerprint:
+    """Test cases for site fingerprints."""
+
+    def test_prefers_stored_html_hash(self, cache):
+        with patch.object(asset_cache_module, "probe_site_fingerprint") as probe:
+            fingerprint = cache.site_fingerprint(
+                {"id": 1, "website": "https://example.com"}
+            )
+
+        assert fingerprint == "html:abc123"
+        probe.assert_not_called()
+
+    def test_falls_back_to_probe(self, cache):
+        with patch.object(
+            asset_cache_module, "probe_site_fingerprint", return_value='etag:"v1"'
+        ) as probe:
+            fingerprint = cache.site_fingerprint(
+                {"id": 2, "website": "https://example.com"}
+            )
+
+        assert fingerprint == 'etag:"v1"'
+        probe.assert_called_once_with("https://example.com")
+
+    def test_probe_uses_validators(self):
+        response = MagicMock(status_code=200, headers={"ETag": '"v2"'})
+        with patch.object(asset_cache_module.requests, "head", return_value=response):
+            assert probe_site_fingerprint("example.com") == 'etag:"v2"'
+
+        response.headers = {"ETag": 'W/"weak"', "Last-Modified": "Mon, 01 Jan 2024"}
+        with patch.object(asset_cache_module.requests, "head", return_value=response):
+            assert (
+                probe_site_fingerprint("example.com")
+                == "last-modified:Mon, 01 Jan 2024"
+            )
+
+        response.headers = {}
+        with patch.object(asset_cache_module.requests, "head", return_value=response):
+            assert probe_site_fingerprint("example.com") is None
+
+
+class TestAssetCache:
+    """Test cases for AssetCache."""
+
+    def test_store_then_lookup(self, cache, storage, tmp_path):
+        """A stored image is returned for the same key with its savings."""
+        key = cache.screenshot_key("https://example.com", "html:abc123")
+        source = write_png(tmp_path / "shot.png")
+        content_hash = file_sha256(source)
+
+        assert cache.lookup("screenshot", key) is None
+        stored = cache.store("screenshot", source, render_seconds=4.0, cache_key=key)
+
+        assert stored.content_hash == content_hash
+        assert stored.file_path.endswith(f"{content_hash}.png")
+        assert not (tmp_path / "shot.png").exists()
+
+        cached = cache.lookup(
+            "screenshot", cache.screenshot_key("www.example.com/", "html:abc123")
+        )
+        assert cached.content_hash == content_hash
+        assert cached.file_path == stored.file_path
+        assert storage.hits == 1
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["seconds_saved"] == 4.0
+        assert stats["bytes_saved"] == stored.size_bytes
+
+    def test_changed_fingerprint_misses(self, cache, tmp_path):
+        """A new fingerprint for the same URL is a miss."""
+        key = cache.screenshot_key("https://example.com", 'etag:"v1"')
+        cache.store("screenshot", write_png(tmp_path / "a.png"), cache_key=key)
+
+        new_key = cache.screenshot_key("https://example.com", 'etag:"v2"')
+        assert cache.lookup("screenshot", new_key) is None
+
+    def test_identical_images_are_stored_once(self, cache, tmp_path):
+        """Two businesses with the same rendered image share one file."""
+        first = cache.store("screenshot", write_png(tmp_path / "a.png", "blue"))
+        second = cache.store("screenshot", write_png(tmp_path / "b.png", "blue"))
+        third = cache.store("screenshot", write_png(tmp_path / "c.png", "green"))
+
+        assert first.file_path == second.file_path
+        assert third.file_path != first.file_path
+        assert not (tmp_path / "b.png").exists()
+        assert cache.stats()["deduplicated"] == 1
+        assert len(list((tmp_path / "assets").rglob("*.png"))) == 2
+
+    def test_missing_file_is_a_miss(self, cache, tmp_path):
+        """An entry whose image file was deleted is not returned."""
+        key = cache.mockup_key("deadbeef")
+        stored = cache.store("mockup", write_png(tmp_path / "m.png"), cache_key=key)
+        os.remove(stored.file_path)
+
+        assert cache.lookup("mockup", key) is None
+
+    def test_disabled_without_cache_storage(self, tmp_path):
+        """Storage without asset_cache methods disables lookups."""
+        cache = AssetCache(storage=object(), cache_dir=tmp_path / "assets")
+        stored = cache.store(
+            "screenshot", write_png(tmp_path / "a.png"), cache_key="key"
+        )
+
+        assert stored.content_hash
+        assert cache.lookup("screenshot", "key") is None
+        assert cache.stats()["lookups"] == 0
+
+
+class TestScreenshotAndMockupCaching:
+    """The pipeline stages short-circuit on cache hits."""
+
+    @pytest.fixture
+    def env(self, cache, tmp_path, monkeypatch):
+        from leadfactory.pipeline import mockup, screenshot
+
+        monkeypatch.delenv("SCREENSHOT_ONE_KEY", raising=False)
+        monkeypatch.setenv("SCREENSHOT_DIR", str(tmp_path / "shots"))
+        monkeypatch.setattr(screenshot, "_screenshot_dir_path", None)
+        monkeypatch.setattr(screenshot, "get_asset_cache", lambda: cache)
+        monkeypatch.setattr(mockup, "get_asset_cache", lambda: cache)
+        return screenshot, mockup
+
+    def test_unchanged_site_is_not_captured_again(self, env, cache):
+        screenshot, _ = env
+        business = {"id": 1, "name": "Cafe", "website": "https://example.com"}
+
+        def capture(url, output_path, **kwargs):
+            write_png(output_path)
+            return True
+
+        with (
+            patch(
+                "leadfactory.pipeline.screenshot_local.is_playwright_available",
+                return_value=True,
+            ),
+            patch(
+                "leadfactory.pipeline.screenshot_pool.capture_screenshot_pooled",
+                side_effect=capture,
+            ) as capture_mock,
+            patch.object(
+                screenshot, "create_screenshot_asset", return_value=True
+            ) as create_asset,
+        ):
+            assert screenshot.generate_business_screenshot(business)
+            assert screenshot.generate_business_screenshot(business)
+
+        assert capture_mock.call_count == 1
+        first, second = create_asset.call_args_list
+        assert first[0][1] == second[0][1]
+        assert first[1]["content_hash"] == second[1]["content_hash"]
+        assert cache.stats()["hits"] == 1
+
+    def test_mockup_reused_for_identical_screenshot(self, env, cache, tmp_path):
+        _, mockup = env
+        screenshot_path = write_png(tmp_path / "shot.png")
+        validation = {
+            "valid": True,
+            "missing_dependencies": [],
+            "business_data": {"id": 7},
+            "screenshot_path": screenshot_path,
+            "screenshot_hash": file_sha256(screenshot_path),
+        }
+
+        with (
+            patch.object(
+                mockup, "validate_mockup_dependencies", return_value=validation
+            ),
+            patch.object(mockup, "create_mockup_asset", return_value=True) as create,
+        ):
+            first = mockup.generate_business_mockup(7)
+            second = mockup.generate_business_mockup(8)
+
+        assert first["status"] == "generated"
+        assert "cached" not in first
+        assert second["status"] == "generated"
+        assert second["cached"] is True
+        assert create.call_args_list[0][0][1] == create.call_args_list[1][0][1]
+        assert second["content_hash"] == create.call_args_list[0][1]["content_hash"]
@@ -0,0 +1,345 @@
+"""
+Unit tests for blocking-key candidate generation in deduplication.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from leadfactory.pipeline.dedupe_blocking import (
+    BLOCK_KEY_VERSION,
+    BlockIndex,
+    build_block_index,
+    ensure_block_index,
+    generate_blocking_keys,
+    name_tokens,
+    normalize_phone_key,
+    rebuild_block_index,
+    registered_domain,
+    soundex,
+)
+from leadfactory.utils.e2e_db_connector import get_potential_duplicate_pairs
+
+
+class TestKeyNormalization:
+    """Test the normalization helpers behind blocking keys."""
+
+    @pytest.mark.parametrize(
+        "phone,expected",
+        [
+            ("(555) 123-4567", "5551234567"),
+            ("+1 555 123 4567", "5551234567"),
+            ("555-1234", "5551234"),
+            ("12-34", None),
+            (None, None),
+        ],
+    )
+    def test_normalize_phone_key(self, phone, expected):
+        assert normalize_phone_key(phone) == expected
+
+    @pytest.mark.parametrize(
+        "website,expected",
+        [
+            ("https://www.Example.com/about", "example.com"),
+            ("http://shop.example.com:8080", "example.com"),
+            ("example.co.uk", "example.co.uk"),
+            ("https://www.joes.com.au/menu?x=1", "joes.com.au"),
+            ("localhost", None),
+            ("", None),
+        ],
+    )
+    def test_registered_domain(self, website, expected):
+        assert registered_domain(website) == expected
+
+    def test_name_tokens_drop_stopwords(self):
+        assert name_tokens("The Joe's Plumbing Co, LLC") == ["joes", "plumbing"]
+
+    @pytest.mark.parametrize(
+        "word,expected",
+        [("robert", "R163"), ("rupert", "R163"), ("ashcraft", "A261"), ("lee", "L000")],
+    )
+    def test_soundex(self, word, expected):
+        assert soundex(word) == expected
+
+
+class TestGenerateBlockingKeys:
+    """Test blocking key generation for business records."""
+
+    def test_all_key_types(self):
+        keys = generate_blocking_keys(
+            {
+                "name": "Joe's Pizza",
+                "phone": "555-123-4567",
+                "email": "Owner@JoesPizza.com",
+                "website": "https://www.joespizza.com",
+                "zip": "10001-1234",
+            }
+        )
+
+        assert keys == {
+            "phone:5551234567",
+            "domain:joespizza.com",
+            "email:owner@joespizza.com",
+            "fullname:joes pizza",
+            "name:z10001:joes",
+            "phonetic:z10001:J200P200",
+        }
+
+    def test_name_keys_scoped_by_zip_and_city(self):
+        keys = generate_blocking_keys(
+            {"name": "Joe's Pizza", "city": "Austin", "state": "TX", "zip": "78701"}
+        )
+
+        assert {"name:z78701:joes", "name:caustin|tx:joes"} <= keys
+        assert {"phonetic:z78701:J200P200", "phonetic:caustin|tx:J200P200"} <= keys
+
+    def test_same_business_in_neighbouring_zip_shares_a_key(self):
+        first = {"name": "Joe's Pizza", "city": "Austin", "state": "TX", "zip": "78701"}
+        moved = dict(first, name="Jose Pizza", zip="78702")
+
+        assert generate_blocking_keys(first) & generate_blocking_keys(moved)
+
+    @pytest.mark.parametrize(
+        "misspelled", ["Smtih Auto Repair", "Smith Atuo Repair", "Smith Auto Repiar"]
+    )
+    def test_misspelling_any_name_token_keeps_a_scoped_key(self, misspelled):
+        business = {"name": "Smith Auto Repair", "city": "Austin", "state": "TX"}
+        moved = dict(business, name=misspelled)
+
+        shared = generate_blocking_keys(business) & generate_blocking_keys(moved)
+
+        assert any(key.startswith(("name:", "phonetic:")) for key in shared)
+
+    def test_empty_business_has_no_keys(self):
+        assert generate_blocking_keys({}) == set()
+
+
+class TestBlockIndex:
+    """Test the in-memory block index."""
+
+    def test_candidate_pairs_only_within_blocks(self):
+        index = build_block_index(
+            [
+                {"id": 1, "name": "Joe's Pizza", "phone": "555-1234", "zip": "10001"},
+                {"id": 2, "name": "Joes Pizzeria", "phone": "555-1234", "zip": "10002"},
+                {"id": 3, "name": "Amy's Cafe", "phone": "555-9999", "zip": "10001"},
+                {"id": 4, "name": "Amys Cafe", "zip": "10001"},
+            ]
+        )
+
+        assert list(index.candidate_pairs()) == [(1, 2), (3, 4)]
+
+    def test_pairs_yielded_once_when_sharing_several_keys(self):
+        index = BlockIndex()
+        index.add(1, {"phone:1", "domain:a.com"})
+        index.add(2, {"phone:1", "domain:a.com"})
+
+        assert list(index.candidate_pairs()) == [(1, 2)]
+
+    def test_oversized_blocks_skipped(self):
+        index = BlockIndex(max_block_size=2)
+        for business_id in range(3):
+            index.add(business_id, {"phone:shared"})
+
+        assert list(index.candidate_pairs()) == []
+
+    def test_remove(self):
+        index = BlockIndex()
+        index.add(1, {"phone:1"})
+        index.add(2, {"phone:1"})
+
+        index.remove(2)
+
+        assert list(index.candidate_pairs()) == []
+        assert index.block_sizes() == {"phone:1": 1}
+
+
+class TestRebuildBlockIndex:
+    """Test backfilling the persisted block index."""
+
+    @patch("leadfactory.pipeline.dedupe_blocking.upsert_block_keys")
+    @patch("leadfactory.pipeline.dedupe_blocking.get_businesses_for_blocking")
+    def test_rebuild_pages_by_id(self, mock_get_businesses, mock_upsert):
+        mock_get_businesses.side_effect = [
+            [{"id": 1, "phone": "555-1234"}, {"id": 5, "phone": "555-1234"}],
+            [],
+        ]
+        mock_upsert.return_value = True
+
+        indexed = rebuild_block_index(batch_size=2)
+
+        assert indexed == 2
+        assert mock_get_businesses.call_args_list[1][0] == (5, 2)
+        mock_upsert.assert_called_once_with(
+            [("phone:5551234", 1), ("phone:5551234", 5)]
+        )
+
+
+@patch("leadfactory.pipeline.dedupe_blocking.replace_block_keys", return_value=True)
+@patch("leadfactory.pipeline.dedupe_blocking.get_block_key_updates", return_value=[])
+@patch("leadfactory.pipeline.dedupe_blocking.mark_block_index_complete")
+@patch("leadfactory.pipeline.dedupe_blocking.upsert_block_keys", return_value=True)
+@patch("leadfactory.pipeline.dedupe_blocking.get_businesses_for_blocking")
+@patch("leadfactory.pipeline.dedupe_blocking.clear_block_index", return_value=True)
+@patch("leadfactory.pipeline.dedupe_blocking.get_block_index_state")
+@patch("leadfactory.pipeline.dedupe_blocking.get_max_business_id", return_value=9)
+class TestEnsureBlockIndex:
+    """Test that blocking is only enabled once the index covers every business."""
+
+    def test_up_to_date_index_is_used_as_is(
+        self,
+        _max_id,
+        mock_state,
+        mock_clear,
+        mock_get,
+        mock_upsert,
+        mock_mark,
+        mock_updates,
+        mock_replace,
+    ):
+        mock_state.return_value = {
+            "key_version": BLOCK_KEY_VERSION,
+            "indexed_through_id": 9,
+        }
+
+        assert ensure_block_index() is True
+        mock_get.assert_not_called()
+        mock_mark.assert_not_called()
+
+    def test_indexes_businesses_past_watermark(
+        self,
+        _max_id,
+        mock_state,
+        mock_clear,
+        mock_get,
+        mock_upsert,
+        mock_mark,
+        mock_updates,
+        mock_replace,
+    ):
+        mock_state.return_value = {
+            "key_version": BLOCK_KEY_VERSION,
+            "indexed_through_id": 4,
+        }
+        mock_get.side_effect = [[{"id": 7, "phone": "555-1234"}], []]
+        mock_mark.return_value = True
+
+        assert ensure_block_index() is True
+        assert mock_get.call_args_list[0][0][0] == 4
+        mock_clear.assert_not_called()
+        mock_mark.assert_called_once_with(BLOCK_KEY_VERSION, 9)
+
+    @pytest.mark.parametrize(
+        "state", [None, {"key_version": BLOCK_KEY_VERSION - 1, "indexed_through_id": 9}]
+    )
+    def test_partial_or_outdated_index_is_rebuilt_from_scratch(
+        self,
+        _max_id,
+        mock_state,
+        mock_clear,
+        mock_get,
+        mock_upsert,
+        mock_mark,
+        mock_updates,
+        mock_replace,
+        state,
+    ):
+        # Keys written by save_business alone never mark the index complete
+        mock_state.return_value = state
+        mock_get.return_value = []
+        mock_mark.return_value = True
+
+        assert ensure_block_index() is True
+        mock_clear.assert_called_once()
+        assert mock_get.call_args_list[0][0][0] == 0
+        mock_mark.assert_called_once_with(BLOCK_KEY_VERSION, 9)
+
+    def test_failed_backfill_keeps_blocking_disabled(
+        self,
+        _max_id,
+        mock_state,
+        mock_clear,
+        mock_get,
+        mock_upsert,
+        mock_mark,
+        mock_updates,
+        mock_replace,
+    ):
+        mock_state.return_value = None
+        mock_get.return_value = [{"id": 1, "phone": "555-1234"}]
+        mock_upsert.return_value = False
+
+        assert ensure_block_index() is False
+        mock_mark.assert_not_called()
+
+    def test_updated_businesses_are_rekeyed(
+        self,
+        _max_id,
+        mock_state,
+        mock_clear,
+        mock_get,
+        mock_upsert,
+        mock_mark,
+        mock_updates,
+        mock_replace,
+    ):
+        # An enrichment changed business 3's phone after it was indexed
+        mock_state.return_value = {
+            "key_version": BLOCK_KEY_VERSION,
+            "indexed_through_id": 9,
+        }
+        mock_updates.side_effect = [
+            [{"id": 3, "phone": "555-9876", "queued_at": "t1"}],
+            [],
+        ]
+
+        assert ensure_block_index() is True
+        mock_get.assert_not_called()
+        mock_replace.assert_called_once_with([("phone:5559876", 3)], [(3, "t1")])
+
+    @pytest.mark.parametrize(
+        "updates, replaced", [(None, True), ([{"id": 3, "queued_at": "t1"}], False)]
+    )
+    def test_failed_rekey_keeps_blocking_disabled(
+        self,
+        _max_id,
+        mock_state,
+        mock_clear,
+        mock_get,
+        mock_upsert,
+        mock_mark,
+        mock_updates,
+        mock_replace,
+        updates,
+        replaced,
+    ):
+        mock_state.return_value = {
+            "key_version": BLOCK_KEY_VERSION,
+            "indexed_through_id": 9,
+        }
+        mock_updates.return_value = updates
+        mock_replace.return_value = replaced
+
+        assert ensure_block_index() is False
+
+
+@pytest.mark.parametrize("complete", [True, False])
+def test_duplicate_pairs_use_blocking_only_when_index_complete(complete):
+    with (
+        patch(
+            "leadfactory.pipeline.dedupe_blocking.ensure_block_index",
+            return_value=complete,
+        ),
+        patch(
+            "leadfactory.utils.e2e_db_connector.get_blocked_duplicate_pairs",
+            return_value=["blocked"],
+        ),
+        patch("leadfactory.utils.e2e_db_connector.db_cursor") as mock_cursor,
+    ):
+        cursor = mock_cursor.return_value.__enter__.return_value
+        cursor.description = [("business1_id",)]
+        cursor.fetchall.return_value = [(1,)]
+
+        pairs = get_potential_duplicate_pairs()
+
+    assert pairs == (["blocked"] if complete else [{"business1_id": 1}])
@@ -0,0 +1,304 @@
+"""
+Unit tests for cluster-based duplicate resolution and bulk merges.
+"""
+
+import json
+from contextlib import contextmanager
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+
+from leadfactory.config.dedupe_config import DedupeConfig
+from leadfactory.pipeline.dedupe_performance import (
+    MergeCluster,
+    OptimizedDeduplicator,
+    UnionFind,
+)
+from leadfactory.utils import e2e_db_connector
+
+
+def make_business(business_id, **fields):
+    business = {
+        "id": business_id,
+        "name": f"Business {business_id}",
+        "address": None,
+        "phone": None,
+        "email": None,
+        "website": "https://same.example",
+        "category": None,
+    }
+    business.update(fields)
+    return business
+
+
+def make_storage(businesses):
+    storage = Mock()
+    storage.get_businesses.side_effect = lambda ids: [
+        businesses[i] for i in ids if i in businesses
+    ]
+    storage.merge_business_clusters.return_value = True
+    return storage
+
+
+def pair(business1_id, business2_id):
+    return {"business1_id": business1_id, "business2_id": business2_id}
+
+
+class TestUnionFind:
+    """Test the disjoint-set structure behind clustering."""
+
+    def test_groups(self):
+        components = UnionFind()
+        components.union(1, 2)
+        components.union(3, 2)
+        components.union(5, 4)
+        components.find(9)
+
+        assert sorted(components.groups()) == [[1, 2, 3], [4, 5]]
+
+    def test_long_chain(self):
+        components = UnionFind()
+        for i in range(10000):
+            components.union(i, i + 1)
+
+        assert components.find(0) == components.find(10000)
+        assert len(components.groups()[0]) == 10001
+
+
+class TestResolveClusters:
+    """Test grouping pairs into clusters with one primary each."""
+
+    def setup_method(self):
+        self.deduplicator = OptimizedDeduplicator(DedupeConfig(), max_workers=2)
+
+    def test_chain_becomes_one_cluster(self):
+        businesses = {
+            1: make_business(1),
+            2: make_business(2, phone="555-1234", address="1 Main St"),
+            3: make_business(3, category="Plumbing"),
+            4: make_business(4, website="https://other.example"),
+        }
+
+        with patch(
+            "leadfactory.pipeline.dedupe_performance.get_storage",
+            return_value=make_storage(businesses),
+        ):
+            clusters, stats = self.deduplicator.resolve_clusters(
+                [pair(1, 2), pair(2, 3), pair(3, 4)]
+            )
+
+        assert stats == {"processed": 3, "flagged": 1, "errors": 0}
+        assert len(clusters) == 1
+        cluster = clusters[0]
+        # Business 2 has the most complete record
+        assert cluster.primary_id == 2
+        assert cluster.secondary_ids == [1, 3]
+        assert cluster.updates == {"category": "Plumbing"}
+
+    def test_ties_keep_lowest_id(self):
+        businesses = {i: make_business(i) for i in (7, 3, 5)}
+
+        with patch(
+            "leadfactory.pipeline.dedupe_performance.get_storage",
+            return_value=make_storage(businesses),
+        ):
+            clusters, _ = self.deduplicator.resolve_clusters([pair(7, 5), pair(5, 3)])
+
+        assert clusters[0].primary_id == 3
+        assert clusters[0].secondary_ids == [5, 7]
+
+    def test_secondaries_fold_in_order(self):
+        """Test that the first secondary to fill a field wins."""
+        businesses = {
+            1: make_business(1, address="1 Main St", phone="555"),
+            2: make_business(2, email="a@example.com"),
+            3: make_business(3, email="b@example.com"),
+        }
+
+        with patch(
+            "leadfactory.pipeline.dedupe_performance.get_storage",
+            return_value=make_storage(businesses),
+        ):
+            clusters, _ = self.deduplicator.resolve_clusters([pair(1, 2), pair(1, 3)])
+
+        assert clusters[0].updates == {"email": "a@example.com"}
+
+    def test_missing_business(self):
+        storage = make_storage({1: make_business(1)})
+
+        with patch(
+            "leadfactory.pipeline.dedupe_performance.get_storage",
+            return_value=storage,
+        ):
+            clusters, stats = self.deduplicator.resolve_clusters([pair(1, 2)])
+
+        assert clusters == []
+        assert stats["errors"] == 1
+
+    def test_businesses_fetched_in_chunks(self):
+        businesses = {i: make_business(i) for i in range(10)}
+        storage = make_storage(businesses)
+
+        with patch(
+            "leadfactory.pipeline.dedupe_performance.get_storage",
+            return_value=storage,
+        ):
+            clusters, _ = self.deduplicator.resolve_clusters(
+                [pair(i, i + 1) for i in range(9)], fetch_size=4
+            )
+
+        assert storage.get_businesses.call_count == 3
+        assert len(clusters) == 1
+        assert len(clusters[0].secondary_ids) == 9
+
+
+class TestMergeClusters:
+    """Test chunked, transactional cluster merges."""
+
+    def setup_method(self):
+        self.deduplicator = OptimizedDeduplicator(DedupeConfig(), max_workers=3)
+        self.clusters = [
+            MergeCluster(i * 10, [i * 10 + 1, i * 10 + 2], {"category": "x"})
+            for i in range(1, 6)
+        ]
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_one_bulk_call_per_chunk(self, parallel):
+        storage = make_storage({})
+
+        with patch(
+            "leadfactory.pipeline.dedupe_performance.get_storage",
+            return_value=storage,
+        ):
+            stats = self.deduplicator.merge_clusters(
+                self.clusters, chunk_size=2, parallel=parallel
+            )
+
+        assert stats == {"merged": 10, "errors": 0}
+        assert storage.merge_business_clusters.call_count == 3
+        merged = [
+            cluster
+            for call in storage.merge_business_clusters.call_args_list
+            for cluster in call[0][0]
+        ]
+        assert sorted(merged) == [
+            (i * 10, [i * 10 + 1, i * 10 + 2], {"category": "x"}) for i in range(1, 6)
+        ]
+        storage.merge_businesses.assert_not_called()
+
+    def test_failed_chunk_counts_errors(self):
+        storage = make_storage({})
+        storage.merge_business_clusters.side_effect = [True, False, True]
+
+        with patch(
+            "leadfactory.pipeline.dedupe_performance.get_storage",
+            return_value=storage,
+        ):
+            stats = self.deduplicator.merge_clusters(
+                self.clusters, chunk_size=2, parallel=False
+            )
+
+        assert stats == {"merged": 6, "errors": 4}
+
+    def test_pairwise_fallback(self):
+        storage = Mock(spec=["get_businesses", "merge_businesses"])
+        storage.merge_businesses.return_value = True
+
+        with patch(
+            "leadfactory.pipeline.dedupe_performance.get_storage",
+            return_value=storage,
+        ):
+            stats = self.deduplicator.merge_clusters(self.clusters[:1])
+
+        assert stats == {"merged": 2, "errors": 0}
+        assert [c[0] for c in storage.merge_businesses.call_args_list] == [
+            (10, 11),
+            (10, 12),
+        ]
+
+    def test_process_pairs_clustered(self):
+        businesses = {i: make_business(i) for i in range(1, 7)}
+        storage = make_storage(businesses)
+
+        with patch(
+            "leadfactory.pipeline.dedupe_performance.get_storage",
+            return_value=storage,
+        ):
+            stats = self.deduplicator.process_pairs_clustered(
+                [pair(1, 2), pair(2, 3), pair(4, 5), pair(5, 6), pair(6, 4)]
+            )
+
+        assert stats == {
+            "processed": 5,
+            "flagged": 0,
+            "errors": 0,
+            "merged": 4,
+            "clusters": 2,
+        }
+        storage.merge_business_clusters.assert_called_once_with(
+            [(1, [2, 3], {}), (4, [5, 6], {})]
+        )
+
+
+class TestMergeBusinessClustersSql:
+    """Test the set-based merge statements."""
+
+    @pytest.fixture
+    def cursor(self):
+        cursor = MagicMock()
+        conn = MagicMock()
+        conn.cursor.return_value = cursor
+
+        @contextmanager
+        def transaction():
+            yield conn
+
+        with patch.object(e2e_db_connector, "db_transaction", transaction):
+            yield cursor
+
+    def test_statements(self, cursor):
+        with patch.object(e2e_db_connector, "execute_values") as execute_values:
+            result = e2e_db_connector.merge_business_clusters(
+                [(1, [2, 3], {"category": "Plumbing"}), (4, [5], {})]
+            )
+
+        assert result is True
+        calls = execute_values.call_args_list
+        assert [call[0][2] for call in calls[:2]] == [[(2, 1), (3, 1), (5, 4)]] * 2
+        assert "UPDATE emails" in calls[0][0][1]
+        assert "UPDATE assets" in calls[1][0][1]
+
+        update_sql, patches = calls[2][0][1], calls[2][0][2]
+        assert "jsonb_populate_record(NULL::businesses, v.patch)" in update_sql
+        assert "category = CASE WHEN v.patch ? 'category'" in update_sql
+        assert [(id_, json.loads(patch)) for id_, patch in patches] == [
+            (1, {"category": "Plumbing"})
+        ]
+
+        assert calls[3][0][2] == [(1, 2), (1, 3), (4, 5)]
+        cursor.execute.assert_called_once_with(
+            "DELETE FROM businesses WHERE id = ANY(%s)", ([2, 3, 5],)
+        )
+
+    def test_invalid_column_rejected(self, cursor):
+        with patch.object(e2e_db_connector, "execute_values") as execute_values:
+            result = e2e_db_connector.merge_business_clusters(
+                [(1, [2], {"name; DROP TABLE businesses": "x"})]
+            )
+
+        assert result is False
+        execute_values.assert_not_called()
+
+    def test_failure_returns_false(self, cursor):
+        cursor.execute.side_effect = RuntimeError("deadlock")
+
+        with patch.object(e2e_db_connector, "execute_values"):
+            assert e2e_db_connector.merge_business_clusters([(1, [2], {})]) is False
+
+    def test_empty(self, cursor):
+        assert e2e_db_connector.merge_business_clusters([]) is True
+        cursor.execute.assert_not_called()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
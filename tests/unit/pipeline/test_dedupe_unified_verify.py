@@ -0,0 +1,109 @@
+"""
+Unit tests for batched LLM verification in the unified dedupe pipeline.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from leadfactory.config.dedupe_config import DedupeConfig
+from leadfactory.llm.async_client import AsyncLLMClient
+from leadfactory.llm.config import FallbackStrategy, LLMConfig, ProviderConfig
+from leadfactory.pipeline import dedupe_unified
+from leadfactory.pipeline.dedupe_unified import LLMVerifier
+
+
+def stub_llm_config():
+    config = LLMConfig()
+    config.fallback_strategy = FallbackStrategy.QUALITY_OPTIMIZED
+    config.providers = {
+        "stub": ProviderConfig(
+            name="stub",
+            default_model="stub",
+            priority=2,
+            additional_config={"latency": 0.0},
+        ),
+    }
+    return config
+
+
+def make_verifier():
+    verifier = LLMVerifier(DedupeConfig(use_llm_verification=True))
+    verifier.llm_client = MagicMock(config=stub_llm_config())
+    return verifier
+
+
+class TestVerifyDuplicatesMany:
+    """Test the concurrent verifier fan-out."""
+
+    def test_closes_a_fresh_client_per_call(self):
+        verifier = make_verifier()
+        pairs = [({"name": f"Biz {i}"}, {"name": f"Biz {i}"}) for i in range(3)]
+        original_aclose = AsyncLLMClient.aclose
+        closed = []
+
+        async def tracked_aclose(client):
+            closed.append(client)
+            await original_aclose(client)
+
+        with (
+            patch.object(AsyncLLMClient, "aclose", tracked_aclose),
+            patch.object(verifier, "_verify_with_ollama") as ollama,
+        ):
+            first = verifier.verify_duplicates_many(pairs)
+            second = verifier.verify_duplicates_many(pairs[:1])
+
+        assert len(first) == 3
+        assert len(second) == 1
+        assert len(closed) == 2
+        assert closed[0] is not closed[1]
+        ollama.assert_not_called()
+
+    def test_failed_fan_out_falls_back_to_ollama(self):
+        verifier = make_verifier()
+        pairs = [({"name": "A"}, {"name": "B"})] * 2
+
+        with (
+            patch.object(
+                AsyncLLMClient,
+                "chat_completion_many",
+                side_effect=RuntimeError("down"),
+            ),
+            patch.object(
+                verifier, "_verify_with_ollama", return_value=(False, 0.1, "no")
+            ) as ollama,
+        ):
+            results = verifier.verify_duplicates_many(pairs)
+
+        assert results == [(False, 0.1, "no")] * 2
+        assert ollama.call_count == 2
+
+
+def test_deduplicate_verifies_each_batch_in_one_call():
+    """Standard processing verifies a batch at a time, not pair by pair."""
+    config = DedupeConfig(use_llm_verification=True, batch_size=2)
+    pairs = [{"business1_id": i, "business2_id": i + 100} for i in range(5)]
+    verifier = MagicMock()
+    verifier.verify_duplicates_many.side_effect = lambda batch: [
+        (False, 0.99, "different")
+    ] * len(batch)
+
+    with (
+        patch.object(dedupe_unified, "check_dedupe_tables_exist", return_value=True),
+        patch.object(dedupe_unified, "get_potential_duplicates", return_value=pairs),
+        patch.object(
+            dedupe_unified,
+            "get_business_by_id",
+            side_effect=lambda business_id: {"id": business_id, "name": "Biz"},
+        ),
+        patch.object(dedupe_unified, "LLMVerifier", return_value=verifier),
+        patch.object(dedupe_unified, "merge_businesses") as merge,
+    ):
+        stats = dedupe_unified.deduplicate(config, use_optimized=False)
+
+    assert [len(c.args[0]) for c in verifier.verify_duplicates_many.call_args_list] == [
+        2,
+        2,
+        1,
+    ]
+    verifier.verify_duplicates.assert_not_called()
+    merge.assert_not_called()
+    assert stats["processed"] == 5
@@ -12,6 +12,9 @@ from unittest.mock import AsyncMock, MagicMock, Mock, call, mock_open, patch
 import pytest
 
 from leadfactory.pipeline.email_queue import (
+    AsyncTokenBucket,
+    EmailDispatcher,
+    PreparedEmail,
     SendGridEmailSender,
     add_unsubscribe,
     apply_template_replacements,
@@ -459,19 +462,40 @@ class TestSendBusinessEmail:
     @patch('leadfactory.pipeline.email_queue.storage')
     async def test_send_business_email_dry_run(self, mock_storage, mock_sender, business):
         """Test email sending in dry run mode."""
+        mock_storage.get_business_asset.return_value = {"file_path": "/tmp/mockup.png"}
         mock_storage.save_email_record.return_value = True
 
         with patch('leadfactory.pipeline.email_queue.is_email_unsubscribed', return_value=False):
-            with patch('leadfactory.pipeline.email_queue.generate_email_content', new_callable=AsyncMock) as mock_gen:
-                mock_gen.return_value = ("Subject", "<p>HTML</p>", "Text")
+            with patch('os.path.exists', return_value=True):
+                with patch('builtins.open', mock_open(read_data=b"fake image")):
+                    with patch('leadfactory.pipeline.email_queue.generate_email_content', new_callable=AsyncMock) as mock_gen:
+                        mock_gen.return_value = ("Subject", "<p>HTML</p>", "Text")
 
-                result = await send_business_email(
-                    business, mock_sender, "<html>Template</html>", is_dry_run=True
-                )
+                        result = await send_business_email(
+                            business, mock_sender, "<html>Template</html>", is_dry_run=True
+                        )
 
-                assert result is True
-                mock_sender.send_email.assert_not_called()  # Not actually sent
-                mock_storage.save_email_record.assert_called_once()  # Still recorded
+                        assert result is True
+                        mock_sender.send_email.assert_not_called()  # Not actually sent
+                        mock_storage.save_email_record.assert_called_once()  # Still recorded
+
+    @pytest.mark.asyncio
+    @patch('leadfactory.pipeline.email_queue.storage')
+    async def test_send_business_email_dry_run_requires_mockup(self, mock_storage, mock_sender, business):
+        """Test dry runs enforce the mockup requirement too."""
+        mock_storage.get_business_asset.return_value = None
+
+        with patch('leadfactory.pipeline.email_queue.is_email_unsubscribed', return_value=False):
+            with patch.dict(os.environ, {"SKIP_SENDGRID_API": "true"}):
+                with patch('leadfactory.pipeline.email_queue.generate_email_content', new_callable=AsyncMock) as mock_gen:
+                    mock_gen.return_value = ("Subject", "<p>HTML</p>", "Text")
+
+                    result = await send_business_email(
+                        business, mock_sender, "<html>Template</html>", is_dry_run=True
+                    )
+
+                    assert result is False
+                    mock_storage.save_email_record.assert_not_called()
 
     @pytest.mark.asyncio
     @patch('leadfactory.pipeline.email_queue.storage')
@@ -550,3 +574,167 @@ class TestProcessBusinessEmail:
 
         result = await process_business_email(1)
         assert result is False
+
+
+class TestSendEmailAsync:
+    """Test sending through a shared aiohttp session."""
+
+    @staticmethod
+    def make_session(status, headers=None, text=""):
+        response = MagicMock()
+        response.status = status
+        response.headers = headers or {}
+        response.text = AsyncMock(return_value=text)
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=response)
+        context.__aexit__ = AsyncMock(return_value=False)
+        session = MagicMock()
+        session.post.return_value = context
+        return session
+
+    @pytest.fixture
+    def sender(self):
+        return SendGridEmailSender(
+            api_key="test-api-key",
+            from_email="test@example.com",
+            from_name="Test Sender",
+            ip_pool="primary",
+            subuser="test-user",
+        )
+
+    @pytest.mark.asyncio
+    async def test_send_email_async_success(self, sender):
+        """Test that a 202 response returns the message ID."""
+        session = self.make_session(202, {"X-Message-Id": "msg-1"})
+
+        message_id = await sender.send_email_async(
+            session, "to@example.com", "To", "Subject", "<p>Hi</p>"
+        )
+
+        assert message_id == "msg-1"
+        payload = session.post.call_args.kwargs["json"]
+        assert payload["personalizations"][0]["to"][0]["email"] == "to@example.com"
+
+    @pytest.mark.asyncio
+    async def test_send_email_async_failure(self, sender):
+        """Test that an error response returns None."""
+        session = self.make_session(400, text="Bad Request")
+
+        message_id = await sender.send_email_async(
+            session, "to@example.com", "To", "Subject", "<p>Hi</p>"
+        )
+
+        assert message_id is None
+
+    def test_rate_limit_key(self, sender):
+        """Test that the rate limit key identifies pool and subuser."""
+        assert sender.rate_limit_key == "primary:test-user"
+
+
+class TestAsyncTokenBucket:
+    """Test the token bucket rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_burst_then_rate(self):
+        """Test that a burst is immediate and later tokens follow the rate."""
+        bucket = AsyncTokenBucket(rate=20, capacity=2)
+        loop = asyncio.get_running_loop()
+
+        start = loop.time()
+        await bucket.acquire()
+        await bucket.acquire()
+        burst_elapsed = loop.time() - start
+        await bucket.acquire()
+        total_elapsed = loop.time() - start
+
+        assert burst_elapsed < 0.03
+        assert total_elapsed >= 0.04
+
+    def test_invalid_rate(self):
+        """Test that a non-positive rate is rejected."""
+        with pytest.raises(ValueError):
+            AsyncTokenBucket(rate=0, capacity=1)
+
+
+class TestEmailDispatcher:
+    """Test concurrent email dispatch."""
+
+    @pytest.fixture
+    def businesses(self):
+        return [
+            {"id": i, "name": f"Business {i}", "email": f"b{i}@example.com"}
+            for i in range(1, 7)
+        ]
+
+    @staticmethod
+    async def fake_render(business, template, is_dry_run=False):
+        if business["id"] == 6:
+            return None
+        return PreparedEmail(
+            business=business,
+            recipient_email=business["email"],
+            original_email=business["email"],
+            subject="Subject",
+            html_content="<p>HTML</p>",
+        )
+
+    @pytest.mark.asyncio
+    @patch("leadfactory.pipeline.email_queue.save_email_record")
+    async def test_sends_concurrently(self, mock_save, businesses):
+        """Test that sends overlap up to the concurrency limit."""
+        in_flight = 0
+        peak = 0
+
+        async def fake_send(session, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return f"msg-{kwargs['to_email']}"
+
+        sender = MagicMock()
+        sender.rate_limit_key = "primary:default"
+        sender.send_email_async = fake_send
+
+        with patch(
+            "leadfactory.pipeline.email_queue.render_business_email",
+            side_effect=self.fake_render,
+        ):
+            dispatcher = EmailDispatcher(
+                sender, "<html></html>", max_concurrency=3, rate_per_second=1000, burst=10
+            )
+            sent, failed = await dispatcher.dispatch(businesses)
+
+        assert (sent, failed) == (5, 1)
+        assert 1 < peak <= 3
+        assert mock_save.call_count == 5
+        sender.send_email.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("leadfactory.pipeline.email_queue.save_email_record")
+    async def test_dry_run_records_without_sending(self, mock_save, businesses):
+        """Test that dry run keeps bookkeeping but sends nothing."""
+        sender = MagicMock()
+        sender.send_email_async = AsyncMock()
+
+        with patch(
+            "leadfactory.pipeline.email_queue.render_business_email",
+            side_effect=self.fake_render,
+        ):
+            dispatcher = EmailDispatcher(sender, "<html></html>", is_dry_run=True)
+            sent, failed = await dispatcher.dispatch(businesses)
+
+        assert (sent, failed) == (5, 1)
+        sender.send_email_async.assert_not_called()
+        assert all(
+            c.kwargs["message_id"].startswith("dry-run-")
+            for c in mock_save.call_args_list
+        )
+
+    def test_buckets_per_pool(self):
+        """Test that each IP pool/subuser gets its own token bucket."""
+        dispatcher = EmailDispatcher(MagicMock(), "<html></html>")
+
+        assert dispatcher.get_bucket("a:x") is dispatcher.get_bucket("a:x")
+        assert dispatcher.get_bucket("a:x") is not dispatcher.get_bucket("b:x")
@@ -0,0 +1,232 @@
+"""
+Unit tests for set-based page saving in the scraper.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from leadfactory.pipeline import scrape
+
+
+class FakeStorage:
+    """Storage double recording the bulk calls save_businesses makes."""
+
+    def __init__(self, existing=None, fail=False):
+        self.existing = existing or []
+        self.fail = fail
+        self.lookups = []
+        self.upserts = []
+        self.block_keys = {}
+        self.verticals = {"hvac": 1, "plumbers": 2}
+
+    def get_businesses_by_match_keys(self, source_ids, websites, phones, name_zips):
+        self.lookups.append((source_ids, websites, phones, name_zips))
+        return [dict(row) for row in self.existing]
+
+    def bulk_upsert_businesses(self, new_businesses, updated_businesses):
+        self.upserts.append(
+            ([dict(b) for b in new_businesses], [dict(b) for b in updated_businesses])
+        )
+        if self.fail:
+            return None
+        return [100 + i for i in range(len(new_businesses))]
+
+    def save_block_keys_many(self, block_keys):
+        self.block_keys.update(block_keys)
+        return True
+
+    def get_vertical_id(self, name):
+        return self.verticals.get(name)
+
+    def get_vertical_name(self, vertical_id):
+        return {v: k for k, v in self.verticals.items()}.get(vertical_id)
+
+
+def record(name, source="yelp", **overrides):
+    return {
+        "name": name,
+        "address": "1 Main St, New York, NY 10001",
+        "zip_code": "10001",
+        "category": "hvac",
+        "city": "New York",
+        "state": "NY",
+        "source": source,
+        "source_id": f"{source}-{name}",
+        **overrides,
+    }
+
+
+def existing_row(**overrides):
+    return {
+        "id": 7,
+        "name": "Acme",
+        "address": "1 Main St",
+        "zip": "10001",
+        "phone": "(212) 555-0100",
+        "email": None,
+        "website": "https://acme.example",
+        "vertical_id": 1,
+        "source": "yelp",
+        "source_id": "yelp-acme",
+        **overrides,
+    }
+
+
+@pytest.fixture
+def storage():
+    fake = FakeStorage()
+    with patch.object(scrape, "get_storage_instance", return_value=fake):
+        yield fake
+
+
+class TestSaveBusinesses:
+    """Test matching, merging and round trips for a scraped page."""
+
+    def test_new_page_uses_one_lookup_and_one_upsert(self, storage):
+        ids = scrape.save_businesses(
+            [record("Acme", phone="1"), record("Bolt", phone="2"), record("Cog")]
+        )
+
+        assert ids == [100, 101, 102]
+        assert len(storage.lookups) == 1
+        assert len(storage.upserts) == 1
+        new_businesses, updated = storage.upserts[0]
+        assert [b["name"] for b in new_businesses] == ["Acme", "Bolt", "Cog"]
+        assert updated == []
+        assert new_businesses[0]["vertical_id"] == 1
+        assert set(storage.block_keys) == {100, 101, 102}
+
+    def test_lookup_keys_are_stripped_and_deduplicated(self, storage):
+        scrape.save_businesses(
+            [
+                record("Acme", website=" https://a.example ", phone=""),
+                record("Bolt", website="https://a.example"),
+            ]
+        )
+
+        source_ids, websites, phones, name_zips = storage.lookups[0]
+        assert source_ids == ["yelp-Acme", "yelp-Bolt"]
+        assert websites == ["https://a.example"]
+        assert phones == []
+        assert name_zips == [("acme", "10001"), ("bolt", "10001")]
+
+    def test_source_id_match_is_returned_unchanged(self, storage):
+        storage.existing = [existing_row()]
+
+        ids = scrape.save_businesses([record("Acme Heating", source_id="yelp-acme")])
+
+        assert ids == [7]
+        assert storage.upserts == [([], [])]
+
+    def test_website_match_applies_conflict_resolution(self, storage):
+        storage.existing = [existing_row()]
+
+        ids = scrape.save_businesses(
+            [
+                record(
+                    "Acme Heating & Cooling",
+                    source="google",
+                    website="https://acme.example",
+                    phone="(212) 555-0199",
+                    category="plumbers",
+                    google_response_json={"place_id": "g1"},
+                )
+            ]
+        )
+
+        assert ids == [7]
+        new_businesses, updated = storage.upserts[0]
+        assert new_businesses == []
+        assert len(updated) == 1
+        # Google outranks Yelp, so its values win every conflicting field
+        assert updated[0]["name"] == "Acme Heating & Cooling"
+        assert updated[0]["phone"] == "(212) 555-0199"
+        assert updated[0]["vertical_id"] == 2
+        assert updated[0]["source"] == "google,yelp"
+        assert updated[0]["google_response_json"] == {"place_id": "g1"}
+        assert updated[0]["yelp_response_json"] is None
+
+    def test_lower_priority_source_keeps_existing_values(self, storage):
+        storage.existing = [existing_row(source="google")]
+
+        scrape.save_businesses([record("Acme Inc", phone="(212) 555-0100")])
+
+        _, updated = storage.upserts[0]
+        assert updated[0]["name"] == "Acme"
+        assert updated[0]["source"] == "google,yelp"
+
+    def test_duplicates_within_page_merge_into_one_insert(self, storage):
+        ids = scrape.save_businesses(
+            [
+                record("Acme", phone="(212) 555-0100"),
+                record("Acme HVAC", source="google", phone="(212) 555-0100"),
+                record("Acme", source_id="yelp-Acme"),
+            ]
+        )
+
+        assert ids == [100, 100, 100]
+        new_businesses, updated = storage.upserts[0]
+        assert len(new_businesses) == 1
+        assert updated == []
+        assert new_businesses[0]["name"] == "Acme HVAC"
+        assert new_businesses[0]["source"] == "google,yelp"
+
+    def test_existing_business_updated_once_per_page(self, storage):
+        storage.existing = [existing_row()]
+
+        scrape.save_businesses(
+            [
+                record("Acme", source="google", phone="(212) 555-0100"),
+                record("Acme", source="google", website="https://acme.example"),
+            ]
+        )
+
+        _, updated = storage.upserts[0]
+        assert [b["id"] for b in updated] == [7]
+
+    def test_failed_upsert_returns_none_for_every_record(self, storage):
+        storage.fail = True
+
+        assert scrape.save_businesses([record("Acme"), record("Bolt")]) == [
+            None,
+            None,
+        ]
+        assert storage.block_keys == {}
+
+    def test_falls_back_to_single_saves_without_bulk_support(self):
+        storage = object()
+        with (
+            patch.object(scrape, "get_storage_instance", return_value=storage),
+            patch.object(scrape, "save_business", side_effect=[1, 2]) as mock_save,
+        ):
+            ids = scrape.save_businesses([record("Acme"), record("Bolt")])
+
+        assert ids == [1, 2]
+        assert mock_save.call_count == 2
+
+    def test_empty_page(self, storage):
+        assert scrape.save_businesses([]) == []
+        assert storage.lookups == []
+
+
+class TestResolveBusinessUpdates:
+    """Test the shared conflict-resolution rules."""
+
+    def test_only_changed_fields_are_returned(self):
+        updates = scrape._resolve_business_updates(
+            existing_row(),
+            {"name": "acme", "address": "1 Main Street", "email": "hi@acme.example"},
+            "yelp",
+            "yelp",
+            lambda name: None,
+            lambda vertical_id: None,
+        )
+
+        assert updates == {"address": "1 Main Street", "email": "hi@acme.example"}
+
+    def test_combine_sources(self):
+        assert scrape._combine_sources("yelp", "google") == "google,yelp"
+        assert scrape._combine_sources("google,yelp", "yelp") is None
+        assert scrape._combine_sources("yelp", "yelp") is None
+        assert scrape._combine_sources("", "manual") == "manual"
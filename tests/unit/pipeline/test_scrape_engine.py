@@ -0,0 +1,185 @@
+"""
+Unit tests for the concurrent scrape engine and place-detail reuse.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from leadfactory.pipeline import scrape
+from leadfactory.pipeline.scrape_engine import ApiRateLimiter, ScrapeEngine
+
+
+def place_details(zip_code, **extra):
+    return {
+        "address_components": [
+            {"types": ["postal_code"], "long_name": zip_code, "short_name": zip_code}
+        ],
+        **extra,
+    }
+
+
+class TestApiRateLimiter:
+    """Test the thread-safe token bucket."""
+
+    def test_burst_then_waits(self):
+        clock = [100.0]
+        sleeps = []
+
+        def fake_sleep(seconds):
+            sleeps.append(seconds)
+
+        with (
+            patch(
+                "leadfactory.pipeline.scrape_engine.time.monotonic",
+                side_effect=lambda: clock[0],
+            ),
+            patch("leadfactory.pipeline.scrape_engine.time.sleep", fake_sleep),
+        ):
+            limiter = ApiRateLimiter(rate_per_second=2, burst=2)
+            assert limiter.acquire() == 0.0
+            assert limiter.acquire() == 0.0
+            assert limiter.acquire() == pytest.approx(0.5)
+            assert limiter.acquire() == pytest.approx(1.0)
+
+            # Tokens refill while idle
+            clock[0] += 10
+            assert limiter.acquire() == 0.0
+
+        assert sleeps == [pytest.approx(0.5), pytest.approx(1.0)]
+
+    def test_zero_rate_disables_limiting(self):
+        limiter = ApiRateLimiter(rate_per_second=0)
+        assert all(limiter.acquire() == 0.0 for _ in range(100))
+
+
+class TestFilterPlacesByZip:
+    """Test concurrent place-detail lookups for ZIP filtering."""
+
+    def test_returns_matching_places_with_details(self):
+        google_api = MagicMock()
+        details = {
+            "p1": (place_details("10001", website="https://one.example"), None),
+            "p2": (place_details("10002"), None),
+            "p3": (None, "HTTP error 500"),
+            "p4": (place_details("10001"), None),
+        }
+        google_api.get_place_details.side_effect = lambda place_id: details[place_id]
+        places = [{"place_id": pid, "name": pid} for pid in details]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            matched = scrape.filter_places_by_zip(
+                google_api, places, "10001", executor=executor
+            )
+
+        assert [place["place_id"] for place, _ in matched] == ["p1", "p4"]
+        assert matched[0][1]["website"] == "https://one.example"
+        assert google_api.get_place_details.call_count == 4
+
+    def test_process_google_place_reuses_details(self):
+        google_api = MagicMock()
+        place = {
+            "place_id": "p1",
+            "name": "Acme HVAC",
+            "formatted_address": "1 Main St, New York, NY",
+        }
+        details = place_details(
+            "10001", formatted_phone_number="(212) 555-0100", website=""
+        )
+
+        with patch.object(scrape, "save_business", return_value=7) as mock_save:
+            business_id = scrape.process_google_place(
+                place, "hvac", google_api, details=details
+            )
+
+        assert business_id == 7
+        google_api.get_place_details.assert_not_called()
+        assert mock_save.call_args.kwargs["zip_code"] == "10001"
+        assert mock_save.call_args.kwargs["phone"] == "(212) 555-0100"
+
+    def test_scrape_businesses_fetches_each_detail_once(self, monkeypatch):
+        monkeypatch.setenv("YELP_KEY", "yelp")
+        monkeypatch.setenv("GOOGLE_KEY", "google")
+        google_api = MagicMock()
+        google_api.search_places.return_value = (
+            [{"place_id": "p1", "name": "A", "formatted_address": "x"}],
+            None,
+        )
+        google_api.get_place_details.return_value = (place_details("10001"), None)
+        yelp_api = MagicMock()
+        yelp_api.search_businesses.return_value = ([], None)
+
+        with patch.object(
+            scrape, "save_businesses", side_effect=lambda records: [1] * len(records)
+        ):
+            counts = scrape.scrape_businesses(
+                "10001",
+                {"name": "hvac", "yelp_alias": "hvac", "google_alias": "hvac"},
+                yelp_api=yelp_api,
+                google_api=google_api,
+            )
+
+        assert counts == (0, 1)
+        assert google_api.get_place_details.call_count == 1
+
+
+class TestScrapeEngine:
+    """Test fan-out and aggregation across ZIP/vertical combinations."""
+
+    def test_run_aggregates_and_counts_failures(self, monkeypatch):
+        monkeypatch.setenv("YELP_KEY", "yelp")
+        monkeypatch.setenv("GOOGLE_KEY", "google")
+        calls = []
+
+        def fake_scrape(zip_code, vertical, limit, **kwargs):
+            calls.append((zip_code, vertical["name"], kwargs["yelp_api"]))
+            if zip_code == "60601":
+                raise RuntimeError("boom")
+            return 2, 3
+
+        engine = ScrapeEngine(max_workers=3, yelp_rate_per_second=0)
+        with patch.object(scrape, "scrape_businesses", side_effect=fake_scrape):
+            result = engine.run(
+                ["10001", "90210", "60601"], [{"name": "hvac"}, {"name": "plumbers"}]
+            )
+
+        assert result.combinations == 6
+        assert result.failed_combinations == 2
+        assert result.yelp_count == 8
+        assert result.google_count == 12
+        assert result.total_businesses == 20
+        # Every combination shares one rate-limited client per API
+        yelp_clients = {id(call[2]) for call in calls}
+        assert len(yelp_clients) == 1
+        assert calls[0][2].rate_limiter is engine.yelp_limiter
+
+    def test_run_reports_each_finished_combination(self, monkeypatch):
+        monkeypatch.setenv("YELP_KEY", "yelp")
+        monkeypatch.setenv("GOOGLE_KEY", "google")
+
+        def fake_scrape(zip_code, vertical, limit, **kwargs):
+            if zip_code == "60601":
+                raise RuntimeError("boom")
+            return 1, 1
+
+        def callback(zip_code, vertical_name):
+            done.append((zip_code, vertical_name))
+            raise RuntimeError("callback errors are logged, not raised")
+
+        done = []
+        engine = ScrapeEngine(max_workers=2, yelp_rate_per_second=0)
+        with patch.object(scrape, "scrape_businesses", side_effect=fake_scrape):
+            result = engine.run(
+                ["10001", "60601"], [{"name": "hvac"}], on_combination_done=callback
+            )
+
+        assert done == [("10001", "hvac")]
+        assert result.total_businesses == 2
+
+    def test_run_requires_api_keys(self, monkeypatch):
+        monkeypatch.delenv("YELP_KEY", raising=False)
+        monkeypatch.delenv("GOOGLE_KEY", raising=False)
+
+        with pytest.raises(ValueError):
+            ScrapeEngine().run(["10001"], [{"name": "hvac"}])
@@ -0,0 +1,318 @@
+"""
+Unit tests for the pooled local screenshot capture.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from leadfactory.pipeline import screenshot_pool
+from leadfactory.pipeline.screenshot_pool import (
+    BrowserPool,
+    SharedBrowserPool,
+    capture_screenshot_pooled,
+    percentile,
+)
+
+
+class FakeBrowser:
+    """Stands in for LocalScreenshotCapture, counting launches and contexts."""
+
+    def __init__(self):
+        self.starts = 0
+        self.stops = 0
+        self.contexts = []
+        self.browser = MagicMock()
+        self.browser.new_context = AsyncMock(side_effect=self._new_context)
+
+    async def start(self):
+        self.starts += 1
+
+    async def stop(self):
+        self.stops += 1
+
+    async def _new_context(self, **kwargs):
+        context = MagicMock()
+        context.options = kwargs
+        context.new_page = AsyncMock(side_effect=lambda: AsyncMock())
+        context.close = AsyncMock()
+        self.contexts.append(context)
+        return context
+
+
+def make_pool(**kwargs):
+    kwargs.setdefault("max_memory_mb", None)
+    pool = BrowserPool(**kwargs)
+    pool._browser = FakeBrowser()
+    return pool
+
+
+class TestBrowserPool:
+    """Test cases for BrowserPool."""
+
+    @pytest.mark.asyncio
+    async def test_start_opens_one_context_per_slot(self):
+        """The browser is launched once and N contexts are opened."""
+        pool = make_pool(size=3)
+        async with pool:
+            assert pool._browser.starts == 1
+            assert len(pool._browser.contexts) == 3
+            options = pool._browser.contexts[0].options
+            assert options["viewport"] == {"width": 1280, "height": 800}
+            assert "User-Agent" in options["extra_http_headers"]
+
+        assert pool._browser.stops == 1
+        for context in pool._browser.contexts:
+            context.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_capture_requires_start(self):
+        """Capturing before start() raises."""
+        with pytest.raises(RuntimeError):
+            await make_pool().capture("https://example.com", "/tmp/x.png")
+
+    @pytest.mark.asyncio
+    async def test_capture_reuses_browser(self):
+        """Successive captures reuse the launched browser and contexts."""
+        pool = make_pool(size=2)
+        with patch.object(
+            screenshot_pool, "render_screenshot", AsyncMock(return_value=True)
+        ) as render:
+            async with pool:
+                for i in range(5):
+                    result = await pool.capture(
+                        "https://example.com", f"/tmp/shot_{i}.png"
+                    )
+                    assert result.success is True
+                    assert result.error is None
+
+        assert render.await_count == 5
+        assert pool._browser.starts == 1
+        assert len(pool._browser.contexts) == 2
+
+    @pytest.mark.asyncio
+    async def test_context_recycled_after_page_limit(self):
+        """A context is replaced once it has rendered pages_per_context pages."""
+        pool = make_pool(size=1, pages_per_context=2)
+        with patch.object(
+            screenshot_pool, "render_screenshot", AsyncMock(return_value=True)
+        ):
+            async with pool:
+                first = pool._browser.contexts[0]
+                for i in range(5):
+                    await pool.capture("https://example.com", f"/tmp/shot_{i}.png")
+
+                # Recycled after pages 2 and 4
+                assert len(pool._browser.contexts) == 3
+                first.close.assert_awaited_once()
+                assert pool._browser.starts == 1
+
+    @pytest.mark.asyncio
+    async def test_capture_timeout(self):
+        """A slow page fails with a timeout and frees its slot."""
+
+        async def slow_render(*args, **kwargs):
+            await asyncio.sleep(5)
+            return True
+
+        pool = make_pool(size=1)
+        with patch.object(screenshot_pool, "render_screenshot", slow_render):
+            async with pool:
+                result = await pool.capture(
+                    "https://slow.example.com", "/tmp/slow.png", timeout=0.05
+                )
+                assert result.success is False
+                assert "Timed out" in result.error
+                assert pool._slots.qsize() == 1
+
+    @pytest.mark.asyncio
+    async def test_capture_error_is_reported(self):
+        """Navigation errors become failed results instead of exceptions."""
+        pool = make_pool(size=1)
+        with patch.object(
+            screenshot_pool,
+            "render_screenshot",
+            AsyncMock(side_effect=Exception("net::ERR_NAME_NOT_RESOLVED")),
+        ):
+            async with pool:
+                result = await pool.capture("https://bad.invalid", "/tmp/bad.png")
+
+        assert result.success is False
+        assert "ERR_NAME_NOT_RESOLVED" in result.error
+
+    @pytest.mark.asyncio
+    async def test_custom_viewport_sets_page_size(self):
+        """A viewport other than the pool's is applied to the page."""
+        pool = make_pool(size=1)
+        pages = []
+
+        async def render(page, *args, **kwargs):
+            pages.append(page)
+            return True
+
+        with patch.object(screenshot_pool, "render_screenshot", render):
+            async with pool:
+                await pool.capture(
+                    "https://example.com",
+                    "/tmp/mobile.png",
+                    viewport_width=375,
+                    viewport_height=667,
+                )
+
+        pages[0].set_viewport_size.assert_awaited_once_with(
+            {"width": 375, "height": 667}
+        )
+        pages[0].close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_capture_many_bounded_and_ordered(self):
+        """capture_many never exceeds the pool size and keeps input order."""
+        active = 0
+        peak = 0
+
+        async def render(page, url, output_path, **kwargs):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return not url.endswith("/7")
+
+        pool = make_pool(size=3)
+        targets = [(f"https://example.com/{i}", f"/tmp/{i}.png") for i in range(10)]
+        with patch.object(screenshot_pool, "render_screenshot", render):
+            async with pool:
+                results = await pool.capture_many(targets)
+
+        assert peak == 3
+        assert [result.url for result in results] == [url for url, _ in targets]
+        assert [result.success for result in results].count(False) == 1
+        assert results[7].success is False
+
+    @pytest.mark.asyncio
+    async def test_browser_restarted_on_memory_growth(self):
+        """The browser restarts once its memory exceeds the limit."""
+        pool = make_pool(size=2, max_memory_mb=100)
+        with (
+            patch.object(
+                screenshot_pool, "render_screenshot", AsyncMock(return_value=True)
+            ),
+            patch.object(BrowserPool, "browser_memory_mb", return_value=500),
+        ):
+            async with pool:
+                await pool.capture("https://example.com", "/tmp/x.png")
+                await pool._restart_task
+
+                assert pool._browser.starts == 2
+                assert len(pool._browser.contexts) == 4
+                assert pool._slots.qsize() == 2
+
+    @pytest.mark.asyncio
+    async def test_stop_waits_for_captures_in_flight(self):
+        """stop() lets running and queued captures finish, then closes."""
+        release = asyncio.Event()
+
+        async def blocked_render(*args, **kwargs):
+            await release.wait()
+            return True
+
+        pool = make_pool(size=1, pages_per_context=1)
+        with patch.object(screenshot_pool, "render_screenshot", blocked_render):
+            await pool.start()
+            captures = asyncio.gather(
+                pool.capture("https://example.com/1", "/tmp/1.png"),
+                pool.capture("https://example.com/2", "/tmp/2.png"),
+            )
+            await asyncio.sleep(0.01)
+            stopping = asyncio.create_task(pool.stop())
+            await asyncio.sleep(0.01)
+
+            assert not stopping.done()
+            with pytest.raises(RuntimeError):
+                await pool.capture("https://example.com/3", "/tmp/3.png")
+
+            release.set()
+            results = await captures
+            await asyncio.wait_for(stopping, 1)
+
+        assert [result.success for result in results] == [True, True]
+        assert pool._browser.stops == 1
+        assert not pool.started
+        # The worn context is not replaced while stopping; every one is closed
+        assert len(pool._browser.contexts) == 1
+        pool._browser.contexts[0].close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_stats(self):
+        """Stats report the captures, throughput and latency percentiles."""
+        pool = make_pool(size=2)
+        with patch.object(
+            screenshot_pool, "render_screenshot", AsyncMock(return_value=True)
+        ):
+            async with pool:
+                await pool.capture_many(
+                    [(f"https://example.com/{i}", f"/tmp/{i}.png") for i in range(4)]
+                )
+
+        stats = pool.stats()
+        assert stats["captures"] == 4
+        assert stats["throughput_per_second"] > 0
+        assert stats["p95_seconds"] >= stats["p50_seconds"] >= 0
+
+
+class TestPercentile:
+    """Test cases for the nearest-rank percentile."""
+
+    def test_percentile(self):
+        values = [float(i) for i in range(1, 101)]
+        assert percentile(values, 95) == 95.0
+        assert percentile(values, 50) == 50.0
+        assert percentile([], 95) == 0.0
+
+
+class TestSharedBrowserPool:
+    """Test cases for the synchronous pool front end."""
+
+    def test_capture_from_threads(self):
+        """The pool starts on first use and can be closed and reopened."""
+        shared = SharedBrowserPool(size=2, max_memory_mb=None)
+
+        with (
+            patch.object(screenshot_pool, "LocalScreenshotCapture", FakeBrowser),
+            patch.object(
+                screenshot_pool, "render_screenshot", AsyncMock(return_value=True)
+            ),
+        ):
+            assert shared.stats() == {}
+            result = shared.capture("https://example.com", "/tmp/x.png")
+            results = shared.capture_many([("https://example.com/a", "/tmp/a.png")] * 3)
+            shared.close()
+
+        assert result.success is True
+        assert len(results) == 3
+        assert shared._pool is None
+
+    def test_capture_screenshot_pooled(self):
+        """The sync helper converts the timeout and returns a bool."""
+        shared = MagicMock()
+        shared.capture.return_value = MagicMock(success=True)
+
+        with patch.object(
+            screenshot_pool, "get_shared_browser_pool", return_value=shared
+        ):
+            assert capture_screenshot_pooled(
+                "https://example.com", "/tmp/x.png", timeout=30000
+            )
+
+        assert shared.capture.call_args[1]["timeout"] == 30
+
+    def test_capture_screenshot_pooled_start_failure(self):
+        """A browser that fails to launch reports False."""
+        shared = MagicMock()
+        shared.capture.side_effect = Exception("Playwright not installed")
+
+        with patch.object(
+            screenshot_pool, "get_shared_browser_pool", return_value=shared
+        ):
+            assert not capture_screenshot_pooled("https://example.com", "/tmp/x.png")
@@ -0,0 +1,388 @@
+"""
+Unit tests for the micro-batch pipeline runner.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from leadfactory.pipeline import stream_runner
+from leadfactory.pipeline.stream_runner import StreamRunner, StreamStage
+
+
+class StageStatusStore:
+    """In-memory processing_status with the claim semantics of the SQL."""
+
+    def __init__(self):
+        self.rows = {}
+        self.businesses = []
+        self.lock = threading.Lock()
+
+    def set(self, business_id, stage, status, age=0.0):
+        self.rows[(business_id, stage)] = [status, time.monotonic() - age]
+
+    def status(self, business_id, stage):
+        row = self.rows.get((business_id, stage))
+        return row[0] if row else None
+
+    def add_businesses(self, business_ids):
+        with self.lock:
+            self.businesses.extend(business_ids)
+
+    def get_max_business_id(self):
+        with self.lock:
+            return max(self.businesses, default=0)
+
+    def seed_stage_status(self, stage, after_id=0, status="pending"):
+        with self.lock:
+            seeded = [
+                business_id
+                for business_id in sorted(self.businesses)
+                if business_id > after_id and (business_id, stage) not in self.rows
+            ]
+            for business_id in seeded:
+                self.set(business_id, stage, status)
+            return seeded
+
+    def claim_stage_batch(self, stage, batch_size, lease_seconds=900):
+        with self.lock:
+            expired = time.monotonic() - lease_seconds
+            claimed = [
+                business_id
+                for (business_id, row_stage), (status, updated) in sorted(
+                    self.rows.items()
+                )
+                if row_stage == stage
+                and (
+                    status == "pending"
+                    or (status == "processing" and updated < expired)
+                )
+            ][:batch_size]
+            for business_id in claimed:
+                self.set(business_id, stage, "processing")
+            return claimed
+
+    def complete_stage_batch(
+        self, stage, outcomes, next_stage=None, next_status="processing"
+    ):
+        with self.lock:
+            for business_id, status in outcomes:
+                if self.status(business_id, stage) == "processing":
+                    self.set(business_id, stage, status)
+            if not next_stage:
+                return []
+            queued = []
+            for business_id, _ in outcomes:
+                if (
+                    self.status(business_id, stage) == "completed"
+                    and (business_id, next_stage) not in self.rows
+                ):
+                    self.set(business_id, next_stage, next_status)
+                    queued.append(business_id)
+            return sorted(queued)
+
+
+class Recorder:
+    """Stage processor that records batches and returns fixed statuses."""
+
+    def __init__(self, name, log, statuses=None, delay=0.0):
+        self.name = name
+        self.log = log
+        self.statuses = statuses or {}
+        self.delay = delay
+        self.batches = []
+
+    def __call__(self, business_ids):
+        self.log.append(("start", self.name, time.perf_counter()))
+        time.sleep(self.delay)
+        self.batches.append(list(business_ids))
+        self.log.append(("end", self.name, time.perf_counter()))
+        return {
+            business_id: self.statuses.get(business_id, "completed")
+            for business_id in business_ids
+        }
+
+    @property
+    def processed(self):
+        return [business_id for batch in self.batches for business_id in batch]
+
+
+def make_stages(log, names=("enrich", "score", "email"), **overrides):
+    recorders = {name: overrides.get(name) or Recorder(name, log) for name in names}
+    return recorders, [StreamStage(name, recorders[name]) for name in names]
+
+
+def run(store, stages, **options):
+    options.setdefault("poll_seconds", 0.01)
+    return StreamRunner(stages, storage=store, **options).run()
+
+
+class TestStreamRunner:
+    """Test claiming, hand-off, backpressure and resume."""
+
+    def test_businesses_flow_through_every_stage(self):
+        store = StageStatusStore()
+        log = []
+
+        def source(notify):
+            for first in range(1, 31, 10):
+                store.add_businesses(range(first, first + 10))
+                notify()
+
+        def score(business_ids):
+            if 7 in business_ids:
+                raise RuntimeError("scoring down")
+            return {business_id: "completed" for business_id in business_ids}
+
+        recorders, stages = make_stages(
+            log,
+            enrich=Recorder("enrich", log, statuses={3: "skipped", 4: "failed"}),
+            score=score,
+        )
+        result = run(store, stages, source=source, batch_size=4)
+
+        emailed = sorted(recorders["email"].processed)
+        # 3 skipped and 4 failed at enrich; 7's whole score batch failed
+        assert emailed == [i for i in range(1, 31) if i not in (3, 4, 5, 6, 7, 8)]
+        assert store.status(3, "enrich") == "skipped"
+        assert store.status(4, "enrich") == "failed"
+        assert store.status(3, "score") is None
+        assert store.status(8, "score") == "failed"
+        assert all(store.status(i, "email") == "completed" for i in emailed)
+        assert all(len(batch) <= 4 for batch in recorders["enrich"].batches)
+
+        assert result.stages["enrich"].skipped == 1
+        assert result.stages["enrich"].failed == 1
+        assert result.stages["score"].failed == 4
+        assert result.outputs == len(emailed)
+        assert 0 < result.first_output_seconds <= result.elapsed_seconds
+
+    def test_stages_overlap_with_source(self):
+        store = StageStatusStore()
+        log = []
+        source_done = []
+
+        def source(notify):
+            for first in range(1, 41, 10):
+                store.add_businesses(range(first, first + 10))
+                notify()
+                time.sleep(0.05)
+            source_done.append(time.perf_counter())
+
+        _, stages = make_stages(log)
+        run(store, stages, source=source, batch_size=10)
+
+        first_email = next(t for kind, name, t in log if name == "email")
+        assert first_email < source_done[0]
+
+    def test_backpressure_holds_back_upstream(self):
+        store = StageStatusStore()
+        log = []
+        seeded = []
+
+        def source(notify):
+            for business_id in range(1, 21):
+                store.add_businesses([business_id])
+                notify()
+                seeded.append(
+                    sum(1 for kind, name, _ in log if (kind, name) == ("end", "email"))
+                )
+
+        _, stages = make_stages(
+            log, names=("enrich", "email"), email=Recorder("email", log, delay=0.02)
+        )
+        run(store, stages, source=source, batch_size=1, queue_size=1)
+
+        # Enrich can only run a few batches ahead of the slow email stage, so
+        # the source cannot finish seeding long before email catches up
+        assert seeded[-1] >= 20 - 6
+
+    def test_resumes_from_stage_state(self):
+        store = StageStatusStore()
+        # A crashed run left 1 mid-score with an expired lease, 2 waiting for
+        # score, 3 held by a live worker elsewhere and 4 already emailed
+        store.set(1, "score", "processing", age=60)
+        store.set(2, "score", "pending")
+        store.set(3, "score", "processing", age=1)
+        store.set(4, "email", "completed")
+        log = []
+
+        recorders, stages = make_stages(log)
+        run(store, stages, lease_seconds=30)
+
+        assert recorders["enrich"].processed == []
+        assert sorted(recorders["score"].processed) == [1, 2]
+        assert sorted(recorders["email"].processed) == [1, 2]
+        assert store.status(3, "score") == "processing"
+
+    def test_concurrent_workers_never_share_a_business(self):
+        store = StageStatusStore()
+        for business_id in range(1, 101):
+            store.set(business_id, "enrich", "pending")
+        log = []
+        enrich = Recorder("enrich", log, delay=0.005)
+        stages = [StreamStage("enrich", enrich, workers=4)]
+
+        runners = [
+            threading.Thread(target=run, args=(store, stages), kwargs={"batch_size": 3})
+            for _ in range(2)
+        ]
+        for runner in runners:
+            runner.start()
+        for runner in runners:
+            runner.join()
+
+        assert sorted(enrich.processed) == list(range(1, 101))
+
+    def test_barrier_mode_runs_stages_one_after_another(self):
+        store = StageStatusStore()
+        log = []
+
+        def source(notify):
+            store.add_businesses(range(1, 21))
+            notify()
+
+        recorders, stages = make_stages(log)
+        result = run(store, stages, source=source, batch_size=5, barrier=True)
+
+        order = [name for kind, name, _ in log if kind == "start"]
+        assert order == ["enrich"] * 4 + ["score"] * 4 + ["email"] * 4
+        assert sorted(recorders["email"].processed) == list(range(1, 21))
+        assert result.outputs == 20
+
+    def test_storage_without_claims_rejected(self):
+        with pytest.raises(RuntimeError, match="claiming"):
+            StreamRunner([StreamStage("enrich", len)], storage=object())
+
+
+class TestDefaultProcessors:
+    """Test the processors wrapping the existing stage functions."""
+
+    def test_enrich_batch_skips_missing_businesses(self):
+        storage = MagicMock()
+        storage.get_businesses_by_ids.return_value = [{"id": 1}, {"id": 2}]
+
+        with (
+            patch("leadfactory.storage.factory.get_storage", return_value=storage),
+            patch(
+                "leadfactory.pipeline.enrich.enrich_business",
+                side_effect=lambda business: business["id"] == 1,
+            ),
+        ):
+            statuses = stream_runner.enrich_batch([1, 2, 3])
+
+        assert statuses == {1: "completed", 2: "failed", 3: "skipped"}
+
+    def test_dedupe_batch_skips_merged_businesses(self):
+        cluster = MagicMock(primary_id=1, secondary_ids=[2, 9])
+        deduplicator = MagicMock()
+        deduplicator.resolve_clusters.return_value = ([cluster], {})
+        deduplicator.merge_clusters.return_value = {"merged": 2, "errors": 0}
+
+        with (
+            patch(
+                "leadfactory.pipeline.dedupe_blocking.ensure_block_index",
+                return_value=True,
+            ),
+            patch(
+                "leadfactory.utils.e2e_db_connector.get_blocked_duplicate_pairs",
+                return_value=[{"business1_id": 1, "business2_id": 2}],
+            ) as get_pairs,
+            patch("leadfactory.config.dedupe_config.load_dedupe_config"),
+            patch(
+                "leadfactory.pipeline.dedupe_performance.OptimizedDeduplicator",
+                return_value=deduplicator,
+            ),
+        ):
+            statuses = stream_runner.dedupe_batch([1, 2, 3])
+
+        assert statuses == {1: "completed", 2: "skipped", 3: "completed"}
+        assert get_pairs.call_args.kwargs["business_ids"] == [1, 2, 3]
+
+    def test_dedupe_batch_without_complete_index_uses_self_join(self):
+        deduplicator = MagicMock()
+        deduplicator.resolve_clusters.return_value = ([], {})
+
+        with (
+            patch(
+                "leadfactory.pipeline.dedupe_blocking.ensure_block_index",
+                return_value=False,
+            ),
+            patch(
+                "leadfactory.utils.e2e_db_connector.get_blocked_duplicate_pairs"
+            ) as get_blocked,
+            patch(
+                "leadfactory.utils.e2e_db_connector.get_potential_duplicate_pairs",
+                return_value=[
+                    {"business1_id": 1, "business2_id": 7},
+                    {"business1_id": 8, "business2_id": 9},
+                ],
+            ) as get_all,
+            patch("leadfactory.config.dedupe_config.load_dedupe_config"),
+            patch(
+                "leadfactory.pipeline.dedupe_performance.OptimizedDeduplicator",
+                return_value=deduplicator,
+            ),
+        ):
+            stream_runner.dedupe_batch([1, 2])
+
+        get_blocked.assert_not_called()
+        assert get_all.call_args.kwargs == {"use_blocking": False}
+        deduplicator.resolve_clusters.assert_called_once_with(
+            [{"business1_id": 1, "business2_id": 7}]
+        )
+
+    def test_score_batch_skips_below_threshold(self):
+        storage = MagicMock()
+        storage.get_businesses_by_ids.return_value = [
+            {"id": 1, "score": 80},
+            {"id": 2, "score": 20},
+        ]
+
+        with (
+            patch("leadfactory.storage.factory.get_storage", return_value=storage),
+            patch(
+                "leadfactory.pipeline.score.score_business",
+                side_effect=lambda business: business["score"],
+            ),
+            patch("leadfactory.pipeline.score.save_business_score", return_value=True),
+        ):
+            score_batch = stream_runner.make_score_batch(audit_threshold=50)
+            statuses = score_batch([1, 2])
+
+        assert statuses == {1: "completed", 2: "skipped"}
+
+    def test_email_batch_sends_concurrently(self):
+        in_flight = []
+        storage = MagicMock()
+        storage.get_emailed_business_ids.return_value = {4}
+
+        async def send(business_id, dry_run, force):
+            import asyncio
+
+            assert force is False
+            in_flight.append(business_id)
+            await asyncio.sleep(0.01)
+            if business_id == 3:
+                raise RuntimeError("bounced")
+            return business_id != 2 and len(in_flight) == 3
+
+        with (
+            patch("leadfactory.storage.factory.get_storage", return_value=storage),
+            patch(
+                "leadfactory.pipeline.email_queue.process_business_email",
+                side_effect=send,
+            ),
+        ):
+            email_batch = stream_runner.make_email_batch(dry_run=True)
+            statuses = email_batch([1, 2, 3, 4])
+
+        # 4 was emailed before its lease expired and is not sent again
+        assert statuses == {1: "completed", 2: "failed", 3: "failed", 4: "skipped"}
+        assert sorted(in_flight) == [1, 2, 3]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,244 @@
+"""
+Unit tests for compiled scoring rules and batch scoring.
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+import yaml
+
+from leadfactory.scoring import ScoringEngine
+from leadfactory.scoring.rule_compiler import BusinessView, RuleCompiler
+from leadfactory.scoring.rule_evaluator import RuleEvaluator
+from leadfactory.scoring.yaml_parser import RuleCondition, ScoringRule
+
+DEFAULT_RULES = Path(__file__).parents[3] / "etc" / "scoring_rules.yml"
+
+LEAF_CONDITIONS = [
+    {"tech_stack_contains": "jquery"},
+    {"tech_stack_contains": "React"},
+    {"tech_stack_contains_any": ["Vue", "wordpress"]},
+    {"tech_stack_version_lt": {"technology": "jQuery", "version": "3.0.0"}},
+    {"tech_stack_version_gt": {"technology": "jQuery", "version": "2.1"}},
+    {"tech_stack_version_lt": {"technology": "PHP", "version": "beta"}},
+    {"vertical_in": ["HVAC", "plumb"]},
+    {"vertical_not_in": ["saas"]},
+    {"location_in": ["ny", "Texas"]},
+    {"location_not_in": ["CA"]},
+    {"employee_count_gt": 10},
+    {"employee_count_lt": 50},
+    {"revenue_gt": 100000.0},
+    {"founded_year_lt": 2000},
+    {"has_social_media": ["Facebook", "twitter"]},
+    {"social_followers_gt": {"facebook": 1000, "twitter": 500}},
+    {"social_engagement_gt": {"facebook": 0.05}},
+    {"has_contact_form": True},
+    {"has_phone_number": False},
+    {"has_email": True},
+    {"page_count_gt": 5},
+    {"page_count_lt": 3},
+    {"tech_stack_contains": "React", "employee_count_gt": 100},
+    {},
+]
+
+TECH_STACKS = [
+    ["jQuery 2.1.4", "WordPress"],
+    ["React", "Node.js"],
+    ["jquery-3.6.0.min.js", 42],
+    {"jQuery": "1.12.4", "PHP": "7.4"},
+    {"jQuery": "3.6", "Vue": "beta"},
+    {"Ruby": None},
+    "React",
+    None,
+    [],
+]
+
+
+def random_business(rng, business_id):
+    business = {"id": business_id, "name": f"Business {business_id}"}
+    optional = {
+        "tech_stack": lambda: rng.choice(TECH_STACKS),
+        "vertical": lambda: rng.choice(["HVAC", "Plumbing", "SaaS", None, 7]),
+        "city": lambda: rng.choice(["New York", "Austin", "Los Angeles"]),
+        "state": lambda: rng.choice(["NY", "TX", "CA", None]),
+        "address": lambda: rng.choice(["1 Main St, Albany NY", "2 Elm St", None]),
+        "employee_count": lambda: rng.choice([5, 25, 250, "40", "n/a", None]),
+        "revenue": lambda: rng.choice([50000, 250000.5, "1e6", None]),
+        "founded_year": lambda: rng.choice([1985, 2010, None]),
+        "social_media": lambda: rng.choice(
+            [
+                {"facebook": {"followers": 2000, "engagement": 0.1}},
+                {"Twitter": {"followers": "300"}, "facebook": "page"},
+                ["Facebook", "Instagram"],
+                {"facebook": {"followers": None}},
+                "none",
+            ]
+        ),
+        "has_contact_form": lambda: rng.choice([True, False]),
+        "has_phone_number": lambda: rng.choice([True, False]),
+        "has_email": lambda: rng.choice([True, False]),
+        "page_count": lambda: rng.choice([1, 4, 12, "many"]),
+    }
+    for field, make in optional.items():
+        if rng.random() < 0.8:
+            business[field] = make()
+    return business
+
+
+def random_condition(rng, depth=0):
+    if depth < 2 and rng.random() < 0.3:
+        key = rng.choice(["all_of", "any_of", "none_of"])
+        return {
+            key: [random_condition(rng, depth + 1) for _ in range(rng.randint(1, 3))]
+        }
+    return dict(rng.choice(LEAF_CONDITIONS))
+
+
+def interpreted(evaluator, business, condition):
+    try:
+        return bool(evaluator._evaluate_condition(business, condition))
+    except Exception:
+        return False
+
+
+def write_config(tmp_path, rules, multipliers=()):
+    config_file = tmp_path / "rules.yml"
+    config = {
+        "settings": {
+            "base_score": 50,
+            "min_score": 0,
+            "max_score": 100,
+            "high_score_threshold": 75,
+        },
+        "rules": rules,
+        "multipliers": list(multipliers),
+    }
+    config_file.write_text(yaml.dump(config))
+    return str(config_file)
+
+
+class TestRuleCompiler:
+    """Test that compiled predicates agree with RuleEvaluator."""
+
+    def test_randomized_equivalence_with_interpreter(self):
+        rng = random.Random(1234)
+        evaluator = RuleEvaluator()
+        compiler = RuleCompiler(evaluator)
+        businesses = [random_business(rng, i) for i in range(200)]
+
+        for _ in range(300):
+            condition = RuleCondition(**random_condition(rng))
+            rule = ScoringRule(name="rule", condition=condition, score=5)
+            compiled = compiler.compile_rules([rule])[0]
+
+            for business in businesses:
+                assert compiled.matches(BusinessView(business)) == interpreted(
+                    evaluator, business, condition
+                ), (condition, business)
+
+    def test_invalid_sub_condition_falls_back_to_interpreter(self):
+        condition = RuleCondition(
+            any_of=[{"tech_stack_contains": "React"}, {"employee_count_gt": "lots"}]
+        )
+        rule = ScoringRule(name="fallback", condition=condition, score=5)
+        compiled = RuleCompiler().compile_rules([rule])[0]
+
+        assert compiled.matches(BusinessView({"tech_stack": ["React"]}))
+        assert not compiled.matches(BusinessView({"tech_stack": ["Vue"]}))
+
+    def test_errors_in_business_data_do_not_match(self):
+        rule = ScoringRule(
+            name="react",
+            condition=RuleCondition(tech_stack_contains="React"),
+            score=5,
+        )
+        compiled = RuleCompiler().compile_rules([rule])[0]
+
+        assert not compiled.matches(BusinessView({"tech_stack": {1: "2.0"}}))
+
+    def test_simplified_format_keys(self):
+        compiler = RuleCompiler()
+        business = BusinessView(
+            {
+                "performance_score": 45,
+                "lcp": 3000,
+                "cls": 0.3,
+                "category": ["Restaurant"],
+                "state": "ny",
+            }
+        )
+
+        assert compiler.compile_condition({"performance_score_lt": "50"})(business)
+        assert not compiler.compile_condition({"performance_score_gt": "50"})(business)
+        assert compiler.compile_condition({"lcp_gt": 2500.0})(business)
+        assert not compiler.compile_condition({"cls_gt": "0.5"})(business)
+        assert compiler.compile_condition({"category_contains": "restaurant"})(business)
+        assert compiler.compile_condition({"category_contains_any": ["bar", "rest"]})(
+            business
+        )
+        assert compiler.compile_condition({"state_in": ["CA", "NY"]})(business)
+        assert not compiler.compile_condition({"state_equals": "TX"})(business)
+
+
+class TestScoreBatch:
+    """Test that batch scoring matches per-business scoring."""
+
+    def test_matches_score_businesses_on_default_rules(self):
+        rng = random.Random(99)
+        engine = ScoringEngine(str(DEFAULT_RULES))
+        engine.load_rules()
+        businesses = [random_business(rng, i) for i in range(300)]
+
+        assert engine.score_batch(businesses) == engine.score_businesses(businesses)
+
+    def test_matches_score_businesses_with_random_rules(self, tmp_path):
+        rng = random.Random(7)
+        rules = [
+            {
+                "name": f"rule_{i}",
+                "condition": random_condition(rng),
+                "score": rng.randint(-20, 20),
+            }
+            for i in range(25)
+        ]
+        multipliers = [
+            {
+                "name": f"multiplier_{i}",
+                "condition": random_condition(rng),
+                "multiplier": rng.choice([0.5, 1.0, 1.2, 1.5]),
+            }
+            for i in range(4)
+        ]
+        engine = ScoringEngine(write_config(tmp_path, rules, multipliers))
+        engine.load_rules()
+        businesses = [random_business(rng, i) for i in range(300)]
+        businesses[3]["ai_status"] = "AI-Uncertain"
+        businesses[5]["score_weight"] = 0.5
+        businesses[8]["score_weight"] = "heavy"
+
+        batch = engine.score_batch(businesses)
+
+        assert batch == engine.score_businesses(businesses)
+        assert batch[3]["requires_manual_review"] is True
+        assert batch[8]["score"] == 0 and "error" in batch[8]
+
+    def test_requires_loaded_rules(self):
+        with pytest.raises(RuntimeError):
+            ScoringEngine().score_batch([{"id": 1}])
+
+    def test_recompiles_when_rules_are_replaced(self, tmp_path):
+        rules = [
+            {
+                "name": "react",
+                "condition": {"tech_stack_contains": "React"},
+                "score": 10,
+            }
+        ]
+        engine = ScoringEngine(write_config(tmp_path, rules))
+        engine.load_rules()
+        business = {"id": 1, "name": "Acme", "tech_stack": ["React"]}
+        assert engine.score_batch([business])[0]["score"] == 60
+
+        engine.rules = []
+        assert engine._calculate_score(business)["score"] == 50
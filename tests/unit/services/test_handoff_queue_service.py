@@ -1,5 +1,6 @@
 """Unit tests for handoff queue service."""
 
+import threading
 import unittest
 from datetime import datetime
 from unittest.mock import MagicMock, patch
@@ -55,11 +56,11 @@ class TestHandoffQueueService(unittest.TestCase):
         )
 
         # Setup mocks
-        self.mock_qualification_engine.qualify_businesses_bulk.return_value = [
-            qualified_result, rejected_result
-        ]
+        self.mock_qualification_engine.iter_qualification_chunks.return_value = iter([
+            [qualified_result, rejected_result]
+        ])
         self.service._create_bulk_operation = MagicMock(return_value=True)
-        self.service._add_to_queue = MagicMock(return_value=1)
+        self.service._add_to_queue_bulk = MagicMock(return_value=[1])
         self.service._update_bulk_operation = MagicMock(return_value=True)
 
         # Test
@@ -67,8 +68,10 @@ class TestHandoffQueueService(unittest.TestCase):
 
         # Verify
         self.assertEqual(operation_id, "test-operation-id")
-        self.service._add_to_queue.assert_called_once()  # Only qualified business added
-        self.mock_qualification_engine.qualify_businesses_bulk.assert_called_once_with(
+        self.service._add_to_queue_bulk.assert_called_once()
+        queue_entries = self.service._add_to_queue_bulk.call_args[0][0]
+        self.assertEqual([e.business_id for e in queue_entries], [1])  # Only qualified business added
+        self.mock_qualification_engine.iter_qualification_chunks.assert_called_once_with(
             [1, 2], 1, False
         )
 
@@ -180,6 +183,89 @@ class TestHandoffQueueService(unittest.TestCase):
         self.assertEqual(entry_id, 1)
         mock_cursor.execute.assert_called_once()
 
+    @patch('leadfactory.services.handoff_queue_service.execute_values')
+    def test_add_to_queue_bulk(self, mock_execute_values):
+        """Test adding many entries to the queue with one insert."""
+        entries = [
+            HandoffQueueEntry(id=None, business_id=i, qualification_criteria_id=1)
+            for i in (1, 2, 3)
+        ]
+        mock_execute_values.return_value = [(10,), (11,), (12,)]
+
+        entry_ids = self.service._add_to_queue_bulk(entries)
+
+        self.assertEqual(entry_ids, [10, 11, 12])
+        mock_execute_values.assert_called_once()
+        rows = mock_execute_values.call_args[0][2]
+        self.assertEqual([row[0] for row in rows], [1, 2, 3])
+
+        mock_execute_values.side_effect = Exception("insert failed")
+        self.assertEqual(self.service._add_to_queue_bulk(entries), [None, None, None])
+
+    def test_bulk_qualify_records_progress_per_chunk(self):
+        """Test bulk qualification updates the operation after each chunk."""
+        def result(business_id, status):
+            return QualificationResult(
+                business_id=business_id, status=status, score=85, criteria_id=1,
+                details={}
+            )
+
+        self.mock_qualification_engine.iter_qualification_chunks.return_value = iter([
+            [result(1, QualificationStatus.QUALIFIED), result(2, QualificationStatus.REJECTED)],
+            [result(3, QualificationStatus.QUALIFIED), result(4, QualificationStatus.INSUFFICIENT_DATA)],
+        ])
+        self.service._create_bulk_operation = MagicMock(return_value=True)
+        self.service._add_to_queue_bulk = MagicMock(side_effect=[[1], [None]])
+
+        progress = []
+        self.service._update_bulk_operation = MagicMock(
+            side_effect=lambda op: progress.append(
+                (op.status, op.success_count, op.failure_count,
+                 dict(op.operation_details))
+            )
+        )
+
+        self.service.bulk_qualify([1, 2, 3, 4], 1, "test_user")
+
+        self.assertEqual(self.service._add_to_queue_bulk.call_count, 2)
+        self.assertEqual(
+            [(status, success, failure) for status, success, failure, _ in progress],
+            [("in_progress", 2, 0), ("in_progress", 3, 1), ("completed", 3, 1)],
+        )
+        self.assertEqual(
+            progress[-1][3],
+            {
+                "processed_count": 4,
+                "qualified_count": 2,
+                "rejected_count": 1,
+                "insufficient_data_count": 1,
+            },
+        )
+
+    def test_bulk_qualify_async(self):
+        """Test bulk qualification in the background returns right away."""
+        release = threading.Event()
+
+        def chunks(*args):
+            release.wait(5)
+            yield []
+
+        self.mock_qualification_engine.iter_qualification_chunks.side_effect = chunks
+        self.service._create_bulk_operation = MagicMock(return_value=True)
+        done = threading.Event()
+        self.service._update_bulk_operation = MagicMock(
+            side_effect=lambda op: op.status == "completed" and done.set()
+        )
+
+        operation_id = self.service.bulk_qualify([1], 1, run_async=True)
+
+        self.assertTrue(operation_id)
+        self.service._create_bulk_operation.assert_called_once()
+        self.assertFalse(done.is_set())
+
+        release.set()
+        self.assertTrue(done.wait(5))
+
     def test_get_queue_entry(self):
         """Test getting queue entry by ID."""
         # Mock database response
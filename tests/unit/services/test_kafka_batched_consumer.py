@@ -0,0 +1,431 @@
+"""
+Unit tests for batched Kafka consumption, keyed publishing and the
+in-memory broker.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from leadfactory.services.pipeline_services.in_memory_kafka import (
+    IllegalStateError,
+    InMemoryConsumer,
+    InMemoryKafkaBroker,
+    TopicPartition,
+)
+from leadfactory.services.pipeline_services.kafka_integration import (
+    KafkaManager,
+    OffsetTracker,
+)
+
+
+async def start_manager(**broker_options):
+    broker = InMemoryKafkaBroker(**broker_options)
+    manager = KafkaManager(broker=broker)
+    await manager.start()
+    return manager, broker
+
+
+async def consume_until(manager, handler, done, **options):
+    """Run consume_tasks_batched until done() holds, then stop it."""
+    options.setdefault("fetch_timeout_ms", 20)
+    options.setdefault("auto_offset_reset", "earliest")
+    task = asyncio.create_task(
+        manager.consume_tasks_batched(["enrich"], handler, **options)
+    )
+    for _ in range(500):
+        if done():
+            break
+        await asyncio.sleep(0.01)
+    manager.running = False
+    return await asyncio.wait_for(task, 5)
+
+
+def read_topic(broker, topic):
+    return [
+        json.loads(value)
+        for tp in broker.partitions_for(topic)
+        for key, value, timestamp in broker._logs[tp]
+    ]
+
+
+class TestOffsetTracker:
+    """Test contiguous commit positions."""
+
+    def test_commits_up_to_lowest_pending_offset(self):
+        tp = TopicPartition("enrich.requests", 0)
+        tracker = OffsetTracker()
+        for offset in range(10, 15):
+            tracker.track(tp, offset)
+
+        assert tracker.commit_offsets() == {tp: 10}
+
+        tracker.complete(tp, 12)
+        tracker.complete(tp, 13)
+        assert tracker.commit_offsets() == {tp: 10}
+
+        tracker.complete(tp, 10)
+        assert tracker.commit_offsets() == {tp: 11}
+
+        tracker.complete(tp, 11)
+        tracker.mark_committed({tp: 14})
+        assert tracker.commit_offsets() == {}
+
+        tracker.complete(tp, 14)
+        assert tracker.commit_offsets() == {tp: 15}
+
+
+class TestInMemoryKafkaBroker:
+    """Test the broker stand-in's producer and consumer behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_linger_batches_sends_into_one_request(self):
+        broker = InMemoryKafkaBroker(topics={"t": 2})
+        producer = broker.producer(value_serializer=str.encode, linger_ms=20)
+
+        deliveries = [await producer.send("t", f"m{i}", key=b"k") for i in range(5)]
+        assert broker.stats["produce_requests"] == 0
+
+        metadata = await asyncio.gather(*deliveries)
+        assert broker.stats["produce_requests"] == 1
+        assert [m.offset for m in metadata] == [0, 1, 2, 3, 4]
+        assert len({m.partition for m in metadata}) == 1
+
+    @pytest.mark.asyncio
+    async def test_group_members_split_partitions_and_resume(self):
+        broker = InMemoryKafkaBroker(topics={"t": 4})
+        producer = broker.producer()
+        for i in range(8):
+            await producer.send_and_wait("t", str(i).encode(), key=str(i).encode())
+
+        first = broker.consumer("t", group_id="g", auto_offset_reset="earliest")
+        second = broker.consumer("t", group_id="g", auto_offset_reset="earliest")
+        await first.start()
+        await second.start()
+        assert first.assignment().isdisjoint(second.assignment())
+        assert len(first.assignment() | second.assignment()) == 4
+
+        batch = await first.getmany(timeout_ms=0)
+        await first.commit()
+        await first.stop()
+        await second.stop()
+
+        # A new member resumes from the committed offsets
+        resumed = broker.consumer("t", group_id="g", auto_offset_reset="earliest")
+        await resumed.start()
+        for tp, records in batch.items():
+            assert resumed.position(tp) == records[-1].offset + 1
+
+    @pytest.mark.asyncio
+    async def test_commit_rejects_unassigned_partitions(self):
+        broker = InMemoryKafkaBroker(topics={"t": 2})
+        first = broker.consumer("t", group_id="g")
+        second = broker.consumer("t", group_id="g")
+        await first.start()
+        await second.start()
+        (owned,) = second.assignment()
+
+        with pytest.raises(IllegalStateError):
+            await first.commit({owned: 5})
+        assert broker.committed("g", owned) is None
+
+
+class TestKafkaManagerBatchedConsumer:
+    """Test batched fetch, concurrent handlers and batched commits."""
+
+    @pytest.mark.asyncio
+    async def test_tasks_keyed_by_business(self):
+        manager, broker = await start_manager(topics={"enrich.requests": 8})
+
+        await manager.publish_tasks(
+            "enrich", [{"business_id": i % 3} for i in range(30)]
+        )
+        await manager.publish_task("enrich", {"business_id": 1}, priority=1)
+
+        partitions = {}
+        for tp in broker.partitions_for("enrich.requests"):
+            for key, value, _ in broker._logs[tp]:
+                partitions.setdefault(key, set()).add(tp.partition)
+        assert set(partitions) == {b"0", b"1", b"2"}
+        assert all(len(used) == 1 for used in partitions.values())
+        # Thirty tasks went out in a single batched produce request
+        assert broker.stats["produce_requests"] == 2
+
+    @pytest.mark.asyncio
+    async def test_preserves_order_per_key_and_bounds_concurrency(self):
+        manager, broker = await start_manager(topics={"enrich.requests": 2})
+        await manager.publish_tasks(
+            "enrich",
+            [{"business_id": i % 4, "seq": i} for i in range(40)],
+        )
+
+        seen = {}
+        running = []
+        peak = []
+
+        async def handler(message):
+            running.append(message)
+            peak.append(len(running))
+            await asyncio.sleep(0.005)
+            running.remove(message)
+            seen.setdefault(message.payload["business_id"], []).append(
+                message.payload["seq"]
+            )
+
+        stats = await consume_until(
+            manager,
+            handler,
+            lambda: sum(map(len, seen.values())) == 40,
+            concurrency=3,
+        )
+
+        assert stats["processed"] == 40
+        assert max(peak) == 3
+        for business_id, sequence in seen.items():
+            assert sequence == sorted(sequence)
+            assert len(sequence) == 10
+
+    @pytest.mark.asyncio
+    async def test_commits_once_per_batch_past_slow_records(self):
+        manager, broker = await start_manager(topics={"enrich.requests": 1})
+        await manager.publish_tasks("enrich", [{"business_id": i} for i in range(20)])
+        tp = TopicPartition("enrich.requests", 0)
+        release = asyncio.Event()
+        handled = []
+        committed_while_blocked = []
+
+        async def handler(message):
+            # Business 5 is slow; everything after it finishes first
+            if message.payload["business_id"] == 5:
+                await release.wait()
+            handled.append(message.payload["business_id"])
+
+        async def release_later():
+            while len(handled) < 19:
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+            committed_while_blocked.append(broker.committed("pipeline_workers", tp))
+            release.set()
+
+        releaser = asyncio.create_task(release_later())
+        stats = await consume_until(
+            manager, handler, lambda: len(handled) == 20, max_records=50
+        )
+        await releaser
+
+        # Never committed past the slow record before it finished
+        assert committed_while_blocked == [5]
+        assert broker.committed("pipeline_workers", tp) == 20
+        assert stats["batches"] == 1
+        assert stats["commits"] <= 4
+
+    @pytest.mark.asyncio
+    async def test_failed_messages_are_retried_then_sent_to_errors(self):
+        manager, broker = await start_manager(topics={"enrich.requests": 2})
+        await manager.publish_task("enrich", {"business_id": 1}, max_retries=1)
+        await manager.publish_task("enrich", {"business_id": 2})
+        attempts = []
+
+        async def handler(message):
+            attempts.append(message.payload["business_id"])
+            if message.payload["business_id"] == 1:
+                raise RuntimeError("enrichment API down")
+
+        stats = await consume_until(manager, handler, lambda: len(attempts) == 3)
+
+        assert sorted(attempts) == [1, 1, 2]
+        assert stats["processed"] == 1
+        assert stats["failed"] == 2
+        errors = read_topic(broker, "pipeline.errors")
+        assert len(errors) == 1
+        assert errors[0]["original_message"]["retry_count"] == 1
+        assert errors[0]["error"] == "enrichment API down"
+
+    @pytest.mark.asyncio
+    async def test_rebalance_commits_revoked_partitions_and_moves_on(self, caplog):
+        manager, broker = await start_manager(topics={"enrich.requests": 4})
+        await manager.publish_tasks(
+            "enrich", [{"business_id": i % 40, "seq": i} for i in range(200)]
+        )
+        joiner = KafkaManager(broker=broker)
+        await joiner.start()
+
+        committed = {}
+
+        class MonotonicOffsets(dict):
+            def __setitem__(self, key, offset):
+                assert offset >= self.get(key, 0), f"{key} rolled back"
+                committed[key] = offset
+                super().__setitem__(key, offset)
+
+        broker._committed = MonotonicOffsets()
+        seen = {}
+
+        async def handler(message):
+            await asyncio.sleep(0.002)
+            seen.setdefault(message.payload["business_id"], []).append(
+                message.payload["seq"]
+            )
+
+        options = {
+            "fetch_timeout_ms": 20,
+            "auto_offset_reset": "earliest",
+            "max_records": 20,
+            "concurrency": 4,
+        }
+        first = asyncio.create_task(
+            manager.consume_tasks_batched(["enrich"], handler, **options)
+        )
+        while sum(map(len, seen.values())) < 40:
+            await asyncio.sleep(0.005)
+        second = asyncio.create_task(
+            joiner.consume_tasks_batched(["enrich"], handler, **options)
+        )
+        while sum(map(len, seen.values())) < 200:
+            await asyncio.sleep(0.01)
+        manager.running = joiner.running = False
+        first_stats, second_stats = await asyncio.gather(first, second)
+
+        # Each record handled exactly once, in order per business, and every
+        # partition committed to its end with no failed commits
+        assert all(
+            sequence == sorted(sequence) and len(sequence) == 5
+            for sequence in seen.values()
+        )
+        for tp in broker.partitions_for("enrich.requests"):
+            assert committed[("pipeline_workers", tp)] == broker.end_offset(tp)
+        assert second_stats["processed"] > 0
+        assert first_stats["processed"] + second_stats["processed"] == 200
+        assert "failed" not in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_in_flight_records_before_closing(self, caplog):
+        manager, broker = await start_manager(topics={"enrich.requests": 2})
+        await manager.publish_tasks("enrich", [{"business_id": i} for i in range(6)])
+        started = []
+        release = asyncio.Event()
+
+        async def handler(message):
+            started.append(message.payload["business_id"])
+            await release.wait()
+            if message.payload["business_id"] == 0 and message.retry_count == 0:
+                raise RuntimeError("enrichment API down")
+
+        task = asyncio.create_task(
+            manager.consume_tasks_batched(
+                ["enrich"], handler, fetch_timeout_ms=20, auto_offset_reset="earliest"
+            )
+        )
+        while len(started) < 6:
+            await asyncio.sleep(0.005)
+
+        stopping = asyncio.create_task(manager.stop())
+        await asyncio.sleep(0.05)
+        assert not stopping.done()
+        release.set()
+        await asyncio.wait_for(stopping, 5)
+
+        assert task.done()
+        stats = task.result()
+        assert stats["processed"] == 5
+        assert stats["failed"] == 1
+        # The retry went out before the producer closed, and every partition
+        # was committed before the consumer left the group
+        retries = [
+            message
+            for message in read_topic(broker, "enrich.requests")
+            if message["retry_count"]
+        ]
+        assert [message["payload"]["business_id"] for message in retries] == [0]
+        for tp in broker.partitions_for("enrich.requests"):
+            originals = sum(
+                1
+                for _, value, _ in broker._logs[tp]
+                if json.loads(value)["retry_count"] == 0
+            )
+            assert broker.committed("pipeline_workers", tp) == (originals or None)
+        assert "Final commit" not in caplog.text
+        assert "Could not requeue" not in caplog.text
+        assert manager.consumers == {}
+
+    @pytest.mark.asyncio
+    async def test_fetch_error_cancels_in_flight_and_stop_returns(self, monkeypatch):
+        manager, broker = await start_manager(topics={"enrich.requests": 1})
+        await manager.publish_tasks("enrich", [{"business_id": i} for i in range(3)])
+        started = []
+        cancelled = []
+
+        async def handler(message):
+            started.append(message.payload["business_id"])
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(message.payload["business_id"])
+                raise
+
+        real_getmany = InMemoryConsumer.getmany
+
+        async def failing_getmany(consumer, *args, **kwargs):
+            if started:
+                raise RuntimeError("broker unreachable")
+            return await real_getmany(consumer, *args, **kwargs)
+
+        monkeypatch.setattr(InMemoryConsumer, "getmany", failing_getmany)
+        stats = await asyncio.wait_for(
+            manager.consume_tasks_batched(
+                ["enrich"], handler, fetch_timeout_ms=20, auto_offset_reset="earliest"
+            ),
+            5,
+        )
+
+        assert stats["processed"] == 0
+        assert sorted(cancelled) == sorted(started)
+        # Nothing finished, so nothing was committed past the first record
+        tp = TopicPartition("enrich.requests", 0)
+        assert broker.committed("pipeline_workers", tp) in (None, 0)
+        assert manager.consumers == {}
+        await asyncio.wait_for(manager.stop(), 5)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_consumer_does_not_block_stop(self):
+        manager, broker = await start_manager(topics={"enrich.requests": 2})
+        await manager.publish_tasks("enrich", [{"business_id": i} for i in range(4)])
+        started = []
+
+        async def handler(message):
+            started.append(message.payload["business_id"])
+            await asyncio.Event().wait()
+
+        task = asyncio.create_task(
+            manager.consume_tasks_batched(
+                ["enrich"], handler, fetch_timeout_ms=20, auto_offset_reset="earliest"
+            )
+        )
+        while len(started) < 4:
+            await asyncio.sleep(0.005)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert manager.consumers == {}
+        await asyncio.wait_for(manager.stop(), 5)
+
+    @pytest.mark.asyncio
+    async def test_mock_mode_without_kafka(self, monkeypatch):
+        monkeypatch.setattr(
+            "leadfactory.services.pipeline_services.kafka_integration.KAFKA_AVAILABLE",
+            False,
+        )
+        manager = KafkaManager()
+        await manager.start()
+
+        ids = await manager.publish_tasks("enrich", [{"business_id": 1}])
+        stats = await manager.consume_tasks_batched(["enrich"], handler=None)
+
+        assert len(ids) == 1
+        assert stats["processed"] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -368,6 +368,83 @@ class TestMockupPNGUploaderUnit:
         result = uploader._is_url_expired("invalid-date", expiry_hours=20)
         assert result is True  # Should assume expired for safety
 
+    def test_upload_skipped_for_already_uploaded_image(self, uploader, test_image_path):
+        """An image whose hash was uploaded before is linked, not uploaded."""
+        content_hash = uploader._calculate_file_hash(test_image_path)
+        uploader.storage.get_business.return_value = {"id": 456}
+        uploader.storage.get_assets_by_content_hash.return_value = [
+            {
+                "business_id": 123,
+                "file_path": "/tmp/leadfactory_assets/ab/local.png",
+                "content_hash": content_hash,
+            },
+            {
+                "business_id": 123,
+                "file_path": "mockups/123/homepage_20250101_000000_abcd1234.png",
+                "url": "https://cdn.com/existing",
+                "content_hash": content_hash,
+                "created_at": datetime.utcnow().isoformat(),
+            },
+        ]
+        uploader.storage.create_asset.return_value = True
+
+        result = uploader.upload_mockup_png(test_image_path, 456)
+
+        assert result.success is True
+        assert result.deduplicated is True
+        assert result.storage_path.startswith("mockups/123/")
+        assert result.cdn_url == "https://cdn.com/existing"
+        uploader.supabase_storage.upload_file.assert_not_called()
+        uploader.storage.get_assets_by_content_hash.assert_called_once_with(
+            content_hash, "mockup"
+        )
+        call_args = uploader.storage.create_asset.call_args
+        assert call_args[1]["business_id"] == 456
+        assert call_args[1]["content_hash"] == content_hash
+
+    def test_upload_skipped_when_business_already_linked(
+        self, uploader, test_image_path
+    ):
+        """Re-uploading a business's own mockup creates no new asset."""
+        uploader.storage.get_business.return_value = {"id": 123}
+        uploader.storage.get_assets_by_content_hash.return_value = [
+            {
+                "business_id": 123,
+                "file_path": "mockups/123/homepage.png",
+                "url": "https://cdn.com/old",
+                "created_at": "2023-01-01T00:00:00",
+            }
+        ]
+        uploader.supabase_storage.generate_secure_report_url.return_value = {
+            "signed_url": "https://cdn.com/fresh"
+        }
+
+        result = uploader.upload_mockup_png(test_image_path, 123)
+
+        assert result.success is True
+        assert result.cdn_url == "https://cdn.com/fresh"
+        uploader.supabase_storage.upload_file.assert_not_called()
+        uploader.storage.create_asset.assert_not_called()
+
+    def test_new_image_is_uploaded_with_hash(self, uploader, test_image_path):
+        """An image not uploaded before is uploaded and its hash recorded."""
+        uploader.storage.get_business.return_value = {"id": 123}
+        uploader.storage.get_assets_by_content_hash.return_value = []
+        uploader.storage.create_asset.return_value = True
+        uploader.supabase_storage.generate_secure_report_url.return_value = {
+            "signed_url": "https://cdn.com/new"
+        }
+
+        result = uploader.upload_mockup_png(test_image_path, 123, optimize=False)
+
+        assert result.success is True
+        assert result.deduplicated is False
+        uploader.supabase_storage.upload_file.assert_called_once()
+        call_args = uploader.storage.create_asset.call_args
+        assert call_args[1]["content_hash"] == uploader._calculate_file_hash(
+            test_image_path
+        )
+
 
 class TestMockupUploadResult:
     """Unit tests for MockupUploadResult dataclass."""
@@ -466,6 +543,5 @@ if __name__ == "__main__":
         )
         assert metadata.business_id == 123
 
-
     except Exception:
         pass
@@ -0,0 +1,375 @@
+"""
+Unit tests for DAG-parallel and streaming execution in PipelineOrchestrator.
+"""
+
+import asyncio
+
+import pytest
+
+from leadfactory.services.pipeline_services.base_service import ServiceRegistry
+from leadfactory.services.pipeline_services.orchestrator import (
+    PipelineOrchestrator,
+    PipelineStage,
+    WorkflowDefinition,
+)
+
+
+class FakeServices:
+    """Stands in for _post_task, recording calls and concurrency."""
+
+    def __init__(self, handlers=None, delay=0.01):
+        self.handlers = handlers or {}
+        self.delay = delay
+        self.calls = []
+        self.events = []
+        self.running = {}
+        self.max_running = {}
+
+    async def __call__(self, service_url, request_data, timeout_seconds):
+        stage = request_data["metadata"]["stage_name"]
+        self.calls.append((stage, request_data))
+        self.running[stage] = self.running.get(stage, 0) + 1
+        self.max_running[stage] = max(
+            self.max_running.get(stage, 0), self.running[stage]
+        )
+        self.events.append(("start", stage))
+        try:
+            handler = self.handlers.get(stage)
+            result = handler(request_data["metadata"]) if handler else {}
+            if asyncio.iscoroutine(result):
+                result = await result
+            else:
+                await asyncio.sleep(self.delay)
+            return result
+        finally:
+            self.running[stage] -= 1
+            self.events.append(("end", stage))
+
+    def batches(self, stage):
+        return [
+            request["metadata"]["business_ids"]
+            for name, request in self.calls
+            if name == stage
+        ]
+
+
+def make_orchestrator(stages, services, **workflow_options):
+    registry = ServiceRegistry()
+    for port, stage in enumerate(stages, start=9000):
+        registry.register_service(stage.service_name, "localhost", port)
+    orchestrator = PipelineOrchestrator(registry)
+    orchestrator.workflows["test"] = WorkflowDefinition(
+        name="test", version="1.0.0", stages=stages, **workflow_options
+    )
+    orchestrator._post_task = services
+    return orchestrator
+
+
+def stage(name, dependencies=(), **options):
+    options.setdefault("retry_attempts", 0)
+    return PipelineStage(
+        name=name, service_name=name, dependencies=list(dependencies), **options
+    )
+
+
+async def execute(orchestrator, input_data=None):
+    return await orchestrator.execute_workflow(
+        "test", input_data or {}, execution_id="run"
+    )
+
+
+class TestParallelExecution:
+    """Test dependency-driven parallel stage execution."""
+
+    @pytest.mark.asyncio
+    async def test_independent_stages_overlap(self):
+        services = FakeServices(delay=0.05)
+        stages = [
+            stage("scrape"),
+            stage("enrich", ["scrape"]),
+            stage("screenshot", ["scrape"]),
+            stage("score", ["enrich", "screenshot"]),
+        ]
+        orchestrator = make_orchestrator(stages, services, parallel_execution=True)
+
+        results = await execute(orchestrator)
+
+        assert set(results) == {"scrape", "enrich", "screenshot", "score"}
+        events = services.events
+        # enrich and screenshot both start before either finishes
+        assert events[2:4] == [("start", "enrich"), ("start", "screenshot")]
+        assert events[-2:] == [("start", "score"), ("end", "score")]
+        context = orchestrator.get_execution_status("run")
+        assert context["status"] == "completed"
+        assert set(context["stage_metrics"]) == set(results)
+
+    @pytest.mark.asyncio
+    async def test_previous_results_passed_on(self):
+        services = FakeServices(
+            handlers={"scrape": lambda metadata: {"business_ids": [1, 2]}}
+        )
+        orchestrator = make_orchestrator(
+            [stage("scrape"), stage("enrich", ["scrape"])],
+            services,
+            parallel_execution=True,
+        )
+
+        await execute(orchestrator)
+
+        previous = services.calls[1][1]["metadata"]["previous_results"]
+        assert previous == {"scrape": {"business_ids": [1, 2]}}
+
+    @pytest.mark.asyncio
+    async def test_required_failure_stops_workflow(self):
+        def fail(metadata):
+            raise RuntimeError("boom")
+
+        services = FakeServices(handlers={"enrich": fail})
+        orchestrator = make_orchestrator(
+            [stage("scrape"), stage("enrich", ["scrape"]), stage("score", ["enrich"])],
+            services,
+            parallel_execution=True,
+        )
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await execute(orchestrator)
+
+        assert "score" not in [name for name, _ in services.calls]
+        assert orchestrator.get_execution_status("run")["stages_failed"] == ["enrich"]
+
+    @pytest.mark.asyncio
+    async def test_optional_failure_skips_optional_dependents(self):
+        def fail(metadata):
+            raise RuntimeError("no gpu")
+
+        services = FakeServices(handlers={"mockup": fail})
+        orchestrator = make_orchestrator(
+            [
+                stage("score"),
+                stage("mockup", ["score"], required=False),
+                stage("preview", ["mockup"], required=False),
+                stage("report", ["score"]),
+            ],
+            services,
+            parallel_execution=True,
+        )
+
+        results = await execute(orchestrator)
+
+        assert results["mockup"]["status"] == "failed"
+        assert "no gpu" in results["mockup"]["error"]
+        assert "preview" not in results
+        assert "report" in results
+
+    @pytest.mark.asyncio
+    async def test_required_stage_after_failed_optional_fails(self):
+        def fail(metadata):
+            raise RuntimeError("no gpu")
+
+        services = FakeServices(handlers={"mockup": fail})
+        orchestrator = make_orchestrator(
+            [
+                stage("score"),
+                stage("mockup", ["score"], required=False),
+                stage("email", ["mockup"]),
+            ],
+            services,
+            parallel_execution=True,
+        )
+
+        with pytest.raises(RuntimeError, match="email dependency mockup"):
+            await execute(orchestrator)
+
+    @pytest.mark.asyncio
+    async def test_cycle_rejected(self):
+        orchestrator = make_orchestrator(
+            [stage("a", ["b"]), stage("b", ["a"])],
+            FakeServices(),
+            parallel_execution=True,
+        )
+
+        with pytest.raises(ValueError, match="cycle"):
+            await execute(orchestrator)
+
+    @pytest.mark.asyncio
+    async def test_stage_timeout(self):
+        async def hang(metadata):
+            await asyncio.sleep(10)
+
+        orchestrator = make_orchestrator(
+            [stage("scrape", timeout_seconds=0.05)],
+            FakeServices(handlers={"scrape": hang}),
+            parallel_execution=True,
+        )
+
+        with pytest.raises(RuntimeError, match="scrape failed"):
+            await execute(orchestrator)
+
+
+class TestStreamingExecution:
+    """Test micro-batch streaming between stages."""
+
+    @staticmethod
+    def scrape(metadata):
+        zip_code = metadata["zip_codes"][0]
+        return {"business_ids": [f"{zip_code}-{i}" for i in range(5)]}
+
+    @pytest.mark.asyncio
+    async def test_leads_flow_through_in_batches(self):
+        services = FakeServices(
+            handlers={
+                "scrape": self.scrape,
+                "enrich": lambda metadata: {
+                    "failed_business_ids": [
+                        i for i in metadata["business_ids"] if i == "z1-0"
+                    ]
+                },
+            }
+        )
+        orchestrator = make_orchestrator(
+            [stage("scrape"), stage("enrich", ["scrape"]), stage("email", ["enrich"])],
+            services,
+            streaming=True,
+            stream_batch_size=4,
+        )
+
+        results = await execute(orchestrator, {"zip_codes": ["z0", "z1", "z2"]})
+
+        scraped = [call for call in services.calls if call[0] == "scrape"]
+        assert [c[1]["metadata"]["zip_codes"] for c in scraped] == [
+            ["z0"],
+            ["z1"],
+            ["z2"],
+        ]
+        emailed = [i for batch in services.batches("email") for i in batch]
+        assert sorted(emailed) == sorted(
+            f"z{z}-{i}" for z in range(3) for i in range(5) if (z, i) != (1, 0)
+        )
+        assert all(len(batch) <= 4 for batch in services.batches("enrich"))
+        assert results["enrich"]["processed"] == 15
+        assert results["email"]["processed"] == 14
+
+        latency = orchestrator.get_execution_status("run")["lead_latency"]
+        assert latency["leads_started"] == 15
+        assert latency["leads_completed"] == 14
+        assert 0 < latency["p50_seconds"] <= latency["p95_seconds"]
+
+    @pytest.mark.asyncio
+    async def test_stages_overlap(self):
+        async def slow_scrape(metadata):
+            await asyncio.sleep(0.05)
+            return self.scrape(metadata)
+
+        services = FakeServices(handlers={"scrape": slow_scrape})
+        orchestrator = make_orchestrator(
+            [
+                stage("scrape", max_concurrency=1),
+                stage("enrich", ["scrape"]),
+                stage("email", ["enrich"]),
+            ],
+            services,
+            streaming=True,
+            stream_batch_size=5,
+        )
+
+        await execute(orchestrator, {"zip_codes": [f"z{i}" for i in range(4)]})
+
+        first_email = services.events.index(("start", "email"))
+        last_scrape = len(services.events) - services.events[::-1].index(
+            ("start", "scrape")
+        )
+        assert first_email < last_scrape
+        assert services.max_running["scrape"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        async def slow(metadata):
+            await asyncio.sleep(0.02)
+            return {}
+
+        services = FakeServices(handlers={"scrape": self.scrape, "enrich": slow})
+        orchestrator = make_orchestrator(
+            [stage("scrape"), stage("enrich", ["scrape"], max_concurrency=2)],
+            services,
+            streaming=True,
+            stream_batch_size=1,
+        )
+
+        await execute(orchestrator, {"zip_codes": ["z0", "z1"]})
+
+        assert len(services.batches("enrich")) == 10
+        assert services.max_running["enrich"] == 2
+
+    @pytest.mark.asyncio
+    async def test_join_waits_for_every_dependency(self):
+        services = FakeServices(handlers={"scrape": self.scrape})
+        orchestrator = make_orchestrator(
+            [
+                stage("scrape"),
+                stage("enrich", ["scrape"]),
+                stage("dedupe", ["scrape"]),
+                stage("score", ["enrich", "dedupe"]),
+            ],
+            services,
+            streaming=True,
+        )
+
+        await execute(orchestrator, {"zip_codes": ["z0"]})
+
+        scored = [i for batch in services.batches("score") for i in batch]
+        assert sorted(scored) == [f"z0-{i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_failed_optional_batch_passes_leads_on(self):
+        def fail(metadata):
+            raise RuntimeError("no gpu")
+
+        services = FakeServices(handlers={"scrape": self.scrape, "mockup": fail})
+        orchestrator = make_orchestrator(
+            [
+                stage("scrape"),
+                stage("mockup", ["scrape"], required=False),
+                stage("email", ["mockup"]),
+            ],
+            services,
+            streaming=True,
+        )
+
+        results = await execute(orchestrator, {"zip_codes": ["z0"]})
+
+        assert results["mockup"]["status"] == "failed"
+        assert len(services.batches("email")[0]) == 5
+        context = orchestrator.get_execution_status("run")
+        assert context["stages_failed"] == ["mockup"]
+
+    @pytest.mark.asyncio
+    async def test_required_stage_failing_every_batch_fails_workflow(self):
+        def fail(metadata):
+            raise RuntimeError("enrichment down")
+
+        services = FakeServices(handlers={"scrape": self.scrape, "enrich": fail})
+        orchestrator = make_orchestrator(
+            [stage("scrape"), stage("enrich", ["scrape"]), stage("email", ["enrich"])],
+            services,
+            streaming=True,
+        )
+
+        with pytest.raises(RuntimeError, match="enrichment down"):
+            await execute(orchestrator, {"zip_codes": ["z0"]})
+
+        assert services.batches("email") == []
+
+
+def test_streaming_workflow_registered():
+    orchestrator = PipelineOrchestrator(ServiceRegistry())
+
+    streaming = orchestrator.workflows["streaming"]
+    assert streaming.streaming
+    assert [s.name for s in streaming.stages] == [
+        s.name for s in orchestrator.workflows["default"].stages
+    ]
+    assert not orchestrator.workflows["default"].streaming
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
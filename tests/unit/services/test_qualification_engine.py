@@ -228,10 +228,7 @@ class TestQualificationEngine(unittest.TestCase):
         )
 
         # Setup mocks
-        def mock_get_business(business_id):
-            return businesses[business_id - 1] if business_id <= len(businesses) else None
-
-        self.mock_storage.get_business_by_id.side_effect = mock_get_business
+        self.mock_storage.get_businesses_by_ids.return_value = businesses
         self.engine.get_criteria_by_id = MagicMock(return_value=criteria)
 
         # Test bulk qualification
@@ -243,6 +240,95 @@ class TestQualificationEngine(unittest.TestCase):
         self.assertEqual(results[1].status, QualificationStatus.REJECTED)   # Score 30
         self.assertEqual(results[2].status, QualificationStatus.QUALIFIED)  # Score 90
 
+    def test_qualify_businesses_bulk_matches_single(self):
+        """Test bulk qualification gives the same results as one-by-one."""
+        businesses = [
+            {"id": 1, "name": "Business 1", "email": "a@example.com", "website": "https://a.com", "score": 85},
+            {"id": 2, "name": "Business 2", "email": "b@example.com", "website": "", "score": 90},
+            {"id": 3, "name": "Business 3", "email": "", "website": "https://c.com", "score": 90},
+            {"id": 4, "name": "Business 4", "email": "d@example.com", "website": "https://d.com", "score": 0},
+            {"id": 5, "name": "Business 5", "email": "e@example.com", "website": "https://e.com", "score": 70},
+        ]
+        summaries = {
+            "business_1": {"total_page_views": 5, "avg_session_duration": 120, "conversions": 1},
+            "business_4": {"total_page_views": 3, "avg_session_duration": 60, "conversions": 0},
+            "business_5": {"total_page_views": 1, "avg_session_duration": 10, "conversions": 0},
+        }
+        criteria = QualificationCriteria(
+            id=1,
+            name="Test Criteria",
+            description="Test",
+            min_score=50,
+            required_fields=["name", "email"],
+            engagement_requirements={"min_page_views": 2},
+            custom_rules={"has_website": True}
+        )
+        by_id = {business["id"]: business for business in businesses}
+        self.engine.get_criteria_by_id = MagicMock(return_value=criteria)
+        self.mock_scoring.score_business.side_effect = lambda b: {"score": 75}
+        self.mock_scoring.score_batch.side_effect = lambda bs: [{"score": 75} for _ in bs]
+
+        # One by one
+        self.mock_storage.get_business_by_id.side_effect = by_id.get
+        self.mock_engagement.get_user_engagement_summary.side_effect = (
+            lambda user_id, days: summaries.get(user_id, {})
+        )
+        single = [self.engine.qualify_business(i, 1) for i in [1, 2, 3, 4, 5, 99]]
+
+        # In bulk, two chunks
+        self.engine.get_criteria_by_id.reset_mock()
+        self.mock_storage.get_businesses_by_ids.side_effect = (
+            lambda ids: [by_id[i] for i in ids if i in by_id]
+        )
+        self.mock_engagement.get_user_engagement_summaries.side_effect = (
+            lambda user_ids, days: {u: summaries.get(u, {}) for u in user_ids}
+        )
+        chunks = list(
+            self.engine.iter_qualification_chunks([1, 2, 3, 4, 5, 99], 1, chunk_size=3)
+        )
+
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3])
+        bulk = [result for chunk in chunks for result in chunk]
+        self.assertEqual(
+            [(r.business_id, r.status, r.score, r.notes) for r in bulk],
+            [(r.business_id, r.status, r.score, r.notes) for r in single],
+        )
+        self.assertEqual(
+            [r.status for r in bulk],
+            [
+                QualificationStatus.QUALIFIED,
+                QualificationStatus.REJECTED,  # No website
+                QualificationStatus.INSUFFICIENT_DATA,  # No email
+                QualificationStatus.QUALIFIED,  # Re-scored to 75
+                QualificationStatus.REJECTED,  # Not enough page views
+                QualificationStatus.REJECTED,  # Not found
+            ],
+        )
+
+        # Criteria loaded once, businesses and engagement fetched per chunk
+        self.engine.get_criteria_by_id.assert_called_once_with(1)
+        self.assertEqual(self.mock_storage.get_businesses_by_ids.call_count, 2)
+        self.assertEqual(
+            self.mock_engagement.get_user_engagement_summaries.call_count, 2
+        )
+        self.mock_storage.update_business_scores.assert_called_once_with({4: 75})
+
+    def test_qualify_businesses_bulk_inactive_criteria(self):
+        """Test bulk qualification with inactive criteria."""
+        criteria = QualificationCriteria(
+            id=1, name="Inactive", description="Test", is_active=False
+        )
+        self.engine.get_criteria_by_id = MagicMock(return_value=criteria)
+        self.mock_storage.get_businesses_by_ids.return_value = [
+            {"id": 1, "name": "Business 1", "score": 85}
+        ]
+
+        results = self.engine.qualify_businesses_bulk([1, 2], 1)
+
+        self.assertEqual(results[0].notes, "Qualification criteria is not active")
+        self.assertEqual(results[1].notes, "Business not found in database")
+        self.mock_scoring.score_batch.assert_not_called()
+
     def test_business_not_found(self):
         """Test qualification when business is not found."""
         # Setup mocks
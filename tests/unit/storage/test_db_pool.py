@@ -0,0 +1,203 @@
+"""
+Tests for the process-wide database connection pool.
+
+This module tests ConnectionPool checkout/return semantics, health checks,
+thread affinity and the pooled e2e_db_connector context managers.
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import psycopg2.extensions
+import pytest
+
+from leadfactory.utils import db_pool, e2e_db_connector
+from leadfactory.utils.db_pool import ConnectionPool, PoolTimeoutError
+
+
+def make_connection():
+    """Create a mock psycopg2 connection in the idle state."""
+    conn = MagicMock()
+    conn.closed = 0
+    conn.get_transaction_status.return_value = (
+        psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    )
+    return conn
+
+
+class TestConnectionPool:
+    """Test cases for ConnectionPool."""
+
+    def setup_method(self):
+        """Set up a pool backed by mock connections."""
+        self.connect = MagicMock(side_effect=lambda dsn: make_connection())
+
+    def make_pool(self, **kwargs):
+        kwargs.setdefault("min_size", 0)
+        kwargs.setdefault("max_size", 2)
+        kwargs.setdefault("timeout", 0.2)
+        kwargs.setdefault("health_check_interval", 60)
+        return ConnectionPool("postgresql://test", connect=self.connect, **kwargs)
+
+    def test_min_size_connections_opened_eagerly(self):
+        """Test that min_size connections are opened at creation."""
+        pool = self.make_pool(min_size=2)
+
+        assert self.connect.call_count == 2
+        assert pool.get_stats()["idle"] == 2
+
+    def test_invalid_sizes_rejected(self):
+        """Test that inconsistent size limits are rejected."""
+        with pytest.raises(ValueError):
+            self.make_pool(max_size=0)
+        with pytest.raises(ValueError):
+            self.make_pool(min_size=3, max_size=2)
+
+    def test_connection_reused_after_return(self):
+        """Test that a returned connection is handed out again."""
+        pool = self.make_pool()
+
+        conn = pool.getconn()
+        pool.putconn(conn)
+        again = pool.getconn()
+
+        assert again is conn
+        assert self.connect.call_count == 1
+        stats = pool.get_stats()
+        assert stats["checkouts"] == 2
+        assert stats["connections_created"] == 1
+
+    def test_open_transaction_rolled_back_on_return(self):
+        """Test that uncommitted work is discarded when returned."""
+        pool = self.make_pool()
+        conn = pool.getconn()
+        conn.get_transaction_status.return_value = (
+            psycopg2.extensions.TRANSACTION_STATUS_INTRANS
+        )
+
+        pool.putconn(conn)
+
+        conn.rollback.assert_called_once()
+        assert pool.get_stats()["idle"] == 1
+
+    def test_broken_connection_discarded(self):
+        """Test that connections in an unknown state are closed, not reused."""
+        pool = self.make_pool()
+        conn = pool.getconn()
+        conn.get_transaction_status.return_value = (
+            psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN
+        )
+
+        pool.putconn(conn)
+
+        conn.close.assert_called_once()
+        assert pool.get_stats()["idle"] == 0
+        assert pool.get_stats()["connections_discarded"] == 1
+
+    def test_failed_health_check_replaces_connection(self):
+        """Test that an idle connection failing SELECT 1 is replaced."""
+        pool = self.make_pool(health_check_interval=0)
+        conn = pool.getconn()
+        pool.putconn(conn)
+        conn.cursor.side_effect = psycopg2.OperationalError("server closed")
+
+        replacement = pool.getconn()
+
+        assert replacement is not conn
+        assert pool.get_stats()["health_check_failures"] == 1
+
+    def test_checkout_times_out_when_exhausted(self):
+        """Test that checkout fails after the timeout when the pool is full."""
+        pool = self.make_pool(max_size=1, timeout=0.05)
+        pool.getconn()
+
+        with pytest.raises(PoolTimeoutError):
+            pool.getconn()
+
+    def test_waiter_receives_returned_connection(self):
+        """Test that a blocked checkout is woken when a connection returns."""
+        pool = self.make_pool(max_size=1, timeout=2)
+        conn = pool.getconn()
+        received = []
+
+        worker = threading.Thread(target=lambda: received.append(pool.getconn()))
+        worker.start()
+        time.sleep(0.05)
+        pool.putconn(conn)
+        worker.join(timeout=2)
+
+        assert received == [conn]
+        assert pool.get_stats()["waits"] == 1
+
+    def test_connection_affinity_per_thread(self):
+        """Test that a thread gets back the connection it last used."""
+        pool = self.make_pool()
+        first = pool.getconn()
+        second = pool.getconn()
+        pool.putconn(first)
+        pool.putconn(second)
+
+        assert pool.getconn() is first
+        assert pool.get_stats()["affinity_hits"] >= 1
+
+    def test_closeall_refuses_checkout(self):
+        """Test that a closed pool refuses further checkouts."""
+        pool = self.make_pool(min_size=1)
+
+        pool.closeall()
+
+        with pytest.raises(Exception):
+            pool.getconn()
+
+
+class TestPooledConnector:
+    """Test the e2e_db_connector context managers on top of the pool."""
+
+    def setup_method(self):
+        db_pool.close_all_pools()
+
+    def teardown_method(self):
+        db_pool.close_all_pools()
+
+    @patch.dict("os.environ", {"DATABASE_URL": "postgresql://test"})
+    @patch("leadfactory.utils.db_pool.psycopg2.connect")
+    def test_db_connection_reuses_pooled_connection(self, mock_connect):
+        """Test that consecutive db_connection calls share one handshake."""
+        mock_connect.side_effect = lambda dsn: make_connection()
+
+        with e2e_db_connector.db_connection() as first:
+            pass
+        with e2e_db_connector.db_connection() as second:
+            pass
+
+        assert first is second
+        first.close.assert_not_called()
+        assert mock_connect.call_count == 1
+
+    @patch.dict("os.environ", {"DATABASE_URL": "postgresql://test"})
+    @patch("leadfactory.utils.db_pool.psycopg2.connect")
+    def test_db_transaction_commits_and_rolls_back(self, mock_connect):
+        """Test that db_transaction commits on success and rolls back on error."""
+        conn = make_connection()
+        mock_connect.return_value = conn
+
+        with e2e_db_connector.db_transaction():
+            pass
+        conn.commit.assert_called_once()
+
+        with pytest.raises(RuntimeError), e2e_db_connector.db_transaction():
+            raise RuntimeError("boom")
+        conn.rollback.assert_called()
+
+    @patch.dict("os.environ", {"DATABASE_URL": "postgresql://test"})
+    @patch("leadfactory.utils.e2e_db_connector.psycopg2.connect")
+    def test_pool_can_be_disabled(self, mock_connect):
+        """Test that DB_POOL_ENABLED=false opens a connection per call."""
+        mock_connect.side_effect = lambda dsn: make_connection()
+
+        with patch.object(db_pool, "DB_POOL_ENABLED", False):
+            with e2e_db_connector.db_connection() as conn:
+                pass
+
+        conn.close.assert_called_once()
@@ -518,6 +518,176 @@ class TestPostgresStorageLogMethods:
         calls = mock_cursor.execute.call_args_list
         assert any("UNION ALL" in str(call) for call in calls)
 
+    def test_get_logs_page_first_page(self, postgres_storage, mock_cursor):
+        """Test keyset page query without a cursor."""
+        mock_cursor.fetchall.return_value = [
+            (1, 123, "llm", "content", datetime.utcnow(), '{"a": 1}', None, 100)
+        ]
+        mock_cursor.description = [
+            ("id",),
+            ("business_id",),
+            ("log_type",),
+            ("content",),
+            ("timestamp",),
+            ("metadata",),
+            ("file_path",),
+            ("content_length",),
+        ]
+
+        logs = postgres_storage.get_logs_page(business_id=123, limit=10)
+
+        assert logs[0]["metadata"] == {"a": 1}
+        query, params = mock_cursor.execute.call_args.args
+        # Each table is limited on its own, then the union is limited
+        assert query.count("LIMIT %s") == 3
+        assert "OFFSET" not in query
+        assert "ORDER BY created_at DESC, id DESC" in query
+        assert "ORDER BY timestamp DESC, log_type DESC, id DESC" in query
+        assert params == [123, 10, 123, 10, 10]
+
+    def test_get_logs_page_after_cursor(self, postgres_storage, mock_cursor):
+        """Test keyset conditions for rows after a cursor."""
+        after = {"timestamp": datetime(2024, 1, 2), "log_type": "raw_html", "id": 5}
+
+        postgres_storage.get_logs_page(after=after, limit=10)
+
+        query, params = mock_cursor.execute.call_args.args
+        # llm sorts after raw_html at equal timestamps when descending
+        assert "created_at <= %s" in query
+        assert "(created_at, id) < (%s, %s)" in query
+        assert params == [after["timestamp"], 10, after["timestamp"], 5, 10, 10]
+
+    def test_get_logs_page_ascending_and_search(self, postgres_storage, mock_cursor):
+        """Test ascending keyset conditions and per-table search."""
+        after = {"timestamp": datetime(2024, 1, 2), "log_type": "llm", "id": 5}
+
+        postgres_storage.get_logs_page(
+            search_query="pizza", after=after, sort_order="asc", limit=10
+        )
+
+        query, params = mock_cursor.execute.call_args.args
+        assert "search_vector @@ plainto_tsquery('simple', %s)" in query
+        assert "original_url ILIKE %s" in query
+        assert "(created_at, id) > (%s, %s)" in query
+        assert "created_at >= %s" in query
+        assert "pizza" in params
+        assert "%pizza%" in params
+
+    def test_get_logs_with_filters_matches_keyset_search(
+        self, postgres_storage, mock_cursor
+    ):
+        """Test that offset pages filter each table like keyset pages."""
+        mock_cursor.fetchone.return_value = (0,)
+
+        postgres_storage.get_logs_with_filters(
+            business_id=123, search_query="pizza", limit=10, offset=20
+        )
+
+        count_query, count_params = mock_cursor.execute.call_args_list[0].args
+        query, params = mock_cursor.execute.call_args_list[1].args
+        assert "search_vector @@ plainto_tsquery('simple', %s)" in query
+        assert "original_url ILIKE %s" in query
+        assert "content ILIKE" not in query
+        assert count_query.startswith("SELECT COUNT(*)")
+        assert count_params == [123, "pizza", 123, "%pizza%"]
+        assert params == count_params + [10, 20]
+
+    def test_get_logs_page_log_type(self, postgres_storage, mock_cursor):
+        """Test that a log type filter queries a single table."""
+        postgres_storage.get_logs_page(log_type="raw_html")
+
+        query = mock_cursor.execute.call_args.args[0]
+        assert "raw_html_storage" in query
+        assert "llm_logs" not in query
+        assert "UNION ALL" not in query
+
+    def test_estimate_logs_count(self, postgres_storage, mock_cursor):
+        """Test count estimates from planner row counts."""
+        mock_cursor.fetchone.side_effect = [
+            ([{"Plan": {"Plan Rows": 1200}}],),
+            ('[{"Plan": {"Plan Rows": 34}}]',),
+        ]
+
+        count = postgres_storage.estimate_logs_count(business_id=123)
+
+        assert count == 1234
+        queries = [call.args[0] for call in mock_cursor.execute.call_args_list]
+        assert all(query.startswith("EXPLAIN") for query in queries)
+        assert "COUNT" not in " ".join(queries)
+
+    def test_iter_logs_named_cursor(self, postgres_storage):
+        """Test that exports stream through a server-side cursor in batches."""
+        named_cursor = Mock()
+        named_cursor.description = [("id",), ("log_type",), ("metadata",)]
+        named_cursor.fetchmany.side_effect = [
+            [(1, "llm", '{"a": 1}'), (2, "llm", "{}")],
+            [(3, "raw_html", {"b": 2})],
+            [],
+        ]
+        conn = Mock()
+        conn.cursor.return_value = named_cursor
+        postgres_storage.connection = Mock()
+        postgres_storage.connection.return_value.__enter__ = Mock(return_value=conn)
+        postgres_storage.connection.return_value.__exit__ = Mock(return_value=None)
+
+        logs = postgres_storage.iter_logs(business_id=123, batch_size=2)
+
+        # Nothing is queried until the export is consumed
+        conn.cursor.assert_not_called()
+        logs = list(logs)
+
+        assert [log["id"] for log in logs] == [1, 2, 3]
+        assert logs[0]["metadata"] == {"a": 1}
+        assert logs[2]["metadata"] == {"b": 2}
+        assert conn.cursor.call_args.kwargs["name"].startswith("logs_export_")
+        named_cursor.fetchmany.assert_called_with(2)
+        named_cursor.close.assert_called_once()
+        conn.rollback.assert_called_once()
+
+        query, params = named_cursor.execute.call_args.args
+        assert "UNION ALL" in query
+        assert "LIMIT" not in query
+        assert "ORDER BY timestamp DESC, log_type DESC, id DESC" in query
+        assert params == [123, 123]
+
+    def test_iter_logs_closed_early(self, postgres_storage):
+        """Test that abandoning an export releases the cursor."""
+        named_cursor = Mock()
+        named_cursor.description = [("id",)]
+        named_cursor.fetchmany.return_value = [(1,), (2,)]
+        conn = Mock()
+        conn.cursor.return_value = named_cursor
+        postgres_storage.connection = Mock()
+        postgres_storage.connection.return_value.__enter__ = Mock(return_value=conn)
+        postgres_storage.connection.return_value.__exit__ = Mock(return_value=None)
+
+        logs = postgres_storage.iter_logs(log_type="llm")
+        assert next(logs)["id"] == 1
+        logs.close()
+
+        named_cursor.close.assert_called_once()
+        conn.rollback.assert_called_once()
+        postgres_storage.connection.return_value.__exit__.assert_called_once()
+
+    def test_iter_logs_reraises_fetch_errors(self, postgres_storage):
+        """Test that a failed fetch aborts the export rather than truncating it."""
+        named_cursor = Mock()
+        named_cursor.description = [("id",)]
+        named_cursor.fetchmany.side_effect = [[(1,)], Exception("connection lost")]
+        conn = Mock()
+        conn.cursor.return_value = named_cursor
+        postgres_storage.connection = Mock()
+        postgres_storage.connection.return_value.__enter__ = Mock(return_value=conn)
+        postgres_storage.connection.return_value.__exit__ = Mock(return_value=None)
+
+        logs = postgres_storage.iter_logs()
+        assert next(logs)["id"] == 1
+        with pytest.raises(Exception, match="connection lost"):
+            next(logs)
+
+        named_cursor.close.assert_called_once()
+        conn.rollback.assert_called_once()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
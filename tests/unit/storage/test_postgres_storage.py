@@ -324,6 +324,68 @@ class TestPostgresStorage:
         result = self.storage.merge_businesses(1, 2)
         assert result is False
 
+    @patch("leadfactory.storage.postgres_storage.merge_business_clusters")
+    def test_merge_business_clusters(self, mock_merge):
+        """Test that cluster merges go to the bulk merge."""
+        mock_merge.return_value = True
+        clusters = [(1, [2, 3], {"category": "Plumbing"})]
+
+        assert self.storage.merge_business_clusters(clusters) is True
+        mock_merge.assert_called_once_with(clusters)
+
+    @patch("leadfactory.storage.postgres_storage.psycopg2.extras.execute_values")
+    def test_store_engagement_batch(self, mock_execute_values):
+        """Test that an engagement batch is written in one transaction."""
+        conn = MagicMock()
+
+        @contextmanager
+        def connection():
+            yield conn
+
+        event = {
+            "event_id": "e1",
+            "user_id": "u1",
+            "session_id": "s1",
+            "event_type": "page_view",
+            "timestamp": "2024-01-01T00:00:00",
+            "properties": {"page": "/"},
+        }
+        session = {
+            "session_id": "s1",
+            "user_id": "u1",
+            "start_time": "2024-01-01T00:00:00",
+            "total_events": 1,
+            "page_views": 1,
+            "unique_pages": 1,
+            "bounce_rate": 0.0,
+            "time_on_site": 0.0,
+            "conversion_events": [],
+        }
+        progress = {
+            "funnel_id": "f1",
+            "user_id": "u1",
+            "session_id": "s1",
+            "step_index": 0,
+            "timestamp": "2024-01-01T00:00:00",
+        }
+
+        with patch.object(self.storage, "connection", connection):
+            assert self.storage.store_engagement_batch(
+                [event], [session], [progress], []
+            )
+
+        statements = [c[0][1] for c in mock_execute_values.call_args_list]
+        assert len(statements) == 3
+        assert "INSERT INTO engagement_events" in statements[0]
+        assert "ON CONFLICT (session_id) DO UPDATE" in statements[1]
+        assert "INSERT INTO funnel_progress" in statements[2]
+        assert mock_execute_values.call_args_list[0][0][2][0][5] == '{"page": "/"}'
+        conn.commit.assert_called_once()
+
+        mock_execute_values.side_effect = Exception("connection lost")
+        with patch.object(self.storage, "connection", connection):
+            assert not self.storage.store_engagement_batch([event], [session])
+
     def test_processing_status_operations(self):
         """Test processing status operations."""
         with patch.object(self.storage, "cursor") as mock_cursor_cm:
@@ -405,6 +467,73 @@ class TestPostgresStorage:
             result = self.storage.get_business_by_name_and_zip("Test Business", "12345")
             assert result["id"] == 1
 
+    @patch("leadfactory.storage.postgres_storage.bulk_upsert_businesses")
+    def test_bulk_upsert_businesses(self, mock_bulk_upsert):
+        """Test conversion of business dicts to bulk upsert rows."""
+        mock_bulk_upsert.return_value = [11]
+        new_business = {
+            "name": "Acme",
+            "address": "1 Main St",
+            "city": "New York",
+            "state": "NY",
+            "zip": "10001",
+            "phone": "555-1234",
+            "email": None,
+            "website": "https://acme.example",
+            "vertical_id": 3,
+            "source": "yelp",
+            "source_id": "y1",
+            "yelp_response_json": {"id": "y1"},
+            "google_response_json": None,
+        }
+        updated_business = {
+            "id": 7,
+            "name": "Bolt",
+            "address": "2 Main St",
+            "phone": None,
+            "email": None,
+            "website": None,
+            "vertical_id": 3,
+            "source": "google,yelp",
+            "yelp_response_json": None,
+            "google_response_json": {"place_id": "g1"},
+        }
+
+        result = self.storage.bulk_upsert_businesses([new_business], [updated_business])
+
+        assert result == [11]
+        new_rows, updated_rows = mock_bulk_upsert.call_args[0]
+        assert new_rows[0][:11] == (
+            "Acme",
+            "1 Main St",
+            "New York",
+            "NY",
+            "10001",
+            "555-1234",
+            None,
+            "https://acme.example",
+            3,
+            "yelp",
+            "y1",
+        )
+        assert json.loads(new_rows[0][11]) == {"id": "y1"}
+        assert new_rows[0][12] is None
+        assert new_rows[0][13] is not None  # retention expiry set for JSON
+        assert updated_rows == [
+            (
+                7,
+                "Bolt",
+                "2 Main St",
+                None,
+                None,
+                None,
+                3,
+                "google,yelp",
+                None,
+                json.dumps({"place_id": "g1"}),
+            )
+        ]
+
     def test_error_handling(self):
         """Test error handling in various methods."""
         with patch.object(self.storage, "cursor") as mock_cursor_cm:
@@ -517,6 +646,39 @@ class TestPostgresStorage:
             assert result["asset_type"] == "screenshot"
             assert result["file_path"] == "/path"
 
+    def test_asset_cache_operations(self):
+        """Test content hash and asset cache operations."""
+        with patch.object(self.storage, "cursor") as mock_cursor_cm:
+            mock_cursor = MagicMock()
+            mock_cursor.__enter__ = MagicMock(return_value=mock_cursor)
+            mock_cursor.__exit__ = MagicMock(return_value=None)
+            mock_cursor_cm.return_value = mock_cursor
+            mock_cursor.rowcount = 1
+
+            # create_asset records the content hash
+            self.storage.create_asset(1, "mockup", "/path", "https://url", content_hash="abc")
+            assert mock_cursor.execute.call_args[0][1][4] == "abc"
+
+            # Cache entries are upserted on (asset_type, cache_key)
+            assert self.storage.save_asset_cache_entry("screenshot", "key", "abc", "/blob.png", 100, 2.5)
+            query = mock_cursor.execute.call_args[0][0]
+            assert "ON CONFLICT (asset_type, cache_key)" in query
+
+            mock_cursor.fetchone.return_value = ("screenshot", "key", "abc", "/blob.png", 100, 2.5, 0, None, None)
+            mock_cursor.description = [(name,) for name in (
+                "asset_type", "cache_key", "content_hash", "file_path", "size_bytes",
+                "render_seconds", "hit_count", "created_at", "last_hit_at",
+            )]
+            entry = self.storage.get_asset_cache_entry("screenshot", "key")
+            assert entry["content_hash"] == "abc"
+            assert entry["file_path"] == "/blob.png"
+
+            mock_cursor.fetchone.return_value = None
+            assert self.storage.get_asset_cache_entry("screenshot", "other") is None
+
+            mock_cursor.fetchone.return_value = ("htmlhash",)
+            assert self.storage.get_latest_html_fingerprint(1) == "htmlhash"
+
     def test_email_operations(self):
         """Test email-related operations."""
         with patch.object(self.storage, "cursor") as mock_cursor_cm:
@@ -0,0 +1,291 @@
+"""
+Unit tests for batched SendGrid webhook ingestion.
+"""
+
+import sqlite3
+import time
+from unittest.mock import patch
+
+import pytest
+
+from leadfactory.webhooks.sendgrid_webhook import (
+    SendGridWebhookHandler,
+    create_webhook_tables,
+)
+
+
+class SqliteConnection:
+    """DatabaseConnection backed by a SQLite file."""
+
+    opened = 0
+
+    def __init__(self, db_path=None):
+        SqliteConnection.opened += 1
+        self.conn = sqlite3.connect(db_path)
+        self.cursor = self.conn.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.conn.close()
+
+    def execute(self, *args):
+        self.cursor.execute(*args)
+
+    def executemany(self, *args):
+        self.cursor.executemany(*args)
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def commit(self):
+        self.conn.commit()
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "webhooks.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        """
+        CREATE TABLE email_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            recipient_email TEXT,
+            message_id TEXT,
+            status TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+        """
+    )
+    now = time.strftime("%Y-%m-%dT%H:%M:%S")
+    conn.executemany(
+        "INSERT INTO email_queue (recipient_email, message_id, status, created_at) "
+        "VALUES (?, ?, 'sent', ?)",
+        [(f"user{i}@example.com", f"msg{i}", now) for i in range(20)],
+    )
+    conn.commit()
+    conn.close()
+
+    with patch(
+        "leadfactory.webhooks.sendgrid_webhook.DatabaseConnection",
+        SqliteConnection,
+        create=True,
+    ):
+        create_webhook_tables(path)
+        yield path
+
+
+def query(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def queue_state(db_path):
+    return query(
+        db_path,
+        "SELECT recipient_email, status, COALESCE(soft_bounce_count, 0), "
+        "delivered_at IS NOT NULL FROM email_queue ORDER BY id",
+    )
+
+
+def mixed_events():
+    now = int(time.time())
+    return [
+        {"event": "bounce", "type": "hard", "email": "user0@example.com"},
+        {"event": "bounce", "type": "soft", "email": "user1@example.com"},
+        {"event": "bounce", "type": "soft", "email": "user1@example.com"},
+        {"event": "dropped", "type": "block", "email": "user2@example.com"},
+        {"event": "spamreport", "email": "user3@example.com"},
+        {"event": "unsubscribe", "email": "user4@example.com"},
+        {"event": "group_unsubscribe", "email": "user5@example.com"},
+        {"event": "delivered", "email": "user6@example.com", "sg_message_id": "msg6"},
+        {"event": "open", "email": "user7@example.com"},
+        {"email": "missing-event@example.com"},
+    ], now
+
+
+def with_ids(events, timestamp):
+    return [
+        dict(event, sg_event_id=f"evt{i}", timestamp=timestamp)
+        for i, event in enumerate(events)
+    ]
+
+
+class TestProcessWebhookBatch:
+    """Test cases for SendGridWebhookHandler.process_webhook_batch."""
+
+    def test_matches_per_event_processing(self, db_path, tmp_path):
+        """The batch path leaves the database in the same state."""
+        events, now = mixed_events()
+        events = with_ids(events, now)
+
+        per_event_path = str(tmp_path / "per_event.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute(f"VACUUM INTO '{per_event_path}'")
+        conn.close()
+
+        handler = SendGridWebhookHandler(db_path=db_path)
+        counts = handler.process_webhook_batch(events)
+        expected_counts = SendGridWebhookHandler(
+            db_path=per_event_path
+        ).process_webhook_events(events)
+
+        assert counts == expected_counts
+        assert counts["bounce"] == 3
+        assert queue_state(db_path) == queue_state(per_event_path)
+        for table in ("email_bounces", "email_spam_reports", "email_unsubscribes"):
+            sql = f"SELECT COUNT(*) FROM {table}"
+            assert query(db_path, sql) == query(per_event_path, sql)
+
+        state = {row[0]: row[1:] for row in queue_state(db_path)}
+        assert state["user0@example.com"][0] == "hard_bounced"
+        assert state["user1@example.com"] == ("sent", 2, 0)
+        assert state["user2@example.com"][0] == "blocked"
+        assert state["user3@example.com"][0] == "spam_complaint"
+        assert state["user5@example.com"][0] == "unsubscribed"
+        assert state["user6@example.com"] == ("delivered", 0, 1)
+
+    def test_redelivered_events_are_stored_once(self, db_path):
+        """Events repeated with the same sg_event_id are upserted once."""
+        event = {
+            "event": "bounce",
+            "type": "soft",
+            "email": "user1@example.com",
+            "sg_event_id": "evt1",
+            "timestamp": int(time.time()),
+        }
+        handler = SendGridWebhookHandler(db_path=db_path)
+        handler.process_webhook_batch([event, dict(event)])
+
+        assert query(db_path, "SELECT COUNT(*) FROM email_bounces") == [(1,)]
+        state = {row[0]: row[1:] for row in queue_state(db_path)}
+        assert state["user1@example.com"] == ("sent", 1, 0)
+
+    def test_redelivered_batch_is_not_counted_twice(self, db_path):
+        """A batch SendGrid sends again leaves the counters unchanged."""
+        events = with_ids(
+            [
+                {"event": "bounce", "type": "soft", "email": "user1@example.com"},
+                {"event": "spamreport", "email": "user2@example.com"},
+            ],
+            int(time.time()),
+        )
+        handler = SendGridWebhookHandler(db_path=db_path)
+
+        with (
+            patch.object(handler, "_check_bounce_rate_thresholds") as check_bounce,
+            patch.object(handler, "_check_spam_rate_thresholds") as check_spam,
+        ):
+            handler.process_webhook_batch(events)
+            handler.process_webhook_batch([dict(event) for event in events])
+
+        state = {row[0]: row[1:] for row in queue_state(db_path)}
+        assert state["user1@example.com"] == ("sent", 1, 0)
+        assert [c.args for c in check_bounce.call_args_list] == [(0.05,), (0.05,)]
+        assert [c.args for c in check_spam.call_args_list] == [(0.05,), (0.05,)]
+
+    def test_last_suppression_status_wins(self, db_path):
+        events = [
+            {"event": "bounce", "type": "block", "email": "user0@example.com"},
+            {"event": "unsubscribe", "email": "user0@example.com"},
+        ]
+        SendGridWebhookHandler(db_path=db_path).process_webhook_batch(events)
+
+        state = {row[0]: row[1:] for row in queue_state(db_path)}
+        assert state["user0@example.com"][0] == "unsubscribed"
+
+    def test_thresholds_checked_once_per_batch(self, db_path):
+        """Rates come from counters loaded once and updated in memory."""
+        now = int(time.time())
+        handler = SendGridWebhookHandler(db_path=db_path)
+        bounces = with_ids(
+            [
+                {"event": "bounce", "type": "soft", "email": f"user{i}@example.com"}
+                for i in range(20)
+            ],
+            now,
+        )
+        spam = [{"event": "spamreport", "email": "user0@example.com", "timestamp": now}]
+
+        with (
+            patch.object(handler, "_check_bounce_rate_thresholds") as check_bounce,
+            patch.object(handler, "_check_spam_rate_thresholds") as check_spam,
+            patch.object(handler, "_calculate_recent_bounce_rate") as calculate_bounce,
+        ):
+            handler.process_webhook_batch(bounces[:10])
+            SqliteConnection.opened = 0
+            handler.process_webhook_batch(bounces[10:] + spam)
+
+        assert SqliteConnection.opened == 1
+        calculate_bounce.assert_not_called()
+        assert [c.args for c in check_bounce.call_args_list] == [(0.5,), (1.0,)]
+        check_spam.assert_called_once_with(0.05)
+
+    def test_counters_reload_when_stale(self, db_path):
+        now = int(time.time())
+        handler = SendGridWebhookHandler(db_path=db_path)
+        handler.rate_refresh_seconds = 0
+        first, second = (
+            [
+                {
+                    "event": "bounce",
+                    "type": "hard",
+                    "email": email,
+                    "sg_event_id": email,
+                    "timestamp": now,
+                }
+            ]
+            for email in ("user0@example.com", "user1@example.com")
+        )
+
+        with patch.object(handler, "_check_bounce_rate_thresholds") as check:
+            handler.process_webhook_batch(first)
+            handler.process_webhook_batch(second)
+
+        assert [c.args for c in check.call_args_list] == [(0.05,), (0.1,)]
+
+    def test_old_events_do_not_count_toward_rates(self, db_path):
+        handler = SendGridWebhookHandler(db_path=db_path)
+        events = with_ids(
+            [{"event": "bounce", "type": "hard", "email": "user0@example.com"}],
+            int(time.time()) - 2 * 24 * 3600,
+        )
+
+        with patch.object(handler, "_check_bounce_rate_thresholds") as check:
+            handler.process_webhook_batch(events)
+
+        check.assert_called_once_with(0.0)
+
+    def test_failed_batch_is_rolled_back(self, db_path):
+        """A failing statement aborts the whole batch so it can be retried."""
+        conn = sqlite3.connect(db_path)
+        conn.execute("DROP TABLE email_unsubscribes")
+        conn.commit()
+        conn.close()
+
+        events, now = mixed_events()
+        handler = SendGridWebhookHandler(db_path=db_path)
+        with pytest.raises(sqlite3.OperationalError):
+            handler.process_webhook_batch(with_ids(events, now))
+
+        assert query(db_path, "SELECT COUNT(*) FROM email_bounces") == [(0,)]
+        assert query(db_path, "SELECT COUNT(*) FROM email_spam_reports") == [(0,)]
+
+    def test_batch_without_writes_skips_database(self, db_path):
+        handler = SendGridWebhookHandler(db_path=db_path)
+        SqliteConnection.opened = 0
+
+        counts = handler.process_webhook_batch(
+            [{"event": "open", "email": "a@example.com"}, {"event": "click"}]
+        )
+
+        assert counts == {"open": 1, "click": 1}
+        assert SqliteConnection.opened == 0
@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the webhook intake log and consumer.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from leadfactory.webhooks.dead_letter_queue import DeadLetterReason
+from leadfactory.webhooks.webhook_intake import (
+    WebhookIntakeConsumer,
+    WebhookIntakeLog,
+    dedupe_key,
+    event_from_dict,
+)
+from leadfactory.webhooks.webhook_validator import (
+    WebhookEvent,
+    WebhookEventType,
+    WebhookStatus,
+)
+
+
+def make_event(event_id, event_type=WebhookEventType.EMAIL_DELIVERY, **payload):
+    return WebhookEvent(
+        webhook_name="sendgrid",
+        event_type=event_type,
+        payload={"sg_event_id": event_id, "email": "a@example.com", **payload},
+        headers={"Content-Type": "application/json"},
+        signature_verified=True,
+    )
+
+
+@pytest.fixture
+def intake_log(tmp_path):
+    log = WebhookIntakeLog(tmp_path / "intake.db")
+    yield log
+    log.close()
+
+
+def run_consumer(consumer):
+    """Dispatch and finish everything currently in the log."""
+
+    async def drain():
+        while await consumer.dispatch_pending():
+            await consumer.join()
+
+    asyncio.run(drain())
+    consumer.intake_log.flush()
+
+
+class TestDedupeKey:
+    """Test cases for dedupe keys."""
+
+    def test_uses_provider_event_id(self):
+        assert dedupe_key(make_event("evt1")) == "sendgrid:evt1"
+
+    def test_hashes_payload_without_id(self):
+        first = WebhookEvent(webhook_name="custom", payload={"a": 1, "b": 2})
+        second = WebhookEvent(webhook_name="custom", payload={"b": 2, "a": 1})
+        other = WebhookEvent(webhook_name="custom", payload={"a": 2})
+
+        assert dedupe_key(first) == dedupe_key(second)
+        assert dedupe_key(first) != dedupe_key(other)
+        assert dedupe_key(first).startswith("custom:sha256:")
+
+    def test_event_round_trip(self):
+        event = make_event("evt1", WebhookEventType.EMAIL_BOUNCE)
+        event.status = WebhookStatus.RETRYING
+
+        restored = event_from_dict(json.loads(json.dumps(event.to_dict())))
+
+        assert restored.to_dict() == event.to_dict()
+
+
+class TestWebhookIntakeLog:
+    """Test cases for WebhookIntakeLog."""
+
+    def test_append_and_read(self, intake_log):
+        first = intake_log.append(make_event("evt1"))
+        second = intake_log.append(make_event("evt2"))
+
+        records = intake_log.read_pending()
+        assert [r.seq for r in records] == [first, second]
+        assert records[0].event.payload["sg_event_id"] == "evt1"
+        assert intake_log.read_pending(after_seq=first)[0].seq == second
+
+    def test_redelivered_webhook_is_appended_once(self, intake_log):
+        assert intake_log.append(make_event("evt1")) == 1
+        assert intake_log.append(make_event("evt1")) is None
+
+        assert len(intake_log.read_pending()) == 1
+        assert intake_log.stats["duplicates"] == 1
+
+    def test_entries_survive_reopen(self, tmp_path):
+        log = WebhookIntakeLog(tmp_path / "intake.db")
+        seq = log.append(make_event("evt1"))
+        log.append(make_event("evt2"))
+        log.mark_done(seq, "processed")
+        log.close()
+
+        reopened = WebhookIntakeLog(tmp_path / "intake.db")
+        try:
+            pending = reopened.read_pending()
+            assert [r.event.payload["sg_event_id"] for r in pending] == ["evt2"]
+        finally:
+            reopened.close()
+
+    def test_concurrent_appends_share_commits(self, intake_log):
+        threads = [
+            threading.Thread(target=intake_log.append, args=(make_event(f"evt{i}"),))
+            for i in range(200)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert intake_log.stats["appended"] == 200
+        assert intake_log.stats["commits"] < 200
+        assert len(intake_log.read_pending(limit=500)) == 200
+
+    def test_lag_and_purge(self, intake_log):
+        first = intake_log.append(make_event("evt1"))
+        intake_log.append(make_event("evt2"))
+        time.sleep(0.01)
+
+        count, age = intake_log.lag()
+        assert count == 2
+        assert age > 0
+
+        intake_log.mark_done(first, "processed")
+        intake_log.flush()
+        assert intake_log.lag()[0] == 1
+
+        assert intake_log.purge_processed(older_than_hours=1) == 0
+        assert intake_log.purge_processed(older_than_hours=-1) == 1
+        # A purged key can be appended again
+        assert intake_log.append(make_event("evt1")) is not None
+
+    def test_append_after_close_raises(self, tmp_path):
+        log = WebhookIntakeLog(tmp_path / "intake.db")
+        log.close()
+
+        with pytest.raises(RuntimeError):
+            log.append(make_event("evt1"))
+
+
+class TestWebhookIntakeConsumer:
+    """Test cases for WebhookIntakeConsumer."""
+
+    def test_processes_and_marks_done(self, intake_log):
+        handled = []
+        consumer = WebhookIntakeConsumer(
+            intake_log, lambda event: handled.append(event.event_id) or True
+        )
+        events = [make_event(f"evt{i}") for i in range(5)]
+        for event in events:
+            intake_log.append(event)
+
+        run_consumer(consumer)
+
+        assert sorted(handled) == sorted(e.event_id for e in events)
+        assert consumer.stats["processed"] == 5
+        assert intake_log.read_pending() == []
+
+    def test_per_event_type_concurrency_limits(self, intake_log):
+        lock = threading.Lock()
+        active = {}
+        peak = {}
+
+        def handler(event):
+            event_type = event.event_type.value
+            with lock:
+                active[event_type] = active.get(event_type, 0) + 1
+                peak[event_type] = max(peak.get(event_type, 0), active[event_type])
+            time.sleep(0.02)
+            with lock:
+                active[event_type] -= 1
+            return True
+
+        for i in range(8):
+            intake_log.append(make_event(f"pay{i}", WebhookEventType.PAYMENT_SUCCESS))
+            intake_log.append(make_event(f"open{i}", WebhookEventType.EMAIL_OPEN))
+
+        consumer = WebhookIntakeConsumer(
+            intake_log,
+            handler,
+            concurrency_limits={"payment_success": 1},
+            default_concurrency=4,
+        )
+        run_consumer(consumer)
+
+        assert peak["payment_success"] == 1
+        assert 1 < peak["email_open"] <= 4
+        assert consumer.stats["processed"] == 16
+
+    def test_failures_go_to_retry_manager(self, intake_log):
+        retry_manager = Mock()
+        retry_manager.schedule_retry.return_value = True
+        dead_letter_manager = Mock()
+        consumer = WebhookIntakeConsumer(
+            intake_log,
+            Mock(side_effect=ConnectionError("storage timeout")),
+            retry_manager=retry_manager,
+            dead_letter_manager=dead_letter_manager,
+        )
+        event = make_event("evt1")
+        intake_log.append(event)
+
+        run_consumer(consumer)
+
+        retry_manager.schedule_retry.assert_called_once_with(
+            event_id=event.event_id,
+            webhook_name="sendgrid",
+            retry_attempt=1,
+            error="storage timeout",
+        )
+        dead_letter_manager.add_event.assert_not_called()
+        assert consumer.stats["retried"] == 1
+        assert intake_log.read_pending() == []
+
+    def test_refused_retries_are_dead_lettered(self, intake_log):
+        retry_manager = Mock()
+        retry_manager.schedule_retry.return_value = False
+        dead_letter_manager = Mock()
+        consumer = WebhookIntakeConsumer(
+            intake_log,
+            lambda event: False,
+            retry_manager=retry_manager,
+            dead_letter_manager=dead_letter_manager,
+        )
+        event = make_event("evt1")
+        intake_log.append(event)
+
+        run_consumer(consumer)
+
+        dead_letter_manager.add_event.assert_called_once()
+        kwargs = dead_letter_manager.add_event.call_args.kwargs
+        assert kwargs["webhook_event"]["event_id"] == event.event_id
+        assert kwargs["reason"] == DeadLetterReason.MAX_RETRIES_EXCEEDED
+        assert consumer.stats["dead_lettered"] == 1
+
+    def test_unfinished_entries_are_replayed(self, tmp_path):
+        """Entries without a done record are consumed again after a restart."""
+        log = WebhookIntakeLog(tmp_path / "intake.db")
+        log.append(make_event("evt1"))
+        log.append(make_event("evt2"))
+        log.close()
+
+        log = WebhookIntakeLog(tmp_path / "intake.db")
+        handled = []
+        consumer = WebhookIntakeConsumer(
+            log, lambda event: handled.append(event.payload["sg_event_id"]) or True
+        )
+        try:
+            run_consumer(consumer)
+        finally:
+            log.close()
+
+        assert sorted(handled) == ["evt1", "evt2"]
+
+    def test_background_consumer_reports_lag(self, intake_log):
+        processed = threading.Event()
+        consumer = WebhookIntakeConsumer(
+            intake_log, lambda event: processed.set() or True, poll_interval=5
+        )
+
+        with patch(
+            "leadfactory.webhooks.webhook_intake.WEBHOOK_CONSUMER_LAG_EVENTS"
+        ) as lag_gauge:
+            consumer.start_background()
+            try:
+                time.sleep(0.05)
+                intake_log.append(make_event("evt1"))
+                assert processed.wait(2)
+            finally:
+                consumer.stop()
+
+        lag_gauge.set.assert_called()
+        intake_log.flush()
+        assert intake_log.read_pending() == []
+
+
+class TestAcceptWebhook:
+    """Test cases for WebhookIntegrationService.accept_webhook."""
+
+    @pytest.fixture
+    def service(self, intake_log):
+        from leadfactory.webhooks.webhook_integration import WebhookIntegrationService
+
+        with (
+            patch("leadfactory.webhooks.webhook_validator.get_storage_instance"),
+            patch("leadfactory.webhooks.webhook_integration.EngagementAnalytics"),
+            patch("leadfactory.webhooks.webhook_integration.ErrorPropagationManager"),
+        ):
+            service = WebhookIntegrationService(
+                webhook_monitor=Mock(),
+                retry_manager=Mock(),
+                dead_letter_manager=Mock(),
+                intake_log=intake_log,
+            )
+            yield service
+
+    def payload(self, event_id="evt1"):
+        return json.dumps(
+            {
+                "email": "test@example.com",
+                "event": "delivered",
+                "timestamp": 1234567890,
+                "sg_event_id": event_id,
+            }
+        ).encode("utf-8")
+
+    def test_accept_appends_without_processing(self, service, intake_log):
+        with patch.object(service.webhook_validator, "process_webhook") as process:
+            result = service.accept_webhook(
+                "sendgrid", self.payload(), {"Content-Type": "application/json"}
+            )
+
+        assert result["success"] is True
+        assert result["status"] == "accepted"
+        assert result["intake_ms"] >= 0
+        process.assert_not_called()
+        records = intake_log.read_pending()
+        assert [r.event.event_id for r in records] == [result["event_id"]]
+        assert records[0].event.event_type == WebhookEventType.EMAIL_DELIVERY
+
+    def test_redelivery_is_acknowledged_as_duplicate(self, service):
+        headers = {"Content-Type": "application/json"}
+        service.accept_webhook("sendgrid", self.payload(), headers)
+        result = service.accept_webhook("sendgrid", self.payload(), headers)
+
+        assert result["success"] is True
+        assert result["duplicate"] is True
+        assert result["status"] == "duplicate"
+
+    def test_invalid_webhook_is_rejected(self, service, intake_log):
+        result = service.accept_webhook("sendgrid", b"not json", {})
+
+        assert result["success"] is False
+        assert result["status"] == "rejected"
+        assert intake_log.read_pending() == []
+
+    def test_consumer_uses_registered_handlers(self, service, intake_log):
+        service.accept_webhook(
+            "sendgrid", self.payload(), {"Content-Type": "application/json"}
+        )
+        consumer = WebhookIntakeConsumer(
+            intake_log,
+            service._process_intake_event,
+            retry_manager=service.retry_manager,
+            dead_letter_manager=service.dead_letter_manager,
+        )
+
+        with patch.object(
+            service, "_handle_email_delivery", return_value=True
+        ) as handler:
+            service.webhook_validator.event_handlers[
+                WebhookEventType.EMAIL_DELIVERY
+            ] = [handler]
+            run_consumer(consumer)
+
+        handler.assert_called_once()
+        assert consumer.stats["processed"] == 1
+        service.retry_manager.schedule_retry.assert_not_called()
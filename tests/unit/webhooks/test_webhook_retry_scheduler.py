@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the heap-based retry scheduler in WebhookRetryManager.
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import pytest
+
+from leadfactory.webhooks.webhook_retry_manager import (
+    RetryQueueStatus,
+    WebhookPriority,
+    WebhookRetryItem,
+    WebhookRetryManager,
+)
+
+
+@pytest.fixture
+def storage():
+    storage = Mock()
+    storage.get_pending_webhook_retries.return_value = []
+    return storage
+
+
+@pytest.fixture
+def manager(storage):
+    with patch(
+        "leadfactory.webhooks.webhook_retry_manager.get_storage_instance",
+        return_value=storage,
+    ):
+        yield WebhookRetryManager(batch_size=2, queue_check_interval=30)
+
+
+def make_item(event_id, seconds, priority=WebhookPriority.NORMAL):
+    return WebhookRetryItem(
+        event_id=event_id,
+        webhook_name="sendgrid",
+        retry_attempt=1,
+        next_retry_time=datetime.utcnow() + timedelta(seconds=seconds),
+        priority=priority,
+    )
+
+
+def run_processor(manager, until, timeout=2.0):
+    """Run process_retry_queue until until() is true, then stop it."""
+
+    async def run():
+        task = asyncio.create_task(manager.process_retry_queue())
+        deadline = time.monotonic() + timeout
+        while not until() and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+        manager.stop_queue()
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(run())
+
+
+class TestWebhookRetryItemStorage:
+    """Test cases for converting retry items to and from storage rows."""
+
+    def test_round_trip(self):
+        item = make_item("evt1", 5, WebhookPriority.CRITICAL)
+
+        row = item.to_storage_dict()
+
+        assert row["priority"] == "critical"
+        assert WebhookRetryItem.from_storage_dict(row) == item
+
+    @pytest.mark.parametrize("priority", ["HIGH", "high", 3, WebhookPriority.HIGH])
+    def test_priority_formats(self, priority):
+        row = make_item("evt1", 0).to_storage_dict()
+        row.update(priority=priority, created_at=None)
+
+        item = WebhookRetryItem.from_storage_dict(row)
+
+        assert item.priority == WebhookPriority.HIGH
+        assert isinstance(item.created_at, datetime)
+
+
+class TestRetryScheduler:
+    """Test cases for due-time scheduling and dispatch."""
+
+    def test_future_high_priority_item_does_not_block_due_items(self, manager):
+        manager.retry_queue.append(make_item("critical", 60, WebhookPriority.CRITICAL))
+        manager.retry_queue.append(make_item("low", -1, WebhookPriority.LOW))
+
+        batch = manager._take_ready_batch(datetime.utcnow())
+
+        assert [item.event_id for item in batch] == ["low"]
+        assert [item.event_id for item in manager.retry_queue] == ["critical"]
+
+    def test_due_items_are_batched_by_priority(self, manager):
+        for event_id, priority in [
+            ("normal", WebhookPriority.NORMAL),
+            ("low", WebhookPriority.LOW),
+            ("critical", WebhookPriority.CRITICAL),
+        ]:
+            manager._push_items([make_item(event_id, -1, priority)])
+
+        first = manager._take_ready_batch(datetime.utcnow())
+        second = manager._take_ready_batch(datetime.utcnow())
+
+        assert [item.event_id for item in first] == ["critical", "normal"]
+        assert [item.event_id for item in second] == ["low"]
+        assert manager.retry_queue == []
+        assert manager.stats["items_in_queue"] == 0
+
+    def test_seconds_until_next_retry(self, manager):
+        assert manager._seconds_until_next_retry() is None
+
+        manager._push_items([make_item("evt1", 30)])
+        assert 29 < manager._seconds_until_next_retry() <= 30
+
+        manager._push_items([make_item("evt2", -5)])
+        assert manager._seconds_until_next_retry() == 0.0
+
+    def test_clear_queue_resets_scheduler(self, manager):
+        manager._push_items([make_item("evt1", -1), make_item("evt2", 10)])
+        manager.retry_queue[0].webhook_name = "stripe"
+
+        manager.clear_queue("sendgrid")
+
+        assert len(manager.retry_queue) == 1
+        assert manager._take_ready_batch(datetime.utcnow())[0].webhook_name == (
+            "stripe"
+        )
+
+
+class TestRetryQueueProcessor:
+    """Test cases for process_retry_queue."""
+
+    def test_warm_start_loads_storage_once(self, manager, storage):
+        due = make_item("due", -1).to_storage_dict()
+        future = make_item("future", 60).to_storage_dict()
+        storage.get_pending_webhook_retries.return_value = [due, future, due]
+        processed = []
+
+        async def process(item, semaphore):
+            processed.append(item.event_id)
+            return True
+
+        with patch.object(manager, "_process_retry_item", side_effect=process):
+            run_processor(manager, lambda: processed)
+
+        storage.get_pending_webhook_retries.assert_called_once_with(due_only=False)
+        assert processed == ["due"]
+        assert [item.event_id for item in manager.retry_queue] == ["future"]
+        storage.remove_webhook_retry_item.assert_called_once_with("due")
+        assert manager.queue_status == RetryQueueStatus.IDLE
+
+    def test_sleeps_until_next_due_item(self, manager):
+        dispatched = {}
+
+        async def process(item, semaphore):
+            dispatched[item.event_id] = datetime.utcnow()
+            return True
+
+        manager._push_items([make_item("evt1", 0.2)])
+        due_at = manager.retry_queue[0].next_retry_time
+
+        with patch.object(manager, "_process_retry_item", side_effect=process):
+            run_processor(manager, lambda: dispatched)
+
+        lateness = (dispatched["evt1"] - due_at).total_seconds()
+        assert 0 <= lateness < 0.1
+
+    def test_schedule_from_another_thread_wakes_processor(self, manager):
+        dispatched = []
+
+        async def process(item, semaphore):
+            dispatched.append(item.event_id)
+            return True
+
+        def schedule_later():
+            time.sleep(0.05)
+            manager.force_retry_event("evt1")
+
+        manager.storage.get_webhook_event.return_value = {"webhook_name": "sendgrid"}
+        thread = threading.Thread(target=schedule_later)
+
+        with patch.object(manager, "_process_retry_item", side_effect=process):
+            thread.start()
+            start = time.monotonic()
+            run_processor(manager, lambda: dispatched)
+            elapsed = time.monotonic() - start
+        thread.join()
+
+        assert dispatched == ["evt1"]
+        assert elapsed < 1
+
+    @pytest.mark.asyncio
+    async def test_failed_retry_replaces_stored_row(self, manager, storage):
+        manager._push_items([make_item("evt1", -1)])
+
+        async def fail(item, semaphore):
+            return False
+
+        with patch.object(manager, "_process_retry_item", side_effect=fail):
+            await manager._process_ready_items()
+
+        storage.remove_webhook_retry_item.assert_called_once_with("evt1")
+        stored = storage.store_webhook_retry_item.call_args.args[0]
+        assert stored["retry_attempt"] == 2
+        assert stored["priority"] == "normal"
+        assert manager.retry_queue[0].retry_attempt == 2
+        assert manager.stats["failed_retries"] == 1